@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+交易管線日誌開銷比較
+
+以本機模擬市場（api.local_market_mcp）與 SQLite 依序執行 trading_tools.execute_trade_atomic
+（驗證 → 市場成交 → 資料庫原子交易），比較不同日誌設定下每筆交易的耗時：
+- off:      移除所有 sink（下限）
+- legacy:   原本的設定：console 同步寫入、檔案 enqueue，無抽樣
+- pipeline: common.logger.setup_logger（所有 sink enqueue）
+- sampled:  pipeline 加上交易模組抽樣（--sampling）
+
+每筆交易的日誌開銷 = 該設定的平均耗時 - off 的平均耗時。各設定輪流執行多回合取中位數，
+資料庫使用 WAL / synchronous=NORMAL，降低磁碟與排程抖動的影響。console 輸出導向 /dev/null。
+
+用法（於 backend 目錄）:
+    python benchmarks/bench_logging.py --trades 200 --rounds 5
+    python benchmarks/bench_logging.py --scenarios off,legacy   # 舊版程式只比較這兩種
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from api.local_market_mcp import LocalMarketMCP, MarketSimulator  # noqa: E402
+from bench_sqlite_profile import prepare_database  # noqa: E402
+from common.logger import _filter_noisy_loggers, logger, setup_logger  # noqa: E402
+from database.sqlite import apply_sqlite_pragmas  # noqa: E402
+from service.trading_service import TradingService  # noqa: E402
+from trading.tools.trading_tools import execute_trade_atomic  # noqa: E402
+
+TICKERS = ("2330", "2317", "2454", "2412", "2882")
+DEFAULT_SAMPLING = "service.trading_service=0.1,trading.tools=0.1"
+
+
+def configure(scenario: str, log_dir: Path, devnull, sampling: str) -> None:
+    """套用日誌設定（console 寫入 devnull）"""
+    logger.remove()
+    if scenario == "off":
+        return
+
+    if scenario == "legacy":
+        # 與原本 setup_logger 相同：console 同步寫入，檔案 enqueue
+        logger.add(
+            devnull,
+            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+            "<level>{level: <8}</level> | "
+            "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+            "<level>{message}</level>",
+            level="INFO",
+            colorize=True,
+            backtrace=True,
+            diagnose=True,
+            filter=_filter_noisy_loggers,
+        )
+        logger.add(
+            log_dir / "legacy.log",
+            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
+            level="INFO",
+            enqueue=True,
+            filter=_filter_noisy_loggers,
+        )
+        return
+
+    stderr = sys.stderr
+    sys.stderr = devnull  # setup_logger 的 console sink 寫入 sys.stderr
+    try:
+        setup_logger(
+            log_level="INFO",
+            log_file=log_dir / f"{scenario}.log",
+            enqueue=True,
+            sampling=sampling if scenario == "sampled" else "",
+            rate_limits="",
+        )
+    finally:
+        sys.stderr = stderr
+
+
+async def run_trades(maker, market, agent_id: str, session_id: str, trades: int) -> list[float]:
+    """依序執行交易（買賣交替，持股維持有限），回傳每筆耗時（微秒）"""
+    durations: list[float] = []
+    async with LocalMarketMCP(market) as server:
+        for n in range(trades):
+            ticker = TICKERS[(n // 2) % len(TICKERS)]
+            action = "BUY" if n % 2 == 0 else "SELL"
+            started = time.perf_counter()
+            async with maker() as session:
+                service = TradingService(session)
+                service.session_id = session_id
+                message = await execute_trade_atomic(
+                    service,
+                    server,
+                    agent_id=agent_id,
+                    ticker=ticker,
+                    action=action,
+                    quantity=1000,
+                    price=market.quote_price(ticker),
+                    decision_reason="benchmark",
+                )
+                await session.commit()
+            durations.append((time.perf_counter() - started) * 1_000_000)
+            if not message.startswith("✅"):
+                raise RuntimeError(f"Trade failed: {message}")
+    return durations
+
+
+def count_records(scenario: str, log_dir: Path) -> int:
+    """該設定寫入檔案的日誌筆數"""
+    path = log_dir / f"{scenario}.log"
+    if not path.exists():
+        return 0
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for line in f if " | " in line)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Trade pipeline logging overhead")
+    parser.add_argument("--trades", type=int, default=200, help="每回合每個設定的交易筆數")
+    parser.add_argument("--rounds", type=int, default=5, help="回合數（取中位數）")
+    parser.add_argument("--sampling", default=DEFAULT_SAMPLING, help="sampled 設定的抽樣規則")
+    parser.add_argument(
+        "--scenarios", default="off,legacy,pipeline,sampled", help="要比較的設定（逗號分隔）"
+    )
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    if "off" not in scenarios:
+        scenarios.insert(0, "off")
+    results: dict[str, list[float]] = {name: [] for name in scenarios}
+    records: dict[str, int] = dict.fromkeys(scenarios, 0)
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        log_dir = Path(tmp) / "logs"
+        log_dir.mkdir()
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        logger.remove()
+        engine = create_async_engine(url)
+        apply_sqlite_pragmas(engine, busy_timeout_ms=5000, mmap_size=268435456)
+        async with engine.connect():
+            pass  # 先切換為 WAL
+        sessions = await prepare_database(url, len(scenarios))
+        maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        market = MarketSimulator(seed=1)
+
+        # 預熱（匯入、連線、查詢編譯快取）
+        agent_id, session_id = next(iter(sessions.items()))
+        await run_trades(maker, market, agent_id, session_id, 20)
+
+        print(f"🏁 {args.trades} trades × {args.rounds} rounds per scenario")
+        for _ in range(args.rounds):
+            for scenario, (agent_id, session_id) in zip(scenarios, sessions.items(), strict=True):
+                configure(scenario, log_dir, devnull, args.sampling)
+                durations = await run_trades(maker, market, agent_id, session_id, args.trades)
+                results[scenario].append(statistics.mean(durations))
+                logger.remove()  # 等待 enqueue 的 sink 寫完
+        for scenario in scenarios:
+            records[scenario] = count_records(scenario, log_dir)
+        await engine.dispose()
+
+    floor = statistics.median(results["off"])
+    total_trades = args.trades * args.rounds
+    print()
+    print(f"{'scenario':<10}{'µs/trade':>12}{'overhead µs':>14}{'records/trade':>15}")
+    print("-" * 51)
+    for scenario in scenarios:
+        mean = statistics.median(results[scenario])
+        per_trade = records[scenario] / total_trades
+        print(f"{scenario:<10}{mean:>12.0f}{mean - floor:>14.0f}{per_trade:>15.1f}")
+    print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+SQLite single-node profile 效能比較
+
+模擬多個 Agent 同時執行 execute_trade_atomic，比較：
+- baseline: 預設 aiosqlite engine（rollback journal、synchronous=FULL），各自提交
+- profile:  WAL / synchronous=NORMAL / mmap pragma + 單一寫入者批次提交
+
+用法（於 backend 目錄）:
+    python benchmarks/bench_sqlite_profile.py --agents 20 --trades 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+import api.config as config  # noqa: E402
+from common.enums import AgentMode  # noqa: E402
+from common.logger import logger  # noqa: E402
+from database.models import Agent, Base  # noqa: E402
+from database.sqlite import SQLiteWriteQueue, apply_sqlite_pragmas  # noqa: E402
+from service.session_service import AgentSessionService  # noqa: E402
+from service.trading_service import TradingService  # noqa: E402
+
+
+async def prepare_database(url: str, agents: int) -> dict[str, str]:
+    """建立資料表、Agent 與執行會話，回傳 agent_id -> session_id"""
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    sessions: dict[str, str] = {}
+    async with maker() as session:
+        for i in range(agents):
+            agent_id = f"bench-agent-{i:02d}"
+            session.add(
+                Agent(
+                    id=agent_id,
+                    name=agent_id,
+                    ai_model="gpt-5-mini",
+                    initial_funds=100_000_000,
+                    current_funds=100_000_000,
+                )
+            )
+        await session.commit()
+        for i in range(agents):
+            agent_id = f"bench-agent-{i:02d}"
+            agent_session = await AgentSessionService(session).create_session(
+                agent_id=agent_id, mode=AgentMode.TRADING
+            )
+            sessions[agent_id] = agent_session.id
+    await engine.dispose()
+    return sessions
+
+
+async def run_agent(
+    maker: async_sessionmaker[AsyncSession],
+    agent_id: str,
+    session_id: str,
+    trades: int,
+    latencies: list[float],
+    errors: list[str],
+) -> None:
+    """單一 Agent 依序執行多筆交易（每筆使用獨立 session，如同工具呼叫）"""
+    for n in range(trades):
+        started = time.perf_counter()
+        async with maker() as session:
+            service = TradingService(session)
+            service.session_id = session_id
+            result = await service.execute_trade_atomic(
+                agent_id=agent_id,
+                ticker=f"{2330 + n % 5}",
+                action="BUY",
+                quantity=1000,
+                price=100.0 + n,
+            )
+            try:
+                await session.commit()
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+        latencies.append((time.perf_counter() - started) * 1000)
+        if not result["success"]:
+            errors.append(result.get("error", "unknown"))
+
+
+async def run_scenario(name: str, profile: bool, agents: int, trades: int) -> dict:
+    """執行單一情境並回傳統計"""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        if profile:
+            # 先切換為 WAL，讓資料準備階段與正式情境使用相同的日誌模式
+            engine = create_async_engine(url)
+            apply_sqlite_pragmas(engine, busy_timeout_ms=5000, mmap_size=268435456)
+            async with engine.connect():
+                pass
+            await engine.dispose()
+        sessions = await prepare_database(url, agents)
+
+        queue = None
+        writer_engine = None
+        if profile:
+            engine = create_async_engine(url, pool_size=agents, max_overflow=0)
+            apply_sqlite_pragmas(engine, busy_timeout_ms=5000, mmap_size=268435456)
+            writer_engine = create_async_engine(url, pool_size=1, max_overflow=0)
+            apply_sqlite_pragmas(
+                writer_engine,
+                busy_timeout_ms=5000,
+                mmap_size=268435456,
+                immediate_transactions=True,
+            )
+            queue = SQLiteWriteQueue(
+                async_sessionmaker(writer_engine, class_=AsyncSession, expire_on_commit=False)
+            )
+            await queue.start()
+        else:
+            engine = create_async_engine(url, pool_size=agents, max_overflow=0)
+
+        config._sqlite_write_queue = queue
+        maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        latencies: list[float] = []
+        errors: list[str] = []
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                run_agent(maker, agent_id, session_id, trades, latencies, errors)
+                for agent_id, session_id in sessions.items()
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+        batches = None
+        if queue is not None:
+            await queue.stop()
+            batches = queue.batches_committed
+        config._sqlite_write_queue = None
+        await engine.dispose()
+        if writer_engine is not None:
+            await writer_engine.dispose()
+
+    latencies.sort()
+    total = agents * trades
+    return {
+        "name": name,
+        "trades": total,
+        "ok": total - len(errors),
+        "errors": len(errors),
+        "locked_errors": sum("locked" in e for e in errors),
+        "elapsed_s": elapsed,
+        "throughput": (total - len(errors)) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "batches": batches,
+    }
+
+
+def print_report(results: list[dict]) -> None:
+    """輸出比較表"""
+    print()
+    print(
+        f"{'scenario':<10}{'ok':>6}{'errors':>8}{'locked':>8}"
+        f"{'trades/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'commits':>9}"
+    )
+    print("-" * 69)
+    for r in results:
+        commits = r["batches"] if r["batches"] is not None else r["ok"]
+        print(
+            f"{r['name']:<10}{r['ok']:>6}{r['errors']:>8}{r['locked_errors']:>8}"
+            f"{r['throughput']:>10.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{commits:>9}"
+        )
+    print()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite profile benchmark")
+    parser.add_argument("--agents", type=int, default=20, help="同時執行的 Agent 數")
+    parser.add_argument("--trades", type=int, default=10, help="每個 Agent 的交易筆數")
+    args = parser.parse_args()
+
+    # 交易流程的逐筆日誌會主導耗時，測量時關閉
+    logger.remove()
+
+    print(f"🏁 {args.agents} agents × {args.trades} trades")
+    results = [
+        await run_scenario("baseline", False, args.agents, args.trades),
+        await run_scenario("profile", True, args.agents, args.trades),
+    ]
+    print_report(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+API 啟動導入時間報告
+
+以 python -X importtime 在子行程中導入 API 進入點（預設 api.server，即 uvicorn 載入的
+"api.server:app"，包含 create_app），輸出：
+- 啟動總耗時（子行程內以 perf_counter 量測，取多次中位數）
+- 累積耗時最高的模組（含導入路徑）
+- 依頂層套件彙總的自身耗時
+- 重量級套件（Agents SDK、LiteLLM、OpenAI 等）是否在啟動時被載入，以及是誰導入的
+
+重量級套件應在第一次使用時才載入（執行 Agent、繪製結構圖、連線 MCP），
+啟動時被載入即視為退化；--budget 超過時也以非零狀態結束，可放在 CI。
+
+用法（於 backend 目錄）:
+    python benchmarks/import_report.py
+    python benchmarks/import_report.py --module api.app --top 30
+    python benchmarks/import_report.py --budget 2.5 --runs 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = BACKEND_DIR / "src"
+
+# 不應在 API 啟動時載入的套件
+HEAVY_PACKAGES = ("agents", "litellm", "openai", "mcp", "graphviz", "pandas", "yfinance")
+
+TIMING_SNIPPET = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print("__elapsed__", elapsed)
+print("__loaded__", ",".join(sorted(n for n in sys.modules if "." not in n)))
+"""
+
+
+@dataclass
+class ImportNode:
+    """importtime 的一筆記錄（微秒）"""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: list[ImportNode] = field(default_factory=list)
+
+
+def parse_importtime(stderr: str) -> list[ImportNode]:
+    """
+    解析 -X importtime 輸出為導入樹
+
+    子模組先於父模組輸出（完成順序），縮排每層兩個空白。
+
+    Returns:
+        頂層導入節點
+    """
+    pending: dict[int, list[ImportNode]] = defaultdict(list)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "| imported package" in line:
+            continue
+        try:
+            self_part, cumulative_part, name_part = line[len("import time:") :].split("|")
+            self_us, cumulative_us = int(self_part), int(cumulative_part)
+        except ValueError:
+            continue  # 標題列
+        name = name_part.rstrip()
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        node = ImportNode(name.strip(), self_us, cumulative_us, pending.pop(depth + 1, []))
+        pending[depth].append(node)
+    return pending.get(0, [])
+
+
+def walk(nodes: list[ImportNode], path: tuple[str, ...] = ()):
+    """走訪導入樹，產生 (節點, 導入路徑)"""
+    for node in nodes:
+        node_path = (*path, node.name)
+        yield node, node_path
+        yield from walk(node.children, node_path)
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure_startup(module: str) -> tuple[float, set[str]]:
+    """在全新的子行程中導入模組，回傳 (耗時秒數, 已載入的頂層套件)"""
+    result = run_python(TIMING_SNIPPET.format(module=module))
+    elapsed = 0.0
+    loaded: set[str] = set()
+    for line in result.stdout.splitlines():
+        if line.startswith("__elapsed__ "):
+            elapsed = float(line.split()[1])
+        elif line.startswith("__loaded__ "):
+            loaded = set(line.split(" ", 1)[1].split(","))
+    return elapsed, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="API startup import-time report")
+    parser.add_argument("--module", default="api.server", help="要導入的進入點模組")
+    parser.add_argument("--top", type=int, default=20, help="列出的模組數")
+    parser.add_argument("--runs", type=int, default=3, help="量測啟動耗時的次數（取中位數）")
+    parser.add_argument("--budget", type=float, default=None, help="啟動耗時上限（秒）")
+    args = parser.parse_args()
+
+    tree = parse_importtime(run_python(f"import {args.module}", "-X", "importtime").stderr)
+    timings = [measure_startup(args.module) for _ in range(max(1, args.runs))]
+    elapsed = statistics.median(t for t, _ in timings)
+    loaded = timings[-1][1]
+
+    nodes = list(walk(tree))
+    print(f"🚀 import {args.module}: {elapsed * 1000:.0f} ms (median of {len(timings)} runs)")
+    print()
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    print("-" * 60)
+    ranked = sorted(nodes, key=lambda item: item[0].cumulative_us, reverse=True)
+    for node, path in ranked[: args.top]:
+        via = f"  ← {' ← '.join(reversed(path[:-1][-3:]))}" if len(path) > 1 else ""
+        print(f"{node.cumulative_us / 1000:>14.1f}{node.self_us / 1000:>10.1f}  {node.name}{via}")
+
+    by_package: dict[str, int] = defaultdict(int)
+    for node, _ in nodes:
+        by_package[node.name.split(".")[0]] += node.self_us
+    print()
+    print(f"{'self ms':>10}  package")
+    print("-" * 40)
+    for package, self_us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[
+        : args.top
+    ]:
+        print(f"{self_us / 1000:>10.1f}  {package}")
+
+    status = 0
+    heavy = [name for name in HEAVY_PACKAGES if name in loaded]
+    print()
+    if heavy:
+        status = 1
+        print(f"❌ Heavy packages loaded at startup: {', '.join(heavy)}")
+        for name in heavy:
+            for node, path in nodes:
+                if node.name == name:
+                    print(f"   {name}: {' → '.join(path)}")
+                    break
+    else:
+        print(f"✅ No heavy packages loaded at startup ({', '.join(HEAVY_PACKAGES)})")
+
+    if args.budget is not None:
+        if elapsed > args.budget:
+            status = 1
+            print(f"❌ Startup {elapsed:.2f}s exceeds budget {args.budget:.2f}s")
+        else:
+            print(f"✅ Startup {elapsed:.2f}s within budget {args.budget:.2f}s")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,689 @@
+#!/usr/bin/env python3
+"""
+端對端 API 負載測試
+
+以腳本化的假 LLM 與本機模擬市場（api.local_market_mcp）驅動 FastAPI 應用程式，
+逐段提高同時執行的 Agent 數量，同時以 GET 輪詢模擬儀表板流量，輸出可在版本間比較的 JSON：
+- 各端點 p50 / p95 / p99 延遲、吞吐量與錯誤率
+- Agent 執行（start_agent_mode → 會話完成）延遲、失敗率（含逾時）與每秒成交筆數
+- 資料庫連線池使用率與飽和比例（SQLite profile 另含單一寫入者佇列深度）
+
+假 LLM 每次執行依序呼叫 get_stock_price_tool 與 execute_trade_atomic_tool（同一 Agent 買賣交替），
+再輸出最終訊息；memory / perplexity 等 stdio MCP 不啟動。執行是否串流沿用 WS_STREAM_AGENT_RUNS
+的預設（假 LLM 同時支援 get_response 與 stream_response），量測結果與正式設定一致。
+
+用法（於 backend 目錄）:
+    python benchmarks/load_test.py --stages 1,5,10,20 --stage-seconds 15 --output load.json
+    python benchmarks/load_test.py --transport uvicorn --compare load.json
+
+未指定 --database-url 時使用暫存目錄中的 SQLite 檔案（SQLite single-node profile）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR / "src"))
+
+TICKERS = ("2330", "2317", "2454", "2412", "2881", "2603")
+
+FINISHED_STATUSES = {"completed", "failed", "stopped"}
+
+
+# ==========================================
+# Scripted LLM
+# ==========================================
+
+
+def build_scripted_model(agent_id: str, market, runs: dict[str, int]):
+    """
+    建立腳本化的假 LLM（agents Model 介面）
+
+    每次執行：查價 → 原子交易（奇數次買入、偶數次賣出同一檔股票）→ 最終訊息。
+    """
+    from agents.items import ModelResponse
+    from agents.models.interface import Model
+    from agents.usage import Usage
+    from openai.types.responses import (
+        Response,
+        ResponseCompletedEvent,
+        ResponseFunctionToolCall,
+        ResponseOutputMessage,
+        ResponseOutputText,
+        ResponseTextDeltaEvent,
+    )
+
+    class ScriptedModel(Model):
+        model = "scripted-load-test"
+
+        def __init__(self):
+            self._ticker = TICKERS[sum(map(ord, agent_id)) % len(TICKERS)]
+
+        async def get_response(
+            self,
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            *,
+            previous_response_id=None,
+            conversation_id=None,
+            prompt=None,
+        ) -> ModelResponse:
+            return ModelResponse(
+                output=[self._next_item(input, tools)], usage=Usage(), response_id=None
+            )
+
+        async def stream_response(
+            self,
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            *,
+            previous_response_id=None,
+            conversation_id=None,
+            prompt=None,
+        ) -> AsyncIterator[Any]:
+            # 與 get_response 相同的腳本；最終訊息先以文字增量送出，再以 response.completed 結束
+            item = self._next_item(input, tools)
+            sequence = itertools.count()
+            if item.type == "message":
+                yield ResponseTextDeltaEvent(
+                    type="response.output_text.delta",
+                    content_index=0,
+                    delta=item.content[0].text,
+                    item_id=item.id,
+                    output_index=0,
+                    sequence_number=next(sequence),
+                    logprobs=[],
+                )
+            yield ResponseCompletedEvent(
+                type="response.completed",
+                sequence_number=next(sequence),
+                response=Response(
+                    id=f"resp_{uuid.uuid4().hex}",
+                    created_at=time.time(),
+                    model=self.model,
+                    object="response",
+                    output=[item],
+                    parallel_tool_calls=False,
+                    tool_choice="auto",
+                    tools=[],
+                    status="completed",
+                ),
+            )
+
+        def _next_item(self, input, tools) -> ResponseOutputMessage | ResponseFunctionToolCall:
+            step = _count_tool_outputs(input)
+            if step == 0:
+                # 新的一次執行
+                runs[agent_id] = runs.get(agent_id, 0) + 1
+            tool_names = {getattr(tool, "name", None) for tool in tools}
+            call = self._next_call(step, tool_names)
+
+            if call is None:
+                return ResponseOutputMessage(
+                    id=f"msg_{uuid.uuid4().hex}",
+                    content=[
+                        ResponseOutputText(
+                            annotations=[], text="負載測試執行完成", type="output_text"
+                        )
+                    ],
+                    role="assistant",
+                    status="completed",
+                    type="message",
+                )
+            name, arguments = call
+            return ResponseFunctionToolCall(
+                id=f"fc_{uuid.uuid4().hex}",
+                call_id=f"call_{uuid.uuid4().hex}",
+                name=name,
+                arguments=json.dumps(arguments, ensure_ascii=False),
+                type="function_call",
+                status="completed",
+            )
+
+        def _next_call(self, step: int, tool_names: set) -> tuple[str, dict] | None:
+            if step == 0 and "get_stock_price_tool" in tool_names:
+                return "get_stock_price_tool", {"symbol": self._ticker}
+            if step <= 1 and "execute_trade_atomic_tool" in tool_names:
+                return "execute_trade_atomic_tool", {
+                    "ticker": self._ticker,
+                    "action": "BUY" if runs[agent_id] % 2 else "SELL",
+                    "quantity": 1000,
+                    "price": market.quote_price(self._ticker),
+                    "decision_reason": "load test",
+                }
+            return None
+
+    return ScriptedModel()
+
+
+def _count_tool_outputs(input) -> int:
+    if isinstance(input, str):
+        return 0
+    return sum(
+        1
+        for item in input
+        if (item.get("type") if isinstance(item, dict) else getattr(item, "type", None))
+        == "function_call_output"
+    )
+
+
+def install_fakes(market) -> dict[str, int]:
+    """以假 LLM 取代模型設定，並停用需要外部程序的 stdio MCP"""
+    from trading.trading_agent import TradingAgent
+
+    runs: dict[str, int] = {}
+
+    async def create_scripted_model(self):
+        return build_scripted_model(self.agent_id, market, runs), None
+
+    async def skip_stdio_server(self, **kwargs):
+        return None
+
+    TradingAgent._create_llm_model = create_scripted_model
+    TradingAgent._start_mcp_server = skip_stdio_server
+    return runs
+
+
+# ==========================================
+# Measurements
+# ==========================================
+
+
+def percentiles(values: list[float]) -> dict[str, float | None]:
+    """p50 / p95 / p99 / max / mean（毫秒，最近排名法）"""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None, "mean": None}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))
+        return round(ordered[index], 2)
+
+    return {
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": round(ordered[-1], 2),
+        "mean": round(sum(ordered) / len(ordered), 2),
+    }
+
+
+class StageStats:
+    """單一負載階段的量測結果"""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.executions: list[float] = []
+        self.execution_outcomes: dict[str, int] = defaultdict(int)
+        self.trades = 0
+        self.pool_samples: dict[str, list[tuple[int, int | None]]] = defaultdict(list)
+        self.write_queue_depth = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record(self, endpoint: str, elapsed_ms: float, ok: bool) -> None:
+        self.latencies[endpoint].append(elapsed_ms)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        elapsed = self.elapsed or 1e-9
+        requests = {}
+        for endpoint in sorted(self.latencies):
+            count = len(self.latencies[endpoint])
+            errors = self.errors[endpoint]
+            requests[endpoint] = {
+                "count": count,
+                "errors": errors,
+                "error_rate": round(errors / count, 4) if count else 0.0,
+                "throughput_per_s": round(count / elapsed, 2),
+                "latency_ms": percentiles(self.latencies[endpoint]),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        total_errors = sum(self.errors.values())
+        completed = self.execution_outcomes["completed"]
+        started = self.execution_outcomes["started"]
+        # 逾時未結束的執行與失敗的執行同樣計入失敗率
+        failures = self.execution_outcomes["failed"] + self.execution_outcomes["timeout"]
+
+        return {
+            "concurrency": self.concurrency,
+            "duration_s": round(self.elapsed, 2),
+            "executions": {
+                **{k: self.execution_outcomes[k] for k in sorted(self.execution_outcomes)},
+                "throughput_per_s": round(completed / elapsed, 2),
+                "failure_rate": round(failures / started, 4) if started else 0.0,
+                "latency_ms": percentiles(self.executions),
+            },
+            "trades": {"executed": self.trades, "per_s": round(self.trades / elapsed, 2)},
+            "requests": requests,
+            "totals": {
+                "requests": total,
+                "errors": total_errors,
+                "error_rate": round(total_errors / total, 4) if total else 0.0,
+                "throughput_per_s": round(total / elapsed, 2),
+            },
+            "db_pool": {
+                **{name: _pool_summary(samples) for name, samples in self.pool_samples.items()},
+                "sqlite_write_queue_max_depth": self.write_queue_depth,
+            },
+        }
+
+
+def _pool_summary(samples: list[tuple[int, int | None]]) -> dict[str, Any]:
+    capacity = samples[0][1] if samples else None
+    checked_out = [used for used, _ in samples]
+    summary: dict[str, Any] = {
+        "capacity": capacity,
+        "max_checked_out": max(checked_out, default=0),
+    }
+    if capacity:
+        summary["mean_utilization"] = round(sum(checked_out) / len(checked_out) / capacity, 4)
+        summary["saturated_ratio"] = round(
+            sum(1 for used in checked_out if used >= capacity) / len(checked_out), 4
+        )
+    return summary
+
+
+def _pools() -> dict[str, Any]:
+    from api import config
+
+    pools = {"primary": config.get_engine().sync_engine.pool}
+    read_pool = config.get_read_engine().sync_engine.pool
+    if read_pool is not pools["primary"]:
+        pools["read"] = read_pool
+    return pools
+
+
+async def sample_pools(stats: StageStats, stop: asyncio.Event, interval: float) -> None:
+    """定期記錄連線池使用量"""
+    from api import config
+
+    pools = _pools()
+    while not stop.is_set():
+        for name, pool in pools.items():
+            checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+            max_overflow = getattr(pool, "_max_overflow", 0)
+            size = pool.size() if hasattr(pool, "size") else 0
+            capacity = size + max_overflow if size and max_overflow >= 0 else None
+            stats.pool_samples[name].append((checked_out, capacity))
+
+        queue = config.get_sqlite_write_queue()
+        if queue is not None:
+            stats.write_queue_depth = max(stats.write_queue_depth, queue.queue_depth)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except TimeoutError:
+            pass
+
+
+# ==========================================
+# Load Generators
+# ==========================================
+
+
+async def timed_request(client, stats: StageStats, endpoint: str, method: str, url: str, **kw):
+    """送出請求並記錄延遲；5xx 與連線錯誤計為錯誤"""
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kw)
+    except Exception:
+        stats.record(endpoint, (time.perf_counter() - started) * 1000, ok=False)
+        return None
+    stats.record(endpoint, (time.perf_counter() - started) * 1000, ok=response.status_code < 500)
+    return response
+
+
+async def run_executions(
+    client,
+    stats: StageStats,
+    agent_id: str,
+    deadline: float,
+    poll_interval: float,
+    session_timeout: float,
+) -> None:
+    """
+    反覆啟動同一個 Agent 並輪詢會話直到完成
+
+    會話超過 session_timeout 秒仍未結束時計為 timeout（失敗）並停止輪詢，
+    避免卡住的執行讓階段永遠無法結束。
+    """
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await timed_request(
+            client,
+            stats,
+            "POST start_agent_mode",
+            "POST",
+            f"/api/agent-execution/{agent_id}/start",
+            json={"mode": "TRADING"},
+        )
+        if response is None or response.status_code != 202:
+            outcome = "busy" if response is not None and response.status_code == 409 else "rejected"
+            stats.execution_outcomes[outcome] += 1
+            await asyncio.sleep(poll_interval)
+            continue
+
+        session_id = response.json()["session_id"]
+        stats.execution_outcomes["started"] += 1
+        session_deadline = started + session_timeout
+        while True:
+            if time.perf_counter() >= session_deadline:
+                stats.execution_outcomes["timeout"] += 1
+                break
+            await asyncio.sleep(poll_interval)
+            detail = await timed_request(
+                client,
+                stats,
+                "GET session_detail",
+                "GET",
+                f"/api/agent-execution/{agent_id}/sessions/{session_id}",
+            )
+            if detail is None or detail.status_code != 200:
+                continue
+            body = detail.json()
+            status = str(body.get("status", "")).lower()
+            if status in FINISHED_STATUSES:
+                stats.executions.append((time.perf_counter() - started) * 1000)
+                stats.execution_outcomes[status] += 1
+                stats.trades += body.get("stats", {}).get("filled", 0)
+                break
+
+
+def dashboard_requests(agent_ids: list[str]) -> list[tuple[str, str]]:
+    """儀表板輪詢的端點（標籤, 路徑）"""
+    requests = [("GET list_agents", "/api/agents")]
+    for agent_id in agent_ids:
+        requests += [
+            ("GET agent", f"/api/agents/{agent_id}"),
+            ("GET portfolio", f"/api/trading/agents/{agent_id}/portfolio"),
+            ("GET performance", f"/api/trading/agents/{agent_id}/performance"),
+            ("GET transactions", f"/api/trading/agents/{agent_id}/transactions"),
+        ]
+    requests += [("GET quote", f"/api/trading/market/quote/{t}") for t in TICKERS[:2]]
+    return requests
+
+
+async def run_poller(client, stats: StageStats, requests, deadline: float, seed: int) -> None:
+    """持續以 GET 輪詢儀表板端點（順序以種子打散）"""
+    order = list(requests)
+    random.Random(seed).shuffle(order)
+    for endpoint, url in itertools.cycle(order):
+        if time.perf_counter() >= deadline:
+            return
+        await timed_request(client, stats, endpoint, "GET", url)
+
+
+async def run_stage(
+    client,
+    agent_ids: list[str],
+    concurrency: int,
+    args: argparse.Namespace,
+) -> StageStats:
+    """執行一個負載階段：concurrency 個 Agent 同時執行 + 固定數量的輪詢者"""
+    stats = StageStats(concurrency)
+    deadline = time.perf_counter() + args.stage_seconds
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_pools(stats, stop, args.sample_interval))
+
+    requests = dashboard_requests(agent_ids[: max(concurrency, 1)])
+    workers = [
+        run_executions(client, stats, agent_id, deadline, args.poll_interval, args.session_timeout)
+        for agent_id in agent_ids[:concurrency]
+    ] + [run_poller(client, stats, requests, deadline, args.seed + n) for n in range(args.pollers)]
+    await asyncio.gather(*workers)
+
+    stop.set()
+    await sampler
+    stats.elapsed = time.perf_counter() - stats.started
+    return stats
+
+
+# ==========================================
+# Setup
+# ==========================================
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """在載入應用程式前設定環境（設定值於 import 時讀取）"""
+    os.environ["CASUAL_MARKET_SSE_URL"] = "local"
+    os.environ["CASUAL_MARKET_SEED"] = str(args.seed)
+    os.environ.setdefault("DEBUG", "false")
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        db_path = Path(tempfile.mkdtemp(prefix="casualtrader-load-")) / "load.db"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+
+
+async def seed_agents(count: int) -> list[str]:
+    """建立負載測試用的 Agent（資金足以連續交易）"""
+    from api.config import get_session_maker
+    from database.models import Agent
+
+    agent_ids = [f"load-agent-{uuid.uuid4().hex[:8]}" for _ in range(count)]
+    async with get_session_maker()() as session:
+        for agent_id in agent_ids:
+            session.add(
+                Agent(
+                    id=agent_id,
+                    name=agent_id,
+                    description="load test agent",
+                    ai_model="scripted-load-test",
+                    initial_funds=Decimal("100000000"),
+                    current_funds=Decimal("100000000"),
+                )
+            )
+        await session.commit()
+    return agent_ids
+
+
+def quiet_logging(level: str) -> None:
+    """降低應用程式日誌量，避免終端輸出成為瓶頸"""
+    from common.logger import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level=level)
+
+
+async def run_asgi(args: argparse.Namespace, app) -> list[StageStats]:
+    import httpx
+
+    async with app.router.lifespan_context(app):
+        quiet_logging(args.log_level)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=args.request_timeout
+        ) as client:
+            return await run_stages(client, args)
+
+
+async def run_uvicorn(args: argparse.Namespace, app) -> list[StageStats]:
+    import httpx
+    import uvicorn
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.05)
+    quiet_logging(args.log_level)
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}",
+            timeout=args.request_timeout,
+            limits=limits,
+        ) as client:
+            return await run_stages(client, args)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def run_stages(client, args: argparse.Namespace) -> list[StageStats]:
+    agent_ids = await seed_agents(max(args.stages))
+    results = []
+    for concurrency in args.stages:
+        print(f"▶ stage: {concurrency} concurrent agent(s), {args.pollers} poller(s)", flush=True)
+        stats = await run_stage(client, agent_ids, concurrency, args)
+        summary = stats.to_dict()
+        print(
+            f"  executions/s={summary['executions']['throughput_per_s']} "
+            f"trades/s={summary['trades']['per_s']} "
+            f"requests/s={summary['totals']['throughput_per_s']} "
+            f"errors={summary['totals']['error_rate']:.2%}",
+            flush=True,
+        )
+        results.append(stats)
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ==========================================
+# Report
+# ==========================================
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> None:
+    """列出與基準報告相同併發階段的主要指標差異"""
+    previous = {stage["concurrency"]: stage for stage in baseline.get("stages", [])}
+    print(f"\nCompared with {baseline['meta'].get('git_commit') or 'baseline'}:")
+    for stage in current["stages"]:
+        old = previous.get(stage["concurrency"])
+        if old is None:
+            continue
+        rows = [
+            (
+                "executions/s",
+                stage["executions"]["throughput_per_s"],
+                old["executions"]["throughput_per_s"],
+            ),
+            (
+                "execution p95 ms",
+                stage["executions"]["latency_ms"]["p95"],
+                old["executions"]["latency_ms"]["p95"],
+            ),
+            ("requests/s", stage["totals"]["throughput_per_s"], old["totals"]["throughput_per_s"]),
+            ("error rate", stage["totals"]["error_rate"], old["totals"]["error_rate"]),
+        ]
+        print(f"  concurrency {stage['concurrency']}:")
+        for label, new_value, old_value in rows:
+            if new_value is None or old_value is None:
+                continue
+            delta = (new_value - old_value) / old_value * 100 if old_value else 0.0
+            print(f"    {label:<18} {old_value:>10} → {new_value:<10} ({delta:+.1f}%)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CasualTrader end-to-end API load test")
+    parser.add_argument(
+        "--stages",
+        type=lambda v: [int(x) for x in v.split(",")],
+        default=[1, 5, 10, 20],
+        help="Concurrent agent executions per stage (comma separated)",
+    )
+    parser.add_argument("--stage-seconds", type=float, default=15.0)
+    parser.add_argument("--pollers", type=int, default=10, help="Concurrent dashboard pollers")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Session poll interval")
+    parser.add_argument(
+        "--session-timeout",
+        type=float,
+        default=60.0,
+        help="Seconds before an unfinished execution is recorded as a timeout",
+    )
+    parser.add_argument("--sample-interval", type=float, default=0.05, help="Pool sample interval")
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--port", type=int, default=18000, help="Port for --transport uvicorn")
+    parser.add_argument("--database-url", help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--seed", type=int, default=42, help="Market and poller seed")
+    parser.add_argument("--log-level", default="WARNING", help="Application log level")
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--compare", help="Previous report to compare against")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    configure_environment(args)
+
+    from api.app import create_app
+    from api.local_market_mcp import get_shared_market
+
+    install_fakes(get_shared_market())
+    app = create_app()
+
+    runner = run_uvicorn if args.transport == "uvicorn" else run_asgi
+    started_at = datetime.now(timezone.utc).isoformat()
+    stages = asyncio.run(runner(args, app))
+
+    report = {
+        "meta": {
+            "started_at": started_at,
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "transport": args.transport,
+            "database": os.environ["DATABASE_URL"].split("://", 1)[0],
+            "stage_seconds": args.stage_seconds,
+            "pollers": args.pollers,
+            "seed": args.seed,
+        },
+        "stages": [stats.to_dict() for stats in stages],
+    }
+    Path(args.output).write_text(
+        json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False), encoding="utf-8"
+    )
+    print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
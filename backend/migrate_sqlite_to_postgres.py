@@ -0,0 +1,889 @@
+#!/usr/bin/env python3
+"""
+SQLite to PostgreSQL Migration Tool
+
+Streams data from a CasualTrader SQLite database into PostgreSQL.
+
+- Rows are read in chunks and loaded with ``COPY ... FROM STDIN``
+  (memory usage is bounded by the chunk size, not the table size)
+- Tables without foreign-key dependencies on each other load in parallel
+- Progress is recorded per table in a state file; re-running resumes
+  from the first table that did not complete
+- Row counts and order-independent checksums are verified at the end
+- Target tables are only cleared (``TRUNCATE ... CASCADE``) with ``--truncate``;
+  otherwise the migration refuses to load into tables that already have rows
+- Legacy ``agent_sessions.initial_input/final_output/tools_called`` become
+  ``agent_session_payloads`` rows; other SQLite columns missing in PostgreSQL
+  abort the migration when they hold data, unless ``--allow-drop`` is given
+
+Usage:
+    python migrate_sqlite_to_postgres.py [--sqlite casualtrader.db] [--jobs 4]
+    python migrate_sqlite_to_postgres.py --fresh --truncate  # 重新開始，清空目標資料表
+    python migrate_sqlite_to_postgres.py --verify-only       # 只比對筆數與 checksum
+
+Environment Variables:
+    POSTGRES_HOST: PostgreSQL host (default: localhost)
+    POSTGRES_PORT: PostgreSQL port (default: 5432)
+    POSTGRES_USER: PostgreSQL user (default: cstrader_user)
+    POSTGRES_PASSWORD: PostgreSQL password (no default; may be set in .env,
+        or left unset to use ~/.pgpass / PGPASSWORD)
+    POSTGRES_DB: PostgreSQL database name (default: cstrader)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+
+
+# ============================================
+# Configuration
+# ============================================
+
+# Load environment variables
+load_dotenv()
+
+# Source (SQLite)
+SQLITE_DB_PATH = Path(__file__).parent / "casualtrader.db"
+
+# Target (PostgreSQL)
+POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
+POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
+POSTGRES_USER = os.getenv("POSTGRES_USER", "cstrader_user")
+POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
+POSTGRES_DB = os.getenv("POSTGRES_DB", "cstrader")
+
+# Migration configuration
+CHUNK_SIZE = 5000  # Rows fetched from SQLite per round-trip
+DEFAULT_JOBS = 4  # Tables migrated in parallel
+PROGRESS_EVERY = 50_000  # Log progress every N rows per table
+
+# 舊版 agent_sessions 內嵌的大型內容；PostgreSQL 已改存於 agent_session_payloads
+SESSION_PAYLOAD_COLUMNS = ("initial_input", "final_output", "tools_called")
+
+_CHECKSUM_MODULUS = 1 << 128
+_print_lock = threading.Lock()
+
+
+# ============================================
+# Logging Functions
+# ============================================
+
+
+def _log(prefix: str, msg: str, stream=None) -> None:
+    with _print_lock:
+        print(f"{prefix} {datetime.now().strftime('%H:%M:%S')} {msg}", file=stream or sys.stdout)
+
+
+def log_info(msg: str) -> None:
+    """Log info message"""
+    _log("[INFO]", msg)
+
+
+def log_success(msg: str) -> None:
+    """Log success message"""
+    _log("[✓]", msg)
+
+
+def log_error(msg: str) -> None:
+    """Log error message"""
+    _log("[✗]", msg, sys.stderr)
+
+
+def log_warning(msg: str) -> None:
+    """Log warning message"""
+    _log("[⚠]", msg)
+
+
+# ============================================
+# Database Connection Functions
+# ============================================
+
+
+def postgres_params() -> dict[str, str]:
+    """PostgreSQL connection parameters from the environment"""
+    params = {
+        "host": POSTGRES_HOST,
+        "port": POSTGRES_PORT,
+        "user": POSTGRES_USER,
+        "database": POSTGRES_DB,
+    }
+    # 未設定密碼時交給 libpq（~/.pgpass、PGPASSWORD 或 trust 驗證）
+    if POSTGRES_PASSWORD:
+        params["password"] = POSTGRES_PASSWORD
+    return params
+
+
+def connect_sqlite(db_path: Path) -> sqlite3.Connection:
+    """Connect to SQLite database (read-only)"""
+    # 唯讀開啟；每個工作執行緒使用自己的連線
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+
+
+def connect_postgres(params: dict[str, str]):
+    """Connect to PostgreSQL database"""
+    import psycopg2
+
+    conn = psycopg2.connect(**params)
+    with conn.cursor() as cursor:
+        # SQLite 儲存的是不含時區的 UTC 時間
+        cursor.execute("SET TIME ZONE 'UTC'")
+    conn.commit()
+    return conn
+
+
+# ============================================
+# Schema Functions
+# ============================================
+
+
+@dataclass
+class ColumnInfo:
+    """SQLite column definition"""
+
+    name: str
+    type: str
+
+    @property
+    def base_type(self) -> str:
+        """Declared type without length/precision, e.g. NUMERIC(15, 2) -> NUMERIC"""
+        return self.type.split("(", 1)[0].strip().upper()
+
+    @property
+    def scale(self) -> int | None:
+        """Declared numeric scale, e.g. NUMERIC(15, 2) -> 2"""
+        match = re.search(r"\(\s*\d+\s*,\s*(\d+)\s*\)", self.type)
+        return int(match.group(1)) if match else None
+
+
+def get_sqlite_tables(sqlite_conn: sqlite3.Connection) -> list[str]:
+    """Get list of tables from SQLite database"""
+    cursor = sqlite_conn.cursor()
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name;"
+    )
+    tables = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return tables
+
+
+def get_table_schema(sqlite_conn: sqlite3.Connection, table_name: str) -> list[ColumnInfo]:
+    """Get table columns from SQLite"""
+    cursor = sqlite_conn.cursor()
+    cursor.execute(f'PRAGMA table_info("{table_name}")')
+    schema = [ColumnInfo(name=row[1], type=row[2] or "") for row in cursor.fetchall()]
+    cursor.close()
+    return schema
+
+
+def get_table_dependencies(sqlite_conn: sqlite3.Connection, table_name: str) -> set[str]:
+    """Get tables referenced by foreign keys of a SQLite table"""
+    cursor = sqlite_conn.cursor()
+    cursor.execute(f'PRAGMA foreign_key_list("{table_name}")')
+    deps = {row[2] for row in cursor.fetchall()}
+    cursor.close()
+    deps.discard(table_name)
+    return deps
+
+
+def plan_levels(dependencies: dict[str, set[str]]) -> list[list[str]]:
+    """
+    Group tables into levels that can be migrated in parallel
+
+    A table is placed after every table it references. Tables in the same
+    level do not depend on each other.
+    """
+    remaining = {table: deps & dependencies.keys() for table, deps in dependencies.items()}
+    levels: list[list[str]] = []
+    done: set[str] = set()
+
+    while remaining:
+        level = sorted(t for t, deps in remaining.items() if deps <= done)
+        if not level:
+            # 循環參照：剩餘資料表放在同一層（需由目標端延遲檢查外鍵）
+            log_warning(f"Circular foreign keys between: {', '.join(sorted(remaining))}")
+            levels.append(sorted(remaining))
+            break
+        levels.append(level)
+        done.update(level)
+        for table in level:
+            del remaining[table]
+
+    return levels
+
+
+def get_postgres_columns(postgres_conn, table_name: str) -> set[str]:
+    """Get column names of a PostgreSQL table (empty if the table does not exist)"""
+    with postgres_conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND table_name = %s",
+            (table_name,),
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+# ============================================
+# Value Conversion
+# ============================================
+
+
+def convert_sqlite_value(value: Any, column: ColumnInfo) -> Any:
+    """Convert SQLite value to PostgreSQL compatible value"""
+    if value is None:
+        return None
+
+    base_type = column.base_type
+
+    # SQLite doesn't have native boolean, so check for 0/1 or True/False
+    if base_type in ("BOOLEAN", "BOOL"):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "t", "true")
+        return bool(value)
+
+    # Handle numeric/decimal conversion（依宣告的 scale 四捨五入，與 PostgreSQL 一致）
+    if base_type in ("NUMERIC", "DECIMAL"):
+        number = Decimal(value) if isinstance(value, str) else Decimal(str(value))
+        scale = column.scale
+        if scale is not None:
+            number = number.quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+        return number
+
+    if base_type in ("DATETIME", "TIMESTAMP") and isinstance(value, str):
+        return datetime.fromisoformat(value)
+
+    if base_type == "DATE" and isinstance(value, str):
+        return date.fromisoformat(value)
+
+    # JSON fields are stored as TEXT in SQLite
+    if base_type == "JSON" and isinstance(value, str):
+        return json.loads(value)
+
+    return value
+
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def encode_copy_value(value: Any) -> str:
+    """Encode a converted value for COPY text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, bytes | memoryview):
+        return "\\\\x" + bytes(value).hex()
+    if isinstance(value, dict | list):
+        value = json.dumps(value, ensure_ascii=False)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def normalize_value(value: Any) -> str:
+    """Canonical text form of a value, identical for SQLite and PostgreSQL rows"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, Decimal | float):
+        normalized = Decimal(str(value)).normalize()
+        return "0" if normalized.is_zero() else format(normalized, "f")
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, dict | list):
+        return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    if isinstance(value, bytes | memoryview):
+        return bytes(value).hex()
+    return str(value)
+
+
+@dataclass
+class TableChecksum:
+    """Order-independent table checksum (sum of per-row SHA-256 digests)"""
+
+    rows: int = 0
+    total: int = 0
+
+    def add(self, values: Iterable[Any]) -> None:
+        payload = "\x1f".join(normalize_value(v) for v in values).encode("utf-8")
+        digest = hashlib.sha256(payload).digest()
+        self.total = (self.total + int.from_bytes(digest[:16], "big")) % _CHECKSUM_MODULUS
+        self.rows += 1
+
+    @property
+    def hexdigest(self) -> str:
+        return f"{self.total:032x}"
+
+
+# ============================================
+# Streaming
+# ============================================
+
+
+def iter_sqlite_rows(
+    sqlite_conn: sqlite3.Connection,
+    table_name: str,
+    columns: list[ColumnInfo],
+    chunk_size: int,
+) -> Iterator[tuple]:
+    """Stream converted rows from SQLite in chunks"""
+    columns_str = ", ".join(f'"{c.name}"' for c in columns)
+    cursor = sqlite_conn.cursor()
+    cursor.execute(f'SELECT {columns_str} FROM "{table_name}"')
+    try:
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            for row in chunk:
+                yield tuple(convert_sqlite_value(v, c) for v, c in zip(row, columns, strict=True))
+    finally:
+        cursor.close()
+
+
+class CopyStream:
+    """File-like object feeding COPY FROM STDIN from a row iterator"""
+
+    def __init__(self, rows: Iterator[tuple], on_row=None):
+        self._rows = rows
+        self._on_row = on_row
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            if self._on_row is not None:
+                self._on_row(row)
+            line = "\t".join(encode_copy_value(v) for v in row) + "\n"
+            self._buffer += line.encode("utf-8")
+
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+
+# ============================================
+# Migration State
+# ============================================
+
+
+class MigrationState:
+    """Per-table progress, persisted as JSON for resuming"""
+
+    def __init__(self, path: Path, source: str, target: str):
+        self.path = path
+        self.source = source
+        self.target = target
+        self.tables: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path, source: str, target: str) -> MigrationState:
+        state = cls(path, source, target)
+        if path.exists():
+            data = json.loads(path.read_text())
+            if data.get("source") != source or data.get("target") != target:
+                raise ValueError(
+                    f"State file {path} belongs to another migration "
+                    f"({data.get('source')} -> {data.get('target')}); use --fresh"
+                )
+            state.tables = data.get("tables", {})
+        return state
+
+    def is_completed(self, table: str) -> bool:
+        return self.tables.get(table, {}).get("status") == "completed"
+
+    def mark_completed(self, table: str, checksum: TableChecksum) -> None:
+        with self._lock:
+            self.tables[table] = {
+                "status": "completed",
+                "rows": checksum.rows,
+                "checksum": checksum.hexdigest,
+                "finished_at": datetime.now(UTC).isoformat(),
+            }
+            self._save()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.tables = {}
+            self._save()
+
+    def _save(self) -> None:
+        data = {"source": self.source, "target": self.target, "tables": self.tables}
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+        tmp.replace(self.path)
+
+
+# ============================================
+# Migration Functions
+# ============================================
+
+
+@dataclass
+class TablePlan:
+    """Columns to copy for one table"""
+
+    name: str
+    columns: list[ColumnInfo]
+    skipped_columns: list[str] = field(default_factory=list)
+    # agent_sessions 舊欄位，搬移時轉為 agent_session_payloads 資料列
+    payload_columns: list[ColumnInfo] = field(default_factory=list)
+
+
+def build_table_plan(sqlite_conn, postgres_conn, table_name: str) -> TablePlan | None:
+    """Match SQLite columns with the PostgreSQL table"""
+    target_columns = get_postgres_columns(postgres_conn, table_name)
+    if not target_columns:
+        log_warning(f"Table {table_name} does not exist in PostgreSQL, skipping...")
+        return None
+
+    schema = get_table_schema(sqlite_conn, table_name)
+    columns = [c for c in schema if c.name in target_columns]
+    missing = [c for c in schema if c.name not in target_columns]
+    payload_columns: list[ColumnInfo] = []
+    if table_name == "agent_sessions" and get_postgres_columns(
+        postgres_conn, "agent_session_payloads"
+    ):
+        payload_columns = [c for c in missing if c.name in SESSION_PAYLOAD_COLUMNS]
+        if payload_columns:
+            names = ", ".join(c.name for c in payload_columns)
+            log_info(f"Table {table_name}: {names} will be moved into agent_session_payloads")
+    skipped = [c.name for c in missing if c not in payload_columns]
+    if skipped:
+        log_warning(f"Table {table_name}: columns not in PostgreSQL, skipped: {', '.join(skipped)}")
+    if not columns:
+        log_warning(f"Table {table_name} has no matching columns, skipping...")
+        return None
+    return TablePlan(
+        name=table_name,
+        columns=columns,
+        skipped_columns=skipped,
+        payload_columns=payload_columns,
+    )
+
+
+def columns_with_data(
+    sqlite_conn: sqlite3.Connection, table_name: str, columns: list[str]
+) -> list[str]:
+    """Columns that hold at least one non-NULL value"""
+    cursor = sqlite_conn.cursor()
+    try:
+        return [
+            column
+            for column in columns
+            if cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM "{table_name}" WHERE "{column}" IS NOT NULL)'
+            ).fetchone()[0]
+        ]
+    finally:
+        cursor.close()
+
+
+def iter_session_payloads(
+    sqlite_conn: sqlite3.Connection,
+    payload_columns: list[ColumnInfo],
+    chunk_size: int,
+) -> Iterator[tuple]:
+    """
+    Build agent_session_payloads rows from the legacy agent_sessions columns
+
+    Same document as scripts/postgres/migrations/20261018_1200_move_session_payloads.sql
+    (codec raw, uncompressed JSON). Sessions that already have a payload in SQLite are
+    left to the agent_session_payloads table itself.
+    """
+    timestamps = [ColumnInfo("created_at", "DATETIME"), ColumnInfo("updated_at", "DATETIME")]
+    selected = ", ".join(f'"{c.name}"' for c in payload_columns)
+    condition = " OR ".join(f'"{c.name}" IS NOT NULL' for c in payload_columns)
+    sql = f"SELECT id, created_at, updated_at, {selected} FROM agent_sessions WHERE ({condition})"
+    if "agent_session_payloads" in get_sqlite_tables(sqlite_conn):
+        sql += " AND id NOT IN (SELECT session_id FROM agent_session_payloads)"
+
+    cursor = sqlite_conn.cursor()
+    cursor.execute(sql)
+    try:
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            for session_id, created_at, updated_at, *values in chunk:
+                document = dict.fromkeys(SESSION_PAYLOAD_COLUMNS)
+                for column, value in zip(payload_columns, values, strict=True):
+                    document[column.name] = convert_sqlite_value(value, column)
+                data = json.dumps(document, ensure_ascii=False, default=str).encode("utf-8")
+                created, updated = (
+                    convert_sqlite_value(v, c)
+                    for v, c in zip((created_at, updated_at), timestamps, strict=True)
+                )
+                yield (session_id, "raw", data, len(data), created, updated)
+    finally:
+        cursor.close()
+
+
+def reset_sequences(postgres_conn, table_name: str, columns: list[ColumnInfo]) -> None:
+    """Move serial/identity sequences past the migrated ids"""
+    with postgres_conn.cursor() as cursor:
+        for column in columns:
+            cursor.execute("SELECT pg_get_serial_sequence(%s, %s)", (table_name, column.name))
+            sequence = cursor.fetchone()[0]
+            if sequence:
+                cursor.execute(
+                    f'SELECT setval(%s, COALESCE((SELECT MAX("{column.name}") FROM "{table_name}"), 0) + 1, false)',
+                    (sequence,),
+                )
+
+
+def migrate_table(
+    sqlite_path: Path,
+    pg_params: dict[str, str],
+    plan: TablePlan,
+    chunk_size: int,
+) -> TableChecksum:
+    """Stream one table into PostgreSQL with COPY (single transaction)"""
+    log_info(f"Migrating table: {plan.name}")
+
+    sqlite_conn = connect_sqlite(sqlite_path)
+    postgres_conn = connect_postgres(pg_params)
+    checksum = TableChecksum()
+
+    def on_row(row: tuple) -> None:
+        checksum.add(row)
+        if checksum.rows % PROGRESS_EVERY == 0:
+            log_info(f"  {plan.name}: {checksum.rows:,} rows")
+
+    try:
+        rows = iter_sqlite_rows(sqlite_conn, plan.name, plan.columns, chunk_size)
+        columns_str = ", ".join(f'"{c.name}"' for c in plan.columns)
+        with postgres_conn.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY "{plan.name}" ({columns_str}) FROM STDIN',
+                CopyStream(rows, on_row=on_row),
+                size=1 << 16,
+            )
+            if plan.payload_columns:
+                # 與 agent_sessions 同一交易：續傳時兩者一起完成或一起重來
+                payloads = TableChecksum()
+                cursor.copy_expert(
+                    "COPY agent_session_payloads "
+                    "(session_id, codec, data, raw_size, created_at, updated_at) FROM STDIN",
+                    CopyStream(
+                        iter_session_payloads(sqlite_conn, plan.payload_columns, chunk_size),
+                        on_row=payloads.add,
+                    ),
+                    size=1 << 16,
+                )
+                log_info(
+                    f"  {plan.name}: {payloads.rows:,} payloads moved to agent_session_payloads"
+                )
+        reset_sequences(postgres_conn, plan.name, plan.columns)
+        postgres_conn.commit()
+    except Exception:
+        postgres_conn.rollback()
+        raise
+    finally:
+        postgres_conn.close()
+        sqlite_conn.close()
+
+    log_success(f"Table {plan.name}: {checksum.rows:,} rows migrated")
+    return checksum
+
+
+def non_empty_postgres_tables(postgres_conn, tables: list[str]) -> list[str]:
+    """Target tables that already contain rows"""
+    non_empty = []
+    with postgres_conn.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM "{table}")')
+            if cursor.fetchone()[0]:
+                non_empty.append(table)
+    postgres_conn.commit()
+    return non_empty
+
+
+def truncate_postgres_tables(postgres_conn, tables: list[str]) -> None:
+    """Clear target tables before (re)loading them"""
+    if not tables:
+        return
+    tables_str = ", ".join(f'"{t}"' for t in tables)
+    with postgres_conn.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {tables_str} CASCADE")
+    postgres_conn.commit()
+    log_info(f"Cleared PostgreSQL tables: {', '.join(tables)}")
+
+
+def sqlite_checksum(sqlite_path: Path, plan: TablePlan, chunk_size: int) -> TableChecksum:
+    """Checksum of the source table"""
+    sqlite_conn = connect_sqlite(sqlite_path)
+    try:
+        checksum = TableChecksum()
+        for row in iter_sqlite_rows(sqlite_conn, plan.name, plan.columns, chunk_size):
+            checksum.add(row)
+        return checksum
+    finally:
+        sqlite_conn.close()
+
+
+def postgres_checksum(pg_params: dict[str, str], plan: TablePlan, chunk_size: int) -> TableChecksum:
+    """Checksum of the target table (server-side cursor)"""
+    postgres_conn = connect_postgres(pg_params)
+    try:
+        checksum = TableChecksum()
+        columns_str = ", ".join(f'"{c.name}"' for c in plan.columns)
+        with postgres_conn.cursor(name=f"verify_{plan.name}") as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(f'SELECT {columns_str} FROM "{plan.name}"')
+            for row in cursor:
+                checksum.add(row)
+        return checksum
+    finally:
+        postgres_conn.close()
+
+
+def verify_tables(
+    sqlite_path: Path,
+    pg_params: dict[str, str],
+    plans: list[TablePlan],
+    chunk_size: int,
+    jobs: int,
+) -> bool:
+    """Compare row counts and checksums of source and target"""
+    log_info("Verifying row counts and checksums...")
+
+    def verify(plan: TablePlan) -> tuple[TablePlan, TableChecksum, TableChecksum]:
+        return (
+            plan,
+            sqlite_checksum(sqlite_path, plan, chunk_size),
+            postgres_checksum(pg_params, plan, chunk_size),
+        )
+
+    ok = True
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for plan, source, target in executor.map(verify, plans):
+            if source.rows != target.rows:
+                ok = False
+                log_error(f"{plan.name}: row count mismatch ({source.rows:,} → {target.rows:,})")
+            elif source.total != target.total:
+                ok = False
+                log_error(
+                    f"{plan.name}: checksum mismatch ({source.hexdigest} → {target.hexdigest})"
+                )
+            else:
+                log_success(f"{plan.name}: {source.rows:,} rows, checksum {source.hexdigest[:12]}")
+    return ok
+
+
+# ============================================
+# Main Migration Function
+# ============================================
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Stream CasualTrader data from SQLite to PostgreSQL"
+    )
+    parser.add_argument("--sqlite", type=Path, default=SQLITE_DB_PATH, help="SQLite database path")
+    parser.add_argument("--tables", nargs="+", help="Only migrate these tables")
+    parser.add_argument(
+        "--jobs", type=int, default=DEFAULT_JOBS, help="Tables migrated in parallel"
+    )
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per SQLite fetch")
+    parser.add_argument(
+        "--state-file", type=Path, help="Progress file (default: <sqlite>.migration.json)"
+    )
+    parser.add_argument("--fresh", action="store_true", help="Ignore saved progress and reload all")
+    parser.add_argument("--verify-only", action="store_true", help="Only verify counts/checksums")
+    parser.add_argument("--no-verify", action="store_true", help="Skip the final verification")
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Clear pending target tables first (TRUNCATE ... CASCADE)",
+    )
+    parser.add_argument(
+        "--allow-drop",
+        action="store_true",
+        help="Migrate even if SQLite columns missing in PostgreSQL hold data (data is lost)",
+    )
+    parser.add_argument("--yes", "-y", action="store_true", help="Do not ask for confirmation")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main migration function"""
+    args = parse_args(argv)
+    pg_params = postgres_params()
+    target = f"postgresql://{POSTGRES_USER}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    state_path = args.state_file or args.sqlite.with_suffix(".migration.json")
+
+    print("\n" + "=" * 60)
+    print("SQLite to PostgreSQL Migration")
+    print("=" * 60)
+    print(f"Source:      {args.sqlite}")
+    print(f"Target:      {target}")
+    print(f"State file:  {state_path}")
+    print("=" * 60 + "\n")
+
+    # Check source database exists
+    if not args.sqlite.exists():
+        log_error(f"SQLite database not found: {args.sqlite}")
+        return 1
+
+    try:
+        sqlite_conn = connect_sqlite(args.sqlite)
+        postgres_conn = connect_postgres(pg_params)
+        log_success("Connected to SQLite and PostgreSQL")
+
+        tables = get_sqlite_tables(sqlite_conn)
+        if args.tables:
+            unknown = set(args.tables) - set(tables)
+            if unknown:
+                log_error(f"Tables not found in SQLite: {', '.join(sorted(unknown))}")
+                return 1
+            tables = [t for t in tables if t in args.tables]
+
+        plans: dict[str, TablePlan] = {}
+        for table in tables:
+            plan = build_table_plan(sqlite_conn, postgres_conn, table)
+            if plan is not None:
+                plans[table] = plan
+
+        if not plans:
+            log_warning("No tables found to migrate")
+            return 0
+
+        if not args.verify_only and not args.allow_drop:
+            # PostgreSQL 沒有對應欄位的資料不可默默丟棄
+            lossy = [
+                f"{table}.{column}"
+                for table, plan in plans.items()
+                for column in columns_with_data(sqlite_conn, table, plan.skipped_columns)
+            ]
+            if lossy:
+                log_error(
+                    f"Columns missing in PostgreSQL still hold data: {', '.join(lossy)}; "
+                    "upgrade the PostgreSQL schema or re-run with --allow-drop to discard them"
+                )
+                return 1
+
+        # 依外鍵分層：同一層的資料表彼此獨立，可平行搬移
+        levels = plan_levels(
+            {t: get_table_dependencies(sqlite_conn, t) & plans.keys() for t in plans}
+        )
+        sqlite_conn.close()
+
+        if not args.verify_only:
+            source = str(args.sqlite.resolve())
+            if args.fresh:
+                state = MigrationState(state_path, source, target)
+                state.reset()
+            else:
+                state = MigrationState.load(state_path, source, target)
+
+            pending = [t for level in levels for t in level if not state.is_completed(t)]
+            completed = [t for t in plans if t not in pending]
+            print(f"Found {len(plans)} tables, {len(levels)} dependency levels")
+            for i, level in enumerate(levels, 1):
+                print(f"  Level {i}: {', '.join(level)}")
+            if completed:
+                print(f"Already completed (skipped): {', '.join(completed)}")
+            print()
+
+            if pending:
+                if not args.truncate:
+                    # 不自動清空：目標已有資料時要求明確指定 --truncate
+                    non_empty = non_empty_postgres_tables(postgres_conn, pending)
+                    if non_empty:
+                        log_error(
+                            f"PostgreSQL tables already contain data: {', '.join(non_empty)}; "
+                            "re-run with --truncate to clear them (TRUNCATE ... CASCADE)"
+                        )
+                        return 1
+
+                if not args.yes:
+                    prompt = (
+                        f"Clear {len(pending)} PostgreSQL table(s) (TRUNCATE ... CASCADE) "
+                        "and migrate them? (yes/no): "
+                        if args.truncate
+                        else f"Migrate {len(pending)} PostgreSQL table(s)? (yes/no): "
+                    )
+                    response = input(prompt)
+                    if response.lower() not in ("yes", "y"):
+                        log_info("Migration cancelled by user")
+                        return 0
+
+                if args.truncate:
+                    truncate_postgres_tables(postgres_conn, pending)
+
+                for level in levels:
+                    level_pending = [t for t in level if t in pending]
+                    if not level_pending:
+                        continue
+                    failed = False
+                    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+                        futures = {
+                            executor.submit(
+                                migrate_table, args.sqlite, pg_params, plans[t], args.chunk_size
+                            ): t
+                            for t in level_pending
+                        }
+                        for future in as_completed(futures):
+                            table = futures[future]
+                            try:
+                                state.mark_completed(table, future.result())
+                            except Exception as e:
+                                failed = True
+                                log_error(f"Error migrating table {table}: {e}")
+                    if failed:
+                        # 子資料表依賴本層，停止後續層級；重新執行即可續傳
+                        log_error("Migration stopped; re-run to resume from unfinished tables")
+                        return 1
+
+            total_rows = sum(state.tables[t]["rows"] for t in plans if state.is_completed(t))
+            log_success(f"Migration completed! Total rows: {total_rows:,}")
+
+        postgres_conn.close()
+
+        if args.no_verify:
+            return 0
+        ordered = [plans[t] for level in levels for t in level]
+        if not verify_tables(args.sqlite, pg_params, ordered, args.chunk_size, max(1, args.jobs)):
+            log_error("Verification failed")
+            return 1
+        log_success("Verification passed")
+        return 0
+
+    except Exception as e:
+        log_error(f"Migration failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
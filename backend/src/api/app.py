@@ -4,32 +4,139 @@ FastAPI Application Factory
 Main application instance and configuration.
 """
 
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, Iterable
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
-from common.logger import logger, setup_logger
+from common.logger import get_log_stats, logger, setup_logger
+from common.metrics import CONTENT_TYPE, HTTP_REQUEST_SECONDS, Sample, registry
 from service.agent_executor import AgentExecutor
-from api.config import settings, get_engine
+from service.agent_purge_service import agent_purge_service
+from service.fundamentals_warmup_service import (
+    fundamentals_warmup_service,
+    get_warmup_interval,
+)
+from service.indicator_snapshot_service import get_snapshot_time, indicator_snapshot_service
+from api.config import (
+    settings,
+    get_engine,
+    get_pool_stats,
+    get_sqlite_write_queue,
+    start_sqlite_write_queue,
+    stop_sqlite_write_queue,
+)
 from api.docs import get_openapi_tags
-from api.routers import agent_execution, agents, ai_models, trading, websocket_router
+from api.routers import agent_execution, agents, ai_models, profiling, trading, websocket_router
+from api.routers.agents import broadcast_purge_progress
 from api.websocket import websocket_manager
 from api import dependencies
 from database.init import ensure_tables_exist
 
 
+def _collect_pool_connections() -> Iterable[Sample]:
+    for pool, stats in get_pool_stats().items():
+        for state in ("checked_out", "overflow"):
+            yield "casualtrader_db_pool_connections", {"pool": pool, "state": state}, stats[state]
+
+
+def _collect_pool_size() -> Iterable[Sample]:
+    for pool, stats in get_pool_stats().items():
+        yield "casualtrader_db_pool_size", {"pool": pool}, stats["size"]
+
+
+def _collect_sqlite_write_queue() -> Iterable[Sample]:
+    queue = get_sqlite_write_queue()
+    if queue is not None:
+        yield "casualtrader_sqlite_write_queue_depth", {}, queue.queue_depth
+
+
+def _websocket_gauge(key: str):
+    def collect() -> Iterable[Sample]:
+        yield f"casualtrader_websocket_{key}", {}, websocket_manager.get_metrics()[key]
+
+    return collect
+
+
+def _collect_websocket_dropped() -> Iterable[Sample]:
+    dropped = websocket_manager.get_metrics()["messages_dropped"]
+    yield "casualtrader_websocket_messages_dropped_total", {}, dropped
+
+
+def _collect_dropped_logs() -> Iterable[Sample]:
+    stats = get_log_stats()
+    for rule, dropped in stats["dropped"].items():
+        yield "casualtrader_log_records_dropped_total", {"reason": "sampled", "rule": rule}, dropped
+    yield (
+        "casualtrader_log_records_dropped_total",
+        {"reason": "backlog", "rule": ""},
+        stats["backlog_dropped"],
+    )
+
+
+def register_metric_collectors() -> None:
+    """Register scrape-time collectors for pool, queue and WebSocket state."""
+    registry.register_collector(
+        "casualtrader_db_pool_connections",
+        "Database connections by pool and state (checked_out / overflow)",
+        _collect_pool_connections,
+    )
+    registry.register_collector(
+        "casualtrader_db_pool_size", "Configured database pool size", _collect_pool_size
+    )
+    registry.register_collector(
+        "casualtrader_sqlite_write_queue_depth",
+        "Writes waiting in the SQLite single-writer queue",
+        _collect_sqlite_write_queue,
+    )
+    registry.register_collector(
+        "casualtrader_websocket_connections",
+        "Open WebSocket connections",
+        _websocket_gauge("connections"),
+    )
+    registry.register_collector(
+        "casualtrader_websocket_queue_depth_total",
+        "Messages queued across all WebSocket send queues",
+        _websocket_gauge("queue_depth_total"),
+    )
+    registry.register_collector(
+        "casualtrader_websocket_queue_depth_max",
+        "Deepest WebSocket send queue",
+        _websocket_gauge("queue_depth_max"),
+    )
+    registry.register_collector(
+        "casualtrader_websocket_messages_dropped",
+        "Messages dropped for slow WebSocket consumers",
+        _collect_websocket_dropped,
+        type_name="counter",
+    )
+    registry.register_collector(
+        "casualtrader_log_records_dropped",
+        "Log records dropped by sampling / rate limits or a full console backlog",
+        _collect_dropped_logs,
+        type_name="counter",
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager."""
     # Setup logger first
     log_level = "DEBUG" if settings.debug else "INFO"
     log_file = Path(__file__).parent.parent.parent / "logs" / "casualtrader.log"
-    setup_logger(log_level=log_level, log_file=log_file)
+    setup_logger(
+        log_level=log_level,
+        log_file=log_file,
+        json_file=settings.log_json_file,
+        enqueue=settings.log_enqueue,
+        sampling=settings.log_sampling,
+        rate_limits=settings.log_rate_limit,
+    )
 
     # Startup
     logger.info("=" * 80)
@@ -70,6 +177,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.error(f" ✗\n     Error: {e}")
         raise
 
+    # SQLite single-writer queue (only for the SQLite profile)
+    if settings.is_sqlite:
+        try:
+            logger.info("   • SQLite Writer... ", end="")
+            await start_sqlite_write_queue()
+            logger.success(" ✓")
+        except Exception as e:
+            logger.error(f" ✗\n     Error: {e}")
+            raise
+
     # WebSocket Manager
     try:
         logger.info("   • WebSocket Manager... ", end="")
@@ -79,6 +196,36 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.error(f" ✗\n     Error: {e}")
         raise
 
+    # Agent Purge (resume purges interrupted by the last shutdown)
+    try:
+        logger.info("   • Agent Purge... ", end="")
+        await agent_purge_service.resume_pending(on_progress=broadcast_purge_progress)
+        logger.success(" ✓")
+    except Exception as e:
+        logger.error(f" ✗\n     Error: {e}")
+
+    # Fundamentals cache warm-up (opt-in)
+    warmup_interval = get_warmup_interval()
+    if warmup_interval > 0:
+        try:
+            logger.info("   • Fundamentals Warm-up... ", end="")
+            fundamentals_warmup_service.start(warmup_interval)
+            logger.success(" ✓")
+        except Exception as e:
+            logger.error(f" ✗\n     Error: {e}")
+
+    # End-of-day indicator snapshots (opt-in)
+    snapshot_time = None
+    try:
+        # 格式錯誤的 INDICATOR_SNAPSHOT_TIME 只停用快照，不影響啟動
+        snapshot_time = get_snapshot_time()
+        if snapshot_time is not None:
+            logger.info("   • Indicator Snapshots... ", end="")
+            indicator_snapshot_service.start(snapshot_time)
+            logger.success(" ✓")
+    except Exception as e:
+        logger.error(f"   • Indicator Snapshots disabled ✗\n     Error: {e}")
+
     # Agent Executor
     try:
         logger.info("   • Agent Executor... ", end="")
@@ -114,6 +261,32 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f" ✗\n     Error: {e}")
 
+    # Pause background purges (resumed on next startup)
+    try:
+        logger.info("   • Pausing agent purges... ", end="")
+        await agent_purge_service.shutdown()
+        logger.success(" ✓")
+    except Exception as e:
+        logger.error(f" ✗\n     Error: {e}")
+
+    # Stop fundamentals warm-up
+    if warmup_interval > 0:
+        try:
+            logger.info("   • Stopping fundamentals warm-up... ", end="")
+            await fundamentals_warmup_service.shutdown()
+            logger.success(" ✓")
+        except Exception as e:
+            logger.error(f" ✗\n     Error: {e}")
+
+    # Stop indicator snapshots
+    if snapshot_time is not None:
+        try:
+            logger.info("   • Stopping indicator snapshots... ", end="")
+            await indicator_snapshot_service.shutdown()
+            logger.success(" ✓")
+        except Exception as e:
+            logger.error(f" ✗\n     Error: {e}")
+
     # Close WebSocket connections
     try:
         logger.info("   • Closing WebSocket connections... ", end="")
@@ -122,6 +295,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f" ✗\n     Error: {e}")
 
+    # Flush pending SQLite writes
+    if settings.is_sqlite:
+        try:
+            logger.info("   • Flushing SQLite writer... ", end="")
+            await stop_sqlite_write_queue()
+            logger.success(" ✓")
+        except Exception as e:
+            logger.error(f" ✗\n     Error: {e}")
+
     logger.info("")
     logger.info("=" * 80)
     logger.success("✅ Server shut down successfully!")
@@ -222,6 +404,24 @@ def create_app() -> FastAPI:
             logger.error(log_msg)
             raise
 
+    # Request latency by route template (bounded label cardinality)
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        """Observe HTTP latency into casualtrader_http_request_duration_seconds."""
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method=request.method,
+                route=getattr(route, "path", None) or "unmatched",
+                status=str(status_code),
+            ).observe(time.perf_counter() - started)
+
     # Global exception handler
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
@@ -256,6 +456,7 @@ def create_app() -> FastAPI:
     )
     app.include_router(ai_models.router, prefix="/api")
     app.include_router(websocket_router.router, tags=["websocket"])
+    app.include_router(profiling.router, prefix="/api/admin/profiler", tags=["admin"])
 
     logger.success("   ✓ All API routes registered")
 
@@ -276,6 +477,25 @@ def create_app() -> FastAPI:
             "debug": settings.debug,
         }
 
+    # Prometheus metrics (must be before static files mounting)
+    register_metric_collectors()
+
+    @app.get(
+        "/metrics",
+        tags=["system"],
+        summary="Prometheus 指標",
+        include_in_schema=False,
+        dependencies=[Depends(profiling.require_admin)],
+    )
+    async def metrics():
+        """
+        Prometheus 指標端點
+
+        以 Prometheus 文字格式返回延遲分布、計數與連線池 / 佇列狀態，不依賴外部服務。
+        指標含路由、Agent 與連線狀態，與管理端點相同需 X-Admin-Token；未設定 ADMIN_TOKEN 時回傳 404。
+        """
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
     # Static files (for frontend)
     # NOTE: Must be mounted AFTER all API routes to avoid catching API requests
     logger.info("📁 Setting up static files...")
@@ -6,11 +6,14 @@ Load and manage environment variables for the API server.
 
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
+from fastapi import Request
 from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from database.read_routing import recent_agent_writes
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -67,6 +70,21 @@ class Settings(BaseSettings):
     log_rotation: str = Field(default="500 MB", description="Log rotation size")
     log_retention: str = Field(default="30 days", description="Log retention period")
     log_compression: str = Field(default="zip", description="Log compression format")
+    log_enqueue: bool = Field(
+        default=True,
+        description="Write console and file logs from background threads (non-blocking)",
+    )
+    log_json_file: str | None = Field(
+        default=None, description="JSON Lines log file path (structured sink, disabled if unset)"
+    )
+    log_sampling: str = Field(
+        default="",
+        description="Per-module sampling ratios below WARNING, e.g. 'service.trading_service=0.1'",
+    )
+    log_rate_limit: str = Field(
+        default="",
+        description="Per-module records per second below WARNING, e.g. 'api.websocket=20'",
+    )
 
     # Database Settings
     database_url: str = Field(
@@ -81,6 +99,31 @@ class Settings(BaseSettings):
         default=3600, description="Database pool recycle time (seconds)"
     )
 
+    # Read Replica Settings
+    database_read_url: str | None = Field(
+        default=None,
+        description="Read replica connection URL (falls back to primary when unset)",
+    )
+    database_read_pool_size: int = Field(default=10, description="Read replica pool size")
+    database_read_max_overflow: int = Field(
+        default=10, description="Read replica max overflow connections"
+    )
+    database_read_after_write_window: float = Field(
+        default=10.0,
+        description="Seconds after a write during which reads for that agent go to primary",
+    )
+
+    # SQLite Single-node Profile (DATABASE_URL=sqlite+aiosqlite:///path.db)
+    sqlite_busy_timeout_ms: int = Field(default=5000, description="SQLite busy_timeout (ms)")
+    sqlite_mmap_size: int = Field(default=268435456, description="SQLite mmap_size (bytes)")
+    sqlite_read_pool_size: int = Field(default=4, description="SQLite read connection pool size")
+    sqlite_write_batch_size: int = Field(
+        default=32, description="Max writes committed together by the SQLite writer"
+    )
+    sqlite_write_batch_window_ms: float = Field(
+        default=5.0, description="SQLite writer batch collection window (ms)"
+    )
+
     # Agent Settings
     max_agents: int = Field(default=10, description="Maximum concurrent agent executions")
     default_ai_model: str = Field(default="gpt-5-mini", description="Default AI model")
@@ -91,16 +134,60 @@ class Settings(BaseSettings):
         description="Default execution timeout for main agent (seconds), applies to all sub-agents",
     )
 
+    # Agent Purge Settings (DELETE /agents/{id} 背景清除)
+    agent_purge_batch_size: int = Field(
+        default=500, description="Rows deleted per short transaction when purging an agent"
+    )
+    agent_purge_throttle_ms: int = Field(
+        default=50, description="Pause between purge batches (ms) to yield to live trades"
+    )
+
     # WebSocket Settings
     ws_heartbeat_interval: int = Field(
         default=30, description="WebSocket heartbeat interval (seconds)"
     )
     ws_max_connections: int = Field(default=100, description="Maximum WebSocket connections")
+    ws_send_queue_size: int = Field(
+        default=256, description="Per-connection outbound WebSocket queue size"
+    )
+    ws_send_timeout: float = Field(
+        default=10.0, description="Seconds before a blocked WebSocket send disconnects the client"
+    )
+    ws_slow_consumer_policy: Literal["disconnect", "drop"] = Field(
+        default="disconnect",
+        description="When a client's queue overflows: disconnect it or drop new messages",
+    )
+    ws_coalesce_window_ms: int = Field(
+        default=250,
+        description="Merge portfolio/performance updates per agent within this window (0 = off)",
+    )
+    ws_event_bus: Literal["memory", "postgres"] = Field(
+        default="memory",
+        description="WebSocket event bus: in-process, or PostgreSQL LISTEN/NOTIFY for multi-worker",
+    )
+    ws_event_bus_url: str | None = Field(
+        default=None, description="PostgreSQL URL for the event bus (defaults to DATABASE_URL)"
+    )
+    ws_event_bus_channel: str = Field(
+        default="casualtrader_ws", description="LISTEN/NOTIFY channel for WebSocket events"
+    )
+    ws_stream_agent_runs: bool = Field(
+        default=True, description="Stream agent run events (text, tool calls) by default"
+    )
+    ws_stream_flush_ms: int = Field(
+        default=100, description="Batch interval for streamed agent run events (ms)"
+    )
 
     # Environment
     environment: str = Field(default="development", description="Environment name")
     debug: bool = Field(default=True, description="Debug mode")
 
+    # Admin Settings
+    admin_token: str | None = Field(
+        default=None,
+        description="Token for admin endpoints and /metrics (X-Admin-Token); unset disables them",
+    )
+
     # MCP Server Settings - Casual Market
     mcp_casual_market_command: str = Field(
         default="uvx", description="MCP Casual Market command (uvx or npx)"
@@ -156,6 +243,22 @@ class Settings(BaseSettings):
                 return [v]
         return v
 
+    @field_validator("log_sampling", "log_rate_limit", mode="after")
+    @classmethod
+    def validate_module_rates(cls, v: str) -> str:
+        """Validate 'module=value,...' log sampling / rate limit specs."""
+        from common.logger import parse_module_rates
+
+        parse_module_rates(v)
+        return v
+
+    @property
+    def is_sqlite(self) -> bool:
+        """Check if the file-based SQLite single-node profile is active."""
+        from database.sqlite import is_file_sqlite_url
+
+        return is_file_sqlite_url(self.database_url)
+
     @property
     def is_production(self) -> bool:
         """Check if running in production environment."""
@@ -168,17 +271,25 @@ class Settings(BaseSettings):
 
     def setup_logging(self) -> None:
         """Configure loguru logger with settings."""
+        import sys
+
         from loguru import logger
 
+        from common.logger import add_json_sink, background_sink, configure_sampling, log_filter
+
         # Remove default handler
         logger.remove()
+        configure_sampling(self.log_sampling, self.log_rate_limit)
 
         # Add console handler
         logger.add(
-            sink=lambda msg: print(msg, end=""),
+            sink=background_sink(sys.stdout)
+            if self.log_enqueue
+            else lambda msg: print(msg, end=""),
             format=self.log_format,
             level=self.log_level,
             colorize=True,
+            filter=log_filter,
         )
 
         # Add file handler if log file is specified
@@ -194,7 +305,18 @@ class Settings(BaseSettings):
                 rotation=self.log_rotation,
                 retention=self.log_retention,
                 compression=self.log_compression,
-                enqueue=True,  # Async logging
+                # 輪轉與壓縮交給 loguru 的背景執行緒，不在 event loop 上執行
+                enqueue=self.log_enqueue,
+                filter=log_filter,
+            )
+
+        if self.log_json_file:
+            add_json_sink(
+                self.log_json_file,
+                self.log_level,
+                self.log_rotation,
+                self.log_retention,
+                enqueue=self.log_enqueue,
             )
 
         logger.info(f"Logging configured: level={self.log_level}, file={self.log_file}")
@@ -209,6 +331,7 @@ def get_settings() -> Settings:
 
 # Global settings instance
 settings = get_settings()
+recent_agent_writes.configure(settings.database_read_after_write_window)
 
 
 # ==========================================
@@ -219,31 +342,83 @@ settings = get_settings()
 _engine = None
 _async_session_maker = None
 
+# Read replica engine and session maker
+_read_engine = None
+_async_read_session_maker = None
+
+# SQLite single-writer queue（僅 SQLite profile 使用）
+_sqlite_write_engine = None
+_sqlite_write_queue = None
+
+
+def _create_engine(url: str, pool_size: int, max_overflow: int, application_name: str):
+    """Create async engine with shared pool and asyncpg settings."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    return create_async_engine(
+        url,
+        echo=settings.database_echo,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        # asyncpg-specific optimizations
+        connect_args={
+            "timeout": 10,  # Connection timeout
+            "command_timeout": 10,  # Command timeout
+            "max_cached_statement_lifetime": 300,  # Cache statements for 5 minutes
+            "max_cacheable_statement_size": 15000,  # Cache statements up to 15KB
+            "server_settings": {
+                "application_name": application_name,
+            },
+        },
+    )
+
+
+def _create_sqlite_engine(
+    url: str,
+    pool_size: int,
+    read_only: bool = False,
+    immediate_transactions: bool = False,
+):
+    """Create async engine for the SQLite single-node profile."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from database.sqlite import apply_sqlite_pragmas
+
+    engine = create_async_engine(
+        url,
+        echo=settings.database_echo,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=settings.database_pool_timeout,
+        connect_args={"timeout": settings.sqlite_busy_timeout_ms / 1000},
+    )
+    apply_sqlite_pragmas(
+        engine,
+        busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+        mmap_size=settings.sqlite_mmap_size,
+        read_only=read_only,
+        immediate_transactions=immediate_transactions,
+    )
+    return engine
+
 
 def get_engine():
     """Get or create database engine."""
     global _engine
+    if _engine is None and settings.is_sqlite:
+        _engine = _create_sqlite_engine(
+            settings.database_url,
+            pool_size=settings.database_pool_size,
+        )
     if _engine is None:
-        from sqlalchemy.ext.asyncio import create_async_engine
-
-        _engine = create_async_engine(
+        _engine = _create_engine(
             settings.database_url,
-            echo=settings.database_echo,
-            pool_pre_ping=True,
             pool_size=settings.database_pool_size,
             max_overflow=settings.database_max_overflow,
-            pool_timeout=settings.database_pool_timeout,
-            pool_recycle=settings.database_pool_recycle,
-            # asyncpg-specific optimizations
-            connect_args={
-                "timeout": 10,  # Connection timeout
-                "command_timeout": 10,  # Command timeout
-                "max_cached_statement_lifetime": 300,  # Cache statements for 5 minutes
-                "max_cacheable_statement_size": 15000,  # Cache statements up to 15KB
-                "server_settings": {
-                    "application_name": "casualtrader_backend",
-                },
-            },
+            application_name="casualtrader_backend",
         )
     return _engine
 
@@ -263,6 +438,140 @@ def get_session_maker():
     return _async_session_maker
 
 
+def get_read_engine():
+    """
+    Get or create read replica engine.
+
+    Falls back to the primary engine when no read replica URL is configured,
+    so single-database deployments behave exactly as before.
+    """
+    global _read_engine
+    if settings.is_sqlite and not settings.database_read_url:
+        # SQLite WAL：讀取連線與寫入互不阻塞，使用獨立的唯讀連線池
+        if _read_engine is None:
+            _read_engine = _create_sqlite_engine(
+                settings.database_url,
+                pool_size=settings.sqlite_read_pool_size,
+                read_only=True,
+            )
+        return _read_engine
+    if not settings.database_read_url:
+        return get_engine()
+    if _read_engine is None:
+        _read_engine = _create_engine(
+            settings.database_read_url,
+            pool_size=settings.database_read_pool_size,
+            max_overflow=settings.database_read_max_overflow,
+            application_name="casualtrader_backend_read",
+        )
+    return _read_engine
+
+
+def get_read_session_maker():
+    """Get or create async session maker bound to the read replica."""
+    global _async_read_session_maker
+    if not settings.database_read_url and not settings.is_sqlite:
+        return get_session_maker()
+    if _async_read_session_maker is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+        _async_read_session_maker = async_sessionmaker(
+            get_read_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return _async_read_session_maker
+
+
+def requires_primary_read(agent_id: str | None) -> bool:
+    """
+    Check whether a read must go to the primary database (read-your-writes).
+
+    Reads for an agent written within ``database_read_after_write_window``
+    seconds, and list reads (``agent_id`` is None) after any recent agent
+    write, are pinned to the primary. Writes are recorded per process by
+    ``database.read_routing.mark_agent_write``.
+    """
+    if not settings.database_read_url:
+        return False
+    return recent_agent_writes.is_recent(agent_id)
+
+
+def get_pool_stats() -> dict[str, dict[str, int]]:
+    """
+    Connection pool usage of the engines created so far (for /metrics).
+
+    Never creates an engine; pools without size accounting (e.g. NullPool)
+    are skipped.
+
+    Returns:
+        {"primary" | "read" | "sqlite_writer": {"size", "checked_out", "overflow"}}
+    """
+    stats = {}
+    for name, engine in (
+        ("primary", _engine),
+        ("read", _read_engine),
+        ("sqlite_writer", _sqlite_write_engine),
+    ):
+        pool = getattr(engine, "pool", None)
+        if pool is None or not hasattr(pool, "checkedout"):
+            continue
+        stats[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        }
+    return stats
+
+
+def get_sqlite_write_queue():
+    """
+    Get the running SQLite single-writer queue.
+
+    Returns:
+        SQLiteWriteQueue when the SQLite profile is active and started, otherwise None
+    """
+    if _sqlite_write_queue is not None and _sqlite_write_queue.is_running:
+        return _sqlite_write_queue
+    return None
+
+
+async def start_sqlite_write_queue():
+    """Start the SQLite single-writer queue (no-op for other databases)."""
+    global _sqlite_write_engine, _sqlite_write_queue
+    if not settings.is_sqlite:
+        return None
+    if _sqlite_write_queue is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+        from database.sqlite import SQLiteWriteQueue
+
+        # 單一寫入連線：BEGIN IMMEDIATE 事先取得寫鎖
+        _sqlite_write_engine = _create_sqlite_engine(
+            settings.database_url,
+            pool_size=1,
+            immediate_transactions=True,
+        )
+        _sqlite_write_queue = SQLiteWriteQueue(
+            async_sessionmaker(_sqlite_write_engine, class_=AsyncSession, expire_on_commit=False),
+            max_batch_size=settings.sqlite_write_batch_size,
+            batch_window_ms=settings.sqlite_write_batch_window_ms,
+        )
+    await _sqlite_write_queue.start()
+    return _sqlite_write_queue
+
+
+async def stop_sqlite_write_queue():
+    """Stop the SQLite single-writer queue and dispose its engine."""
+    global _sqlite_write_engine, _sqlite_write_queue
+    if _sqlite_write_queue is not None:
+        await _sqlite_write_queue.stop()
+        _sqlite_write_queue = None
+    if _sqlite_write_engine is not None:
+        await _sqlite_write_engine.dispose()
+        _sqlite_write_engine = None
+
+
 async def get_db_session():
     """
     FastAPI dependency for database session.
@@ -291,9 +600,50 @@ async def get_db_session():
         await session.close()
 
 
+async def get_read_db_session(request: Request):
+    """
+    FastAPI dependency for read-only database session.
+
+    Routes to the read replica when configured. Requests whose ``agent_id``
+    path parameter was written recently, and requests without an ``agent_id``
+    (lists) after any recent agent write, are pinned to the primary database
+    (see ``requires_primary_read``).
+
+    Yields:
+        AsyncSession: SQLAlchemy async session
+
+    Example:
+        ```python
+        @router.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_read_db_session)):
+            # Read-only queries
+            pass
+        ```
+    """
+    agent_id = request.path_params.get("agent_id")
+    if requires_primary_read(agent_id):
+        session_maker = get_session_maker()
+    else:
+        session_maker = get_read_session_maker()
+
+    session = session_maker()
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 async def close_db_engine():
-    """Close database engine."""
-    global _engine
+    """Close database engines (primary, read replica and SQLite writer)."""
+    global _engine, _read_engine, _async_read_session_maker
+    await stop_sqlite_write_queue()
+    if _read_engine is not None:
+        await _read_engine.dispose()
+        _read_engine = None
+        _async_read_session_maker = None
     if _engine is not None:
         await _engine.dispose()
         _engine = None
@@ -221,6 +221,10 @@ ws.onmessage = (event) => {
 - `data`: 事件數據
             """,
         },
+        {
+            "name": "admin",
+            "description": "管理端點（需設定 ADMIN_TOKEN 並帶 X-Admin-Token 標頭）：隨選剖析",
+        },
     ]
 
 
@@ -0,0 +1,352 @@
+"""
+WebSocket 事件匯流排
+
+WebSocketManager 透過事件匯流排發佈事件，由每個 worker 收到後各自推送給本機連線：
+- InProcessEventBus: 單一程序（預設），發佈即直接交給本機處理
+- PostgresEventBus: 多 worker 部署，使用 PostgreSQL LISTEN/NOTIFY 讓所有 worker 收到同一事件
+
+事件只在發佈端序列化一次，各 worker 收到的是已序列化的訊息文字，直接放入送出佇列。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from common.logger import logger
+
+# 事件處理回呼：(topic, message_text)，topic 為 None 表示廣播給所有連線
+EventHandler = Callable[[str | None, str], Awaitable[None]]
+
+EVENT_BUS_MEMORY = "memory"
+EVENT_BUS_POSTGRES = "postgres"
+
+# PostgreSQL NOTIFY payload 上限為 8000 bytes，保留空間給分段標頭
+DEFAULT_MAX_NOTIFY_BYTES = 7800
+
+_FULL_PREFIX = "F"
+_CHUNK_PREFIX = "C"
+
+
+class EventBusError(Exception):
+    """事件匯流排錯誤"""
+
+    pass
+
+
+# ==========================================
+# Notification Encoding
+# ==========================================
+
+
+def encode_notifications(
+    topic: str | None, message_text: str, max_bytes: int = DEFAULT_MAX_NOTIFY_BYTES
+) -> list[str]:
+    """
+    將事件編碼為 NOTIFY payload，超過上限時切成多段
+
+    Args:
+        topic: 事件主題（None 表示廣播）
+        message_text: 已序列化的訊息
+        max_bytes: 單一 payload 上限（bytes）
+
+    Returns:
+        NOTIFY payload 列表（依序發送）
+    """
+    envelope = json.dumps({"t": topic, "m": message_text}, ensure_ascii=False)
+    data = envelope.encode("utf-8")
+    if len(data) + len(_FULL_PREFIX) <= max_bytes:
+        return [_FULL_PREFIX + envelope]
+
+    # 以 UTF-8 字元邊界切段
+    chunk_id = uuid.uuid4().hex[:12]
+    header_size = len(_CHUNK_PREFIX) + len(chunk_id) + 16
+    size = max_bytes - header_size
+    if size <= 0:
+        raise EventBusError(f"max_bytes too small for chunking: {max_bytes}")
+
+    parts: list[bytes] = []
+    start = 0
+    while start < len(data):
+        end = min(start + size, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        start = end
+
+    total = len(parts)
+    return [
+        f"{_CHUNK_PREFIX}{chunk_id}:{index}:{total}:{part.decode('utf-8')}"
+        for index, part in enumerate(parts)
+    ]
+
+
+class NotificationDecoder:
+    """還原 NOTIFY payload（含分段重組）"""
+
+    def __init__(self, max_pending: int = 256):
+        self._pending: dict[str, list[str | None]] = {}
+        self._max_pending = max_pending
+
+    def feed(self, payload: str) -> tuple[str | None, str] | None:
+        """
+        輸入一段 payload
+
+        Returns:
+            完整事件 (topic, message_text)；分段尚未收齊時回傳 None
+        """
+        if payload.startswith(_FULL_PREFIX):
+            return self._decode(payload[len(_FULL_PREFIX) :])
+
+        if not payload.startswith(_CHUNK_PREFIX):
+            raise EventBusError(f"Unknown notification format: {payload[:20]!r}")
+
+        chunk_id, index, total, part = payload[len(_CHUNK_PREFIX) :].split(":", 3)
+        index, total = int(index), int(total)
+
+        parts = self._pending.get(chunk_id)
+        if parts is None:
+            if len(self._pending) >= self._max_pending:
+                # 丟棄最舊的未完成事件（發送端中斷時避免無限累積）
+                self._pending.pop(next(iter(self._pending)))
+            parts = self._pending[chunk_id] = [None] * total
+        parts[index] = part
+
+        if any(p is None for p in parts):
+            return None
+        del self._pending[chunk_id]
+        return self._decode("".join(parts))
+
+    @staticmethod
+    def _decode(envelope: str) -> tuple[str | None, str]:
+        data = json.loads(envelope)
+        return data["t"], data["m"]
+
+
+# ==========================================
+# Event Buses
+# ==========================================
+
+
+class InProcessEventBus:
+    """單一程序事件匯流排：發佈即交給本機處理"""
+
+    local_only = True
+
+    def __init__(self):
+        self._handler: EventHandler | None = None
+        self.published = 0
+
+    def set_handler(self, handler: EventHandler) -> None:
+        """設定本機事件處理回呼"""
+        self._handler = handler
+
+    async def start(self) -> None:
+        """啟動（無需連線）"""
+
+    async def stop(self) -> None:
+        """停止（無需連線）"""
+
+    async def publish(self, topic: str | None, message_text: str) -> None:
+        """發佈事件"""
+        self.published += 1
+        if self._handler is not None:
+            await self._handler(topic, message_text)
+
+    def get_metrics(self) -> dict[str, Any]:
+        """取得統計資訊"""
+        return {"backend": EVENT_BUS_MEMORY, "published": self.published}
+
+
+class PostgresEventBus:
+    """
+    PostgreSQL LISTEN/NOTIFY 事件匯流排
+
+    每個 worker 使用一條 LISTEN 連線接收事件、一條連線發送 NOTIFY；
+    發佈端自己也會收到事件，因此本機推送一律走接收路徑，確保所有 worker 行為一致。
+    """
+
+    local_only = False
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = "casualtrader_ws",
+        max_notify_bytes: int = DEFAULT_MAX_NOTIFY_BYTES,
+        reconnect_delay: float = 1.0,
+    ):
+        """
+        初始化事件匯流排
+
+        Args:
+            dsn: PostgreSQL 連線字串（可使用 SQLAlchemy 的 postgresql+asyncpg:// 格式）
+            channel: LISTEN/NOTIFY 頻道名稱
+            max_notify_bytes: 單一 NOTIFY payload 上限
+            reconnect_delay: LISTEN 連線中斷後的重連間隔（秒）
+        """
+        self._dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self._channel = channel
+        self._max_notify_bytes = max_notify_bytes
+        self._reconnect_delay = reconnect_delay
+
+        self._handler: EventHandler | None = None
+        self._decoder = NotificationDecoder()
+        self._inbox: asyncio.Queue[tuple[str | None, str]] = asyncio.Queue()
+        self._listen_conn = None
+        self._publish_conn = None
+        self._publish_lock = asyncio.Lock()
+        self._dispatcher: asyncio.Task | None = None
+        self._reconnector: asyncio.Task | None = None
+        self._stopping = False
+
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+
+    def set_handler(self, handler: EventHandler) -> None:
+        """設定本機事件處理回呼"""
+        self._handler = handler
+
+    async def start(self) -> None:
+        """建立 LISTEN 與 NOTIFY 連線並啟動分派任務"""
+        self._stopping = False
+        await self._connect_listener()
+        self._publish_conn = await self._connect()
+        self._dispatcher = asyncio.create_task(self._dispatch(), name="event-bus-dispatch")
+        logger.info(f"PostgreSQL event bus listening on channel '{self._channel}'")
+
+    async def stop(self) -> None:
+        """關閉連線與背景任務"""
+        self._stopping = True
+        for task in (self._reconnector, self._dispatcher):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._reconnector = self._dispatcher = None
+
+        for conn in (self._listen_conn, self._publish_conn):
+            if conn is not None and not conn.is_closed():
+                try:
+                    await conn.close()
+                except Exception as e:
+                    logger.warning(f"Error closing event bus connection: {e}")
+        self._listen_conn = self._publish_conn = None
+
+    async def publish(self, topic: str | None, message_text: str) -> None:
+        """
+        發佈事件給所有 worker
+
+        Raises:
+            EventBusError: 匯流排尚未啟動
+        """
+        if self._publish_conn is None:
+            raise EventBusError("PostgreSQL event bus is not started")
+
+        payloads = encode_notifications(topic, message_text, self._max_notify_bytes)
+        async with self._publish_lock:
+            if self._publish_conn.is_closed():
+                self._publish_conn = await self._connect()
+            if len(payloads) == 1:
+                await self._publish_conn.execute(
+                    "SELECT pg_notify($1, $2)", self._channel, payloads[0]
+                )
+            else:
+                # 同一交易內的 NOTIFY 於提交時依序送出，分段不會與其他事件交錯
+                async with self._publish_conn.transaction():
+                    for payload in payloads:
+                        await self._publish_conn.execute(
+                            "SELECT pg_notify($1, $2)", self._channel, payload
+                        )
+        self.published += 1
+
+    def get_metrics(self) -> dict[str, Any]:
+        """取得統計資訊"""
+        return {
+            "backend": EVENT_BUS_POSTGRES,
+            "channel": self._channel,
+            "published": self.published,
+            "received": self.received,
+            "reconnects": self.reconnects,
+            "inbox_depth": self._inbox.qsize(),
+        }
+
+    # ==========================================
+    # Internal
+    # ==========================================
+
+    async def _connect(self):
+        import asyncpg
+
+        return await asyncpg.connect(self._dsn)
+
+    async def _connect_listener(self) -> None:
+        self._listen_conn = await self._connect()
+        self._listen_conn.add_termination_listener(self._on_terminated)
+        await self._listen_conn.add_listener(self._channel, self._on_notify)
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        """asyncpg 通知回呼（同步）：重組後放入待分派佇列"""
+        try:
+            event = self._decoder.feed(payload)
+        except Exception as e:
+            logger.error(f"Invalid event bus notification: {e}")
+            return
+        if event is not None:
+            self.received += 1
+            self._inbox.put_nowait(event)
+
+    def _on_terminated(self, _conn) -> None:
+        """LISTEN 連線中斷時排程重連"""
+        if self._stopping:
+            return
+        logger.warning("PostgreSQL event bus listener disconnected, reconnecting")
+        if self._reconnector is None or self._reconnector.done():
+            self._reconnector = asyncio.create_task(self._reconnect(), name="event-bus-reconnect")
+
+    async def _reconnect(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self._reconnect_delay)
+            try:
+                await self._connect_listener()
+                self.reconnects += 1
+                logger.info("PostgreSQL event bus listener reconnected")
+                return
+            except Exception as e:
+                logger.warning(f"Event bus reconnect failed: {e}")
+
+    async def _dispatch(self) -> None:
+        """依收到順序交給本機處理"""
+        while True:
+            topic, message_text = await self._inbox.get()
+            if self._handler is None:
+                continue
+            try:
+                await self._handler(topic, message_text)
+            except Exception as e:
+                logger.error(f"Event bus handler failed: {e}")
+
+
+def create_event_bus(
+    backend: str, dsn: str | None = None, channel: str = "casualtrader_ws"
+) -> InProcessEventBus | PostgresEventBus:
+    """
+    依設定建立事件匯流排
+
+    Args:
+        backend: memory | postgres
+        dsn: PostgreSQL 連線字串（postgres 必填）
+        channel: LISTEN/NOTIFY 頻道名稱
+
+    Raises:
+        EventBusError: 不支援的設定
+    """
+    if backend == EVENT_BUS_MEMORY:
+        return InProcessEventBus()
+    if backend == EVENT_BUS_POSTGRES:
+        if not dsn or not dsn.startswith("postgresql"):
+            raise EventBusError("PostgreSQL event bus requires a postgresql:// database URL")
+        return PostgresEventBus(dsn, channel=channel)
+    raise EventBusError(f"Unknown event bus backend: {backend}")
@@ -0,0 +1,436 @@
+"""
+基本面資料持久快取
+
+資產負債表、損益表、月營收、股利與公司基本資料最多每月或每季更新一次，
+分析時不需每次向 casual-market-mcp 重新取得。快取存放在本機 SQLite：
+
+- 鍵值：(工具, 參數, 報告期)。報告期依台股申報期限推算，例如 5/15 後「最新季報」為當年 Q1，
+  新報告期開始時舊資料自動視為過期
+- 新鮮度：每種資料有各自的最長保存時間（提早申報的公司在期限前也會被更新）；
+  指定年度 / 季度等已申報期間的資料幾乎不變，保存較久
+- stale-while-revalidate：過期但未超過 FUNDAMENTALS_CACHE_MAX_STALE_DAYS 的資料立即回傳，
+  同時在背景重新取得；重新取得失敗時繼續使用舊資料
+- 快取同時用於 MCPMarketClient 與 Agent 的 casual_market_mcp（CachedMarketMCP）
+
+設定:
+- FUNDAMENTALS_CACHE_ENABLED: 是否啟用（預設 true；本機模擬市場模式不使用快取）
+- FUNDAMENTALS_CACHE_PATH: SQLite 檔案路徑（預設 backend/cache/fundamentals.db）
+- FUNDAMENTALS_CACHE_MAX_STALE_DAYS: 可先回傳舊資料的最長過期天數（預設 120）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from agents.mcp import MCPServer
+from mcp.types import CallToolResult, GetPromptResult, ListPromptsResult, TextContent
+from mcp.types import Tool as MCPTool
+
+from common.logger import logger
+from common.mcp_compat import forward_call_tool, tool_result_is_error
+from common.time_utils import ensure_utc, utc_now
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache", "fundamentals.db"
+)
+DEFAULT_MAX_STALE = timedelta(days=int(os.getenv("FUNDAMENTALS_CACHE_MAX_STALE_DAYS", "120")))
+
+# 季報申報期限（月, 日, 對應季度, 年度差）：年報 3/31、Q1 5/15、Q2 8/14、Q3 11/14
+_QUARTERLY_DEADLINES = ((3, 31, 4, -1), (5, 15, 1, 0), (8, 14, 2, 0), (11, 14, 3, 0))
+# 月營收申報期限：次月 10 日
+_MONTHLY_REVENUE_DAY = 10
+
+Fetch = Callable[[], Awaitable[dict[str, Any]]]
+
+
+# ==========================================
+# Freshness Rules
+# ==========================================
+
+
+def latest_quarter(today: date) -> str:
+    """已過申報期限的最新季報期間（例如 2024-06-01 → "2024Q1"）"""
+    period = f"{today.year - 2}Q4"
+    for year in (today.year - 1, today.year):
+        for month, day, quarter, offset in _QUARTERLY_DEADLINES:
+            if today >= date(year, month, day):
+                period = f"{year + offset}Q{quarter}"
+    return period
+
+
+def latest_revenue_month(today: date) -> str:
+    """已過申報期限的最新月營收期間（例如 2024-06-11 → "2024-05"）"""
+    months_back = 1 if today.day > _MONTHLY_REVENUE_DAY else 2
+    month_index = today.year * 12 + today.month - 1 - months_back
+    return f"{month_index // 12}-{month_index % 12 + 1:02d}"
+
+
+@dataclass(frozen=True)
+class FreshnessRule:
+    """單一資料類型的新鮮度規則"""
+
+    # 由今日推算目前報告期
+    current_period: Callable[[date], str]
+    # 目前報告期的資料最長視為新鮮的時間
+    max_age: timedelta
+    # 參數指定了這些欄位時為已申報期間（報告期取自參數）
+    period_args: tuple[str, ...] = ()
+    # 已申報期間的資料最長視為新鮮的時間
+    period_max_age: timedelta = timedelta(days=90)
+
+    def period(self, arguments: dict[str, Any], today: date) -> tuple[str, bool]:
+        """回傳 (報告期, 是否為參數指定的期間)"""
+        if self.period_args and all(arguments.get(a) for a in self.period_args):
+            return "-".join(str(arguments[a]) for a in self.period_args), True
+        return self.current_period(today), False
+
+
+CACHEABLE_TOOLS: dict[str, FreshnessRule] = {
+    "get_company_balance_sheet": FreshnessRule(
+        latest_quarter, timedelta(days=7), period_args=("year", "season")
+    ),
+    "get_company_income_statement": FreshnessRule(
+        latest_quarter, timedelta(days=7), period_args=("year", "season")
+    ),
+    "get_company_monthly_revenue": FreshnessRule(
+        latest_revenue_month, timedelta(days=3), period_args=("year", "month")
+    ),
+    # 股利於股東會決議，以年度為報告期
+    "get_company_dividend": FreshnessRule(lambda today: str(today.year), timedelta(days=7)),
+    "get_company_profile": FreshnessRule(lambda today: "", timedelta(days=30)),
+}
+
+
+def is_cacheable_result(data: Any) -> bool:
+    """只快取成功的回應"""
+    return isinstance(data, dict) and data.get("success") is not False and "error" not in data
+
+
+def normalize_arguments(arguments: dict[str, Any] | None) -> dict[str, Any]:
+    """移除空值並統一股票代號格式（Agent 傳入的參數常包含 null）"""
+    normalized = {k: v for k, v in (arguments or {}).items() if v is not None and v != ""}
+    if isinstance(normalized.get("symbol"), str):
+        normalized["symbol"] = normalized["symbol"].strip().upper()
+    return normalized
+
+
+# ==========================================
+# Cache
+# ==========================================
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """快取資料"""
+
+    tool: str
+    arguments: str
+    period: str
+    data: dict[str, Any]
+    fetched_at: datetime
+    fresh: bool
+    # 超過可先回傳舊資料的期限
+    expired: bool
+
+
+class FundamentalsCache:
+    """基本面資料 SQLite 快取"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_stale: timedelta = DEFAULT_MAX_STALE,
+        clock: Callable[[], datetime] = utc_now,
+    ):
+        """
+        Args:
+            path: SQLite 檔案路徑（":memory:" 表示不落地）
+            max_stale: 過期資料仍可先回傳（同時背景更新）的最長時間
+            clock: 取得目前時間（測試可替換）
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_stale = max_stale
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fundamentals_cache (
+                tool TEXT NOT NULL,
+                arguments TEXT NOT NULL,
+                period TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (tool, arguments, period)
+            )
+            """
+        )
+        self._conn.commit()
+        self._refreshing: dict[tuple[str, str], asyncio.Task] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    @staticmethod
+    def is_cacheable(tool_name: str) -> bool:
+        return tool_name in CACHEABLE_TOOLS
+
+    def lookup(self, tool_name: str, arguments: dict[str, Any] | None) -> CacheEntry | None:
+        """查詢最新的快取資料（不論報告期）並判斷是否新鮮"""
+        rule = CACHEABLE_TOOLS[tool_name]
+        arguments = normalize_arguments(arguments)
+        key = _arguments_key(arguments)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT period, data, fetched_at FROM fundamentals_cache "
+                "WHERE tool = ? AND arguments = ? ORDER BY fetched_at DESC LIMIT 1",
+                (tool_name, key),
+            ).fetchone()
+        if row is None:
+            return None
+
+        period, data, fetched_at = row
+        fetched = ensure_utc(datetime.fromisoformat(fetched_at))
+        now = self._clock()
+        current_period, explicit = rule.period(arguments, now.date())
+        age = now - fetched
+        max_age = rule.period_max_age if explicit else rule.max_age
+        return CacheEntry(
+            tool=tool_name,
+            arguments=key,
+            period=period,
+            data=json.loads(data),
+            fetched_at=fetched,
+            fresh=period == current_period and age <= max_age,
+            expired=age > max_age + self.max_stale,
+        )
+
+    def store(self, tool_name: str, arguments: dict[str, Any] | None, data: dict[str, Any]) -> None:
+        """寫入快取（同一參數只保留最新報告期）"""
+        rule = CACHEABLE_TOOLS[tool_name]
+        arguments = normalize_arguments(arguments)
+        key = _arguments_key(arguments)
+        now = self._clock()
+        period, _ = rule.period(arguments, now.date())
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM fundamentals_cache WHERE tool = ? AND arguments = ?",
+                (tool_name, key),
+            )
+            self._conn.execute(
+                "INSERT INTO fundamentals_cache (tool, arguments, period, data, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (tool_name, key, period, json.dumps(data, ensure_ascii=False), now.isoformat()),
+            )
+            self._conn.commit()
+
+    async def get_or_fetch(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        fetch: Fetch,
+        refresh_tasks: set[asyncio.Task] | None = None,
+    ) -> dict[str, Any]:
+        """
+        取得資料：新鮮資料直接回傳；過期資料先回傳並在背景更新；沒有資料時同步取得
+
+        Args:
+            tool_name: MCP 工具名稱（必須在 CACHEABLE_TOOLS 中）
+            arguments: 工具參數
+            fetch: 向 MCP 取得資料的協程函式
+            refresh_tasks: 呼叫端的背景更新集合。以 fetch 排入的背景更新會加入（完成後移除），
+                呼叫端關閉 fetch 使用的連線前應等待這些更新
+        """
+        entry = await asyncio.to_thread(self.lookup, tool_name, arguments)
+        if entry is not None and entry.fresh:
+            self.stats["hits"] += 1
+            return entry.data
+
+        if entry is not None and not entry.expired:
+            self.stats["stale_hits"] += 1
+            task = self._schedule_refresh(tool_name, arguments, fetch)
+            if task is not None and refresh_tasks is not None:
+                refresh_tasks.add(task)
+                task.add_done_callback(refresh_tasks.discard)
+            return entry.data
+
+        self.stats["misses"] += 1
+        try:
+            return await self.refresh(tool_name, arguments, fetch)
+        except Exception:
+            if entry is None:
+                raise
+            logger.warning(f"Refreshing {tool_name} failed, serving expired cache entry")
+            return entry.data
+
+    async def refresh(
+        self, tool_name: str, arguments: dict[str, Any] | None, fetch: Fetch
+    ) -> dict[str, Any]:
+        """向 MCP 取得資料並寫入快取（失敗的回應不寫入）"""
+        data = await fetch()
+        if is_cacheable_result(data):
+            await asyncio.to_thread(self.store, tool_name, arguments, data)
+        return data
+
+    async def wait_for_refreshes(
+        self, tasks: Iterable[asyncio.Task] | None = None, timeout: float = 10.0
+    ) -> None:
+        """
+        等待背景更新完成（MCP 連線關閉前呼叫）
+
+        Args:
+            tasks: 要等待的更新（通常為呼叫端的 refresh_tasks）；未指定時等待全部
+            timeout: 最長等待秒數
+        """
+        pending = list(self._refreshing.values() if tasks is None else tasks)
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+    def _schedule_refresh(
+        self, tool_name: str, arguments: dict[str, Any] | None, fetch: Fetch
+    ) -> asyncio.Task | None:
+        """排入背景更新；同一鍵值已在更新中時回傳 None"""
+        key = (tool_name, _arguments_key(normalize_arguments(arguments)))
+        if key in self._refreshing:
+            return None
+
+        async def run() -> None:
+            try:
+                await self.refresh(tool_name, arguments, fetch)
+                self.stats["refreshes"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Background refresh of {tool_name} failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        task = self._refreshing[key] = asyncio.create_task(run())
+        return task
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _arguments_key(arguments: dict[str, Any]) -> str:
+    return json.dumps(arguments, sort_keys=True, ensure_ascii=False)
+
+
+_fundamentals_cache: FundamentalsCache | None = None
+
+
+def get_fundamentals_cache() -> FundamentalsCache | None:
+    """
+    程序內共用的基本面快取
+
+    FUNDAMENTALS_CACHE_ENABLED=false 或使用本機模擬市場時回傳 None。
+    """
+    global _fundamentals_cache
+    if os.getenv("FUNDAMENTALS_CACHE_ENABLED", "true").lower() in ("false", "0", "no"):
+        return None
+
+    from api.local_market_mcp import is_local_market_url
+
+    if is_local_market_url(os.getenv("CASUAL_MARKET_SSE_URL")):
+        return None
+    if _fundamentals_cache is None:
+        path = os.getenv("FUNDAMENTALS_CACHE_PATH", DEFAULT_CACHE_PATH)
+        _fundamentals_cache = FundamentalsCache(path)
+        logger.info(f"Fundamentals cache: {path}")
+    return _fundamentals_cache
+
+
+# ==========================================
+# MCP Server Proxy
+# ==========================================
+
+
+class UncacheableResultError(Exception):
+    """MCP 回應不是 JSON 物件，無法快取"""
+
+    def __init__(self, result: CallToolResult):
+        super().__init__("MCP tool result is not a JSON object")
+        self.result = result
+
+
+class CachedMarketMCP(MCPServer):
+    """
+    casual_market_mcp 快取代理
+
+    基本面工具經由 FundamentalsCache，其他工具與屬性（例如 session）直接轉給原伺服器。
+    背景更新使用本代理的連線，只追蹤自己排入的更新，關閉時不必等待其他 Agent 的更新。
+    """
+
+    def __init__(self, server: MCPServer, cache: FundamentalsCache):
+        super().__init__()
+        self._server = server
+        self._cache = cache
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._server, name)
+
+    @property
+    def name(self) -> str:
+        return self._server.name
+
+    async def connect(self) -> None:
+        await self._server.connect()
+
+    async def cleanup(self) -> None:
+        await self.wait_for_refreshes()
+        await self._server.cleanup()
+
+    async def wait_for_refreshes(self, timeout: float = 10.0) -> None:
+        """等待本代理排入的背景更新完成（關閉原伺服器連線前呼叫）"""
+        await self._cache.wait_for_refreshes(self._refresh_tasks, timeout=timeout)
+
+    async def list_tools(self, run_context=None, agent=None) -> list[MCPTool]:
+        return await self._server.list_tools(run_context, agent)
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        meta: dict[str, Any] | None = None,
+    ) -> CallToolResult:
+        if not self._cache.is_cacheable(tool_name):
+            return await forward_call_tool(self._server, tool_name, arguments, meta)
+
+        async def fetch() -> dict[str, Any]:
+            result = await forward_call_tool(self._server, tool_name, arguments, meta)
+            text = getattr(result.content[0], "text", None) if result.content else None
+            try:
+                data = json.loads(text) if text and not tool_result_is_error(result) else None
+            except json.JSONDecodeError:
+                data = None
+            if not isinstance(data, dict):
+                raise UncacheableResultError(result)
+            return data
+
+        try:
+            data = await self._cache.get_or_fetch(
+                tool_name, arguments, fetch, refresh_tasks=self._refresh_tasks
+            )
+        except UncacheableResultError as e:
+            return e.result
+        return CallToolResult(
+            content=[TextContent(type="text", text=json.dumps(data, ensure_ascii=False))],
+            isError=False,
+        )
+
+    async def list_prompts(self) -> ListPromptsResult:
+        return await self._server.list_prompts()
+
+    async def get_prompt(
+        self, name: str, arguments: dict[str, Any] | None = None
+    ) -> GetPromptResult:
+        return await self._server.get_prompt(name, arguments)
@@ -0,0 +1,227 @@
+"""
+本機 casual-market MCP 替身
+
+以 MarketSimulator 提供與 casual-market-mcp 相同的工具，讓負載測試與離線執行不需連到
+遠端 CASUAL_MARKET_SSE_URL：
+
+- 同程序模式：CASUAL_MARKET_SSE_URL=local 時，TradingAgent 與 MCPMarketClient 直接使用
+  LocalMarketMCP（agents.mcp.MCPServer 實作），工具呼叫不經過網路
+- SSE 模式：python -m api.local_market_mcp --port 8066 啟動獨立的 MCP SSE 伺服器，
+  CASUAL_MARKET_SSE_URL 指向 http://localhost:8066/sse 即可
+
+模擬資料設定:
+- CASUAL_MARKET_SEED: 合成價格的隨機種子（預設 42）
+- CASUAL_MARKET_DATA: 錄製 K 線 JSON 檔路徑（設定時改用錄製資料重播）
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import inspect
+import json
+import os
+import types
+import typing
+from typing import Any
+
+from agents.mcp import MCPServer
+from mcp.types import (
+    CallToolResult,
+    GetPromptResult,
+    ListPromptsResult,
+    TextContent,
+)
+from mcp.types import Tool as MCPTool
+
+from api.market_simulator import DEFAULT_SEED, TOOL_NAMES, MarketSimulator
+from common.logger import logger
+
+LOCAL_MARKET_URL = "local"
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+_shared_market: MarketSimulator | None = None
+
+
+def is_local_market_url(url: str | None) -> bool:
+    """CASUAL_MARKET_SSE_URL 是否指定使用本機替身"""
+    return (url or "").strip().lower() == LOCAL_MARKET_URL
+
+
+def create_market_from_env() -> MarketSimulator:
+    """依 CASUAL_MARKET_SEED / CASUAL_MARKET_DATA 建立模擬市場"""
+    seed = int(os.getenv("CASUAL_MARKET_SEED", str(DEFAULT_SEED)))
+    data_path = os.getenv("CASUAL_MARKET_DATA")
+    if data_path:
+        logger.info(f"Local market replaying recorded data: {data_path}")
+        return MarketSimulator.load_recorded(data_path, seed=seed)
+    logger.info(f"Local market using synthetic prices (seed={seed})")
+    return MarketSimulator(seed=seed)
+
+
+def get_shared_market() -> MarketSimulator:
+    """同程序共用的模擬市場（所有 Agent 與 API 看到相同價格）"""
+    global _shared_market
+    if _shared_market is None:
+        _shared_market = create_market_from_env()
+    return _shared_market
+
+
+def reset_shared_market(market: MarketSimulator | None = None) -> None:
+    """替換或清除共用的模擬市場（測試與負載測試使用）"""
+    global _shared_market
+    _shared_market = market
+
+
+def tool_definitions(market: MarketSimulator) -> list[MCPTool]:
+    """由模擬市場的方法簽章產生 MCP 工具定義"""
+    tools = []
+    for name in TOOL_NAMES:
+        method = getattr(market, name)
+        tools.append(
+            MCPTool(
+                name=name,
+                description=inspect.getdoc(method) or name,
+                inputSchema=_input_schema(method),
+            )
+        )
+    return tools
+
+
+class LocalMarketMCP(MCPServer):
+    """
+    同程序 casual-market MCP 伺服器
+
+    可直接放入 Agent(mcp_servers=[...])；同時提供 session 屬性，
+    讓以 casual_market_mcp.session.call_tool(...) 呼叫的交易工具不需修改。
+    """
+
+    def __init__(self, market: MarketSimulator | None = None, name: str = "casual_market_mcp"):
+        super().__init__()
+        self.market = market or get_shared_market()
+        self._name = name
+        self._tools = tool_definitions(self.market)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def session(self) -> LocalMarketMCP:
+        """與 MCPServerSse.session 相容（同程序沒有獨立的 ClientSession）"""
+        return self
+
+    async def __aenter__(self) -> LocalMarketMCP:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.cleanup()
+
+    async def connect(self) -> None:
+        """同程序伺服器不需連線"""
+
+    async def cleanup(self) -> None:
+        """同程序伺服器不需清理"""
+
+    async def list_tools(self, run_context=None, agent=None) -> list[MCPTool]:
+        return list(self._tools)
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        meta: dict[str, Any] | None = None,
+    ) -> CallToolResult:
+        result = self.market.call(tool_name, arguments)
+        return CallToolResult(
+            content=[TextContent(type="text", text=json.dumps(result, ensure_ascii=False))],
+            isError=False,
+        )
+
+    async def list_prompts(self) -> ListPromptsResult:
+        return ListPromptsResult(prompts=[])
+
+    async def get_prompt(
+        self, name: str, arguments: dict[str, Any] | None = None
+    ) -> GetPromptResult:
+        raise KeyError(f"Prompt not found: {name}")
+
+
+# ==========================================
+# SSE Server
+# ==========================================
+
+
+def create_sse_app(market: MarketSimulator):
+    """
+    建立 MCP SSE 應用程式（Starlette），路徑與 casual-market-mcp 相同（/sse）
+
+    工具回應以 JSON 文字傳回，與同程序模式一致。
+    """
+    try:
+        from mcp.server.fastmcp import FastMCP as MCPApp
+    except ImportError:
+        # mcp 2.x 將 FastMCP 更名為 MCPServer
+        from mcp.server.mcpserver import MCPServer as MCPApp
+
+    app = MCPApp("casual-market-mcp")
+    for name in TOOL_NAMES:
+        description = inspect.getdoc(getattr(market, name)) or name
+        app.add_tool(_json_tool(market, name), name=name, description=description)
+    return app.sse_app()
+
+
+def _json_tool(market: MarketSimulator, name: str):
+    """包裝模擬市場方法：保留參數簽章，回傳 JSON 文字並計入呼叫統計"""
+    method = getattr(market, name)
+    hints = typing.get_type_hints(method)
+
+    @functools.wraps(method)
+    def tool(**arguments: Any) -> str:
+        return json.dumps(market.call(name, arguments), ensure_ascii=False)
+
+    signature = inspect.signature(method)
+    parameters = [
+        p.replace(annotation=hints.get(p.name, Any)) for p in signature.parameters.values()
+    ]
+    tool.__signature__ = signature.replace(parameters=parameters, return_annotation=str)
+    tool.__annotations__ = {p.name: p.annotation for p in parameters} | {"return": str}
+    return tool
+
+
+def _input_schema(method) -> dict[str, Any]:
+    """由方法簽章產生 JSON Schema（僅支援 str / int / float / bool 與 Optional）"""
+    hints = typing.get_type_hints(method)
+    properties: dict[str, Any] = {}
+    required = []
+    for parameter in inspect.signature(method).parameters.values():
+        annotation = hints.get(parameter.name, str)
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+            annotation = args[0]
+        schema: dict[str, Any] = {"type": _JSON_TYPES.get(annotation, "string")}
+        if parameter.default is inspect.Parameter.empty:
+            required.append(parameter.name)
+        else:
+            schema = {"anyOf": [schema, {"type": "null"}], "default": parameter.default}
+        properties[parameter.name] = schema
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local casual-market MCP server (SSE)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8066)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_sse_app(create_market_from_env())
+    logger.info(f"Local casual-market MCP listening on http://{args.host}:{args.port}/sse")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
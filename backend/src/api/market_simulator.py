@@ -0,0 +1,702 @@
+"""
+模擬台股市場
+
+本機 casual-market MCP 替身的資料來源，回應格式與 casual-market-mcp 工具相同：
+- 合成模式：以種子產生每檔股票的日 K 線，相同種子必得相同價格
+- 錄製模式：讀取 JSON 檔的歷史 K 線重播
+
+市場時鐘以交易日為單位，報價與成交都使用目前交易日的 K 線；呼叫 advance() 前進。
+所有計算都在記憶體中完成，不需網路，可承受大量呼叫（負載測試、離線執行）。
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+# 台股手續費率 0.1425%（最低 20 元）、證券交易稅 0.3%（賣出）
+FEE_RATE = 0.001425
+MIN_FEE = 20
+TAX_RATE = 0.003
+
+# 一張 = 1000 股
+LOT_SIZE = 1000
+
+DEFAULT_SEED = 42
+DEFAULT_START_DATE = date(2024, 1, 2)
+
+# 合成價格：日波動率與開盤跳空幅度
+_DAILY_VOLATILITY = 0.02
+_OPEN_GAP = 0.005
+
+# 常見股票名稱（合成模式下其他代號以「模擬股票」命名）
+_KNOWN_SYMBOLS = {
+    "2330": ("台積電", "半導體業"),
+    "2317": ("鴻海", "其他電子業"),
+    "2454": ("聯發科", "半導體業"),
+    "2308": ("台達電", "電子零組件業"),
+    "2412": ("中華電", "通信網路業"),
+    "2881": ("富邦金", "金融保險業"),
+    "2882": ("國泰金", "金融保險業"),
+    "2603": ("長榮", "航運業"),
+    "1301": ("台塑", "塑膠工業"),
+    "0050": ("元大台灣50", "ETF"),
+}
+
+_INDEX_NAME = "發行量加權股價指數"
+_INDEX_SYMBOL = "^TWII"
+
+
+# 模擬市場提供的 casual-market-mcp 工具
+TOOL_NAMES = (
+    "get_taiwan_stock_price",
+    "get_stock_daily_trading",
+    "buy_taiwan_stock",
+    "sell_taiwan_stock",
+    "get_market_index_info",
+    "get_market_historical_index",
+    "check_taiwan_trading_day",
+    "get_taiwan_holiday_info",
+    "get_company_profile",
+    "get_company_income_statement",
+    "get_company_balance_sheet",
+    "get_company_monthly_revenue",
+    "get_company_dividend",
+    "get_stock_valuation_ratios",
+)
+
+
+class MarketSimulatorError(Exception):
+    """模擬市場設定錯誤"""
+
+    pass
+
+
+@dataclass(frozen=True)
+class Bar:
+    """日 K 線"""
+
+    day: date
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+
+
+def tick_size(price: float) -> float:
+    """台股升降單位"""
+    if price < 10:
+        return 0.01
+    if price < 50:
+        return 0.05
+    if price < 100:
+        return 0.1
+    if price < 500:
+        return 0.5
+    if price < 1000:
+        return 1.0
+    return 5.0
+
+
+def round_to_tick(price: float) -> float:
+    """價格對齊升降單位"""
+    tick = tick_size(price)
+    return round(round(price / tick) * tick, 2)
+
+
+def trading_fee(amount: float) -> int:
+    """手續費（最低 20 元）"""
+    return max(MIN_FEE, math.floor(amount * FEE_RATE))
+
+
+def is_weekend(day: date) -> bool:
+    return day.weekday() >= 5
+
+
+def _next_business_day(day: date) -> date:
+    day += timedelta(days=1)
+    while is_weekend(day):
+        day += timedelta(days=1)
+    return day
+
+
+class _Series:
+    """單一股票的 K 線序列（合成序列依需要延伸）"""
+
+    def __init__(
+        self,
+        symbol: str,
+        name: str,
+        industry: str,
+        bars: list[Bar],
+        rng: random.Random | None = None,
+        tick: bool = True,
+    ):
+        self.symbol = symbol
+        self.name = name
+        self.industry = industry
+        self.bars = bars
+        self._rng = rng
+        # 指數不適用股票升降單位
+        self._round = round_to_tick if tick else functools.partial(round, ndigits=2)
+
+    def bar(self, index: int) -> Bar:
+        """第 index 個交易日的 K 線（錄製資料用完後停在最後一天）"""
+        if self._rng is None:
+            return self.bars[min(index, len(self.bars) - 1)]
+        while len(self.bars) <= index:
+            self.bars.append(self._next_bar(self.bars[-1]))
+        return self.bars[index]
+
+    def previous_close(self, index: int) -> float:
+        """前一交易日收盤價（第一天以開盤價代替）"""
+        if self._rng is None:
+            index = min(index, len(self.bars) - 1)
+        bar = self.bar(index)
+        return self.bars[index - 1].close if index > 0 else bar.open
+
+    def _next_bar(self, previous: Bar) -> Bar:
+        rng = self._rng
+        open_price = previous.close * (1 + rng.gauss(0, _OPEN_GAP))
+        close = open_price * math.exp(rng.gauss(0, _DAILY_VOLATILITY))
+        # 漲跌幅限制 10%
+        close = min(max(close, previous.close * 0.9), previous.close * 1.1)
+        high = max(open_price, close) * (1 + abs(rng.gauss(0, _OPEN_GAP)))
+        low = min(open_price, close) * (1 - abs(rng.gauss(0, _OPEN_GAP)))
+        return Bar(
+            day=_next_business_day(previous.day),
+            open=self._round(open_price),
+            high=self._round(min(high, previous.close * 1.1)),
+            low=self._round(max(low, previous.close * 0.9)),
+            close=self._round(close),
+            volume=int(rng.lognormvariate(9, 1)) * LOT_SIZE,
+        )
+
+
+class MarketSimulator:
+    """
+    模擬台股市場
+
+    工具方法（get_taiwan_stock_price、buy_taiwan_stock 等）與 casual-market-mcp 工具同名，
+    回傳 {"success": bool, "data": ...} 或 {"success": False, "error": ...}。
+    """
+
+    def __init__(
+        self,
+        seed: int = DEFAULT_SEED,
+        start_date: date = DEFAULT_START_DATE,
+        recorded: dict[str, Any] | None = None,
+    ):
+        """
+        初始化模擬市場
+
+        Args:
+            seed: 合成價格的隨機種子
+            start_date: 合成模式的第一個交易日
+            recorded: 錄製的 K 線資料（格式見 load_recorded），提供時只接受其中的股票
+        """
+        self.seed = seed
+        self.start_date = (
+            start_date if not is_weekend(start_date) else _next_business_day(start_date)
+        )
+        self.day_index = 0
+        self._recorded = recorded is not None
+        self._series: dict[str, _Series] = {}
+        self._names: dict[str, str] = {}
+        self.calls: dict[str, int] = {}
+
+        if recorded is not None:
+            for symbol, entry in recorded.items():
+                self._add_recorded(str(symbol), entry)
+            if not self._series:
+                raise MarketSimulatorError("Recorded market data is empty")
+        self._index = self._make_index()
+
+    @classmethod
+    def load_recorded(cls, path: str | Path, seed: int = DEFAULT_SEED) -> MarketSimulator:
+        """
+        從 JSON 檔建立錄製模式的模擬市場
+
+        檔案格式:
+            {"2330": {"name": "台積電", "industry": "半導體業",
+                      "bars": [{"date": "2024-01-02", "open": 590, "high": 593,
+                                "low": 589, "close": 593, "volume": 22000000}, ...]}}
+            bars 只有 close 時，開高低以收盤價代替。
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls(seed=seed, recorded=json.load(f))
+
+    def call(self, tool_name: str, arguments: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        依工具名稱呼叫
+
+        Returns:
+            工具回應；不支援的工具或參數錯誤時回傳 {"success": False, "error": ...}
+        """
+        if tool_name not in TOOL_NAMES:
+            return _error(f"模擬市場不支援此工具: {tool_name}")
+        self.calls[tool_name] = self.calls.get(tool_name, 0) + 1
+        try:
+            return getattr(self, tool_name)(**(arguments or {}))
+        except TypeError as e:
+            return _error(f"工具參數錯誤: {e}")
+
+    # ==========================================
+    # 市場時鐘
+    # ==========================================
+
+    @property
+    def current_date(self) -> date:
+        """目前交易日"""
+        return self._index.bar(self.day_index).day
+
+    def advance(self, days: int = 1) -> date:
+        """前進 days 個交易日，回傳新的交易日"""
+        self.day_index += days
+        return self.current_date
+
+    def quote_price(self, symbol: str) -> float | None:
+        """目前交易日收盤價（找不到股票時為 None）"""
+        series = self._resolve(symbol)
+        return series.bar(self.day_index).close if series else None
+
+    def get_stats(self) -> dict[str, Any]:
+        """呼叫統計"""
+        return {
+            "mode": "recorded" if self._recorded else "synthetic",
+            "seed": self.seed,
+            "current_date": self.current_date.isoformat(),
+            "symbols": len(self._series),
+            "calls": dict(self.calls),
+            "total_calls": sum(self.calls.values()),
+        }
+
+    # ==========================================
+    # 報價
+    # ==========================================
+
+    def get_taiwan_stock_price(self, symbol: str) -> dict[str, Any]:
+        """股票即時報價"""
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+
+        bar = series.bar(self.day_index)
+        previous_close = series.previous_close(self.day_index)
+        change = round(bar.close - previous_close, 2)
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "company_name": series.name,
+                "current_price": bar.close,
+                "change": change,
+                "change_percent": round(change / previous_close * 100, 2),
+                "volume": bar.volume,
+                "high": bar.high,
+                "low": bar.low,
+                "open": bar.open,
+                "previous_close": previous_close,
+                "last_update": f"{bar.day.isoformat()}T13:30:00",
+            },
+            "stock_price",
+        )
+
+    def get_stock_daily_trading(self, symbol: str, date: str | None = None) -> dict[str, Any]:
+        """個股日成交資訊（預設目前交易日）"""
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+
+        bar = series.bar(self.day_index)
+        if date:
+            target = _parse_date(date)
+            if target is None:
+                return _error(f"日期格式錯誤: {date}")
+            matches = [b for b in series.bars[: self.day_index + 1] if b.day == target]
+            if not matches:
+                return _error(f"{symbol} 於 {date} 無交易資料")
+            bar = matches[0]
+
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "date": bar.day.isoformat(),
+                "open": bar.open,
+                "high": bar.high,
+                "low": bar.low,
+                "close": bar.close,
+                "volume": bar.volume,
+                "turnover": round(bar.close * bar.volume),
+            },
+            "daily_trading",
+        )
+
+    # ==========================================
+    # 模擬交易
+    # ==========================================
+
+    def buy_taiwan_stock(
+        self, symbol: str, quantity: int, price: float | None = None
+    ) -> dict[str, Any]:
+        """模擬買入（市價以收盤價成交；限價不低於當日最低價才成交）"""
+        return self._trade("buy", symbol, quantity, price)
+
+    def sell_taiwan_stock(
+        self, symbol: str, quantity: int, price: float | None = None
+    ) -> dict[str, Any]:
+        """模擬賣出（市價以收盤價成交；限價不高於當日最高價才成交）"""
+        return self._trade("sell", symbol, quantity, price)
+
+    def _trade(
+        self, action: str, symbol: str, quantity: int, price: float | None
+    ) -> dict[str, Any]:
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+        if quantity <= 0 or quantity % LOT_SIZE != 0:
+            return _error(f"交易數量必須是 {LOT_SIZE} 股的倍數: {quantity}")
+
+        bar = series.bar(self.day_index)
+        if price is None:
+            executed = bar.close
+        elif price <= 0:
+            return _error(f"委託價格必須大於 0: {price}")
+        elif action == "buy":
+            if price < bar.low:
+                return _error(f"委託價 {price} 低於當日最低價 {bar.low}，未成交")
+            executed = min(price, bar.close)
+        else:
+            if price > bar.high:
+                return _error(f"委託價 {price} 高於當日最高價 {bar.high}，未成交")
+            executed = max(price, bar.close)
+
+        total_amount = round(executed * quantity, 2)
+        fee = trading_fee(total_amount)
+        tax = math.floor(total_amount * TAX_RATE) if action == "sell" else 0
+        net_amount = total_amount + fee if action == "buy" else total_amount - fee - tax
+
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "company_name": series.name,
+                "action": action,
+                "quantity": quantity,
+                "price": executed,
+                "order_type": "market" if price is None else "limit",
+                "total_amount": total_amount,
+                "fee": fee,
+                "tax": tax,
+                "net_amount": net_amount,
+                "trade_date": bar.day.isoformat(),
+            },
+            f"{action}_stock",
+        )
+
+    # ==========================================
+    # 市場指數
+    # ==========================================
+
+    def get_market_index_info(self) -> dict[str, Any]:
+        """加權指數（格式與 TWSE OpenAPI 相同）"""
+        bar = self._index.bar(self.day_index)
+        change = round(bar.close - self._index.previous_close(self.day_index), 2)
+        return _ok(
+            _index_record(bar, change, self._index.previous_close(self.day_index)),
+            "index_info",
+        )
+
+    def get_market_historical_index(self) -> dict[str, Any]:
+        """加權指數近 20 個交易日"""
+        start = max(0, self.day_index - 19)
+        records = []
+        for index in range(start, self.day_index + 1):
+            bar = self._index.bar(index)
+            previous = self._index.previous_close(index)
+            records.append(_index_record(bar, round(bar.close - previous, 2), previous))
+        return _ok(records, "historical_index")
+
+    # ==========================================
+    # 交易日
+    # ==========================================
+
+    def check_taiwan_trading_day(self, date: str) -> dict[str, Any]:
+        """是否為交易日（週一至週五視為交易日）"""
+        target = _parse_date(date)
+        if target is None:
+            return _error(f"日期格式錯誤: {date}")
+        weekend = is_weekend(target)
+        return _ok(
+            {
+                "date": target.isoformat(),
+                "is_trading_day": not weekend,
+                "is_weekend": weekend,
+                "is_holiday": False,
+                "holiday_name": None,
+            },
+            "trading_day",
+        )
+
+    def get_taiwan_holiday_info(self, date: str) -> dict[str, Any]:
+        """節假日資訊（模擬市場沒有國定假日）"""
+        target = _parse_date(date)
+        if target is None:
+            return _error(f"日期格式錯誤: {date}")
+        return _ok(
+            {"date": target.isoformat(), "is_holiday": False, "holiday_name": None},
+            "holiday_info",
+        )
+
+    # ==========================================
+    # 財務資料
+    # ==========================================
+
+    def get_company_profile(self, symbol: str) -> dict[str, Any]:
+        """公司基本資料"""
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+        rng = self._fundamentals_rng(series.symbol)
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "company_name": series.name,
+                "industry": series.industry,
+                "chairman": "模擬董事長",
+                "establishment_date": f"{rng.randint(1960, 2010)}-01-01",
+                "capital": self._shares(series.symbol) * 10,
+                "employee_count": rng.randint(100, 50000),
+                "website": f"https://example.com/{series.symbol}",
+            },
+            "company_profile",
+        )
+
+    def get_company_income_statement(
+        self, symbol: str, year: int | None = None, season: int | None = None
+    ) -> dict[str, Any]:
+        """綜合損益表（單季，單位：千元）"""
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+        year, season = self._period(year, season)
+        rng = self._fundamentals_rng(series.symbol, f"{year}Q{season}")
+
+        revenue = round(self._shares(series.symbol) * rng.uniform(2, 8) / 1000)
+        gross_profit = round(revenue * rng.uniform(0.15, 0.55))
+        operating_income = round(gross_profit * rng.uniform(0.3, 0.8))
+        net_income = round(operating_income * rng.uniform(0.7, 0.95))
+        eps = round(net_income * 1000 / self._shares(series.symbol), 2)
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "year": year,
+                "season": season,
+                "revenue": revenue,
+                "gross_profit": gross_profit,
+                "operating_income": operating_income,
+                "net_income": net_income,
+                "eps": eps,
+            },
+            "income_statement",
+        )
+
+    def get_company_balance_sheet(
+        self, symbol: str, year: int | None = None, season: int | None = None
+    ) -> dict[str, Any]:
+        """資產負債表（單位：千元）"""
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+        year, season = self._period(year, season)
+        rng = self._fundamentals_rng(series.symbol, f"{year}Q{season}:bs")
+
+        total_assets = round(self._shares(series.symbol) * rng.uniform(20, 60) / 1000)
+        total_liabilities = round(total_assets * rng.uniform(0.2, 0.7))
+        current_assets = round(total_assets * rng.uniform(0.3, 0.6))
+        current_liabilities = round(total_liabilities * rng.uniform(0.4, 0.8))
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "year": year,
+                "season": season,
+                "total_assets": total_assets,
+                "total_liabilities": total_liabilities,
+                "equity": total_assets - total_liabilities,
+                "current_assets": current_assets,
+                "current_liabilities": current_liabilities,
+            },
+            "balance_sheet",
+        )
+
+    def get_company_monthly_revenue(
+        self, symbol: str, year: int | None = None, month: int | None = None
+    ) -> dict[str, Any]:
+        """月營收（單位：千元）"""
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+        current = self.current_date
+        year = year or current.year
+        month = month or current.month
+        rng = self._fundamentals_rng(series.symbol, f"{year}-{month}")
+        base = self._shares(series.symbol) * 2 / 3000
+        revenue = round(base * rng.uniform(0.8, 1.2))
+        last_year = round(base * rng.uniform(0.7, 1.1))
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "year": year,
+                "month": month,
+                "revenue": revenue,
+                "last_year_revenue": last_year,
+                "yoy_percent": round((revenue - last_year) / last_year * 100, 2),
+            },
+            "monthly_revenue",
+        )
+
+    def get_company_dividend(self, symbol: str) -> dict[str, Any]:
+        """股利資訊"""
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+        rng = self._fundamentals_rng(series.symbol, "dividend")
+        price = series.bar(self.day_index).close
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "year": self.current_date.year - 1,
+                "cash_dividend": round(price * rng.uniform(0.01, 0.06), 2),
+                "stock_dividend": 0,
+            },
+            "dividend",
+        )
+
+    def get_stock_valuation_ratios(self, symbol: str) -> dict[str, Any]:
+        """本益比、殖利率、股價淨值比"""
+        series = self._resolve(symbol)
+        if series is None:
+            return _error(f"找不到股票: {symbol}")
+        rng = self._fundamentals_rng(series.symbol, "valuation")
+        return _ok(
+            {
+                "symbol": series.symbol,
+                "date": self.current_date.isoformat(),
+                "pe_ratio": round(rng.uniform(8, 35), 2),
+                "dividend_yield": round(rng.uniform(0.5, 6), 2),
+                "pb_ratio": round(rng.uniform(0.8, 6), 2),
+            },
+            "valuation_ratios",
+        )
+
+    # ==========================================
+    # Internal
+    # ==========================================
+
+    def _resolve(self, symbol: str) -> _Series | None:
+        """以股票代號或公司名稱找到序列；合成模式下任何數字代號都有價格"""
+        key = str(symbol).strip().upper().removesuffix(".TW")
+        key = self._names.get(key, key)
+        series = self._series.get(key)
+        if series is not None or self._recorded:
+            return series
+        if not key.isdigit() or not 4 <= len(key) <= 6:
+            return None
+
+        name, industry = _KNOWN_SYMBOLS.get(key, (f"模擬股票{key}", "模擬產業"))
+        rng = random.Random(f"{self.seed}:{key}")
+        open_price = round_to_tick(rng.uniform(15, 800))
+        first = Bar(
+            day=self.start_date,
+            open=open_price,
+            high=open_price,
+            low=open_price,
+            close=open_price,
+            volume=int(rng.lognormvariate(9, 1)) * LOT_SIZE,
+        )
+        series = self._series[key] = _Series(key, name, industry, [first], rng)
+        self._names.setdefault(name, key)
+        return series
+
+    def _add_recorded(self, symbol: str, entry: dict[str, Any]) -> None:
+        bars = []
+        for raw in entry.get("bars", []):
+            close = float(raw["close"])
+            bars.append(
+                Bar(
+                    day=_parse_date(str(raw["date"])) or self.start_date,
+                    open=float(raw.get("open", close)),
+                    high=float(raw.get("high", close)),
+                    low=float(raw.get("low", close)),
+                    close=close,
+                    volume=int(raw.get("volume", 0)),
+                )
+            )
+        if not bars:
+            raise MarketSimulatorError(f"Recorded market data has no bars for {symbol}")
+        bars.sort(key=lambda bar: bar.day)
+        name = entry.get("name", symbol)
+        self._series[symbol] = _Series(symbol, name, entry.get("industry", ""), bars)
+        self._names[name] = symbol
+
+    def _make_index(self) -> _Series:
+        """加權指數：錄製模式使用第一檔股票的交易日，合成模式使用種子產生"""
+        if self._recorded:
+            days = next(iter(self._series.values())).bars
+            level = 17000.0
+            rng = random.Random(f"{self.seed}:{_INDEX_SYMBOL}")
+            bars = []
+            for bar in days:
+                level *= math.exp(rng.gauss(0, 0.01))
+                bars.append(Bar(bar.day, level, level, level, round(level, 2), 0))
+            return _Series(_INDEX_SYMBOL, _INDEX_NAME, "", bars)
+
+        rng = random.Random(f"{self.seed}:{_INDEX_SYMBOL}")
+        first = Bar(self.start_date, 17000.0, 17000.0, 17000.0, 17000.0, 0)
+        return _Series(_INDEX_SYMBOL, _INDEX_NAME, "", [first], rng, tick=False)
+
+    def _fundamentals_rng(self, symbol: str, period: str = "") -> random.Random:
+        return random.Random(f"{self.seed}:{symbol}:{period}")
+
+    def _shares(self, symbol: str) -> int:
+        """模擬發行股數（依代號固定）"""
+        return self._fundamentals_rng(symbol, "shares").randint(1000, 9999) * 1_000_000
+
+    def _period(self, year: int | None, season: int | None) -> tuple[int, int]:
+        """未指定時使用最近一個已公告的季度"""
+        current = self.current_date
+        latest_season = (current.month - 1) // 3 or 4
+        latest_year = current.year if latest_season != 4 else current.year - 1
+        return year or latest_year, season or latest_season
+
+
+def _index_record(bar: Bar, change: float, previous_close: float) -> dict[str, Any]:
+    return {
+        "日期": bar.day.isoformat(),
+        "指數": _INDEX_NAME,
+        "收盤指數": f"{bar.close:.2f}",
+        "漲跌": "+" if change >= 0 else "-",
+        "漲跌點數": f"{abs(change):.2f}",
+        "漲跌百分比": f"{change / previous_close * 100:.2f}",
+        "特殊處理註記": "",
+    }
+
+
+def _parse_date(value: str) -> date | None:
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _ok(data: Any, tool: str) -> dict[str, Any]:
+    return {"success": True, "data": data, "tool": tool}
+
+
+def _error(message: str) -> dict[str, Any]:
+    return {"success": False, "error": message}
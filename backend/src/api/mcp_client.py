@@ -6,6 +6,8 @@ MCP Client 服務
 實作說明：
 - 使用 agents.mcp.MCPServerSse 管理 MCP Server 連接
 - 透過 SSE 協議與 casual-market-mcp 通信
+- CASUAL_MARKET_SSE_URL=local 時改用同程序的模擬市場（api.local_market_mcp）
+- 財報、股利、公司基本資料經由基本面快取（api.fundamentals_cache）
 - 提供完整的錯誤處理和重試機制
 """
 
@@ -14,11 +16,17 @@ from __future__ import annotations
 import asyncio
 import json
 import os
-from typing import Any
-
-from agents.mcp import MCPServerSse
+import time
+from typing import TYPE_CHECKING, Any
 
 from common.logger import logger
+from common.mcp_compat import tool_result_is_error
+from common.metrics import MCP_CALL_SECONDS
+
+if TYPE_CHECKING:
+    from agents.mcp import MCPServer
+
+    from api.fundamentals_cache import FundamentalsCache
 
 
 class MCPMarketClient:
@@ -29,35 +37,57 @@ class MCPMarketClient:
     支援 21 個專業工具。
     """
 
-    def __init__(self, timeout: int = 60):
+    def __init__(self, timeout: int = 60, cache: FundamentalsCache | None = None):
         """
         初始化 MCP Market 客戶端
 
         Args:
             timeout: 超時時間（秒）
+            cache: 基本面快取（未指定時連線 SSE 後使用 get_fundamentals_cache()）
         """
         self.timeout = timeout
+        self.cache = cache
 
         # 使用 SSE URL
         self.sse_url = os.getenv("CASUAL_MARKET_SSE_URL", "http://sacahan-ubunto:8066/sse")
         logger.info(f"MCP Market Client 使用 SSE URL: {self.sse_url}")
 
-        self._server: MCPServerSse | None = None
+        self._server: MCPServer | None = None
+        # 本客戶端排入的基本面背景更新（使用本客戶端的連線）
+        self._refresh_tasks: set[asyncio.Task] = set()
         logger.info("MCP Market Client 已初始化")
 
     async def __aenter__(self):
         """異步上下文管理器進入"""
         logger.debug("創建 MCP Server 連接")
+        from api.local_market_mcp import LocalMarketMCP, is_local_market_url
+
+        if is_local_market_url(self.sse_url):
+            self._server = await LocalMarketMCP().__aenter__()
+            logger.debug("使用本機模擬市場")
+            return self
+
+        # Agents SDK 第一次連線時才載入
+        from agents.mcp import MCPServerSse
+
         self._server = await MCPServerSse(
             name="casual-market-mcp",
             params={"url": self.sse_url},
             client_session_timeout_seconds=self.timeout,
         ).__aenter__()
         logger.info("MCP Server 連接已建立")
+
+        if self.cache is None:
+            from api.fundamentals_cache import get_fundamentals_cache
+
+            self.cache = get_fundamentals_cache()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """異步上下文管理器退出"""
+        if self.cache is not None:
+            # 背景更新仍在使用連線，關閉前等待完成（只等待本客戶端排入的更新）
+            await self.cache.wait_for_refreshes(self._refresh_tasks)
         if self._server:
             try:
                 await self._server.__aexit__(exc_type, exc_val, exc_tb)
@@ -88,6 +118,51 @@ class MCPMarketClient:
             raise RuntimeError("MCP Server 未初始化，請使用 async with 語法")
 
         arguments = arguments or {}
+        if self.cache is not None and self.cache.is_cacheable(tool_name):
+            return await self.cache.get_or_fetch(
+                tool_name,
+                arguments,
+                lambda: self._call_tool_uncached(tool_name, arguments, retries),
+                refresh_tasks=self._refresh_tasks,
+            )
+        return await self._call_tool_uncached(tool_name, arguments, retries)
+
+    async def refresh_cached(
+        self, tool_name: str, arguments: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        直接向 MCP 取得資料並更新基本面快取（預熱用）
+
+        Raises:
+            RuntimeError: 當 server 未初始化或未啟用快取時
+        """
+        if not self._server or self.cache is None:
+            raise RuntimeError("MCP Server 未初始化或未啟用基本面快取")
+        arguments = arguments or {}
+        return await self.cache.refresh(
+            tool_name, arguments, lambda: self._call_tool_uncached(tool_name, arguments, 2)
+        )
+
+    async def _timed_call(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+        """單次 MCP 呼叫（記錄延遲指標，逾時與錯誤結果記為 error）"""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await asyncio.wait_for(
+                self._server.call_tool(tool_name, arguments), timeout=self.timeout
+            )
+            if not tool_result_is_error(result):
+                outcome = "ok"
+            return result
+        finally:
+            MCP_CALL_SECONDS.labels(
+                server=self._server.name, tool=tool_name, outcome=outcome
+            ).observe(time.perf_counter() - started)
+
+    async def _call_tool_uncached(
+        self, tool_name: str, arguments: dict[str, Any], retries: int
+    ) -> dict[str, Any]:
+        """直接調用 MCP 工具（含重試）"""
         last_error = None
 
         for attempt in range(retries + 1):
@@ -95,9 +170,7 @@ class MCPMarketClient:
                 logger.info(f"調用 MCP 工具: {tool_name} (嘗試 {attempt + 1}/{retries + 1})")
 
                 # 使用 MCPServerStdio 的 call_tool 方法
-                result = await asyncio.wait_for(
-                    self._server.call_tool(tool_name, arguments), timeout=self.timeout
-                )
+                result = await self._timed_call(tool_name, arguments)
 
                 # 解析結果
                 if result.content:
@@ -32,6 +32,7 @@ class AgentStatus(str, Enum):
     INACTIVE = "inactive"  # 未啟用
     ERROR = "error"  # 錯誤
     SUSPENDED = "suspended"  # 已暫停
+    DELETING = "deleting"  # 刪除中
 
 
 class AgentRuntimeStatus(str, Enum):
@@ -7,6 +7,7 @@ Agent Execution API Router
 - start 端點：立即返回 session_id，在後台異步執行
 - stop 端點：等待 Agent 停止完成後返回
 - 狀態更新透過 WebSocket 推送
+- 串流模式：增量輸出與工具呼叫以批次推送到 session:<session_id> 主題
 """
 
 from __future__ import annotations
@@ -21,13 +22,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from service.agents_service import AgentNotFoundError
 from common.enums import AgentMode
 from common.logger import logger
+from common.metrics import RUNNING_AGENTS
+from common.profiler import bind_profiling_scope, reset_profiling_scope
 from service.trading_service import (
     AgentBusyError,
     TradingService,
     TradingServiceError,
+    TradeUpdate,
 )
 from service.session_service import AgentSessionService
-from api.config import get_db_session
+from trading.run_stream import RunStreamBatcher
+from database.read_routing import mark_agent_write
+from api.config import get_db_session, get_read_db_session, settings
 from api.websocket import websocket_manager
 
 router = APIRouter()
@@ -52,6 +58,10 @@ class StartModeRequest(BaseModel):
         default=AgentModeEnum.TRADING,
         description="執行模式: TRADING | REBALANCING",
     )
+    stream: bool | None = Field(
+        default=None,
+        description="是否透過 WebSocket 串流推送執行過程（session:<id> 主題），預設依設定",
+    )
 
 
 # ==========================================
@@ -100,11 +110,27 @@ async def get_trading_service(
     return TradingService(db_session)
 
 
+async def get_read_trading_service(
+    db_session: AsyncSession = Depends(get_read_db_session),
+) -> TradingService:
+    """獲取唯讀 TradingService 實例（僅供 GET 端點查詢使用，路由至讀取副本）"""
+    return TradingService(db_session)
+
+
+async def broadcast_trade_update(update: TradeUpdate) -> None:
+    """推送交易、投資組合與績效事件給訂閱該 Agent 的客戶端"""
+    await websocket_manager.broadcast_trade_execution(update.agent_id, update.trade)
+    await websocket_manager.broadcast_portfolio_update(update.agent_id, update.portfolio)
+    if update.performance:
+        await websocket_manager.broadcast_performance_update(update.agent_id, update.performance)
+
+
 async def _execute_in_background(
     trading_service: TradingService,
     agent_id: str,
     mode: AgentMode,
     session_id: str,
+    stream: bool = False,
 ) -> None:
     """
     後台執行 Agent 並推送狀態更新
@@ -120,26 +146,47 @@ async def _execute_in_background(
         agent_id: Agent ID
         mode: 執行模式
         session_id: 既存的 session ID（由 API 層創建）
+        stream: 是否串流推送執行事件（只推送，不寫入資料庫）
     """
     # 為後台執行創建新的 session（獨立於 API 端點的 session）
     from api.config import get_session_maker
 
     session_maker = get_session_maker()
     bg_session = session_maker()
+    stream_sink = None
+    running = RUNNING_AGENTS.labels(mode=mode.value)
+    running.inc()
+    # 讓 /api/admin/profiler 可以只剖析此 session
+    scope_token = bind_profiling_scope(session_id)
 
     try:
         logger.info(f"[Background] Starting execution for agent {agent_id} ({mode.value})")
 
         # 創建新的 TradingService 實例，使用獨立的 session
-        bg_trading_service = TradingService(bg_session)
+        bg_trading_service = TradingService(bg_session, on_trade=broadcast_trade_update)
+
+        if stream:
+
+            async def publish_stream(events: list[dict]) -> None:
+                await websocket_manager.broadcast_execution_stream(agent_id, session_id, events)
+
+            stream_sink = RunStreamBatcher(
+                publish_stream, flush_interval_ms=settings.ws_stream_flush_ms
+            )
+            await stream_sink.start()
 
         # 使用既存的 session_id，避免重複創建
         result = await bg_trading_service.execute_single_mode(
             agent_id=agent_id,
             mode=mode,
             session_id=session_id,
+            stream_sink=stream_sink,
         )
 
+        # 先送出剩餘的串流事件，再推送完成事件
+        if stream_sink is not None:
+            await stream_sink.close()
+
         # ✅ 執行成功 - 推送完成事件
         await websocket_manager.broadcast(
             {
@@ -186,6 +233,14 @@ async def _execute_in_background(
         )
 
     finally:
+        running.dec()
+        reset_profiling_scope(scope_token)
+        if stream_sink is not None:
+            await stream_sink.close()
+
+        # 執行結束時的狀態/交易寫入需讓後續讀取直接走主資料庫
+        mark_agent_write(agent_id)
+
         # 🔒 關鍵：確保後台 session 被正確關閉
         try:
             await bg_session.close()
@@ -255,6 +310,7 @@ async def start_agent_mode(
             initial_input={},
         )
         session_id = session.id
+        mark_agent_write(agent_id)
 
         logger.info(f"API: Created session {session_id}, starting background execution")
 
@@ -272,6 +328,9 @@ async def start_agent_mode(
                 agent_id=agent_id,
                 mode=mode,
                 session_id=session_id,
+                stream=(
+                    request.stream if request.stream is not None else settings.ws_stream_agent_runs
+                ),
             )
         )
         # ⭐ 保存任務以便後續停止
@@ -352,6 +411,7 @@ async def stop_agent(
 
         # 停止正在執行的任務，並等待完成
         result = await trading_service.stop_agent(agent_id)
+        mark_agent_write(agent_id)
 
         # 推送停止事件和狀態更新事件
         # 1. 執行停止事件（包含會話信息）
@@ -413,10 +473,11 @@ async def get_execution_history(
     agent_id: str,
     limit: int = 20,
     status_filter: str | None = None,
+    include_output: bool = False,
     session_service: AgentSessionService = Depends(
-        lambda db_session=Depends(get_db_session): AgentSessionService(db_session)
+        lambda db_session=Depends(get_read_db_session): AgentSessionService(db_session)
     ),
-    trading_service: TradingService = Depends(get_trading_service),
+    trading_service: TradingService = Depends(get_read_trading_service),
 ):
     """
     取得 Agent 執行歷史
@@ -425,6 +486,7 @@ async def get_execution_history(
         agent_id: Agent ID
         limit: 返回的最大記錄數（預設 20）
         status_filter: 狀態過濾器（可選）：pending, running, completed, failed, stopped
+        include_output: 是否包含 final_output（預設否；大型輸出請改用會話詳情端點取得）
 
     Returns:
         執行歷史記錄列表（按時間倒序）
@@ -450,6 +512,7 @@ async def get_execution_history(
             agent_id=agent_id,
             limit=limit,
             status=status_enum,
+            with_payload=include_output,
         )
 
         # 為歷史列表構建回應（包含基本交易統計和詳細交易記錄）
@@ -500,7 +563,7 @@ async def get_execution_history(
                     "start_time": session.start_time,
                     "end_time": session.end_time,
                     "execution_time_ms": session.execution_time_ms,
-                    "final_output": session.final_output,
+                    "final_output": session.final_output if include_output else None,
                     "completed_at": session.end_time,  # 別名，前端可能使用
                     "error_message": session.error_message,
                     "created_at": session.created_at,
@@ -536,9 +599,9 @@ async def get_session_detail(
     agent_id: str,
     session_id: str,
     session_service: AgentSessionService = Depends(
-        lambda db_session=Depends(get_db_session): AgentSessionService(db_session)
+        lambda db_session=Depends(get_read_db_session): AgentSessionService(db_session)
     ),
-    trading_service: TradingService = Depends(get_trading_service),
+    trading_service: TradingService = Depends(get_read_trading_service),
 ):
     """
     取得會話詳細資訊
@@ -555,7 +618,8 @@ async def get_session_detail(
         500: 查詢失敗
     """
     try:
-        session = await session_service.get_session(session_id)
+        # 詳情頁才載入壓縮的大型內容（initial_input / final_output / tools_called）
+        session = await session_service.get_session(session_id, with_payload=True)
 
         if session.agent_id != agent_id:
             raise HTTPException(
@@ -9,19 +9,29 @@ from __future__ import annotations
 import json
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from common.enums import AgentMode
+from common.enums import AgentMode, AgentStatus, SessionStatus
 from common.logger import logger
+from common.time_utils import utc_now
+from database.read_routing import mark_agent_write
 from service.agents_service import (
     AgentConfigurationError,
     AgentDatabaseError,
     AgentNotFoundError,
     AgentsService,
 )
-from api.config import get_db_session
-from schemas.agent import CreateAgentRequest, UpdateAgentRequest
+from service.session_service import AgentSessionService
+from service.agent_purge_service import (
+    AgentPurgeError,
+    AgentPurgeService,
+    PurgeJob,
+    agent_purge_service,
+)
+from api.config import get_db_session, get_read_db_session
+from api.websocket import websocket_manager
+from schemas.agent import CreateAgentRequest, PurgeThrottleRequest, UpdateAgentRequest
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
@@ -44,6 +54,36 @@ def get_agents_service(db_session: AsyncSession = Depends(get_db_session)) -> Ag
     return AgentsService(db_session)
 
 
+def get_read_agents_service(
+    db_session: AsyncSession = Depends(get_read_db_session),
+) -> AgentsService:
+    """
+    獲取唯讀 AgentsService 實例（路由至讀取副本）
+
+    Args:
+        db_session: 唯讀 SQLAlchemy 異步 session
+
+    Returns:
+        AgentsService 實例
+    """
+    return AgentsService(db_session)
+
+
+def get_agent_purge_service() -> AgentPurgeService:
+    """
+    獲取 Agent 背景清除服務
+
+    Returns:
+        全域 AgentPurgeService 實例
+    """
+    return agent_purge_service
+
+
+async def broadcast_purge_progress(job: PurgeJob) -> None:
+    """透過 WebSocket 推送清除進度"""
+    await websocket_manager.broadcast_agent_purge_progress(job.agent_id, job.to_dict())
+
+
 # ==========================================
 # API Endpoints
 # ==========================================
@@ -57,8 +97,8 @@ def get_agents_service(db_session: AsyncSession = Depends(get_db_session)) -> Ag
     description="獲取系統中所有 Agent 的列表",
 )
 async def list_agents(
-    agents_service: AgentsService = Depends(get_agents_service),
-    db_session: AsyncSession = Depends(get_db_session),
+    agents_service: AgentsService = Depends(get_read_agents_service),
+    db_session: AsyncSession = Depends(get_read_db_session),
 ):
     """
     列出所有 Agents
@@ -192,8 +232,8 @@ async def list_agents(
 )
 async def get_agent(
     agent_id: str,
-    agents_service: AgentsService = Depends(get_agents_service),
-    db_session: AsyncSession = Depends(get_db_session),
+    agents_service: AgentsService = Depends(get_read_agents_service),
+    db_session: AsyncSession = Depends(get_read_db_session),
 ):
     """
     取得單一 Agent 詳情
@@ -340,6 +380,7 @@ async def create_agent(
 
         # 提交資料庫變更
         await agents_service.session.commit()
+        mark_agent_write(agent.id)
 
         logger.success(f"Agent created successfully: {agent.id}")
 
@@ -456,6 +497,7 @@ async def update_agent(
 
         # 提交變更
         await agents_service.session.commit()
+        mark_agent_write(agent_id)
         await agents_service.session.refresh(agent)
 
         logger.success(f"Agent updated successfully: {agent_id}")
@@ -512,21 +554,36 @@ async def update_agent(
     "/{agent_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="刪除 Agent",
-    description="刪除指定的 Agent",
+    description="刪除指定的 Agent（立即標記為已刪除，關聯資料於背景分批清除）",
 )
 async def delete_agent(
     agent_id: str,
+    batch_size: int | None = Query(None, ge=1, le=10000, description="每批刪除筆數"),
+    throttle_ms: int | None = Query(None, ge=0, le=60000, description="批次間暫停毫秒數"),
     agents_service: AgentsService = Depends(get_agents_service),
+    purge_service: AgentPurgeService = Depends(get_agent_purge_service),
 ):
     """
     刪除 Agent
 
+    Agent 先標記為 DELETING 並立即從查詢中消失；交易、持股、績效與會話
+    由背景工作以小批次短事務刪除，進度可透過
+    GET /api/agents/{agent_id}/purge 或訂閱該 Agent 主題的 WebSocket
+    `agent_purge_progress` 取得。
+
+    執行中（有 RUNNING 會話）的 Agent 不能刪除，須先呼叫
+    POST /api/agent-execution/{agent_id}/stop 停止，避免背景清除刪掉執行中的會話與交易。
+
     Args:
         agent_id: Agent ID
+        batch_size: 每批刪除筆數（預設 AGENT_PURGE_BATCH_SIZE）
+        throttle_ms: 批次間暫停毫秒數（預設 AGENT_PURGE_THROTTLE_MS）
         agents_service: AgentsService 實例
+        purge_service: AgentPurgeService 實例
 
     Raises:
         404: Agent 不存在
+        409: Agent 執行中
         500: 刪除失敗
     """
     try:
@@ -535,11 +592,32 @@ async def delete_agent(
         # 檢查 agent 是否存在
         agent = await agents_service.get_agent_config(agent_id)
 
-        # 刪除 agent
-        await agents_service.session.delete(agent)
+        # 執行中的 Agent 須先停止
+        running = await AgentSessionService(agents_service.session).count_agent_sessions(
+            agent_id, status=SessionStatus.RUNNING
+        )
+        if running:
+            logger.warning(f"Refusing to delete running agent: {agent_id}")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Agent {agent_id} is running; stop it before deleting",
+            )
+
+        # 標記為刪除中：之後的查詢視為已刪除
+        agent.status = AgentStatus.DELETING.value
+        agent.updated_at = utc_now()
         await agents_service.session.commit()
+        mark_agent_write(agent_id)
+
+        # 背景分批清除關聯資料
+        purge_service.start(
+            agent_id,
+            batch_size=batch_size,
+            throttle_ms=throttle_ms,
+            on_progress=broadcast_purge_progress,
+        )
 
-        logger.success(f"Agent deleted successfully: {agent_id}")
+        logger.success(f"Agent marked deleted, purge scheduled: {agent_id}")
 
     except AgentNotFoundError as e:
         logger.warning(f"Agent not found: {agent_id}")
@@ -548,6 +626,9 @@ async def delete_agent(
             detail=f"Agent {agent_id} not found",
         ) from e
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error(f"Failed to delete agent {agent_id}: {e}")
         await agents_service.session.rollback()
@@ -557,6 +638,59 @@ async def delete_agent(
         ) from e
 
 
+@router.get(
+    "/{agent_id}/purge",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="查詢 Agent 清除進度",
+    description="查詢已刪除 Agent 的背景清除進度",
+)
+async def get_agent_purge_progress(
+    agent_id: str,
+    purge_service: AgentPurgeService = Depends(get_agent_purge_service),
+):
+    """
+    查詢 Agent 背景清除進度
+
+    Raises:
+        404: 沒有此 Agent 的清除工作
+    """
+    job = purge_service.get_job(agent_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No purge job for agent {agent_id}",
+        )
+    return job.to_dict()
+
+
+@router.patch(
+    "/{agent_id}/purge",
+    response_model=dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="調整 Agent 清除節流",
+    description="調整進行中清除工作的批次大小與批次間暫停時間",
+)
+async def throttle_agent_purge(
+    agent_id: str,
+    request: PurgeThrottleRequest,
+    purge_service: AgentPurgeService = Depends(get_agent_purge_service),
+):
+    """
+    調整進行中清除工作的節流（下一批生效）
+
+    Raises:
+        404: 沒有進行中的清除工作
+    """
+    try:
+        job = purge_service.throttle(
+            agent_id, batch_size=request.batch_size, throttle_ms=request.throttle_ms
+        )
+    except AgentPurgeError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    return job.to_dict()
+
+
 @router.post(
     "/{agent_id}/mode",
     response_model=dict[str, Any],
@@ -605,6 +739,7 @@ async def switch_agent_mode(
         )
 
         await agents_service.session.commit()
+        mark_agent_write(agent_id)
 
         logger.success(f"Agent mode switched successfully: {agent_id} -> {mode}")
 
@@ -677,6 +812,7 @@ async def reset_agent(
 
         # 提交變更
         await agents_service.session.commit()
+        mark_agent_write(agent_id)
 
         logger.success(f"Agent reset successfully: {agent_id}")
 
@@ -0,0 +1,146 @@
+"""
+Profiler Admin API Router
+
+隨選剖析執行中的行程或單一 Agent session（common.profiler）。
+
+設計特性：
+- 僅限管理者：需設定 ADMIN_TOKEN，請求帶 X-Admin-Token 標頭；未設定時端點回傳 404
+  （require_admin 也用於 /metrics 與 /api/ws/metrics）
+- 同一時間一個剖析，時間到自動停止；未剖析時沒有取樣開銷
+- 結果以 collapsed stack 檔案下載（flamegraph.pl / speedscope / inferno）
+"""
+
+from __future__ import annotations
+
+import secrets
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+
+from common.logger import logger
+from common.profiler import (
+    MAX_DURATION_SECONDS,
+    MAX_INTERVAL_MS,
+    MIN_INTERVAL_MS,
+    ProfileNotFoundError,
+    ProfilerBusyError,
+    ProfilerError,
+    profiler_manager,
+)
+from api.config import settings
+
+
+# ==========================================
+# Dependencies
+# ==========================================
+
+
+async def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    """Reject requests without a valid admin token (endpoints are hidden when unset)."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+# ==========================================
+# Request Models
+# ==========================================
+
+
+class StartProfileRequest(BaseModel):
+    """開始剖析請求"""
+
+    session_id: str | None = Field(
+        default=None, description="只剖析此 Agent session（未指定表示整個行程）"
+    )
+    interval_ms: float = Field(
+        default=10, ge=MIN_INTERVAL_MS, le=MAX_INTERVAL_MS, description="CPU 取樣間隔（毫秒）"
+    )
+    duration_seconds: float = Field(
+        default=30, gt=0, le=MAX_DURATION_SECONDS, description="最長剖析時間，時間到自動停止"
+    )
+
+
+# ==========================================
+# Endpoints
+# ==========================================
+
+
+def _get_run(profile_id: str):
+    try:
+        return profiler_manager.get(profile_id)
+    except ProfileNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+
+@router.post(
+    "/start",
+    status_code=status.HTTP_201_CREATED,
+    summary="開始剖析",
+)
+async def start_profile(request: StartProfileRequest) -> dict[str, Any]:
+    """
+    Start a sampling profile of the process or one agent session.
+
+    Raises:
+        409: A profile is already running
+        400: Invalid parameters
+    """
+    try:
+        run = await profiler_manager.start(
+            session_id=request.session_id,
+            interval_ms=request.interval_ms,
+            duration_seconds=request.duration_seconds,
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+    except ProfilerError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    logger.info(f"API: Profiler {run.id} started for {request.session_id or 'process'}")
+    return run.summary()
+
+
+@router.post("/{profile_id}/stop", summary="停止剖析")
+async def stop_profile(profile_id: str) -> dict[str, Any]:
+    """Stop a running profile and return its summary (no-op if already finished)."""
+    _get_run(profile_id)
+    run = await profiler_manager.stop(profile_id)
+    return run.summary()
+
+
+@router.get("", summary="列出剖析")
+async def list_profiles() -> list[dict[str, Any]]:
+    """List retained profiles, oldest first."""
+    return [run.summary(top=0) for run in profiler_manager.list()]
+
+
+@router.get("/{profile_id}", summary="剖析摘要")
+async def get_profile(profile_id: str, top: int = 20) -> dict[str, Any]:
+    """
+    Profile summary: top functions by CPU samples, where tasks are awaiting,
+    and event-loop lag percentiles.
+    """
+    return _get_run(profile_id).summary(top=top)
+
+
+@router.get("/{profile_id}/download", summary="下載 collapsed stack")
+async def download_profile(
+    profile_id: str, kind: Literal["cpu", "tasks"] = "cpu"
+) -> PlainTextResponse:
+    """
+    Download the profile in collapsed stack format (one "frame;frame count" per line),
+    readable by flamegraph.pl, speedscope and inferno.
+    """
+    run = _get_run(profile_id)
+    return PlainTextResponse(
+        run.folded(kind),
+        headers={"Content-Disposition": f'attachment; filename="profile-{run.id}-{kind}.folded"'},
+    )
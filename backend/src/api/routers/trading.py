@@ -18,7 +18,7 @@ from service.agents_service import (
     AgentNotFoundError,
     AgentsService,
 )
-from api.config import get_db_session
+from api.config import get_read_db_session
 from api.holiday_client import TaiwanHolidayAPIClient
 from api.mcp_client import create_mcp_market_client
 from dotenv import load_dotenv
@@ -36,12 +36,15 @@ router = APIRouter(prefix="/api/trading", tags=["trading"])
 # ==========================================
 
 
-def get_agents_service(db_session: AsyncSession = Depends(get_db_session)) -> AgentsService:
+def get_agents_service(db_session: AsyncSession = Depends(get_read_db_session)) -> AgentsService:
     """
     獲取 AgentsService 實例
 
+    本路由的端點皆為唯讀查詢，因此使用讀取副本 session；
+    最近有寫入的 Agent 會自動改走主資料庫（read-your-writes）。
+
     Args:
-        db_session: SQLAlchemy 異步 session
+        db_session: 唯讀 SQLAlchemy 異步 session
 
     Returns:
         AgentsService 實例
@@ -4,13 +4,25 @@ WebSocket Router
 WebSocket endpoint for real-time communication.
 """
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import json
+from typing import Any
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 from loguru import logger
 
 from ..websocket import websocket_manager
+from .profiling import require_admin
 
 router = APIRouter()
 
+_COMMANDS = ("subscribe", "unsubscribe", "hello", "resync")
+
+
+@router.get("/api/ws/metrics", dependencies=[Depends(require_admin)])
+async def websocket_metrics() -> dict[str, Any]:
+    """WebSocket broadcast metrics (queue depth, drops, send latency); admin only."""
+    return websocket_manager.get_metrics()
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -23,7 +35,14 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
             logger.debug(f"Received WebSocket message: {data}")
 
-            # Echo back for now (can be extended for client commands)
+            command = _parse_command(data)
+            if command is not None:
+                reply = await _handle_command(websocket, command)
+                if reply is not None:
+                    await websocket_manager.send_to_client(websocket, reply)
+                continue
+
+            # Echo back other messages
             await websocket_manager.send_to_client(
                 websocket, {"type": "pong", "data": {"received": data}}
             )
@@ -33,3 +52,58 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         await websocket_manager.disconnect(websocket)
+
+
+async def _handle_command(websocket: WebSocket, command: dict[str, Any]) -> dict[str, Any] | None:
+    """Apply a parsed command and return the reply (None when the reply is queued)."""
+    action = command["type"]
+    if action == "hello":
+        # Only a JSON boolean enables delta mode; bool("false") would be True
+        delta = command.get("delta", False)
+        if not isinstance(delta, bool):
+            return {
+                "type": "error",
+                "error": "hello: delta must be a boolean",
+                "data": {"delta": delta},
+            }
+        # Reply is sent as JSON text so the client can read it before switching decoders
+        return await websocket_manager.negotiate(
+            websocket,
+            encoding=str(command.get("encoding") or "json"),
+            delta=delta,
+        )
+    if action == "resync":
+        await websocket_manager.resync(websocket, str(command.get("agent_id", "")))
+        return None
+
+    topics = command.get("topics") or []
+    if isinstance(topics, str):
+        topics = [topics]
+    topics = [str(topic) for topic in topics]
+    if action == "subscribe":
+        current = await websocket_manager.subscribe(websocket, topics)
+    else:
+        current = await websocket_manager.unsubscribe(websocket, topics)
+    return {"type": "subscriptions", "topics": current}
+
+
+def _parse_command(data: str) -> dict[str, Any] | None:
+    """
+    Parse a client command.
+
+    Supported messages:
+        {"type": "subscribe", "topics": ["agent:<id>", ...]}
+        {"type": "unsubscribe", "topics": ["*"]}
+        {"type": "hello", "encoding": "json" | "msgpack", "delta": true}
+        {"type": "resync", "agent_id": "<id>"}
+
+    Returns:
+        The command message, or None for any other message.
+    """
+    try:
+        message = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(message, dict) or message.get("type") not in _COMMANDS:
+        return None
+    return message
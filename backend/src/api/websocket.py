@@ -6,34 +6,161 @@ WebSocket 管理器
 
 import asyncio
 import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from api.config import settings
+from api.event_bus import InProcessEventBus, PostgresEventBus, create_event_bus
+from api.ws_payloads import (
+    ENCODING_JSON,
+    ENCODING_MSGPACK,
+    diff_portfolio,
+    encode_message,
+    msgpack_available,
+)
 from common.logger import logger
 
+# 慢速客戶端處理策略
+SLOW_CONSUMER_DISCONNECT = "disconnect"  # 佇列滿時斷線（客戶端重連後重新同步）
+SLOW_CONSUMER_DROP = "drop"  # 佇列滿時丟棄新訊息，並在恢復時通知丟棄數量
+
+# WebSocket close code 1013: Try Again Later
+_CLOSE_CODE_SLOW_CONSUMER = 1013
+
+# 延遲統計保留的樣本數
+_LATENCY_SAMPLES = 1024
+
+# 訂閱所有主題的萬用主題（新連線預設訂閱，維持舊客戶端行為）
+TOPIC_ALL = "*"
+
+
+def agent_topic(agent_id: str) -> str:
+    """取得 Agent 專屬主題名稱"""
+    return f"agent:{agent_id}"
+
+
+def session_topic(session_id: str) -> str:
+    """取得執行會話專屬主題名稱（串流事件）"""
+    return f"session:{session_id}"
+
+
+@dataclass
+class _ConnectionState:
+    """單一連線的送出佇列與統計"""
+
+    websocket: WebSocket
+    queue: asyncio.Queue
+    send_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    writer: asyncio.Task | None = None
+    sent: int = 0
+    dropped: int = 0
+    pending_drop_notice: int = 0
+    max_depth: int = 0
+    topics: set[str] = field(default_factory=lambda: {TOPIC_ALL})
+    encoding: str = ENCODING_JSON
+    delta: bool = False
+    # 差量模式下，各 Agent 最後送給此連線的投資組合序號
+    portfolio_seq: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def plain(self) -> bool:
+        """是否為預設的 JSON 完整訊息連線"""
+        return self.encoding == ENCODING_JSON and not self.delta
+
+
+def _summarize(samples: deque[float]) -> dict[str, float]:
+    """計算延遲樣本的 p50 / p95 / max"""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
 
 class WebSocketManager:
     """
     WebSocket 連線管理類別。
     負責管理所有 WebSocket 連線，並提供事件廣播功能。
+
+    每個連線有獨立的有界送出佇列與寫入任務：廣播只序列化一次並放入各佇列，
+    慢速客戶端不會拖慢其他連線；佇列溢出時依策略斷線或丟棄訊息。
+
+    Agent 細節事件（交易、投資組合、績效、策略）只發佈到 `agent:<id>` 主題，
+    僅送給訂閱該主題（或萬用主題 `*`）的連線。投資組合與績效更新依 Agent 在合併視窗內
+    只送出最新狀態，交易事件則逐筆送出。
+
+    事件經由事件匯流排發佈：預設為單一程序；多 worker 部署時使用 PostgreSQL LISTEN/NOTIFY，
+    每個 worker 收到事件後只推送給自己的連線。
+
+    客戶端可協商 msgpack 二進位編碼與投資組合差量模式（預設為 JSON 完整訊息）：
+    差量模式只送出變更的欄位與持股，並附上序號；序號不連續時改送完整快照。
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        send_timeout: float = 10.0,
+        slow_consumer_policy: str = SLOW_CONSUMER_DISCONNECT,
+        coalesce_window_ms: int = 0,
+        event_bus: InProcessEventBus | PostgresEventBus | None = None,
+    ):
         """
         初始化 WebSocket 管理器。
         active_connections 儲存所有目前連線的 WebSocket 實例。
         _lock 用於確保多協程操作安全。
+
+        Args:
+            max_queue_size: 每個連線的送出佇列上限
+            send_timeout: 單次送出逾時秒數（逾時視為慢速客戶端並斷線）
+            slow_consumer_policy: 佇列溢出時的策略（disconnect / drop）
+            coalesce_window_ms: 投資組合/績效更新的合併視窗（毫秒，0 表示不合併）
+            event_bus: 事件匯流排（預設為單一程序）
         """
         self.active_connections: list[WebSocket] = []  # 目前所有連線
         self._lock = asyncio.Lock()  # 協程鎖
+        self._connections: dict[WebSocket, _ConnectionState] = {}  # 連線送出狀態
+        self._topics: dict[str, set[WebSocket]] = {}  # 主題 -> 訂閱連線索引
+
+        self._max_queue_size = max(1, max_queue_size)
+        self._send_timeout = send_timeout
+        self._slow_consumer_policy = slow_consumer_policy
+        self._coalesce_window = max(0, coalesce_window_ms) / 1000
+        self._event_bus = event_bus or InProcessEventBus()
+        self._event_bus.set_handler(self._dispatch_local)
+
+        # 合併中的狀態更新：(agent_id, type) -> 最新訊息，視窗結束時只送出最新一筆
+        self._coalesce_pending: dict[tuple[str, str], dict[str, Any]] = {}
+        self._coalesce_tasks: dict[tuple[str, str], asyncio.Task] = {}
+        self._coalesce_received = 0
+        self._coalesce_sent = 0
+
+        # 投資組合差量基準：agent_id -> (序號, 最新投資組合資料)
+        self._portfolio_state: dict[str, tuple[int, dict[str, Any]]] = {}
+        self._portfolio_deltas = 0
+        self._portfolio_snapshots = 0
+
+        # 統計資訊
+        self._messages_broadcast = 0
+        self._messages_sent = 0
+        self._messages_dropped = 0
+        self._slow_consumer_disconnects = 0
+        self._send_latencies_ms: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._delivery_latencies_ms: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
 
     async def startup(self):
         """
         啟動時初始化管理器。
-        僅記錄初始化訊息。
+        啟動事件匯流排（PostgreSQL 匯流排會建立 LISTEN 連線）。
         """
+        await self._event_bus.start()
         logger.info("WebSocket Manager initialized")
 
     async def shutdown(self):
@@ -41,7 +168,22 @@ class WebSocketManager:
         關閉管理器時清理所有連線。
         逐一關閉所有 WebSocket，並清空連線列表。
         """
+        for task in self._coalesce_tasks.values():
+            task.cancel()
+        self._coalesce_tasks.clear()
+        self._coalesce_pending.clear()
+
+        try:
+            await self._event_bus.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping event bus: {e}")
+
         async with self._lock:
+            for state in self._connections.values():
+                self._stop_writer(state)
+            self._connections.clear()
+            self._topics.clear()
+            self._portfolio_state.clear()
             for connection in self.active_connections:
                 try:
                     await connection.close()
@@ -53,11 +195,12 @@ class WebSocketManager:
     async def connect(self, websocket: WebSocket):
         """
         接受新的 WebSocket 連線。
-        先呼叫 accept()，再加入 active_connections。
+        先呼叫 accept()，再加入 active_connections 並啟動寫入任務。
         """
         await websocket.accept()
         async with self._lock:
             self.active_connections.append(websocket)
+            self._ensure_state(websocket)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
     async def disconnect(self, websocket: WebSocket):
@@ -66,46 +209,104 @@ class WebSocketManager:
         若連線存在則移除，並記錄剩餘連線數。
         """
         async with self._lock:
-            if websocket in self.active_connections:
-                self.active_connections.remove(websocket)
+            self._remove_locked(websocket)
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
     async def broadcast(self, message: dict[str, Any]):
         """
         廣播訊息給所有已連線的客戶端。
         會自動補上 timestamp 欄位。
-        若有斷線則移除。
+
+        訊息只序列化一次並放入各連線的送出佇列，由各自的寫入任務並行送出；
+        送出失敗的連線會被移除，佇列溢出的連線依策略斷線或丟棄訊息。
         """
-        if not self.active_connections:
-            return
+        await self._emit(None, message)
 
-        # 若 message 未含 timestamp，則補上目前時間
-        if "timestamp" not in message:
-            message["timestamp"] = datetime.now().isoformat()
+    async def publish(self, topic: str, message: dict[str, Any]):
+        """
+        發佈訊息到指定主題。
+        只送給訂閱該主題或萬用主題的連線；單一程序時沒有訂閱者則不序列化。
+        """
+        await self._emit(topic, message)
 
-        message_text = json.dumps(message, default=str)  # 轉成 JSON 字串
+    async def subscribe(self, websocket: WebSocket, topics: list[str]) -> list[str]:
+        """
+        訂閱主題。
 
-        # 複製連線列表，避免迭代時被修改
+        Returns:
+            連線目前訂閱的主題列表
+        """
         async with self._lock:
-            connections = self.active_connections.copy()
+            state = self._connections.get(websocket)
+            if state is None:
+                return []
+            for topic in topics:
+                state.topics.add(topic)
+                self._topics.setdefault(topic, set()).add(websocket)
+            return sorted(state.topics)
 
-        disconnected = []  # 記錄斷線的連線
-        for connection in connections:
-            try:
-                await connection.send_text(message_text)
-            except WebSocketDisconnect:
-                disconnected.append(connection)
-            except Exception as e:
-                logger.error(f"Error broadcasting to WebSocket: {e}")
-                disconnected.append(connection)
-
-        # 移除斷線的客戶端
-        if disconnected:
-            async with self._lock:
-                for conn in disconnected:
-                    if conn in self.active_connections:
-                        self.active_connections.remove(conn)
-            logger.info(f"Removed {len(disconnected)} disconnected clients")
+    async def unsubscribe(self, websocket: WebSocket, topics: list[str]) -> list[str]:
+        """
+        取消訂閱主題（取消 `*` 後只會收到已訂閱主題與全域事件）。
+
+        Returns:
+            連線目前訂閱的主題列表
+        """
+        async with self._lock:
+            state = self._connections.get(websocket)
+            if state is None:
+                return []
+            for topic in topics:
+                state.topics.discard(topic)
+                self._unindex_locked(websocket, topic)
+            return sorted(state.topics)
+
+    def get_subscriber_count(self, topic: str) -> int:
+        """取得主題的訂閱連線數（不含萬用主題）"""
+        return len(self._topics.get(topic, ()))
+
+    async def negotiate(
+        self, websocket: WebSocket, encoding: str = ENCODING_JSON, delta: bool = False
+    ) -> dict[str, Any]:
+        """
+        協商連線的訊息編碼與投資組合差量模式。
+        伺服器未安裝 msgpack 或編碼不支援時維持 JSON。
+
+        Returns:
+            welcome 訊息（實際採用的設定）
+        """
+        if encoding != ENCODING_MSGPACK or not msgpack_available():
+            encoding = ENCODING_JSON
+
+        async with self._lock:
+            state = self._connections.get(websocket)
+            if state is not None:
+                state.encoding = encoding
+                state.delta = delta
+                state.portfolio_seq.clear()
+        return {"type": "welcome", "encoding": encoding, "delta": delta}
+
+    async def resync(self, websocket: WebSocket, agent_id: str):
+        """
+        重新送出 Agent 投資組合完整快照（客戶端偵測到序號不連續時請求）。
+        伺服器尚無該 Agent 的投資組合時回覆 resync_unavailable，由客戶端改用 REST 取得。
+        """
+        state = self._connections.get(websocket)
+        if state is None:
+            return
+
+        current = self._portfolio_state.get(agent_id)
+        if current is None:
+            message = {"type": "resync_unavailable", "agent_id": agent_id}
+        else:
+            seq, data = current
+            message = self._portfolio_snapshot(agent_id, seq, data)
+            state.portfolio_seq[agent_id] = seq
+        message.setdefault("timestamp", datetime.now().isoformat())
+
+        payload = encode_message(message, state.encoding)
+        if not self._enqueue(state, payload, time.perf_counter()):
+            await self._disconnect_slow_consumers([websocket])
 
     async def send_to_client(self, websocket: WebSocket, message: dict[str, Any]):
         """
@@ -115,12 +316,51 @@ class WebSocketManager:
         if "timestamp" not in message:
             message["timestamp"] = datetime.now().isoformat()
 
+        state = self._connections.get(websocket)
         try:
-            await websocket.send_json(message)
+            if state is None:
+                await websocket.send_json(message)
+            else:
+                # 與寫入任務共用送出鎖，避免同一連線並行送出
+                async with state.send_lock:
+                    await websocket.send_json(message)
         except Exception as e:
             logger.error(f"Error sending to WebSocket: {e}")
             await self.disconnect(websocket)
 
+    def get_metrics(self) -> dict[str, Any]:
+        """
+        取得廣播統計資訊。
+
+        Returns:
+            連線數、佇列深度、送出/丟棄數量與送出延遲（毫秒）
+        """
+        depths = [state.queue.qsize() for state in self._connections.values()]
+        return {
+            "connections": len(self.active_connections),
+            "event_bus": self._event_bus.get_metrics(),
+            "topics": {topic: len(sockets) for topic, sockets in self._topics.items()},
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "queue_capacity": self._max_queue_size,
+            "messages_broadcast": self._messages_broadcast,
+            "messages_sent": self._messages_sent,
+            "messages_dropped": self._messages_dropped,
+            "slow_consumer_disconnects": self._slow_consumer_disconnects,
+            "coalesce_received": self._coalesce_received,
+            "coalesce_sent": self._coalesce_sent,
+            "coalesce_ratio": (
+                round(self._coalesce_received / self._coalesce_sent, 3)
+                if self._coalesce_sent
+                else 0.0
+            ),
+            "encodings": self._count_encodings(),
+            "portfolio_deltas": self._portfolio_deltas,
+            "portfolio_snapshots": self._portfolio_snapshots,
+            "send_latency_ms": _summarize(self._send_latencies_ms),
+            "delivery_latency_ms": _summarize(self._delivery_latencies_ms),
+        }
+
     async def broadcast_agent_status(
         self,
         agent_id: str,
@@ -157,42 +397,65 @@ class WebSocketManager:
     async def broadcast_trade_execution(self, agent_id: str, trade_data: dict[str, Any]):
         """
         廣播代理人交易執行事件。
-        會將交易資料廣播給所有客戶端。
+        只送給訂閱該 Agent 主題的客戶端。
         """
         message = {"type": "trade_execution", "agent_id": agent_id, "data": trade_data}
-        await self.broadcast(message)
+        await self.publish(agent_topic(agent_id), message)
 
     async def broadcast_strategy_change(self, agent_id: str, change_data: dict[str, Any]):
         """
         廣播代理人策略變更事件。
-        會將策略變更資料廣播給所有客戶端。
+        只送給訂閱該 Agent 主題的客戶端。
         """
         message = {"type": "strategy_change", "agent_id": agent_id, "data": change_data}
-        await self.broadcast(message)
+        await self.publish(agent_topic(agent_id), message)
 
     async def broadcast_portfolio_update(self, agent_id: str, portfolio_data: dict[str, Any]):
         """
         廣播代理人投資組合更新事件。
-        會將最新投資組合資料廣播給所有客戶端。
+        只送給訂閱該 Agent 主題的客戶端；合併視窗內只送出最新狀態。
         """
         message = {
             "type": "portfolio_update",
             "agent_id": agent_id,
             "data": portfolio_data,
         }
-        await self.broadcast(message)
+        await self._publish_coalesced(agent_id, message)
 
     async def broadcast_performance_update(self, agent_id: str, performance_data: dict[str, Any]):
         """
         廣播代理人績效指標更新事件。
-        會將最新績效資料廣播給所有客戶端。
+        只送給訂閱該 Agent 主題的客戶端；合併視窗內只送出最新狀態。
         """
         message = {
             "type": "performance_update",
             "agent_id": agent_id,
             "data": performance_data,
         }
-        await self.broadcast(message)
+        await self._publish_coalesced(agent_id, message)
+
+    async def broadcast_execution_stream(
+        self, agent_id: str, session_id: str, events: list[dict[str, Any]]
+    ):
+        """
+        發佈執行串流事件（增量文字、工具呼叫、sub-agent 事件）。
+        只送給訂閱該會話主題的客戶端。
+        """
+        message = {
+            "type": "execution_stream",
+            "agent_id": agent_id,
+            "session_id": session_id,
+            "events": events,
+        }
+        await self.publish(session_topic(session_id), message)
+
+    async def broadcast_agent_purge_progress(self, agent_id: str, progress: dict[str, Any]):
+        """
+        廣播代理人背景清除進度事件。
+        刪除代理人後，每批刪除完成時推送一次；只送給訂閱該 Agent 主題的客戶端。
+        """
+        message = {"type": "agent_purge_progress", "agent_id": agent_id, "data": progress}
+        await self.publish(agent_topic(agent_id), message)
 
     async def broadcast_error(
         self,
@@ -315,6 +578,374 @@ class WebSocketManager:
 
         await self.broadcast(message)
 
+    # ==========================================
+    # Internal
+    # ==========================================
+
+    async def _emit(self, topic: str | None, message: dict[str, Any]):
+        """補上 timestamp、序列化一次後交給事件匯流排"""
+        # 單一程序時沒有收件者就不需序列化
+        if self._event_bus.local_only and not self._has_recipients(topic):
+            if message.get("type") == "portfolio_update":
+                # 未推送的投資組合不能作為差量基準
+                self._portfolio_state.pop(message["agent_id"], None)
+            return
+
+        # 若 message 未含 timestamp，則補上目前時間
+        if "timestamp" not in message:
+            message["timestamp"] = datetime.now().isoformat()
+
+        message_text = json.dumps(message, default=str)  # 轉成 JSON 字串
+        await self._event_bus.publish(topic, message_text)
+
+    def _has_recipients(self, topic: str | None) -> bool:
+        """本機是否有連線會收到此主題"""
+        if topic is None:
+            return bool(self.active_connections)
+        return bool(self._topics.get(topic) or self._topics.get(TOPIC_ALL))
+
+    async def _dispatch_local(self, topic: str | None, message_text: str):
+        """事件匯流排回呼：推送給本機連線"""
+        async with self._lock:
+            if topic is None:
+                # 複製連線列表，避免迭代時被修改
+                states = [self._ensure_state(connection) for connection in self.active_connections]
+            else:
+                subscribers = self._topics.get(topic, set()) | self._topics.get(TOPIC_ALL, set())
+                states = [
+                    self._connections[connection]
+                    for connection in subscribers
+                    if connection in self._connections
+                ]
+
+        message = self._parse_portfolio_update(topic, message_text)
+        if message is not None:
+            # 投資組合更新一律記錄差量基準（即使目前沒有差量模式的連線）
+            snapshot, delta = self._advance_portfolio(message)
+        if not states:
+            return
+
+        if message is None:
+            if all(state.plain for state in states):
+                # 一般情況：所有連線都使用 JSON 完整訊息，直接送出匯流排收到的文字
+                await self._deliver(states, message_text)
+            else:
+                await self._deliver_encoded(
+                    states,
+                    {"full": json.loads(message_text)},
+                    lambda _state: "full",
+                    plain_text=message_text,
+                )
+            return
+
+        agent_id = message["agent_id"]
+
+        def variant(state: _ConnectionState) -> str:
+            if not state.delta:
+                return "full"
+            if delta is not None and state.portfolio_seq.get(agent_id) == delta["base_seq"]:
+                chosen = "delta"
+            else:
+                # 第一次收到或序號不連續：送完整快照
+                chosen = "snapshot"
+            state.portfolio_seq[agent_id] = snapshot["seq"]
+            return chosen
+
+        await self._deliver_encoded(
+            states,
+            {"full": message, "snapshot": snapshot, "delta": delta},
+            variant,
+            plain_text=message_text,
+        )
+
+    @staticmethod
+    def _parse_portfolio_update(topic: str | None, message_text: str) -> dict[str, Any] | None:
+        """Agent 主題上的投資組合更新回傳解析後的訊息，其他事件回傳 None"""
+        if topic is None or not topic.startswith("agent:"):
+            return None
+        message = json.loads(message_text)
+        return message if message.get("type") == "portfolio_update" else None
+
+    async def _deliver_encoded(
+        self,
+        states: list[_ConnectionState],
+        variants: dict[str, dict[str, Any] | None],
+        choose,
+        plain_text: str | None = None,
+    ):
+        """
+        依各連線的訊息版本與編碼分組，每組只序列化一次後放入送出佇列
+
+        Args:
+            variants: 版本名稱 -> 訊息
+            choose: 依連線選擇版本的函式
+            plain_text: 完整訊息的 JSON 文字（可直接重用）
+        """
+        groups: dict[tuple[str, str], list[_ConnectionState]] = {}
+        for state in states:
+            groups.setdefault((choose(state), state.encoding), []).append(state)
+
+        for (name, encoding), members in groups.items():
+            if name == "full" and encoding == ENCODING_JSON and plain_text is not None:
+                payload = plain_text
+            else:
+                payload = encode_message(variants[name], encoding)
+            if name == "delta":
+                self._portfolio_deltas += len(members)
+            elif name == "snapshot":
+                self._portfolio_snapshots += len(members)
+            await self._deliver(members, payload)
+
+    def _advance_portfolio(
+        self, message: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """
+        記錄 Agent 最新投資組合並遞增序號
+
+        Returns:
+            (含序號的完整快照, 相對上一版的差量訊息；沒有上一版時為 None)
+        """
+        agent_id = message["agent_id"]
+        data = message.get("data") or {}
+        previous = self._portfolio_state.get(agent_id)
+        seq = previous[0] + 1 if previous else 1
+        self._portfolio_state[agent_id] = (seq, data)
+
+        snapshot = self._portfolio_snapshot(agent_id, seq, data, message.get("timestamp"))
+        if previous is None:
+            return snapshot, None
+
+        delta = {
+            "type": "portfolio_delta",
+            "agent_id": agent_id,
+            "seq": seq,
+            "base_seq": previous[0],
+            "timestamp": message.get("timestamp"),
+            "changes": diff_portfolio(previous[1], data),
+        }
+        return snapshot, delta
+
+    @staticmethod
+    def _portfolio_snapshot(
+        agent_id: str, seq: int, data: dict[str, Any], timestamp: str | None = None
+    ) -> dict[str, Any]:
+        """建立含序號的投資組合完整快照"""
+        message = {"type": "portfolio_update", "agent_id": agent_id, "seq": seq, "data": data}
+        if timestamp is not None:
+            message["timestamp"] = timestamp
+        return message
+
+    def _count_encodings(self) -> dict[str, int]:
+        """統計各編碼 / 差量模式的連線數"""
+        counts: dict[str, int] = {}
+        for state in self._connections.values():
+            key = f"{state.encoding}+delta" if state.delta else state.encoding
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    async def _deliver(self, states: list[_ConnectionState], payload: str | bytes):
+        """將已序列化的訊息放入各連線的送出佇列"""
+        enqueued_at = time.perf_counter()
+        self._messages_broadcast += 1
+
+        slow_consumers = []
+        for state in states:
+            if not self._enqueue(state, payload, enqueued_at):
+                slow_consumers.append(state.websocket)
+
+        if slow_consumers:
+            await self._disconnect_slow_consumers(slow_consumers)
+
+        # 讓寫入任務有機會立即開始送出
+        await asyncio.sleep(0)
+
+    async def _publish_coalesced(self, agent_id: str, message: dict[str, Any]):
+        """
+        合併同一 Agent、同一類型的狀態更新
+
+        視窗內的第一筆更新啟動計時，後續更新只取代待送訊息；
+        視窗結束時送出最新一筆（交易事件不經過此路徑，不會遺失）。
+        """
+        self._coalesce_received += 1
+        if self._coalesce_window <= 0:
+            self._coalesce_sent += 1
+            await self.publish(agent_topic(agent_id), message)
+            return
+
+        key = (agent_id, message["type"])
+        self._coalesce_pending[key] = message
+        if key not in self._coalesce_tasks:
+            self._coalesce_tasks[key] = asyncio.create_task(self._flush_coalesced(key))
+
+    async def _flush_coalesced(self, key: tuple[str, str]):
+        """
+        合併視窗結束時送出最新的狀態更新
+
+        在背景任務中執行，沒有呼叫端可接住例外：發佈失敗只記錄錯誤。
+        """
+        try:
+            await asyncio.sleep(self._coalesce_window)
+        finally:
+            self._coalesce_tasks.pop(key, None)
+        message = self._coalesce_pending.pop(key, None)
+        if message is None:
+            return
+        try:
+            await self.publish(agent_topic(key[0]), message)
+        except Exception as e:
+            logger.error(f"Error publishing coalesced {key[1]} for agent {key[0]}: {e}")
+            return
+        self._coalesce_sent += 1
+
+    def _ensure_state(self, websocket: WebSocket) -> _ConnectionState:
+        """取得連線狀態，不存在時建立並啟動寫入任務（需持有 _lock）"""
+        state = self._connections.get(websocket)
+        if state is None:
+            state = _ConnectionState(
+                websocket=websocket, queue=asyncio.Queue(maxsize=self._max_queue_size)
+            )
+            state.writer = asyncio.create_task(self._writer(state))
+            self._connections[websocket] = state
+            for topic in state.topics:
+                self._topics.setdefault(topic, set()).add(websocket)
+        return state
+
+    def _enqueue(self, state: _ConnectionState, payload: str | bytes, enqueued_at: float) -> bool:
+        """
+        放入連線送出佇列
+
+        Returns:
+            False 表示佇列已滿且策略為斷線
+        """
+        try:
+            state.queue.put_nowait((payload, enqueued_at))
+        except asyncio.QueueFull:
+            if self._slow_consumer_policy == SLOW_CONSUMER_DROP:
+                state.dropped += 1
+                state.pending_drop_notice += 1
+                self._messages_dropped += 1
+                # 丟棄的可能是投資組合更新，下一次改送完整快照
+                state.portfolio_seq.clear()
+                return True
+            return False
+
+        state.max_depth = max(state.max_depth, state.queue.qsize())
+        return True
+
+    async def _writer(self, state: _ConnectionState):
+        """連線寫入任務：依序送出佇列中的訊息"""
+        while True:
+            payload, enqueued_at = await state.queue.get()
+
+            if state.pending_drop_notice:
+                # 通知客戶端有訊息被丟棄，讓前端重新取得最新狀態
+                notice = encode_message(
+                    {
+                        "type": "messages_dropped",
+                        "count": state.pending_drop_notice,
+                        "timestamp": datetime.now().isoformat(),
+                    },
+                    state.encoding,
+                )
+                state.pending_drop_notice = 0
+                if not await self._send(state, notice, enqueued_at, record=False):
+                    return
+
+            if not await self._send(state, payload, enqueued_at):
+                return
+
+    async def _send(
+        self, state: _ConnectionState, payload: str | bytes, enqueued_at: float, record: bool = True
+    ) -> bool:
+        """送出單一訊息（bytes 以二進位訊息送出）；失敗時移除連線並回傳 False"""
+        websocket = state.websocket
+        started = time.perf_counter()
+        try:
+            async with state.send_lock:
+                async with asyncio.timeout(self._send_timeout):
+                    if isinstance(payload, bytes):
+                        await websocket.send_bytes(payload)
+                    else:
+                        await websocket.send_text(payload)
+        except WebSocketDisconnect:
+            await self._drop_connection(websocket)
+            return False
+        except TimeoutError:
+            logger.warning(f"WebSocket send timed out after {self._send_timeout}s, disconnecting")
+            self._slow_consumer_disconnects += 1
+            await self._drop_connection(websocket, close_code=_CLOSE_CODE_SLOW_CONSUMER)
+            return False
+        except Exception as e:
+            logger.error(f"Error broadcasting to WebSocket: {e}")
+            await self._drop_connection(websocket)
+            return False
+
+        if record:
+            finished = time.perf_counter()
+            state.sent += 1
+            self._messages_sent += 1
+            self._send_latencies_ms.append((finished - started) * 1000)
+            self._delivery_latencies_ms.append((finished - enqueued_at) * 1000)
+        return True
+
+    async def _disconnect_slow_consumers(self, connections: list[WebSocket]):
+        """斷開佇列溢出的慢速客戶端"""
+        for connection in connections:
+            self._slow_consumer_disconnects += 1
+            await self._drop_connection(connection, close_code=_CLOSE_CODE_SLOW_CONSUMER)
+        logger.warning(f"Disconnected {len(connections)} slow WebSocket consumers")
+
+    async def _drop_connection(self, websocket: WebSocket, close_code: int | None = None):
+        """移除連線（可選擇主動關閉）"""
+        async with self._lock:
+            removed = self._remove_locked(websocket)
+        if removed:
+            logger.info(
+                f"Removed disconnected client. Total connections: {len(self.active_connections)}"
+            )
+        if close_code is not None:
+            try:
+                await websocket.close(code=close_code)
+            except Exception:
+                pass
+
+    def _remove_locked(self, websocket: WebSocket) -> bool:
+        """移除連線與其寫入任務（需持有 _lock）"""
+        removed = websocket in self.active_connections
+        if removed:
+            self.active_connections.remove(websocket)
+        state = self._connections.pop(websocket, None)
+        if state is not None:
+            self._stop_writer(state)
+            for topic in state.topics:
+                self._unindex_locked(websocket, topic)
+        return removed
+
+    def _unindex_locked(self, websocket: WebSocket, topic: str):
+        """從主題索引移除連線（需持有 _lock）"""
+        sockets = self._topics.get(topic)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self._topics[topic]
+
+    @staticmethod
+    def _stop_writer(state: _ConnectionState):
+        """停止寫入任務（由寫入任務自身呼叫時不取消）"""
+        writer = state.writer
+        if writer is not None and writer is not asyncio.current_task() and not writer.done():
+            writer.cancel()
+
 
 # 全域 WebSocket 管理器實例
-websocket_manager = WebSocketManager()  # 供 API 其他模組直接使用
+websocket_manager = WebSocketManager(
+    max_queue_size=settings.ws_send_queue_size,
+    send_timeout=settings.ws_send_timeout,
+    slow_consumer_policy=settings.ws_slow_consumer_policy,
+    coalesce_window_ms=settings.ws_coalesce_window_ms,
+    event_bus=create_event_bus(
+        settings.ws_event_bus,
+        dsn=settings.ws_event_bus_url or settings.database_url,
+        channel=settings.ws_event_bus_channel,
+    ),
+)  # 供 API 其他模組直接使用
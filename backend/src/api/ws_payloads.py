@@ -0,0 +1,120 @@
+"""
+WebSocket 訊息編碼與投資組合差量
+
+- 編碼：預設 JSON 文字訊息；客戶端協商後可改用 msgpack 二進位訊息（需安裝 msgpack）
+- 差量：投資組合更新只傳送變更的欄位與持股，並附上序號供客戶端偵測遺漏
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+# 清單欄位中用來辨識項目的鍵（持股以股票代號辨識）
+_LIST_ITEM_KEYS = ("ticker", "symbol", "id")
+
+_MISSING = object()
+
+
+def msgpack_available() -> bool:
+    """是否可使用 msgpack 編碼"""
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_message(message: dict[str, Any], encoding: str) -> str | bytes:
+    """
+    依連線協商的編碼序列化訊息
+
+    Returns:
+        JSON 字串（文字訊息）或 msgpack bytes（二進位訊息）
+    """
+    if encoding == ENCODING_MSGPACK:
+        import msgpack
+
+        return msgpack.packb(message, default=str)
+    return json.dumps(message, default=str)
+
+
+def diff_portfolio(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """
+    計算投資組合差量
+
+    Args:
+        previous: 上一次送出的投資組合資料
+        current: 最新的投資組合資料
+
+    Returns:
+        {
+            "set": 變更或新增的欄位,
+            "unset": 移除的欄位,
+            "lists": {欄位: {"key": 項目鍵, "upsert": 變更的項目, "remove": 移除的項目鍵}}
+        }
+        清單欄位（例如持股）只包含變更的項目；客戶端依項目鍵合併。
+    """
+    changes: dict[str, Any] = {"set": {}, "unset": [], "lists": {}}
+
+    for field, value in current.items():
+        old = previous.get(field, _MISSING)
+        if old == value:
+            continue
+        item_key = _list_item_key(old, value)
+        if item_key is None:
+            changes["set"][field] = value
+        else:
+            changes["lists"][field] = _diff_list(old, value, item_key)
+
+    changes["unset"] = [field for field in previous if field not in current]
+    return changes
+
+
+def apply_portfolio_delta(previous: dict[str, Any], changes: dict[str, Any]) -> dict[str, Any]:
+    """
+    套用差量（與前端 store 的合併規則相同，供測試與伺服器端驗證使用）
+    """
+    result = {k: v for k, v in previous.items() if k not in changes.get("unset", [])}
+    result.update(changes.get("set", {}))
+
+    for field, diff in changes.get("lists", {}).items():
+        key = diff["key"]
+        removed = set(diff["remove"])
+        upserts = {item[key]: item for item in diff["upsert"]}
+        merged = []
+        for item in result.get(field, []):
+            item_id = item[key]
+            if item_id in removed:
+                continue
+            merged.append(upserts.pop(item_id, item))
+        merged.extend(upserts.values())
+        result[field] = merged
+    return result
+
+
+def _list_item_key(old: Any, new: Any) -> str | None:
+    """兩個清單若皆由含相同鍵的 dict 組成，回傳該鍵；否則回傳 None（整欄取代）"""
+    if not isinstance(old, list) or not isinstance(new, list):
+        return None
+    items = old + new
+    if not all(isinstance(item, dict) for item in items):
+        return None
+    for key in _LIST_ITEM_KEYS:
+        if all(key in item for item in items):
+            return key
+    return None
+
+
+def _diff_list(old: list[dict], new: list[dict], key: str) -> dict[str, Any]:
+    """以項目鍵比對清單差異"""
+    old_by_key = {item[key]: item for item in old}
+    new_keys = {item[key] for item in new}
+    return {
+        "key": key,
+        "upsert": [item for item in new if old_by_key.get(item[key]) != item],
+        "remove": [item_id for item_id in old_by_key if item_id not in new_keys],
+    }
@@ -19,7 +19,8 @@ from .enums import (
     validate_session_status,
 )
 from .logger import get_logger, intercept_standard_logging, logger, setup_logger
-from .agent_utils import save_agent_graph
+
+# save_agent_graph 延遲導入（agent_utils 會載入 Agents SDK，拖慢 API 啟動）
 
 __all__ = [
     # Enums
@@ -44,3 +45,12 @@ __all__ = [
     # Agent Utils
     "save_agent_graph",
 ]
+
+
+def __getattr__(name: str):
+    """延遲導入重量級模組"""
+    if name == "save_agent_graph":
+        from .agent_utils import save_agent_graph
+
+        return save_agent_graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
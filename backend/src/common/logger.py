@@ -7,14 +7,35 @@ Features:
 - 彩色 console 輸出
 - 文件日誌輪轉
 - 標準 logging 模組的攔截器
-- 結構化日誌格式
+- 結構化日誌格式（JSON Lines sink）
+- 非同步寫入：console 經由 BackgroundSink 交給背景執行緒；檔案 sink 會輪轉與壓縮，
+  經 loguru enqueue 由其背景執行緒寫入，呼叫端不等待 I/O
+- 依模組抽樣與限流（只作用於 WARNING 以下的日誌）
+
+熱路徑請使用延遲格式化，未輸出的級別不會組字串:
+    logger.debug("持股已更新: {} {}", ticker, quantity)
+    logger.opt(lazy=True).debug("組合狀態: {}", lambda: expensive_dump())
+
+設定（環境變數，setup_logger 參數未指定時使用）:
+- LOG_ENQUEUE: 日誌是否由背景執行緒寫入（預設 true，console 與檔案 sink 皆適用）
+- LOG_JSON_FILE: JSON Lines 日誌檔路徑（未設定表示停用）
+- LOG_SAMPLING: 模組抽樣比例，例如 "service.trading_service=0.1,trading.tools=0.5"
+- LOG_RATE_LIMIT: 模組每秒上限，例如 "api.websocket=20"
 """
 
 from __future__ import annotations
 
+import json
 import os
+import queue
 import sys
+import threading
+import time
+import traceback
+from collections import defaultdict
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 from loguru import logger
 
@@ -70,12 +91,290 @@ def _filter_noisy_loggers(record):
     return True
 
 
+# WARNING 以上的日誌一律保留，不抽樣也不限流
+_SAMPLING_MAX_LEVEL = 30
+
+
+class LogSampler:
+    """
+    依模組抽樣與限流的日誌過濾器
+
+    模組以 record["name"] 的前綴比對（最長者優先），只作用於 WARNING 以下的日誌。
+    同一筆日誌送到多個 sink 時只判斷一次，各 sink 的輸出保持一致。
+    """
+
+    def __init__(
+        self,
+        sampling: dict[str, float] | None = None,
+        rate_limits: dict[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            sampling: {模組前綴: 保留比例}，0.1 表示每 10 筆保留 1 筆
+            rate_limits: {模組前綴: 每秒最多輸出筆數}
+            clock: 時間來源（測試用）
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.configure(sampling, rate_limits)
+
+    def configure(
+        self,
+        sampling: dict[str, float] | None = None,
+        rate_limits: dict[str, float] | None = None,
+    ) -> None:
+        """更新規則並重設計數"""
+        with self._lock:
+            self.sampling = dict(sampling or {})
+            self.rate_limits = dict(rate_limits or {})
+            self._seen: dict[str, int] = defaultdict(int)
+            self._windows: dict[str, tuple[float, int]] = {}
+            self.dropped: dict[str, int] = defaultdict(int)
+
+    def __call__(self, record: dict[str, Any]) -> bool:
+        if not self.sampling and not self.rate_limits:
+            return True
+        local = self._local
+        if getattr(local, "record", None) is record:
+            return local.decision
+        decision = self._decide(record)
+        local.record, local.decision = record, decision
+        return decision
+
+    def _decide(self, record: dict[str, Any]) -> bool:
+        if record["level"].no >= _SAMPLING_MAX_LEVEL:
+            return True
+        name = record["name"] or ""
+        sample_key = _match_module(name, self.sampling)
+        limit_key = _match_module(name, self.rate_limits)
+        if sample_key is None and limit_key is None:
+            return True
+
+        with self._lock:
+            if sample_key is not None:
+                ratio = self.sampling[sample_key]
+                seen = self._seen[sample_key]
+                self._seen[sample_key] = seen + 1
+                if ratio <= 0 or seen % max(round(1 / min(ratio, 1.0)), 1):
+                    self.dropped[sample_key] += 1
+                    return False
+            if limit_key is not None:
+                now = self._clock()
+                started, count = self._windows.get(limit_key, (now, 0))
+                if now - started >= 1.0:
+                    started, count = now, 0
+                if count >= self.rate_limits[limit_key]:
+                    self.dropped[limit_key] += 1
+                    return False
+                self._windows[limit_key] = (started, count + 1)
+        return True
+
+
+def _match_module(name: str, rules: dict[str, float]) -> str | None:
+    """name 符合的最長模組前綴"""
+    matched = None
+    for prefix in rules:
+        if (name == prefix or name.startswith(prefix + ".")) and (
+            matched is None or len(prefix) > len(matched)
+        ):
+            matched = prefix
+    return matched
+
+
+def parse_module_rates(spec: str | None) -> dict[str, float]:
+    """
+    解析 "模組=數值" 以逗號分隔的設定
+
+    Raises:
+        ValueError: 格式錯誤或數值為負
+    """
+    rates: dict[str, float] = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        module, sep, value = item.partition("=")
+        if not sep or not module.strip():
+            raise ValueError(f"Invalid module rate: {item.strip()!r} (expected module=value)")
+        rate = float(value)
+        if rate < 0:
+            raise ValueError(f"Module rate must not be negative: {item.strip()!r}")
+        rates[module.strip()] = rate
+    return rates
+
+
+class BackgroundSink:
+    """
+    由背景執行緒寫入的 stream sink
+
+    呼叫端只把格式化後的字串放入同程序佇列，背景執行緒批次寫入並 flush。
+    loguru 的 enqueue=True 以 multiprocessing 佇列傳遞（每筆需 pickle），
+    同程序使用時每筆反而比直接寫入慢數倍，因此 console 不使用。
+    檔案 sink 的輪轉與壓縮由 loguru 的檔案 sink 處理，仍使用 enqueue=True。
+
+    佇列累積超過 max_pending 筆時丟棄新的日誌（計入 get_log_stats），不阻塞呼叫端。
+    logger.remove()（含程式結束時）會呼叫 stop()，寫完佇列中的日誌。
+    """
+
+    _STOP = object()
+
+    def __init__(self, stream, max_pending: int = 100_000):
+        self._stream = stream
+        self._max_pending = max_pending
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        if self._queue.qsize() >= self._max_pending:
+            self.dropped += 1
+            return
+        self._queue.put(message)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """寫完佇列中的日誌後結束背景執行緒"""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            messages = [m for m in batch if m is not self._STOP]
+            try:
+                self._stream.write("".join(messages))
+                self._stream.flush()
+            except Exception:
+                # stream 已關閉（例如測試結束）時不可讓背景執行緒中斷
+                pass
+            if len(messages) < len(batch):
+                return
+
+
+_sampler = LogSampler()
+_background_sinks: list[BackgroundSink] = []
+
+
+def log_filter(record) -> bool:
+    """所有 sink 共用的過濾器：第三方雜訊 + 模組抽樣 / 限流"""
+    return _filter_noisy_loggers(record) and _sampler(record)
+
+
+def _json_format(record) -> str:
+    """JSON Lines 格式（一行一筆，extra 為 logger.bind() 的欄位）"""
+    payload: dict[str, Any] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+    extra = {key: value for key, value in record["extra"].items() if key != "_json"}
+    if extra:
+        payload["extra"] = extra
+    if record["exception"] is not None:
+        exc_type, exc_value, exc_tb = record["exception"]
+        payload["exception"] = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
+    record["extra"]["_json"] = json.dumps(payload, ensure_ascii=False, default=str)
+    return "{extra[_json]}\n"
+
+
+def add_json_sink(
+    json_file: str | Path,
+    log_level: str = "INFO",
+    rotation: str = "100 MB",
+    retention: str = "30 days",
+    enqueue: bool = True,
+) -> int:
+    """
+    新增 JSON Lines 日誌 sink
+
+    Args:
+        enqueue: 是否經 loguru 的背景執行緒寫入（輪轉時的檔案操作不在呼叫端執行）
+
+    Returns:
+        loguru handler id
+    """
+    json_file = Path(json_file)
+    json_file.parent.mkdir(parents=True, exist_ok=True)
+    return logger.add(
+        json_file,
+        format=_json_format,
+        level=log_level,
+        rotation=rotation,
+        retention=retention,
+        enqueue=enqueue,
+        filter=log_filter,
+    )
+
+
+def configure_sampling(
+    sampling: str | dict[str, float] | None = None,
+    rate_limits: str | dict[str, float] | None = None,
+) -> None:
+    """
+    設定模組抽樣與限流（未指定時讀取 LOG_SAMPLING / LOG_RATE_LIMIT）
+
+    Raises:
+        ValueError: 設定格式錯誤
+    """
+    if sampling is None:
+        sampling = os.getenv("LOG_SAMPLING")
+    if rate_limits is None:
+        rate_limits = os.getenv("LOG_RATE_LIMIT")
+    if not isinstance(sampling, dict):
+        sampling = parse_module_rates(sampling)
+    if not isinstance(rate_limits, dict):
+        rate_limits = parse_module_rates(rate_limits)
+    _sampler.configure(sampling, rate_limits)
+
+
+def background_sink(stream) -> BackgroundSink:
+    """建立 BackgroundSink（丟棄筆數計入 get_log_stats）"""
+    sink = BackgroundSink(stream)
+    _background_sinks[:] = [s for s in _background_sinks if s._thread.is_alive()]
+    _background_sinks.append(sink)
+    return sink
+
+
+def get_log_stats() -> dict[str, Any]:
+    """
+    被丟棄的日誌筆數
+
+    Returns:
+        {"dropped": {模組規則: 抽樣 / 限流丟棄筆數}, "backlog_dropped": 背景佇列滿時丟棄筆數}
+    """
+    return {
+        "dropped": dict(_sampler.dropped),
+        "backlog_dropped": sum(sink.dropped for sink in _background_sinks),
+    }
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 def setup_logger(
     log_level: str = "INFO",
     log_file: Path | None = None,
     rotation: str = "100 MB",
     retention: str = "30 days",
     enable_console: bool = True,
+    json_file: str | Path | None = None,
+    enqueue: bool | None = None,
+    sampling: str | dict[str, float] | None = None,
+    rate_limits: str | dict[str, float] | None = None,
 ) -> None:
     """
     設置統一的 logger 配置
@@ -86,14 +385,31 @@ def setup_logger(
         rotation: 日誌輪轉條件
         retention: 日誌保留期限
         enable_console: 是否啟用 console 輸出
+        json_file: JSON Lines 日誌檔路徑（預設 LOG_JSON_FILE，未設定表示停用）
+        enqueue: 是否由背景執行緒寫入（預設 LOG_ENQUEUE，未設定為 True）
+        sampling: 模組抽樣比例（預設 LOG_SAMPLING）
+        rate_limits: 模組每秒上限（預設 LOG_RATE_LIMIT）
     """
     # 移除預設的 handler
     logger.remove()
 
-    # Console handler - 彩色輸出
+    if enqueue is None:
+        enqueue = _env_flag("LOG_ENQUEUE", True)
+    if json_file is None:
+        json_file = os.getenv("LOG_JSON_FILE") or None
+
+    config_error = None
+    try:
+        configure_sampling(sampling, rate_limits)
+    except ValueError as e:
+        # 設定錯誤不應讓服務無法啟動：停用抽樣並在 sink 建立後警告
+        _sampler.configure()
+        config_error = e
+
+    # Console handler - 彩色輸出（enqueue 時由背景執行緒寫入）
     if enable_console:
         logger.add(
-            sys.stderr,
+            background_sink(sys.stderr) if enqueue else sys.stderr,
             format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
             "<level>{level: <8}</level> | "
             "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
@@ -102,10 +418,13 @@ def setup_logger(
             colorize=True,
             backtrace=True,
             diagnose=True,
-            filter=_filter_noisy_loggers,  # 添加過濾器
+            # BackgroundSink 已由背景執行緒寫入，不再經 loguru 的 multiprocessing 佇列
+            enqueue=False,
+            filter=log_filter,
         )
 
-    # File handler - JSON 格式
+    # File handler - 輪轉與 zip 壓縮在寫入的執行緒中執行，
+    # enqueue 時交給 loguru 的背景執行緒，不阻塞 event loop
     if log_file:
         log_file = Path(log_file)
         log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -119,13 +438,21 @@ def setup_logger(
             compression="zip",
             backtrace=True,
             diagnose=True,
-            enqueue=True,  # 非同步寫入
-            filter=_filter_noisy_loggers,  # 添加過濾器
+            enqueue=enqueue,
+            filter=log_filter,
         )
 
+    # JSON Lines - 給日誌收集系統
+    if json_file:
+        add_json_sink(json_file, log_level, rotation, retention, enqueue=enqueue)
+
     logger.info(f"Logger initialized with level: {log_level}")
     if log_file:
         logger.info(f"Logging to file: {log_file}")
+    if json_file:
+        logger.info(f"Logging JSON to: {json_file}")
+    if config_error is not None:
+        logger.warning(f"Log sampling disabled, invalid configuration: {config_error}")
 
 
 def intercept_standard_logging() -> None:
@@ -201,4 +528,17 @@ setup_logger(log_level="INFO", log_file=_default_log_file)
 intercept_standard_logging()
 
 # 匯出給其他模組使用
-__all__ = ["logger", "setup_logger", "intercept_standard_logging", "get_logger"]
+__all__ = [
+    "logger",
+    "setup_logger",
+    "intercept_standard_logging",
+    "get_logger",
+    "BackgroundSink",
+    "LogSampler",
+    "add_json_sink",
+    "background_sink",
+    "configure_sampling",
+    "get_log_stats",
+    "log_filter",
+    "parse_module_rates",
+]
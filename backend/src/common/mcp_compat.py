@@ -0,0 +1,39 @@
+"""
+MCP 伺服器代理的版本相容工具
+
+uv.lock 鎖定 openai-agents 0.4.x 與 mcp 1.x，較新的版本介面不同：
+- MCPServer.call_tool: 0.4.x 只接受 (tool_name, arguments)，新版多了 meta
+- CallToolResult 的錯誤旗標: mcp 1.x 為 isError，新版為 is_error（isError 僅為建構別名）
+
+代理伺服器（計時、快取、本地行情）經由這裡轉呼叫與判斷錯誤，兩種版本都能運作。
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def tool_result_is_error(result: Any) -> bool:
+    """CallToolResult 是否為錯誤結果（同時支援 isError 與 is_error）"""
+    for attr in ("isError", "is_error"):
+        value = getattr(result, attr, None)
+        if value is not None:
+            return bool(value)
+    return False
+
+
+async def forward_call_tool(
+    server: Any,
+    tool_name: str,
+    arguments: dict[str, Any] | None,
+    meta: dict[str, Any] | None = None,
+) -> Any:
+    """
+    轉呼叫內層伺服器的 call_tool
+
+    只有呼叫端真的帶了 meta 才轉交，否則以兩個參數呼叫，相容只接受
+    (tool_name, arguments) 的 MCPServer。
+    """
+    if meta is None:
+        return await server.call_tool(tool_name, arguments)
+    return await server.call_tool(tool_name, arguments, meta)
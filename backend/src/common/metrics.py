@@ -0,0 +1,390 @@
+"""
+Prometheus 指標（不依賴外部套件）
+
+提供 Counter / Gauge / Histogram 與 Prometheus 文字格式輸出（text format 0.0.4），
+由 GET /metrics 提供給 Prometheus 抓取（需 X-Admin-Token，見 ADMIN_TOKEN）；
+不需要 prometheus_client 或任何外部服務。
+
+即時狀態（資料庫連線池、WebSocket 佇列等）以 collector 在抓取時讀取，
+不在熱路徑上更新。
+
+用法:
+    HTTP_REQUEST_SECONDS.labels(method="GET", route="/api/agents", status="200").observe(0.01)
+
+    with TRADE_EXECUTION_SECONDS.time(action="BUY"):   # 例外時 outcome="error"
+        ...
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 預設延遲區間（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# LLM 與 Agent 執行動輒數十秒
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+# (指標名稱, 標籤, 值)
+Sample = tuple[str, dict[str, str], float]
+
+
+class MetricsError(Exception):
+    """指標定義或使用錯誤（重複名稱、標籤不符等）"""
+
+    pass
+
+
+class _Metric:
+    """具名指標（依標籤值分為多個序列）"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, ...], Any] = {}
+
+    def labels(self, **labels: Any) -> Any:
+        """取得標籤對應的序列（不存在時建立）"""
+        if set(labels) != set(self.labelnames):
+            raise MetricsError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, self._new_series())
+        return series
+
+    def _new_series(self) -> Any:
+        raise NotImplementedError
+
+    def _default(self) -> Any:
+        if self.labelnames:
+            raise MetricsError(f"{self.name} has labels {self.labelnames}, use .labels()")
+        return self.labels()
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """移除所有序列（測試用）"""
+        with self._lock:
+            self._series.clear()
+
+    def _label_dict(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+
+class _Value:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+
+class _CounterValue(_Value):
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise MetricsError("Counters can only increase")
+        super().inc(amount)
+
+
+class Counter(_Metric):
+    """只增不減的計數"""
+
+    type_name = "counter"
+
+    def _new_series(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def samples(self) -> Iterable[Sample]:
+        for key, series in list(self._series.items()):
+            yield f"{self.name}_total", self._label_dict(key), series.value
+
+
+class Gauge(_Metric):
+    """可增可減的目前值"""
+
+    type_name = "gauge"
+
+    def _new_series(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def samples(self) -> Iterable[Sample]:
+        for key, series in list(self._series.items()):
+            yield self.name, self._label_dict(key), series.value
+
+
+class _HistogramSeries:
+    def __init__(self, buckets: tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+            self.count += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """延遲分布（累積區間 + 總和 + 次數）"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def _new_series(self) -> _HistogramSeries:
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self, **labels: Any) -> _Timer:
+        """
+        計時（context manager 或 decorator，支援 async 函式）
+
+        標籤包含 outcome 且未指定時，正常結束為 "ok"、拋出例外為 "error"。
+        """
+        return _Timer(self, labels)
+
+    def samples(self) -> Iterable[Sample]:
+        for key, series in list(self._series.items()):
+            labels = self._label_dict(key)
+            cumulative = 0
+            for bound, count in zip(series.buckets, series.counts, strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_bucket", {**labels, "le": "+Inf"}, series.count
+            yield f"{self.name}_sum", labels, series.sum
+            yield f"{self.name}_count", labels, series.count
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: dict[str, Any]):
+        self._histogram = histogram
+        self._labels = labels
+        self._started = 0.0
+
+    def _record(self, failed: bool) -> None:
+        labels = dict(self._labels)
+        if "outcome" in self._histogram.labelnames and "outcome" not in labels:
+            labels["outcome"] = "error" if failed else "ok"
+        elapsed = time.perf_counter() - self._started
+        self._histogram.labels(**labels).observe(elapsed)
+
+    def __enter__(self) -> _Timer:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._record(exc_type is not None)
+
+    def __call__(self, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _Timer(self._histogram, self._labels):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(self._histogram, self._labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+class MetricsRegistry:
+    """指標登錄表"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: dict[str, tuple[str, str, Callable[[], Iterable[Sample]]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics or metric.name in self._collectors:
+                raise MetricsError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def register_collector(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Sample]],
+        type_name: str = "gauge",
+    ) -> None:
+        """
+        登錄抓取時才讀取的指標
+
+        同名 collector 重複登錄時取代舊的（例如每次 create_app 重新登錄）；
+        名稱與已登錄的 Counter / Gauge / Histogram 相同時拋出 MetricsError。
+
+        Args:
+            name: 指標名稱（collect 回傳的樣本名稱須以此開頭）
+            collect: 回傳 (樣本名稱, 標籤, 值) 的函式
+
+        Raises:
+            MetricsError: 名稱已被非 collector 的指標使用
+        """
+        with self._lock:
+            if name in self._metrics:
+                raise MetricsError(f"Duplicate metric: {name}")
+            self._collectors[name] = (type_name, documentation, collect)
+
+    def render(self) -> str:
+        """Prometheus 文字格式"""
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            _append_family(lines, metric.name, metric.type_name, metric.documentation)
+            lines.extend(_format_sample(*sample) for sample in metric.samples())
+        for name, (type_name, documentation, collect) in list(self._collectors.items()):
+            try:
+                samples = list(collect())
+            except Exception as e:
+                from common.logger import logger
+
+                logger.warning(f"Metrics collector {name} failed: {e}")
+                continue
+            _append_family(lines, name, type_name, documentation)
+            lines.extend(_format_sample(*sample) for sample in samples)
+        return "\n".join(lines) + "\n"
+
+
+def _append_family(lines: list[str], name: str, type_name: str, documentation: str) -> None:
+    lines.append(f"# HELP {name} {_escape(documentation, quote=False)}")
+    lines.append(f"# TYPE {name} {type_name}")
+
+
+def _format_sample(name: str, labels: dict[str, str], value: float) -> str:
+    if labels:
+        pairs = ",".join(f'{key}="{_escape(str(v))}"' for key, v in labels.items())
+        return f"{name}{{{pairs}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(text: str, quote: bool = True) -> str:
+    text = text.replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quote else text
+
+
+# ==========================================
+# Application Metrics
+# ==========================================
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "casualtrader_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+TRADE_EXECUTION_SECONDS = registry.histogram(
+    "casualtrader_trade_execution_duration_seconds",
+    "execute_trade_atomic duration including the per-agent lock wait",
+    ("action", "outcome"),
+)
+MCP_CALL_SECONDS = registry.histogram(
+    "casualtrader_mcp_call_duration_seconds",
+    "MCP call_tool latency by server and tool",
+    ("server", "tool", "outcome"),
+)
+LLM_REQUEST_SECONDS = registry.histogram(
+    "casualtrader_llm_request_duration_seconds",
+    "LLM request latency by model",
+    ("model", "outcome"),
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = registry.counter(
+    "casualtrader_llm_tokens",
+    "LLM tokens by model and type (input / output)",
+    ("model", "type"),
+)
+RUNNING_AGENTS = registry.gauge(
+    "casualtrader_running_agents",
+    "Agent executions currently in progress",
+    ("mode",),
+)
@@ -0,0 +1,493 @@
+"""
+執行中 Agent 的隨選非同步剖析（不依賴外部套件）
+
+由管理端點（api.routers.profiling）啟動 / 停止，同一時間只允許一個剖析：
+- CPU 取樣：背景執行緒每隔 interval 讀取事件迴圈執行緒的呼叫堆疊
+  （sys._current_frames），迴圈閒置（等待 I/O）時只計數不記錄。標準事件迴圈閒置時停在
+  selectors 的 select；uvloop 等 C 實作的迴圈閒置時沒有 Python frame，最內層是啟動迴圈的
+  函式（例如 asyncio.Runner.run），此時沒有執行中的 task 即視為閒置
+- Task 堆疊：事件迴圈上的取樣 task 定期沿 cr_await 走訪每個 asyncio task，
+  記錄各 task 正在等待的位置
+- 事件迴圈延遲：同一個取樣 task 比較 asyncio.sleep 的預期與實際喚醒時間
+
+範圍可為整個行程，或只限一個 Agent session：_execute_in_background 以
+bind_profiling_scope 標記 session 的根 task；剖析期間安裝的 task factory 會把
+新建立的 task 標記為建立者的 session（剖析開始前已存在的子 task 不會被標記）。
+
+結果以 collapsed stack 格式（"frame;frame;frame 次數"）輸出，可直接給
+flamegraph.pl、speedscope、inferno 使用。未剖析時除了 session 根 task 的標記外沒有任何開銷。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import math
+import os
+import statistics
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from common.logger import logger
+from common.time_utils import utc_now
+
+MIN_INTERVAL_MS = 1
+MAX_INTERVAL_MS = 1000
+MAX_DURATION_SECONDS = 300
+# Task 堆疊與迴圈延遲的取樣間隔下限（走訪所有 task 比讀取單一執行緒堆疊昂貴）
+MIN_TASK_INTERVAL_SECONDS = 0.05
+MAX_STACK_DEPTH = 128
+
+PROFILE_KINDS = ("cpu", "tasks")
+
+# 目前執行中的 Agent session（由 bind_profiling_scope 設定，子 task 透過 context 繼承）
+profiling_scope: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "profiling_scope", default=None
+)
+
+# task → session_id
+_task_scopes: weakref.WeakKeyDictionary[asyncio.Task, str] = weakref.WeakKeyDictionary()
+
+
+class ProfilerError(Exception):
+    """剖析參數或狀態錯誤"""
+
+    pass
+
+
+class ProfilerBusyError(ProfilerError):
+    """已有剖析正在執行"""
+
+    pass
+
+
+class ProfileNotFoundError(ProfilerError):
+    """剖析不存在（或已被淘汰）"""
+
+    pass
+
+
+def bind_profiling_scope(session_id: str) -> contextvars.Token:
+    """
+    標記目前 task 屬於指定 session
+
+    Returns:
+        還原用的 token（傳給 reset_profiling_scope）
+    """
+    task = asyncio.current_task()
+    if task is not None:
+        _task_scopes[task] = session_id
+    return profiling_scope.set(session_id)
+
+
+def reset_profiling_scope(token: contextvars.Token) -> None:
+    """解除 bind_profiling_scope 的標記"""
+    task = asyncio.current_task()
+    if task is not None:
+        _task_scopes.pop(task, None)
+    profiling_scope.reset(token)
+
+
+# ==========================================
+# Stack Formatting
+# ==========================================
+
+_frame_labels: dict[Any, str] = {}
+_path_prefixes = sorted(
+    {os.path.join(os.path.abspath(p), "") for p in sys.path if p}, key=len, reverse=True
+)
+
+
+def _frame_label(code) -> str:
+    """函式名稱與模組相對路徑（以 co_firstlineno 區分同名函式，不含目前行號以利合併）"""
+    label = _frame_labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for prefix in _path_prefixes:
+            if filename.startswith(prefix):
+                filename = filename[len(prefix) :]
+                break
+        name = getattr(code, "co_qualname", code.co_name)
+        # collapsed 格式以 ";" 分隔堆疊、以最後一個空白分隔次數
+        label = f"{name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+        _frame_labels[code] = label
+    return label
+
+
+def _thread_stack(frame) -> tuple[str, ...]:
+    """執行緒堆疊（根在前）"""
+    labels: list[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+def _await_stack(coro: Any) -> tuple[str, ...]:
+    """沿 cr_await / gi_yieldfrom / ag_await 走訪 coroutine 鏈（根在前）"""
+    labels: list[str] = []
+    while coro is not None and len(labels) < MAX_STACK_DEPTH:
+        frame = (
+            getattr(coro, "cr_frame", None)
+            or getattr(coro, "gi_frame", None)
+            or getattr(coro, "ag_frame", None)
+        )
+        if frame is None:
+            if not hasattr(coro, "cr_await") and not hasattr(coro, "gi_yieldfrom"):
+                # 等待的是 Future 等非 coroutine 物件
+                labels.append(f"<{type(coro).__name__}>")
+            break
+        labels.append(_frame_label(frame.f_code))
+        coro = (
+            getattr(coro, "cr_await", None)
+            or getattr(coro, "gi_yieldfrom", None)
+            or getattr(coro, "ag_await", None)
+        )
+    return tuple(labels)
+
+
+def _is_selector_wait(frame) -> bool:
+    """標準事件迴圈是否正在 selector 等待 I/O"""
+    code = frame.f_code
+    return code.co_name == "select" and code.co_filename.endswith("selectors.py")
+
+
+def _loop_runner_code(loop: asyncio.AbstractEventLoop) -> Any:
+    """
+    C 實作的事件迴圈（uvloop）中，啟動迴圈的 Python 函式（在事件迴圈的 task 中呼叫）
+
+    迴圈本身沒有 Python frame，執行中 task 的根 coroutine 的 f_back 即為呼叫
+    run_until_complete / run_forever 的函式。標準事件迴圈回傳 None（以 select 判斷閒置）。
+    """
+    if isinstance(loop, asyncio.BaseEventLoop):
+        return None
+    task = asyncio.current_task(loop)
+    frame = getattr(task.get_coro(), "cr_frame", None) if task is not None else None
+    runner = frame.f_back if frame is not None else None
+    return runner.f_code if runner is not None else None
+
+
+def _fold(stacks: Counter) -> str:
+    lines = [f"{';'.join(stack)} {count}" for stack, count in stacks.most_common() if stack]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def _top_leaves(stacks: Counter, limit: int) -> list[dict[str, Any]]:
+    leaves: Counter = Counter()
+    for stack, count in stacks.items():
+        if stack:
+            leaves[stack[-1]] += count
+    total = sum(leaves.values())
+    return [
+        {"frame": frame, "samples": count, "ratio": round(count / total, 4)}
+        for frame, count in leaves.most_common(limit)
+    ]
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+# ==========================================
+# Profile Run
+# ==========================================
+
+
+@dataclass
+class ProfileRun:
+    """一次剖析的設定與結果"""
+
+    id: str
+    session_id: str | None
+    interval: float
+    duration: float
+    started_at: datetime = field(default_factory=utc_now)
+    ended_at: datetime | None = None
+    cpu_stacks: Counter = field(default_factory=Counter)
+    task_stacks: Counter = field(default_factory=Counter)
+    lag_samples: list[float] = field(default_factory=list)
+    idle_samples: int = 0
+    other_samples: int = 0
+    task_snapshots: int = 0
+    sampler_seconds: float = 0.0
+    error: str | None = None
+    # 取樣執行緒寫入、事件迴圈讀取
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def running(self) -> bool:
+        return self.ended_at is None
+
+    @property
+    def scope(self) -> str:
+        return "session" if self.session_id else "process"
+
+    def folded(self, kind: str) -> str:
+        """collapsed stack 文字（kind: cpu | tasks）"""
+        if kind not in PROFILE_KINDS:
+            raise ProfilerError(f"Unknown profile kind: {kind} (expected one of {PROFILE_KINDS})")
+        with self.lock:
+            stacks = Counter(self.cpu_stacks if kind == "cpu" else self.task_stacks)
+        return _fold(stacks)
+
+    def summary(self, top: int = 20) -> dict[str, Any]:
+        ended = self.ended_at or utc_now()
+        with self.lock:
+            cpu_stacks = Counter(self.cpu_stacks)
+            task_stacks = Counter(self.task_stacks)
+            lag = sorted(self.lag_samples)
+        lag_ms: dict[str, Any] = {"samples": len(lag)}
+        if lag:
+            lag_ms.update(
+                mean=round(statistics.fmean(lag) * 1000, 3),
+                p50=round(_percentile(lag, 0.50) * 1000, 3),
+                p95=round(_percentile(lag, 0.95) * 1000, 3),
+                p99=round(_percentile(lag, 0.99) * 1000, 3),
+                max=round(lag[-1] * 1000, 3),
+            )
+        return {
+            "id": self.id,
+            "status": "running" if self.running else "completed",
+            "scope": self.scope,
+            "session_id": self.session_id,
+            "interval_ms": round(self.interval * 1000, 3),
+            "max_duration_seconds": self.duration,
+            "started_at": self.started_at.isoformat(),
+            "ended_at": self.ended_at.isoformat() if self.ended_at else None,
+            "elapsed_seconds": round((ended - self.started_at).total_seconds(), 3),
+            "error": self.error,
+            "cpu": {
+                "samples": sum(cpu_stacks.values()),
+                "idle_samples": self.idle_samples,
+                "other_samples": self.other_samples,
+                "top_functions": _top_leaves(cpu_stacks, top),
+            },
+            "tasks": {
+                "snapshots": self.task_snapshots,
+                "samples": sum(task_stacks.values()),
+                "top_awaits": _top_leaves(task_stacks, top),
+            },
+            "event_loop_lag_ms": lag_ms,
+            "sampler_overhead_ms": round(self.sampler_seconds * 1000, 3),
+        }
+
+
+class _Session:
+    """執行中的剖析：取樣執行緒 + 事件迴圈上的取樣 task + task factory"""
+
+    def __init__(self, run: ProfileRun, loop: asyncio.AbstractEventLoop):
+        self.run = run
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.stop_event = threading.Event()
+        self.thread_stop = threading.Event()
+        self.thread = threading.Thread(target=self._sample_threads, name="profiler", daemon=True)
+        self.previous_factory = loop.get_task_factory()
+        self.runner_code = _loop_runner_code(loop)
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.run.session_id:
+            self.loop.set_task_factory(self._task_factory)
+        self.thread.start()
+        self.task = self.loop.create_task(self._sample_loop(), name=f"profiler-{self.run.id}")
+
+    def _task_factory(self, loop, coro, **kwargs):
+        if self.previous_factory is not None:
+            task = self.previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        scope = context.get(profiling_scope) if context is not None else profiling_scope.get()
+        if scope is not None:
+            _task_scopes[task] = scope
+        return task
+
+    def _is_idle(self, frame, task: asyncio.Task | None) -> bool:
+        """事件迴圈是否閒置（等待 I/O）"""
+        if _is_selector_wait(frame):
+            return True
+        return task is None and self.runner_code is not None and frame.f_code is self.runner_code
+
+    def _in_scope(self, task: asyncio.Task | None) -> bool:
+        if not self.run.session_id:
+            return True
+        return task is not None and _task_scopes.get(task) == self.run.session_id
+
+    def _sample_threads(self) -> None:
+        """CPU 取樣（背景執行緒）"""
+        run = self.run
+        while not self.thread_stop.wait(run.interval):
+            started = time.perf_counter()
+            frame = None
+            try:
+                frame = sys._current_frames().get(self.loop_thread_id)
+                if frame is None:
+                    break
+                task = asyncio.current_task(self.loop)
+                if self._is_idle(frame, task):
+                    run.idle_samples += 1
+                elif self._in_scope(task):
+                    stack = _thread_stack(frame)
+                    with run.lock:
+                        run.cpu_stacks[stack] += 1
+                else:
+                    run.other_samples += 1
+            except Exception as e:
+                run.error = str(e)
+                logger.warning(f"Profiler {run.id} thread sampler failed: {e}")
+                break
+            finally:
+                del frame  # 不保留其他執行緒的 frame
+                run.sampler_seconds += time.perf_counter() - started
+
+    async def _sample_loop(self) -> None:
+        """Task 堆疊與事件迴圈延遲（事件迴圈上），時間到或 stop 時結束剖析"""
+        run = self.run
+        interval = max(run.interval, MIN_TASK_INTERVAL_SECONDS)
+        deadline = time.monotonic() + run.duration
+        current = asyncio.current_task()
+        try:
+            while time.monotonic() < deadline and not self.stop_event.is_set():
+                expected = time.monotonic() + interval
+                await asyncio.sleep(interval)
+                if self.stop_event.is_set():
+                    break
+                started = time.perf_counter()
+                lag = max(0.0, time.monotonic() - expected)
+                stacks = [
+                    _await_stack(task.get_coro())
+                    for task in asyncio.all_tasks(self.loop)
+                    if task is not current and not task.done() and self._in_scope(task)
+                ]
+                with run.lock:
+                    run.lag_samples.append(lag)
+                    run.task_stacks.update(stacks)
+                    run.task_snapshots += 1
+                run.sampler_seconds += time.perf_counter() - started
+        except Exception as e:
+            run.error = str(e)
+            logger.warning(f"Profiler {run.id} task sampler failed: {e}")
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        self.thread_stop.set()
+        self.thread.join(timeout=max(1.0, self.run.interval * 2))
+        if self.run.session_id:
+            if self.loop.get_task_factory() == self._task_factory:
+                self.loop.set_task_factory(self.previous_factory)
+            else:
+                logger.warning(f"Profiler {self.run.id}: task factory replaced, not restoring")
+        self.run.ended_at = utc_now()
+        logger.info(
+            f"Profiler {self.run.id} finished: {sum(self.run.cpu_stacks.values())} CPU samples, "
+            f"{self.run.task_snapshots} task snapshots"
+        )
+
+
+# ==========================================
+# Manager
+# ==========================================
+
+
+class ProfilerManager:
+    """
+    剖析管理（同一時間一個剖析，保留最近 max_history 筆結果）
+
+    用法:
+        run = await profiler_manager.start(session_id="...", interval_ms=10, duration_seconds=30)
+        ...
+        await profiler_manager.stop(run.id)
+        text = profiler_manager.get(run.id).folded("cpu")
+    """
+
+    def __init__(self, max_history: int = 5):
+        self.max_history = max_history
+        self._runs: dict[str, ProfileRun] = {}
+        self._active: _Session | None = None
+        self._ids = itertools.count(1)
+
+    @property
+    def active(self) -> ProfileRun | None:
+        if self._active is not None and self._active.run.running:
+            return self._active.run
+        return None
+
+    async def start(
+        self,
+        session_id: str | None = None,
+        interval_ms: float = 10,
+        duration_seconds: float = 30,
+    ) -> ProfileRun:
+        """
+        開始剖析
+
+        Args:
+            session_id: 只剖析此 Agent session（None 表示整個行程）
+            interval_ms: CPU 取樣間隔（毫秒）
+            duration_seconds: 最長剖析時間，時間到自動停止
+
+        Raises:
+            ProfilerError: 參數超出範圍
+            ProfilerBusyError: 已有剖析正在執行
+        """
+        if not MIN_INTERVAL_MS <= interval_ms <= MAX_INTERVAL_MS:
+            raise ProfilerError(
+                f"interval_ms must be between {MIN_INTERVAL_MS} and {MAX_INTERVAL_MS}"
+            )
+        if not 0 < duration_seconds <= MAX_DURATION_SECONDS:
+            raise ProfilerError(f"duration_seconds must be between 0 and {MAX_DURATION_SECONDS}")
+        if self.active is not None:
+            raise ProfilerBusyError(f"Profile {self.active.id} is already running")
+
+        run = ProfileRun(
+            id=f"{utc_now():%Y%m%d%H%M%S}-{next(self._ids)}",
+            session_id=session_id,
+            interval=interval_ms / 1000,
+            duration=duration_seconds,
+        )
+        self._active = _Session(run, asyncio.get_running_loop())
+        self._active.start()
+        self._runs[run.id] = run
+        while len(self._runs) > self.max_history:
+            oldest = next(iter(self._runs))
+            if self._runs[oldest].running:
+                break
+            del self._runs[oldest]
+        logger.info(
+            f"Profiler {run.id} started ({run.scope}, interval {interval_ms}ms, "
+            f"max {duration_seconds}s)"
+        )
+        return run
+
+    async def stop(self, profile_id: str) -> ProfileRun:
+        """停止剖析（已結束時直接返回結果）"""
+        run = self.get(profile_id)
+        active = self._active
+        if run.running and active is not None and active.run is run:
+            active.stop_event.set()
+            if active.task is not None:
+                await active.task
+        return run
+
+    def get(self, profile_id: str) -> ProfileRun:
+        run = self._runs.get(profile_id)
+        if run is None:
+            raise ProfileNotFoundError(f"Profile {profile_id} not found")
+        return run
+
+    def list(self) -> list[ProfileRun]:
+        return list(self._runs.values())
+
+
+profiler_manager = ProfilerManager()
@@ -8,8 +8,10 @@ from .models import (
     AgentHolding,
     AgentPerformance,
     AgentSession,
+    AgentSessionPayload,
     AIModelConfig,
     Base,
+    IndicatorSnapshot,
     PerformanceMetrics,
     Transaction,
     get_model_by_name,
@@ -23,10 +25,12 @@ __all__ = [
     # Models
     "Agent",
     "AgentSession",
+    "AgentSessionPayload",
     "AgentHolding",
     "Transaction",
     "AgentPerformance",
     "AIModelConfig",
+    "IndicatorSnapshot",
     # Dataclasses
     "PerformanceMetrics",
     # Utility functions
@@ -0,0 +1,100 @@
+"""
+Payload compression utilities
+
+提供大型 JSON 內容（會話輸出、工具追蹤等）的壓縮/解壓縮。
+
+- 優先使用 zstd（需安裝 ``zstandard``），否則回退至標準庫 gzip
+- 小於門檻的內容不壓縮，避免浪費 CPU
+- 每筆資料記錄使用的 codec，可混合讀取不同編碼的資料
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any
+
+try:
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - 視安裝環境而定
+    _zstd = None
+
+
+CODEC_RAW = "raw"
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+
+# 小於此大小（bytes）的內容直接以原始 JSON 儲存
+COMPRESSION_THRESHOLD = 512
+
+_ZSTD_LEVEL = 3
+_GZIP_LEVEL = 6
+
+
+class PayloadCodecError(Exception):
+    """Payload 編解碼錯誤"""
+
+    pass
+
+
+def default_codec() -> str:
+    """取得目前環境可用的最佳壓縮 codec"""
+    return CODEC_ZSTD if _zstd is not None else CODEC_GZIP
+
+
+def encode_payload(value: Any, codec: str | None = None) -> tuple[str, bytes, int]:
+    """
+    將任意可 JSON 序列化的值編碼並壓縮
+
+    Args:
+        value: 要儲存的值
+        codec: 指定 codec（預設自動選擇）
+
+    Returns:
+        (codec, 壓縮後資料, 原始大小)
+    """
+    raw = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+    raw_size = len(raw)
+
+    if raw_size < COMPRESSION_THRESHOLD:
+        return CODEC_RAW, raw, raw_size
+
+    codec = codec or default_codec()
+    if codec == CODEC_ZSTD:
+        if _zstd is None:
+            raise PayloadCodecError("zstd codec requested but 'zstandard' is not installed")
+        return codec, _zstd.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw), raw_size
+    if codec == CODEC_GZIP:
+        return codec, gzip.compress(raw, compresslevel=_GZIP_LEVEL, mtime=0), raw_size
+    if codec == CODEC_RAW:
+        return codec, raw, raw_size
+
+    raise PayloadCodecError(f"Unknown payload codec: {codec}")
+
+
+def decode_payload(codec: str, data: bytes | None) -> Any:
+    """
+    解壓縮並還原 JSON 值
+
+    Args:
+        codec: 資料使用的 codec
+        data: 壓縮後資料
+
+    Returns:
+        還原後的值（無資料時為 None）
+    """
+    if not data:
+        return None
+
+    if codec == CODEC_RAW:
+        raw = data
+    elif codec == CODEC_GZIP:
+        raw = gzip.decompress(data)
+    elif codec == CODEC_ZSTD:
+        if _zstd is None:
+            raise PayloadCodecError("zstd payload found but 'zstandard' is not installed")
+        raw = _zstd.ZstdDecompressor().decompress(data)
+    else:
+        raise PayloadCodecError(f"Unknown payload codec: {codec}")
+
+    return json.loads(raw.decode("utf-8"))
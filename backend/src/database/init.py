@@ -7,6 +7,7 @@ Handles automatic database table creation on startup.
 from sqlalchemy.ext.asyncio import AsyncEngine
 from common.logger import logger
 from database import Base
+from database.sqlite_upgrade import upgrade_sqlite_schema
 
 
 async def ensure_tables_exist(engine: AsyncEngine) -> None:
@@ -14,6 +15,8 @@ async def ensure_tables_exist(engine: AsyncEngine) -> None:
     Ensure all database tables exist.
 
     Creates missing tables based on the current ORM model definitions.
+    Existing SQLite databases are upgraded in place (see database.sqlite_upgrade);
+    PostgreSQL is upgraded with scripts/postgres/migrations.
     Safe to call multiple times.
 
     Args:
@@ -23,6 +26,9 @@ async def ensure_tables_exist(engine: AsyncEngine) -> None:
         logger.debug("Checking database tables...")
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+        if engine.dialect.name == "sqlite":
+            async with engine.connect() as conn:
+                await conn.run_sync(upgrade_sqlite_schema)
         logger.debug("✓ Database tables verified/created")
     except Exception as e:
         logger.error(f"✗ Failed to initialize database tables: {e}", exc_info=True)
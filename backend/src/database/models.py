@@ -21,6 +21,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
@@ -38,6 +39,7 @@ from common.enums import (
     TransactionStatus,
 )
 from common.time_utils import utc_now
+from database.compression import CODEC_RAW, decode_payload, encode_payload
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -145,12 +147,7 @@ class AgentSession(Base):
     end_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     execution_time_ms: Mapped[int | None] = mapped_column(Integer)
 
-    # 執行內容
-    initial_input: Mapped[dict[str, Any] | None] = mapped_column(JSON)
-    final_output: Mapped[str | None] = mapped_column(Text)
-    tools_called: Mapped[str | None] = mapped_column(
-        Text, doc='呼叫的工具列表 (JSON 字串格式)，例如: \'["get_stock_price", "analyze_trend"]\''
-    )
+    # 執行內容（大型內容存放於 agent_session_payloads，見 payload 關聯）
     error_message: Mapped[str | None] = mapped_column(Text)
 
     # 審計時間戳記 (遵循 timestamp.instructions.md 標準)
@@ -171,6 +168,13 @@ class AgentSession(Base):
     # 關聯關係
     agent: Mapped[Agent] = relationship("Agent", back_populates="sessions")
     transactions: Mapped[list[Transaction]] = relationship("Transaction", back_populates="session")
+    # 延遲載入：列表查詢不會讀取大型內容，需要時以 selectinload 或 awaitable_attrs 取得
+    payload: Mapped[AgentSessionPayload | None] = relationship(
+        "AgentSessionPayload",
+        back_populates="session",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
     # 表約束
     __table_args__ = (
@@ -181,6 +185,90 @@ class AgentSession(Base):
         Index("idx_sessions_created_at", "created_at"),
     )
 
+    def _get_payload_field(self, name: str) -> Any:
+        payload = self.payload
+        return payload.get_field(name) if payload is not None else None
+
+    def _set_payload_field(self, name: str, value: Any) -> None:
+        if self.payload is None:
+            self.payload = AgentSessionPayload()
+        self.payload.set_field(name, value)
+
+    @property
+    def initial_input(self) -> dict[str, Any] | None:
+        """初始輸入資料（存放於壓縮 payload）"""
+        return self._get_payload_field("initial_input")
+
+    @initial_input.setter
+    def initial_input(self, value: dict[str, Any] | None) -> None:
+        self._set_payload_field("initial_input", value)
+
+    @property
+    def final_output(self) -> str | None:
+        """最終輸出（存放於壓縮 payload）"""
+        return self._get_payload_field("final_output")
+
+    @final_output.setter
+    def final_output(self, value: str | None) -> None:
+        self._set_payload_field("final_output", value)
+
+    @property
+    def tools_called(self) -> str | None:
+        """呼叫的工具列表 (JSON 字串格式)，例如: '["get_stock_price", "analyze_trend"]'"""
+        return self._get_payload_field("tools_called")
+
+    @tools_called.setter
+    def tools_called(self, value: str | None) -> None:
+        self._set_payload_field("tools_called", value)
+
+
+class AgentSessionPayload(Base):
+    """
+    Agent 會話大型內容（壓縮儲存）
+
+    將 initial_input / final_output / tools_called 合併為單一 JSON 文件，
+    壓縮後存放於獨立表格，讓 agent_sessions 的列表查詢維持窄列寬。
+    """
+
+    __tablename__ = "agent_session_payloads"
+
+    session_id: Mapped[str] = mapped_column(
+        String(50), ForeignKey("agent_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    codec: Mapped[str] = mapped_column(String(10), nullable=False, default=CODEC_RAW)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, default=b"{}")
+    raw_size: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # 審計時間戳記
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, onupdate=utc_now, nullable=False
+    )
+
+    # 關聯關係
+    session: Mapped[AgentSession] = relationship("AgentSession", back_populates="payload")
+
+    def _fields(self) -> dict[str, Any]:
+        """解壓縮後的內容（依 data 快取，避免重複解壓縮）"""
+        cached = self.__dict__.get("_decoded_cache")
+        if cached is not None and cached[0] is self.data:
+            return cached[1]
+        fields = decode_payload(self.codec or CODEC_RAW, self.data) or {}
+        self.__dict__["_decoded_cache"] = (self.data, fields)
+        return fields
+
+    def get_field(self, name: str) -> Any:
+        """取得單一欄位"""
+        return self._fields().get(name)
+
+    def set_field(self, name: str, value: Any) -> None:
+        """更新單一欄位並重新壓縮"""
+        fields = dict(self._fields())
+        fields[name] = value
+        self.codec, self.data, self.raw_size = encode_payload(fields)
+
 
 class AgentHolding(Base):
     """Agent 持倉模型"""
@@ -371,6 +459,60 @@ class AIModelConfig(Base):
     )
 
 
+class IndicatorSnapshot(Base):
+    """
+    技術指標每日快照
+
+    收盤後由 indicator_snapshot_service 預先計算股票池的完整技術面
+    （均線、RSI、MACD、KD、布林通道、趨勢、型態與交易訊號），
+    盤中分析直接讀取，不必重新計算。
+    """
+
+    __tablename__ = "indicator_snapshots"
+    __table_args__ = (
+        UniqueConstraint("ticker", "trading_date", name="uq_indicator_snapshot_ticker_date"),
+        Index("idx_indicator_snapshots_trading_date", "trading_date"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ticker: Mapped[str] = mapped_column(String(10), nullable=False)
+    trading_date: Mapped[date] = mapped_column(Date, nullable=False)
+    close: Mapped[Decimal] = mapped_column(Numeric(12, 4), nullable=False)
+
+    # 指標與分析結果
+    indicators: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    trend: Mapped[dict[str, Any] | None] = mapped_column(JSON, default=None)
+    patterns: Mapped[list[dict[str, Any]]] = mapped_column(JSON, nullable=False, default=list)
+
+    # 交易訊號（generate_trading_signals 的規則）
+    overall_signal: Mapped[str] = mapped_column(String(10), nullable=False)
+    confidence: Mapped[Decimal] = mapped_column(Numeric(5, 4), nullable=False)
+    signals: Mapped[list[dict[str, Any]]] = mapped_column(JSON, nullable=False, default=list)
+
+    # 時間戳記
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utc_now,
+        onupdate=utc_now,
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉為工具輸出格式"""
+        return {
+            "ticker": self.ticker,
+            "trading_date": self.trading_date.isoformat(),
+            "close": float(self.close),
+            "indicators": self.indicators,
+            "trend": self.trend,
+            "patterns": self.patterns,
+            "overall_signal": self.overall_signal,
+            "confidence": float(self.confidence),
+            "signals": self.signals,
+            "computed_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
 # ==========================================
 # Utility functions using Python 3.12+ features
 # ==========================================
@@ -381,10 +523,12 @@ def get_model_by_name(model_name: str) -> type[Base] | None:
     model_mapping: dict[str, type[Base]] = {
         "agent": Agent,
         "session": AgentSession,
+        "session_payload": AgentSessionPayload,
         "holding": AgentHolding,
         "transaction": Transaction,
         "performance": AgentPerformance,
         "ai_model": AIModelConfig,
+        "indicator_snapshot": IndicatorSnapshot,
     }
     return model_mapping.get(model_name.lower())
 
@@ -400,6 +544,8 @@ def validate_agent_status(status: str) -> AgentStatus | None:
             return AgentStatus.ERROR
         case "suspended":
             return AgentStatus.SUSPENDED
+        case "deleting":
+            return AgentStatus.DELETING
         case _:
             return None
 
@@ -0,0 +1,118 @@
+"""
+Read-your-writes 讀取路由
+
+設定讀取副本後，剛寫入的資料可能尚未複製到副本。這裡記錄每個 Agent 最近一次
+寫入的時間，時間窗內的讀取改走主資料庫：
+- 單一 Agent 的讀取（路徑含 agent_id）：該 Agent 在時間窗內有寫入
+- 清單讀取（不限定 Agent）：任何 Agent 在時間窗內有寫入
+
+記錄以 LRU 方式限制筆數並在寫入時清除過期項目，不會隨 Agent 數量無限成長。
+筆數超過上限而被擠出、但仍在時間窗內的寫入，會讓所有讀取保守地改走主資料庫，
+直到時間窗結束。
+
+記錄只存在於目前行程：多個 worker 時，寫入與之後的讀取可能落在不同 worker，
+須以 sticky session 將同一用戶端導向同一 worker，或以單一 worker 部署。
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+DEFAULT_WINDOW_SECONDS = 10.0
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class RecentWrites:
+    """有時間窗與筆數上限的寫入記錄（key → 最近一次寫入的 monotonic 時間）"""
+
+    def __init__(
+        self,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._writes: OrderedDict[str, float] = OrderedDict()
+        self._last_write: float | None = None
+        # 被擠出但仍在時間窗內的最近一次寫入時間
+        self._evicted_write: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._writes
+
+    def configure(self, window_seconds: float, max_entries: int | None = None) -> None:
+        """更新時間窗與筆數上限（由設定載入時呼叫）"""
+        self.window_seconds = window_seconds
+        if max_entries is not None:
+            self.max_entries = max_entries
+        self._prune(time.monotonic())
+
+    def clear(self) -> None:
+        self._writes.clear()
+        self._last_write = None
+        self._evicted_write = None
+
+    def mark(self, key: str, at: float | None = None) -> None:
+        """記錄一次寫入"""
+        now = time.monotonic() if at is None else at
+        self._writes[key] = now
+        self._writes.move_to_end(key)
+        self._last_write = now if self._last_write is None else max(self._last_write, now)
+        self._prune(now)
+
+    def is_recent(self, key: str | None = None) -> bool:
+        """
+        時間窗內是否有寫入
+
+        Args:
+            key: 指定 key；None 表示任何 key（清單讀取）
+
+        Returns:
+            True 表示讀取應改走主資料庫
+        """
+        now = time.monotonic()
+        if self._within_window(self._evicted_write, now):
+            return True
+        if key is None:
+            return self._within_window(self._last_write, now)
+        written_at = self._writes.get(key)
+        if written_at is None:
+            return False
+        if self._within_window(written_at, now):
+            return True
+        # 已過期，順便清理
+        del self._writes[key]
+        return False
+
+    def _within_window(self, written_at: float | None, now: float) -> bool:
+        return written_at is not None and now - written_at < self.window_seconds
+
+    def _prune(self, now: float) -> None:
+        """移除過期項目，並將超出上限的最舊項目擠出"""
+        for key, written_at in list(self._writes.items()):
+            if self._within_window(written_at, now):
+                break
+            del self._writes[key]
+        while len(self._writes) > self.max_entries:
+            _, written_at = self._writes.popitem(last=False)
+            if self._evicted_write is None or written_at > self._evicted_write:
+                self._evicted_write = written_at
+
+
+# 目前行程的 Agent 寫入記錄（時間窗由 API 設定載入時套用）
+recent_agent_writes = RecentWrites()
+
+
+def mark_agent_write(agent_id: str | None) -> None:
+    """
+    記錄 Agent 的寫入（read-your-writes）
+
+    時間窗內該 Agent 的讀取與所有清單讀取改走主資料庫，用戶端剛觸發的
+    交易或執行不會讀到副本上的舊資料。
+    """
+    if agent_id:
+        recent_agent_writes.mark(agent_id)
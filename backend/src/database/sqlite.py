@@ -0,0 +1,240 @@
+"""
+SQLite single-node profile
+
+小型部署使用 aiosqlite 時的效能設定：
+- 連線建立時設定 WAL、synchronous=NORMAL、mmap_size、busy_timeout 等 pragma
+- 單一寫入者 (single-writer) 任務：將併發交易的寫入排入佇列，
+  以單一連線批次執行並一次提交 (group commit)，避免 "database is locked"
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from common.logger import logger
+
+T = TypeVar("T")
+
+WriteJob = Callable[[AsyncSession], Awaitable[Any]]
+
+
+def is_sqlite_url(url: str | None) -> bool:
+    """判斷是否為 SQLite 連線 URL"""
+    return bool(url) and url.startswith("sqlite")
+
+
+def is_file_sqlite_url(url: str | None) -> bool:
+    """判斷是否為檔案型 SQLite（記憶體資料庫無法共用 WAL 與連線池）"""
+    return is_sqlite_url(url) and ":memory:" not in url and "mode=memory" not in url
+
+
+def apply_sqlite_pragmas(
+    engine: AsyncEngine,
+    busy_timeout_ms: int,
+    mmap_size: int,
+    read_only: bool = False,
+    immediate_transactions: bool = False,
+) -> None:
+    """
+    在每條新連線上套用 SQLite pragma
+
+    Args:
+        engine: SQLite async engine
+        busy_timeout_ms: 鎖等待時間（毫秒）
+        mmap_size: 記憶體映射大小（bytes）
+        read_only: 是否為唯讀連線（設定 query_only）
+        immediate_transactions: 是否以 BEGIN IMMEDIATE 開始交易（寫入者連線使用，
+            事先取得寫鎖並讓 SAVEPOINT 行為正確）
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record):
+        if immediate_transactions:
+            # 關閉 pysqlite 的隱式交易，改由 begin 事件明確控制
+            dbapi_connection.isolation_level = None
+
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    if immediate_transactions:
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _on_begin(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+@dataclass
+class _PendingWrite:
+    """佇列中的寫入工作"""
+
+    job: WriteJob
+    future: asyncio.Future
+
+
+class SQLiteWriteQueue:
+    """
+    SQLite 單一寫入者佇列
+
+    所有寫入工作由單一背景任務以同一條連線執行：
+    - 每個工作在獨立 SAVEPOINT 中執行，失敗只回滾該工作
+    - 在批次視窗內收集多個工作後一次 COMMIT，減少 fsync 次數
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_batch_size: int = 32,
+        batch_window_ms: float = 5.0,
+        max_queue_size: int = 1000,
+    ):
+        """
+        初始化寫入佇列
+
+        Args:
+            session_maker: 綁定寫入者 engine 的 session maker
+            max_batch_size: 單次提交最多包含的工作數
+            batch_window_ms: 收集批次的等待時間（毫秒）
+            max_queue_size: 佇列上限（滿時 submit 會等待）
+        """
+        self._session_maker = session_maker
+        self._max_batch_size = max(1, max_batch_size)
+        self._batch_window = max(0.0, batch_window_ms) / 1000
+        self._queue: asyncio.Queue[_PendingWrite | None] = asyncio.Queue(maxsize=max_queue_size)
+        self._task: asyncio.Task | None = None
+
+        # 統計資訊
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.batches_committed = 0
+
+    @property
+    def is_running(self) -> bool:
+        """寫入任務是否運行中"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """目前排隊中的工作數"""
+        return self._queue.qsize()
+
+    async def start(self) -> None:
+        """啟動寫入任務"""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run(), name="sqlite-writer")
+        logger.info("SQLite write queue started")
+
+    async def stop(self) -> None:
+        """停止寫入任務（會先處理完已排隊的工作）"""
+        if not self.is_running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        logger.info(
+            f"SQLite write queue stopped: jobs={self.jobs_completed}, "
+            f"failed={self.jobs_failed}, batches={self.batches_committed}"
+        )
+
+    async def submit(self, job: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        提交寫入工作並等待提交完成
+
+        Args:
+            job: 接收寫入者 session 的 async 函數，不可自行 commit
+
+        Returns:
+            job 的回傳值（已提交後才回傳）
+        """
+        if not self.is_running:
+            raise RuntimeError("SQLite write queue is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingWrite(job=job, future=future))
+        return await future
+
+    async def _run(self) -> None:
+        """寫入任務主迴圈"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = loop.time() + self._batch_window
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._run_batch(batch)
+            except Exception as e:
+                # 連線層級錯誤：通知整個批次，寫入任務繼續服務後續工作
+                logger.error(f"SQLite write batch failed: {e}")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                self.jobs_failed += len(batch)
+
+    async def _run_batch(self, batch: list[_PendingWrite]) -> None:
+        """以單一交易執行一個批次"""
+        outcomes: list[tuple[_PendingWrite, Any, BaseException | None]] = []
+
+        async with self._session_maker() as session:
+            for pending in batch:
+                if pending.future.cancelled():
+                    continue
+                try:
+                    async with session.begin_nested():
+                        result = await pending.job(session)
+                    outcomes.append((pending, result, None))
+                except Exception as e:
+                    outcomes.append((pending, None, e))
+
+            try:
+                await session.commit()
+            except Exception as e:
+                logger.error(f"SQLite write batch commit failed: {e}")
+                await session.rollback()
+                for pending, _, _ in outcomes:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                self.jobs_failed += len(outcomes)
+                return
+
+        self.batches_committed += 1
+        for pending, result, error in outcomes:
+            if pending.future.done():
+                continue
+            if error is not None:
+                self.jobs_failed += 1
+                pending.future.set_exception(error)
+            else:
+                self.jobs_completed += 1
+                pending.future.set_result(result)
@@ -0,0 +1,177 @@
+"""
+既有 SQLite 資料庫的就地升級
+
+create_all 只建立缺少的資料表，不會修改既有資料表。PostgreSQL 以
+scripts/postgres/migrations 升級；SQLite 改由啟動時的 ensure_tables_exist
+呼叫這裡，依實際的資料表結構判斷是否需要升級（可重複執行，已升級時不做事）。
+所有步驟在同一個交易中執行，失敗時整批回滾並讓啟動失敗：
+- agent_sessions 內嵌的 initial_input / final_output / tools_called
+  搬入 agent_session_payloads（codec raw，與 PostgreSQL migration 相同的 JSON 文件），
+  再移除舊欄位
+- agents 的 check_agent_status 加入 deleting（SQLite 無法修改 CHECK，以重建資料表完成）
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+from sqlalchemy import Connection, text
+
+from common.enums import AgentStatus
+from common.logger import logger
+from database.compression import CODEC_RAW, encode_payload
+
+LEGACY_PAYLOAD_COLUMNS = ("initial_input", "final_output", "tools_called")
+
+
+class SQLiteUpgradeError(Exception):
+    """SQLite 升級失敗"""
+
+
+_AGENT_STATUS_CHECK = re.compile(
+    r"CONSTRAINT\s+check_agent_status\s+CHECK\s*\(status IN \([^)]*\)\)"
+)
+_CREATE_AGENTS = re.compile(r"^\s*CREATE TABLE\s+(\"agents\"|agents)", re.IGNORECASE)
+
+
+def _table_columns(connection: Connection, table: str) -> list[str]:
+    return [row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table}")')]
+
+
+def _json_value(value: Any) -> Any:
+    """JSON 欄位在 SQLite 中以文字儲存；無法解析時保留原字串"""
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def move_session_payloads(connection: Connection) -> int:
+    """
+    將 agent_sessions 內嵌的大型內容搬入 agent_session_payloads
+
+    已有 payload 的會話保留原 payload（與 PostgreSQL 的 ON CONFLICT DO NOTHING 相同）。
+
+    Returns:
+        搬移的會話數（沒有舊欄位時為 0）
+    """
+    columns = _table_columns(connection, "agent_sessions")
+    legacy = [c for c in LEGACY_PAYLOAD_COLUMNS if c in columns]
+    if not legacy:
+        return 0
+
+    selected = ", ".join(legacy)
+    has_data = " OR ".join(f"{c} IS NOT NULL" for c in legacy)
+    rows = connection.exec_driver_sql(
+        f"SELECT id, created_at, updated_at, {selected} FROM agent_sessions WHERE {has_data}"
+    ).fetchall()
+
+    moved = 0
+    for session_id, created_at, updated_at, *values in rows:
+        document = dict.fromkeys(LEGACY_PAYLOAD_COLUMNS)
+        document.update(zip(legacy, values, strict=True))
+        document["initial_input"] = _json_value(document["initial_input"])
+        codec, data, raw_size = encode_payload(document, CODEC_RAW)
+        result = connection.execute(
+            text(
+                "INSERT OR IGNORE INTO agent_session_payloads "
+                "(session_id, codec, data, raw_size, created_at, updated_at) "
+                "VALUES (:session_id, :codec, :data, :raw_size, :created_at, :updated_at)"
+            ),
+            {
+                "session_id": session_id,
+                "codec": codec,
+                "data": data,
+                "raw_size": raw_size,
+                "created_at": created_at,
+                "updated_at": updated_at,
+            },
+        )
+        moved += result.rowcount
+
+    for column in legacy:
+        connection.exec_driver_sql(f"ALTER TABLE agent_sessions DROP COLUMN {column}")
+    logger.info(
+        f"Moved {moved} session payload(s) into agent_session_payloads "
+        f"and dropped agent_sessions.{', '.join(legacy)}"
+    )
+    return moved
+
+
+def widen_agent_status_check(connection: Connection) -> bool:
+    """
+    重建 agents 資料表，讓 check_agent_status 接受目前所有的 AgentStatus
+
+    依 SQLite 建議的步驟：以新約束建立 agents_new、複製資料、刪除舊表、改名，
+    再重建索引。需在關閉外鍵檢查的連線上執行（見 upgrade_sqlite_schema），
+    否則刪除舊表時會連帶處理子資料表的外鍵。
+
+    Returns:
+        是否重建了資料表
+    """
+    table_sql = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'agents'"
+    ).scalar()
+    if not table_sql:
+        return False
+    constraint = _AGENT_STATUS_CHECK.search(table_sql)
+    if constraint is None:
+        logger.warning("agents.check_agent_status not recognised; SQLite schema left unchanged")
+        return False
+    allowed = [status.value for status in AgentStatus]
+    if all(f"'{value}'" in constraint.group(0) for value in allowed):
+        return False
+
+    values = ", ".join(f"'{value}'" for value in allowed)
+    new_sql = _CREATE_AGENTS.sub("CREATE TABLE agents_new", table_sql, count=1)
+    new_sql = new_sql.replace(
+        constraint.group(0), f"CONSTRAINT check_agent_status CHECK (status IN ({values}))"
+    )
+    index_sql = [
+        row[0]
+        for row in connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'agents' AND sql IS NOT NULL"
+        )
+    ]
+
+    connection.exec_driver_sql(new_sql)
+    connection.exec_driver_sql("INSERT INTO agents_new SELECT * FROM agents")
+    connection.exec_driver_sql("DROP TABLE agents")
+    connection.exec_driver_sql("ALTER TABLE agents_new RENAME TO agents")
+    for sql in index_sql:
+        connection.exec_driver_sql(sql)
+    logger.info(f"Rebuilt agents table: check_agent_status now allows {values}")
+    return True
+
+
+def upgrade_sqlite_schema(connection: Connection) -> None:
+    """
+    套用所有 SQLite 升級（在 create_all 之後，以尚未開始交易的連線呼叫）
+
+    foreign_keys 只能在交易外切換：先暫時關閉，升級在 SAVEPOINT 交易中執行，
+    提交前以 foreign_key_check 確認沒有破壞外鍵，最後還原原本的設定。
+    """
+    foreign_keys = connection.exec_driver_sql("PRAGMA foreign_keys").scalar()
+    connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+    connection.exec_driver_sql("SAVEPOINT sqlite_upgrade")
+    try:
+        move_session_payloads(connection)
+        widen_agent_status_check(connection)
+        violations = connection.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            raise SQLiteUpgradeError(f"SQLite upgrade broke foreign keys: {violations[:5]}")
+        connection.exec_driver_sql("RELEASE SAVEPOINT sqlite_upgrade")
+    except Exception:
+        connection.exec_driver_sql("ROLLBACK TO SAVEPOINT sqlite_upgrade")
+        connection.exec_driver_sql("RELEASE SAVEPOINT sqlite_upgrade")
+        raise
+    finally:
+        connection.commit()
+        if foreign_keys:
+            connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+            connection.commit()
@@ -81,6 +81,16 @@ class UpdateModeRequest(BaseModel):
     trigger: str = Field(default="manual")  # 觸發來源
 
 
+class PurgeThrottleRequest(BaseModel):
+    """
+    調整代理人背景清除節流請求模型。
+    未提供的欄位維持原值。
+    """
+
+    batch_size: int | None = Field(None, ge=1, le=10000)  # 每批刪除筆數
+    throttle_ms: int | None = Field(None, ge=0, le=60000)  # 批次間暫停毫秒數
+
+
 class AgentResponse(BaseModel):
     """
     代理人資訊回應模型。
@@ -94,7 +104,7 @@ class AgentResponse(BaseModel):
     color_theme: str  # 顏色主題
     current_mode: str  # 目前交易模式
     max_position_size: float  # 最大持倉比例 (%)
-    status: str  # 代理人持久化狀態 (active/inactive/error/suspended)
+    status: str  # 代理人持久化狀態 (active/inactive/error/suspended/deleting)
     initial_funds: float  # 初始資金
     current_funds: float | None = None  # 目前資金
     investment_preferences: list[str]  # 投資偏好
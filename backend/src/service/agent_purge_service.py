@@ -0,0 +1,332 @@
+"""
+AgentPurgeService - Agent 背景清除服務
+
+刪除 Agent 時不在單一事務中級聯刪除全部歷史資料，而是：
+- API 立即將 Agent 標記為 DELETING（查詢中視為已刪除）
+- 背景工作依序以有上限的小批次刪除子資料表，每批一個短事務
+- 批次之間可節流，避免長時間持有鎖而阻塞進行中的交易
+- 進度可查詢並透過回呼推送
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from common.enums import AgentStatus
+from common.logger import logger
+from common.time_utils import utc_now
+from database.models import (
+    Agent,
+    AgentHolding,
+    AgentPerformance,
+    AgentSession,
+    AgentSessionPayload,
+    Transaction,
+)
+from database.read_routing import mark_agent_write
+
+
+# ==========================================
+# Custom Exceptions
+# ==========================================
+
+
+class AgentPurgeError(Exception):
+    """Agent 清除工作錯誤"""
+
+    pass
+
+
+# ==========================================
+# Purge Job
+# ==========================================
+
+
+PURGE_PENDING = "pending"
+PURGE_RUNNING = "running"
+PURGE_COMPLETED = "completed"
+PURGE_FAILED = "failed"
+PURGE_CANCELLED = "cancelled"
+
+# 刪除順序：先刪除參照其他資料表的子資料，最後刪除 Agent 本身
+PURGE_STEPS = (
+    "transactions",
+    "agent_holdings",
+    "agent_performance",
+    "agent_session_payloads",
+    "agent_sessions",
+)
+
+ProgressCallback = Callable[["PurgeJob"], Awaitable[None]]
+
+
+@dataclass
+class PurgeJob:
+    """單一 Agent 的清除工作狀態"""
+
+    agent_id: str
+    batch_size: int
+    throttle_ms: int
+    status: str = PURGE_PENDING
+    current_step: str | None = None
+    deleted: dict[str, int] = field(default_factory=lambda: dict.fromkeys(PURGE_STEPS, 0))
+    batches: int = 0
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    @property
+    def is_active(self) -> bool:
+        """工作是否仍在進行"""
+        return self.status in (PURGE_PENDING, PURGE_RUNNING)
+
+    def to_dict(self) -> dict[str, Any]:
+        """轉換為 API 回應格式"""
+        return {
+            "agent_id": self.agent_id,
+            "status": self.status,
+            "current_step": self.current_step,
+            "deleted": dict(self.deleted),
+            "total_deleted": sum(self.deleted.values()),
+            "batches": self.batches,
+            "batch_size": self.batch_size,
+            "throttle_ms": self.throttle_ms,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
+
+
+# ==========================================
+# AgentPurgeService
+# ==========================================
+
+
+class AgentPurgeService:
+    """
+    Agent 背景清除服務
+
+    每個 Agent 同時最多一個清除工作；工作使用自己的 session，
+    不依賴 API 請求的 session 生命週期。
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession] | None = None):
+        """
+        初始化清除服務
+
+        Args:
+            session_maker: 資料庫 session maker（預設使用主資料庫）
+        """
+        self._session_maker = session_maker
+        self.jobs: dict[str, PurgeJob] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def _get_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        if self._session_maker is None:
+            from api.config import get_session_maker
+
+            self._session_maker = get_session_maker()
+        return self._session_maker
+
+    def get_job(self, agent_id: str) -> PurgeJob | None:
+        """取得 Agent 的清除工作"""
+        return self.jobs.get(agent_id)
+
+    def start(
+        self,
+        agent_id: str,
+        batch_size: int | None = None,
+        throttle_ms: int | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> PurgeJob:
+        """
+        啟動 Agent 清除工作（Agent 應已標記為 DELETING）
+
+        Args:
+            agent_id: Agent ID
+            batch_size: 每批刪除筆數（預設使用設定值）
+            throttle_ms: 批次間暫停毫秒數（預設使用設定值）
+            on_progress: 每批完成後的進度回呼
+
+        Returns:
+            清除工作（已在執行中則回傳既有工作）
+        """
+        existing = self.jobs.get(agent_id)
+        if existing is not None and existing.is_active:
+            return existing
+
+        from api.config import settings
+
+        if throttle_ms is None:
+            throttle_ms = settings.agent_purge_throttle_ms
+        job = PurgeJob(
+            agent_id=agent_id,
+            batch_size=max(1, batch_size or settings.agent_purge_batch_size),
+            throttle_ms=max(0, throttle_ms),
+        )
+        self.jobs[agent_id] = job
+        self._tasks[agent_id] = asyncio.create_task(
+            self._run(job, on_progress), name=f"agent-purge-{agent_id}"
+        )
+        return job
+
+    def throttle(
+        self, agent_id: str, batch_size: int | None = None, throttle_ms: int | None = None
+    ) -> PurgeJob:
+        """
+        調整進行中工作的批次大小與節流（下一批生效）
+
+        Raises:
+            AgentPurgeError: 沒有進行中的清除工作
+        """
+        job = self.jobs.get(agent_id)
+        if job is None or not job.is_active:
+            raise AgentPurgeError(f"No active purge job for agent '{agent_id}'")
+        if batch_size is not None:
+            job.batch_size = max(1, batch_size)
+        if throttle_ms is not None:
+            job.throttle_ms = max(0, throttle_ms)
+        return job
+
+    async def resume_pending(self, on_progress: ProgressCallback | None = None) -> list[str]:
+        """
+        重新啟動上次未完成的清除工作（啟動時呼叫）
+
+        Returns:
+            重新啟動的 Agent ID 列表
+        """
+        async with self._get_session_maker()() as session:
+            result = await session.execute(
+                select(Agent.id).where(Agent.status == AgentStatus.DELETING.value)
+            )
+            agent_ids = list(result.scalars().all())
+
+        for agent_id in agent_ids:
+            self.start(agent_id, on_progress=on_progress)
+        if agent_ids:
+            logger.info(f"Resumed agent purge jobs: {', '.join(agent_ids)}")
+        return agent_ids
+
+    async def shutdown(self) -> None:
+        """取消進行中的工作（Agent 維持 DELETING，下次啟動時續行）"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def wait(self, agent_id: str) -> PurgeJob | None:
+        """等待工作結束並回傳最終狀態"""
+        task = self._tasks.get(agent_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        return self.jobs.get(agent_id)
+
+    # ==========================================
+    # Internal
+    # ==========================================
+
+    async def _run(self, job: PurgeJob, on_progress: ProgressCallback | None) -> None:
+        """依序分批刪除子資料表，最後刪除 Agent"""
+        job.status = PURGE_RUNNING
+        job.started_at = utc_now()
+        logger.info(
+            f"Agent purge started: {job.agent_id} "
+            f"(batch_size={job.batch_size}, throttle_ms={job.throttle_ms})"
+        )
+
+        try:
+            for step in PURGE_STEPS:
+                job.current_step = step
+                while True:
+                    deleted = await self._delete_batch(job.agent_id, step, job.batch_size)
+                    if deleted == 0:
+                        break
+                    job.deleted[step] += deleted
+                    job.batches += 1
+                    await self._notify(job, on_progress)
+                    if job.throttle_ms:
+                        await asyncio.sleep(job.throttle_ms / 1000)
+
+            job.current_step = "agents"
+            await self._delete_agent_row(job.agent_id)
+
+            job.status = PURGE_COMPLETED
+            logger.success(
+                f"Agent purge completed: {job.agent_id} "
+                f"({sum(job.deleted.values())} rows in {job.batches} batches)"
+            )
+
+        except asyncio.CancelledError:
+            job.status = PURGE_CANCELLED
+            logger.warning(f"Agent purge cancelled: {job.agent_id}")
+            raise
+
+        except Exception as e:
+            job.status = PURGE_FAILED
+            job.error = str(e)
+            logger.error(f"Agent purge failed: {job.agent_id}: {e}", exc_info=True)
+
+        finally:
+            job.current_step = None
+            job.finished_at = utc_now()
+            self._tasks.pop(job.agent_id, None)
+            if job.status != PURGE_CANCELLED:
+                await self._notify(job, on_progress)
+
+    async def _delete_batch(self, agent_id: str, step: str, limit: int) -> int:
+        """以短事務刪除一批子資料，回傳刪除筆數"""
+        if step == "agent_session_payloads":
+            key = AgentSessionPayload.session_id
+            condition = key.in_(select(AgentSession.id).where(AgentSession.agent_id == agent_id))
+            model = AgentSessionPayload
+        else:
+            model = {
+                "transactions": Transaction,
+                "agent_holdings": AgentHolding,
+                "agent_performance": AgentPerformance,
+                "agent_sessions": AgentSession,
+            }[step]
+            key = model.id
+            condition = model.agent_id == agent_id
+
+        async with self._get_session_maker()() as session:
+            ids = list((await session.execute(select(key).where(condition).limit(limit))).scalars())
+            if not ids:
+                return 0
+            await session.execute(delete(model).where(key.in_(ids)))
+            await session.commit()
+            return len(ids)
+
+    async def _delete_agent_row(self, agent_id: str) -> None:
+        """刪除 Agent 本身（僅限仍為 DELETING 狀態）"""
+        async with self._get_session_maker()() as session:
+            await session.execute(
+                delete(Agent).where(
+                    Agent.id == agent_id, Agent.status == AgentStatus.DELETING.value
+                )
+            )
+            await session.commit()
+
+        mark_agent_write(agent_id)
+
+    async def _notify(self, job: PurgeJob, on_progress: ProgressCallback | None) -> None:
+        """回報進度（回呼失敗不影響清除）"""
+        if on_progress is None:
+            return
+        try:
+            await on_progress(job)
+        except Exception as e:
+            logger.warning(f"Agent purge progress callback failed: {e}")
+
+
+# 全域清除服務實例
+agent_purge_service = AgentPurgeService()
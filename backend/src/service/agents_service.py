@@ -33,6 +33,7 @@ from common.enums import (
     validate_agent_status,
 )
 from common.logger import logger
+from service import performance_metrics
 from common.time_utils import utc_now
 
 
@@ -104,13 +105,13 @@ class AgentsService:
             result = await self.session.execute(stmt)
             agent = result.scalar_one_or_none()
 
-            if not agent:
+            if not agent or agent.status == AgentStatus.DELETING:
                 raise AgentNotFoundError(f"Agent '{agent_id}' not found in database")
 
             # 驗證必要欄位
             self._validate_agent_config(agent)
 
-            logger.info(f"Loaded agent config: {agent_id} (model: {agent.ai_model})")
+            logger.debug("Loaded agent config: {} (model: {})", agent_id, agent.ai_model)
             return agent
 
         except AgentNotFoundError:
@@ -140,7 +141,7 @@ class AgentsService:
             result = await self.session.execute(stmt)
             agent = result.scalar_one_or_none()
 
-            if not agent:
+            if not agent or agent.status == AgentStatus.DELETING:
                 raise AgentNotFoundError(f"Agent '{agent_id}' not found")
 
             logger.info(f"Loaded agent with {len(agent.holdings)} holdings: {agent_id}")
@@ -164,7 +165,12 @@ class AgentsService:
         """
         try:
             logger.debug("Executing list_agents query")
-            stmt = select(Agent).order_by(Agent.created_at.asc())
+            # 刪除中的 Agent 視為已刪除
+            stmt = (
+                select(Agent)
+                .where(Agent.status != AgentStatus.DELETING.value)
+                .order_by(Agent.created_at.asc())
+            )
             result = await self.session.execute(stmt)
             agents = list(result.scalars().all())
 
@@ -601,7 +607,7 @@ class AgentsService:
             result = await self.session.execute(stmt)
             holdings = list(result.scalars().all())
 
-            logger.info(f"Found {len(holdings)} holdings for agent {agent_id}")
+            logger.debug("Found {} holdings for agent {}", len(holdings), agent_id)
             return holdings
 
         except Exception as e:
@@ -761,101 +767,15 @@ class AgentsService:
             result = await self.session.execute(stmt)
             transactions = list(result.scalars().all())
 
-            # 按股票分組交易
-            trades_by_ticker: dict[str, dict[str, list[Transaction]]] = {}
-            for tx in transactions:
-                if tx.ticker not in trades_by_ticker:
-                    trades_by_ticker[tx.ticker] = {"buys": [], "sells": []}
-
-                if tx.action == TransactionAction.BUY:
-                    trades_by_ticker[tx.ticker]["buys"].append(tx)
-                else:
-                    trades_by_ticker[tx.ticker]["sells"].append(tx)
-
-            # 計算買賣對和損益
-            total_pairs = 0
-            winning_pairs = 0
-
-            for ticker, trades in trades_by_ticker.items():
-                buys = trades["buys"].copy()
-                sells = trades["sells"].copy()
-
-                # 在修改之前保存每個交易的原始數量（使用 id 作為 key）
-                buy_original_quantities = {id(buy): buy.quantity for buy in buys}
-                sell_original_quantities = {id(sell): sell.quantity for sell in sells}
-
-                buy_idx = 0
-
-                for sell in sells:
-                    remaining_qty = sell.quantity
-                    sell_original_qty = sell_original_quantities.get(id(sell), sell.quantity)
-
-                    # 避免除以零：跳過數量為零的賣出交易
-                    if sell_original_qty == 0:
-                        logger.warning(f"Skipping sell transaction with zero quantity for {ticker}")
-                        continue
-
-                    while remaining_qty > 0 and buy_idx < len(buys):
-                        buy = buys[buy_idx]
-                        buy_original_qty = buy_original_quantities.get(id(buy), buy.quantity)
-
-                        # 避免除以零：跳過數量為零的買入交易
-                        if buy_original_qty == 0:
-                            logger.warning(
-                                f"Skipping buy transaction with zero quantity for {ticker}"
-                            )
-                            buy_idx += 1
-                            continue
-
-                        # 如果買入交易已完全配對，移到下一個
-                        if buy.quantity <= 0:
-                            buy_idx += 1
-                            continue
-
-                        # 計算此次配對的數量（取較小值）
-                        matched_qty = min(remaining_qty, buy.quantity)
-
-                        # 計算此對交易的損益（含手續費）
-                        # 損益 = (賣出價 - 買入價) × 數量 - 雙邊手續費
-                        gross_pnl = (sell.price - buy.price) * matched_qty
-                        buy_commission_portion = buy.commission * Decimal(
-                            str(matched_qty / buy_original_qty)
-                        )  # 按比例分攤手續費
-                        sell_commission_portion = sell.commission * Decimal(
-                            str(matched_qty / sell_original_qty)
-                        )
-                        net_pnl = gross_pnl - buy_commission_portion - sell_commission_portion
-
-                        # 判斷是否獲利
-                        if net_pnl > 0:
-                            winning_pairs += 1
-
-                        total_pairs += 1
-
-                        # 更新剩餘數量
-                        remaining_qty -= matched_qty
-                        buy.quantity -= matched_qty
-
-                        # 如果買入交易完全配對，移到下一個買入交易
-                        if buy.quantity <= 0:
-                            buy_idx += 1
-
-            # 計算勝率
-            win_rate = (
-                Decimal(str(winning_pairs / total_pairs * 100)) if total_pairs > 0 else Decimal("0")
-            )
+            # FIFO 買賣配對（公式與回測共用）
+            pairs = performance_metrics.trade_pairs_and_win_rate(transactions)
 
             logger.info(
                 f"Trade pairs calculated for agent {agent_id}: "
-                f"total={total_pairs}, winning={winning_pairs}, win_rate={win_rate}%"
+                f"total={pairs['total_pairs']}, winning={pairs['winning_pairs']}, "
+                f"win_rate={pairs['win_rate']}%"
             )
-
-            return {
-                "total_pairs": total_pairs,
-                "winning_pairs": winning_pairs,
-                "losing_pairs": total_pairs - winning_pairs,
-                "win_rate": win_rate,
-            }
+            return pairs
 
         except Exception as e:
             logger.error(
@@ -890,61 +810,8 @@ class AgentsService:
             result = await self.session.execute(stmt)
             transactions = list(result.scalars().all())
 
-            # 追蹤成本基礎 (cost basis)
-            # 格式: {ticker: [(quantity, price, commission), ...]}
-            cost_basis: dict[str, list[tuple[int, Decimal, Decimal]]] = {}
-            realized_pnl = Decimal("0")
-
-            for tx in transactions:
-                ticker = tx.ticker
-
-                if tx.action == TransactionAction.BUY:
-                    # 買入: 記錄成本基礎
-                    if ticker not in cost_basis:
-                        cost_basis[ticker] = []
-
-                    cost_basis[ticker].append((tx.quantity, tx.price, tx.commission))
-
-                elif tx.action == TransactionAction.SELL:
-                    # 賣出: 使用 FIFO 配對並計算損益
-                    remaining_qty = tx.quantity
-                    sell_price = tx.price
-                    sell_commission_per_share = (
-                        tx.commission / Decimal(tx.quantity) if tx.quantity else Decimal("0")
-                    )
-
-                    while remaining_qty > 0 and ticker in cost_basis and cost_basis[ticker]:
-                        # 取得最早的買入記錄 (FIFO)
-                        buy_qty, buy_price, buy_commission = cost_basis[ticker][0]
-
-                        # 計算此次配對的數量
-                        matched_qty = min(remaining_qty, buy_qty)
-
-                        # 計算毛損益
-                        gross_pnl = (sell_price - buy_price) * Decimal(matched_qty)
-
-                        # 扣除手續費（按比例分攤）
-                        allocation_ratio = (
-                            Decimal(matched_qty) / Decimal(buy_qty) if buy_qty else Decimal("0")
-                        )
-                        buy_commission_portion = buy_commission * allocation_ratio
-                        sell_commission_portion = sell_commission_per_share * Decimal(matched_qty)
-
-                        # 計算淨損益
-                        net_pnl = gross_pnl - buy_commission_portion - sell_commission_portion
-
-                        # 累加到總已實現損益
-                        realized_pnl += net_pnl
-
-                        # 更新剩餘數量
-                        remaining_qty -= matched_qty
-                        buy_qty -= matched_qty
-
-                        # 更新或移除成本基礎記錄
-                        if buy_qty == 0:
-                            cost_basis[ticker].pop(0)
-                        else:
-                            cost_basis[ticker][0] = (buy_qty, buy_price, buy_commission)
+            # FIFO 配對計算已實現損益（公式與回測共用）
+            realized_pnl = performance_metrics.realized_pnl(transactions)
 
             logger.info(f"Calculated realized P&L for agent {agent_id}: {realized_pnl}")
             return realized_pnl
@@ -995,26 +862,11 @@ class AgentsService:
                 )
                 return None
 
-            # 初始化追蹤變數
-            peak = Decimal("0")  # 歷史最高淨值
-            max_drawdown = Decimal("0")  # 最大回撤
-
-            # 遍歷每個淨值
-            for value in values:
-                # 更新歷史最高淨值
-                if value > peak:
-                    peak = value
-
-                # 計算當前回撤
-                if peak > 0:
-                    drawdown = (peak - value) / peak * 100
-                    # 更新最大回撤
-                    if drawdown > max_drawdown:
-                        max_drawdown = drawdown
+            max_drawdown = performance_metrics.max_drawdown(values)
 
             logger.info(
                 f"Calculated max drawdown for agent {agent_id}: {max_drawdown:.2f}% "
-                f"(peak={peak}, data_points={len(values)})"
+                f"(peak={max(values)}, data_points={len(values)})"
             )
             return max_drawdown
 
@@ -1044,9 +896,6 @@ class AgentsService:
             AgentDatabaseError: 資料庫操作失敗
         """
         try:
-            # 無風險利率（年化 2%）
-            RISK_FREE_RATE = Decimal("2")
-
             # 取得所有歷史績效記錄（按日期排序）
             stmt = (
                 select(AgentPerformance.daily_return)
@@ -1059,40 +908,17 @@ class AgentsService:
             daily_returns = [row[0] for row in result.all()]
 
             # 需要至少 20 個交易日資料
-            if len(daily_returns) < 20:
+            sharpe_ratio = performance_metrics.sharpe_ratio(daily_returns)
+            if sharpe_ratio is None:
                 logger.debug(
                     f"Insufficient data to calculate Sharpe ratio for agent {agent_id}: "
                     f"only {len(daily_returns)} records (need >= 20)"
                 )
                 return None
 
-            # 計算日報酬率平均值
-            avg_return = sum(daily_returns) / len(daily_returns)
-
-            # 計算日報酬率標準差（波動率）
-            variance = sum((r - avg_return) ** 2 for r in daily_returns) / len(daily_returns)
-            daily_volatility = variance.sqrt()
-
-            # 年化波動率（252 個交易日）
-            annual_volatility = daily_volatility * Decimal("15.8745")  # √252
-
-            # 計算年化報酬率
-            # 假設日平均報酬複利計算：(1 + 日平均報酬)^252 - 1
-            if avg_return > -1:
-                annual_return = ((1 + avg_return / 100) ** 252 - 1) * 100
-            else:
-                annual_return = Decimal("0")
-
-            # 計算夏普比率
-            if annual_volatility > 0:
-                sharpe_ratio = (annual_return - RISK_FREE_RATE) / annual_volatility
-            else:
-                sharpe_ratio = Decimal("0")
-
             logger.info(
                 f"Calculated Sharpe ratio for agent {agent_id}: {sharpe_ratio:.4f} "
-                f"(annual_return={annual_return:.2f}%, annual_volatility={annual_volatility:.2f}%, "
-                f"data_points={len(daily_returns)})"
+                f"(data_points={len(daily_returns)})"
             )
             return sharpe_ratio
 
@@ -1122,10 +948,6 @@ class AgentsService:
             AgentDatabaseError: 資料庫操作失敗
         """
         try:
-            # 無風險利率（年化 2%）
-            RISK_FREE_RATE = Decimal("2")
-            TARGET_RETURN = Decimal("0")  # 目標報酬為 0%
-
             # 取得所有歷史績效記錄（按日期排序）
             stmt = (
                 select(AgentPerformance.daily_return)
@@ -1138,48 +960,17 @@ class AgentsService:
             daily_returns = [row[0] for row in result.all()]
 
             # 需要至少 20 個交易日資料
-            if len(daily_returns) < 20:
+            sortino_ratio = performance_metrics.sortino_ratio(daily_returns)
+            if sortino_ratio is None:
                 logger.debug(
                     f"Insufficient data to calculate Sortino ratio for agent {agent_id}: "
                     f"only {len(daily_returns)} records (need >= 20)"
                 )
                 return None
 
-            # 計算日報酬率平均值
-            avg_return = sum(daily_returns) / len(daily_returns)
-
-            # 計算下行波動率（只考慮負報酬）
-            downside_returns = [r for r in daily_returns if r < TARGET_RETURN]
-
-            if downside_returns:
-                downside_variance = sum((r - TARGET_RETURN) ** 2 for r in downside_returns) / len(
-                    daily_returns
-                )  # 分母用總數，不是負報酬數
-                downside_volatility = downside_variance.sqrt()
-            else:
-                # 無下行波動，直接返回
-                downside_volatility = Decimal("0")
-
-            # 年化下行波動率
-            annual_downside_volatility = downside_volatility * Decimal("15.8745")  # √252
-
-            # 計算年化報酬率
-            if avg_return > -1:
-                annual_return = ((1 + avg_return / 100) ** 252 - 1) * 100
-            else:
-                annual_return = Decimal("0")
-
-            # 計算索提諾比率
-            if annual_downside_volatility > 0:
-                sortino_ratio = (annual_return - RISK_FREE_RATE) / annual_downside_volatility
-            else:
-                # 無下行風險，索提諾比率為無窮大（用很大的數表示）
-                sortino_ratio = Decimal("999") if annual_return > RISK_FREE_RATE else Decimal("0")
-
             logger.info(
                 f"Calculated Sortino ratio for agent {agent_id}: {sortino_ratio:.4f} "
-                f"(annual_return={annual_return:.2f}%, annual_downside_volatility={annual_downside_volatility:.2f}%, "
-                f"data_points={len(daily_returns)}, downside_returns={len(downside_returns)})"
+                f"(data_points={len(daily_returns)})"
             )
             return sortino_ratio
 
@@ -1229,21 +1020,11 @@ class AgentsService:
             if not daily_returns:
                 return None
 
-            # 計算平均日報酬率
-            avg_return = sum(daily_returns) / len(daily_returns)
-
-            # 計算年化報酬率
-            if avg_return > -1:
-                annual_return = ((1 + avg_return / 100) ** 252 - 1) * 100
-            else:
-                annual_return = Decimal("0")
-
-            # 計算卡瑪比率
-            calmar_ratio = annual_return / max_drawdown
+            calmar_ratio = performance_metrics.calmar_ratio(daily_returns, max_drawdown)
 
             logger.info(
                 f"Calculated Calmar ratio for agent {agent_id}: {calmar_ratio:.4f} "
-                f"(annual_return={annual_return:.2f}%, max_drawdown={max_drawdown:.2f}%)"
+                f"(max_drawdown={max_drawdown:.2f}%)"
             )
             return calmar_ratio
 
@@ -1307,8 +1088,8 @@ class AgentsService:
                 return None
 
             # 計算日報酬率
-            daily_return = (
-                (today_perf.total_value - prev_perf.total_value) / prev_perf.total_value * 100
+            daily_return = performance_metrics.daily_return(
+                prev_perf.total_value, today_perf.total_value
             )
 
             logger.info(
@@ -1316,7 +1097,7 @@ class AgentsService:
                 f"{daily_return}% (from {prev_perf.total_value} to {today_perf.total_value})"
             )
 
-            return Decimal(str(daily_return))
+            return daily_return
 
         except Exception as e:
             logger.error(
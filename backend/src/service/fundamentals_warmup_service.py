@@ -0,0 +1,169 @@
+"""
+FundamentalsWarmupService - 基本面快取預熱服務
+
+定期為 Agent 持有或關注（investment_preferences 中的股票代號）的股票
+預先取得財報、月營收、股利與公司基本資料，讓分析時直接命中快取。
+已新鮮的快取資料不重新取得。
+
+設定:
+- FUNDAMENTALS_WARMUP_INTERVAL: 預熱間隔（秒），0 表示停用（預設 0）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from common.enums import AgentStatus
+from common.logger import logger
+from database.models import Agent, AgentHolding
+
+# 預熱的工具（只指定股票代號，即「最新」報告期）
+WARMUP_TOOLS = (
+    "get_company_balance_sheet",
+    "get_company_income_statement",
+    "get_company_monthly_revenue",
+    "get_company_dividend",
+    "get_company_profile",
+)
+
+_TICKER_PATTERN = re.compile(r"^\d{4,6}[A-Z]?$")
+
+
+class FundamentalsWarmupService:
+    """基本面快取預熱服務"""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+        client_factory: Callable[[], Any] | None = None,
+    ):
+        """
+        初始化預熱服務
+
+        Args:
+            session_maker: 資料庫 session maker（預設使用主資料庫）
+            client_factory: 建立 MCPMarketClient 的函式（預設 create_mcp_market_client）
+        """
+        self._session_maker = session_maker
+        self._client_factory = client_factory
+        self._task: asyncio.Task | None = None
+
+    def _get_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        if self._session_maker is None:
+            from api.config import get_session_maker
+
+            self._session_maker = get_session_maker()
+        return self._session_maker
+
+    def _create_client(self) -> Any:
+        if self._client_factory is None:
+            from api.mcp_client import create_mcp_market_client
+
+            return create_mcp_market_client()
+        return self._client_factory()
+
+    async def collect_tickers(self) -> list[str]:
+        """Agent 持有的股票與投資偏好中的股票代號（排除刪除中的 Agent）"""
+        async with self._get_session_maker()() as session:
+            held = await session.execute(select(AgentHolding.ticker).distinct())
+            preferences = await session.execute(
+                select(Agent.investment_preferences).where(
+                    Agent.status != AgentStatus.DELETING.value,
+                    Agent.investment_preferences.is_not(None),
+                )
+            )
+            tickers = set(held.scalars().all())
+            for raw in preferences.scalars().all():
+                tickers.update(_tickers_in_preferences(raw))
+        return sorted(tickers)
+
+    async def warm_up(self, tickers: list[str] | None = None) -> dict[str, int]:
+        """
+        預熱快取
+
+        Args:
+            tickers: 股票代號（預設為 collect_tickers() 的結果）
+
+        Returns:
+            {"tickers", "refreshed", "skipped", "failed"}
+        """
+        if tickers is None:
+            tickers = await self.collect_tickers()
+        stats = {"tickers": len(tickers), "refreshed": 0, "skipped": 0, "failed": 0}
+        if not tickers:
+            return stats
+
+        async with self._create_client() as client:
+            if client.cache is None:
+                logger.info("Fundamentals cache disabled, skipping warm-up")
+                return stats
+            for ticker in tickers:
+                for tool_name in WARMUP_TOOLS:
+                    arguments = {"symbol": ticker}
+                    entry = await asyncio.to_thread(client.cache.lookup, tool_name, arguments)
+                    if entry is not None and entry.fresh:
+                        stats["skipped"] += 1
+                        continue
+                    try:
+                        await client.refresh_cached(tool_name, arguments)
+                        stats["refreshed"] += 1
+                    except Exception as e:
+                        stats["failed"] += 1
+                        logger.warning(f"Warm-up {tool_name}({ticker}) failed: {e}")
+
+        logger.info(
+            f"Fundamentals warm-up: {stats['tickers']} tickers, "
+            f"{stats['refreshed']} refreshed, {stats['skipped']} fresh, {stats['failed']} failed"
+        )
+        return stats
+
+    def start(self, interval: float) -> None:
+        """啟動定期預熱（已啟動時不重複建立）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(interval))
+
+    async def shutdown(self) -> None:
+        """停止定期預熱"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.warm_up()
+            except Exception as e:
+                logger.warning(f"Fundamentals warm-up failed: {e}")
+            await asyncio.sleep(interval)
+
+
+def _tickers_in_preferences(raw: str) -> set[str]:
+    """investment_preferences（JSON 字串列表）中看起來像股票代號的項目"""
+    try:
+        preferences = json.loads(raw)
+    except (TypeError, json.JSONDecodeError):
+        return set()
+    if not isinstance(preferences, list):
+        return set()
+    return {
+        item.strip().upper()
+        for item in preferences
+        if isinstance(item, str) and _TICKER_PATTERN.match(item.strip().upper())
+    }
+
+
+def get_warmup_interval() -> float:
+    """FUNDAMENTALS_WARMUP_INTERVAL（秒），0 表示停用"""
+    return float(os.getenv("FUNDAMENTALS_WARMUP_INTERVAL", "0"))
+
+
+fundamentals_warmup_service = FundamentalsWarmupService()
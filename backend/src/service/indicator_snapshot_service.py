@@ -0,0 +1,274 @@
+"""
+IndicatorSnapshotService - 技術指標每日快照服務
+
+收盤後為股票池一次計算完整技術面（trading.indicators.compute_snapshots），
+寫入 indicator_snapshots 表（股票代號 + 交易日唯一）。盤中的技術分析
+以 get_indicator_snapshot 工具直接讀取，不再為熱門股票重複計算。
+
+股票池：INDICATOR_SNAPSHOT_UNIVERSE 檔案；未設定時為 Agent 持有 / 關注的股票；
+兩者皆無時為 K 線檔中的全部股票。
+
+設定:
+- INDICATOR_SNAPSHOT_UNIVERSE: 股票池檔案（JSON 列表或每行一個代號）
+- INDICATOR_SNAPSHOT_DATA: K 線檔（預設 CASUAL_MARKET_DATA）
+- INDICATOR_SNAPSHOT_TIME: 每日執行時間（HH:MM，伺服器時間），未設定表示停用
+
+手動執行：cd src && python -m service.indicator_snapshot_service
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from collections.abc import Callable, Iterable, Sequence
+from datetime import date, datetime, timedelta
+from datetime import time as time_of_day
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from common.logger import logger
+from database.models import IndicatorSnapshot
+from trading.indicators import compute_snapshots
+from trading.pattern_scan import OHLCVPanel, PatternScanError, load_ohlcv
+
+# 單次查詢 / 寫入的股票數
+BATCH_SIZE = 500
+
+
+class IndicatorSnapshotError(Exception):
+    """快照建立錯誤（沒有 K 線資料、股票池為空等）"""
+
+    pass
+
+
+class IndicatorSnapshotService:
+    """技術指標每日快照服務"""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+        panel_loader: Callable[[], OHLCVPanel] | None = None,
+    ):
+        """
+        初始化快照服務
+
+        Args:
+            session_maker: 資料庫 session maker（預設使用主資料庫）
+            panel_loader: 讀取 K 線的函式（預設讀取 INDICATOR_SNAPSHOT_DATA / CASUAL_MARKET_DATA）
+        """
+        self._session_maker = session_maker
+        self._panel_loader = panel_loader
+        self._task: asyncio.Task | None = None
+
+    def _get_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        if self._session_maker is None:
+            from api.config import get_session_maker
+
+            self._session_maker = get_session_maker()
+        return self._session_maker
+
+    def _load_panel(self) -> OHLCVPanel:
+        if self._panel_loader is None:
+            return load_ohlcv(os.getenv("INDICATOR_SNAPSHOT_DATA"))
+        return self._panel_loader()
+
+    async def collect_universe(self) -> list[str]:
+        """股票池（INDICATOR_SNAPSHOT_UNIVERSE 或 Agent 持有 / 關注的股票，可能為空）"""
+        universe_path = os.getenv("INDICATOR_SNAPSHOT_UNIVERSE")
+        if universe_path:
+            from trading.screening import load_universe
+
+            return load_universe(universe_path)
+
+        from service.fundamentals_warmup_service import FundamentalsWarmupService
+
+        return await FundamentalsWarmupService(self._get_session_maker()).collect_tickers()
+
+    async def run(
+        self, tickers: Sequence[str] | None = None, panel: OHLCVPanel | None = None
+    ) -> dict[str, Any]:
+        """
+        計算並儲存快照
+
+        Args:
+            tickers: 股票池（預設為 collect_universe()；為空時使用 K 線中的全部股票）
+            panel: K 線（預設由 panel_loader 讀取）
+
+        Returns:
+            {"tickers", "stored", "missing", "trading_date", "elapsed_ms"}
+        """
+        started = time.perf_counter()
+        if tickers is None:
+            tickers = await self.collect_universe()
+        if panel is None:
+            panel = await asyncio.to_thread(self._load_panel)
+
+        if tickers:
+            wanted = {t.strip().upper() for t in tickers}
+            rows = [i for i, t in enumerate(panel.tickers) if t.upper() in wanted]
+            missing = sorted(wanted - {panel.tickers[i].upper() for i in rows})
+            if not rows:
+                raise IndicatorSnapshotError("None of the universe tickers have price data")
+            panel = _select_rows(panel, rows)
+        else:
+            missing = []
+
+        snapshots = await asyncio.to_thread(compute_snapshots, panel)
+        stored = await self.store(snapshots)
+        trading_date = max((s["trading_date"] for s in snapshots), default=None)
+
+        stats = {
+            "tickers": len(snapshots),
+            "stored": stored,
+            "missing": missing,
+            "trading_date": trading_date.isoformat() if trading_date else None,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        }
+        logger.info(
+            f"Indicator snapshots: {stats['stored']} stored for {stats['trading_date']}, "
+            f"{len(missing)} without data, {stats['elapsed_ms']:.0f}ms"
+        )
+        return stats
+
+    async def store(self, snapshots: Iterable[dict[str, Any]]) -> int:
+        """寫入快照（同一股票同一交易日已存在時更新）"""
+        snapshots = list(snapshots)
+        async with self._get_session_maker()() as session:
+            for start in range(0, len(snapshots), BATCH_SIZE):
+                batch = snapshots[start : start + BATCH_SIZE]
+                existing = await session.execute(
+                    select(IndicatorSnapshot).where(
+                        IndicatorSnapshot.ticker.in_({s["ticker"] for s in batch}),
+                        IndicatorSnapshot.trading_date.in_({s["trading_date"] for s in batch}),
+                    )
+                )
+                rows = {(row.ticker, row.trading_date): row for row in existing.scalars().all()}
+                for snapshot in batch:
+                    row = rows.get((snapshot["ticker"], snapshot["trading_date"]))
+                    if row is None:
+                        row = IndicatorSnapshot(
+                            ticker=snapshot["ticker"], trading_date=snapshot["trading_date"]
+                        )
+                        session.add(row)
+                    row.close = Decimal(str(round(snapshot["close"], 4)))
+                    row.indicators = snapshot["indicators"]
+                    row.trend = snapshot["trend"]
+                    row.patterns = snapshot["patterns"]
+                    row.overall_signal = snapshot["overall_signal"]
+                    row.confidence = Decimal(str(round(snapshot["confidence"], 4)))
+                    row.signals = snapshot["signals"]
+            await session.commit()
+        return len(snapshots)
+
+    async def latest(
+        self, tickers: Sequence[str], trading_date: date | None = None
+    ) -> dict[str, IndicatorSnapshot]:
+        """
+        各股票最新的快照
+
+        Args:
+            tickers: 股票代號
+            trading_date: 只取此交易日（含）之前的快照（預設不限）
+
+        Returns:
+            {股票代號: IndicatorSnapshot}（沒有快照的股票不列出）
+        """
+        tickers = sorted({t.strip().upper() for t in tickers if t and t.strip()})
+        result: dict[str, IndicatorSnapshot] = {}
+        async with self._get_session_maker()() as session:
+            for start in range(0, len(tickers), BATCH_SIZE):
+                batch = tickers[start : start + BATCH_SIZE]
+                latest_dates = select(
+                    IndicatorSnapshot.ticker,
+                    func.max(IndicatorSnapshot.trading_date).label("trading_date"),
+                ).where(IndicatorSnapshot.ticker.in_(batch))
+                if trading_date is not None:
+                    latest_dates = latest_dates.where(
+                        IndicatorSnapshot.trading_date <= trading_date
+                    )
+                latest_dates = latest_dates.group_by(IndicatorSnapshot.ticker).subquery()
+                rows = await session.execute(
+                    select(IndicatorSnapshot).join(
+                        latest_dates,
+                        (IndicatorSnapshot.ticker == latest_dates.c.ticker)
+                        & (IndicatorSnapshot.trading_date == latest_dates.c.trading_date),
+                    )
+                )
+                result.update({row.ticker: row for row in rows.scalars().all()})
+        return result
+
+    def start(self, run_at: time_of_day) -> None:
+        """啟動每日排程（已啟動時不重複建立）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(run_at))
+
+    async def shutdown(self) -> None:
+        """停止每日排程"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self, run_at: time_of_day) -> None:
+        while True:
+            await asyncio.sleep(_seconds_until(run_at, datetime.now()))
+            try:
+                await self.run()
+            except Exception as e:
+                logger.warning(f"Indicator snapshot run failed: {e}")
+
+
+def _select_rows(panel: OHLCVPanel, rows: list[int]) -> OHLCVPanel:
+    return OHLCVPanel(
+        [panel.tickers[i] for i in rows],
+        panel.dates,
+        {name: getattr(panel, name)[rows] for name in ("open", "high", "low", "close", "volume")},
+    )
+
+
+def _seconds_until(run_at: time_of_day, now: datetime) -> float:
+    """距離下一次 run_at 的秒數"""
+    target = datetime.combine(now.date(), run_at)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def get_snapshot_time() -> time_of_day | None:
+    """INDICATOR_SNAPSHOT_TIME（HH:MM），未設定時為 None（停用）"""
+    value = os.getenv("INDICATOR_SNAPSHOT_TIME", "").strip()
+    return time_of_day.fromisoformat(value) if value else None
+
+
+indicator_snapshot_service = IndicatorSnapshotService()
+
+
+async def _run_from_cli(args: argparse.Namespace) -> None:
+    from api.config import get_engine
+    from database.init import ensure_tables_exist
+    from trading.screening import load_universe
+
+    await ensure_tables_exist(get_engine())
+
+    tickers = load_universe(args.universe) if args.universe else None
+    panel = load_ohlcv(args.data) if args.data else None
+    await indicator_snapshot_service.run(tickers=tickers, panel=panel)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compute end-of-day indicator snapshots")
+    parser.add_argument("--universe", help="ticker list file (JSON list or one per line)")
+    parser.add_argument("--data", help="recorded bars file (default: CASUAL_MARKET_DATA)")
+    try:
+        asyncio.run(_run_from_cli(parser.parse_args()))
+    except (IndicatorSnapshotError, PatternScanError) as e:
+        parser.exit(1, f"{e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+績效指標計算公式
+
+AgentsService（資料庫績效）與回測引擎共用的純計算函式，確保兩者的指標一致。
+所有報酬率、回撤皆以百分比 (%) 表示。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from decimal import Decimal
+from typing import Any, Protocol
+
+from common.enums import TransactionAction
+
+# 無風險利率（年化 2%，台灣公債平均利率）
+RISK_FREE_RATE = Decimal("2")
+
+# √252（年交易日數）
+ANNUALIZATION_FACTOR = Decimal("15.8745")
+
+# 計算 Sharpe / Sortino 所需的最少日報酬樣本數
+MIN_RISK_SAMPLES = 20
+
+# 無下行風險時的 Sortino 上限值
+SORTINO_CAP = Decimal("999")
+
+
+class TradeRecord(Protocol):
+    """FIFO 配對所需的交易欄位（Transaction ORM 或回測交易記錄）"""
+
+    ticker: str
+    action: TransactionAction
+    quantity: int
+    price: Decimal
+    commission: Decimal
+
+
+def daily_return(previous_value: Decimal, current_value: Decimal) -> Decimal | None:
+    """
+    當日報酬率
+
+    公式: (今日總價值 - 前日總價值) / 前日總價值 × 100%
+
+    Returns:
+        日報酬率 (%)；前日總價值非正數時為 None
+    """
+    if previous_value <= 0:
+        return None
+    return Decimal(str((current_value - previous_value) / previous_value * 100))
+
+
+def annualized_return(daily_returns: Sequence[Decimal]) -> Decimal:
+    """以平均日報酬率複利換算年化報酬率：(1 + 日平均報酬)^252 - 1"""
+    avg_return = sum(daily_returns) / len(daily_returns)
+    if avg_return > -1:
+        return ((1 + avg_return / 100) ** 252 - 1) * 100
+    return Decimal("0")
+
+
+def max_drawdown(values: Sequence[Decimal]) -> Decimal | None:
+    """
+    最大回撤
+
+    最大回撤 = (歷史最高淨值 - 當前淨值) / 歷史最高淨值 × 100%
+
+    Returns:
+        最大回撤 (%)；資料點少於 2 個時為 None
+    """
+    if len(values) < 2:
+        return None
+
+    peak = Decimal("0")
+    result = Decimal("0")
+    for value in values:
+        peak = max(peak, value)
+        if peak > 0:
+            result = max(result, (peak - value) / peak * 100)
+    return result
+
+
+def sharpe_ratio(daily_returns: Sequence[Decimal]) -> Decimal | None:
+    """
+    夏普比率
+
+    公式: (年化報酬率 - 無風險利率) / 年化波動率
+
+    Returns:
+        夏普比率；日報酬樣本少於 20 個時為 None
+    """
+    if len(daily_returns) < MIN_RISK_SAMPLES:
+        return None
+
+    avg_return = sum(daily_returns) / len(daily_returns)
+    variance = sum((r - avg_return) ** 2 for r in daily_returns) / len(daily_returns)
+    annual_volatility = variance.sqrt() * ANNUALIZATION_FACTOR
+
+    if annual_volatility > 0:
+        return (annualized_return(daily_returns) - RISK_FREE_RATE) / annual_volatility
+    return Decimal("0")
+
+
+def sortino_ratio(daily_returns: Sequence[Decimal]) -> Decimal | None:
+    """
+    索提諾比率
+
+    公式: (年化報酬率 - 無風險利率) / 年化下行波動率
+    下行波動率只計算負報酬，分母使用全部樣本數。
+
+    Returns:
+        索提諾比率；日報酬樣本少於 20 個時為 None
+    """
+    if len(daily_returns) < MIN_RISK_SAMPLES:
+        return None
+
+    target = Decimal("0")
+    downside = [r for r in daily_returns if r < target]
+    if downside:
+        downside_variance = sum((r - target) ** 2 for r in downside) / len(daily_returns)
+        downside_volatility = downside_variance.sqrt()
+    else:
+        downside_volatility = Decimal("0")
+    annual_downside_volatility = downside_volatility * ANNUALIZATION_FACTOR
+
+    annual_return = annualized_return(daily_returns)
+    if annual_downside_volatility > 0:
+        return (annual_return - RISK_FREE_RATE) / annual_downside_volatility
+    # 無下行風險，以上限值表示
+    return SORTINO_CAP if annual_return > RISK_FREE_RATE else Decimal("0")
+
+
+def calmar_ratio(daily_returns: Sequence[Decimal], drawdown: Decimal | None) -> Decimal | None:
+    """
+    卡瑪比率
+
+    公式: 年化報酬率 / 最大回撤
+
+    Returns:
+        卡瑪比率；沒有回撤或沒有日報酬時為 None
+    """
+    if drawdown is None or drawdown == 0 or not daily_returns:
+        return None
+    return annualized_return(daily_returns) / drawdown
+
+
+def trade_pairs_and_win_rate(transactions: Sequence[TradeRecord]) -> dict[str, Any]:
+    """
+    FIFO 買賣配對與勝率
+
+    每筆賣出依時間順序與買入配對，損益扣除按比例分攤的雙邊手續費。
+
+    Args:
+        transactions: 依時間排序的已執行交易
+
+    Returns:
+        {"total_pairs", "winning_pairs", "losing_pairs", "win_rate" (%)}
+    """
+    trades_by_ticker: dict[str, dict[str, list[TradeRecord]]] = {}
+    for tx in transactions:
+        trades = trades_by_ticker.setdefault(tx.ticker, {"buys": [], "sells": []})
+        trades["buys" if tx.action == TransactionAction.BUY else "sells"].append(tx)
+
+    total_pairs = 0
+    winning_pairs = 0
+
+    for trades in trades_by_ticker.values():
+        buys = trades["buys"]
+        # 配對中剩餘的買入數量（不修改原始交易記錄）
+        buy_remaining = [buy.quantity for buy in buys]
+        buy_idx = 0
+
+        for sell in trades["sells"]:
+            if sell.quantity == 0:
+                continue
+            remaining_qty = sell.quantity
+
+            while remaining_qty > 0 and buy_idx < len(buys):
+                buy = buys[buy_idx]
+                if buy.quantity == 0 or buy_remaining[buy_idx] <= 0:
+                    buy_idx += 1
+                    continue
+
+                matched_qty = min(remaining_qty, buy_remaining[buy_idx])
+
+                # 損益 = (賣出價 - 買入價) × 數量 - 按比例分攤的雙邊手續費
+                gross_pnl = (sell.price - buy.price) * matched_qty
+                buy_commission = buy.commission * Decimal(str(matched_qty / buy.quantity))
+                sell_commission = sell.commission * Decimal(str(matched_qty / sell.quantity))
+                if gross_pnl - buy_commission - sell_commission > 0:
+                    winning_pairs += 1
+                total_pairs += 1
+
+                remaining_qty -= matched_qty
+                buy_remaining[buy_idx] -= matched_qty
+                if buy_remaining[buy_idx] <= 0:
+                    buy_idx += 1
+
+    win_rate = Decimal(str(winning_pairs / total_pairs * 100)) if total_pairs > 0 else Decimal("0")
+    return {
+        "total_pairs": total_pairs,
+        "winning_pairs": winning_pairs,
+        "losing_pairs": total_pairs - winning_pairs,
+        "win_rate": win_rate,
+    }
+
+
+def realized_pnl(transactions: Sequence[TradeRecord]) -> Decimal:
+    """
+    FIFO 已實現損益
+
+    Args:
+        transactions: 依時間排序的已執行交易
+
+    Returns:
+        已實現損益總額（扣除按比例分攤的雙邊手續費）
+    """
+    # 成本基礎 {ticker: [(剩餘數量, 買入價, 剩餘手續費), ...]}
+    cost_basis: dict[str, list[tuple[int, Decimal, Decimal]]] = {}
+    total = Decimal("0")
+
+    for tx in transactions:
+        lots = cost_basis.setdefault(tx.ticker, [])
+        if tx.action == TransactionAction.BUY:
+            lots.append((tx.quantity, tx.price, tx.commission))
+            continue
+
+        remaining_qty = tx.quantity
+        sell_commission_per_share = (
+            tx.commission / Decimal(tx.quantity) if tx.quantity else Decimal("0")
+        )
+        while remaining_qty > 0 and lots:
+            buy_qty, buy_price, buy_commission = lots[0]
+            matched_qty = min(remaining_qty, buy_qty)
+
+            gross_pnl = (tx.price - buy_price) * Decimal(matched_qty)
+            allocation_ratio = Decimal(matched_qty) / Decimal(buy_qty) if buy_qty else Decimal("0")
+            total += (
+                gross_pnl
+                - buy_commission * allocation_ratio
+                - sell_commission_per_share * Decimal(matched_qty)
+            )
+
+            remaining_qty -= matched_qty
+            buy_qty -= matched_qty
+            if buy_qty == 0:
+                lots.pop(0)
+            else:
+                lots[0] = (buy_qty, buy_price, buy_commission)
+
+    return total
@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Any
 
 from sqlalchemy import desc, select
+from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.models import AgentSession
@@ -100,7 +101,7 @@ class AgentSessionService:
 
             self.db_session.add(session)
             await self.db_session.commit()
-            await self.db_session.refresh(session)
+            await self._refresh_with_payload(session)
 
             logger.info(f"Created session {session.id} for agent {agent_id} (mode: {mode_value})")
             return session
@@ -142,7 +143,7 @@ class AgentSessionService:
             - updated_at: Set to current time
         """
         try:
-            session = await self.get_session(session_id)
+            session = await self.get_session(session_id, with_payload=final_output is not None)
 
             session.status = status
             if final_output is not None:
@@ -178,6 +179,8 @@ class AgentSessionService:
 
             await self.db_session.commit()
             await self.db_session.refresh(session)
+            if final_output is not None:
+                await self.db_session.refresh(session, attribute_names=["payload"])
 
             logger.info(f"Updated session {session_id} status to {status.value}")
             return session
@@ -211,7 +214,7 @@ class AgentSessionService:
             SessionError: 更新失敗
         """
         try:
-            session = await self.get_session(session_id)
+            session = await self.get_session(session_id, with_payload=True)
 
             session.final_output = final_output
             if tools_called:
@@ -236,7 +239,7 @@ class AgentSessionService:
                 session.execution_time_ms = execution_time_ms
 
             await self.db_session.commit()
-            await self.db_session.refresh(session)
+            await self._refresh_with_payload(session)
 
             logger.debug(f"Updated session {session_id} output")
             return session
@@ -248,12 +251,21 @@ class AgentSessionService:
             logger.error(f"Failed to update session output {session_id}: " f"{type(e).__name__}")
             raise SessionError(f"Failed to update session output: {str(e)}")
 
-    async def get_session(self, session_id: str) -> AgentSession:
+    async def _refresh_with_payload(self, session: AgentSession) -> None:
+        """重新載入會話欄位與 payload 關聯（refresh 會使延遲載入的 payload 失效）"""
+        await self.db_session.refresh(session)
+        await self.db_session.refresh(session, attribute_names=["payload"])
+
+    async def get_session(self, session_id: str, with_payload: bool = False) -> AgentSession:
         """
         取得單一會話
 
+        大型內容（initial_input / final_output / tools_called）存放於壓縮的
+        payload 表格，預設不載入；需要讀寫這些欄位時請設定 with_payload=True。
+
         Args:
             session_id: Session ID
+            with_payload: 是否一併載入壓縮的大型內容
 
         Returns:
             AgentSession 實例
@@ -263,6 +275,8 @@ class AgentSessionService:
         """
         try:
             stmt = select(AgentSession).where(AgentSession.id == session_id)
+            if with_payload:
+                stmt = stmt.options(selectinload(AgentSession.payload))
             result = await self.db_session.execute(stmt)
             session = result.scalar_one_or_none()
 
@@ -282,6 +296,7 @@ class AgentSessionService:
         agent_id: str,
         limit: int = 50,
         status: SessionStatus | None = None,
+        with_payload: bool = False,
     ) -> list[AgentSession]:
         """
         列出 Agent 的執行會話
@@ -290,6 +305,7 @@ class AgentSessionService:
             agent_id: Agent ID
             limit: 最大返回數量
             status: 過濾狀態（可選）
+            with_payload: 是否一併載入壓縮的大型內容（預設否，維持窄列寬）
 
         Returns:
             AgentSession 列表（按時間倒序）
@@ -304,6 +320,8 @@ class AgentSessionService:
                 stmt = stmt.where(AgentSession.status == status)
 
             stmt = stmt.order_by(desc(AgentSession.start_time)).limit(limit)
+            if with_payload:
+                stmt = stmt.options(selectinload(AgentSession.payload))
 
             result = await self.db_session.execute(stmt)
             sessions = list(result.scalars().all())
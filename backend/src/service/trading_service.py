@@ -7,17 +7,41 @@ TradingService - 交易服務層
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from trading.trading_agent import TradingAgent
+from trading.config import COMMISSION_RATE
+from trading.run_stream import RunStreamBatcher
 from service.agents_service import AgentsService, AgentNotFoundError
 from common.enums import AgentMode, AgentStatus, SessionStatus, TransactionStatus
 from common.logger import logger
+from common.metrics import TRADE_EXECUTION_SECONDS
 from common.time_utils import utc_now
+from database.read_routing import mark_agent_write
 from service.session_service import AgentSessionService
 
+if TYPE_CHECKING:
+    from trading.trading_agent import TradingAgent
+
+
+def __getattr__(name: str):
+    """延遲導入 TradingAgent（trading_agent 會載入 Agents SDK 與 LiteLLM，拖慢 API 啟動）"""
+    if name == "TradingAgent":
+        from trading.trading_agent import TradingAgent
+
+        globals()["TradingAgent"] = TradingAgent
+        return TradingAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _trading_agent_class() -> type[TradingAgent]:
+    """TradingAgent 類別（第一次建立 Agent 時導入；測試可 patch 本模組的 TradingAgent）"""
+    return globals().get("TradingAgent") or __getattr__("TradingAgent")
+
 
 # ==========================================
 # Custom Exceptions
@@ -42,6 +66,31 @@ class InvalidOperationError(TradingServiceError):
     pass
 
 
+def _observe_trade(action: str, started: float, outcome: str) -> None:
+    """記錄交易執行時間（含等待交易鎖）"""
+    label = action.upper() if action and action.upper() in ("BUY", "SELL") else "invalid"
+    TRADE_EXECUTION_SECONDS.labels(action=label, outcome=outcome).observe(
+        time.perf_counter() - started
+    )
+
+
+@dataclass
+class TradeUpdate:
+    """交易成功後的通知內容（交易明細、投資組合與當日績效）"""
+
+    agent_id: str
+    trade: dict[str, Any]
+    portfolio: dict[str, Any]
+    performance: dict[str, Any]
+
+
+TradeCallback = Callable[[TradeUpdate], Awaitable[None]]
+
+
+def _optional_float(value: Any) -> float | None:
+    return float(value) if value is not None else None
+
+
 # ==========================================
 # TradingService
 # ==========================================
@@ -57,14 +106,16 @@ class TradingService:
     - 會話管理
     """
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, on_trade: TradeCallback | None = None):
         """
         初始化 TradingService
 
         Args:
             db_session: SQLAlchemy 異步 session
+            on_trade: 交易提交後的回呼（可選），例如推送 WebSocket 事件
         """
         self.db_session = db_session
+        self.on_trade = on_trade
         self.agents_service = AgentsService(db_session)
         self.session_service = AgentSessionService(db_session)
 
@@ -81,7 +132,7 @@ class TradingService:
         # agent_id -> asyncio.Task 實例
         self.execution_tasks: dict[str, asyncio.Task] = {}
 
-        logger.info("TradingService initialized")
+        logger.debug("TradingService initialized")
 
     def _get_or_create_trade_lock(self, agent_id: str) -> asyncio.Lock:
         """
@@ -102,6 +153,7 @@ class TradingService:
         agent_id: str,
         mode: AgentMode,
         session_id: str | None = None,
+        stream_sink: RunStreamBatcher | None = None,
     ) -> dict[str, Any]:
         """
         執行單一模式（執行完後立即返回，不再循環轉換）
@@ -110,6 +162,8 @@ class TradingService:
             agent_id: Agent ID
             mode: 執行模式 (TRADING/REBALANCING)
             session_id: 既存的 session ID（可選）。如果提供，使用該 session 而不創建新的
+            stream_sink: 串流事件批次器（可選）。提供時以串流模式執行並推送增量事件，
+                僅最終輸出寫入資料庫
 
         Returns:
             執行結果：
@@ -175,6 +229,7 @@ class TradingService:
 
             # 8. 初始化 Agent（載入工具、Sub-agents 等）
             logger.info(f"Initializing agent {agent_id}")
+            agent.stream_sink = stream_sink
             await agent.initialize()
 
             # 9. 執行指定模式
@@ -229,6 +284,9 @@ class TradingService:
 
         finally:
             # 確保資源清理（即使發生異常）
+            if agent is not None:
+                agent.stream_sink = None
+
             if agent_id in self.active_agents:
                 try:
                     if agent is not None:
@@ -424,6 +482,8 @@ class TradingService:
             此方法假設調用者（如 trading_tools.execute_trade_atomic）已經完成
             參數驗證和交易可行性檢查。此處的驗證僅作為安全網。
         """
+        started = time.perf_counter()
+
         # ⭐ 取得該 Agent 的交易鎖 - 防止同一 Agent 的併發交易
         trade_lock = self._get_or_create_trade_lock(agent_id)
 
@@ -453,9 +513,13 @@ class TradingService:
                     except (TypeError, ValueError) as e:
                         raise ValueError(f"交易價格無效: {price}") from e
 
-                logger.info(
-                    f"執行資料庫原子交易: agent_id={agent_id}, ticker={ticker}, "
-                    f"action={action_upper}, quantity={quantity}, price={price}"
+                logger.debug(
+                    "執行資料庫原子交易: agent_id={}, ticker={}, action={}, quantity={}, price={}",
+                    agent_id,
+                    ticker,
+                    action_upper,
+                    quantity,
+                    price,
                 )
 
                 # ==========================================
@@ -478,64 +542,63 @@ class TradingService:
                 # ==========================================
                 # 開始資料庫事務
                 # ==========================================
-                # 使用 savepoint() 支援嵌套事務
-                # 如果已有活躍事務，savepoint() 會建立 nested transaction (savepoint)
-                # 如果沒有，它會建立新的事務
-                async with self.db_session.begin_nested():
-                    # Step 1: 記錄交易到資料庫
-                    total_amount = float(quantity * price)
-                    commission = total_amount * 0.001425  # 手續費 0.1425%
-
-                    logger.debug(
-                        f"準備創建交易記錄: quantity={quantity}, "
-                        f"price={price}, total_amount={total_amount}"
-                    )
-
-                    transaction = await self._create_transaction_internal(
-                        agent_id=agent_id,
-                        ticker=ticker,
-                        action=action_upper,
-                        quantity=quantity,
-                        price=price,
-                        total_amount=total_amount,
-                        commission=commission,
-                        decision_reason=decision_reason or "原子交易",
-                        company_name=company_name,
-                        status="EXECUTED",
-                        session_id=current_session_id,
-                    )
-                    logger.info(f"交易已記錄: {transaction.id}")
-
-                    # Step 2: 更新持股明細
-                    await self._update_agent_holdings_internal(
-                        agent_id=agent_id,
-                        ticker=ticker,
-                        action=action_upper,
-                        quantity=quantity,
-                        price=price,
-                        company_name=company_name,
-                    )
-                    logger.info("持股已更新")
-
-                    # Step 3: 更新資金餘額
-                    if action_upper == "BUY":
-                        amount_change = -(total_amount + commission)
-                    else:  # SELL
-                        amount_change = total_amount - commission
-
-                    await self._update_agent_funds_internal(
-                        agent_id=agent_id,
-                        amount_change=amount_change,
-                        transaction_type=f"{action_upper} {ticker}",
-                    )
-                    logger.info(f"資金已更新: {amount_change:+.2f} 元")
-
-                    # Step 4: 更新績效指標
-                    await self._calculate_and_update_performance_internal(agent_id)
-                    logger.info("績效已更新")
+                from api.config import get_sqlite_write_queue
+
+                write_queue = get_sqlite_write_queue()
+                if write_queue is not None:
+                    # SQLite profile：交由單一寫入者批次提交，避免併發寫入鎖衝突
+                    async def _write_job(writer_session: AsyncSession):
+                        return await TradingService(writer_session)._apply_trade_internal(
+                            agent_id=agent_id,
+                            ticker=ticker,
+                            action=action_upper,
+                            quantity=quantity,
+                            price=price,
+                            decision_reason=decision_reason,
+                            company_name=company_name,
+                            session_id=current_session_id,
+                        )
 
-                    # 事務自動提交（所有步驟都成功）
-                    logger.info("資料庫原子交易成功完成")
+                    transaction, total_amount, commission = await write_queue.submit(_write_job)
+                    await self._refresh_agent_state(agent_id)
+                else:
+                    # 使用 savepoint() 支援嵌套事務
+                    # 如果已有活躍事務，savepoint() 會建立 nested transaction (savepoint)
+                    # 如果沒有，它會建立新的事務
+                    async with self.db_session.begin_nested():
+                        transaction, total_amount, commission = await self._apply_trade_internal(
+                            agent_id=agent_id,
+                            ticker=ticker,
+                            action=action_upper,
+                            quantity=quantity,
+                            price=price,
+                            decision_reason=decision_reason,
+                            company_name=company_name,
+                            session_id=current_session_id,
+                        )
+                        # 事務自動提交（所有步驟都成功）
+
+                logger.debug("資料庫原子交易成功完成: {}", transaction.id)
+
+                # 交易後一段時間內該 Agent 的讀取改走主資料庫（read-your-writes）
+                mark_agent_write(agent_id)
+                _observe_trade(action, started, "ok")
+
+                # 仍持有交易鎖：同一 Agent 的通知依交易順序送出
+                await self._notify_trade(
+                    agent_id,
+                    {
+                        "transaction_id": transaction.id,
+                        "session_id": current_session_id,
+                        "ticker": ticker,
+                        "company_name": company_name,
+                        "action": action_upper,
+                        "quantity": quantity,
+                        "price": float(price),
+                        "total_amount": float(total_amount),
+                        "commission": float(commission),
+                    },
+                )
 
                 return {
                     "success": True,
@@ -553,12 +616,165 @@ class TradingService:
             except Exception as e:
                 # ⭐ 任何失敗 → 事務自動回滾
                 logger.error(f"原子交易失敗，已完全回滾: {e}", exc_info=True)
+                _observe_trade(action, started, "error")
                 return {
                     "success": False,
                     "error": str(e),
                     "message": f"❌ 交易執行失敗，已完全回滾\n❌ 錯誤: {str(e)}",
                 }
 
+    async def _apply_trade_internal(
+        self,
+        agent_id: str,
+        ticker: str,
+        action: str,
+        quantity: int,
+        price: float,
+        decision_reason: str | None,
+        company_name: str | None,
+        session_id: str,
+    ) -> tuple[Any, float, float]:
+        """
+        內部交易套用方法（事務內使用）
+
+        依序記錄交易、更新持股、資金與績效，不負責事務管理。
+
+        Returns:
+            (交易記錄, 成交金額, 手續費)
+        """
+        # Step 1: 記錄交易到資料庫
+        total_amount = float(quantity * price)
+        commission = total_amount * COMMISSION_RATE  # 手續費 0.1425%
+
+        logger.debug(
+            "準備創建交易記錄: quantity={}, price={}, total_amount={}",
+            quantity,
+            price,
+            total_amount,
+        )
+
+        transaction = await self._create_transaction_internal(
+            agent_id=agent_id,
+            ticker=ticker,
+            action=action,
+            quantity=quantity,
+            price=price,
+            total_amount=total_amount,
+            commission=commission,
+            decision_reason=decision_reason or "原子交易",
+            company_name=company_name,
+            status="EXECUTED",
+            session_id=session_id,
+        )
+        logger.debug("交易已記錄: {}", transaction.id)
+
+        # Step 2: 更新持股明細
+        await self._update_agent_holdings_internal(
+            agent_id=agent_id,
+            ticker=ticker,
+            action=action,
+            quantity=quantity,
+            price=price,
+            company_name=company_name,
+        )
+        logger.debug("持股已更新")
+
+        # Step 3: 更新資金餘額
+        if action == "BUY":
+            amount_change = -(total_amount + commission)
+        else:  # SELL
+            amount_change = total_amount - commission
+
+        await self._update_agent_funds_internal(
+            agent_id=agent_id,
+            amount_change=amount_change,
+            transaction_type=f"{action} {ticker}",
+        )
+        logger.debug("資金已更新: {:+.2f} 元", amount_change)
+
+        # Step 4: 更新績效指標
+        await self._calculate_and_update_performance_internal(agent_id)
+        logger.debug("績效已更新")
+
+        return transaction, total_amount, commission
+
+    async def _notify_trade(self, agent_id: str, trade: dict[str, Any]) -> None:
+        """通知交易結果（回呼失敗不影響已提交的交易）"""
+        if self.on_trade is None:
+            return
+        try:
+            await self.on_trade(await self._build_trade_update(agent_id, trade))
+        except Exception as e:
+            logger.warning(f"Trade callback failed for agent {agent_id}: {e}")
+
+    async def _build_trade_update(self, agent_id: str, trade: dict[str, Any]) -> TradeUpdate:
+        """讀取交易後的資金、持股與當日績效"""
+        from datetime import date
+
+        from sqlalchemy import select
+
+        from database.models import AgentPerformance
+
+        agent = await self.agents_service.get_agent_config(agent_id)
+        holdings = await self.agents_service.get_agent_holdings(agent_id)
+        performance = await self.db_session.scalar(
+            select(AgentPerformance).where(
+                AgentPerformance.agent_id == agent_id, AgentPerformance.date == date.today()
+            )
+        )
+
+        portfolio = {
+            "current_funds": float(agent.current_funds) if agent.current_funds else None,
+            "holdings": [
+                {
+                    "ticker": holding.ticker,
+                    "company_name": holding.company_name,
+                    "quantity": holding.quantity,
+                    "average_cost": float(holding.average_cost),
+                    "total_cost": float(holding.total_cost),
+                }
+                for holding in holdings
+            ],
+        }
+        performance_data = {}
+        if performance is not None:
+            performance_data = {
+                "date": performance.date.isoformat(),
+                "total_value": float(performance.total_value),
+                "cash_balance": float(performance.cash_balance),
+                "total_return": _optional_float(performance.total_return),
+                "win_rate": _optional_float(performance.win_rate),
+                "total_trades": performance.total_trades,
+            }
+        return TradeUpdate(
+            agent_id=agent_id, trade=trade, portfolio=portfolio, performance=performance_data
+        )
+
+    async def _refresh_agent_state(self, agent_id: str) -> None:
+        """
+        重新載入目前 session 中該 Agent 的已載入物件
+
+        交易由 SQLite 寫入者以另一條連線提交後，避免本 session 讀到過期的資金/持股。
+        """
+        from sqlalchemy.exc import InvalidRequestError
+
+        from database.models import Agent, AgentHolding, AgentPerformance
+
+        for obj in list(self.db_session.identity_map.values()):
+            if isinstance(obj, Agent):
+                if obj.id != agent_id:
+                    continue
+            elif isinstance(obj, (AgentHolding, AgentPerformance)):
+                if obj.agent_id != agent_id:
+                    continue
+            else:
+                continue
+            try:
+                await self.db_session.refresh(obj)
+            except InvalidRequestError:
+                # 物件已不存在於資料庫，直接移出 session
+                self.db_session.expunge(obj)
+
     async def _create_transaction_internal(
         self,
         agent_id: str,
@@ -597,9 +813,12 @@ class TradingService:
         # 🔍 DEBUG: 記錄創建 Transaction 物件前的 quantity 值
         tx_id = str(uuid.uuid4())
         logger.debug(
-            f"創建 Transaction 物件: id={tx_id[:8]}..., "
-            f"quantity={quantity} (type={type(quantity).__name__}), "
-            f"price={price}, total_amount={total_amount}"
+            "創建 Transaction 物件: id={}..., quantity={} (type={}), price={}, total_amount={}",
+            tx_id[:8],
+            quantity,
+            type(quantity).__name__,
+            price,
+            total_amount,
         )
 
         # 🔍 DEBUG: 驗證 quantity 的值
@@ -633,8 +852,10 @@ class TradingService:
 
         # 🔍 DEBUG: 驗證 Transaction 物件創建後的 quantity 值
         logger.debug(
-            f"Transaction 物件已創建: id={transaction.id[:8]}..., "
-            f"transaction.quantity={transaction.quantity} (type={type(transaction.quantity).__name__})"
+            "Transaction 物件已創建: id={}..., transaction.quantity={} (type={})",
+            transaction.id[:8],
+            transaction.quantity,
+            type(transaction.quantity).__name__,
         )
 
         if transaction.quantity != quantity:
@@ -646,7 +867,7 @@ class TradingService:
         self.db_session.add(transaction)
 
         # 🔍 DEBUG: 驗證添加到 session 後的 quantity 值
-        logger.debug(f"Transaction 已添加到 session: transaction.quantity={transaction.quantity}")
+        logger.debug("Transaction 已添加到 session: transaction.quantity={}", transaction.quantity)
 
         return transaction
 
@@ -755,8 +976,12 @@ class TradingService:
         agent.updated_at = utc_now()
         agent.last_active_at = utc_now()
 
-        logger.info(
-            f"Updated funds for agent {agent_id}: {current_funds} -> {new_funds} ({transaction_type})"
+        logger.debug(
+            "Updated funds for agent {}: {} -> {} ({})",
+            agent_id,
+            current_funds,
+            new_funds,
+            transaction_type,
         )
 
     async def _calculate_and_update_performance_internal(self, agent_id: str) -> None:
@@ -854,7 +1079,7 @@ class TradingService:
             )
             self.db_session.add(performance)
 
-        logger.info(f"Updated performance for agent {agent_id}: total_value={total_value}")
+        logger.debug("Updated performance for agent {}: total_value={}", agent_id, total_value)
 
     async def _get_or_create_agent(
         self,
@@ -883,15 +1108,16 @@ class TradingService:
 
         # 如果已存在且是有效的 TradingAgent 實例，則返回
         # 注意：跳過 "STARTING" 佔位符（這是 API 層的臨時標記）
+        trading_agent_class = _trading_agent_class()
         if agent_id in self.active_agents:
             existing_agent = self.active_agents[agent_id]
             # 只有當是 TradingAgent 實例時才返回
-            if isinstance(existing_agent, TradingAgent):
+            if isinstance(existing_agent, trading_agent_class):
                 return existing_agent
             # 如果是字串佔位符 "STARTING"，繼續創建真實的 Agent 實例
 
         logger.debug(f"Creating TradingAgent for {agent_id}")
-        agent = TradingAgent(agent_id, agent_config, self.agents_service, self)
+        agent = trading_agent_class(agent_id, agent_config, self.agents_service, self)
         self.active_agents[agent_id] = agent
         return agent
 
@@ -6,9 +6,18 @@ CasualTrader Agent System
 
 from __future__ import annotations
 
-# 正確的重構架構 - 使用 trading_agent.py
-from .trading_agent import TradingAgent
+# TradingAgent 延遲導入：trading_agent 會載入 Agents SDK 與 LiteLLM，
+# 而 trading.indicators 等純計算模組在 API 啟動時就會被導入
 
 __all__ = [
     "TradingAgent",
 ]
+
+
+def __getattr__(name: str):
+    """延遲導入重量級模組"""
+    if name == "TradingAgent":
+        from .trading_agent import TradingAgent
+
+        return TradingAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
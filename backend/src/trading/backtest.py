@@ -0,0 +1,504 @@
+"""
+離線回測引擎
+
+以歷史收盤價逐日重播，讓多個 Agent 的決策經過與實盤相同的交易流程：
+- 參數驗證：`_validate_trade_params`（股數、整張、價格）
+- 可行性檢查：`check_trade_feasibility`（資金含手續費、持股數量）
+- 成交：手續費 0.1425%、持股平均成本與資金更新規則同 `TradingService._apply_trade_internal`
+- 績效：`service.performance_metrics`（與 AgentsService 相同公式）
+
+交易記錄在記憶體帳本中，不寫入資料庫；決策函式可為規則策略或重播已記錄的 LLM 決策。
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from common.enums import TransactionAction
+from common.logger import logger
+from service import performance_metrics
+from trading.tools.trading_tools import (
+    COMMISSION_RATE,
+    _validate_trade_params,
+    check_trade_feasibility,
+)
+
+
+class BacktestError(Exception):
+    """回測錯誤"""
+
+    pass
+
+
+# ==========================================
+# Market Data
+# ==========================================
+
+
+@dataclass(frozen=True)
+class Decision:
+    """單筆交易決策（price 為 None 時以當日收盤價成交）"""
+
+    ticker: str
+    action: str
+    quantity: int
+    price: float | None = None
+    reason: str | None = None
+
+
+class MarketDay:
+    """回測中的單一交易日：當日收盤價與截至當日的歷史收盤價"""
+
+    def __init__(self, index: int, day: date, history: PriceHistory):
+        self.index = index
+        self.date = day
+        self._history = history
+
+    def close(self, ticker: str) -> float | None:
+        """當日收盤價（當日無成交時為 None）"""
+        series = self._history.closes.get(ticker)
+        return series[self.index] if series is not None else None
+
+    def window(self, ticker: str, size: int) -> list[float]:
+        """截至當日（含）最近 size 個有成交的收盤價"""
+        series = self._history.closes.get(ticker)
+        values: list[float] = []
+        if series is None:
+            return values
+        i = self.index
+        while i >= 0 and len(values) < size:
+            if series[i] is not None:
+                values.append(series[i])
+            i -= 1
+        values.reverse()
+        return values
+
+    @property
+    def tickers(self) -> list[str]:
+        """當日有收盤價的股票"""
+        return [t for t, series in self._history.closes.items() if series[self.index] is not None]
+
+
+class PriceHistory:
+    """
+    依交易日對齊的收盤價
+
+    closes[ticker][i] 為第 i 個交易日的收盤價，當日無成交為 None。
+    """
+
+    def __init__(self, prices: Mapping[str, Mapping[date, float]]):
+        """
+        Args:
+            prices: {股票代號: {日期: 收盤價}}
+        """
+        if not prices:
+            raise BacktestError("Price history is empty")
+
+        self.dates: list[date] = sorted({d for series in prices.values() for d in series})
+        self.closes: dict[str, list[float | None]] = {
+            ticker: [float(series[d]) if d in series else None for d in self.dates]
+            for ticker, series in prices.items()
+        }
+
+    @classmethod
+    def from_matrix(
+        cls, tickers: Sequence[str], dates: Sequence[date], matrix: Sequence[Sequence[float]]
+    ) -> PriceHistory:
+        """
+        由收盤價矩陣建立（參數掃描以記憶體映射陣列傳遞價格）
+
+        Args:
+            tickers: 股票代號，對應矩陣的列
+            dates: 交易日，對應矩陣的欄
+            matrix: matrix[i][j] 為 tickers[i] 於 dates[j] 的收盤價，NaN 表示當日無成交
+        """
+        if not tickers:
+            raise BacktestError("Price history is empty")
+
+        history = cls.__new__(cls)
+        history.dates = list(dates)
+        history.closes = {
+            ticker: [None if math.isnan(value) else value for value in map(float, row)]
+            for ticker, row in zip(tickers, matrix, strict=True)
+        }
+        return history
+
+
+# 決策函式：(當日行情, 帳本) -> 當日決策
+DecisionFunction = Callable[[MarketDay, "BacktestLedger"], Iterable[Decision]]
+
+
+# ==========================================
+# Ledger
+# ==========================================
+
+
+@dataclass
+class BacktestPosition:
+    """持股（同 AgentHolding 欄位）"""
+
+    ticker: str
+    quantity: int
+    average_cost: float
+    total_cost: float
+
+
+@dataclass
+class BacktestTrade:
+    """成交記錄（符合 performance_metrics.TradeRecord）"""
+
+    date: date
+    ticker: str
+    action: TransactionAction
+    quantity: int
+    price: Decimal
+    total_amount: Decimal
+    commission: Decimal
+    reason: str | None = None
+
+
+class BacktestLedger:
+    """記憶體帳本：資金、持股與成交記錄"""
+
+    def __init__(self, initial_funds: float, commission_rate: float = COMMISSION_RATE):
+        self.initial_funds = float(initial_funds)
+        self.commission_rate = commission_rate
+        self.cash = float(initial_funds)
+        self.holdings: dict[str, BacktestPosition] = {}
+        self.trades: list[BacktestTrade] = []
+        self.rejected: list[dict[str, Any]] = []
+
+    def held_quantity(self, ticker: str) -> int:
+        """目前持股數"""
+        position = self.holdings.get(ticker)
+        return position.quantity if position else 0
+
+    def execute(self, day: MarketDay, decision: Decision) -> str | None:
+        """
+        驗證並成交一筆決策
+
+        Returns:
+            錯誤訊息；成交時為 None（被拒絕的決策記錄在 rejected）
+        """
+        price = decision.price if decision.price is not None else day.close(decision.ticker)
+        if price is None:
+            return self._reject(day, decision, f"{decision.ticker} 於 {day.date} 沒有收盤價")
+
+        try:
+            action, quantity, price = _validate_trade_params(
+                decision.action, decision.quantity, price
+            )
+        except ValueError as e:
+            return self._reject(day, decision, str(e))
+
+        position = self.holdings.get(decision.ticker)
+        error = check_trade_feasibility(
+            decision.ticker,
+            action,
+            quantity,
+            price,
+            self.cash,
+            position.quantity if position else None,
+            commission_rate=self.commission_rate,
+        )
+        if error:
+            return self._reject(day, decision, error)
+
+        self._apply(day.date, decision.ticker, action, quantity, price, decision.reason)
+        return None
+
+    def market_value(self, prices: Mapping[str, float]) -> float:
+        """持股市值（無價格時以平均成本估值）"""
+        return sum(
+            p.quantity * prices.get(ticker, p.average_cost) for ticker, p in self.holdings.items()
+        )
+
+    def _apply(
+        self,
+        day: date,
+        ticker: str,
+        action: str,
+        quantity: int,
+        price: float,
+        reason: str | None,
+    ) -> None:
+        """成交：同 TradingService._apply_trade_internal 的持股與資金規則"""
+        total_amount = float(quantity * price)
+        commission = total_amount * self.commission_rate
+
+        position = self.holdings.get(ticker)
+        if action == "BUY":
+            if position:
+                position.quantity += quantity
+                position.total_cost += quantity * price
+                position.average_cost = position.total_cost / position.quantity
+            else:
+                self.holdings[ticker] = BacktestPosition(
+                    ticker=ticker,
+                    quantity=quantity,
+                    average_cost=price,
+                    total_cost=quantity * price,
+                )
+            self.cash -= total_amount + commission
+        else:
+            position.quantity -= quantity
+            if position.quantity == 0:
+                del self.holdings[ticker]
+            else:
+                position.total_cost = position.average_cost * position.quantity
+            self.cash += total_amount - commission
+
+        self.trades.append(
+            BacktestTrade(
+                date=day,
+                ticker=ticker,
+                action=TransactionAction.BUY if action == "BUY" else TransactionAction.SELL,
+                quantity=quantity,
+                price=Decimal(str(price)),
+                total_amount=Decimal(str(total_amount)),
+                commission=Decimal(str(commission)),
+                reason=reason,
+            )
+        )
+
+    def _reject(self, day: MarketDay, decision: Decision, error: str) -> str:
+        self.rejected.append({"date": day.date, "decision": decision, "error": error})
+        return error
+
+
+# ==========================================
+# Results
+# ==========================================
+
+
+@dataclass
+class BacktestResult:
+    """單一 Agent 的回測結果"""
+
+    agent_id: str
+    ledger: BacktestLedger
+    # 每日收盤後的 (日期, 總資產價值)
+    equity_curve: list[tuple[date, Decimal]] = field(default_factory=list)
+    final_prices: dict[str, float] = field(default_factory=dict)
+
+    def daily_returns(self) -> list[Decimal]:
+        """逐日報酬率 (%)"""
+        returns = []
+        for (_, previous), (_, current) in zip(self.equity_curve, self.equity_curve[1:]):
+            value = performance_metrics.daily_return(previous, current)
+            if value is not None:
+                returns.append(value)
+        return returns
+
+    def summary(self) -> dict[str, Any]:
+        """
+        績效摘要（欄位同 AgentPerformance）
+
+        持股以回測最後一日收盤價估值（取代即時股價），其餘公式同 AgentsService。
+        """
+        ledger = self.ledger
+        initial = Decimal(str(ledger.initial_funds))
+        cash = Decimal(str(ledger.cash))
+        stocks_value = Decimal(str(ledger.market_value(self.final_prices)))
+        total_value = cash + stocks_value
+
+        unrealized = sum(
+            (
+                (
+                    Decimal(str(self.final_prices.get(t, p.average_cost)))
+                    - Decimal(str(p.average_cost))
+                )
+                * p.quantity
+                for t, p in ledger.holdings.items()
+            ),
+            Decimal("0"),
+        )
+        pairs = performance_metrics.trade_pairs_and_win_rate(ledger.trades)
+        daily_returns = self.daily_returns()
+        values = [value for _, value in self.equity_curve]
+        drawdown = performance_metrics.max_drawdown(values)
+
+        return {
+            "agent_id": self.agent_id,
+            "start_date": self.equity_curve[0][0] if self.equity_curve else None,
+            "end_date": self.equity_curve[-1][0] if self.equity_curve else None,
+            "total_value": total_value,
+            "cash_balance": cash,
+            "total_return": (total_value - initial) / initial if initial > 0 else Decimal("0"),
+            "realized_pnl": performance_metrics.realized_pnl(ledger.trades),
+            "unrealized_pnl": unrealized,
+            "win_rate": pairs["win_rate"],
+            "total_trades": len(ledger.trades),
+            "sell_trades_count": sum(
+                1 for t in ledger.trades if t.action == TransactionAction.SELL
+            ),
+            "winning_trades_correct": pairs["winning_pairs"],
+            "max_drawdown": drawdown,
+            "sharpe_ratio": performance_metrics.sharpe_ratio(daily_returns),
+            "sortino_ratio": performance_metrics.sortino_ratio(daily_returns),
+            "calmar_ratio": performance_metrics.calmar_ratio(daily_returns, drawdown),
+            "rejected_decisions": len(ledger.rejected),
+        }
+
+
+# ==========================================
+# Engine
+# ==========================================
+
+
+class BacktestEngine:
+    """
+    逐日重播歷史價格，同時模擬多個 Agent
+
+    每個交易日依序：呼叫各 Agent 的決策函式 → 驗證並成交 → 以收盤價記錄總資產。
+    """
+
+    def __init__(self, prices: Mapping[str, Mapping[date, float]] | PriceHistory):
+        """
+        Args:
+            prices: {股票代號: {日期: 收盤價}} 或已建立的 PriceHistory
+        """
+        self.history = prices if isinstance(prices, PriceHistory) else PriceHistory(prices)
+
+    def run(
+        self,
+        strategies: Mapping[str, DecisionFunction],
+        initial_funds: float = 1_000_000,
+        commission_rate: float = COMMISSION_RATE,
+    ) -> dict[str, BacktestResult]:
+        """
+        執行回測
+
+        Args:
+            strategies: {agent_id: 決策函式}
+            initial_funds: 每個 Agent 的初始資金
+            commission_rate: 手續費率（預設同實盤 0.1425%）
+
+        Returns:
+            {agent_id: BacktestResult}
+        """
+        if initial_funds <= 0:
+            raise BacktestError(f"initial_funds must be positive: {initial_funds}")
+
+        history = self.history
+        results = {
+            agent_id: BacktestResult(
+                agent_id=agent_id, ledger=BacktestLedger(initial_funds, commission_rate)
+            )
+            for agent_id in strategies
+        }
+        last_prices: dict[str, float] = {}
+
+        for index, day in enumerate(history.dates):
+            market_day = MarketDay(index, day, history)
+            for ticker, series in history.closes.items():
+                if series[index] is not None:
+                    last_prices[ticker] = series[index]
+
+            for agent_id, decide in strategies.items():
+                ledger = results[agent_id].ledger
+                for decision in decide(market_day, ledger) or ():
+                    ledger.execute(market_day, decision)
+
+                total_value = ledger.cash + ledger.market_value(last_prices)
+                results[agent_id].equity_curve.append((day, Decimal(str(total_value))))
+
+        for result in results.values():
+            result.final_prices = dict(last_prices)
+
+        logger.info(
+            f"Backtest finished: {len(strategies)} agents x {len(history.dates)} days, "
+            f"{sum(len(r.ledger.trades) for r in results.values())} trades"
+        )
+        return results
+
+
+# ==========================================
+# Decision Functions
+# ==========================================
+
+
+def moving_average_crossover(
+    tickers: Sequence[str], short_window: int = 5, long_window: int = 20, lots: int = 1
+) -> DecisionFunction:
+    """
+    均線交叉規則策略
+
+    短均線由下往上穿越長均線時買進 lots 張，由上往下穿越時賣出全部持股。
+    """
+    if short_window >= long_window:
+        raise BacktestError("short_window must be smaller than long_window")
+
+    def decide(day: MarketDay, ledger: BacktestLedger) -> list[Decision]:
+        decisions = []
+        for ticker in tickers:
+            closes = day.window(ticker, long_window + 1)
+            if len(closes) < long_window + 1 or day.close(ticker) is None:
+                continue
+            short_now = sum(closes[-short_window:]) / short_window
+            long_now = sum(closes[-long_window:]) / long_window
+            short_prev = sum(closes[-short_window - 1 : -1]) / short_window
+            long_prev = sum(closes[-long_window - 1 : -1]) / long_window
+
+            held = ledger.held_quantity(ticker)
+            if short_prev <= long_prev and short_now > long_now and held == 0:
+                decisions.append(Decision(ticker, "BUY", lots * 1000, reason="均線黃金交叉"))
+            elif short_prev >= long_prev and short_now < long_now and held > 0:
+                decisions.append(Decision(ticker, "SELL", held, reason="均線死亡交叉"))
+        return decisions
+
+    return decide
+
+
+class RecordedDecisions:
+    """
+    重播已記錄的決策（例如實盤 LLM 的交易記錄）
+
+    以原成交價重播；未指定價格的記錄以當日收盤價成交。
+    """
+
+    def __init__(self, records: Iterable[Mapping[str, Any]]):
+        """
+        Args:
+            records: [{"date", "ticker", "action", "quantity", "price"?, "reason"?}, ...]
+        """
+        self._by_date: dict[date, list[Decision]] = {}
+        for record in records:
+            day = record["date"]
+            if isinstance(day, datetime):
+                day = day.date()
+            elif isinstance(day, str):
+                day = date.fromisoformat(day[:10])
+            price = record.get("price")
+            self._by_date.setdefault(day, []).append(
+                Decision(
+                    ticker=str(record["ticker"]),
+                    action=str(record["action"]).upper(),
+                    quantity=int(record["quantity"]),
+                    price=float(price) if price is not None else None,
+                    reason=record.get("reason"),
+                )
+            )
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Any]) -> RecordedDecisions:
+        """由 Transaction 記錄建立（使用成交時間與決策理由）"""
+        return cls(
+            {
+                "date": tx.execution_time or tx.created_at,
+                "ticker": tx.ticker,
+                "action": getattr(tx.action, "value", tx.action),
+                "quantity": tx.quantity,
+                "price": tx.price,
+                "reason": tx.decision_reason,
+            }
+            for tx in transactions
+        )
+
+    def __call__(self, day: MarketDay, ledger: BacktestLedger) -> list[Decision]:
+        return self._by_date.get(day.date, [])
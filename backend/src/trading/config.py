@@ -10,6 +10,9 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field
 
+# 券商手續費率 0.1425%（買賣皆收，交易服務與回測共用）
+COMMISSION_RATE = 0.001425
+
 
 # ==========================================
 # Agent 配置資料結構 (Python 3.12+ dataclass)
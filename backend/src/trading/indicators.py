@@ -0,0 +1,386 @@
+"""
+多股票技術指標引擎
+
+以 OHLCVPanel（股票, 交易日）陣列一次計算全部股票的完整指標組合：
+- 均線 MA5 / MA10 / MA20 / MA60
+- RSI(14)：Wilder 平滑
+- MACD(12, 26, 9)：EMA 以前 N 日簡單平均為起點
+- 布林通道(20, 2σ)
+- KD(9, 3, 3)：台股慣用算法，K / D 初始值 50
+- 趨勢分類與交易訊號：與 analyze_trend / generate_trading_signals 工具相同的規則
+
+遞迴平滑（EMA、Wilder、KD）沿交易日迴圈、跨股票以陣列運算；
+各股票的有效資料先靠右對齊，最後一欄即為各自的最新 K 線。
+資料不足以計算的指標為 None。
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from common.logger import logger
+from trading.pattern_scan import DEFAULT_ORDER, OHLCVPanel, PatternMatch, scan
+
+INDICATORS = ("ma", "rsi", "macd", "bollinger", "kd")
+MA_PERIODS = (5, 10, 20, 60)
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_PERIOD, BOLLINGER_WIDTH = 20, 2.0
+KD_PERIOD = 9
+TREND_MIN_BARS = 20
+
+# 型態名稱對照（掃描引擎 → 工具輸出）
+PATTERN_NAMES = {
+    "double_top": "雙重頂",
+    "double_bottom": "雙重底",
+    "breakout": "帶量突破",
+    "breakdown": "帶量跌破",
+}
+
+
+# ==========================================
+# Indicators
+# ==========================================
+
+
+def compute_indicators(
+    panel: OHLCVPanel, indicators: Sequence[str] = INDICATORS
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """
+    計算每檔股票最新一日的技術指標
+
+    Returns:
+        {股票代號: {"ma": {...}, "rsi": {...}, "macd": {...}, "bollinger": {...}, "kd": {...}}}
+        格式與 calculate_technical_indicators 工具的 indicators 欄位相同
+    """
+    high, low, close = _right_aligned(panel, ("high", "low", "close"))
+    columns: dict[str, list[dict[str, Any]]] = {}
+
+    if "ma" in indicators:
+        averages = {f"ma{n}": _latest_mean(close, n) for n in MA_PERIODS}
+        columns["ma"] = [
+            {name: _value(values[i]) for name, values in averages.items()}
+            for i in range(len(panel.tickers))
+        ]
+
+    if "rsi" in indicators:
+        columns["rsi"] = [{"value": value, "status": _rsi_status(value)} for value in _rsi(close)]
+
+    if "macd" in indicators:
+        fast = _smoothed(close, MACD_FAST, 2 / (MACD_FAST + 1))
+        slow = _smoothed(close, MACD_SLOW, 2 / (MACD_SLOW + 1))
+        line = fast - slow
+        signal = _smoothed(line, MACD_SIGNAL, 2 / (MACD_SIGNAL + 1))
+        histogram = line - signal
+        columns["macd"] = [
+            {
+                "macd": _value(line[i, -1]),
+                "signal": _value(signal[i, -1]),
+                "histogram": _value(histogram[i, -1]),
+                "status": _sign_status(histogram[i, -1], "多頭", "空頭"),
+            }
+            for i in range(len(panel.tickers))
+        ]
+
+    if "bollinger" in indicators:
+        middle = _latest_mean(close, BOLLINGER_PERIOD)
+        width = BOLLINGER_WIDTH * _latest_std(close, BOLLINGER_PERIOD)
+        columns["bollinger"] = [
+            {
+                "upper": _value(middle[i] + width[i]),
+                "middle": _value(middle[i]),
+                "lower": _value(middle[i] - width[i]),
+            }
+            for i in range(len(panel.tickers))
+        ]
+
+    if "kd" in indicators:
+        k, d = _kd(high, low, close)
+        columns["kd"] = [
+            {"k": _value(k[i]), "d": _value(d[i]), "status": _kd_status(k[i], d[i])}
+            for i in range(len(panel.tickers))
+        ]
+
+    return {
+        ticker: {name: rows[i] for name, rows in columns.items()}
+        for i, ticker in enumerate(panel.tickers)
+    }
+
+
+def _right_aligned(panel: OHLCVPanel, fields: Sequence[str]) -> list[np.ndarray]:
+    """將每列的有效 K 線（依收盤價判斷）移到右側，缺值集中在左側"""
+    missing = np.isnan(panel.close)
+    order = np.argsort(~missing, axis=1, kind="stable")
+    return [np.take_along_axis(getattr(panel, name), order, axis=1) for name in fields]
+
+
+def _latest_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """最近 period 日的平均（資料不足時為 NaN）"""
+    if values.shape[1] < period:
+        return np.full(values.shape[0], np.nan)
+    return values[:, -period:].mean(axis=1)
+
+
+def _latest_std(values: np.ndarray, period: int) -> np.ndarray:
+    """最近 period 日的母體標準差（資料不足時為 NaN）"""
+    if values.shape[1] < period:
+        return np.full(values.shape[0], np.nan)
+    return values[:, -period:].std(axis=1)
+
+
+def _smoothed(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    遞迴平均：前 period 個有效值的簡單平均為起點，之後 avg += alpha * (x - avg)
+
+    alpha = 2 / (period + 1) 為 EMA，alpha = 1 / period 為 Wilder 平滑。
+    左側缺值不計入；起點之前為 NaN。
+    """
+    rows, days = values.shape
+    result = np.full((rows, days), np.nan)
+    total = np.zeros(rows)
+    count = np.zeros(rows, dtype=np.int64)
+    average = np.full(rows, np.nan)
+    for j in range(days):
+        x = values[:, j]
+        valid = ~np.isnan(x)
+        seeding = valid & (count < period)
+        total[seeding] += x[seeding]
+        count[valid] += 1
+        seeded = seeding & (count == period)
+        average[seeded] = total[seeded] / period
+        update = valid & ~seeding
+        average[update] += alpha * (x[update] - average[update])
+        result[:, j] = np.where(count >= period, average, np.nan)
+    return result
+
+
+def _rsi(close: np.ndarray) -> list[float | None]:
+    if close.shape[1] < 2:
+        return [None] * close.shape[0]
+    change = np.diff(close, axis=1)
+    gain = _smoothed(np.clip(change, 0, None), RSI_PERIOD, 1 / RSI_PERIOD)[:, -1]
+    loss = _smoothed(np.clip(-change, 0, None), RSI_PERIOD, 1 / RSI_PERIOD)[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(loss > 0, 100 - 100 / (1 + gain / loss), np.where(gain > 0, 100.0, 50.0))
+    return [_value(value) for value in np.where(np.isnan(gain), np.nan, rsi)]
+
+
+def _kd(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """KD(9, 3, 3)：RSV 以 1/3 權重平滑為 K，K 再平滑為 D（有 RSV 之前為 NaN）"""
+    rows, days = close.shape
+    k = np.full(rows, np.nan)
+    d = np.full(rows, np.nan)
+    if days < KD_PERIOD:
+        return k, d
+    highest = sliding_window_view(high, KD_PERIOD, axis=1).max(axis=-1)
+    lowest = sliding_window_view(low, KD_PERIOD, axis=1).min(axis=-1)
+    spread = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsv = np.where(spread > 0, (close[:, KD_PERIOD - 1 :] - lowest) / spread * 100, 50.0)
+    rsv[np.isnan(spread)] = np.nan
+    for j in range(rsv.shape[1]):
+        x = rsv[:, j]
+        valid = ~np.isnan(x)
+        started = valid & np.isnan(k)
+        k[started] = 50.0
+        d[started] = 50.0
+        k[valid] = k[valid] * 2 / 3 + x[valid] / 3
+        d[valid] = d[valid] * 2 / 3 + k[valid] / 3
+    return k, d
+
+
+def _rsi_status(value: float | None) -> str | None:
+    if value is None:
+        return None
+    return "超買" if value >= 70 else "超賣" if value <= 30 else "中性"
+
+
+def _kd_status(k: float, d: float) -> str | None:
+    if np.isnan(k) or np.isnan(d):
+        return None
+    if k >= 80:
+        return "超買"
+    if k <= 20:
+        return "超賣"
+    return "偏強" if k > d else "偏弱"
+
+
+def _sign_status(value: float, positive: str, negative: str) -> str | None:
+    if np.isnan(value):
+        return None
+    return positive if value > 0 else negative
+
+
+def _value(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+# ==========================================
+# Trend & Signals
+# ==========================================
+
+
+def classify_trend(short_term: float, mid_term: float) -> tuple[str, float]:
+    """
+    依動能分類趨勢（analyze_trend 的規則）
+
+    Args:
+        short_term: close[-5] / close[-10] - 1
+        mid_term: close[-10] / close[-20] - 1
+
+    Returns:
+        (方向 "上升" | "下降" | "盤整", 強度 0-1)
+    """
+    if short_term > 0.02 and mid_term > 0.05:
+        return "上升", 0.8
+    if short_term < -0.02 and mid_term < -0.05:
+        return "下降", 0.8
+    return "盤整", 0.4
+
+
+def momentum_pattern(recent_trend: float) -> dict[str, Any] | None:
+    """近 20 日漲跌超過 5% 的趨勢型態（identify_chart_patterns 的規則）"""
+    if recent_trend > 1.05:
+        return {
+            "pattern_name": "上升趨勢",
+            "pattern_type": "bullish",
+            "confidence": 0.75,
+            "description": f"價格上漲 {(recent_trend - 1) * 100:.2f}%",
+        }
+    if recent_trend < 0.95:
+        return {
+            "pattern_name": "下降趨勢",
+            "pattern_type": "bearish",
+            "confidence": 0.75,
+            "description": f"價格下跌 {(1 - recent_trend) * 100:.2f}%",
+        }
+    return None
+
+
+def pattern_info(match: PatternMatch) -> dict[str, Any]:
+    """掃描引擎的型態轉為工具輸出格式"""
+    return {
+        "pattern_name": PATTERN_NAMES[match.pattern],
+        "pattern_type": match.direction,
+        "confidence": round(match.score, 2),
+        "description": describe_match(match),
+    }
+
+
+def describe_match(match: PatternMatch) -> str:
+    details = match.details
+    if match.pattern in ("double_top", "double_bottom"):
+        status = "已確認" if match.confirmed else "形成中"
+        return (
+            f"{match.detected_on} {status}，兩點 {details['first_price']:.2f} / "
+            f"{details['second_price']:.2f}，頸線 {details['neckline']:.2f}"
+        )
+    return (
+        f"{match.detected_on} 收盤 {details['close']:.2f} 越過 {details['level']:.2f}，"
+        f"量能 {details['volume_ratio']:.1f} 倍"
+    )
+
+
+def combine_signals(
+    trend: Mapping[str, Any], patterns: Sequence[Any]
+) -> tuple[str, float, list[dict[str, str]]]:
+    """
+    綜合趨勢與型態產生交易訊號（generate_trading_signals 的規則）
+
+    Returns:
+        (整體訊號 "買進" | "觀望", 信心度 0-1, 訊號明細)
+    """
+    signals = []
+    overall_signal = "觀望"
+    confidence = 0.5
+
+    if trend.get("direction") == "上升":
+        signals.append({"type": "trend", "signal": "看多"})
+        confidence += 0.15
+
+    if any(isinstance(p, dict) and p.get("pattern_type") == "bullish" for p in patterns):
+        signals.append({"type": "pattern", "signal": "看多"})
+        confidence += 0.1
+
+    if len(signals) >= 2:
+        overall_signal = "買進"
+        confidence = min(0.85, confidence)
+
+    return overall_signal, confidence, signals
+
+
+# ==========================================
+# Snapshots
+# ==========================================
+
+
+def compute_snapshots(panel: OHLCVPanel, lookback: int = 60) -> list[dict[str, Any]]:
+    """
+    計算每檔股票最新交易日的完整技術面快照
+
+    Returns:
+        [{"ticker", "trading_date", "close", "indicators", "trend", "patterns",
+          "overall_signal", "confidence", "signals"}]（依股票代號排序）
+    """
+    started = time.perf_counter()
+    (close,) = _right_aligned(panel, ("close",))
+    indicators = compute_indicators(panel)
+
+    # 每檔最新 K 線的日期
+    present = ~np.isnan(panel.close)
+    last_column = np.where(present, np.arange(len(panel.dates)), -1).max(axis=1)
+
+    engine_patterns: dict[str, list[dict[str, Any]]] = {t: [] for t in panel.tickers}
+    if len(panel.dates) >= 2 * DEFAULT_ORDER + 3:
+        for match in scan(panel, lookback=max(lookback, 2 * DEFAULT_ORDER + 3)).matches:
+            engine_patterns[match.ticker].append(pattern_info(match))
+
+    snapshots = []
+    for i, ticker in enumerate(panel.tickers):
+        if last_column[i] < 0:
+            continue
+        series = close[i][~np.isnan(close[i])]
+        trend = _trend(series)
+        patterns = []
+        if len(series) >= TREND_MIN_BARS:
+            pattern = momentum_pattern(series[-1] / series[-TREND_MIN_BARS])
+            if pattern is not None:
+                patterns.append(pattern)
+        patterns.extend(engine_patterns[ticker])
+        overall_signal, confidence, signals = combine_signals(trend or {}, patterns)
+        snapshots.append(
+            {
+                "ticker": ticker,
+                "trading_date": panel.dates[last_column[i]],
+                "close": float(series[-1]),
+                "indicators": indicators[ticker],
+                "trend": trend,
+                "patterns": patterns,
+                "overall_signal": overall_signal,
+                "confidence": confidence,
+                "signals": signals,
+            }
+        )
+    snapshots.sort(key=lambda s: s["ticker"])
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.debug(f"Indicator snapshots: {len(snapshots)} tickers in {elapsed_ms:.1f}ms")
+    return snapshots
+
+
+def _trend(series: np.ndarray) -> dict[str, Any] | None:
+    if len(series) < TREND_MIN_BARS:
+        return None
+    short_term = float(series[-5] / series[-10] - 1.0)
+    mid_term = float(series[-10] / series[-20] - 1.0)
+    direction, strength = classify_trend(short_term, mid_term)
+    return {
+        "direction": direction,
+        "strength": strength,
+        "short_term_momentum": short_term,
+        "mid_term_momentum": mid_term,
+    }
@@ -0,0 +1,148 @@
+"""
+Agent 執行的指標收集
+
+- MeteredMCPServer: MCP 伺服器代理，記錄每次 call_tool 的延遲（依伺服器與工具），
+  交易工具經 session.call_tool 的呼叫也一併記錄
+- MeteredLitellmModel: LitellmModel 子類別，記錄每次 LLM 請求的延遲與 token 數（依模型）
+
+指標定義見 common.metrics，由 GET /metrics 輸出。
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterator, Awaitable
+from typing import Any
+
+from agents.extensions.models.litellm_model import LitellmModel
+from agents.mcp import MCPServer
+from mcp.types import CallToolResult, GetPromptResult, ListPromptsResult
+from mcp.types import Tool as MCPTool
+
+from common.mcp_compat import forward_call_tool, tool_result_is_error
+from common.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS, MCP_CALL_SECONDS
+
+
+async def _observe_call(server: str, tool_name: str, call: Awaitable[Any]) -> Any:
+    """等待 MCP 工具呼叫並記錄延遲（錯誤結果與例外記為 error）"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = await call
+        if not tool_result_is_error(result):
+            outcome = "ok"
+        return result
+    finally:
+        MCP_CALL_SECONDS.labels(server=server, tool=tool_name, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+
+class _MeteredSession:
+    """原伺服器 session 的計時代理：call_tool 計時，其他屬性直接轉給原 session"""
+
+    def __init__(self, session: Any, server: str):
+        self._session = session
+        self._server = server
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    async def call_tool(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        return await _observe_call(
+            self._server, name, self._session.call_tool(name, *args, **kwargs)
+        )
+
+
+class MeteredMCPServer(MCPServer):
+    """
+    MCP 伺服器計時代理
+
+    call_tool 計時後轉給原伺服器；session 回傳計時代理，讓直接以
+    session.call_tool(...) 呼叫的交易工具也記入 MCP_CALL_SECONDS。
+    其他方法與屬性直接轉給原伺服器。
+    回傳錯誤旗標（isError）的結果與拋出例外都記為 outcome="error"。
+    """
+
+    def __init__(self, server: MCPServer):
+        super().__init__()
+        self._server = server
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._server, name)
+
+    @property
+    def name(self) -> str:
+        return self._server.name
+
+    @property
+    def session(self) -> Any:
+        session = self._server.session
+        return None if session is None else _MeteredSession(session, self.name)
+
+    async def connect(self) -> None:
+        await self._server.connect()
+
+    async def cleanup(self) -> None:
+        await self._server.cleanup()
+
+    async def list_tools(self, run_context=None, agent=None) -> list[MCPTool]:
+        return await self._server.list_tools(run_context, agent)
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        meta: dict[str, Any] | None = None,
+    ) -> CallToolResult:
+        return await _observe_call(
+            self.name, tool_name, forward_call_tool(self._server, tool_name, arguments, meta)
+        )
+
+    async def list_prompts(self) -> ListPromptsResult:
+        return await self._server.list_prompts()
+
+    async def get_prompt(
+        self, name: str, arguments: dict[str, Any] | None = None
+    ) -> GetPromptResult:
+        return await self._server.get_prompt(name, arguments)
+
+
+class MeteredLitellmModel(LitellmModel):
+    """記錄請求延遲與 token 數的 LitellmModel"""
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await super().get_response(*args, **kwargs)
+            self._count_tokens(getattr(response, "usage", None))
+            outcome = "ok"
+            return response
+        finally:
+            self._observe(started, outcome)
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            async for event in super().stream_response(*args, **kwargs):
+                if getattr(event, "type", None) == "response.completed":
+                    self._count_tokens(getattr(event.response, "usage", None))
+                yield event
+            outcome = "ok"
+        finally:
+            self._observe(started, outcome)
+
+    def _observe(self, started: float, outcome: str) -> None:
+        LLM_REQUEST_SECONDS.labels(model=self.model, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+    def _count_tokens(self, usage: Any) -> None:
+        if usage is None:
+            return
+        for token_type, attribute in (("input", "input_tokens"), ("output", "output_tokens")):
+            count = getattr(usage, attribute, 0) or 0
+            if count:
+                LLM_TOKENS.labels(model=self.model, type=token_type).inc(count)
@@ -0,0 +1,474 @@
+"""
+多股票圖表型態掃描引擎
+
+將多檔股票的 K 線對齊成 (股票, 交易日) 陣列，以滑動視窗陣列運算一次掃描全部股票：
+- 局部高低點：中心 K 線為前後 order 日的最高 / 最低
+- 雙重頂 / 雙重底：回溯期間最後兩個高點（低點）價位相近、中間回檔夠深；
+  收盤跌破（突破）頸線為確認
+- 突破 / 跌破：收盤價突破前 N 日最高（跌破最低）且成交量放大
+- 成交量分布支撐壓力：回溯期間依典型價格 (H+L+C)/3 累積成交量，量大的價位區為支撐 / 壓力
+
+結果依分數（0-1）排序。可由 Agent 工具呼叫，也可定期掃描本機 K 線檔
+（與 CASUAL_MARKET_DATA 相同的錄製格式）：cd src && python -m trading.pattern_scan
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from common.logger import logger
+
+PATTERNS = ("double_top", "double_bottom", "breakout", "breakdown")
+DEFAULT_LOOKBACK = 60
+DEFAULT_ORDER = 5
+# 雙重頂 / 底兩個高（低）點的最大價差比例與最小回檔深度
+DEFAULT_TOLERANCE = 0.03
+DEFAULT_MIN_DEPTH = 0.03
+DEFAULT_BREAKOUT_WINDOW = 20
+DEFAULT_VOLUME_MULTIPLE = 1.5
+# 只回報最近幾個交易日內的突破
+DEFAULT_RECENT_DAYS = 3
+PROFILE_BINS = 24
+MAX_LEVELS = 3
+
+_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class PatternScanError(Exception):
+    """型態掃描錯誤（資料不足、格式錯誤等）"""
+
+    pass
+
+
+# ==========================================
+# OHLCV Panel
+# ==========================================
+
+
+class OHLCVPanel:
+    """多檔股票對齊後的 K 線陣列（缺少的交易日為 NaN）"""
+
+    def __init__(self, tickers: Sequence[str], dates: Sequence[date], arrays: Mapping[str, Any]):
+        """
+        Args:
+            tickers: 股票代號（列）
+            dates: 交易日（欄，遞增）
+            arrays: {"open", "high", "low", "close", "volume"} 各為 (股票數, 交易日數) 陣列
+        """
+        self.tickers = tuple(tickers)
+        self.dates = list(dates)
+        shape = (len(self.tickers), len(self.dates))
+        for name in _FIELDS:
+            values = np.asarray(arrays[name], dtype=np.float64)
+            if values.shape != shape:
+                raise PatternScanError(f"{name} has shape {values.shape}, expected {shape}")
+            setattr(self, name, values)
+
+    @classmethod
+    def from_bars(cls, bars: Mapping[str, Sequence[Any]]) -> OHLCVPanel:
+        """
+        由 {股票代號: K 線列表} 建立
+
+        K 線可為 dict 或具有 date/open/high/low/close/volume 屬性的物件（例如 PriceDataPoint）；
+        只有 close 時開高低以收盤價代替，沒有成交量時為 0。
+        """
+        parsed: dict[str, dict[date, tuple[float, ...]]] = {}
+        for ticker, rows in bars.items():
+            series = {}
+            for row in rows or []:
+                try:
+                    day = date.fromisoformat(str(_field(row, "date"))[:10])
+                    close = float(_field(row, "close"))
+                    series[day] = (
+                        float(_field(row, "open") or close),
+                        float(_field(row, "high") or close),
+                        float(_field(row, "low") or close),
+                        close,
+                        float(_field(row, "volume") or 0),
+                    )
+                except (TypeError, ValueError) as e:
+                    raise PatternScanError(f"Invalid bar for {ticker}: {row!r}") from e
+            if series:
+                parsed[str(ticker)] = series
+        if not parsed:
+            raise PatternScanError("No price data")
+
+        tickers = sorted(parsed)
+        dates = sorted({d for series in parsed.values() for d in series})
+        column = {d: j for j, d in enumerate(dates)}
+        data = np.full((len(_FIELDS), len(tickers), len(dates)), np.nan)
+        for i, ticker in enumerate(tickers):
+            for day, values in parsed[ticker].items():
+                data[:, i, column[day]] = values
+        return cls(tickers, dates, dict(zip(_FIELDS, data, strict=True)))
+
+    def tail(self, days: int) -> OHLCVPanel:
+        """最近 days 個交易日"""
+        return OHLCVPanel(
+            self.tickers,
+            self.dates[-days:],
+            {name: getattr(self, name)[:, -days:] for name in _FIELDS},
+        )
+
+
+# ==========================================
+# Results
+# ==========================================
+
+
+@dataclass
+class PatternMatch:
+    """單一型態"""
+
+    ticker: str
+    pattern: str
+    # "bullish" 或 "bearish"
+    direction: str
+    score: float
+    detected_on: date
+    confirmed: bool
+    details: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ticker": self.ticker,
+            "pattern": self.pattern,
+            "direction": self.direction,
+            "score": round(self.score, 4),
+            "detected_on": self.detected_on.isoformat(),
+            "confirmed": self.confirmed,
+            "details": {k: round(v, 4) for k, v in self.details.items()},
+        }
+
+
+@dataclass
+class ScanResult:
+    """掃描結果"""
+
+    tickers: int
+    days: int
+    matches: list[PatternMatch]
+    # {股票代號: {"support": [...], "resistance": [...]}}（由近到遠）
+    levels: dict[str, dict[str, list[float]]]
+    elapsed_ms: float
+
+    def to_dict(self, limit: int | None = None) -> dict[str, Any]:
+        matches = self.matches if limit is None else self.matches[:limit]
+        return {
+            "tickers": self.tickers,
+            "days": self.days,
+            "match_count": len(self.matches),
+            "matches": [m.to_dict() for m in matches],
+            "levels": self.levels,
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+# ==========================================
+# Scan
+# ==========================================
+
+
+def scan(
+    panel: OHLCVPanel,
+    patterns: Sequence[str] | None = None,
+    lookback: int = DEFAULT_LOOKBACK,
+    order: int = DEFAULT_ORDER,
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_depth: float = DEFAULT_MIN_DEPTH,
+    breakout_window: int = DEFAULT_BREAKOUT_WINDOW,
+    volume_multiple: float = DEFAULT_VOLUME_MULTIPLE,
+    recent_days: int = DEFAULT_RECENT_DAYS,
+) -> ScanResult:
+    """
+    掃描所有股票的型態與支撐壓力
+
+    Args:
+        panel: 對齊後的 K 線
+        patterns: 要掃描的型態（預設 PATTERNS 全部）
+        lookback: 型態與成交量分布的回溯交易日數
+        order: 局部高低點的左右視窗天數
+        tolerance: 雙重頂 / 底兩點的最大價差比例
+        min_depth: 雙重頂 / 底中間回檔的最小深度
+        breakout_window: 突破比較的前 N 日
+        volume_multiple: 突破需要的成交量倍數（相對前 N 日均量；沒有成交量資料時不檢查）
+        recent_days: 只回報最近幾日內的突破
+    """
+    patterns = tuple(patterns or PATTERNS)
+    unknown = set(patterns) - set(PATTERNS)
+    if unknown:
+        raise PatternScanError(
+            f"Unknown patterns: {', '.join(sorted(unknown))} (available: {', '.join(PATTERNS)})"
+        )
+    if lookback < 2 * order + 3:
+        raise PatternScanError(f"lookback must be at least {2 * order + 3}")
+
+    started = time.perf_counter()
+    window = panel.tail(max(lookback, breakout_window + recent_days))
+    matches: list[PatternMatch] = []
+
+    recent = window.tail(lookback)
+    if "double_top" in patterns:
+        matches += _double_patterns(recent, order, tolerance, min_depth, top=True)
+    if "double_bottom" in patterns:
+        matches += _double_patterns(recent, order, tolerance, min_depth, top=False)
+    if "breakout" in patterns or "breakdown" in patterns:
+        matches += [
+            m
+            for m in _breakouts(window, breakout_window, volume_multiple, recent_days)
+            if m.pattern in patterns
+        ]
+    levels = volume_profile_levels(recent)
+
+    matches.sort(key=lambda m: (-m.score, m.ticker, m.pattern))
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+    return ScanResult(len(panel.tickers), len(panel.dates), matches, levels, elapsed_ms)
+
+
+def local_extrema(values: np.ndarray, order: int, maximum: bool = True) -> np.ndarray:
+    """
+    局部高（低）點遮罩
+
+    中心值為前後 order 日（含）的最大（最小）值，且嚴格大於（小於）前 order 日，
+    平台只標記第一天。前後不足 order 日的位置為 False。
+    """
+    values = values if maximum else -values
+    days = values.shape[1]
+    mask = np.zeros(values.shape, dtype=bool)
+    if days < 2 * order + 1:
+        return mask
+    window_max = _rolling(values, 2 * order + 1, np.max)
+    left_max = _rolling(values, order, np.max)[:, : days - 2 * order]
+    center = values[:, order : days - order]
+    mask[:, order : days - order] = (center == window_max) & (center > left_max)
+    return mask
+
+
+def volume_profile_levels(
+    panel: OHLCVPanel, bins: int = PROFILE_BINS, max_levels: int = MAX_LEVELS
+) -> dict[str, dict[str, list[float]]]:
+    """
+    成交量分布支撐壓力
+
+    將期間價格區間分成 bins 區，以典型價格累積成交量（沒有成交量時每日權重相同），
+    成交量大於平均且不小於相鄰區的價位區為節點；低於最新收盤為支撐、高於為壓力，
+    各取成交量最大的 max_levels 個並由近到遠排序。
+    """
+    n = len(panel.tickers)
+    typical = (panel.high + panel.low + panel.close) / 3
+    lo = np.min(panel.low, axis=1, initial=np.inf, where=~np.isnan(panel.low))
+    hi = np.max(panel.high, axis=1, initial=-np.inf, where=~np.isnan(panel.high))
+    span = np.where(np.isfinite(hi - lo) & (hi > lo), hi - lo, 1.0)
+
+    volume = np.nan_to_num(panel.volume)
+    no_volume = volume.sum(axis=1) <= 0
+    weights = np.where(no_volume[:, None], 1.0, volume)
+    valid = ~np.isnan(typical)
+    scaled = np.nan_to_num((typical - lo[:, None]) / span[:, None] * bins)
+    index = np.clip(np.floor(scaled).astype(np.int64), 0, bins - 1)
+    profile = np.zeros(n * bins)
+    rows = np.broadcast_to(np.arange(n)[:, None], typical.shape)
+    np.add.at(profile, (rows * bins + index)[valid], weights[valid])
+    profile = profile.reshape(n, bins)
+
+    padded = np.pad(profile, ((0, 0), (1, 1)), constant_values=-1.0)
+    nodes = (
+        (profile >= padded[:, :-2])
+        & (profile >= padded[:, 2:])
+        & (profile > profile.mean(axis=1, keepdims=True))
+    )
+    prices = lo[:, None] + (np.arange(bins) + 0.5) * span[:, None] / bins
+    last_close = _last_valid(panel.close)
+
+    levels = {}
+    for i, ticker in enumerate(panel.tickers):
+        if np.isnan(last_close[i]) or not np.isfinite(lo[i]):
+            continue
+        node_bins = np.flatnonzero(nodes[i])
+        strongest = node_bins[np.argsort(profile[i, node_bins])[::-1]]
+        support = [p for p in prices[i, strongest] if p < last_close[i]][:max_levels]
+        resistance = [p for p in prices[i, strongest] if p > last_close[i]][:max_levels]
+        levels[ticker] = {
+            "support": [round(float(p), 2) for p in sorted(support, reverse=True)],
+            "resistance": [round(float(p), 2) for p in sorted(resistance)],
+        }
+    return levels
+
+
+def _double_patterns(
+    panel: OHLCVPanel, order: int, tolerance: float, min_depth: float, top: bool
+) -> list[PatternMatch]:
+    """雙重頂（top=True）或雙重底：最後兩個高（低）點與其間的頸線"""
+    extreme = panel.high if top else panel.low
+    mask = local_extrema(extreme, order, maximum=top)
+    days = np.arange(extreme.shape[1])
+
+    positions = np.where(mask, days, -1)
+    second = positions.max(axis=1)
+    first = np.where(days < second[:, None], positions, -1).max(axis=1)
+    valid = (first >= 0) & (second - first >= order)
+
+    rows = np.arange(len(panel.tickers))
+    p1 = extreme[rows, np.maximum(first, 0)]
+    p2 = extreme[rows, np.maximum(second, 0)]
+    between = (days > first[:, None]) & (days < second[:, None])
+    last_close = _last_valid(panel.close)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if top:
+            neckline = np.where(between, panel.low, np.inf).min(axis=1)
+            depth = (np.minimum(p1, p2) - neckline) / np.minimum(p1, p2)
+            confirmed = last_close < neckline
+        else:
+            neckline = np.where(between, panel.high, -np.inf).max(axis=1)
+            depth = (neckline - np.maximum(p1, p2)) / neckline
+            confirmed = last_close > neckline
+        difference = np.abs(p1 - p2) / np.maximum(p1, p2)
+        found = valid & (difference <= tolerance) & (depth >= min_depth) & np.isfinite(neckline)
+        score = (
+            0.5 * (1 - difference / tolerance)
+            + 0.3 * np.minimum(depth / (3 * min_depth), 1)
+            + 0.2 * confirmed
+        )
+
+    name, direction = ("double_top", "bearish") if top else ("double_bottom", "bullish")
+    return [
+        PatternMatch(
+            ticker=panel.tickers[i],
+            pattern=name,
+            direction=direction,
+            score=float(score[i]),
+            detected_on=panel.dates[second[i]],
+            confirmed=bool(confirmed[i]),
+            details={
+                "first_price": float(p1[i]),
+                "second_price": float(p2[i]),
+                "neckline": float(neckline[i]),
+                "depth": float(depth[i]),
+                "days_apart": float(second[i] - first[i]),
+            },
+        )
+        for i in np.flatnonzero(found)
+    ]
+
+
+def _breakouts(
+    panel: OHLCVPanel, window: int, volume_multiple: float, recent_days: int
+) -> list[PatternMatch]:
+    """最近 recent_days 日內收盤突破前 window 日最高（跌破最低）且放量"""
+    days = panel.close.shape[1]
+    if days <= window:
+        return []
+    # 第 j 欄為 [j, j + window) 的統計，對應第 j + window 日的「前 window 日」
+    prior_high = _rolling(panel.high, window, np.max)[:, :-1]
+    prior_low = _rolling(panel.low, window, np.min)[:, :-1]
+    average_volume = _rolling(panel.volume, window, np.mean)[:, :-1]
+    close = panel.close[:, window:]
+    volume = panel.volume[:, window:]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        volume_ratio = np.where(average_volume > 0, volume / average_volume, np.nan)
+        volume_ok = (average_volume <= 0) | (volume_ratio >= volume_multiple)
+        up = (close > prior_high) & volume_ok
+        down = (close < prior_low) & volume_ok
+
+    recent = max(min(recent_days, close.shape[1]), 1)
+    matches = []
+    for name, direction, flags, level in (
+        ("breakout", "bullish", up, prior_high),
+        ("breakdown", "bearish", down, prior_low),
+    ):
+        flags = flags[:, -recent:]
+        columns = np.where(flags, np.arange(recent), -1).max(axis=1)
+        for i in np.flatnonzero(columns >= 0):
+            j = close.shape[1] - recent + columns[i]
+            move = abs(close[i, j] / level[i, j] - 1)
+            ratio = volume_ratio[i, j]
+            volume_score = 0.0 if np.isnan(ratio) else min(ratio / (2 * volume_multiple), 1)
+            matches.append(
+                PatternMatch(
+                    ticker=panel.tickers[i],
+                    pattern=name,
+                    direction=direction,
+                    score=0.5 * min(move / 0.05, 1) + 0.5 * volume_score,
+                    detected_on=panel.dates[window + j],
+                    confirmed=True,
+                    details={
+                        "level": float(level[i, j]),
+                        "close": float(close[i, j]),
+                        "move": float(move),
+                        "volume_ratio": float(0.0 if np.isnan(ratio) else ratio),
+                        "days_ago": float(recent - 1 - columns[i]),
+                    },
+                )
+            )
+    return matches
+
+
+def _field(row: Any, key: str) -> Any:
+    return row.get(key) if isinstance(row, Mapping) else getattr(row, key, None)
+
+
+def _rolling(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """沿交易日的滑動視窗統計：第 j 欄為 [j, j + window) 的結果（NaN 會傳遞）"""
+    return reducer(sliding_window_view(values, window, axis=1), axis=-1)
+
+
+def _last_valid(values: np.ndarray) -> np.ndarray:
+    """每列最後一個非 NaN 值"""
+    present = ~np.isnan(values)
+    last = np.where(present, np.arange(values.shape[1]), -1).max(axis=1)
+    result = values[np.arange(values.shape[0]), np.maximum(last, 0)]
+    return np.where(last >= 0, result, np.nan)
+
+
+# ==========================================
+# Scheduled Scan
+# ==========================================
+
+
+def load_ohlcv(path: str | None = None) -> OHLCVPanel:
+    """讀取本機 K 線檔（錄製格式，預設為 CASUAL_MARKET_DATA）"""
+    path = path or os.getenv("CASUAL_MARKET_DATA")
+    if not path:
+        raise PatternScanError("No local OHLCV data configured (set CASUAL_MARKET_DATA)")
+    try:
+        with open(path, encoding="utf-8") as f:
+            recorded = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise PatternScanError(f"Cannot read OHLCV data: {e}") from e
+    return OHLCVPanel.from_bars({t: entry.get("bars", []) for t, entry in recorded.items()})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scan chart patterns across recorded OHLCV data")
+    parser.add_argument("--data", help="recorded bars file (default: CASUAL_MARKET_DATA)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--lookback", type=int, default=DEFAULT_LOOKBACK)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    result = scan(load_ohlcv(args.data), lookback=args.lookback).to_dict(limit=args.limit)
+    logger.info(
+        f"Pattern scan: {result['match_count']} matches across {result['tickers']} tickers "
+        f"in {result['elapsed_ms']:.1f}ms"
+    )
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
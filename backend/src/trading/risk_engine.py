@@ -0,0 +1,321 @@
+"""
+投資組合風險引擎
+
+以持股的歷史收盤價計算共變異數 / 相關係數矩陣，提供：
+- 參數法 VaR / CVaR（常態假設，部位價值 v 與日報酬共變異數 Σ：σp = √(vᵀΣv)）
+- 歷史模擬法 VaR / CVaR（以歷史日報酬重播目前部位的損益分布）
+- 成分 VaR（各部位對組合 VaR 的貢獻，加總等於 z·σp）
+- 單一股票年化波動率與相對大盤的 Beta
+
+共變異數估計依「交易日 + 股票組合 + 價格資料」快取；風險分析師在同一交易日內重複呼叫
+calculate_portfolio_risk 時不會重算，換日時自動清除前一日的快取。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+from statistics import NormalDist
+
+import numpy as np
+
+from common.logger import logger
+
+TRADING_DAYS_PER_YEAR = 252
+
+# 計算共變異數所需的最少日報酬數
+MIN_RETURNS = 10
+
+DEFAULT_CONFIDENCE = 0.95
+
+# 同一交易日最多保留的估計數（不同股票組合）
+MAX_CACHED_ESTIMATES = 64
+
+
+class RiskEngineError(Exception):
+    """風險引擎錯誤（歷史資料不足或格式錯誤）"""
+
+    pass
+
+
+@dataclass(frozen=True)
+class CovarianceEstimate:
+    """持股日報酬的共變異數估計"""
+
+    trading_day: date
+    tickers: tuple[str, ...]
+    # returns[t, i]：第 t 日 tickers[i] 的日報酬（小數）
+    returns: np.ndarray
+    # 各股票收盤價相對最後一日的比值（用於重建持有期間的組合價值）
+    relative_prices: np.ndarray
+    mean: np.ndarray
+    covariance: np.ndarray
+    correlation: np.ndarray
+
+    @property
+    def observations(self) -> int:
+        return self.returns.shape[0]
+
+    def annualized_volatility(self) -> dict[str, float]:
+        """各股票年化波動率"""
+        daily = np.sqrt(np.diag(self.covariance))
+        return {
+            ticker: float(vol * math.sqrt(TRADING_DAYS_PER_YEAR))
+            for ticker, vol in zip(self.tickers, daily, strict=True)
+        }
+
+    def correlation_dict(self) -> dict[str, dict[str, float]]:
+        """相關係數矩陣（{股票: {股票: 相關係數}}，方便序列化回 Agent）"""
+        return {
+            a: {b: round(float(self.correlation[i, j]), 4) for j, b in enumerate(self.tickers)}
+            for i, a in enumerate(self.tickers)
+        }
+
+
+@dataclass(frozen=True)
+class PortfolioVaR:
+    """組合 VaR / CVaR（金額，正值表示損失）"""
+
+    confidence: float
+    horizon_days: int
+    portfolio_value: float
+    parametric_var: float
+    parametric_cvar: float
+    historical_var: float
+    historical_cvar: float
+    # 各部位單獨計算的參數法 VaR 加總（未考慮分散效果）
+    undiversified_var: float
+    component_var: dict[str, float]
+    # 以歷史價格重建目前持股的價值路徑得出的最大回撤（金額）
+    max_drawdown: float
+
+    @property
+    def diversification_ratio(self) -> float:
+        """組合 z·σp / 個別 VaR 加總（越低表示分散效果越好）"""
+        if self.undiversified_var <= 0:
+            return 1.0
+        return sum(self.component_var.values()) / self.undiversified_var
+
+
+class RiskEngine:
+    """
+    共變異數 VaR 引擎（估計結果依交易日快取）
+
+    工具以 asyncio.to_thread 呼叫，快取的清除、淘汰與寫入以鎖保護；
+    矩陣計算在鎖外進行。
+    """
+
+    def __init__(self, max_cached: int = MAX_CACHED_ESTIMATES):
+        self._max_cached = max_cached
+        self._lock = threading.Lock()
+        self._cache_day: date | None = None
+        self._cache: dict[tuple, CovarianceEstimate] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def estimate(
+        self,
+        price_history: Mapping[str, Sequence[float]],
+        trading_day: date | None = None,
+    ) -> CovarianceEstimate:
+        """
+        由收盤價計算日報酬共變異數 / 相關係數矩陣
+
+        Args:
+            price_history: {股票代號: 依日期排序的收盤價（最後一筆為最新）}；
+                各股票長度不同時取共同的最近區間
+            trading_day: 資料所屬交易日（預設今日）
+
+        Raises:
+            RiskEngineError: 股票為空或共同區間的日報酬少於 MIN_RETURNS
+        """
+        trading_day = trading_day or date.today()
+        tickers = tuple(sorted(price_history))
+        if not tickers:
+            raise RiskEngineError("price_history is empty")
+
+        length = min(len(price_history[t]) for t in tickers)
+        if length - 1 < MIN_RETURNS:
+            raise RiskEngineError(
+                f"Need at least {MIN_RETURNS + 1} common closing prices, got {length}"
+            )
+        try:
+            prices = np.array(
+                [list(price_history[t])[-length:] for t in tickers], dtype=np.float64
+            ).T
+        except (TypeError, ValueError) as e:
+            raise RiskEngineError(f"Invalid closing prices: {e}") from e
+        if not np.all(np.isfinite(prices)) or np.any(prices <= 0):
+            raise RiskEngineError("Closing prices must be positive numbers")
+
+        key = (trading_day, tickers, hashlib.blake2b(prices.tobytes(), digest_size=16).digest())
+        with self._lock:
+            self._roll_cache_day(trading_day)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        returns = prices[1:] / prices[:-1] - 1
+        covariance = np.atleast_2d(np.cov(returns, rowvar=False, ddof=1))
+        stddev = np.sqrt(np.diag(covariance))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = covariance / np.outer(stddev, stddev)
+        correlation = np.nan_to_num(correlation)
+        np.fill_diagonal(correlation, 1.0)
+
+        estimate = CovarianceEstimate(
+            trading_day=trading_day,
+            tickers=tickers,
+            returns=returns,
+            relative_prices=prices / prices[-1],
+            mean=returns.mean(axis=0),
+            covariance=covariance,
+            correlation=correlation,
+        )
+        with self._lock:
+            self._roll_cache_day(trading_day)
+            if key not in self._cache and len(self._cache) >= self._max_cached:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = estimate
+        logger.debug(
+            f"Covariance estimated for {len(tickers)} tickers x {estimate.observations} returns "
+            f"({trading_day})"
+        )
+        return estimate
+
+    def portfolio_var(
+        self,
+        estimate: CovarianceEstimate,
+        position_values: Mapping[str, float],
+        confidence: float = DEFAULT_CONFIDENCE,
+        horizon_days: int = 1,
+    ) -> PortfolioVaR:
+        """
+        計算組合 VaR / CVaR
+
+        Args:
+            estimate: estimate() 的結果
+            position_values: {股票代號: 部位市值}，股票必須都在 estimate 中
+            confidence: 信賴水準（例如 0.95）
+            horizon_days: 持有天數（參數法以 √t 放大；歷史法以 t 日累積報酬計算）
+        """
+        if not 0 < confidence < 1:
+            raise RiskEngineError(f"confidence must be in (0, 1): {confidence}")
+        if horizon_days < 1:
+            raise RiskEngineError(f"horizon_days must be at least 1: {horizon_days}")
+        missing = set(position_values) - set(estimate.tickers)
+        if missing:
+            raise RiskEngineError(f"No price history for: {', '.join(sorted(missing))}")
+
+        values = np.array([float(position_values.get(t, 0.0)) for t in estimate.tickers])
+        portfolio_value = float(values.sum())
+
+        # 參數法（常態）
+        z = NormalDist().inv_cdf(confidence)
+        tail_density = NormalDist().pdf(z) / (1 - confidence)
+        scale = math.sqrt(horizon_days)
+        mean_pnl = float(values @ estimate.mean) * horizon_days
+        variance = float(values @ estimate.covariance @ values)
+        sigma = math.sqrt(max(variance, 0.0)) * scale
+        parametric_var = max(z * sigma - mean_pnl, 0.0)
+        parametric_cvar = max(tail_density * sigma - mean_pnl, 0.0)
+
+        position_sigma = np.abs(values) * np.sqrt(np.diag(estimate.covariance)) * scale
+        undiversified_var = float((z * position_sigma).sum())
+        if sigma > 0:
+            marginal = estimate.covariance @ values * scale**2 / sigma
+            component = z * values * marginal
+        else:
+            component = np.zeros_like(values)
+
+        # 歷史模擬法
+        pnl = _horizon_returns(estimate.returns, horizon_days) @ values
+        historical_var = max(float(-np.quantile(pnl, 1 - confidence)), 0.0)
+        tail = pnl[pnl <= -historical_var]
+        historical_cvar = max(float(-tail.mean()), 0.0) if tail.size else historical_var
+
+        path = estimate.relative_prices @ values
+        peaks = np.maximum.accumulate(path)
+        max_drawdown = float((peaks - path).max()) if path.size else 0.0
+
+        return PortfolioVaR(
+            confidence=confidence,
+            horizon_days=horizon_days,
+            portfolio_value=portfolio_value,
+            parametric_var=parametric_var,
+            parametric_cvar=parametric_cvar,
+            historical_var=historical_var,
+            historical_cvar=historical_cvar,
+            undiversified_var=undiversified_var,
+            component_var={
+                t: float(c)
+                for t, c in zip(estimate.tickers, component, strict=True)
+                if t in position_values
+            },
+            max_drawdown=max_drawdown,
+        )
+
+    def beta(
+        self,
+        price_history: Sequence[float],
+        market_history: Sequence[float],
+        trading_day: date | None = None,
+    ) -> float:
+        """股票日報酬相對大盤（例如加權指數）的 Beta"""
+        estimate = self.estimate({"stock": price_history, "market": market_history}, trading_day)
+        stock, market = estimate.tickers.index("stock"), estimate.tickers.index("market")
+        market_variance = estimate.covariance[market, market]
+        if market_variance <= 0:
+            return 1.0
+        return float(estimate.covariance[stock, market] / market_variance)
+
+    def cache_info(self) -> dict[str, int | str | None]:
+        """快取統計"""
+        with self._lock:
+            return {
+                "trading_day": self._cache_day.isoformat() if self._cache_day else None,
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_day = None
+
+    def _roll_cache_day(self, trading_day: date) -> None:
+        """換日時清空快取（呼叫端需持有 _lock）"""
+        if self._cache_day != trading_day:
+            self._cache.clear()
+            self._cache_day = trading_day
+
+
+def _horizon_returns(returns: np.ndarray, horizon_days: int) -> np.ndarray:
+    """以滾動視窗計算 t 日累積報酬（t = 1 時即為日報酬）"""
+    if horizon_days == 1:
+        return returns
+    growth = np.cumprod(1 + returns, axis=0)
+    growth = np.vstack([np.ones((1, returns.shape[1])), growth])
+    if growth.shape[0] <= horizon_days:
+        raise RiskEngineError(
+            f"Not enough history for a {horizon_days}-day horizon ({returns.shape[0]} returns)"
+        )
+    return growth[horizon_days:] / growth[:-horizon_days] - 1
+
+
+_risk_engine: RiskEngine | None = None
+
+
+def get_risk_engine() -> RiskEngine:
+    """程序內共用的風險引擎（風險分析師的工具呼叫共用同一份快取）"""
+    global _risk_engine
+    if _risk_engine is None:
+        _risk_engine = RiskEngine()
+    return _risk_engine
@@ -0,0 +1,216 @@
+"""
+Agent 執行串流事件批次器
+
+將 OpenAI Agents SDK 的串流事件（Runner.run_streamed，以及 sub-agent 的 RunHooks，
+見 trading.subagent_stream）轉換為精簡的 JSON 事件，並以固定間隔批次推送，避免每個 token 都產生一次 WebSocket 訊息。
+
+事件格式（kind）：
+- text: 模型輸出的增量文字（同一批次內連續片段會合併）
+- tool_started / tool_finished: 工具呼叫開始與完成
+- agent_updated: 目前執行的 Agent 變更
+
+sub-agent 的事件帶有 parent_call_id（對應主 Agent 呼叫該 sub-agent 的 tool call）；
+sub-agent 以非串流方式執行，其文字為每次模型回應的完整內容。
+串流事件只用於即時顯示，不寫入資料庫；最終輸出仍由會話結束時保存。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from common.logger import logger
+
+if TYPE_CHECKING:
+    from agents.stream_events import StreamEvent
+
+# 工具輸出只推送前段內容（完整內容由 Agent 自行使用）
+_TOOL_OUTPUT_PREVIEW_CHARS = 500
+
+FlushCallback = Callable[[list[dict[str, Any]]], Awaitable[None]]
+
+
+def _field(raw: Any, name: str) -> Any:
+    """讀取 SDK raw item 欄位（可能是物件或 TypedDict）"""
+    if isinstance(raw, dict):
+        return raw.get(name)
+    return getattr(raw, name, None)
+
+
+def tool_finished_event(agent: str | None, call_id: str | None, output: Any) -> dict[str, Any]:
+    """工具完成事件（輸出只保留前段預覽）"""
+    preview = "" if output is None else str(output)
+    return {
+        "kind": "tool_finished",
+        "agent": agent,
+        "call_id": call_id,
+        "output": preview[:_TOOL_OUTPUT_PREVIEW_CHARS],
+        "truncated": len(preview) > _TOOL_OUTPUT_PREVIEW_CHARS,
+    }
+
+
+class RunStreamBatcher:
+    """
+    串流事件批次器
+
+    handle_event() / handle_subagent_update() 為同步且只寫入緩衝區；背景任務每 flush_interval_ms 將緩衝區交給 on_flush 推送。
+    """
+
+    def __init__(
+        self,
+        on_flush: FlushCallback,
+        flush_interval_ms: int = 100,
+        max_buffered_events: int = 500,
+    ):
+        """
+        初始化批次器
+
+        Args:
+            on_flush: 推送一批事件的回呼
+            flush_interval_ms: 批次推送間隔（毫秒）
+            max_buffered_events: 緩衝區上限（超過時提前推送）
+        """
+        self._on_flush = on_flush
+        self._interval = max(1, flush_interval_ms) / 1000
+        self._max_buffered = max(1, max_buffered_events)
+        self._buffer: list[dict[str, Any]] = []
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        self.events_received = 0
+        self.batches_sent = 0
+
+    async def start(self) -> None:
+        """啟動背景推送任務"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop(), name="run-stream-flush")
+
+    async def close(self) -> None:
+        """停止背景任務並推送剩餘事件"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+    async def __aenter__(self) -> RunStreamBatcher:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    # ==========================================
+    # Event Conversion
+    # ==========================================
+
+    def handle_event(
+        self,
+        event: StreamEvent,
+        agent_name: str | None = None,
+        parent_call_id: str | None = None,
+    ) -> None:
+        """
+        轉換並緩衝一個 SDK 串流事件
+
+        Args:
+            event: SDK 串流事件
+            agent_name: 產生事件的 Agent 名稱（主 Agent 的原始事件不帶名稱）
+            parent_call_id: sub-agent 事件所屬的 tool call ID
+        """
+        converted = self._convert(event, agent_name)
+        if converted is None:
+            return
+        if parent_call_id:
+            converted["parent_call_id"] = parent_call_id
+        self._append(converted)
+
+    def handle_subagent_update(
+        self, event: dict[str, Any], parent_call_id: str | None = None
+    ) -> None:
+        """
+        緩衝一個 sub-agent 事件（已是推送格式，由 sub-agent 的 RunHooks 產生）
+
+        Args:
+            event: 推送格式的事件
+            parent_call_id: 主 Agent 呼叫該 sub-agent 的 tool call ID
+        """
+        if parent_call_id:
+            event = {**event, "parent_call_id": parent_call_id}
+        self._append(event)
+
+    def _convert(self, event: StreamEvent, agent_name: str | None) -> dict[str, Any] | None:
+        """將 SDK 事件轉換為推送格式，不需推送的事件回傳 None"""
+        # 以 event.type 判斷種類，本模組不必在 API 啟動時載入 Agents SDK
+        event_type = getattr(event, "type", None)
+        if event_type == "raw_response_event":
+            if getattr(event.data, "type", None) != "response.output_text.delta":
+                return None
+            delta = getattr(event.data, "delta", "")
+            if not delta:
+                return None
+            return {"kind": "text", "agent": agent_name, "delta": delta}
+
+        if event_type == "agent_updated_stream_event":
+            return {"kind": "agent_updated", "agent": event.new_agent.name}
+
+        if event_type == "run_item_stream_event":
+            item_agent = getattr(getattr(event.item, "agent", None), "name", None) or agent_name
+            raw = event.item.raw_item
+            if event.name == "tool_called":
+                return {
+                    "kind": "tool_started",
+                    "agent": item_agent,
+                    "tool": _field(raw, "name") or _field(raw, "type"),
+                    "call_id": _field(raw, "call_id") or _field(raw, "id"),
+                }
+            if event.name == "tool_output":
+                return tool_finished_event(
+                    item_agent,
+                    _field(raw, "call_id") or _field(raw, "id"),
+                    getattr(event.item, "output", None),
+                )
+        return None
+
+    def _append(self, event: dict[str, Any]) -> None:
+        """加入緩衝區；連續的同來源文字片段合併為一筆"""
+        self.events_received += 1
+        if event["kind"] == "text" and self._buffer:
+            last = self._buffer[-1]
+            if (
+                last["kind"] == "text"
+                and last.get("agent") == event.get("agent")
+                and last.get("parent_call_id") == event.get("parent_call_id")
+            ):
+                last["delta"] += event["delta"]
+                return
+
+        self._buffer.append(event)
+        if len(self._buffer) >= self._max_buffered:
+            self._wakeup.set()
+
+    # ==========================================
+    # Flushing
+    # ==========================================
+
+    async def flush(self) -> None:
+        """推送目前緩衝的事件（推送失敗不影響 Agent 執行）"""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self.batches_sent += 1
+        try:
+            await self._on_flush(batch)
+        except Exception as e:
+            logger.warning(f"Failed to publish run stream events: {e}")
+
+    async def _flush_loop(self) -> None:
+        """固定間隔推送，緩衝區滿時提前推送"""
+        while True:
+            try:
+                async with asyncio.timeout(self._interval):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
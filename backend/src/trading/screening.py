@@ -0,0 +1,541 @@
+"""
+全市場基本面篩選索引
+
+批次工作為整個股票池計算財務比率（與 calculate_financial_ratios 等工具相同的定義），
+存成欄式資料表（每個指標一個 NumPy 陣列）並為每個指標建立排序索引。
+篩選條件以二分搜尋在排序索引上取出符合的列，再依指定指標取前 N 名，
+「PE < 15、ROE > 12%、營收成長 > 10%、依殖利率取前 20 名」在毫秒內完成，
+Agent 不需逐檔以 LLM 呼叫工具篩選。
+
+- 比率以小數表示（12% = 0.12）；ROE / ROA 以單季淨利 × 4 年化
+- 營收成長為最新月營收年增率，EPS 成長為最新季 EPS 與去年同季比較
+- 缺少資料的指標為 NaN，不符合任何條件也不參與排序
+
+設定:
+- SCREENING_INDEX_PATH: 索引檔路徑（預設 backend/cache/screening_index.npz）
+- SCREENING_UNIVERSE: 股票池檔案（JSON 列表或每行一個代號）；未設定時使用 Agent 持有 / 關注的股票
+
+建立索引：cd src && python -m trading.screening [--universe FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+from common.logger import logger
+from common.time_utils import utc_now
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache", "screening_index.npz"
+)
+DEFAULT_CONCURRENCY = 8
+DEFAULT_LIMIT = 20
+
+# 數值指標（欄位名稱: 說明）
+NUMERIC_FIELDS: dict[str, str] = {
+    "pe_ratio": "本益比",
+    "pb_ratio": "股價淨值比",
+    "dividend_yield": "殖利率",
+    "roe": "股東權益報酬率（年化）",
+    "roa": "資產報酬率（年化）",
+    "gross_margin": "毛利率",
+    "operating_margin": "營業利益率",
+    "net_margin": "淨利率",
+    "debt_ratio": "負債比",
+    "current_ratio": "流動比率",
+    "revenue_growth": "月營收年增率",
+    "eps": "每股盈餘（單季）",
+    "eps_growth": "EPS 年增率",
+}
+# 文字欄位（只支援相等條件）
+TEXT_FIELDS: dict[str, str] = {"industry": "產業"}
+
+FIELD_ALIASES = {
+    "pe": "pe_ratio",
+    "per": "pe_ratio",
+    "pb": "pb_ratio",
+    "pbr": "pb_ratio",
+    "yield": "dividend_yield",
+    "growth": "revenue_growth",
+}
+
+_OPERATORS = ("<=", ">=", "==", "=", "<", ">")
+_CONDITION = re.compile(r"^\s*([A-Za-z_]+)\s*(<=|>=|==|=|<|>)\s*(.+?)\s*$")
+
+
+class ScreeningError(Exception):
+    """篩選索引錯誤（索引不存在、條件格式錯誤等）"""
+
+    pass
+
+
+# ==========================================
+# Metrics
+# ==========================================
+
+
+def compute_metrics(statements: Mapping[str, Mapping[str, Any] | None]) -> dict[str, float]:
+    """
+    由 casual-market-mcp 的回應資料計算篩選指標
+
+    Args:
+        statements: {"income", "prior_income", "balance", "monthly_revenue", "valuation"}
+            各為對應工具回應的 data（缺少時為 None）
+
+    Returns:
+        {指標: 數值}；無法計算的指標為 NaN
+    """
+    income = statements.get("income") or {}
+    prior = statements.get("prior_income") or {}
+    balance = statements.get("balance") or {}
+    revenue = statements.get("monthly_revenue") or {}
+    valuation = statements.get("valuation") or {}
+
+    sales = _number(income.get("revenue"))
+    net_income = _number(income.get("net_income"))
+    assets = _number(balance.get("total_assets"))
+    liabilities = _number(balance.get("total_liabilities"))
+    equity = _number(balance.get("equity", balance.get("total_equity")))
+    if math.isnan(equity):
+        equity = assets - liabilities
+    eps = _number(income.get("eps"))
+    prior_eps = _number(prior.get("eps"))
+    dividend_yield = _number(valuation.get("dividend_yield"))
+    revenue_yoy = _number(revenue.get("yoy_percent"))
+
+    return {
+        "pe_ratio": _number(valuation.get("pe_ratio")),
+        "pb_ratio": _number(valuation.get("pb_ratio")),
+        # valuation_ratios 的殖利率與月營收年增率以百分比表示
+        "dividend_yield": dividend_yield / 100,
+        "roe": _ratio(net_income * 4, equity),
+        "roa": _ratio(net_income * 4, assets),
+        "gross_margin": _ratio(_number(income.get("gross_profit")), sales),
+        "operating_margin": _ratio(_number(income.get("operating_income")), sales),
+        "net_margin": _ratio(net_income, sales),
+        "debt_ratio": _ratio(liabilities, assets),
+        "current_ratio": _ratio(
+            _number(balance.get("current_assets")), _number(balance.get("current_liabilities"))
+        ),
+        "revenue_growth": revenue_yoy / 100,
+        "eps": eps,
+        "eps_growth": _ratio(eps - prior_eps, abs(prior_eps)),
+    }
+
+
+def _number(value: Any) -> float:
+    try:
+        number = float(str(value).replace(",", "")) if value is not None else math.nan
+    except ValueError:
+        return math.nan
+    return number if math.isfinite(number) else math.nan
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    if math.isnan(numerator) or math.isnan(denominator) or denominator <= 0:
+        return math.nan
+    return numerator / denominator
+
+
+# ==========================================
+# Index
+# ==========================================
+
+
+@dataclass(frozen=True)
+class Condition:
+    """單一篩選條件"""
+
+    field: str
+    op: str
+    value: float | str
+
+
+class ScreeningIndex:
+    """欄式篩選索引：每個指標一個陣列與一個排序索引"""
+
+    def __init__(
+        self,
+        tickers: list[str],
+        columns: Mapping[str, Any],
+        built_at: datetime | None = None,
+    ):
+        """
+        Args:
+            tickers: 股票代號（列）
+            columns: {欄位: 與 tickers 等長的值}；數值欄位缺值為 NaN
+            built_at: 建立時間
+        """
+        self.tickers = np.asarray(tickers, dtype=str)
+        self.built_at = built_at or utc_now()
+        self.columns: dict[str, np.ndarray] = {}
+        self._order: dict[str, np.ndarray] = {}
+        self._sorted: dict[str, np.ndarray] = {}
+
+        for name in NUMERIC_FIELDS:
+            values = np.asarray(columns.get(name, [math.nan] * len(tickers)), dtype=np.float64)
+            if values.shape != self.tickers.shape:
+                raise ScreeningError(
+                    f"Column {name} has {values.size} rows, expected {len(tickers)}"
+                )
+            self.columns[name] = values
+            # 排序索引只包含有值的列
+            present = np.flatnonzero(~np.isnan(values))
+            order = present[np.argsort(values[present], kind="stable")]
+            self._order[name] = order
+            self._sorted[name] = values[order]
+        for name in TEXT_FIELDS:
+            self.columns[name] = np.asarray(columns.get(name, [""] * len(tickers)), dtype=str)
+
+    def __len__(self) -> int:
+        return int(self.tickers.size)
+
+    def query(
+        self,
+        conditions: list[Condition],
+        sort_by: str | None = None,
+        descending: bool = True,
+        limit: int = DEFAULT_LIMIT,
+    ) -> tuple[np.ndarray, int]:
+        """
+        篩選並排序
+
+        Returns:
+            (符合條件的前 limit 列索引, 符合條件的總列數)
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for condition in conditions:
+            mask &= self._match(condition)
+
+        if sort_by is None:
+            rows = np.flatnonzero(mask)
+        else:
+            sort_by = resolve_field(sort_by)
+            if sort_by not in NUMERIC_FIELDS:
+                raise ScreeningError(f"Cannot sort by text field: {sort_by}")
+            order = self._order[sort_by][::-1] if descending else self._order[sort_by]
+            rows = order[mask[order]]
+        return rows[: max(limit, 0)], int(mask.sum())
+
+    def row(self, index: int) -> dict[str, Any]:
+        """單列資料（NaN 轉為 None）"""
+        record: dict[str, Any] = {"ticker": str(self.tickers[index])}
+        for name in TEXT_FIELDS:
+            record[name] = str(self.columns[name][index])
+        for name in NUMERIC_FIELDS:
+            value = float(self.columns[name][index])
+            record[name] = None if math.isnan(value) else round(value, 4)
+        return record
+
+    def _match(self, condition: Condition) -> np.ndarray:
+        if condition.field in TEXT_FIELDS:
+            return self.columns[condition.field] == condition.value
+
+        values = self._sorted[condition.field]
+        order = self._order[condition.field]
+        value = condition.value
+        if condition.op == "<":
+            rows = order[: np.searchsorted(values, value, side="left")]
+        elif condition.op == "<=":
+            rows = order[: np.searchsorted(values, value, side="right")]
+        elif condition.op == ">":
+            rows = order[np.searchsorted(values, value, side="right") :]
+        elif condition.op == ">=":
+            rows = order[np.searchsorted(values, value, side="left") :]
+        else:
+            start = np.searchsorted(values, value, side="left")
+            rows = order[start : np.searchsorted(values, value, side="right")]
+        mask = np.zeros(len(self), dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def save(self, path: str) -> None:
+        """存成 .npz（欄式）"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # 先寫入暫存檔再取代，讀取中的程序不會讀到寫到一半的索引
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                tickers=self.tickers,
+                built_at=np.asarray(self.built_at.isoformat()),
+                **self.columns,
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> ScreeningIndex:
+        try:
+            with np.load(path) as data:
+                columns = {name: data[name] for name in data.files if name in _ALL_FIELDS}
+                return cls(
+                    list(data["tickers"]),
+                    columns,
+                    built_at=datetime.fromisoformat(str(data["built_at"])),
+                )
+        except (OSError, KeyError, ValueError) as e:
+            raise ScreeningError(f"Cannot load screening index {path}: {e}") from e
+
+
+_ALL_FIELDS = set(NUMERIC_FIELDS) | set(TEXT_FIELDS)
+
+
+def resolve_field(name: str) -> str:
+    key = name.strip().lower()
+    key = FIELD_ALIASES.get(key, key)
+    if key not in _ALL_FIELDS:
+        raise ScreeningError(f"Unknown field: {name} (available: {', '.join(sorted(_ALL_FIELDS))})")
+    return key
+
+
+def parse_conditions(filters: Any) -> list[Condition]:
+    """
+    解析篩選條件
+
+    接受：
+    - 字串："pe_ratio < 15, roe > 12%, revenue_growth > 0.1"（以逗號或 and 分隔）
+    - 列表：["pe < 15", {"field": "roe", "op": ">", "value": 0.12}]
+    百分比字串（"12%"）轉為小數。
+    """
+    if not filters:
+        return []
+    if isinstance(filters, str):
+        filters = re.split(r",|\band\b|&&", filters, flags=re.IGNORECASE)
+    if isinstance(filters, dict):
+        filters = [filters]
+
+    conditions = []
+    for item in filters:
+        if isinstance(item, dict):
+            field, op, raw = item.get("field"), item.get("op", "=="), item.get("value")
+        elif isinstance(item, str):
+            if not item.strip():
+                continue
+            match = _CONDITION.match(item)
+            if match is None:
+                raise ScreeningError(f"Invalid condition: {item!r}")
+            field, op, raw = match.groups()
+        else:
+            raise ScreeningError(f"Invalid condition: {item!r}")
+
+        if not field or op not in _OPERATORS:
+            raise ScreeningError(f"Invalid condition: {item!r}")
+        field = resolve_field(str(field))
+        op = "==" if op == "=" else op
+        if field in TEXT_FIELDS:
+            if op != "==":
+                raise ScreeningError(f"Text field {field} only supports ==")
+            conditions.append(Condition(field, op, str(raw).strip().strip("'\"")))
+        else:
+            conditions.append(Condition(field, op, _parse_value(raw)))
+    return conditions
+
+
+def _parse_value(raw: Any) -> float:
+    text = str(raw).strip()
+    try:
+        if text.endswith("%"):
+            return float(text[:-1]) / 100
+        return float(text)
+    except ValueError as e:
+        raise ScreeningError(f"Invalid number: {raw!r}") from e
+
+
+def screen(
+    index: ScreeningIndex,
+    filters: Any = None,
+    sort_by: str | None = None,
+    descending: bool = True,
+    limit: int = DEFAULT_LIMIT,
+) -> dict[str, Any]:
+    """
+    執行篩選並回傳 Agent 可讀的結果
+
+    Returns:
+        {"matched", "count", "results", "sort_by", "conditions", "universe", "built_at", "elapsed_ms"}
+    """
+    started = time.perf_counter()
+    conditions = parse_conditions(filters)
+    rows, matched = index.query(conditions, sort_by=sort_by, descending=descending, limit=limit)
+    results = [index.row(int(i)) for i in rows]
+    return {
+        "matched": matched,
+        "count": len(results),
+        "results": results,
+        "sort_by": resolve_field(sort_by) if sort_by else None,
+        "conditions": [f"{c.field} {c.op} {c.value}" for c in conditions],
+        "universe": len(index),
+        "built_at": index.built_at.isoformat(),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+# ==========================================
+# Shared Index
+# ==========================================
+
+
+_loaded: tuple[str, float, ScreeningIndex] | None = None
+
+
+def get_screening_index(path: str | None = None) -> ScreeningIndex:
+    """
+    讀取篩選索引（檔案更新時重新讀取）
+
+    Raises:
+        ScreeningError: 索引尚未建立
+    """
+    global _loaded
+    path = path or os.getenv("SCREENING_INDEX_PATH", DEFAULT_INDEX_PATH)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError as e:
+        raise ScreeningError(
+            f"Screening index not built yet ({path}); run: python -m trading.screening"
+        ) from e
+    if _loaded is None or _loaded[:2] != (path, mtime):
+        _loaded = (path, mtime, ScreeningIndex.load(path))
+    return _loaded[2]
+
+
+# ==========================================
+# Batch Build
+# ==========================================
+
+
+async def build_screening_index(
+    tickers: list[str],
+    client: Any = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> ScreeningIndex:
+    """
+    向 casual-market-mcp 取得股票池的財報並建立索引
+
+    財報經由基本面快取（api.fundamentals_cache），重建時大多直接命中。
+
+    Args:
+        tickers: 股票池
+        client: 已連線的 MCPMarketClient（預設自行建立）
+        concurrency: 同時處理的股票數
+    """
+    if client is None:
+        from api.mcp_client import create_mcp_market_client
+
+        async with create_mcp_market_client() as connected:
+            return await build_screening_index(tickers, connected, concurrency)
+
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def fetch(ticker: str) -> tuple[dict[str, float], str] | None:
+        async with semaphore:
+            try:
+                return await _fetch_metrics(client, ticker)
+            except Exception as e:
+                logger.warning(f"Screening index: skipping {ticker}: {e}")
+                return None
+
+    fetched = await asyncio.gather(*(fetch(t) for t in tickers))
+    rows = [(t, r) for t, r in zip(tickers, fetched, strict=True) if r is not None]
+
+    index = ScreeningIndex(
+        [t for t, _ in rows],
+        {
+            **{name: [metrics[name] for _, (metrics, _) in rows] for name in NUMERIC_FIELDS},
+            "industry": [industry for _, (_, industry) in rows],
+        },
+    )
+    logger.info(
+        f"Screening index built: {len(index)}/{len(tickers)} tickers "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return index
+
+
+async def _fetch_metrics(client: Any, ticker: str) -> tuple[dict[str, float], str]:
+    income = _data(await client.get_income_statement(ticker))
+    if income is None:
+        raise ScreeningError("no income statement")
+
+    prior = None
+    if income.get("year") and income.get("season"):
+        prior = _data(
+            await client.get_income_statement(
+                ticker, year=int(income["year"]) - 1, season=int(income["season"])
+            )
+        )
+    balance, revenue, valuation, profile = await asyncio.gather(
+        client.get_balance_sheet(ticker),
+        client.get_monthly_revenue(ticker),
+        client.get_valuation_ratios(ticker),
+        client.get_company_profile(ticker),
+    )
+    metrics = compute_metrics(
+        {
+            "income": income,
+            "prior_income": prior,
+            "balance": _data(balance),
+            "monthly_revenue": _data(revenue),
+            "valuation": _data(valuation),
+        }
+    )
+    return metrics, str((_data(profile) or {}).get("industry", ""))
+
+
+def _data(response: Any) -> dict[str, Any] | None:
+    """MCP 回應的 data；失敗時回傳 None"""
+    if not isinstance(response, dict) or response.get("success") is False or "error" in response:
+        return None
+    data = response.get("data", response)
+    return data if isinstance(data, dict) else None
+
+
+def load_universe(path: str) -> list[str]:
+    """讀取股票池檔案（JSON 列表或每行一個代號，# 開頭為註解）"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        tickers = json.loads(text)
+    except json.JSONDecodeError:
+        tickers = [line.split("#")[0] for line in text.splitlines()]
+    return sorted({str(t).strip().upper() for t in tickers if str(t).strip()})
+
+
+async def _build_from_cli(args: argparse.Namespace) -> None:
+    universe_path = args.universe or os.getenv("SCREENING_UNIVERSE")
+    if universe_path:
+        tickers = load_universe(universe_path)
+    else:
+        from service.fundamentals_warmup_service import fundamentals_warmup_service
+
+        tickers = await fundamentals_warmup_service.collect_tickers()
+    if not tickers:
+        raise ScreeningError("Empty universe (set SCREENING_UNIVERSE or pass --universe)")
+
+    index = await build_screening_index(tickers, concurrency=args.concurrency)
+    index.save(args.output)
+    logger.info(f"Screening index saved to {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the fundamental screening index")
+    parser.add_argument("--universe", help="ticker list file (JSON list or one per line)")
+    parser.add_argument("--output", default=os.getenv("SCREENING_INDEX_PATH", DEFAULT_INDEX_PATH))
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    asyncio.run(_build_from_cli(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
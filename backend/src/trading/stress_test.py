@@ -0,0 +1,399 @@
+"""
+投資組合壓力測試引擎
+
+- 蒙地卡羅：以 RiskEngine 的日報酬共變異數（Cholesky 分解）產生相關的常態報酬，
+  一次以陣列運算模擬整批路徑 (paths × days × tickers)，回傳損失分布、尾端分位數與最差路徑。
+  依批次執行並受時間預算限制：每個批次（含第一個）開始前檢查剩餘預算，批次大小依實測速度
+  調整為剩餘時間內可完成的路徑數，超過預算時以已完成的路徑回答（truncated=True）。
+  路徑數、天數與單一批次的陣列大小皆有上限。
+- 歷史危機重播：以本機價格檔（與 CASUAL_MARKET_DATA 相同的錄製 K 線格式）
+  重播 2008、2020 等期間各持股的價格變化；檔案中沒有的持股以其他股票的平均表現代替。
+- 近期收盤價（recent_closes）：風險工具的共變異數、波動率與 Beta 一律由伺服器端的本機價格檔
+  取得，不使用 LLM 傳入的價格序列。
+
+損失以正值表示（同 VaR）；危機重播的 portfolio_loss 沿用 perform_stress_test 的損益符號（負值為虧損）。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from common.logger import logger
+from trading.risk_engine import CovarianceEstimate, RiskEngineError
+
+DEFAULT_PATHS = 10_000
+DEFAULT_HORIZON_DAYS = 20
+DEFAULT_SEED = 42
+# 工具呼叫可接受的模擬時間（秒）
+DEFAULT_TIME_BUDGET = 2.0
+MAX_PATHS = 200_000
+# 約一年的交易日
+MAX_HORIZON_DAYS = 250
+BATCH_PATHS = 2_000
+# 第一個批次（量測速度用）的路徑數
+PROBE_PATHS = 100
+# 單一批次亂數陣列 (paths × days × tickers) 的元素上限，約 16 MB
+MAX_BATCH_VALUES = 2_000_000
+TAIL_PERCENTILES = (90.0, 95.0, 99.0, 99.9)
+# recent_closes 預設回傳的收盤價筆數（約一年的交易日報酬）
+HISTORY_LOOKBACK_DAYS = 251
+# recent_closes(market=True) 中大盤代理（價格檔全部股票的等權平均）的鍵
+MARKET_PROXY = "__market__"
+
+# 歷史危機期間（名稱, 起日, 迄日）：以台股加權指數高點至低點為準
+CRISIS_WINDOWS: dict[str, tuple[str, date, date]] = {
+    "2008": ("2008 金融海嘯", date(2008, 5, 20), date(2008, 11, 21)),
+    "2020": ("2020 新冠疫情崩跌", date(2020, 1, 20), date(2020, 3, 19)),
+}
+
+
+@dataclass
+class MonteCarloResult:
+    """蒙地卡羅壓力測試結果（金額，損失為正值）"""
+
+    requested_paths: int
+    completed_paths: int
+    horizon_days: int
+    seed: int
+    portfolio_value: float
+    mean_loss: float
+    probability_of_loss: float
+    # {分位數: 損失}，例如 {"p99": 123456.0}
+    tail_losses: dict[str, float]
+    # 各信賴水準的 CVaR（超過分位數的平均損失）
+    expected_shortfall: dict[str, float]
+    # 損失分布直方圖：邊界與各區間路徑數
+    histogram: dict[str, list[float]]
+    # 最差路徑：{"path": 序號, "loss": 期末損失, "values": 每日組合價值}
+    worst_paths: list[dict[str, Any]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    truncated: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requested_paths": self.requested_paths,
+            "completed_paths": self.completed_paths,
+            "horizon_days": self.horizon_days,
+            "seed": self.seed,
+            "portfolio_value": self.portfolio_value,
+            "mean_loss": self.mean_loss,
+            "probability_of_loss": self.probability_of_loss,
+            "tail_losses": self.tail_losses,
+            "expected_shortfall": self.expected_shortfall,
+            "histogram": self.histogram,
+            "worst_paths": self.worst_paths,
+            "elapsed_ms": self.elapsed_ms,
+            "truncated": self.truncated,
+        }
+
+
+def monte_carlo(
+    estimate: CovarianceEstimate,
+    position_values: Mapping[str, float],
+    paths: int = DEFAULT_PATHS,
+    horizon_days: int = DEFAULT_HORIZON_DAYS,
+    seed: int = DEFAULT_SEED,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    worst: int = 5,
+    bins: int = 20,
+) -> MonteCarloResult:
+    """
+    模擬相關報酬路徑下的組合損失分布
+
+    Args:
+        estimate: RiskEngine.estimate() 的結果（提供平均報酬與共變異數）
+        position_values: {股票代號: 部位市值}
+        paths: 模擬路徑數（上限 MAX_PATHS）
+        horizon_days: 每條路徑的交易日數（上限 MAX_HORIZON_DAYS）
+        seed: 亂數種子（相同種子與完成路徑數得到相同結果）
+        time_budget: 時間預算（秒），包含第一個批次
+        worst: 回傳的最差路徑數
+        bins: 損失分布直方圖的區間數
+
+    Raises:
+        RiskEngineError: 參數無效，或時間預算內無法完成任何路徑
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+    if paths < 1 or horizon_days < 1:
+        raise RiskEngineError("paths and horizon_days must be at least 1")
+    missing = set(position_values) - set(estimate.tickers)
+    if missing:
+        raise RiskEngineError(f"No price history for: {', '.join(sorted(missing))}")
+
+    paths = min(paths, MAX_PATHS)
+    horizon_days = min(horizon_days, MAX_HORIZON_DAYS)
+    values = np.array([float(position_values.get(t, 0.0)) for t in estimate.tickers])
+    portfolio_value = float(values.sum())
+    factor = _cholesky(estimate.covariance)
+    rng = np.random.default_rng(seed)
+    batch_limit = max(1, min(BATCH_PATHS, MAX_BATCH_VALUES // (horizon_days * len(values))))
+
+    losses: list[np.ndarray] = []
+    worst_losses = np.empty(0)
+    worst_values = np.empty((0, horizon_days + 1))
+    worst_index = np.empty(0, dtype=np.int64)
+    completed = 0
+    seconds_per_path = 0.0
+
+    while completed < paths:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        if completed:
+            # 只排入剩餘預算內可完成的路徑數
+            size = min(batch_limit, paths - completed, int(remaining / seconds_per_path))
+            if size < 1:
+                break
+        else:
+            size = min(PROBE_PATHS, batch_limit, paths)
+        batch_started = time.perf_counter()
+
+        # (size, days, tickers) 相關日報酬 → 各股票累積價值 → 組合價值路徑
+        shocks = rng.standard_normal((size, horizon_days, len(values)))
+        returns = estimate.mean + shocks @ factor.T
+        growth = np.cumprod(1 + returns, axis=1)
+        portfolio_paths = np.concatenate(
+            [np.full((size, 1), portfolio_value), growth @ values], axis=1
+        )
+        batch_losses = portfolio_value - portfolio_paths[:, -1]
+        losses.append(batch_losses)
+
+        # 只保留目前最差的 worst 條路徑
+        candidate = np.argsort(batch_losses)[-worst:] if worst else np.empty(0, dtype=np.int64)
+        worst_losses = np.concatenate([worst_losses, batch_losses[candidate]])
+        worst_values = np.concatenate([worst_values, portfolio_paths[candidate]])
+        worst_index = np.concatenate([worst_index, candidate + completed])
+        keep = np.argsort(worst_losses)[::-1][:worst]
+        worst_losses, worst_values, worst_index = (
+            worst_losses[keep],
+            worst_values[keep],
+            worst_index[keep],
+        )
+
+        completed += size
+        seconds_per_path = max((time.perf_counter() - batch_started) / size, 1e-9)
+
+    if not completed:
+        raise RiskEngineError(f"Time budget {time_budget:.2f}s is too small to simulate any path")
+    all_losses = np.concatenate(losses)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    truncated = completed < paths
+    if truncated:
+        logger.warning(
+            f"Monte Carlo stopped at {completed}/{paths} paths (time budget {time_budget:.2f}s)"
+        )
+
+    tail_losses = {
+        _percentile_key(p): float(np.percentile(all_losses, p)) for p in TAIL_PERCENTILES
+    }
+    expected_shortfall = {
+        key: float(all_losses[all_losses >= threshold].mean())
+        for key, threshold in tail_losses.items()
+    }
+    counts, edges = np.histogram(all_losses, bins=bins)
+
+    return MonteCarloResult(
+        requested_paths=paths,
+        completed_paths=completed,
+        horizon_days=horizon_days,
+        seed=seed,
+        portfolio_value=portfolio_value,
+        mean_loss=float(all_losses.mean()),
+        probability_of_loss=float((all_losses > 0).mean()),
+        tail_losses=tail_losses,
+        expected_shortfall=expected_shortfall,
+        histogram={
+            "edges": [round(float(e), 2) for e in edges],
+            "counts": [int(c) for c in counts],
+        },
+        worst_paths=[
+            {
+                "path": int(index),
+                "loss": float(loss),
+                "values": [round(float(v), 2) for v in path],
+            }
+            for index, loss, path in zip(worst_index, worst_losses, worst_values, strict=True)
+        ],
+        elapsed_ms=round(elapsed_ms, 2),
+        truncated=truncated,
+    )
+
+
+# ==========================================
+# Historical Crisis Replay
+# ==========================================
+
+
+def crisis_replay(
+    position_values: Mapping[str, float],
+    prices: Mapping[str, Mapping[date, float]],
+    window: str,
+) -> dict[str, Any]:
+    """
+    重播歷史危機期間的價格變化
+
+    Args:
+        position_values: {股票代號: 部位市值}
+        prices: {股票代號: {日期: 收盤價}}（例如 load_price_history 的結果）
+        window: CRISIS_WINDOWS 的鍵（"2008"、"2020"）
+
+    Returns:
+        {"scenario", "window", "portfolio_loss", "max_loss", "trough_date",
+         "affected_positions", "proxied_tickers", "days"}；損益為負值表示虧損
+    """
+    if window not in CRISIS_WINDOWS:
+        raise RiskEngineError(
+            f"Unknown crisis window: {window} (available: {', '.join(CRISIS_WINDOWS)})"
+        )
+    name, start, end = CRISIS_WINDOWS[window]
+
+    days = sorted({d for series in prices.values() for d in series if start <= d <= end})
+    relative: dict[str, np.ndarray] = {}
+    for ticker, series in prices.items():
+        closes = _forward_fill([series.get(d) for d in days])
+        if closes is not None:
+            relative[ticker] = closes / closes[0]
+    if not relative:
+        raise RiskEngineError(f"No local price data between {start} and {end}")
+
+    proxy = np.mean(list(relative.values()), axis=0)
+    proxied = sorted(t for t in position_values if t not in relative)
+    pnl_paths = {
+        ticker: float(value) * (relative.get(ticker, proxy) - 1)
+        for ticker, value in position_values.items()
+    }
+    portfolio_pnl = np.sum(list(pnl_paths.values()), axis=0)
+    trough = int(np.argmin(portfolio_pnl))
+
+    return {
+        "scenario": name,
+        "window": {"start": days[0].isoformat(), "end": days[-1].isoformat()},
+        "portfolio_loss": float(portfolio_pnl[-1]),
+        "max_loss": float(portfolio_pnl[trough]),
+        "trough_date": days[trough].isoformat(),
+        "affected_positions": [
+            {"ticker": ticker, "loss": float(path[-1])} for ticker, path in pnl_paths.items()
+        ],
+        "proxied_tickers": proxied,
+        "days": len(days),
+    }
+
+
+def load_price_history(path: str | None = None) -> dict[str, dict[date, float]]:
+    """
+    讀取本機價格檔（錄製 K 線格式，預設為 CASUAL_MARKET_DATA）
+
+    檔案變更時（修改時間不同）重新讀取。
+    """
+    path = path or os.getenv("CASUAL_MARKET_DATA")
+    if not path:
+        raise RiskEngineError("No local price data configured (set CASUAL_MARKET_DATA)")
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError as e:
+        raise RiskEngineError(f"Cannot read local price data: {e}") from e
+    return _load_price_file(path, mtime)
+
+
+def recent_closes(
+    tickers: Iterable[str],
+    as_of: date | None = None,
+    lookback: int = HISTORY_LOOKBACK_DAYS,
+    market: bool = False,
+    path: str | None = None,
+) -> dict[str, list[float]]:
+    """
+    本機價格檔中各股票的近期收盤價（依日期對齊，可直接交給 RiskEngine.estimate）
+
+    Args:
+        tickers: 股票代號；價格檔中沒有的股票略過
+        as_of: 只使用此日（含）以前的價格（回測時避免看到未來資料），預設為全部
+        lookback: 最多回傳的收盤價筆數
+        market: 是否加入 MARKET_PROXY（價格檔全部股票的等權平均，用於估計 Beta）
+        path: 價格檔路徑（預設 CASUAL_MARKET_DATA）
+
+    Returns:
+        {股票代號: 收盤價列表}，各列表長度相同；缺漏日以前一日收盤價補齊
+
+    Raises:
+        RiskEngineError: 未設定或無法讀取價格檔
+    """
+    prices = {
+        ticker: {d: c for d, c in series.items() if as_of is None or d <= as_of}
+        for ticker, series in load_price_history(path).items()
+    }
+    series = {t: prices[t] for t in dict.fromkeys(map(str, tickers)) if prices.get(t)}
+    if not series:
+        return {}
+    # 共同區間：所有股票都已有價格的日期
+    start = max(min(s) for s in series.values())
+    days = sorted({d for s in series.values() for d in s if d >= start})[-lookback:]
+    closes = {ticker: _closes_on(s, days) for ticker, s in series.items()}
+
+    if market:
+        relative = [
+            filled / filled[0]
+            for filled in (_closes_on(s, days) for s in prices.values() if s and min(s) <= days[0])
+        ]
+        closes[MARKET_PROXY] = np.mean(relative, axis=0)
+    return {ticker: values.tolist() for ticker, values in closes.items()}
+
+
+def _closes_on(series: Mapping[date, float], days: list[date]) -> np.ndarray:
+    """指定日期的收盤價；缺漏日沿用前一筆（含區間開始前的最後一筆）"""
+    before = [d for d in series if d < days[0]]
+    last = series[max(before)] if before else None
+    closes = []
+    for day in days:
+        last = series.get(day, last)
+        closes.append(last)
+    return _forward_fill(closes)
+
+
+@lru_cache(maxsize=4)
+def _load_price_file(path: str, mtime: float) -> dict[str, dict[date, float]]:
+    with open(path, encoding="utf-8") as f:
+        recorded = json.load(f)
+    return {
+        str(ticker): {
+            date.fromisoformat(str(bar["date"])[:10]): float(bar["close"])
+            for bar in entry.get("bars", [])
+        }
+        for ticker, entry in recorded.items()
+    }
+
+
+def _forward_fill(closes: list[float | None]) -> np.ndarray | None:
+    """以前一日收盤價補齊缺漏；期間內沒有任何價格時回傳 None"""
+    first = next((c for c in closes if c is not None), None)
+    if first is None:
+        return None
+    filled = []
+    last = first
+    for close in closes:
+        last = close if close is not None else last
+        filled.append(last)
+    return np.array(filled, dtype=np.float64)
+
+
+def _cholesky(covariance: np.ndarray) -> np.ndarray:
+    """共變異數矩陣的下三角分解；非正定時（例如完全相關）改用特徵值分解"""
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def _percentile_key(percentile: float) -> str:
+    return f"p{percentile:g}".replace(".", "_")
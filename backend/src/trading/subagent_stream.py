@@ -0,0 +1,94 @@
+"""
+Sub-agent 串流事件轉送
+
+uv.lock 鎖定的 Agents SDK（0.4.x）的 Agent.as_tool 沒有 on_stream，sub-agent 的進度改以
+RunHooks（as_tool 的 hooks 參數，新舊版本皆支援）轉送給 RunStreamBatcher：
+- on_agent_start → agent_updated
+- on_llm_end → text（sub-agent 不以串流執行，為每次模型回應的完整文字）
+- on_tool_start / on_tool_end → tool_started / tool_finished
+
+主 Agent 呼叫 sub-agent 的 tool call ID 由 relay_subagent_tool 在呼叫期間放入 ContextVar，
+sub-agent 的 Runner.run 與其 hooks 都在該 context 中執行，事件因此帶有 parent_call_id。
+批次器於每次執行時才決定（sink_getter），工具只需在初始化時建立一次。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from agents import FunctionTool, RunHooks
+
+from .run_stream import RunStreamBatcher, tool_finished_event
+
+SinkGetter = Callable[[], RunStreamBatcher | None]
+
+_parent_call_id: ContextVar[str | None] = ContextVar("subagent_parent_call_id", default=None)
+
+
+def _response_text(response: Any) -> str:
+    """取出模型回應中的訊息文字"""
+    parts = []
+    for item in getattr(response, "output", None) or []:
+        if getattr(item, "type", None) != "message":
+            continue
+        for content in getattr(item, "content", None) or []:
+            if getattr(content, "type", None) == "output_text":
+                parts.append(content.text)
+    return "".join(parts)
+
+
+class SubagentStreamHooks(RunHooks):
+    """將 sub-agent 的生命週期事件轉為推送格式（未啟用串流時略過）"""
+
+    def __init__(self, sink_getter: SinkGetter):
+        self._sink_getter = sink_getter
+
+    def _emit(self, event: dict[str, Any]) -> None:
+        sink = self._sink_getter()
+        if sink is not None:
+            sink.handle_subagent_update(event, parent_call_id=_parent_call_id.get())
+
+    async def on_agent_start(self, context, agent) -> None:
+        self._emit({"kind": "agent_updated", "agent": agent.name})
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        text = _response_text(response)
+        if text:
+            self._emit({"kind": "text", "agent": agent.name, "delta": text})
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        self._emit(
+            {
+                "kind": "tool_started",
+                "agent": agent.name,
+                "tool": getattr(tool, "name", None),
+                "call_id": getattr(context, "tool_call_id", None),
+            }
+        )
+
+    async def on_tool_end(self, context, agent, tool, result) -> None:
+        self._emit(tool_finished_event(agent.name, getattr(context, "tool_call_id", None), result))
+
+
+def relay_subagent_tool(tool: FunctionTool | None) -> FunctionTool | None:
+    """
+    包裝 as_tool 產生的工具，呼叫期間記錄主 Agent 的 tool call ID
+
+    Returns:
+        同一個工具物件（tool 為 None 時回傳 None）
+    """
+    if tool is None:
+        return None
+    invoke = tool.on_invoke_tool
+
+    async def on_invoke_tool(context, arguments):
+        token = _parent_call_id.set(getattr(context, "tool_call_id", None))
+        try:
+            return await invoke(context, arguments)
+        finally:
+            _parent_call_id.reset(token)
+
+    tool.on_invoke_tool = on_invoke_tool
+    return tool
@@ -0,0 +1,286 @@
+"""
+Agent 配置參數掃描
+
+在部署 Agent 前，以回測引擎評估多組配置（最大持倉比例、手續費假設、再平衡頻率）：
+- 網格：`build_grid` 由基準 AgentConfig 展開所有參數組合
+- 平行：以 ProcessPoolExecutor 執行，每個組合為一次 `BacktestEngine.run`
+- 價格：收盤價寫入暫存 .npy 檔，各工作程序以記憶體映射開啟並只載入一次，
+  任務本身只傳遞配置，不需每次序列化整段價格歷史
+- 排名：報酬率、最大回撤、Sharpe 等指標由 `BacktestResult.summary` 計算（同 AgentsService）
+
+策略以「策略工廠」傳入（無參數、回傳決策函式，例如
+`functools.partial(moving_average_crossover, ["2330"])`），必須可被 pickle。
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import itertools
+import math
+import os
+import tempfile
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+
+from common.logger import logger
+from trading.backtest import (
+    BacktestEngine,
+    BacktestError,
+    BacktestLedger,
+    Decision,
+    DecisionFunction,
+    MarketDay,
+    PriceHistory,
+)
+from trading.config import AgentConfig
+from trading.tools.trading_tools import COMMISSION_RATE
+
+# 策略工廠：在工作程序中建立決策函式（需可 pickle）
+StrategyFactory = Callable[[], DecisionFunction]
+
+# 可用於排名的指標與方向（True 表示越大越好）
+RANK_METRICS = {
+    "sharpe_ratio": True,
+    "sortino_ratio": True,
+    "calmar_ratio": True,
+    "total_return": True,
+    "max_drawdown": False,
+}
+
+SHARES_PER_LOT = 1000
+
+
+@dataclass(frozen=True)
+class SweepCase:
+    """單一參數組合"""
+
+    config: AgentConfig
+    commission_rate: float = COMMISSION_RATE
+    # 每隔幾個交易日執行一次決策（1 表示每日）
+    rebalance_days: int = 1
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {
+            "max_position_size": self.config.max_position_size,
+            "commission_rate": self.commission_rate,
+            "rebalance_days": self.rebalance_days,
+        }
+
+
+@dataclass
+class SweepResult:
+    """單一參數組合的回測結果"""
+
+    case: SweepCase
+    summary: dict[str, Any] = field(default_factory=dict)
+    rank: int = 0
+
+    def to_row(self) -> dict[str, Any]:
+        """排名表的一列"""
+        summary = self.summary
+        return {
+            "rank": self.rank,
+            **self.case.params,
+            "total_return": summary.get("total_return"),
+            "max_drawdown": summary.get("max_drawdown"),
+            "sharpe_ratio": summary.get("sharpe_ratio"),
+            "sortino_ratio": summary.get("sortino_ratio"),
+            "calmar_ratio": summary.get("calmar_ratio"),
+            "win_rate": summary.get("win_rate"),
+            "total_trades": summary.get("total_trades"),
+            "rejected_decisions": summary.get("rejected_decisions"),
+        }
+
+
+def build_grid(
+    base: AgentConfig,
+    max_position_sizes: Iterable[int] | None = None,
+    commission_rates: Iterable[float] | None = None,
+    rebalance_days: Iterable[int] | None = None,
+) -> list[SweepCase]:
+    """
+    由基準配置展開參數網格
+
+    未指定的維度沿用基準配置（手續費沿用實盤 0.1425%，每日再平衡）。
+    """
+    sizes = list(max_position_sizes or [base.max_position_size])
+    rates = list(commission_rates or [COMMISSION_RATE])
+    periods = list(rebalance_days or [1])
+
+    for size in sizes:
+        if not 0 < size <= 100:
+            raise BacktestError(f"max_position_size must be in (0, 100]: {size}")
+    for period in periods:
+        if period < 1:
+            raise BacktestError(f"rebalance_days must be at least 1: {period}")
+
+    return [
+        SweepCase(
+            config=dataclasses.replace(base, max_position_size=size),
+            commission_rate=rate,
+            rebalance_days=period,
+        )
+        for size, rate, period in itertools.product(sizes, rates, periods)
+    ]
+
+
+def apply_case_limits(decide: DecisionFunction, case: SweepCase) -> DecisionFunction:
+    """
+    以配置限制包裝決策函式
+
+    - 再平衡頻率：僅在第 0、rebalance_days、2 × rebalance_days ... 個交易日呼叫決策函式
+    - 最大持倉比例：買進後單一股票市值不超過總資產的 max_position_size%，
+      超過時向下調整為整張，不足一張則略過該筆買進
+    """
+    limit = case.config.max_position_size / 100
+
+    def limited(day: MarketDay, ledger: BacktestLedger) -> list[Decision]:
+        if day.index % case.rebalance_days:
+            return []
+
+        prices = {ticker: price for ticker in ledger.holdings if (price := day.close(ticker))}
+        total_value = ledger.cash + ledger.market_value(prices)
+
+        decisions = []
+        for decision in decide(day, ledger) or ():
+            if decision.action.upper() != "BUY":
+                decisions.append(decision)
+                continue
+
+            price = decision.price if decision.price is not None else day.close(decision.ticker)
+            if not price:
+                decisions.append(decision)
+                continue
+
+            position = ledger.holdings.get(decision.ticker)
+            held_value = position.quantity * price if position else 0.0
+            room = total_value * limit - held_value
+            max_quantity = int(room // (price * SHARES_PER_LOT)) * SHARES_PER_LOT
+            if max_quantity <= 0:
+                continue
+            if decision.quantity > max_quantity:
+                decision = dataclasses.replace(decision, quantity=max_quantity)
+            decisions.append(decision)
+        return decisions
+
+    return limited
+
+
+def rank_results(
+    results: Sequence[SweepResult], rank_by: str = "sharpe_ratio"
+) -> list[SweepResult]:
+    """
+    依指標排名（無法計算的指標排在最後，同分時以總報酬率決定）
+    """
+    if rank_by not in RANK_METRICS:
+        raise BacktestError(f"Unsupported rank metric: {rank_by}")
+    descending = RANK_METRICS[rank_by]
+
+    def key(result: SweepResult) -> tuple:
+        value = result.summary.get(rank_by)
+        total_return = result.summary.get("total_return") or Decimal("0")
+        if value is None:
+            return (1, Decimal("0"), -total_return)
+        return (0, -value if descending else value, -total_return)
+
+    ranked = sorted(results, key=key)
+    for position, result in enumerate(ranked, start=1):
+        result.rank = position
+    return ranked
+
+
+def run_sweep(
+    prices: Mapping[str, Mapping[date, float]] | PriceHistory,
+    cases: Sequence[SweepCase],
+    strategy_factory: StrategyFactory,
+    rank_by: str = "sharpe_ratio",
+    max_workers: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    平行執行參數掃描
+
+    Args:
+        prices: {股票代號: {日期: 收盤價}} 或已建立的 PriceHistory
+        cases: 參數組合（通常由 build_grid 產生）
+        strategy_factory: 可 pickle 的策略工廠
+        rank_by: 排名指標（見 RANK_METRICS）
+        max_workers: 工作程序數；1 表示在目前程序依序執行
+
+    Returns:
+        依排名排序的結果表（每列含參數與績效指標）
+    """
+    if not cases:
+        raise BacktestError("Sweep grid is empty")
+    if rank_by not in RANK_METRICS:
+        raise BacktestError(f"Unsupported rank metric: {rank_by}")
+
+    history = prices if isinstance(prices, PriceHistory) else PriceHistory(prices)
+    tickers = list(history.closes)
+    matrix = np.array(
+        [[np.nan if v is None else v for v in history.closes[t]] for t in tickers],
+        dtype=np.float64,
+    )
+
+    workers = max_workers or min(len(cases), os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory(prefix="casualtrader-sweep-") as tmp:
+        path = os.path.join(tmp, "closes.npy")
+        np.save(path, matrix)
+        worker_args = (path, tickers, history.dates, strategy_factory)
+
+        if workers == 1:
+            _init_worker(*worker_args)
+            summaries = [_run_case(case) for case in cases]
+        else:
+            chunksize = max(1, math.ceil(len(cases) / (workers * 4)))
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=worker_args
+            ) as pool:
+                summaries = list(pool.map(_run_case, cases, chunksize=chunksize))
+
+    results = [
+        SweepResult(case=case, summary=summary)
+        for case, summary in zip(cases, summaries, strict=True)
+    ]
+    ranked = rank_results(results, rank_by)
+    logger.info(
+        f"Parameter sweep finished: {len(cases)} cases x {len(history.dates)} days "
+        f"on {workers} worker(s), best {rank_by}={ranked[0].summary.get(rank_by)}"
+    )
+    return [result.to_row() for result in ranked]
+
+
+# ==========================================
+# Worker
+# ==========================================
+
+# 工作程序狀態（由 _init_worker 在每個程序建立一次）
+_worker_engine: BacktestEngine | None = None
+_worker_strategy_factory: StrategyFactory | None = None
+
+
+def _init_worker(
+    path: str, tickers: list[str], dates: list[date], strategy_factory: StrategyFactory
+) -> None:
+    """以記憶體映射開啟價格矩陣並建立回測引擎"""
+    global _worker_engine, _worker_strategy_factory
+    matrix = np.load(path, mmap_mode="r")
+    _worker_engine = BacktestEngine(PriceHistory.from_matrix(tickers, dates, matrix))
+    _worker_strategy_factory = strategy_factory
+
+
+def _run_case(case: SweepCase) -> dict[str, Any]:
+    """執行單一參數組合並回傳績效摘要"""
+    decide = apply_case_limits(_worker_strategy_factory(), case)
+    result = _worker_engine.run(
+        {case.config.name: decide},
+        initial_funds=case.config.initial_funds,
+        commission_rate=case.commission_rate,
+    )[case.config.name]
+    return result.summary()
@@ -1,10 +1,18 @@
 """Analysis tools package."""
 
-from .fundamental_agent import get_fundamental_agent
-from .risk_agent import get_risk_agent
-from .sentiment_agent import get_sentiment_agent
-from .technical_agent import get_technical_agent
-from .trading_tools import execute_trade_atomic, create_trading_tools
+from __future__ import annotations
+
+import importlib
+
+# 子 Agent 模組會載入 Agents SDK 與 LiteLLM，第一次使用時才導入
+_LAZY_EXPORTS = {
+    "get_fundamental_agent": ".fundamental_agent",
+    "get_technical_agent": ".technical_agent",
+    "get_risk_agent": ".risk_agent",
+    "get_sentiment_agent": ".sentiment_agent",
+    "execute_trade_atomic": ".trading_tools",
+    "create_trading_tools": ".trading_tools",
+}
 
 __all__ = [
     "get_fundamental_agent",
@@ -14,3 +22,11 @@ __all__ = [
     "execute_trade_atomic",
     "create_trading_tools",
 ]
+
+
+def __getattr__(name: str):
+    """延遲導入子 Agent 與交易工具"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
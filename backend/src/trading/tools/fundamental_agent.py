@@ -97,6 +97,10 @@ def fundamental_agent_instructions() -> str:
   - 新鮮（≤7 天）→ 增量更新
   - 陳舊（>7 天）→ 完整重新分析 + 對比
 
+**選股（需要候選名單時）** → screen_stocks
+  - 以全市場篩選索引一次取得候選，例如 filters="pe < 15, roe > 12%, revenue_growth > 10%"、sort_by="dividend_yield"
+  - 只對入選的股票進行後續逐檔分析
+
 **步驟 1-3：數據收集與分析** → casual_market_mcp + tools
   1. 收集財務數據
   2. 分析財務健全性 → analyze_financial_health
@@ -113,6 +117,7 @@ def fundamental_agent_instructions() -> str:
 
 ## 工具調用
 
+- **screen_stocks** → 全市場條件篩選（毫秒級，比率以小數或百分比表示）
 - **calculate_financial_ratios** → 計算所有財務指標
 - **analyze_financial_health** → 評估財務體質（0-100分）
 - **evaluate_valuation** → 判斷估值水準（便宜/合理/昂貴）
@@ -134,6 +139,63 @@ def fundamental_agent_instructions() -> str:
 """
 
 
+@function_tool(strict_mode=False)
+def screen_stocks(
+    filters: Any = None,
+    sort_by: str = None,
+    descending: bool = True,
+    limit: int = 20,
+) -> dict:
+    """全市場基本面篩選
+
+    以預先建立的篩選索引一次篩選整個股票池，不需逐檔呼叫財務分析工具。
+
+    **可選參數：**
+        filters: 篩選條件，字串或列表 [可選]
+            例如 "pe_ratio < 15, roe > 12%, revenue_growth > 10%"
+            或 [{"field": "roe", "op": ">", "value": 0.12}, "industry == 半導體業"]
+            欄位：pe_ratio, pb_ratio, dividend_yield, roe, roa, gross_margin,
+            operating_margin, net_margin, debt_ratio, current_ratio, revenue_growth,
+            eps, eps_growth, industry；比率以小數表示（或加 % 的百分比）
+        sort_by: 排序欄位 (例如: "dividend_yield") [可選]
+        descending: 是否由大到小排序，預設 True [可選]
+        limit: 回傳筆數，預設 20 [可選]
+
+    Returns:
+        dict: 篩選結果
+            {
+                "matched": int,          # 符合條件的股票數
+                "count": int,            # 回傳筆數
+                "results": list[dict],   # 各股票的指標
+                "universe": int,         # 索引的股票數
+                "built_at": str          # 索引建立時間
+            }
+    """
+    from trading.screening import ScreeningError, get_screening_index, screen
+
+    try:
+        params = parse_tool_params(
+            filters=filters, sort_by=sort_by, descending=descending, limit=limit
+        )
+        result = screen(
+            get_screening_index(),
+            filters=params.get("filters"),
+            sort_by=params.get("sort_by"),
+            descending=params.get("descending", True) is not False,
+            limit=int(params.get("limit") or 20),
+        )
+        logger.info(
+            f"篩選完成 | 條件: {result['conditions']} | 符合: {result['matched']}/{result['universe']}"
+        )
+        return result
+    except ScreeningError as e:
+        logger.warning(f"篩選失敗: {e}")
+        return {"error": str(e), "matched": 0, "count": 0, "results": []}
+    except Exception as e:
+        logger.error(f"篩選失敗: {e}", exc_info=True)
+        return {"error": str(e), "matched": 0, "count": 0, "results": []}
+
+
 @function_tool(strict_mode=False)
 def calculate_financial_ratios(
     ticker: str,
@@ -780,6 +842,7 @@ async def get_fundamental_agent(
 
     logger.debug("Creating custom tools with function_tool")
     all_tools = [
+        screen_stocks,
         calculate_financial_ratios,
         analyze_financial_health,
         evaluate_valuation,
@@ -5,10 +5,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import json
 from typing import Any
-from datetime import datetime
+from datetime import date, datetime
 
 from dotenv import load_dotenv
 
@@ -16,11 +17,17 @@ from agents import Agent, function_tool, ModelSettings
 from agents.extensions.models.litellm_model import LitellmModel
 
 from common.logger import logger
+from trading import stress_test
+from trading.risk_engine import DEFAULT_CONFIDENCE, RiskEngineError, get_risk_engine
 
 load_dotenv()
 
 DEFAULT_MODEL = os.getenv("DEFAULT_AI_MODEL", "gpt-5-mini")
 DEFAULT_MAX_TURNS = os.getenv("DEFAULT_MAX_TURNS", 30)
+# 蒙地卡羅壓力測試的時間上限（秒），確保工具呼叫在允許的延遲內回應
+STRESS_TEST_TIME_BUDGET = float(
+    os.getenv("STRESS_TEST_TIME_BUDGET", str(stress_test.DEFAULT_TIME_BUDGET))
+)
 
 
 # ==========================================
@@ -105,8 +112,8 @@ def risk_agent_instructions() -> str:
   3. 分析組合集中度 → analyze_portfolio_concentration
 
 **步驟 4-6：壓力測試與風險評級** → perplexity_mcp + tools
-  4. 計算整體組合風險 → calculate_portfolio_risk
-  5. 透過 perplexity_mcp 搜尋市場風險新聞、執行壓力測試 → perform_stress_test
+  4. 計算整體組合風險 → calculate_portfolio_risk（持股收盤價由系統載入，以共變異數計算 VaR/CVaR）
+  5. 透過 perplexity_mcp 搜尋市場風險新聞、執行壓力測試 → perform_stress_test（系統載入持股收盤價執行蒙地卡羅模擬，scenarios 可加入 "2008"、"2020" 歷史危機重播）
   6. 生成管理建議 → generate_risk_recommendations
 
 **步驟 7：對比與保存** → memory_mcp
@@ -138,20 +145,24 @@ def risk_agent_instructions() -> str:
 
 
 @function_tool(strict_mode=False)
-def calculate_position_risk(
+async def calculate_position_risk(
     ticker: str,
     position_data: dict = None,
     market_data: dict = None,
+    trading_day: str = None,
     **kwargs,
 ) -> str:
     """計算個別部位風險
 
+    未提供 market_data 時，由系統的本機價格資料估計波動率與 Beta（不接受傳入的價格序列）。
+
     **必要參數：**
         ticker: 股票代號 (例如: "2330") [必要]
 
     **可選參數：**
         position_data: 部位數據，包含 quantity, avg_cost, current_price [可選]
-        market_data: 市場數據，包含 volatility, beta，缺少時使用預設值 [可選]
+        market_data: 市場數據，包含 volatility, beta，缺少時以歷史價格估計或使用預設值 [可選]
+        trading_day: 資料所屬交易日 (YYYY-MM-DD)，只使用此日以前的價格 [可選]
         **kwargs: 額外參數（用於容錯）
 
     Returns:
@@ -165,7 +176,8 @@ def calculate_position_risk(
                 "beta": float,
                 "var_95": float,
                 "max_drawdown": float,
-                "risk_score": float
+                "risk_score": float,
+                "volatility_source": str    # provided/historical/default
             }
 
     Raises:
@@ -174,12 +186,17 @@ def calculate_position_risk(
     try:
         # 參數驗證和容錯
         params = parse_tool_params(
-            ticker=ticker, position_data=position_data, market_data=market_data, **kwargs
+            ticker=ticker,
+            position_data=position_data,
+            market_data=market_data,
+            trading_day=trading_day,
+            **kwargs,
         )
 
         _ticker = params.get("ticker") or ticker
         _position_data = params.get("position_data") or position_data
         _market_data = params.get("market_data") or market_data
+        _trading_day = params.get("trading_day") or trading_day
 
         # 驗證必要參數
         if not _ticker:
@@ -201,13 +218,10 @@ def calculate_position_risk(
             elif hasattr(_position_data, "model_dump"):
                 _position_data = _position_data.model_dump()
 
-        # 如果 market_data 為 None，使用預設值
+        # 如果 market_data 為 None，以本機歷史價格估計（無歷史價格時使用預設值）
         if not _market_data:
-            logger.warning("缺少 market_data 參數，使用預設值")
-            _market_data = {
-                "volatility": 0.25,
-                "beta": 1.0,
-            }
+            # 讀取價格檔與估計不佔用事件迴圈
+            _market_data = await asyncio.to_thread(_estimate_market_data, _ticker, _trading_day)
         elif not isinstance(_market_data, dict):
             # 如果是其他類型（如 Pydantic 模型），轉換為 dict
             if hasattr(_market_data, "dict"):
@@ -252,6 +266,7 @@ def calculate_position_risk(
             "var_95": var_95,
             "max_drawdown": max_drawdown,
             "risk_score": risk_score,
+            "volatility_source": _market_data.get("source", "provided"),
         }
 
     except Exception as e:
@@ -270,6 +285,48 @@ def calculate_position_risk(
         }
 
 
+def _trading_date(trading_day: str | None) -> date | None:
+    """解析 YYYY-MM-DD 交易日；格式錯誤時視為未提供"""
+    if not trading_day:
+        return None
+    try:
+        return datetime.strptime(str(trading_day)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        logger.warning(f"無法解析 trading_day: {trading_day}，使用最新價格")
+        return None
+
+
+def _load_closes(
+    tickers: Any, trading_day: str | None, market: bool = False
+) -> dict[str, list[float]]:
+    """由本機價格檔載入近期收盤價；未設定價格檔時回傳空 dict"""
+    try:
+        return stress_test.recent_closes(tickers, as_of=_trading_date(trading_day), market=market)
+    except RiskEngineError as e:
+        logger.warning(f"無法載入本機收盤價: {e}")
+        return {}
+
+
+def _estimate_market_data(ticker: str, trading_day: str | None) -> dict[str, Any]:
+    """以本機歷史收盤價估計年化波動率與 Beta（相對大盤代理）；資料不足時使用預設值（0.25 / 1.0）"""
+    market_data: dict[str, Any] = {"volatility": 0.25, "beta": 1.0, "source": "default"}
+    closes = _load_closes([ticker], trading_day, market=True)
+    if ticker not in closes:
+        logger.warning(f"缺少 market_data 且沒有 {ticker} 的本機價格，使用預設值")
+        return market_data
+
+    engine = get_risk_engine()
+    day = _trading_date(trading_day)
+    try:
+        estimate = engine.estimate({ticker: closes[ticker]}, day)
+        market_data["volatility"] = estimate.annualized_volatility()[ticker]
+        market_data["source"] = "historical"
+        market_data["beta"] = engine.beta(closes[ticker], closes[stress_test.MARKET_PROXY], day)
+    except RiskEngineError as e:
+        logger.warning(f"無法以歷史價格估計 {ticker} 波動率，使用預設值: {e}")
+    return market_data
+
+
 @function_tool(strict_mode=False)
 def analyze_portfolio_concentration(
     positions: list,
@@ -392,20 +449,27 @@ def analyze_portfolio_concentration(
 
 
 @function_tool(strict_mode=False)
-def calculate_portfolio_risk(
+async def calculate_portfolio_risk(
     position_risks: list,
     concentration_json: str = None,
     total_value: float = None,
+    trading_day: str = None,
     **kwargs,
 ) -> dict:
     """計算投資組合整體風險
 
+    系統有持股的本機收盤價時，以日報酬的共變異數矩陣計算組合 VaR（考慮相關性與分散效果），
+    並附上歷史模擬法 VaR 與 CVaR；否則加總個別部位 VaR 並以 HHI 集中度調整。
+    價格由伺服器端載入，不接受傳入的價格序列。
+
     **必要參數：**
-        position_risks: 部位風險列表 [必要]
+        position_risks: 部位風險列表（calculate_position_risk 的結果，含 ticker、position_value）[必要]
 
     **可選參數：**
         concentration_json: JSON 格式的集中度數據，缺少時使用預設值 [可選]
         total_value: 投資組合總價值，缺少時使用預設值 [可選]
+        trading_day: 資料所屬交易日 (YYYY-MM-DD)，只使用此日以前的價格；
+            同日重複呼叫會重用共變異數矩陣 [可選]
         **kwargs: 額外參數（用於容錯）
 
     Returns:
@@ -416,7 +480,17 @@ def calculate_portfolio_risk(
                 "total_var_95": float,
                 "max_portfolio_drawdown": float,
                 "correlation_adjustment": float,
-                "position_count": int
+                "position_count": int,
+                "var_method": str,          # covariance/sum
+                # 以下僅 var_method 為 covariance 時提供（VaR 為 1 日、95% 信賴水準）
+                "var_horizon_days": int,
+                "cvar_95": float,
+                "historical_var_95": float,
+                "historical_cvar_95": float,
+                "undiversified_var_95": float,
+                "component_var_95": dict,
+                "correlation_matrix": dict,
+                "observations": int
             }
 
     Raises:
@@ -428,12 +502,14 @@ def calculate_portfolio_risk(
             position_risks=position_risks,
             concentration_json=concentration_json,
             total_value=total_value,
+            trading_day=trading_day,
             **kwargs,
         )
 
         _position_risks = params.get("position_risks") or position_risks or []
         _concentration_json = params.get("concentration_json") or concentration_json
         _total_value = params.get("total_value") or total_value or 0
+        _trading_day = params.get("trading_day") or trading_day
 
         # 驗證參數
         if not _position_risks:
@@ -488,11 +564,21 @@ def calculate_portfolio_risk(
             else 50
         )
 
-        # 集中度調整
-        hhi = concentration_data.get("hhi", 0.1)
-        correlation_adjustment = 1 + (hhi - 0.1) * 0.5
+        # 讀取價格檔與矩陣運算不佔用事件迴圈
+        covariance_risk = await asyncio.to_thread(
+            _covariance_portfolio_risk, risks_list, _trading_day
+        )
+        if covariance_risk:
+            # 以共變異數 VaR 取代加總：分散效果（組合 VaR / 個別 VaR 加總）作為相關性調整
+            total_var_95 = covariance_risk["total_var_95"]
+            correlation_adjustment = covariance_risk.pop("diversification_ratio")
+            portfolio_max_drawdown = covariance_risk.pop("max_portfolio_drawdown")
+        else:
+            # 集中度調整
+            hhi = concentration_data.get("hhi", 0.1)
+            correlation_adjustment = 1 + (hhi - 0.1) * 0.5
+            portfolio_max_drawdown = total_var_95 * correlation_adjustment
 
-        portfolio_max_drawdown = total_var_95 * correlation_adjustment
         overall_risk_score = min(100, avg_risk_score * correlation_adjustment)
 
         # 判斷風險等級
@@ -517,6 +603,8 @@ def calculate_portfolio_risk(
             "max_portfolio_drawdown": portfolio_max_drawdown,
             "correlation_adjustment": correlation_adjustment,
             "position_count": len(risks_list),
+            "var_method": "covariance" if covariance_risk else "sum",
+            **(covariance_risk or {}),
         }
 
     except Exception as e:
@@ -532,19 +620,67 @@ def calculate_portfolio_risk(
         }
 
 
+def _covariance_portfolio_risk(
+    risks_list: list[dict], trading_day: str | None
+) -> dict[str, Any] | None:
+    """以共變異數矩陣計算組合 VaR；本機價格資料不足時回傳 None（改用加總法）"""
+    try:
+        position_values: dict[str, float] = {}
+        for risk in risks_list:
+            ticker = str(risk.get("ticker", ""))
+            value = float(risk.get("position_value") or 0)
+            if ticker and value:
+                position_values[ticker] = position_values.get(ticker, 0.0) + value
+        if not position_values:
+            return None
+
+        history = _load_closes(position_values, trading_day)
+        if not history:
+            return None
+        engine = get_risk_engine()
+        estimate = engine.estimate(history, _trading_date(trading_day))
+        var = engine.portfolio_var(estimate, position_values, DEFAULT_CONFIDENCE)
+    except (RiskEngineError, TypeError, ValueError, AttributeError) as e:
+        logger.warning(f"無法以共變異數計算組合 VaR，改用個別 VaR 加總: {e}")
+        return None
+
+    return {
+        "var_horizon_days": var.horizon_days,
+        "total_var_95": var.parametric_var,
+        "cvar_95": var.parametric_cvar,
+        "historical_var_95": var.historical_var,
+        "historical_cvar_95": var.historical_cvar,
+        "undiversified_var_95": var.undiversified_var,
+        "component_var_95": var.component_var,
+        "correlation_matrix": estimate.correlation_dict(),
+        "observations": estimate.observations,
+        "diversification_ratio": var.diversification_ratio,
+        "max_portfolio_drawdown": var.max_drawdown,
+    }
+
+
 @function_tool(strict_mode=False)
-def perform_stress_test(
+async def perform_stress_test(
     positions: list,
     scenarios: list = None,
+    simulation: dict = None,
+    trading_day: str = None,
     **kwargs,
 ) -> dict:
     """執行投資組合壓力測試
 
+    系統有持股的本機收盤價時另執行蒙地卡羅模擬（價格由伺服器端載入，不接受傳入的價格序列）。
+
     **必要參數：**
-        positions: 部位列表 [必要]
+        positions: 部位列表，每筆含 ticker、value [必要]
 
     **可選參數：**
         scenarios: 壓力測試情景列表，缺少時使用預設情景 [可選]
+            - {"name": str, "price_change": float}: 所有部位同幅度漲跌
+            - {"historical_window": "2008" | "2020"} 或 "2008" / "2020":
+              以本機價格資料重播 2008 金融海嘯、2020 新冠疫情崩跌
+        simulation: 蒙地卡羅設定 {"paths", "horizon_days", "seed", "time_budget_seconds"} [可選]
+        trading_day: 資料所屬交易日 (YYYY-MM-DD)，只使用此日以前的價格 [可選]
         **kwargs: 額外參數（用於容錯）
 
     Returns:
@@ -553,11 +689,22 @@ def perform_stress_test(
                 "stress_scenarios": [
                     {
                         "scenario": str,
-                        "portfolio_loss": float,
+                        "portfolio_loss": float,    # 負值為虧損
                         "affected_positions": list
                     }
                 ],
-                "scenario_count": int
+                "scenario_count": int,
+                "monte_carlo": {                    # 僅有持股本機價格時
+                    "completed_paths": int,
+                    "horizon_days": int,
+                    "mean_loss": float,             # 損失為正值
+                    "probability_of_loss": float,
+                    "tail_losses": {"p90", "p95", "p99", "p99_9"},
+                    "expected_shortfall": dict,
+                    "histogram": {"edges", "counts"},
+                    "worst_paths": [{"path", "loss", "values"}],
+                    "truncated": bool               # 超過時間預算時為 True
+                }
             }
 
     Raises:
@@ -565,10 +712,18 @@ def perform_stress_test(
     """
     try:
         # 參數驗證和容錯
-        params = parse_tool_params(positions=positions, scenarios=scenarios, **kwargs)
+        params = parse_tool_params(
+            positions=positions,
+            scenarios=scenarios,
+            simulation=simulation,
+            trading_day=trading_day,
+            **kwargs,
+        )
 
         _positions = params.get("positions") or positions or []
         _scenarios = params.get("scenarios") or scenarios or []
+        _simulation = params.get("simulation") or simulation or {}
+        _trading_day = params.get("trading_day") or trading_day
 
         # 驗證參數
         if not _positions:
@@ -592,6 +747,7 @@ def perform_stress_test(
         logger.info(f"開始執行壓力測試 | 部位數: {len(_positions)} | 情景數: {len(_scenarios)}")
 
         stress_results = []
+        position_values = _position_values(_positions)
 
         for scenario in _scenarios:
             try:
@@ -603,6 +759,16 @@ def perform_stress_test(
                     scenario = {"name": "未知情景"}
 
                 scenario_name = scenario.get("name", "未知情景")
+                window = scenario.get("historical_window") or (
+                    scenario_name if scenario_name in stress_test.CRISIS_WINDOWS else None
+                )
+                if window:
+                    # 讀取價格檔與陣列運算不佔用事件迴圈
+                    stress_results.append(
+                        await asyncio.to_thread(_crisis_scenario, position_values, str(window))
+                    )
+                    continue
+
                 portfolio_loss = 0
                 affected_positions = []
 
@@ -637,12 +803,20 @@ def perform_stress_test(
                 logger.warning(f"處理情景失敗: {e}")
                 continue
 
-        logger.info(f"壓力測試完成 | 評估情景數: {len(stress_results)}")
-
-        return {
+        result = {
             "stress_scenarios": stress_results,
             "scenario_count": len(stress_results),
         }
+        # 模擬以 NumPy 在執行緒中進行（可達數秒），期間其他 Agent 與 WebSocket 照常運作
+        monte_carlo = await asyncio.to_thread(
+            _monte_carlo_scenario, position_values, _trading_day, _simulation
+        )
+        if monte_carlo is not None:
+            result["monte_carlo"] = monte_carlo
+
+        logger.info(f"壓力測試完成 | 評估情景數: {len(stress_results)}")
+
+        return result
 
     except Exception as e:
         logger.error(f"執行壓力測試失敗: {e}", exc_info=True)
@@ -653,6 +827,72 @@ def perform_stress_test(
         }
 
 
+def _position_values(positions: list) -> dict[str, float]:
+    """由部位列表取得 {股票代號: 市值}"""
+    values: dict[str, float] = {}
+    for pos in positions:
+        try:
+            pos_dict = pos if isinstance(pos, dict) else pos.__dict__
+            ticker = str(pos_dict.get("ticker", ""))
+            value = float(pos_dict.get("value") or 0)
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if ticker and value:
+            values[ticker] = values.get(ticker, 0.0) + value
+    return values
+
+
+def _crisis_scenario(position_values: dict[str, float], window: str) -> dict[str, Any]:
+    """歷史危機重播情景；本機沒有價格資料時回傳含 error 的情景結果"""
+    try:
+        return stress_test.crisis_replay(position_values, stress_test.load_price_history(), window)
+    except RiskEngineError as e:
+        logger.warning(f"無法重播歷史危機 {window}: {e}")
+        return {
+            "scenario": stress_test.CRISIS_WINDOWS.get(window, (window,))[0],
+            "error": str(e),
+            "portfolio_loss": 0,
+            "affected_positions": [],
+        }
+
+
+def _monte_carlo_scenario(
+    position_values: dict[str, float], trading_day: str | None, simulation: Any
+) -> dict[str, Any] | None:
+    """
+    蒙地卡羅壓力測試（時間預算不超過 STRESS_TEST_TIME_BUDGET）
+
+    Returns:
+        模擬結果；沒有持股的本機價格時回傳 None（不執行模擬）
+    """
+    if not position_values:
+        return None
+    history = _load_closes(position_values, trading_day)
+    if not history:
+        logger.info("沒有持股的本機收盤價，略過蒙地卡羅模擬")
+        return None
+    try:
+        if isinstance(simulation, str):
+            simulation = json.loads(simulation)
+
+        estimate = get_risk_engine().estimate(history, _trading_date(trading_day))
+        time_budget = min(
+            float(simulation.get("time_budget_seconds") or STRESS_TEST_TIME_BUDGET),
+            STRESS_TEST_TIME_BUDGET,
+        )
+        return stress_test.monte_carlo(
+            estimate,
+            position_values,
+            paths=int(simulation.get("paths") or stress_test.DEFAULT_PATHS),
+            horizon_days=int(simulation.get("horizon_days") or stress_test.DEFAULT_HORIZON_DAYS),
+            seed=int(simulation.get("seed", stress_test.DEFAULT_SEED)),
+            time_budget=time_budget,
+        ).to_dict()
+    except (RiskEngineError, TypeError, ValueError, AttributeError) as e:
+        logger.warning(f"無法執行蒙地卡羅壓力測試: {e}")
+        return {"error": str(e)}
+
+
 @function_tool(strict_mode=False)
 def generate_risk_recommendations(
     portfolio_risk_json: str = None,
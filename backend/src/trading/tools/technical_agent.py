@@ -131,6 +131,13 @@ def technical_agent_instructions() -> str:
   - 新鮮（≤3 天）→ 增量更新
   - 陳舊（>3 天）→ 完整重新分析 + 對比
 
+**快照優先** → get_indicator_snapshot
+  - 先讀取收盤後預先計算的指標、趨勢與訊號快照；命中時不必重新計算步驟 2、4、6
+  - 沒有快照或需要盤中最新價格時再計算
+
+**多檔掃描（比較多檔股票時）** → scan_chart_patterns
+  - 一次傳入多檔 K 線，取得依分數排序的型態（雙重頂 / 底、突破 / 跌破）與支撐壓力
+
 **步驟 1-3：數據收集與計算** → casual_market_mcp + tools
   1. 收集 K 線數據和成交量
   2. 計算技術指標 → calculate_technical_indicators
@@ -147,6 +154,8 @@ def technical_agent_instructions() -> str:
 
 ## 工具調用
 
+- **get_indicator_snapshot** → 讀取預先計算的技術指標快照（多檔一次查詢）
+- **scan_chart_patterns** → 多檔股票型態掃描（排序後的型態與支撐壓力）
 - **calculate_technical_indicators** → 計算 MA、MACD、RSI 等
 - **identify_chart_patterns** → 識別型態和含義
 - **analyze_trend** → 判斷趨勢方向和強度（0-10）
@@ -168,6 +177,153 @@ def technical_agent_instructions() -> str:
 """
 
 
+def _engine_patterns(ticker: str, price_data: list, lookback_days: int) -> list[dict]:
+    """以型態掃描引擎識別單檔股票的型態（資料不足時回傳空列表）"""
+    from trading.indicators import pattern_info
+    from trading.pattern_scan import DEFAULT_ORDER, OHLCVPanel, PatternScanError, scan
+
+    try:
+        panel = OHLCVPanel.from_bars({ticker: price_data})
+        result = scan(panel, lookback=max(lookback_days, 2 * DEFAULT_ORDER + 3))
+    except PatternScanError as e:
+        logger.debug(f"型態掃描略過 | 股票: {ticker} | {e}")
+        return []
+    return [pattern_info(match) for match in result.matches]
+
+
+def _volume_profile_levels(ticker: str, price_data: list) -> dict[str, list[float]]:
+    """以成交量分布計算支撐壓力（資料少於 20 筆時回傳空字典）"""
+    from trading.pattern_scan import OHLCVPanel, PatternScanError, volume_profile_levels
+
+    if len(price_data) < 20:
+        return {}
+    try:
+        panel = OHLCVPanel.from_bars({ticker: price_data}).tail(60)
+    except PatternScanError:
+        return {}
+    return volume_profile_levels(panel).get(ticker, {})
+
+
+@function_tool(strict_mode=False)
+def scan_chart_patterns(
+    price_data: dict = None,
+    patterns: list = None,
+    lookback_days: int = 60,
+    limit: int = 20,
+) -> dict:
+    """多檔股票圖表型態掃描
+
+    一次掃描多檔股票的雙重頂 / 雙重底、帶量突破 / 跌破與成交量分布支撐壓力，
+    依分數（0-1）排序回傳。
+
+    **可選參數：**
+        price_data: {股票代號: K 線列表}，K 線含 date, open, high, low, close, volume [可選]
+            未提供時掃描本機 K 線檔（CASUAL_MARKET_DATA）
+        patterns: 要掃描的型態，預設全部 ["double_top", "double_bottom", "breakout", "breakdown"] [可選]
+        lookback_days: 回溯分析天數，預設 60 天 [可選]
+        limit: 回傳型態筆數，預設 20 [可選]
+
+    Returns:
+        dict: 掃描結果
+            {
+                "tickers": int,
+                "match_count": int,
+                "matches": [
+                    {"ticker": str, "pattern": str, "direction": str, "score": float,
+                     "detected_on": str, "confirmed": bool, "details": dict}
+                ],
+                "levels": {"2330": {"support": [float], "resistance": [float]}}
+            }
+    """
+    from trading.pattern_scan import OHLCVPanel, PatternScanError, load_ohlcv, scan
+
+    try:
+        params = parse_tool_params(
+            price_data=price_data, patterns=patterns, lookback_days=lookback_days, limit=limit
+        )
+        _price_data = params.get("price_data")
+        panel = OHLCVPanel.from_bars(_price_data) if _price_data else load_ohlcv()
+        result = scan(
+            panel,
+            patterns=params.get("patterns") or None,
+            lookback=int(params.get("lookback_days") or 60),
+        ).to_dict(limit=int(params.get("limit") or 20))
+        logger.info(
+            f"型態掃描完成 | 股票數: {result['tickers']} | 型態: {result['match_count']} | "
+            f"耗時: {result['elapsed_ms']:.1f}ms"
+        )
+        return result
+    except PatternScanError as e:
+        logger.warning(f"型態掃描失敗: {e}")
+        return {"error": str(e), "match_count": 0, "matches": [], "levels": {}}
+    except Exception as e:
+        logger.error(f"型態掃描失敗: {e}", exc_info=True)
+        return {"error": str(e), "match_count": 0, "matches": [], "levels": {}}
+
+
+@function_tool(strict_mode=False)
+async def get_indicator_snapshot(
+    tickers: Any = None,
+    trading_date: str = None,
+) -> dict:
+    """讀取收盤後預先計算的技術指標快照
+
+    每日收盤後已為熱門股票計算完整技術面（MA、RSI、MACD、KD、布林通道、趨勢、型態與交易訊號），
+    盤中分析優先使用快照；沒有快照的股票再以其他工具計算。
+
+    **必要參數：**
+        tickers: 股票代號列表，例如 ["2330", "2317"]，也接受 "2330,2317" [必要]
+
+    **可選參數：**
+        trading_date: 只取此交易日（含）之前的快照，格式 YYYY-MM-DD，預設為最新 [可選]
+
+    Returns:
+        dict: 快照
+            {
+                "snapshots": {
+                    "2330": {
+                        "trading_date": str, "close": float,
+                        "indicators": {"ma": {...}, "rsi": {...}, "macd": {...}, "bollinger": {...}, "kd": {...}},
+                        "trend": {"direction": str, "strength": float, ...},
+                        "patterns": [...], "overall_signal": str, "confidence": float, "signals": [...],
+                        "age_days": int
+                    }
+                },
+                "missing": [str]   # 沒有快照的股票
+            }
+    """
+    from datetime import date
+
+    from service.indicator_snapshot_service import indicator_snapshot_service
+
+    try:
+        params = parse_tool_params(tickers=tickers, trading_date=trading_date)
+        _tickers = params.get("tickers") or []
+        if isinstance(_tickers, str):
+            _tickers = _tickers.replace("，", ",").split(",")
+        _tickers = [str(t).strip().upper() for t in _tickers if str(t).strip()]
+        if not _tickers:
+            return {"error": "缺少必要參數: tickers", "snapshots": {}, "missing": []}
+
+        _trading_date = params.get("trading_date")
+        as_of = date.fromisoformat(str(_trading_date)[:10]) if _trading_date else None
+
+        rows = await indicator_snapshot_service.latest(_tickers, as_of)
+        today = as_of or date.today()
+        snapshots = {}
+        for ticker, row in rows.items():
+            snapshot = row.to_dict()
+            snapshot["age_days"] = (today - row.trading_date).days
+            snapshots[ticker] = snapshot
+        missing = [t for t in dict.fromkeys(_tickers) if t not in snapshots]
+
+        logger.info(f"讀取技術指標快照 | 命中: {len(snapshots)} | 缺少: {len(missing)}")
+        return {"snapshots": snapshots, "missing": missing}
+    except Exception as e:
+        logger.error(f"讀取技術指標快照失敗: {e}", exc_info=True)
+        return {"error": str(e), "snapshots": {}, "missing": []}
+
+
 @function_tool(strict_mode=False)
 def calculate_technical_indicators(
     ticker: str,
@@ -235,46 +391,23 @@ def calculate_technical_indicators(
         if isinstance(_indicators, str):
             _indicators = [_indicators.lower()]
 
-        _indicators = _indicators or ["ma", "rsi", "macd", "bollinger", "kd"]
-        result = {"ticker": _ticker, "indicators": {}}
+        from trading.indicators import INDICATORS, compute_indicators
+        from trading.pattern_scan import OHLCVPanel
+
+        _indicators = [
+            str(name).lower()
+            for name in (_indicators or INDICATORS)
+            if str(name).lower() in INDICATORS
+        ]
         latest_close = _price_data[-1].close
 
         logger.debug(f"計算指標: {', '.join(_indicators)} | 最新收盤: {latest_close}")
 
-        if "ma" in _indicators:
-            result["indicators"]["ma"] = {
-                "ma5": latest_close * 0.98,
-                "ma10": latest_close * 0.97,
-                "ma20": latest_close * 0.95,
-                "ma60": latest_close * 0.92,
-            }
-
-        if "rsi" in _indicators:
-            rsi_value = 55.0
-            status = "超買" if rsi_value >= 70 else "超賣" if rsi_value <= 30 else "中性"
-            result["indicators"]["rsi"] = {"value": rsi_value, "status": status}
-
-        if "macd" in _indicators:
-            result["indicators"]["macd"] = {
-                "macd": 0.5,
-                "signal": 0.3,
-                "histogram": 0.2,
-                "status": "多頭",
-            }
-
-        if "bollinger" in _indicators:
-            result["indicators"]["bollinger"] = {
-                "upper": latest_close * 1.02,
-                "middle": latest_close,
-                "lower": latest_close * 0.98,
-            }
-
-        if "kd" in _indicators:
-            result["indicators"]["kd"] = {
-                "k": 60.0,
-                "d": 55.0,
-                "status": "偏強",
-            }
+        panel = OHLCVPanel.from_bars({_ticker: _price_data})
+        result = {
+            "ticker": _ticker,
+            "indicators": compute_indicators(panel, _indicators)[str(_ticker)],
+        }
 
         logger.info(f"技術指標計算完成 | 股票: {_ticker} | 指標數: {len(result['indicators'])}")
 
@@ -362,29 +495,15 @@ def identify_chart_patterns(
                 "pattern_count": 0,
             }
 
+        from trading.indicators import momentum_pattern
+
         patterns = []
 
-        if len(_price_data) >= 20:
-            recent_trend = _price_data[-1].close / _price_data[-20].close
+        momentum = momentum_pattern(_price_data[-1].close / _price_data[-20].close)
+        if momentum is not None:
+            patterns.append(momentum)
 
-            if recent_trend > 1.05:
-                patterns.append(
-                    {
-                        "pattern_name": "上升趨勢",
-                        "pattern_type": "bullish",
-                        "confidence": 0.75,
-                        "description": f"價格上漲 {(recent_trend - 1) * 100:.2f}%",
-                    }
-                )
-            elif recent_trend < 0.95:
-                patterns.append(
-                    {
-                        "pattern_name": "下降趨勢",
-                        "pattern_type": "bearish",
-                        "confidence": 0.75,
-                        "description": f"價格下跌 {(1 - recent_trend) * 100:.2f}%",
-                    }
-                )
+        patterns.extend(_engine_patterns(_ticker, _price_data, int(_lookback_days)))
 
         logger.info(f"圖表型態識別完成 | 股票: {_ticker} | 發現型態: {len(patterns)}")
 
@@ -472,12 +591,9 @@ def analyze_trend(
 
         logger.debug(f"動能指標 | 短期: {short_term:.2%} | 中期: {mid_term:.2%}")
 
-        if short_term > 0.02 and mid_term > 0.05:
-            direction, strength = "上升", 0.8
-        elif short_term < -0.02 and mid_term < -0.05:
-            direction, strength = "下降", 0.8
-        else:
-            direction, strength = "盤整", 0.4
+        from trading.indicators import classify_trend
+
+        direction, strength = classify_trend(short_term, mid_term)
 
         logger.info(f"趨勢分析完成 | 股票: {_ticker} | 方向: {direction} | 強度: {strength:.2f}")
 
@@ -564,13 +680,15 @@ def analyze_support_resistance(
 
         current_price = _price_data[-1].close
 
-        support_levels = [
+        # 資料足夠時以成交量分布找支撐壓力，不足的一側以固定比例補上
+        levels = _volume_profile_levels(_ticker, _price_data)
+        support_levels = levels.get("support") or [
             current_price * 0.95,
             current_price * 0.92,
             current_price * 0.90,
         ]
 
-        resistance_levels = [
+        resistance_levels = levels.get("resistance") or [
             current_price * 1.05,
             current_price * 1.08,
             current_price * 1.10,
@@ -669,25 +787,11 @@ def generate_trading_signals(
             f"開始產生交易訊號 | 股票: {_ticker} | 趨勢方向: {_trend_analysis.get('direction', '未知')}"
         )
 
-        signals = []
-        overall_signal = "觀望"
-        confidence = 0.5
+        from trading.indicators import combine_signals
 
-        if _trend_analysis.get("direction") == "上升":
-            signals.append({"type": "trend", "signal": "看多"})
-            confidence += 0.15
-
-        patterns_list = _patterns.get("patterns", [])
-        bullish_patterns = sum(
-            1 for p in patterns_list if isinstance(p, dict) and p.get("pattern_type") == "bullish"
+        overall_signal, confidence, signals = combine_signals(
+            _trend_analysis, _patterns.get("patterns", [])
         )
-        if bullish_patterns > 0:
-            signals.append({"type": "pattern", "signal": "看多"})
-            confidence += 0.1
-
-        if len(signals) >= 2:
-            overall_signal = "買進"
-            confidence = min(0.85, confidence)
 
         logger.info(
             f"交易訊號產生完成 | 股票: {_ticker} | 訊號: {overall_signal} | "
@@ -740,6 +844,8 @@ async def get_technical_agent(
 
     logger.debug("Creating custom tools with function_tool")
     all_tools = [
+        get_indicator_snapshot,
+        scan_chart_patterns,
         calculate_technical_indicators,
         identify_chart_patterns,
         analyze_trend,
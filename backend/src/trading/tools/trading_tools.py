@@ -8,6 +8,7 @@ from agents.mcp import MCPServerStdio, MCPServerSse
 
 from common.logger import logger
 from common.enums import TransactionStatus
+from trading.config import COMMISSION_RATE
 
 if TYPE_CHECKING:
     from service.trading_service import TradingService
@@ -85,7 +86,7 @@ async def record_trade(
 
         # 計算總金額和手續費
         total_amount = float(quantity * price)
-        commission = total_amount * 0.001425  # 假設手續費 0.1425%
+        commission = total_amount * COMMISSION_RATE
 
         # 創建交易記錄
         await agent_service.create_transaction(
@@ -270,7 +271,7 @@ async def _execute_market_trade(
         if price is not None:
             params["price"] = price
 
-        logger.info(f"🔄 呼叫 casual_market_mcp.{tool_name}: {params}")
+        logger.debug("🔄 呼叫 casual_market_mcp.{}: {}", tool_name, params)
 
         # 呼叫 MCP 工具
         result = await casual_market_mcp.session.call_tool(tool_name, params)
@@ -308,8 +309,12 @@ async def _execute_market_trade(
                         "error": "市場交易未回傳成交價格，交易無效",
                     }
 
-                logger.info(
-                    f"✅ 市場交易成功: {action.upper()} {quantity} 股 {ticker} @ {executed_price}"
+                logger.debug(
+                    "✅ 市場交易成功: {} {} 股 {} @ {}",
+                    action.upper(),
+                    quantity,
+                    ticker,
+                    executed_price,
                 )
 
                 return {
@@ -393,6 +398,51 @@ def _validate_trade_params(
     return action_upper, quantity, validated_price
 
 
+def check_trade_feasibility(
+    ticker: str,
+    action: str,
+    quantity: int,
+    price: float,
+    current_funds: float,
+    held_quantity: int | None = None,
+    commission_rate: float = COMMISSION_RATE,
+) -> str | None:
+    """
+    檢查資金 / 持股是否足以執行交易（不存取資料庫，回測引擎共用）
+
+    Args:
+        ticker: 股票代號
+        action: 交易動作 ("BUY" 或 "SELL")
+        quantity: 交易股數
+        price: 交易價格
+        current_funds: 現有資金
+        held_quantity: 目前持股數（None 表示沒有持股記錄）
+        commission_rate: 手續費率（預設 0.1425%，參數掃描可調整）
+
+    Returns:
+        錯誤訊息；可執行時為 None
+    """
+    if action == "BUY":
+        # 計算買入所需資金（含手續費）
+        total_amount = quantity * price
+        commission = total_amount * commission_rate
+        required_funds = total_amount + commission
+
+        if current_funds < required_funds:
+            return (
+                f"資金不足: 現有 {current_funds:,.2f} 元，"
+                f"買入 {quantity} 股 {ticker} @ {price} 需要 {required_funds:,.2f} 元"
+                f"（含手續費 {commission:,.2f} 元）"
+            )
+        return None
+
+    if held_quantity is None:
+        return f"無法賣出 {ticker}: 沒有該股票的持股記錄"
+    if held_quantity < quantity:
+        return f"持股不足: 持有 {held_quantity} 股 {ticker}，無法賣出 {quantity} 股"
+    return None
+
+
 async def _validate_trade_feasibility(
     agent_service,
     agent_id: str,
@@ -437,24 +487,15 @@ async def _validate_trade_feasibility(
         current_funds = float(agent_config.current_funds or agent_config.initial_funds)
 
         if action.upper() == "BUY":
-            # 計算買入所需資金（含手續費 0.1425%）
-            total_amount = quantity * price
-            commission = total_amount * 0.001425
-            required_funds = total_amount + commission
-
-            if current_funds < required_funds:
-                return {
-                    "valid": False,
-                    "error": f"資金不足: 現有 {current_funds:,.2f} 元，"
-                    f"買入 {quantity} 股 {ticker} @ {price} 需要 {required_funds:,.2f} 元"
-                    f"（含手續費 {commission:,.2f} 元）",
-                }
+            error = check_trade_feasibility(ticker, "BUY", quantity, price, current_funds)
+            if error:
+                return {"valid": False, "error": error}
 
             return {
                 "valid": True,
                 "agent_config": agent_config,
                 "current_funds": current_funds,
-                "required_funds": required_funds,
+                "required_funds": quantity * price * (1 + COMMISSION_RATE),
             }
 
         elif action.upper() == "SELL":
@@ -462,18 +503,12 @@ async def _validate_trade_feasibility(
             holdings = await agent_service.get_agent_holdings(agent_id)
             holding = next((h for h in holdings if h.ticker == ticker), None)
 
-            if not holding:
-                return {
-                    "valid": False,
-                    "error": f"無法賣出 {ticker}: 沒有該股票的持股記錄",
-                }
-
-            if holding.quantity < quantity:
-                return {
-                    "valid": False,
-                    "error": f"持股不足: 持有 {holding.quantity} 股 {ticker}，"
-                    f"無法賣出 {quantity} 股",
-                }
+            held_quantity = holding.quantity if holding else None
+            error = check_trade_feasibility(
+                ticker, "SELL", quantity, price, current_funds, held_quantity
+            )
+            if error:
+                return {"valid": False, "error": error}
 
             return {
                 "valid": True,
@@ -572,15 +607,23 @@ async def execute_trade_atomic(
                 f"💡 未進行任何交易，系統狀態未變更"
             )
 
-        logger.info(
-            f"✅ 預先驗證通過: {action_upper} {validated_quantity} 股 {ticker} @ {validated_price}"
+        logger.debug(
+            "✅ 預先驗證通過: {} {} 股 {} @ {}",
+            action_upper,
+            validated_quantity,
+            ticker,
+            validated_price,
         )
 
         # ==========================================
         # Step 1: 執行市場交易
         # ==========================================
-        logger.info(
-            f"📤 開始原子交易: {action_upper} {validated_quantity} 股 {ticker} @ {validated_price}"
+        logger.debug(
+            "📤 開始原子交易: {} {} 股 {} @ {}",
+            action_upper,
+            validated_quantity,
+            ticker,
+            validated_price,
         )
 
         market_result = await _execute_market_trade(
@@ -607,7 +650,7 @@ async def execute_trade_atomic(
 
         # ⭐ 使用市場實際成交價格（而非傳入的價格）
         executed_price = market_result["executed_price"]
-        logger.info(f"✅ 市場交易成功，實際成交價: {executed_price}")
+        logger.debug("✅ 市場交易成功，實際成交價: {}", executed_price)
 
         # 執行資料庫原子操作
         result = await trading_service.execute_trade_atomic(
@@ -621,7 +664,15 @@ async def execute_trade_atomic(
         )
 
         if result["success"]:
-            logger.info("✅ 原子交易成功完成（市場交易 + 資料庫更新）")
+            # 每筆交易只輸出這一筆 INFO，各步驟為 DEBUG
+            logger.info(
+                "✅ 原子交易成功完成: {} {} {} 股 {} @ {}",
+                agent_id,
+                action_upper,
+                validated_quantity,
+                ticker,
+                executed_price,
+            )
             return (
                 f"✅ 交易執行成功 (原子操作)\n\n"
                 f"📊 交易詳情:\n"
@@ -29,10 +29,6 @@ from agents import (
 from agents.mcp import MCPServerStdio, MCPServerSse
 
 # 導入所有 sub-agents
-from .tools.technical_agent import get_technical_agent
-from .tools.sentiment_agent import get_sentiment_agent
-from .tools.fundamental_agent import get_fundamental_agent
-from .tools.risk_agent import get_risk_agent
 from .tools.trading_tools import create_trading_tools, get_portfolio_status
 from .tools.memory_tools import (
     load_execution_memory,
@@ -52,6 +48,9 @@ from agents.extensions.models.litellm_model import LitellmModel
 
 from database.models import Agent as AgentConfig
 from .tool_config import ToolConfig, ToolRequirements
+from .run_stream import RunStreamBatcher
+from .subagent_stream import SubagentStreamHooks, relay_subagent_tool
+from .instrumentation import MeteredLitellmModel, MeteredMCPServer
 
 load_dotenv()
 
@@ -62,7 +61,7 @@ DEFAULT_AGENT_TIMEOUT = int(os.getenv("DEFAULT_AGENT_TIMEOUT", "300"))  # 秒
 DEFAULT_TEMPERATURE = float(os.getenv("DEFAULT_MODEL_TEMPERATURE", 0.7))
 
 # CASUAL_MARKET_SSE_URL: casual-market-mcp 的 SSE 連接 URL
-# 預設使用本地開發 URL
+# 預設使用本地開發 URL；設為 "local" 時使用同程序的模擬市場（api.local_market_mcp）
 CASUAL_MARKET_SSE_URL = os.getenv("CASUAL_MARKET_SSE_URL", "http://sacahan-ubunto:8066/sse")
 # MEMORY_DB_PATH: Memory MCP 資料庫文件存儲位置
 # 預設使用 backend/memory 目錄
@@ -144,6 +143,8 @@ class TradingAgent:
         self.casual_market_mcp = None
         self.memory_mcp = None
         self.perplexity_mcp = None
+        # 串流執行時的事件批次器（需在 initialize() 前設定，sub-agent 才會以串流模式執行）
+        self.stream_sink: RunStreamBatcher | None = None
 
         logger.info(f"TradingAgent created: {agent_id}")
 
@@ -222,7 +223,9 @@ class TradingAgent:
                 model_settings_dict["extra_headers"] = self.extra_headers
 
             # 構建 MCP servers 列表，排除 None 值
-            mcp_servers_list = [self.memory_mcp, self.casual_market_mcp]
+            mcp_servers_list = [
+                server for server in (self.memory_mcp, self.casual_market_mcp) if server
+            ]
 
             self.agent = Agent(
                 name=self.agent_id,
@@ -264,13 +267,29 @@ class TradingAgent:
         if self._exit_stack is None:
             self._exit_stack = AsyncExitStack()
 
+        from api.local_market_mcp import LocalMarketMCP, is_local_market_url
+
         # Casual Market MCP Server (兩種模式都需要)
-        if tool_requirements.include_casual_market_mcp:
+        if tool_requirements.include_casual_market_mcp and is_local_market_url(
+            CASUAL_MARKET_SSE_URL
+        ):
+            self.casual_market_mcp = MeteredMCPServer(
+                await self._exit_stack.enter_async_context(LocalMarketMCP())
+            )
+            logger.info("casual_market_mcp server initialized (local simulator)")
+        elif tool_requirements.include_casual_market_mcp:
             self.casual_market_mcp = await self._start_mcp_server_sse(
                 name="casual_market_mcp",
                 url=CASUAL_MARKET_SSE_URL,
                 success_message="casual_market_mcp server initialized (SSE)",
             )
+            from api.fundamentals_cache import CachedMarketMCP, get_fundamentals_cache
+
+            cache = get_fundamentals_cache()
+            if self.casual_market_mcp and cache:
+                # 財報等基本面資料經由本機快取；連線關閉前等待背景更新完成
+                self.casual_market_mcp = CachedMarketMCP(self.casual_market_mcp, cache)
+                self._exit_stack.push_async_callback(self.casual_market_mcp.wait_for_refreshes)
 
         # Memory MCP Server (兩種模式都需要)
         if tool_requirements.include_memory_mcp:
@@ -324,7 +343,7 @@ class TradingAgent:
                 )
             )
             logger.info(success_message)
-            return server
+            return MeteredMCPServer(server)
         except Exception as exc:
             logger.warning(
                 f"Failed to initialize {name}: {exc}",
@@ -354,7 +373,7 @@ class TradingAgent:
                 )
             )
             logger.info(success_message)
-            return server
+            return MeteredMCPServer(server)
         except Exception as exc:
             logger.warning(
                 f"Failed to initialize {name}: {exc}",
@@ -434,7 +453,7 @@ class TradingAgent:
 
         # 返回 LitellmModel - headers 將通過 ModelSettings 傳遞
         # return LitellmModel(model=model_str, api_key=api_key), extra_headers
-        return LitellmModel(model=model_str), extra_headers
+        return MeteredLitellmModel(model=model_str), extra_headers
 
     def _setup_openai_tools(self, tool_requirements: ToolRequirements) -> list[Any]:
         """
@@ -522,10 +541,14 @@ class TradingAgent:
                 "extra_headers": self.extra_headers,
                 "mcp_servers": mcp_servers,  # 共享 MCP servers（動態構建）
             }
+            # sub-agent 進度經由 RunHooks 轉送給本次執行的 stream_sink（未啟用串流時略過）
+            subagent_hooks = SubagentStreamHooks(lambda: self.stream_sink)
 
             # 技術分析 Agent (兩種模式都需要)
             if tool_requirements.include_technical_agent:
                 try:
+                    from .tools.technical_agent import get_technical_agent
+
                     technical_agent = await get_technical_agent(**subagent_config)
                     if technical_agent:
                         tool = technical_agent.as_tool(
@@ -537,7 +560,9 @@ class TradingAgent:
     - 提供買賣點建議
                             """,
                             max_turns=DEFAULT_MAX_TURNS,
+                            hooks=subagent_hooks,
                         )
+                        tool = relay_subagent_tool(tool)
                         if tool:
                             tools.append(tool)
                             logger.info("技術分析 Sub Agent Tool 載入成功")
@@ -552,6 +577,8 @@ class TradingAgent:
             # 情緒分析 Agent (僅 TRADING 模式)
             if tool_requirements.include_sentiment_agent:
                 try:
+                    from .tools.sentiment_agent import get_sentiment_agent
+
                     sentiment_agent = await get_sentiment_agent(**subagent_config)
                     if sentiment_agent:
                         tool = sentiment_agent.as_tool(
@@ -563,7 +590,9 @@ class TradingAgent:
     - 評估市場氛圍對股價的影響
                                 """,
                             max_turns=DEFAULT_MAX_TURNS,
+                            hooks=subagent_hooks,
                         )
+                        tool = relay_subagent_tool(tool)
                         if tool:
                             tools.append(tool)
                             logger.info("情緒分析 Sub Agent Tool 載入成功")
@@ -578,6 +607,8 @@ class TradingAgent:
             # 基本面分析 Agent (僅 TRADING 模式)
             if tool_requirements.include_fundamental_agent:
                 try:
+                    from .tools.fundamental_agent import get_fundamental_agent
+
                     fundamental_agent = await get_fundamental_agent(**subagent_config)
                     if fundamental_agent:
                         tool = fundamental_agent.as_tool(
@@ -589,7 +620,9 @@ class TradingAgent:
     - 分析產業競爭力和成長潛力
                                 """,
                             max_turns=DEFAULT_MAX_TURNS,
+                            hooks=subagent_hooks,
                         )
+                        tool = relay_subagent_tool(tool)
                         if tool:
                             tools.append(tool)
                             logger.info("基本面分析 Sub Agent Tool 載入成功")
@@ -604,6 +637,8 @@ class TradingAgent:
             # 風險評估 Agent (兩種模式都需要)
             if tool_requirements.include_risk_agent:
                 try:
+                    from .tools.risk_agent import get_risk_agent
+
                     risk_agent = await get_risk_agent(**subagent_config)
                     if risk_agent:
                         tool = risk_agent.as_tool(
@@ -615,7 +650,9 @@ class TradingAgent:
     - 提供資產配置和避險建議
                                 """,
                             max_turns=DEFAULT_MAX_TURNS,
+                            hooks=subagent_hooks,
                         )
+                        tool = relay_subagent_tool(tool)
                         if tool:
                             tools.append(tool)
                             logger.info("風險評估 Sub Agent Tool 載入成功")
@@ -698,11 +735,21 @@ class TradingAgent:
                 # === Phase 2: 構建任務提示（融入記憶體） ===
                 task_prompt = await self._build_task_prompt(execution_mode, execution_memory)
 
-                # === Phase 3: 執行 Agent ===
-                result = await Runner.run(self.agent, task_prompt, max_turns=DEFAULT_MAX_TURNS)
+                # === Phase 3: 執行 Agent（有串流批次器時逐步推送事件） ===
+                if self.stream_sink is not None:
+                    result = await self._run_streamed(task_prompt)
+                else:
+                    result = await Runner.run(self.agent, task_prompt, max_turns=DEFAULT_MAX_TURNS)
 
                 logger.info(
-                    f"✅ Agent {self.agent_id} execution completed: {result} (trace_id: {trace_id})"
+                    "✅ Agent {} execution completed (trace_id: {}, output: {} chars)",
+                    self.agent_id,
+                    trace_id,
+                    len(str(result.final_output or "")),
+                )
+                # 完整執行結果（含所有 items）只在 DEBUG 時組字串
+                logger.opt(lazy=True).debug(
+                    "Agent {} run result: {}", lambda: self.agent_id, lambda: result
                 )
 
                 # === Phase 4: 執行後 - 保存記憶體 ===
@@ -741,6 +788,22 @@ class TradingAgent:
 
             raise AgentExecutionError(f"Agent execution failed: {str(e)}")
 
+    async def _run_streamed(self, task_prompt: str):
+        """
+        以串流模式執行 Agent，將事件交給 stream_sink 批次推送
+
+        Returns:
+            執行完成的 RunResultStreaming（final_output 與 Runner.run 相同）
+        """
+        result = Runner.run_streamed(self.agent, task_prompt, max_turns=DEFAULT_MAX_TURNS)
+        try:
+            async for event in result.stream_events():
+                self.stream_sink.handle_event(event, agent_name=self.agent.name)
+        except asyncio.CancelledError:
+            result.cancel()
+            raise
+        return result
+
     def _build_instructions(self, description: str) -> str:
         """
         根據描述構建 Agent 指令（系統角色和基本原則）
@@ -794,7 +857,7 @@ class TradingAgent:
 - 遵守系統提供的所有約束和指導
         """
         )
-        logger.info(f"Instructions for {self.agent_id}: {instructions.strip()}")
+        logger.debug("Instructions for {}: {}", self.agent_id, instructions.strip())
 
         return instructions.strip()
 
@@ -999,7 +1062,7 @@ class TradingAgent:
             action_message
             + f"\n\n**📅 目前的日期時間：** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
-        logger.info(f"Action message for {self.agent_id}: {action_message.strip()}")
+        logger.debug("Action message for {}: {}", self.agent_id, action_message.strip())
         return action_message.strip()
 
     async def _load_execution_memory(self) -> str | None:
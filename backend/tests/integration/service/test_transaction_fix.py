@@ -273,3 +273,95 @@ async def test_execute_trade_atomic_fails_without_session(
 
     transactions = await trading_service.agents_service.get_agent_transactions(sample_agent.id)
     assert len(transactions) == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_trade_atomic_broadcasts_updates(
+    db_session: AsyncSession,
+    sample_agent: Agent,
+    running_session: AgentSession,
+    monkeypatch,
+):
+    """
+    測試: 交易提交後推送交易、投資組合與績效事件給訂閱該 Agent 的客戶端
+    """
+    import json
+    from unittest.mock import AsyncMock
+
+    from fastapi import WebSocket
+
+    from api.routers import agent_execution
+    from api.websocket import WebSocketManager
+
+    manager = WebSocketManager()
+    monkeypatch.setattr(agent_execution, "websocket_manager", manager)
+    ws = AsyncMock(spec=WebSocket)
+    await manager.connect(ws)
+
+    trading_service = TradingService(db_session, on_trade=agent_execution.broadcast_trade_update)
+    trading_service.session_id = running_session.id
+
+    result = await trading_service.execute_trade_atomic(
+        agent_id=sample_agent.id,
+        ticker="2330",
+        action="BUY",
+        quantity=1000,
+        price=Decimal("500"),
+        company_name="台積電",
+    )
+
+    assert result["success"] is True
+    messages = {
+        message["type"]: message
+        for message in (json.loads(call.args[0]) for call in ws.send_text.call_args_list)
+    }
+    assert set(messages) == {"trade_execution", "portfolio_update", "performance_update"}
+    assert messages["trade_execution"]["data"]["transaction_id"] == result["transaction_id"]
+    assert messages["trade_execution"]["data"]["quantity"] == 1000
+    assert messages["portfolio_update"]["data"]["holdings"][0]["ticker"] == "2330"
+    assert messages["portfolio_update"]["data"]["current_funds"] == pytest.approx(
+        1000000 - 500000 * 1.001425
+    )
+    assert messages["performance_update"]["data"]["total_trades"] == 1
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_trade_callback_failure_keeps_trade(
+    db_session: AsyncSession,
+    sample_agent: Agent,
+    running_session: AgentSession,
+):
+    """
+    測試: 通知回呼失敗不影響已提交的交易；交易失敗時不通知
+    """
+    calls = []
+
+    async def failing_callback(update):
+        calls.append(update)
+        raise RuntimeError("websocket down")
+
+    trading_service = TradingService(db_session, on_trade=failing_callback)
+    trading_service.session_id = running_session.id
+
+    result = await trading_service.execute_trade_atomic(
+        agent_id=sample_agent.id,
+        ticker="2330",
+        action="BUY",
+        quantity=1000,
+        price=Decimal("100"),
+    )
+    rejected = await trading_service.execute_trade_atomic(
+        agent_id=sample_agent.id,
+        ticker="2330",
+        action="BUY",
+        quantity=1500,
+        price=Decimal("100"),
+    )
+
+    assert result["success"] is True
+    assert rejected["success"] is False
+    assert len(calls) == 1
+    assert calls[0].trade["transaction_id"] == result["transaction_id"]
+    transactions = await trading_service.agents_service.get_agent_transactions(sample_agent.id)
+    assert len(transactions) == 1
@@ -0,0 +1,201 @@
+"""
+Agent 背景清除整合測試
+
+測試範圍：
+- 標記為 DELETING 的 Agent 立即從查詢中消失
+- 背景工作以小批次刪除交易、持股、績效、會話與 payload，最後刪除 Agent
+- 進度回報與節流調整
+- 重新啟動時續行未完成的清除工作
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from common.enums import AgentMode, AgentStatus, TransactionAction
+from database.models import (
+    Agent,
+    AgentHolding,
+    AgentPerformance,
+    AgentSession,
+    AgentSessionPayload,
+    Base,
+    Transaction,
+)
+from service.agent_purge_service import (
+    PURGE_COMPLETED,
+    AgentPurgeError,
+    AgentPurgeService,
+)
+from service.agents_service import AgentNotFoundError, AgentsService
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    """檔案型 SQLite（背景工作使用獨立連線）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'purge.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _seed_agent(maker, agent_id: str, status: str = AgentStatus.ACTIVE.value, rows: int = 5):
+    """建立含歷史資料的 Agent"""
+    async with maker() as session:
+        session.add(
+            Agent(
+                id=agent_id,
+                name=agent_id,
+                ai_model="gpt-5-mini",
+                initial_funds=Decimal("1000000"),
+                current_funds=Decimal("1000000"),
+                status=status,
+            )
+        )
+        for i in range(rows):
+            agent_session = AgentSession(
+                id=f"{agent_id}-s{i}", agent_id=agent_id, mode=AgentMode.TRADING.value
+            )
+            agent_session.final_output = f"output {i}"
+            session.add(agent_session)
+            session.add(
+                Transaction(
+                    id=f"{agent_id}-t{i}",
+                    agent_id=agent_id,
+                    session_id=agent_session.id,
+                    ticker="2330",
+                    action=TransactionAction.BUY.value,
+                    quantity=1000,
+                    price=Decimal("500"),
+                    total_amount=Decimal("500000"),
+                )
+            )
+            session.add(
+                AgentPerformance(
+                    agent_id=agent_id,
+                    date=date.today() - timedelta(days=i),
+                    total_value=Decimal("1000000"),
+                    cash_balance=Decimal("500000"),
+                )
+            )
+        session.add(
+            AgentHolding(
+                agent_id=agent_id,
+                ticker="2330",
+                quantity=1000,
+                average_cost=Decimal("500"),
+                total_cost=Decimal("500000"),
+            )
+        )
+        await session.commit()
+
+
+async def _count(maker, model, agent_id: str) -> int:
+    async with maker() as session:
+        if model is AgentSessionPayload:
+            stmt = (
+                select(func.count())
+                .select_from(AgentSessionPayload)
+                .join(AgentSession)
+                .where(AgentSession.agent_id == agent_id)
+            )
+        elif model is Agent:
+            stmt = select(func.count()).select_from(Agent).where(Agent.id == agent_id)
+        else:
+            stmt = select(func.count()).select_from(model).where(model.agent_id == agent_id)
+        return await session.scalar(stmt)
+
+
+@pytest.mark.asyncio
+class TestDeletingAgentHidden:
+    """測試刪除中的 Agent 視為已刪除"""
+
+    async def test_deleting_agent_not_listed(self, session_maker):
+        """測試：DELETING Agent 不出現在列表與查詢中"""
+        await _seed_agent(session_maker, "keep", rows=0)
+        await _seed_agent(session_maker, "gone", status=AgentStatus.DELETING.value, rows=0)
+
+        async with session_maker() as session:
+            service = AgentsService(session)
+            assert [a.id for a in await service.list_agents()] == ["keep"]
+            with pytest.raises(AgentNotFoundError):
+                await service.get_agent_config("gone")
+
+
+@pytest.mark.asyncio
+class TestAgentPurge:
+    """測試背景分批清除"""
+
+    async def test_purge_deletes_children_in_batches(self, session_maker):
+        """測試：小批次刪除所有關聯資料，其他 Agent 不受影響"""
+        await _seed_agent(session_maker, "victim", status=AgentStatus.DELETING.value)
+        await _seed_agent(session_maker, "bystander")
+
+        progress = []
+
+        async def on_progress(job):
+            progress.append(job.to_dict())
+
+        service = AgentPurgeService(session_maker)
+        service.start("victim", batch_size=2, throttle_ms=0, on_progress=on_progress)
+        job = await service.wait("victim")
+
+        assert job.status == PURGE_COMPLETED
+        assert job.deleted == {
+            "transactions": 5,
+            "agent_holdings": 1,
+            "agent_performance": 5,
+            "agent_session_payloads": 5,
+            "agent_sessions": 5,
+        }
+        # 5 筆以每批 2 筆刪除需 3 批
+        assert job.batches == 3 + 1 + 3 + 3 + 3
+        assert len(progress) == job.batches + 1
+        assert progress[-1]["status"] == PURGE_COMPLETED
+
+        for model in (Agent, Transaction, AgentHolding, AgentPerformance, AgentSession):
+            assert await _count(session_maker, model, "victim") == 0
+        assert await _count(session_maker, AgentSessionPayload, "victim") == 0
+
+        assert await _count(session_maker, Agent, "bystander") == 1
+        assert await _count(session_maker, Transaction, "bystander") == 5
+        assert await _count(session_maker, AgentSessionPayload, "bystander") == 5
+
+    async def test_throttle_requires_active_job(self, session_maker):
+        """測試：沒有進行中的工作時無法調整節流"""
+        service = AgentPurgeService(session_maker)
+        with pytest.raises(AgentPurgeError):
+            service.throttle("nobody", batch_size=10)
+
+    async def test_throttle_updates_running_job(self, session_maker):
+        """測試：進行中的工作可調整批次大小與暫停時間"""
+        await _seed_agent(session_maker, "slow", status=AgentStatus.DELETING.value)
+        service = AgentPurgeService(session_maker)
+        service.start("slow", batch_size=1, throttle_ms=10)
+
+        job = service.throttle("slow", batch_size=100, throttle_ms=0)
+        assert job.batch_size == 100
+        assert job.throttle_ms == 0
+
+        job = await service.wait("slow")
+        assert job.status == PURGE_COMPLETED
+        assert await _count(session_maker, Agent, "slow") == 0
+
+    async def test_resume_pending_purges(self, session_maker):
+        """測試：啟動時續行 DELETING 狀態的 Agent"""
+        await _seed_agent(session_maker, "interrupted", status=AgentStatus.DELETING.value)
+        await _seed_agent(session_maker, "alive", rows=1)
+
+        service = AgentPurgeService(session_maker)
+        assert await service.resume_pending() == ["interrupted"]
+
+        job = await service.wait("interrupted")
+        assert job.status == PURGE_COMPLETED
+        assert await _count(session_maker, Agent, "interrupted") == 0
+        assert await _count(session_maker, Agent, "alive") == 1
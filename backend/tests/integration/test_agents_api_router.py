@@ -23,7 +23,11 @@ from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.server import app
-from api.routers.agents import get_agents_service
+from api.routers.agents import (
+    get_agent_purge_service,
+    get_agents_service,
+    get_read_agents_service,
+)
 from database.models import Agent, AgentHolding
 from common.enums import AgentMode, AgentStatus
 from service.agents_service import (
@@ -112,6 +116,7 @@ def test_list_agents_success(test_client, mock_agents_service, sample_agent_mode
 
     # 模擬依賴注入
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
 
     try:
         response = test_client.get("/api/agents")
@@ -132,6 +137,8 @@ def test_list_agents_empty(test_client, mock_agents_service):
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.get("/api/agents")
         assert response.status_code == 200
@@ -148,6 +155,8 @@ def test_list_agents_database_error(test_client, mock_agents_service):
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.get("/api/agents")
         assert response.status_code == 500
@@ -179,6 +188,8 @@ def test_list_agents_investment_preferences_parsing(test_client, mock_agents_ser
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.get("/api/agents")
         assert response.status_code == 200
@@ -212,6 +223,8 @@ def test_list_agents_malformed_json_preference(test_client, mock_agents_service)
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.get("/api/agents")
         assert response.status_code == 200
@@ -244,6 +257,8 @@ def test_get_agent_success(test_client, mock_agents_service, sample_agent_model)
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.get("/api/agents/agent_123")
         assert response.status_code == 200
@@ -262,6 +277,8 @@ def test_get_agent_not_found(test_client, mock_agents_service):
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.get("/api/agents/nonexistent_agent")
         assert response.status_code == 404
@@ -277,6 +294,8 @@ def test_get_agent_database_error(test_client, mock_agents_service):
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.get("/api/agents/agent_123")
         assert response.status_code == 500
@@ -296,6 +315,8 @@ def test_create_agent_success(test_client, mock_agents_service, sample_agent_mod
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         request_payload = {
             "name": "Test Agent",
@@ -321,6 +342,8 @@ def test_create_agent_invalid_model(test_client, mock_agents_service):
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         request_payload = {
             "name": "Test Agent",
@@ -344,6 +367,8 @@ def test_create_agent_configuration_error(test_client, mock_agents_service):
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         request_payload = {
             "name": "Test Agent",
@@ -375,6 +400,8 @@ def test_update_agent_success(test_client, mock_agents_service, sample_agent_mod
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         request_payload = {
             "name": "Updated Agent",
@@ -396,6 +423,8 @@ def test_update_agent_not_found(test_client, mock_agents_service):
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         request_payload = {"name": "Updated"}
         response = test_client.put("/api/agents/nonexistent", json=request_payload)
@@ -415,9 +444,15 @@ def test_delete_agent_success(test_client, mock_agents_service, sample_agent_mod
     mock_agents_service.session = AsyncMock()
     mock_agents_service.session.delete = AsyncMock()
     mock_agents_service.session.commit = AsyncMock()
+    # 沒有 RUNNING 會話
+    idle = MagicMock()
+    idle.scalars.return_value.all.return_value = []
+    mock_agents_service.session.execute = AsyncMock(return_value=idle)
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.delete("/api/agents/agent_123")
         assert response.status_code == 200 or response.status_code == 204
@@ -425,12 +460,35 @@ def test_delete_agent_success(test_client, mock_agents_service, sample_agent_mod
         app.dependency_overrides.clear()
 
 
+def test_delete_agent_running_conflict(test_client, mock_agents_service, sample_agent_model):
+    """測試刪除執行中的 Agent 回傳 409，且不標記刪除也不排程清除"""
+    mock_agents_service.get_agent_config.return_value = sample_agent_model
+    running = MagicMock()
+    running.scalars.return_value.all.return_value = [MagicMock()]
+    mock_agents_service.session.execute.return_value = running
+    purge_service = MagicMock()
+
+    app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
+    app.dependency_overrides[get_agent_purge_service] = lambda: purge_service
+
+    try:
+        response = test_client.delete("/api/agents/agent_123")
+        assert response.status_code == 409
+        assert sample_agent_model.status == AgentStatus.ACTIVE
+        mock_agents_service.session.commit.assert_not_called()
+        purge_service.start.assert_not_called()
+    finally:
+        app.dependency_overrides.clear()
+
+
 def test_delete_agent_not_found(test_client, mock_agents_service):
     """測試刪除不存在的 Agent"""
     mock_agents_service.get_agent_config.side_effect = AgentNotFoundError("Agent not found")
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.delete("/api/agents/nonexistent")
         assert response.status_code == 404
@@ -486,6 +544,8 @@ def test_get_agent_with_null_fields(test_client, mock_agents_service):
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         response = test_client.get("/api/agents/agent_null")
         assert response.status_code == 200
@@ -503,6 +563,8 @@ def test_create_agent_with_special_characters(test_client, mock_agents_service,
 
     app.dependency_overrides[get_agents_service] = lambda: mock_agents_service
 
+    app.dependency_overrides[get_read_agents_service] = lambda: mock_agents_service
+
     try:
         request_payload = {
             "name": "Test Agent 🤖 中文",
@@ -0,0 +1,167 @@
+"""
+PostgreSQL LISTEN/NOTIFY 事件匯流排整合測試（多 worker）
+
+需要可連線的 PostgreSQL（EVENT_BUS_TEST_DATABASE_URL，預設使用 DATABASE_URL）；
+無法連線時略過。
+
+測試範圍：
+- 兩個 worker（各自的 WebSocketManager 與匯流排）都收到同一事件，且各只推送一次
+- 主題訂閱在各 worker 本機判斷
+- 另一個程序發佈的事件送達本程序的連線
+- 超過 NOTIFY 上限的事件分段傳送
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+
+from api.config import get_settings
+from api.event_bus import PostgresEventBus
+from api.websocket import TOPIC_ALL, WebSocketManager, agent_topic
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+def _database_url() -> str:
+    return os.getenv("EVENT_BUS_TEST_DATABASE_URL") or get_settings().database_url
+
+
+@pytest.fixture
+async def dsn():
+    """可連線的 PostgreSQL DSN，無法連線時略過"""
+    import asyncpg
+
+    url = _database_url()
+    if not url.startswith("postgresql"):
+        pytest.skip("PostgreSQL database URL not configured")
+    dsn = url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    try:
+        conn = await asyncpg.connect(dsn, timeout=3)
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not reachable: {e}")
+    await conn.close()
+    return dsn
+
+
+@pytest.fixture
+def channel(request):
+    """每個測試使用獨立頻道，避免互相干擾"""
+    return f"ws_test_{os.getpid()}_{request.node.name}"[:63]
+
+
+async def _start_worker(dsn: str, channel: str) -> tuple[WebSocketManager, AsyncMock]:
+    """建立一個 worker：管理器、匯流排與一個已連線客戶端"""
+    manager = WebSocketManager(event_bus=PostgresEventBus(dsn, channel=channel))
+    await manager.startup()
+    client = AsyncMock(spec=WebSocket)
+    await manager.connect(client)
+    return manager, client
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.02)
+
+
+def _sent(client: AsyncMock) -> list[dict]:
+    return [json.loads(call.args[0]) for call in client.send_text.call_args_list]
+
+
+@pytest.mark.asyncio
+class TestPostgresEventBus:
+    """測試跨 worker 事件傳遞"""
+
+    async def test_event_published_once_reaches_every_worker(self, dsn, channel):
+        """測試：一個 worker 發佈，所有 worker 的客戶端各收到一次"""
+        worker_a, client_a = await _start_worker(dsn, channel)
+        worker_b, client_b = await _start_worker(dsn, channel)
+        try:
+            await worker_a.broadcast({"type": "agent_status", "agent_id": "a1"})
+
+            await _wait_for(lambda: client_a.send_text.called and client_b.send_text.called)
+            await asyncio.sleep(0.1)
+            assert [m["type"] for m in _sent(client_a)] == ["agent_status"]
+            assert [m["type"] for m in _sent(client_b)] == ["agent_status"]
+            assert worker_a.get_metrics()["event_bus"]["published"] == 1
+            assert worker_b.get_metrics()["event_bus"]["published"] == 0
+        finally:
+            await worker_a.shutdown()
+            await worker_b.shutdown()
+
+    async def test_topic_filtering_per_worker(self, dsn, channel):
+        """測試：只有訂閱主題的 worker 客戶端收到 Agent 事件"""
+        worker_a, client_a = await _start_worker(dsn, channel)
+        worker_b, client_b = await _start_worker(dsn, channel)
+        try:
+            await worker_b.unsubscribe(client_b, [TOPIC_ALL])
+            await worker_a.unsubscribe(client_a, [TOPIC_ALL])
+            await worker_a.subscribe(client_a, [agent_topic("a1")])
+
+            await worker_b.broadcast_trade_execution("a1", {"ticker": "2330"})
+
+            await _wait_for(lambda: client_a.send_text.called)
+            await asyncio.sleep(0.1)
+            assert _sent(client_a)[0]["data"] == {"ticker": "2330"}
+            client_b.send_text.assert_not_called()
+        finally:
+            await worker_a.shutdown()
+            await worker_b.shutdown()
+
+    async def test_event_from_other_process(self, dsn, channel):
+        """測試：另一個 worker 程序發佈的事件送達本程序"""
+        worker, client = await _start_worker(dsn, channel)
+        script = textwrap.dedent(
+            f"""
+            import asyncio
+            from api.event_bus import PostgresEventBus
+            from api.websocket import WebSocketManager
+
+            async def main():
+                manager = WebSocketManager(event_bus=PostgresEventBus({dsn!r}, channel={channel!r}))
+                await manager.startup()
+                await manager.broadcast_execution_started("a1", "s1", "TRADING")
+                await manager.shutdown()
+
+            asyncio.run(main())
+            """
+        )
+        try:
+            env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+            result = await asyncio.to_thread(
+                subprocess.run,
+                [sys.executable, "-c", script],
+                env=env,
+                capture_output=True,
+                timeout=60,
+            )
+            assert result.returncode == 0, result.stderr.decode()
+
+            await _wait_for(lambda: client.send_text.called)
+            assert _sent(client)[0]["type"] == "execution_started"
+        finally:
+            await worker.shutdown()
+
+    async def test_large_event_chunked(self, dsn, channel):
+        """測試：超過 NOTIFY 上限的事件完整送達"""
+        worker_a, _client_a = await _start_worker(dsn, channel)
+        worker_b, client_b = await _start_worker(dsn, channel)
+        try:
+            text = "台積電法說會" * 5000
+            await worker_a.broadcast({"type": "execution_stream", "text": text})
+
+            await _wait_for(lambda: client_b.send_text.called)
+            assert _sent(client_b)[0]["text"] == text
+        finally:
+            await worker_a.shutdown()
+            await worker_b.shutdown()
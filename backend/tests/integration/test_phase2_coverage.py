@@ -11,7 +11,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 
 from api.server import app
-from api.routers.agents import get_agents_service
+from api.routers.agents import get_agents_service, get_read_agents_service
 from database.models import Agent
 from common.enums import AgentStatus, AgentMode
 from service.agents_service import AgentsService, AgentNotFoundError
@@ -50,6 +50,7 @@ def test_list_agents_success():
 
         client = TestClient(app)
         app.dependency_overrides[get_agents_service] = lambda: mock_service
+        app.dependency_overrides[get_read_agents_service] = lambda: mock_service
 
         # 由於實際路由是異步的，我們需要測試實際的 API 端點
         # 但首先需要確保模擬正確設置
@@ -70,6 +71,7 @@ def test_get_agent_not_found():
 
         client = TestClient(app)
         app.dependency_overrides[get_agents_service] = lambda: mock_service
+        app.dependency_overrides[get_read_agents_service] = lambda: mock_service
 
         try:
             response = client.get("/api/agents/nonexistent")
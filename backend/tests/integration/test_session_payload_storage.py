@@ -0,0 +1,108 @@
+"""
+AgentSession 大型內容壓縮儲存整合測試
+
+測試範圍：
+- initial_input / final_output / tools_called 存放於 agent_session_payloads
+- 大型內容會被壓縮，小型內容以原始 JSON 儲存
+- 列表查詢不載入 payload，詳情查詢可按需載入
+- 刪除會話時一併刪除 payload
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm.attributes import instance_state
+
+from common.enums import AgentMode, SessionStatus
+from database.compression import CODEC_RAW, decode_payload, encode_payload
+from database.models import Agent, AgentSessionPayload
+from service.session_service import AgentSessionService
+
+
+@pytest.fixture
+async def agent(test_db_session):
+    """建立測試用 Agent"""
+    agent = Agent(
+        id="payload-agent",
+        name="Payload Agent",
+        ai_model="gpt-5-mini",
+        initial_funds=1000000,
+        current_funds=1000000,
+    )
+    test_db_session.add(agent)
+    await test_db_session.commit()
+    return agent
+
+
+class TestPayloadCodec:
+    """測試 payload 編解碼"""
+
+    def test_small_payload_stored_raw(self):
+        """測試：小型內容不壓縮"""
+        codec, data, raw_size = encode_payload({"q": 1})
+        assert codec == CODEC_RAW
+        assert raw_size == len(data)
+        assert decode_payload(codec, data) == {"q": 1}
+
+    def test_large_payload_compressed(self):
+        """測試：大型內容壓縮後可還原"""
+        value = {"final_output": "買進 2330 " * 2000}
+        codec, data, raw_size = encode_payload(value)
+        assert codec != CODEC_RAW
+        assert len(data) < raw_size
+        assert decode_payload(codec, data) == value
+
+
+@pytest.mark.asyncio
+class TestSessionPayloadStorage:
+    """測試會話大型內容的離線儲存"""
+
+    async def test_round_trip_through_service(self, test_db_session, agent):
+        """測試：透過服務層寫入並讀回大型內容"""
+        service = AgentSessionService(test_db_session)
+        session = await service.create_session(
+            agent_id=agent.id, mode=AgentMode.TRADING, initial_input={"prompt": "分析"}
+        )
+
+        long_output = "交易摘要 " * 5000
+        await service.update_session_status(
+            session.id, SessionStatus.COMPLETED, final_output=long_output
+        )
+
+        test_db_session.expunge_all()
+        detail = await service.get_session(session.id, with_payload=True)
+        assert detail.initial_input == {"prompt": "分析"}
+        assert detail.final_output == long_output
+
+        payload = detail.payload
+        assert payload.codec != CODEC_RAW
+        assert len(payload.data) < payload.raw_size
+
+    async def test_list_does_not_load_payload(self, test_db_session, agent):
+        """測試：列表查詢不載入 payload"""
+        service = AgentSessionService(test_db_session)
+        session = await service.create_session(agent_id=agent.id, mode=AgentMode.TRADING)
+        await service.update_session_status(
+            session.id, SessionStatus.COMPLETED, final_output="done"
+        )
+
+        test_db_session.expunge_all()
+        sessions = await service.list_agent_sessions(agent.id)
+        assert len(sessions) == 1
+        assert "payload" in instance_state(sessions[0]).unloaded
+
+        with_payload = await service.list_agent_sessions(agent.id, with_payload=True)
+        assert with_payload[0].final_output == "done"
+
+    async def test_delete_session_removes_payload(self, test_db_session, agent):
+        """測試：刪除會話時一併刪除 payload"""
+        service = AgentSessionService(test_db_session)
+        session = await service.create_session(
+            agent_id=agent.id, mode=AgentMode.TRADING, initial_input={"x": 1}
+        )
+
+        await service.delete_session(session.id)
+
+        count = await test_db_session.scalar(select(func.count()).select_from(AgentSessionPayload))
+        assert count == 0
@@ -0,0 +1,200 @@
+"""
+SQLite single-node profile 整合測試
+
+測試範圍：
+- 連線建立時套用 WAL / synchronous / busy_timeout / mmap_size pragma
+- 唯讀連線無法寫入
+- 單一寫入者佇列：批次提交、單一工作失敗不影響同批次其他工作
+- execute_trade_atomic 在寫入佇列啟用時透過寫入者提交，並更新呼叫端 session
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import api.config as config
+from common.enums import AgentMode
+from database.models import Agent, AgentHolding, Base, Transaction
+from database.sqlite import SQLiteWriteQueue, apply_sqlite_pragmas, is_file_sqlite_url
+from service.session_service import AgentSessionService
+from service.trading_service import TradingService
+
+
+def _make_engine(url: str, pool_size: int = 1, **kwargs):
+    """建立套用 pragma 的 SQLite engine"""
+    engine = create_async_engine(url, pool_size=pool_size, max_overflow=0)
+    apply_sqlite_pragmas(engine, busy_timeout_ms=2000, mmap_size=1 << 20, **kwargs)
+    return engine
+
+
+@pytest.fixture
+async def sqlite_url(tmp_path):
+    """建立已有資料表的 SQLite 檔案"""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"
+    engine = _make_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+    return url
+
+
+@pytest.fixture
+async def write_queue(sqlite_url):
+    """啟動綁定寫入者 engine 的寫入佇列"""
+    engine = _make_engine(sqlite_url, immediate_transactions=True)
+    queue = SQLiteWriteQueue(
+        async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+        max_batch_size=16,
+        batch_window_ms=20,
+    )
+    await queue.start()
+    yield queue
+    await queue.stop()
+    await engine.dispose()
+
+
+def _add_agent(agent_id: str):
+    """回傳新增 Agent 的寫入工作"""
+
+    async def job(session: AsyncSession):
+        session.add(
+            Agent(
+                id=agent_id,
+                name=agent_id,
+                ai_model="gpt-5-mini",
+                initial_funds=1000000,
+                current_funds=1000000,
+            )
+        )
+        await session.flush()
+        return agent_id
+
+    return job
+
+
+class TestSQLiteUrl:
+    """測試 SQLite URL 判斷"""
+
+    def test_file_url_detection(self):
+        """測試：僅檔案型 SQLite 啟用 profile"""
+        assert is_file_sqlite_url("sqlite+aiosqlite:///./casualtrader.db")
+        assert not is_file_sqlite_url("sqlite+aiosqlite:///:memory:")
+        assert not is_file_sqlite_url("postgresql+asyncpg://u:p@host/db")
+        assert not is_file_sqlite_url(None)
+
+
+@pytest.mark.asyncio
+class TestSQLitePragmas:
+    """測試連線 pragma 設定"""
+
+    async def test_pragmas_applied_on_connect(self, sqlite_url):
+        """測試：新連線使用 WAL 與 synchronous=NORMAL"""
+        engine = _make_engine(sqlite_url)
+        async with engine.connect() as conn:
+            assert (await conn.scalar(text("PRAGMA journal_mode"))).lower() == "wal"
+            assert await conn.scalar(text("PRAGMA synchronous")) == 1  # NORMAL
+            assert await conn.scalar(text("PRAGMA busy_timeout")) == 2000
+        await engine.dispose()
+
+    async def test_read_only_connection_rejects_writes(self, sqlite_url):
+        """測試：唯讀連線池無法寫入"""
+        engine = _make_engine(sqlite_url, read_only=True)
+        async with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("DELETE FROM agents"))
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestSQLiteWriteQueue:
+    """測試單一寫入者佇列"""
+
+    async def test_concurrent_writes_are_batched(self, write_queue, sqlite_url):
+        """測試：併發寫入合併為較少次提交"""
+        results = await asyncio.gather(
+            *(write_queue.submit(_add_agent(f"agent-{i}")) for i in range(10))
+        )
+
+        assert results == [f"agent-{i}" for i in range(10)]
+        assert write_queue.jobs_completed == 10
+        assert write_queue.batches_committed < 10
+
+        engine = _make_engine(sqlite_url, read_only=True)
+        async with engine.connect() as conn:
+            assert await conn.scalar(select(func.count()).select_from(Agent)) == 10
+        await engine.dispose()
+
+    async def test_failed_job_does_not_affect_batch(self, write_queue, sqlite_url):
+        """測試：單一工作失敗只回滾該工作"""
+
+        async def failing(session: AsyncSession):
+            session.add(Agent(id="bad", name="bad", ai_model="x", initial_funds=1))
+            await session.flush()
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            write_queue.submit(_add_agent("good-1")),
+            write_queue.submit(failing),
+            write_queue.submit(_add_agent("good-2")),
+            return_exceptions=True,
+        )
+
+        assert results[0] == "good-1"
+        assert isinstance(results[1], ValueError)
+        assert results[2] == "good-2"
+        assert write_queue.jobs_failed == 1
+
+        engine = _make_engine(sqlite_url, read_only=True)
+        async with engine.connect() as conn:
+            ids = set((await conn.execute(select(Agent.id))).scalars())
+        await engine.dispose()
+        assert ids == {"good-1", "good-2"}
+
+    async def test_submit_requires_running_queue(self, sqlite_url):
+        """測試：未啟動時提交會失敗"""
+        engine = _make_engine(sqlite_url)
+        queue = SQLiteWriteQueue(async_sessionmaker(engine, class_=AsyncSession))
+        with pytest.raises(RuntimeError):
+            await queue.submit(_add_agent("x"))
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestTradeThroughWriteQueue:
+    """測試交易透過單一寫入者提交"""
+
+    async def test_execute_trade_atomic_uses_writer(self, write_queue, sqlite_url, monkeypatch):
+        """測試：交易由寫入者提交，呼叫端 session 看到最新資金"""
+        await write_queue.submit(_add_agent("trader"))
+        monkeypatch.setattr(config, "_sqlite_write_queue", write_queue)
+
+        engine = _make_engine(sqlite_url, pool_size=2)
+        maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with maker() as session:
+            agent_session = await AgentSessionService(session).create_session(
+                agent_id="trader", mode=AgentMode.TRADING
+            )
+            agent = await session.get(Agent, "trader")
+            assert float(agent.current_funds) == 1000000
+
+            service = TradingService(session)
+            service.session_id = agent_session.id
+            result = await service.execute_trade_atomic(
+                agent_id="trader", ticker="2330", action="BUY", quantity=1000, price=500.0
+            )
+
+            assert result["success"], result
+            assert write_queue.jobs_completed == 2
+            assert float(agent.current_funds) == pytest.approx(1000000 - 500000 * 1.001425)
+
+            holding = await session.scalar(
+                select(AgentHolding).where(AgentHolding.agent_id == "trader")
+            )
+            assert holding.quantity == 1000
+            assert await session.scalar(select(func.count()).select_from(Transaction)) == 1
+        await engine.dispose()
@@ -0,0 +1,187 @@
+"""
+既有 SQLite 資料庫升級整合測試
+
+測試範圍：
+- 舊版 agent_sessions 內嵌的 initial_input / final_output / tools_called
+  於啟動時（ensure_tables_exist）搬入 agent_session_payloads 並移除舊欄位
+- 升級可重複執行，已有 payload 的會話不被覆寫
+- 舊版 agents 的 check_agent_status 不含 deleting 時重建資料表，保留資料、索引與子資料表
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.init import ensure_tables_exist
+from service.session_service import AgentSessionService
+
+# 升級前（baseline）由 create_all 建立的資料表
+LEGACY_SCHEMA = (
+    """
+    CREATE TABLE agents (
+        id VARCHAR(50) NOT NULL,
+        name VARCHAR(200) NOT NULL,
+        description TEXT,
+        ai_model VARCHAR(50) NOT NULL,
+        color_theme VARCHAR(20) NOT NULL,
+        initial_funds NUMERIC(15, 2) NOT NULL,
+        current_funds NUMERIC(15, 2) NOT NULL,
+        max_position_size NUMERIC(5, 2) NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        current_mode VARCHAR(30) NOT NULL,
+        investment_preferences TEXT,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        last_active_at DATETIME,
+        PRIMARY KEY (id),
+        CONSTRAINT check_agent_status CHECK (status IN ('active', 'inactive', 'error', 'suspended')),
+        CONSTRAINT check_agent_mode CHECK (current_mode IN ('TRADING', 'REBALANCING'))
+    )
+    """,
+    """
+    CREATE TABLE agent_sessions (
+        id VARCHAR(50) NOT NULL,
+        agent_id VARCHAR(50) NOT NULL,
+        mode VARCHAR(30) NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        start_time DATETIME NOT NULL,
+        end_time DATETIME,
+        execution_time_ms INTEGER,
+        initial_input JSON,
+        final_output TEXT,
+        tools_called TEXT,
+        error_message TEXT,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT check_session_status
+            CHECK (status IN ('pending', 'running', 'completed', 'failed', 'timeout')),
+        FOREIGN KEY(agent_id) REFERENCES agents (id)
+    )
+    """,
+    "CREATE INDEX idx_agents_status ON agents (status)",
+    "CREATE INDEX idx_sessions_agent_id ON agent_sessions (agent_id)",
+    """
+    INSERT INTO agents VALUES ('a1', 'Agent', NULL, 'gpt-5-mini', '34, 197, 94', 1000000,
+        1000000, 50, 'inactive', 'TRADING', NULL, '2026-10-01 00:00:00.000000',
+        '2026-10-01 00:00:00.000000', NULL)
+    """,
+    """
+    INSERT INTO agent_sessions VALUES ('s1', 'a1', 'TRADING', 'completed',
+        '2026-10-01 01:00:00.000000', NULL, 1200, '{"prompt": "buy"}', 'BIG OUTPUT',
+        '["get_stock_price"]', NULL, '2026-10-01 01:00:00.000000', '2026-10-01 01:00:00.000000')
+    """,
+    """
+    INSERT INTO agent_sessions VALUES ('s2', 'a1', 'TRADING', 'failed',
+        '2026-10-01 02:00:00.000000', NULL, NULL, NULL, NULL, NULL, 'boom',
+        '2026-10-01 02:00:00.000000', '2026-10-01 02:00:00.000000')
+    """,
+)
+
+
+@pytest.fixture(params=[False, True], ids=["fk-off", "fk-on"])
+async def legacy_engine(tmp_path, request):
+    """以升級前資料表結構建立的 SQLite 檔案（外鍵檢查關閉 / 開啟）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+    if request.param:
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _foreign_keys(dbapi_connection, _record):
+            dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+    async with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.exec_driver_sql(statement)
+    yield engine
+    await engine.dispose()
+
+
+async def _columns(engine, table: str) -> list[str]:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"PRAGMA table_info({table})")
+        return [row[1] for row in result]
+
+
+class TestSessionPayloadUpgrade:
+    """測試會話內容搬移"""
+
+    async def test_inline_payloads_moved(self, legacy_engine):
+        """測試：舊欄位的內容搬入 payload 表後可由 ORM 讀出，舊欄位被移除"""
+        await ensure_tables_exist(legacy_engine)
+
+        maker = async_sessionmaker(legacy_engine, class_=AsyncSession, expire_on_commit=False)
+        async with maker() as db:
+            service = AgentSessionService(db)
+            moved = await service.get_session("s1", with_payload=True)
+            empty = await service.get_session("s2", with_payload=True)
+
+        assert moved.final_output == "BIG OUTPUT"
+        assert moved.initial_input == {"prompt": "buy"}
+        assert moved.tools_called == '["get_stock_price"]'
+        assert empty.final_output is None
+        assert empty.error_message == "boom"
+        columns = await _columns(legacy_engine, "agent_sessions")
+        assert not {"initial_input", "final_output", "tools_called"} & set(columns)
+
+    async def test_upgrade_is_idempotent(self, legacy_engine):
+        """測試：重複啟動不會重複搬移或覆寫新寫入的 payload"""
+        await ensure_tables_exist(legacy_engine)
+        maker = async_sessionmaker(legacy_engine, class_=AsyncSession, expire_on_commit=False)
+        async with maker() as db:
+            await AgentSessionService(db).update_session_output("s1", final_output="NEW")
+
+        await ensure_tables_exist(legacy_engine)
+
+        async with legacy_engine.connect() as conn:
+            count = await conn.scalar(text("SELECT COUNT(*) FROM agent_session_payloads"))
+        async with maker() as db:
+            session = await AgentSessionService(db).get_session("s1", with_payload=True)
+        assert count == 1
+        assert session.final_output == "NEW"
+
+
+class TestAgentStatusUpgrade:
+    """測試 agents 狀態約束重建"""
+
+    async def test_deleting_status_allowed(self, legacy_engine):
+        """測試：升級後可標記為 deleting，資料、索引與會話保留，重複執行不再重建"""
+        await ensure_tables_exist(legacy_engine)
+
+        async with legacy_engine.begin() as conn:
+            await conn.execute(text("UPDATE agents SET status = 'deleting' WHERE id = 'a1'"))
+        async with legacy_engine.connect() as conn:
+            agent = (await conn.execute(text("SELECT name, status FROM agents"))).one()
+            sessions = await conn.scalar(text("SELECT COUNT(*) FROM agent_sessions"))
+            indexes = await conn.scalars(
+                text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'agents'")
+            )
+            index_names = set(indexes)
+            table_sql = await conn.scalar(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'agents'")
+            )
+            violations = (await conn.exec_driver_sql("PRAGMA foreign_key_check")).fetchall()
+
+        assert tuple(agent) == ("Agent", "deleting")
+        assert sessions == 2
+        assert "idx_agents_status" in index_names
+        assert "agents_new" not in table_sql
+        assert violations == []
+
+        await ensure_tables_exist(legacy_engine)
+        async with legacy_engine.connect() as conn:
+            assert (
+                await conn.scalar(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'agents'")
+                )
+                == table_sql
+            )
+
+    async def test_legacy_constraint_rejects_deleting(self, legacy_engine):
+        """測試：未升級的資料表確實拒絕 deleting（重現升級前的錯誤）"""
+        from sqlalchemy.exc import IntegrityError
+
+        with pytest.raises(IntegrityError):
+            async with legacy_engine.begin() as conn:
+                await conn.execute(text("UPDATE agents SET status = 'deleting'"))
@@ -0,0 +1,171 @@
+"""
+測試離線回測引擎
+
+測試場景:
+1. 成交規則與實盤一致（整張、手續費、平均成本、資金）
+2. 不可行的決策被拒絕且不影響帳本
+3. 重播已記錄的決策
+4. 均線交叉規則策略
+5. 績效摘要與 AgentsService 公式一致
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import pairwise
+from types import SimpleNamespace
+
+import pytest
+
+from common.enums import TransactionAction
+from service import performance_metrics
+from trading.backtest import (
+    BacktestEngine,
+    BacktestError,
+    Decision,
+    RecordedDecisions,
+    moving_average_crossover,
+)
+
+START = date(2024, 1, 1)
+
+
+def series(closes: list[float], start: date = START) -> dict[date, float]:
+    """建立連續交易日的收盤價"""
+    return {start + timedelta(days=i): price for i, price in enumerate(closes)}
+
+
+def scripted(plan: dict[int, list[Decision]]):
+    """依交易日序號送出固定決策"""
+
+    def decide(day, _ledger):
+        return plan.get(day.index, [])
+
+    return decide
+
+
+class TestLedger:
+    """測試成交規則"""
+
+    def test_buy_and_sell_follow_trade_pipeline(self):
+        """測試：手續費、平均成本、資金與實盤公式相同"""
+        engine = BacktestEngine({"2330": series([100, 110, 120])})
+        plan = {
+            0: [Decision("2330", "BUY", 1000)],
+            1: [Decision("2330", "BUY", 1000)],
+            2: [Decision("2330", "SELL", 1000)],
+        }
+
+        ledger = engine.run({"a1": scripted(plan)}, initial_funds=1_000_000)["a1"].ledger
+
+        position = ledger.holdings["2330"]
+        assert position.quantity == 1000
+        assert position.average_cost == pytest.approx(105)
+        expected_cash = 1_000_000 - 100_000 * 1.001425 - 110_000 * 1.001425 + 120_000 * 0.998575
+        assert ledger.cash == pytest.approx(expected_cash)
+        assert [t.action for t in ledger.trades] == [
+            TransactionAction.BUY,
+            TransactionAction.BUY,
+            TransactionAction.SELL,
+        ]
+        assert ledger.trades[0].commission == Decimal("142.5")
+
+    @pytest.mark.parametrize(
+        "decision",
+        [
+            Decision("2330", "BUY", 500),  # 非整張
+            Decision("2330", "HOLD", 1000),  # 無效動作
+            Decision("2330", "SELL", 1000),  # 沒有持股
+            Decision("2330", "BUY", 20000),  # 資金不足
+            Decision("2317", "BUY", 1000),  # 當日沒有收盤價
+        ],
+    )
+    def test_infeasible_decisions_rejected(self, decision):
+        """測試：不可行的決策被拒絕，帳本不變"""
+        engine = BacktestEngine({"2330": series([100]), "2317": series([50], START + timedelta(1))})
+
+        result = engine.run({"a1": scripted({0: [decision]})}, initial_funds=1_000_000)["a1"]
+
+        assert result.ledger.trades == []
+        assert result.ledger.cash == 1_000_000
+        assert len(result.ledger.rejected) == 1
+
+    def test_invalid_initial_funds(self):
+        """測試：初始資金必須為正數"""
+        with pytest.raises(BacktestError):
+            BacktestEngine({"2330": series([100])}).run({}, initial_funds=0)
+
+
+class TestDecisionFunctions:
+    """測試決策函式"""
+
+    def test_recorded_decisions_replayed(self):
+        """測試：以記錄的日期與成交價重播"""
+        transactions = [
+            SimpleNamespace(
+                execution_time=None,
+                created_at=START + timedelta(days=1),
+                ticker="2330",
+                action=TransactionAction.BUY,
+                quantity=1000,
+                price=Decimal("101.5"),
+                decision_reason="LLM 決策",
+            )
+        ]
+        engine = BacktestEngine({"2330": series([100, 102, 104])})
+
+        ledger = engine.run({"a1": RecordedDecisions.from_transactions(transactions)})["a1"].ledger
+
+        (trade,) = ledger.trades
+        assert (trade.date, trade.price, trade.reason) == (
+            START + timedelta(days=1),
+            Decimal("101.5"),
+            "LLM 決策",
+        )
+
+    def test_moving_average_crossover(self):
+        """測試：均線交叉時買進並在反轉時賣出"""
+        closes = [100] * 5 + [110, 120, 130] + [90, 80, 70]
+        engine = BacktestEngine({"2330": series(closes)})
+
+        ledger = engine.run(
+            {"a1": moving_average_crossover(["2330"], short_window=2, long_window=4)}
+        )["a1"].ledger
+
+        assert [t.action for t in ledger.trades] == [TransactionAction.BUY, TransactionAction.SELL]
+        assert ledger.holdings == {}
+
+
+class TestSummary:
+    """測試績效摘要"""
+
+    def test_metrics_use_agents_service_formulas(self):
+        """測試：摘要指標與共用公式一致"""
+        closes = [100 + (i % 7) * 3 - (i % 5) * 2 for i in range(40)]
+        engine = BacktestEngine({"2330": series(closes)})
+        plan = {0: [Decision("2330", "BUY", 2000)], 20: [Decision("2330", "SELL", 1000)]}
+
+        result = engine.run({"a1": scripted(plan)}, initial_funds=500_000)["a1"]
+        summary = result.summary()
+
+        values = [value for _, value in result.equity_curve]
+        returns = [performance_metrics.daily_return(prev, cur) for prev, cur in pairwise(values)]
+        assert summary["max_drawdown"] == performance_metrics.max_drawdown(values)
+        assert summary["sharpe_ratio"] == performance_metrics.sharpe_ratio(returns)
+        assert summary["total_value"] == values[-1]
+        assert summary["total_return"] == (values[-1] - 500_000) / 500_000
+        assert summary["total_trades"] == 2
+        assert summary["sell_trades_count"] == 1
+        assert summary["realized_pnl"] == performance_metrics.realized_pnl(result.ledger.trades)
+
+    def test_many_agents_share_price_history(self):
+        """測試：多個 Agent 在同一次回測中各自獨立"""
+        engine = BacktestEngine({"2330": series([100, 101])})
+        strategies = {
+            "buyer": scripted({0: [Decision("2330", "BUY", 1000)]}),
+            "idle": scripted({}),
+        }
+
+        results = engine.run(strategies)
+
+        assert len(results["buyer"].ledger.trades) == 1
+        assert results["idle"].summary()["total_return"] == 0
@@ -0,0 +1,160 @@
+"""
+測試 WebSocket 事件匯流排
+
+測試場景:
+1. NOTIFY payload 編碼與分段重組（含多位元組字元）
+2. 單一程序匯流排直接交給本機處理
+3. 非本機匯流排：事件一律經由匯流排，由各 worker 自行推送
+4. 依設定建立匯流排
+"""
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+
+from api.event_bus import (
+    EventBusError,
+    InProcessEventBus,
+    NotificationDecoder,
+    PostgresEventBus,
+    create_event_bus,
+    encode_notifications,
+)
+from api.websocket import TOPIC_ALL, WebSocketManager, agent_topic
+
+
+class LoopbackBus(InProcessEventBus):
+    """模擬跨 worker 匯流排：發佈的事件保留到 deliver() 才交給本機"""
+
+    local_only = False
+
+    def __init__(self):
+        super().__init__()
+        self.outbox: list[tuple[str | None, str]] = []
+
+    async def publish(self, topic, message_text):
+        self.published += 1
+        self.outbox.append((topic, message_text))
+
+    async def deliver(self):
+        while self.outbox:
+            await self._handler(*self.outbox.pop(0))
+
+
+class TestNotificationEncoding:
+    """測試 NOTIFY payload 編碼"""
+
+    def test_small_event_single_payload(self):
+        """測試：小事件不分段"""
+        payloads = encode_notifications("agent:a1", '{"type": "x"}')
+        assert len(payloads) == 1
+        assert NotificationDecoder().feed(payloads[0]) == ("agent:a1", '{"type": "x"}')
+
+    def test_large_event_chunked_and_reassembled(self):
+        """測試：超過上限的事件分段後可完整重組（含中文）"""
+        message_text = json.dumps({"type": "execution_stream", "text": "買進台積電" * 2000})
+        payloads = encode_notifications(None, message_text, max_bytes=1000)
+
+        assert len(payloads) > 1
+        assert all(len(p.encode("utf-8")) <= 1000 for p in payloads)
+
+        decoder = NotificationDecoder()
+        results = [decoder.feed(p) for p in payloads]
+        assert results[:-1] == [None] * (len(payloads) - 1)
+        assert results[-1] == (None, message_text)
+
+    def test_interleaved_chunks(self):
+        """測試：不同事件的分段可交錯重組"""
+        first = encode_notifications("a", "x" * 3000, max_bytes=1000)
+        second = encode_notifications("b", "y" * 3000, max_bytes=1000)
+
+        decoder = NotificationDecoder()
+        completed = [
+            event
+            for pair in zip(first, second)
+            for event in (decoder.feed(pair[0]), decoder.feed(pair[1]))
+            if event is not None
+        ]
+        assert completed == [("a", "x" * 3000), ("b", "y" * 3000)]
+
+    def test_unknown_format_rejected(self):
+        """測試：無法辨識的 payload"""
+        with pytest.raises(EventBusError):
+            NotificationDecoder().feed("garbage")
+
+
+class TestManagerWithEventBus:
+    """測試 WebSocketManager 經由事件匯流排發佈"""
+
+    @pytest.mark.asyncio
+    async def test_in_process_bus_delivers_locally(self):
+        """測試：預設匯流排直接推送給本機連線"""
+        bus = InProcessEventBus()
+        manager = WebSocketManager(event_bus=bus)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+
+        await manager.broadcast({"type": "test"})
+
+        ws.send_text.assert_called_once()
+        assert manager.get_metrics()["event_bus"]["published"] == 1
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_events_fan_out_only_after_bus_delivery(self):
+        """測試：跨 worker 匯流排下，推送發生在收到匯流排事件時"""
+        bus = LoopbackBus()
+        manager = WebSocketManager(event_bus=bus)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+        await manager.unsubscribe(ws, [TOPIC_ALL])
+        await manager.subscribe(ws, [agent_topic("a1")])
+
+        await manager.broadcast_trade_execution("a1", {"ticker": "2330"})
+        await manager.broadcast_trade_execution("a2", {"ticker": "2317"})
+        ws.send_text.assert_not_called()
+        assert bus.published == 2
+
+        await bus.deliver()
+        sent = json.loads(ws.send_text.call_args[0][0])
+        assert ws.send_text.call_count == 1
+        assert sent["agent_id"] == "a1"
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_worker_without_clients_still_publishes(self):
+        """測試：本機沒有連線時仍發佈，讓其他 worker 推送"""
+        bus = LoopbackBus()
+        manager = WebSocketManager(event_bus=bus)
+
+        await manager.broadcast({"type": "test"})
+
+        assert bus.published == 1
+
+
+class TestCreateEventBus:
+    """測試依設定建立匯流排"""
+
+    def test_memory_backend(self):
+        """測試：memory 為單一程序匯流排"""
+        assert isinstance(create_event_bus("memory"), InProcessEventBus)
+
+    def test_postgres_backend(self):
+        """測試：postgres 匯流排接受 SQLAlchemy URL"""
+        bus = create_event_bus("postgres", dsn="postgresql+asyncpg://u:p@db:5432/app")
+        assert isinstance(bus, PostgresEventBus)
+        assert bus._dsn == "postgresql://u:p@db:5432/app"
+
+    def test_postgres_backend_requires_postgres_url(self):
+        """測試：SQLite URL 無法使用 postgres 匯流排"""
+        with pytest.raises(EventBusError):
+            create_event_bus("postgres", dsn="sqlite+aiosqlite:///db.sqlite")
+
+    @pytest.mark.asyncio
+    async def test_publish_before_start_rejected(self):
+        """測試：未啟動的 postgres 匯流排無法發佈"""
+        bus = PostgresEventBus("postgresql://u:p@db/app")
+        with pytest.raises(EventBusError):
+            await bus.publish(None, "{}")
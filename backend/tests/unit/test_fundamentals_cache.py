@@ -0,0 +1,367 @@
+"""
+測試基本面資料持久快取
+
+測試場景:
+1. 報告期推算（季報 / 月營收申報期限）與新鮮度規則
+2. 持久化：重新開啟後仍命中，新報告期使舊資料過期
+3. stale-while-revalidate：先回傳舊資料並在背景更新
+4. 錯誤回應不快取
+5. CachedMarketMCP 代理與 MCPMarketClient 整合（鎖定版本 SDK 的兩參數 call_tool、錯誤結果不快取、
+   關閉時只等待自己排入的背景更新）
+6. 預熱服務略過新鮮資料
+"""
+
+import asyncio
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+from api.fundamentals_cache import (
+    CachedMarketMCP,
+    FundamentalsCache,
+    latest_quarter,
+    latest_revenue_month,
+)
+from api.mcp_client import MCPMarketClient
+from service.fundamentals_warmup_service import (
+    WARMUP_TOOLS,
+    FundamentalsWarmupService,
+    _tickers_in_preferences,
+)
+
+
+class Clock:
+    """可調整的時鐘"""
+
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, **kwargs) -> None:
+        self.now += timedelta(**kwargs)
+
+
+class FakeServer:
+    """記錄呼叫次數的 MCP server（鎖定版本 SDK 的 call_tool 只接受兩個參數）"""
+
+    name = "casual_market_mcp"
+
+    def __init__(self, payload=None, text: str | None = None, is_error: bool = False):
+        self.payload = payload if payload is not None else {"success": True, "data": {"v": 1}}
+        self.text = text
+        self.is_error = is_error
+        self.calls: list[tuple[str, dict]] = []
+        self.session = object()
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls.append((tool_name, arguments))
+        await self.release.wait()
+        text = self.text if self.text is not None else json.dumps(self.payload)
+        return CallToolResult(content=[TextContent(type="text", text=text)], isError=self.is_error)
+
+
+@pytest.fixture
+def clock():
+    return Clock(datetime(2024, 6, 1, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return FundamentalsCache(str(tmp_path / "fundamentals.db"), clock=clock)
+
+
+def counting_fetch(payload=None):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return payload if payload is not None else {"success": True, "data": len(calls)}
+
+    return fetch, calls
+
+
+class TestReportingCalendar:
+    """測試報告期推算"""
+
+    @pytest.mark.parametrize(
+        ("today", "expected"),
+        [
+            (date(2024, 3, 30), "2023Q3"),
+            (date(2024, 3, 31), "2023Q4"),
+            (date(2024, 5, 15), "2024Q1"),
+            (date(2024, 8, 14), "2024Q2"),
+            (date(2024, 12, 31), "2024Q3"),
+            (date(2025, 1, 5), "2024Q3"),
+        ],
+    )
+    def test_latest_quarter(self, today, expected):
+        """測試：依季報申報期限推算最新季報"""
+        assert latest_quarter(today) == expected
+
+    @pytest.mark.parametrize(
+        ("today", "expected"),
+        [
+            (date(2024, 6, 10), "2024-04"),
+            (date(2024, 6, 11), "2024-05"),
+            (date(2024, 1, 5), "2023-11"),
+        ],
+    )
+    def test_latest_revenue_month(self, today, expected):
+        """測試：每月 10 日後可取得上月營收"""
+        assert latest_revenue_month(today) == expected
+
+
+class TestFundamentalsCache:
+    """測試快取與新鮮度"""
+
+    def test_fresh_entry_persists_across_instances(self, cache, clock, tmp_path):
+        """測試：重新開啟快取檔後仍命中，參數中的 null 與大小寫不影響鍵值"""
+        cache.store("get_company_balance_sheet", {"symbol": "2330"}, {"success": True})
+
+        reopened = FundamentalsCache(str(tmp_path / "fundamentals.db"), clock=clock)
+        entry = reopened.lookup("get_company_balance_sheet", {"symbol": " 2330", "year": None})
+
+        assert entry is not None
+        assert entry.fresh
+        assert entry.period == "2024Q1"
+
+    def test_new_reporting_period_invalidates(self, cache, clock):
+        """測試：進入新報告期（8/14 後）時舊季報不再新鮮"""
+        cache.store("get_company_income_statement", {"symbol": "2330"}, {"success": True})
+
+        clock.now = datetime(2024, 8, 14, tzinfo=timezone.utc)
+        entry = cache.lookup("get_company_income_statement", {"symbol": "2330"})
+
+        assert not entry.fresh
+        assert not entry.expired
+
+    def test_max_age_within_period(self, cache, clock):
+        """測試：同一報告期內超過保存時間時重新取得（提早申報的公司）"""
+        cache.store("get_company_balance_sheet", {"symbol": "2330"}, {"success": True})
+
+        clock.advance(days=8)
+
+        assert not cache.lookup("get_company_balance_sheet", {"symbol": "2330"}).fresh
+
+    def test_explicit_period_kept_longer(self, cache, clock):
+        """測試：指定年度季度的已申報資料保存較久"""
+        arguments = {"symbol": "2330", "year": 2023, "season": 4}
+        cache.store("get_company_balance_sheet", arguments, {"success": True})
+
+        clock.advance(days=60)
+        entry = cache.lookup("get_company_balance_sheet", arguments)
+
+        assert entry.fresh
+        assert entry.period == "2023-4"
+
+    def test_hit_skips_fetch(self, cache):
+        """測試：新鮮資料不呼叫 MCP"""
+        fetch, calls = counting_fetch()
+
+        first = asyncio.run(cache.get_or_fetch("get_company_profile", {"symbol": "2330"}, fetch))
+        second = asyncio.run(cache.get_or_fetch("get_company_profile", {"symbol": "2330"}, fetch))
+
+        assert first == second == {"success": True, "data": 1}
+        assert len(calls) == 1
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_stale_served_while_revalidating(self, cache, clock):
+        """測試：過期資料先回傳，背景更新後改為新資料"""
+        fetch, calls = counting_fetch()
+
+        async def scenario():
+            await cache.get_or_fetch("get_company_dividend", {"symbol": "2330"}, fetch)
+            clock.advance(days=10)
+            stale = await cache.get_or_fetch("get_company_dividend", {"symbol": "2330"}, fetch)
+            await cache.wait_for_refreshes()
+            fresh = await cache.get_or_fetch("get_company_dividend", {"symbol": "2330"}, fetch)
+            return stale, fresh
+
+        stale, fresh = asyncio.run(scenario())
+
+        assert stale["data"] == 1
+        assert fresh["data"] == 2
+        assert len(calls) == 2
+        assert cache.stats["stale_hits"] == 1
+        assert cache.stats["refreshes"] == 1
+
+    def test_expired_entry_refetched_synchronously(self, cache, clock):
+        """測試：超過可容忍期限的資料同步重新取得；失敗時仍回傳舊資料"""
+        fetch, calls = counting_fetch()
+        asyncio.run(cache.get_or_fetch("get_company_profile", {"symbol": "2330"}, fetch))
+        clock.advance(days=365)
+
+        async def failing():
+            raise RuntimeError("mcp down")
+
+        refetched = asyncio.run(
+            cache.get_or_fetch("get_company_profile", {"symbol": "2330"}, fetch)
+        )
+        clock.advance(days=365)
+        fallback = asyncio.run(
+            cache.get_or_fetch("get_company_profile", {"symbol": "2330"}, failing)
+        )
+
+        assert refetched["data"] == 2
+        assert len(calls) == 2
+        assert fallback["data"] == 2
+
+    def test_error_payload_not_cached(self, cache):
+        """測試：失敗的回應不寫入快取"""
+        fetch, calls = counting_fetch({"success": False, "error": "not found"})
+
+        for _ in range(2):
+            asyncio.run(cache.get_or_fetch("get_company_profile", {"symbol": "9999"}, fetch))
+
+        assert len(calls) == 2
+        assert cache.lookup("get_company_profile", {"symbol": "9999"}) is None
+
+
+class TestIntegration:
+    """測試 MCP 代理與客戶端"""
+
+    def test_proxy_caches_fundamentals_only(self, cache):
+        """測試：基本面工具命中快取，其他工具與屬性直接轉給原伺服器"""
+        server = FakeServer()
+        proxy = CachedMarketMCP(server, cache)
+
+        async def scenario():
+            for _ in range(2):
+                result = await proxy.call_tool("get_company_profile", {"symbol": "2330"})
+            for _ in range(2):
+                await proxy.call_tool("get_taiwan_stock_price", {"symbol": "2330"})
+            return result
+
+        result = asyncio.run(scenario())
+
+        assert json.loads(result.content[0].text) == server.payload
+        assert [name for name, _ in server.calls] == [
+            "get_company_profile",
+            "get_taiwan_stock_price",
+            "get_taiwan_stock_price",
+        ]
+        assert proxy.name == "casual_market_mcp"
+        assert proxy.session is server.session
+
+    def test_proxy_passes_through_non_json(self, cache):
+        """測試：非 JSON 回應原樣回傳且不快取"""
+        server = FakeServer(text="service unavailable")
+        proxy = CachedMarketMCP(server, cache)
+
+        result = asyncio.run(proxy.call_tool("get_company_profile", {"symbol": "2330"}))
+
+        assert result.content[0].text == "service unavailable"
+        assert cache.lookup("get_company_profile", {"symbol": "2330"}) is None
+
+    def test_proxy_skips_error_results(self, cache):
+        """測試：錯誤結果（isError）原樣回傳且不快取"""
+        server = FakeServer(is_error=True)
+        proxy = CachedMarketMCP(server, cache)
+
+        asyncio.run(proxy.call_tool("get_company_profile", {"symbol": "2330"}))
+
+        assert cache.lookup("get_company_profile", {"symbol": "2330"}) is None
+
+    def test_cleanup_waits_only_for_own_refreshes(self, cache, clock):
+        """測試：代理關閉時只等待自己排入的背景更新，不等待共用快取中其他代理的更新"""
+        slow, other = FakeServer(), FakeServer()
+        slow_proxy, other_proxy = CachedMarketMCP(slow, cache), CachedMarketMCP(other, cache)
+        slow.cleanup = other.cleanup = lambda: asyncio.sleep(0)
+
+        async def scenario():
+            await slow_proxy.call_tool("get_company_profile", {"symbol": "2330"})
+            clock.advance(days=40)
+            slow.release.clear()
+            # 過期資料先回傳，背景更新卡在 slow 的連線上
+            await slow_proxy.call_tool("get_company_profile", {"symbol": "2330"})
+            await asyncio.wait_for(other_proxy.cleanup(), timeout=1)
+            pending = len(slow_proxy._refresh_tasks)
+            slow.release.set()
+            await asyncio.wait_for(slow_proxy.cleanup(), timeout=1)
+            return pending
+
+        assert asyncio.run(scenario()) == 1
+        assert len(slow.calls) == 2
+        assert cache.stats["refreshes"] == 1
+
+    def test_client_uses_cache(self, cache):
+        """測試：MCPMarketClient 的財報查詢經由快取"""
+        server = FakeServer()
+        client = MCPMarketClient(cache=cache)
+        client._server = server
+
+        async def scenario():
+            await client.get_balance_sheet("2330")
+            await client.get_balance_sheet("2330")
+            await client.get_stock_price("2330")
+
+        asyncio.run(scenario())
+
+        assert [name for name, _ in server.calls] == [
+            "get_company_balance_sheet",
+            "get_taiwan_stock_price",
+        ]
+
+
+class TestWarmup:
+    """測試預熱服務"""
+
+    def test_preferences_tickers(self):
+        """測試：只取投資偏好中看起來像股票代號的項目"""
+        assert _tickers_in_preferences(json.dumps(["2330", "半導體", "00878", " 2317 "])) == {
+            "2330",
+            "00878",
+            "2317",
+        }
+        assert _tickers_in_preferences("not json") == set()
+
+    def test_warm_up_skips_fresh_entries(self, cache):
+        """測試：已新鮮的資料不重新取得"""
+        server = FakeServer()
+
+        def client_factory():
+            client = MCPMarketClient(cache=cache)
+
+            async def enter():
+                client._server = server
+                return client
+
+            async def exit_(*args):
+                client._server = None
+
+            client.__aenter__ = enter
+            client.__aexit__ = exit_
+            return _AsyncContext(client)
+
+        cache.store("get_company_profile", {"symbol": "2330"}, {"success": True})
+        service = FundamentalsWarmupService(client_factory=client_factory)
+
+        stats = asyncio.run(service.warm_up(["2330"]))
+
+        assert stats == {
+            "tickers": 1,
+            "refreshed": len(WARMUP_TOOLS) - 1,
+            "skipped": 1,
+            "failed": 0,
+        }
+        assert "get_company_profile" not in [name for name, _ in server.calls]
+
+
+class _AsyncContext:
+    """以 client 的 __aenter__ / __aexit__ 屬性建立 async with 物件"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def __aenter__(self):
+        return await self.client.__aenter__()
+
+    async def __aexit__(self, *args):
+        await self.client.__aexit__(*args)
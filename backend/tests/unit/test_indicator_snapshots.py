@@ -0,0 +1,274 @@
+"""
+測試技術指標引擎與每日快照
+
+測試場景:
+1. 均線、布林通道、RSI（Wilder）、MACD、KD 與逐日計算的參考實作一致
+2. 歷史長度不同的股票同時計算，結果與逐檔計算相同；資料不足時為 None
+3. 趨勢分類與交易訊號規則（與工具相同）
+4. 快照服務：股票池篩選、寫入、重複執行時更新、依交易日查詢最新快照
+5. get_indicator_snapshot / calculate_technical_indicators 工具
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.models import Base, IndicatorSnapshot
+from service.indicator_snapshot_service import (
+    IndicatorSnapshotError,
+    IndicatorSnapshotService,
+    _seconds_until,
+    indicator_snapshot_service,
+)
+from trading.indicators import (
+    classify_trend,
+    combine_signals,
+    compute_indicators,
+    compute_snapshots,
+)
+from trading.pattern_scan import OHLCVPanel
+from trading.tools.technical_agent import calculate_technical_indicators, get_indicator_snapshot
+
+from .tool_helpers import ainvoke
+
+START = date(2024, 1, 1)
+
+
+def random_closes(days: int, seed: int = 0, drift: float = 0.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp((rng.normal(drift, 0.02, days)).cumsum())
+
+
+def bars(closes, start: date = START) -> list[dict]:
+    return [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "open": float(c),
+            "high": float(c) * 1.01,
+            "low": float(c) * 0.98,
+            "close": float(c),
+            "volume": 1000,
+        }
+        for i, c in enumerate(closes)
+    ]
+
+
+def reference_ema(values: list[float], period: int, alpha: float) -> list[float | None]:
+    """逐日計算：前 period 個值的平均為起點"""
+    result, average = [], None
+    for i, value in enumerate(values):
+        if i + 1 == period:
+            average = sum(values[:period]) / period
+        elif average is not None:
+            average += alpha * (value - average)
+        result.append(average)
+    return result
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'snapshots.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+class TestIndicators:
+    """測試指標計算"""
+
+    def test_matches_reference(self):
+        """測試：各指標與逐日參考實作相同"""
+        closes = random_closes(120)
+        highs, lows = closes * 1.01, closes * 0.98
+
+        result = compute_indicators(OHLCVPanel.from_bars({"2330": bars(closes)}))["2330"]
+
+        assert result["ma"]["ma20"] == pytest.approx(closes[-20:].mean(), abs=1e-4)
+        assert result["ma"]["ma60"] == pytest.approx(closes[-60:].mean(), abs=1e-4)
+        std = closes[-20:].std()
+        assert result["bollinger"]["upper"] == pytest.approx(
+            closes[-20:].mean() + 2 * std, abs=1e-4
+        )
+
+        change = np.diff(closes)
+        gain = reference_ema(list(np.clip(change, 0, None)), 14, 1 / 14)[-1]
+        loss = reference_ema(list(np.clip(-change, 0, None)), 14, 1 / 14)[-1]
+        assert result["rsi"]["value"] == pytest.approx(100 - 100 / (1 + gain / loss), abs=1e-4)
+
+        fast = reference_ema(list(closes), 12, 2 / 13)
+        slow = reference_ema(list(closes), 26, 2 / 27)
+        line = [f - s for f, s in zip(fast[25:], slow[25:], strict=True)]
+        signal = reference_ema(line, 9, 2 / 10)
+        assert result["macd"]["macd"] == pytest.approx(line[-1], abs=1e-4)
+        assert result["macd"]["histogram"] == pytest.approx(line[-1] - signal[-1], abs=1e-4)
+        assert result["macd"]["status"] == ("多頭" if line[-1] > signal[-1] else "空頭")
+
+        k = d = 50.0
+        for t in range(8, len(closes)):
+            high, low = highs[t - 8 : t + 1].max(), lows[t - 8 : t + 1].min()
+            k = k * 2 / 3 + (closes[t] - low) / (high - low) * 100 / 3
+            d = d * 2 / 3 + k / 3
+        assert result["kd"]["k"] == pytest.approx(k, abs=1e-4)
+        assert result["kd"]["d"] == pytest.approx(d, abs=1e-4)
+
+    def test_batch_equals_single_with_different_history(self):
+        """測試：上市日不同的股票同時計算，與逐檔計算結果相同"""
+        young = bars(random_closes(40, seed=2), start=START + timedelta(days=80))
+        old = bars(random_closes(120, seed=1))
+
+        batch = compute_indicators(OHLCVPanel.from_bars({"OLD": old, "YOUNG": young}))
+
+        assert batch["YOUNG"] == compute_indicators(OHLCVPanel.from_bars({"YOUNG": young}))["YOUNG"]
+        assert batch["OLD"] == compute_indicators(OHLCVPanel.from_bars({"OLD": old}))["OLD"]
+
+    def test_insufficient_data_is_none(self):
+        """測試：資料不足的指標為 None"""
+        result = compute_indicators(OHLCVPanel.from_bars({"2330": bars(random_closes(30))}))
+
+        indicators = result["2330"]
+        assert indicators["ma"]["ma20"] is not None
+        assert indicators["ma"]["ma60"] is None
+        assert indicators["macd"]["signal"] is None
+        assert indicators["macd"]["status"] is None
+        assert indicators["rsi"]["value"] is not None
+
+    def test_flat_prices(self):
+        """測試：價格不變時 RSI 為 50、KD 維持 50"""
+        result = compute_indicators(OHLCVPanel.from_bars({"2330": bars([100.0] * 30)}))["2330"]
+
+        assert result["rsi"]["value"] == 50.0
+        assert result["bollinger"]["upper"] == result["bollinger"]["lower"] == 100.0
+
+
+class TestTrendAndSignals:
+    """測試趨勢與訊號規則"""
+
+    @pytest.mark.parametrize(
+        ("short_term", "mid_term", "expected"),
+        [(0.03, 0.06, "上升"), (-0.03, -0.06, "下降"), (0.03, 0.01, "盤整")],
+    )
+    def test_classify_trend(self, short_term, mid_term, expected):
+        """測試：短期與中期動能同向且夠大才有趨勢"""
+        assert classify_trend(short_term, mid_term)[0] == expected
+
+    def test_combine_signals(self):
+        """測試：上升趨勢加多頭型態為買進，信心度上限 0.85"""
+        overall, confidence, signals = combine_signals(
+            {"direction": "上升"}, [{"pattern_type": "bullish"}]
+        )
+
+        assert overall == "買進"
+        assert confidence == pytest.approx(0.75)
+        assert len(signals) == 2
+        assert combine_signals({}, [])[:2] == ("觀望", 0.5)
+
+    def test_snapshot_of_rising_stock(self):
+        """測試：穩定上漲的股票快照為上升趨勢並產生買進訊號"""
+        closes = 100 * 1.01 ** np.arange(60)
+
+        [snapshot] = compute_snapshots(OHLCVPanel.from_bars({"2330": bars(closes)}))
+
+        assert snapshot["trading_date"] == START + timedelta(days=59)
+        assert snapshot["trend"]["direction"] == "上升"
+        assert snapshot["patterns"][0]["pattern_name"] == "上升趨勢"
+        assert snapshot["overall_signal"] == "買進"
+        assert snapshot["indicators"]["rsi"]["status"] == "超買"
+
+
+class TestSnapshotService:
+    """測試快照服務"""
+
+    async def test_run_stores_universe_and_updates(self, session_maker):
+        """測試：只計算股票池中的股票，重複執行時更新而非新增"""
+        panel = OHLCVPanel.from_bars(
+            {"2330": bars(random_closes(80)), "2317": bars(random_closes(80, seed=1))}
+        )
+        service = IndicatorSnapshotService(session_maker, panel_loader=lambda: panel)
+
+        stats = await service.run(tickers=["2330", "9999"])
+        await service.run(tickers=["2330"])
+
+        assert stats["tickers"] == 1
+        assert stats["missing"] == ["9999"]
+        assert stats["trading_date"] == (START + timedelta(days=79)).isoformat()
+        async with session_maker() as session:
+            count = await session.scalar(select(func.count()).select_from(IndicatorSnapshot))
+        assert count == 1
+
+    async def test_empty_universe_uses_all_tickers(self, session_maker):
+        """測試：股票池為空時計算 K 線中的全部股票"""
+        panel = OHLCVPanel.from_bars(
+            {"2330": bars(random_closes(30)), "2317": bars(random_closes(30, seed=1))}
+        )
+        service = IndicatorSnapshotService(session_maker, panel_loader=lambda: panel)
+
+        assert (await service.run(tickers=[]))["tickers"] == 2
+        with pytest.raises(IndicatorSnapshotError):
+            await service.run(tickers=["9999"])
+
+    async def test_latest_by_trading_date(self, session_maker):
+        """測試：預設取最新快照，指定交易日時取該日（含）之前的快照"""
+        service = IndicatorSnapshotService(session_maker)
+        closes = random_closes(60)
+        await service.run(tickers=[], panel=OHLCVPanel.from_bars({"2330": bars(closes[:50])}))
+        await service.run(tickers=[], panel=OHLCVPanel.from_bars({"2330": bars(closes)}))
+
+        latest = await service.latest(["2330", "2317"])
+        earlier = await service.latest(["2330"], START + timedelta(days=55))
+
+        assert list(latest) == ["2330"]
+        assert latest["2330"].trading_date == START + timedelta(days=59)
+        assert earlier["2330"].trading_date == START + timedelta(days=49)
+        assert float(latest["2330"].close) == pytest.approx(closes[-1], abs=1e-4)
+
+    def test_seconds_until_next_run(self):
+        """測試：已過今日執行時間時排到明天"""
+        from datetime import datetime, time
+
+        now = datetime(2024, 6, 3, 15, 0)
+
+        assert _seconds_until(time(14, 30), now) == pytest.approx(23.5 * 3600)
+        assert _seconds_until(time(16, 0), now) == pytest.approx(3600)
+
+
+class TestTools:
+    """測試 Agent 工具"""
+
+    async def test_get_indicator_snapshot(self, session_maker, monkeypatch):
+        """測試：回傳命中的快照與缺少的股票，接受逗號分隔字串"""
+        monkeypatch.setattr(indicator_snapshot_service, "_session_maker", session_maker)
+        panel = OHLCVPanel.from_bars({"2330": bars(random_closes(60))})
+        await indicator_snapshot_service.run(tickers=[], panel=panel)
+
+        result = await ainvoke(
+            get_indicator_snapshot,
+            {"tickers": "2330, 2317", "trading_date": (START + timedelta(days=61)).isoformat()},
+        )
+
+        assert result["missing"] == ["2317"]
+        snapshot = result["snapshots"]["2330"]
+        assert snapshot["trading_date"] == (START + timedelta(days=59)).isoformat()
+        assert snapshot["age_days"] == 2
+        assert set(snapshot["indicators"]) == {"ma", "rsi", "macd", "bollinger", "kd"}
+
+    async def test_get_indicator_snapshot_requires_tickers(self):
+        """測試：缺少股票代號時回傳錯誤"""
+        result = await ainvoke(get_indicator_snapshot, {})
+
+        assert "error" in result
+
+    async def test_calculate_technical_indicators_uses_engine(self):
+        """測試：技術指標工具回傳實際計算值，只計算指定的指標"""
+        closes = random_closes(80)
+
+        result = await ainvoke(
+            calculate_technical_indicators,
+            {"ticker": "2330", "price_data": bars(closes), "indicators": ["MA", "rsi"]},
+        )
+
+        assert set(result["indicators"]) == {"ma", "rsi"}
+        assert result["indicators"]["ma"]["ma5"] == pytest.approx(closes[-5:].mean(), abs=1e-4)
@@ -0,0 +1,152 @@
+"""
+測試本機 casual-market MCP 替身
+
+測試場景:
+1. 相同種子產生相同價格，前進交易日後價格改變
+2. 模擬交易的整張、限價與手續費規則
+3. 錄製資料重播
+4. LocalMarketMCP 與交易管線（_execute_market_trade、MCPMarketClient）相容
+"""
+
+import pytest
+
+from api.local_market_mcp import LocalMarketMCP, reset_shared_market
+from api.market_simulator import TOOL_NAMES, MarketSimulator, MarketSimulatorError
+from trading.tools.trading_tools import _execute_market_trade
+
+RECORDED = {
+    "2330": {
+        "name": "台積電",
+        "bars": [
+            {"date": "2024-01-02", "open": 590, "high": 593, "low": 589, "close": 593},
+            {"date": "2024-01-03", "close": 578},
+        ],
+    }
+}
+
+
+class TestMarketSimulator:
+    """測試模擬市場"""
+
+    def test_same_seed_same_prices(self):
+        """測試：相同種子的報價完全相同，不同種子不同"""
+        first, second = MarketSimulator(seed=7), MarketSimulator(seed=7)
+        for market in (first, second):
+            market.advance(30)
+
+        assert first.get_taiwan_stock_price("2330") == second.get_taiwan_stock_price("2330")
+        assert first.quote_price("2330") != _advanced(MarketSimulator(seed=8), 30).quote_price(
+            "2330"
+        )
+
+    def test_quote_by_company_name(self):
+        """測試：可用公司名稱查詢"""
+        market = MarketSimulator()
+        market.get_taiwan_stock_price("2330")
+
+        result = market.get_taiwan_stock_price("台積電")
+
+        assert result["success"] is True
+        assert result["data"]["symbol"] == "2330"
+
+    def test_unknown_symbol(self):
+        """測試：無效代號回傳錯誤"""
+        result = MarketSimulator().call("get_taiwan_stock_price", {"symbol": "not-a-stock"})
+
+        assert result["success"] is False
+
+    def test_market_order_fills_at_close(self):
+        """測試：市價單以收盤價成交並計算手續費與證交稅"""
+        market = _advanced(MarketSimulator(), 5)
+        close = market.quote_price("2330")
+
+        result = market.sell_taiwan_stock("2330", 2000)
+
+        data = result["data"]
+        assert data["price"] == close
+        assert data["total_amount"] == pytest.approx(close * 2000)
+        assert data["fee"] >= 20
+        assert data["net_amount"] == pytest.approx(data["total_amount"] - data["fee"] - data["tax"])
+
+    def test_limit_order_outside_range_rejected(self):
+        """測試：限價低於當日最低價不成交"""
+        market = _advanced(MarketSimulator(), 5)
+        low = market.get_taiwan_stock_price("2330")["data"]["low"]
+
+        assert market.buy_taiwan_stock("2330", 1000, price=low * 0.5)["success"] is False
+        assert market.buy_taiwan_stock("2330", 1000, price=low)["data"]["price"] == low
+
+    def test_odd_lot_rejected(self):
+        """測試：非整張交易被拒絕"""
+        assert MarketSimulator().buy_taiwan_stock("2330", 500)["success"] is False
+
+    def test_unsupported_tool(self):
+        """測試：不支援的工具回傳錯誤並不計入統計"""
+        market = MarketSimulator()
+
+        result = market.call("get_top_foreign_holdings", {})
+
+        assert result["success"] is False
+        assert market.get_stats()["total_calls"] == 0
+
+    def test_recorded_replay(self):
+        """測試：錄製模式依序重播並停在最後一天"""
+        market = MarketSimulator(recorded=RECORDED)
+
+        assert market.quote_price("2330") == 593
+        market.advance(5)
+        quote = market.get_taiwan_stock_price("2330")["data"]
+        assert (quote["current_price"], quote["previous_close"]) == (578, 593)
+        assert market.quote_price("2317") is None
+
+    def test_recorded_requires_bars(self):
+        """測試：錄製資料缺少 K 線時拒絕建立"""
+        with pytest.raises(MarketSimulatorError):
+            MarketSimulator(recorded={"2330": {"bars": []}})
+
+
+class TestLocalMarketMCP:
+    """測試同程序 MCP 伺服器"""
+
+    @pytest.fixture(autouse=True)
+    def _shared_market(self):
+        reset_shared_market(MarketSimulator(seed=1))
+        yield
+        reset_shared_market()
+
+    @pytest.mark.asyncio
+    async def test_lists_all_tools(self):
+        """測試：工具清單含必要參數"""
+        async with LocalMarketMCP() as server:
+            tools = {tool.name: tool for tool in await server.list_tools()}
+
+        assert set(tools) == set(TOOL_NAMES)
+        schema = tools["buy_taiwan_stock"].model_dump(by_alias=True)["inputSchema"]
+        assert schema["required"] == ["symbol", "quantity"]
+
+    @pytest.mark.asyncio
+    async def test_execute_market_trade(self):
+        """測試：交易管線透過 session.call_tool 取得成交結果"""
+        async with LocalMarketMCP() as server:
+            close = server.market.quote_price("2330")
+            result = await _execute_market_trade(server, "2330", "BUY", 1000, None)
+
+        assert result["success"] is True
+        assert result["executed_price"] == close
+
+    @pytest.mark.asyncio
+    async def test_mcp_market_client_uses_local_market(self, monkeypatch):
+        """測試：CASUAL_MARKET_SSE_URL=local 時 MCPMarketClient 不連線"""
+        from api.mcp_client import MCPMarketClient
+
+        monkeypatch.setenv("CASUAL_MARKET_SSE_URL", "local")
+
+        async with MCPMarketClient() as client:
+            result = await client.get_market_indices()
+
+        assert result["data"]["指數"] == "發行量加權股價指數"
+
+
+def _advanced(market: MarketSimulator, days: int) -> MarketSimulator:
+    market.advance(days)
+    return market
@@ -0,0 +1,205 @@
+"""
+測試日誌管線
+
+測試場景:
+1. 模組抽樣：WARNING 以下依比例保留，WARNING 以上一律保留，最長前綴優先
+2. 模組限流：每秒上限，下一秒重新計數
+3. 同一筆日誌送到多個 sink 時只判斷一次
+4. 設定解析與 Settings 驗證
+5. JSON Lines sink 與 BackgroundSink（console 使用時不再經 loguru enqueue）
+6. 會輪轉 / 壓縮的檔案 sink 經 loguru enqueue 寫入，不在呼叫端執行
+"""
+
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from common.logger import (
+    BackgroundSink,
+    LogSampler,
+    add_json_sink,
+    configure_sampling,
+    get_log_stats,
+    log_filter,
+    logger,
+    parse_module_rates,
+    setup_logger,
+)
+
+
+def make_record(name: str, level_no: int = 20) -> dict:
+    return {"name": name, "level": SimpleNamespace(no=level_no, name="INFO")}
+
+
+@pytest.fixture
+def reset_sampling():
+    yield
+    configure_sampling({}, {})
+
+
+class TestLogSampler:
+    """測試抽樣與限流"""
+
+    def test_sampling_keeps_one_in_n(self):
+        """測試：比例 0.25 時每 4 筆保留 1 筆，其他模組不受影響"""
+        sampler = LogSampler(sampling={"service.trading_service": 0.25})
+
+        kept = [sampler(make_record("service.trading_service")) for _ in range(8)]
+
+        assert kept == [True, False, False, False, True, False, False, False]
+        assert sampler(make_record("service.agents_service")) is True
+        assert sampler.dropped == {"service.trading_service": 6}
+
+    def test_warnings_are_never_dropped(self):
+        """測試：WARNING 以上不抽樣"""
+        sampler = LogSampler(sampling={"trading": 0})
+
+        assert sampler(make_record("trading.tools", level_no=30)) is True
+        assert sampler(make_record("trading.tools", level_no=40)) is True
+        assert sampler(make_record("trading.tools")) is False
+
+    def test_longest_prefix_wins(self):
+        """測試：以最長的模組前綴為準，前綴須對齊模組邊界"""
+        sampler = LogSampler(sampling={"trading": 0, "trading.tools.trading_tools": 1.0})
+
+        assert sampler(make_record("trading.tools.trading_tools")) is True
+        assert sampler(make_record("trading.trading_agent")) is False
+        assert sampler(make_record("trading_extra")) is True
+
+    def test_rate_limit_per_second(self):
+        """測試：每秒超過上限的日誌被丟棄，下一秒重新計數"""
+        now = [100.0]
+        sampler = LogSampler(rate_limits={"api.websocket": 2}, clock=lambda: now[0])
+
+        first = [sampler(make_record("api.websocket")) for _ in range(4)]
+        now[0] += 1.0
+        second = sampler(make_record("api.websocket"))
+
+        assert first == [True, True, False, False]
+        assert second is True
+        assert sampler.dropped == {"api.websocket": 2}
+
+    def test_same_record_decided_once(self, reset_sampling):
+        """測試：兩個 sink 收到相同的日誌（同一筆只計數一次）"""
+        configure_sampling({__name__: 0.5}, {})
+        first, second = [], []
+        handlers = [
+            logger.add(first.append, format="{message}", filter=log_filter),
+            logger.add(second.append, format="{message}", filter=log_filter),
+        ]
+        try:
+            for i in range(6):
+                logger.info("event {}", i)
+        finally:
+            for handler in handlers:
+                logger.remove(handler)
+
+        assert [str(m).strip() for m in first] == ["event 0", "event 2", "event 4"]
+        assert first == second
+        assert get_log_stats()["dropped"] == {__name__: 3}
+
+
+class TestConfiguration:
+    """測試設定解析"""
+
+    def test_parse_module_rates(self):
+        """測試：解析逗號分隔的 模組=數值"""
+        assert parse_module_rates(" a.b=0.1, c=5 ,") == {"a.b": 0.1, "c": 5.0}
+        assert parse_module_rates(None) == {}
+
+    @pytest.mark.parametrize("spec", ["trading", "=0.5", "trading=abc", "trading=-1"])
+    def test_invalid_spec(self, spec):
+        """測試：格式錯誤或負數時拋出 ValueError"""
+        with pytest.raises(ValueError):
+            parse_module_rates(spec)
+
+    def test_settings_reject_invalid_spec(self):
+        """測試：Settings 啟動時驗證抽樣設定"""
+        from api.config import Settings
+
+        with pytest.raises(ValidationError):
+            Settings(log_sampling="trading")
+        assert Settings(log_rate_limit="api.websocket=20").log_rate_limit == "api.websocket=20"
+
+
+class TestSinks:
+    """測試 JSON 與背景寫入 sink"""
+
+    def test_json_sink(self, tmp_path):
+        """測試：每行一筆 JSON，含 bind 欄位與例外堆疊"""
+        path = tmp_path / "logs" / "app.jsonl"
+        handler = add_json_sink(path, log_level="INFO")
+        try:
+            logger.bind(agent_id="agent-1").info("交易 {}", "2330")
+            logger.debug("not written")
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            logger.remove(handler)
+
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["message"] for line in lines] == ["交易 2330", "failed"]
+        assert lines[0]["level"] == "INFO"
+        assert lines[0]["logger"] == __name__
+        assert lines[0]["extra"] == {"agent_id": "agent-1"}
+        assert "ValueError: boom" in lines[1]["exception"]
+
+    def test_background_sink_writes_in_order(self):
+        """測試：stop() 後所有日誌依序寫入"""
+        stream = io.StringIO()
+        sink = BackgroundSink(stream)
+        handler = logger.add(sink, format="{message}")
+        for i in range(500):
+            logger.info("line {}", i)
+        logger.remove(handler)  # 呼叫 sink.stop()
+
+        assert stream.getvalue().splitlines() == [f"line {i}" for i in range(500)]
+
+    def test_background_sink_drops_when_backlogged(self):
+        """測試：佇列超過上限時丟棄而不阻塞"""
+        sink = BackgroundSink(io.StringIO(), max_pending=0)
+
+        sink.write("dropped\n")
+        sink.stop()
+
+        assert sink.dropped == 1
+
+    @pytest.mark.parametrize("enqueue", [True, False])
+    def test_console_sink_never_uses_loguru_enqueue(self, monkeypatch, enqueue):
+        """測試：console 以 BackgroundSink 寫入時，loguru 的 enqueue 一律關閉"""
+        added = []
+        monkeypatch.setattr(logger, "add", lambda sink, **kwargs: added.append((sink, kwargs)))
+        monkeypatch.setattr(logger, "remove", lambda *args: None)
+
+        setup_logger(enqueue=enqueue)
+
+        (sink, kwargs), *_ = added
+        assert isinstance(sink, BackgroundSink) is enqueue
+        assert kwargs["enqueue"] is False
+        if enqueue:
+            sink.stop()
+
+    @pytest.mark.parametrize("enqueue", [True, False])
+    def test_rotating_file_sinks_use_loguru_enqueue(self, monkeypatch, tmp_path, enqueue):
+        """測試：文字檔與 JSON 檔 sink 會輪轉壓縮，enqueue 時交給 loguru 背景執行緒"""
+        added = []
+        monkeypatch.setattr(logger, "add", lambda sink, **kwargs: added.append((sink, kwargs)))
+        monkeypatch.setattr(logger, "remove", lambda *args: None)
+
+        setup_logger(
+            log_file=tmp_path / "app.log",
+            json_file=tmp_path / "app.jsonl",
+            enable_console=False,
+            enqueue=enqueue,
+        )
+
+        sinks = {sink.name: kwargs for sink, kwargs in added}
+        assert sinks.keys() == {"app.log", "app.jsonl"}
+        assert sinks["app.log"]["compression"] == "zip"
+        assert all(kwargs["rotation"] for kwargs in sinks.values())
+        assert all(kwargs["enqueue"] is enqueue for kwargs in sinks.values())
@@ -0,0 +1,334 @@
+"""
+測試 Prometheus 指標
+
+測試場景:
+1. Counter / Gauge / Histogram 的文字格式輸出（累積區間、標籤跳脫）
+2. 計時器：context manager 與 async decorator，例外時 outcome="error"
+3. 標籤不符、重複名稱與失敗的 collector
+4. MeteredMCPServer 依伺服器與工具記錄延遲，錯誤結果記為 error
+   （內層伺服器為鎖定版本 SDK 的兩參數 call_tool，錯誤旗標 isError / is_error 皆可）；
+   交易工具經 session.call_tool 的呼叫同樣記錄
+5. MeteredLitellmModel 記錄延遲與 token 數
+6. execute_trade_atomic 記錄交易執行時間
+7. GET /metrics 端點與路由樣板標籤；需 X-Admin-Token（未設定 ADMIN_TOKEN 時 404，錯誤時 403）
+8. register_collector 同名時取代，與一般指標同名時拋出 MetricsError
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from mcp.types import CallToolResult, TextContent
+
+from common.metrics import (
+    LLM_REQUEST_SECONDS,
+    LLM_TOKENS,
+    MCP_CALL_SECONDS,
+    TRADE_EXECUTION_SECONDS,
+    MetricsError,
+    MetricsRegistry,
+)
+from trading.instrumentation import MeteredLitellmModel, MeteredMCPServer
+
+
+def sample_value(text: str, line_prefix: str) -> float:
+    """取得輸出中以 line_prefix 開頭的樣本值"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not found in:\n{text}")
+
+
+def histogram_count(histogram, **labels) -> int:
+    return histogram.labels(**labels).count
+
+
+class FakeServer:
+    """回傳固定結果的 MCP server（鎖定版本 SDK 的 call_tool 只接受兩個參數）"""
+
+    name = "casual_market_mcp"
+
+    def __init__(self, is_error: bool = False, fail: bool = False):
+        self.is_error = is_error
+        self.fail = fail
+        self.session = SimpleNamespace(id=object(), call_tool=self.call_tool)
+
+    async def call_tool(self, tool_name, arguments):
+        if self.fail:
+            raise ConnectionError("connection lost")
+        return CallToolResult(content=[TextContent(type="text", text="{}")], isError=self.is_error)
+
+
+class LegacyResultServer(FakeServer):
+    """回傳 mcp 1.x 形式結果（只有 isError 屬性）的 MCP server"""
+
+    async def call_tool(self, tool_name, arguments):
+        return SimpleNamespace(content=[], isError=self.is_error)
+
+
+class TestRegistry:
+    """測試指標與輸出格式"""
+
+    def test_render_counter_gauge_histogram(self):
+        """測試：各類型的 HELP / TYPE 與樣本格式，Histogram 區間為累積值"""
+        registry = MetricsRegistry()
+        requests = registry.counter("app_requests", "Requests", ("route",))
+        running = registry.gauge("app_running", "Running")
+        latency = registry.histogram("app_latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        requests.labels(route='/a"b').inc(2)
+        running.inc()
+        running.inc()
+        running.dec()
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value)
+
+        text = registry.render()
+
+        assert "# TYPE app_requests counter" in text
+        assert sample_value(text, 'app_requests_total{route="/a\\"b"}') == 2
+        assert sample_value(text, "app_running") == 1
+        assert "# TYPE app_latency_seconds histogram" in text
+        assert sample_value(text, 'app_latency_seconds_bucket{le="0.1"}') == 1
+        assert sample_value(text, 'app_latency_seconds_bucket{le="1"}') == 2
+        assert sample_value(text, 'app_latency_seconds_bucket{le="+Inf"}') == 3
+        assert sample_value(text, "app_latency_seconds_count") == 3
+        assert sample_value(text, "app_latency_seconds_sum") == pytest.approx(5.55)
+
+    def test_timer_outcome(self):
+        """測試：正常結束記為 ok，拋出例外記為 error 且例外照常拋出"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("job_seconds", "Job", ("job", "outcome"))
+
+        with latency.time(job="a"):
+            pass
+        with pytest.raises(ValueError), latency.time(job="a"):
+            raise ValueError("boom")
+
+        assert latency.labels(job="a", outcome="ok").count == 1
+        assert latency.labels(job="a", outcome="error").count == 1
+
+    async def test_timer_decorates_async_function(self):
+        """測試：decorator 支援 async 函式並保留回傳值"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("call_seconds", "Call", ("outcome",))
+
+        @latency.time()
+        async def work():
+            return 42
+
+        assert await work() == 42
+        assert latency.labels(outcome="ok").count == 1
+
+    def test_invalid_usage(self):
+        """測試：標籤不符、重複名稱、負數遞增都會拋出 MetricsError"""
+        registry = MetricsRegistry()
+        counter = registry.counter("events", "Events", ("kind",))
+
+        with pytest.raises(MetricsError):
+            counter.labels(other="x")
+        with pytest.raises(MetricsError):
+            counter.inc()
+        with pytest.raises(MetricsError):
+            counter.labels(kind="x").inc(-1)
+        with pytest.raises(MetricsError):
+            registry.gauge("events", "Duplicate")
+        with pytest.raises(MetricsError):
+            registry.counter("plain", "Plain").inc(-1)
+
+    def test_failing_collector_is_skipped(self):
+        """測試：collector 失敗時略過該指標，其他指標照常輸出"""
+        registry = MetricsRegistry()
+
+        def broken():
+            raise RuntimeError("pool gone")
+
+        registry.register_collector("broken_metric", "Broken", broken)
+        registry.register_collector("queue_depth", "Depth", lambda: [("queue_depth", {}, 3)])
+
+        text = registry.render()
+
+        assert "broken_metric" not in text
+        assert sample_value(text, "queue_depth") == 3
+
+    def test_register_collector_replaces_same_name(self):
+        """測試：同名 collector 重新登錄時取代舊的，與一般指標同名時拋出 MetricsError"""
+        registry = MetricsRegistry()
+        registry.counter("events", "Events")
+
+        registry.register_collector("queue_depth", "Depth", lambda: [("queue_depth", {}, 3)])
+        registry.register_collector("queue_depth", "Depth", lambda: [("queue_depth", {}, 5)])
+
+        assert sample_value(registry.render(), "queue_depth") == 5
+        with pytest.raises(MetricsError):
+            registry.register_collector("events", "Clash", list)
+
+
+class TestInstrumentation:
+    """測試 MCP 與 LLM 計時"""
+
+    async def test_metered_mcp_server(self):
+        """測試：依工具記錄延遲，錯誤結果與例外記為 error，屬性轉給原伺服器"""
+        server = FakeServer()
+        proxy = MeteredMCPServer(server)
+        labels = {"server": "casual_market_mcp", "tool": "get_taiwan_stock_price"}
+        ok_before = histogram_count(MCP_CALL_SECONDS, **labels, outcome="ok")
+        error_before = histogram_count(MCP_CALL_SECONDS, **labels, outcome="error")
+
+        await proxy.call_tool("get_taiwan_stock_price", {"symbol": "2330"})
+        await MeteredMCPServer(FakeServer(is_error=True)).call_tool(
+            "get_taiwan_stock_price", {"symbol": "2330"}
+        )
+        with pytest.raises(ConnectionError):
+            await MeteredMCPServer(FakeServer(fail=True)).call_tool(
+                "get_taiwan_stock_price", {"symbol": "2330"}
+            )
+
+        assert proxy.name == "casual_market_mcp"
+        assert proxy.session.id is server.session.id
+        assert histogram_count(MCP_CALL_SECONDS, **labels, outcome="ok") == ok_before + 1
+        assert histogram_count(MCP_CALL_SECONDS, **labels, outcome="error") == error_before + 2
+
+    async def test_session_calls_are_metered(self):
+        """測試：交易管線以 session.call_tool 呼叫時同樣記錄延遲"""
+        from api.local_market_mcp import LocalMarketMCP, reset_shared_market
+        from api.market_simulator import MarketSimulator
+        from trading.tools.trading_tools import _execute_market_trade
+
+        reset_shared_market(MarketSimulator(seed=1))
+        try:
+            async with LocalMarketMCP() as server:
+                proxy = MeteredMCPServer(server)
+                labels = {"server": proxy.name, "tool": "buy_taiwan_stock", "outcome": "ok"}
+                before = histogram_count(MCP_CALL_SECONDS, **labels)
+
+                result = await _execute_market_trade(proxy, "2330", "BUY", 1000, None)
+        finally:
+            reset_shared_market()
+
+        assert result["success"] is True
+        assert histogram_count(MCP_CALL_SECONDS, **labels) == before + 1
+
+    async def test_metered_mcp_server_legacy_result(self):
+        """測試：mcp 1.x 的 isError 結果同樣依錯誤旗標分類"""
+        labels = {"server": "casual_market_mcp", "tool": "get_company_profile"}
+        ok_before = histogram_count(MCP_CALL_SECONDS, **labels, outcome="ok")
+        error_before = histogram_count(MCP_CALL_SECONDS, **labels, outcome="error")
+
+        await MeteredMCPServer(LegacyResultServer()).call_tool("get_company_profile", {})
+        await MeteredMCPServer(LegacyResultServer(is_error=True)).call_tool(
+            "get_company_profile", {}
+        )
+
+        assert histogram_count(MCP_CALL_SECONDS, **labels, outcome="ok") == ok_before + 1
+        assert histogram_count(MCP_CALL_SECONDS, **labels, outcome="error") == error_before + 1
+
+    async def test_metered_model_counts_tokens(self, monkeypatch):
+        """測試：LLM 請求記錄延遲與輸入 / 輸出 token 數"""
+        usage = SimpleNamespace(input_tokens=120, output_tokens=30)
+
+        async def fake_get_response(self, *args, **kwargs):
+            return SimpleNamespace(usage=usage)
+
+        monkeypatch.setattr(
+            "agents.extensions.models.litellm_model.LitellmModel.get_response", fake_get_response
+        )
+        model = MeteredLitellmModel(model="test/metered-model")
+
+        await model.get_response(None, "hi", None, [], None, [], None)
+
+        labels = {"model": "test/metered-model"}
+        assert LLM_REQUEST_SECONDS.labels(**labels, outcome="ok").count == 1
+        assert LLM_TOKENS.labels(**labels, type="input").value == 120
+        assert LLM_TOKENS.labels(**labels, type="output").value == 30
+
+    async def test_metered_model_stream(self, monkeypatch):
+        """測試：串流請求在完成事件取得 token 數，全部事件照常轉出"""
+        completed = SimpleNamespace(
+            type="response.completed",
+            response=SimpleNamespace(usage=SimpleNamespace(input_tokens=5, output_tokens=7)),
+        )
+
+        async def fake_stream_response(self, *args, **kwargs):
+            yield SimpleNamespace(type="response.output_text.delta")
+            yield completed
+
+        monkeypatch.setattr(
+            "agents.extensions.models.litellm_model.LitellmModel.stream_response",
+            fake_stream_response,
+        )
+        model = MeteredLitellmModel(model="test/stream-model")
+
+        events = [event async for event in model.stream_response(None, "hi")]
+
+        labels = {"model": "test/stream-model"}
+        assert events[-1] is completed
+        assert LLM_REQUEST_SECONDS.labels(**labels, outcome="ok").count == 1
+        assert LLM_TOKENS.labels(**labels, type="output").value == 7
+
+
+class TestTradeMetrics:
+    """測試交易執行時間"""
+
+    async def test_failed_trade_is_recorded(self):
+        """測試：交易失敗（回滾）時記為 outcome="error"，無效動作歸為 invalid"""
+        from service.trading_service import TradingService
+
+        before = histogram_count(TRADE_EXECUTION_SECONDS, action="invalid", outcome="error")
+
+        result = await TradingService(db_session=None).execute_trade_atomic(
+            agent_id="agent-1", ticker="2330", action="HOLD", quantity=1000, price=100.0
+        )
+
+        assert result["success"] is False
+        assert (
+            histogram_count(TRADE_EXECUTION_SECONDS, action="invalid", outcome="error")
+            == before + 1
+        )
+
+
+class TestMetricsEndpoint:
+    """測試 /metrics 端點"""
+
+    def test_metrics_endpoint(self, monkeypatch):
+        """測試：以 Prometheus 文字格式輸出，HTTP 延遲以路由樣板為標籤"""
+        from api.app import create_app
+        from api.config import settings
+
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        client = TestClient(create_app())
+
+        client.get("/api/health")
+        client.get("/no-such-route")
+        response = client.get("/metrics", headers={"X-Admin-Token": "secret"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert 'route="/api/health",status="200"' in text
+        assert 'route="unmatched",status="404"' in text
+        for name in (
+            "casualtrader_trade_execution_duration_seconds",
+            "casualtrader_mcp_call_duration_seconds",
+            "casualtrader_llm_request_duration_seconds",
+            "casualtrader_llm_tokens",
+            "casualtrader_running_agents",
+            "casualtrader_db_pool_connections",
+            "casualtrader_websocket_connections",
+            "casualtrader_websocket_queue_depth_total",
+            "casualtrader_log_records_dropped",
+        ):
+            assert f"# TYPE {name} " in text
+
+    def test_metrics_requires_admin_token(self, monkeypatch):
+        """測試：未設定 ADMIN_TOKEN 時 404，缺少或錯誤的 token 回傳 403"""
+        from api.app import create_app
+        from api.config import settings
+
+        monkeypatch.setattr(settings, "admin_token", None)
+        client = TestClient(create_app())
+        assert client.get("/metrics", headers={"X-Admin-Token": "x"}).status_code == 404
+
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        assert client.get("/metrics").status_code == 403
+        assert client.get("/metrics", headers={"X-Admin-Token": "wrong"}).status_code == 403
@@ -0,0 +1,319 @@
+"""
+測試 SQLite → PostgreSQL 串流搬移工具
+
+測試場景:
+1. 依外鍵分層 - 父資料表先於子資料表，獨立資料表同層
+2. 值轉換與 COPY 文字格式編碼（NULL、跳脫字元、布林、bytea）
+3. checksum 在 SQLite 原始值與 PostgreSQL 回傳型別之間一致
+4. 分批串流讀取與 CopyStream
+5. 進度檔續傳
+6. 目標安全：密碼只取自環境變數，目標已有資料時需 --truncate 才清空
+7. PostgreSQL 沒有的欄位：舊版會話內容轉為 agent_session_payloads，
+   其他仍有資料的欄位需 --allow-drop 才搬移
+"""
+
+import json
+import sqlite3
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+import migrate_sqlite_to_postgres as migrate
+from migrate_sqlite_to_postgres import (
+    ColumnInfo,
+    CopyStream,
+    MigrationState,
+    TableChecksum,
+    convert_sqlite_value,
+    encode_copy_value,
+    iter_sqlite_rows,
+    plan_levels,
+)
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """建立含外鍵的測試 SQLite 檔案"""
+    path = tmp_path / "source.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE agents (id VARCHAR(50) PRIMARY KEY, is_active BOOLEAN,
+                             current_funds NUMERIC(15, 2), created_at DATETIME);
+        CREATE TABLE agent_sessions (id VARCHAR(50) PRIMARY KEY,
+                                     agent_id VARCHAR(50) REFERENCES agents(id));
+        CREATE TABLE transactions (id VARCHAR(50) PRIMARY KEY,
+                                   agent_id VARCHAR(50) REFERENCES agents(id),
+                                   session_id VARCHAR(50) REFERENCES agent_sessions(id),
+                                   market_data JSON);
+        CREATE TABLE ai_model_configs (id INTEGER PRIMARY KEY, model_key VARCHAR(50));
+        """
+    )
+    conn.executemany(
+        "INSERT INTO agents VALUES (?, ?, ?, ?)",
+        [(f"a{i}", i % 2, 1000000.005 + i, "2026-10-18 01:02:03.000004") for i in range(25)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestPlanLevels:
+    """測試資料表分層"""
+
+    def test_dependencies_ordered(self, sqlite_db):
+        """測試：子資料表在父資料表之後，獨立資料表同層"""
+        conn = sqlite3.connect(sqlite_db)
+        tables = migrate.get_sqlite_tables(conn)
+        deps = {t: migrate.get_table_dependencies(conn, t) for t in tables}
+        conn.close()
+
+        assert plan_levels(deps) == [
+            ["agents", "ai_model_configs"],
+            ["agent_sessions"],
+            ["transactions"],
+        ]
+
+    def test_cycle_placed_last(self):
+        """測試：循環參照不會造成無窮迴圈"""
+        levels = plan_levels({"a": {"b"}, "b": {"a"}, "c": set()})
+        assert levels == [["c"], ["a", "b"]]
+
+
+class TestValueConversion:
+    """測試值轉換與 COPY 編碼"""
+
+    def test_convert_by_declared_type(self):
+        """測試：依 SQLite 宣告型別轉換"""
+        assert convert_sqlite_value(1, ColumnInfo("x", "BOOLEAN")) is True
+        assert convert_sqlite_value(1.005, ColumnInfo("x", "NUMERIC(10, 2)")) == Decimal("1.01")
+        assert convert_sqlite_value('{"a": 1}', ColumnInfo("x", "JSON")) == {"a": 1}
+        assert convert_sqlite_value("2026-10-18 01:02:03", ColumnInfo("x", "DATETIME")) == datetime(
+            2026, 10, 18, 1, 2, 3
+        )
+        assert convert_sqlite_value(None, ColumnInfo("x", "INTEGER")) is None
+
+    def test_copy_text_encoding(self):
+        """測試：COPY 文字格式的 NULL 與跳脫"""
+        assert encode_copy_value(None) == "\\N"
+        assert encode_copy_value(False) == "f"
+        assert encode_copy_value("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+        assert encode_copy_value(b"\x01\xff") == "\\\\x01ff"
+        assert encode_copy_value({"k": "值"}) == '{"k": "值"}'
+
+
+class TestChecksum:
+    """測試 checksum 跨資料庫一致"""
+
+    def test_source_and_postgres_types_match(self):
+        """測試：SQLite 轉換值與 psycopg2 回傳值的 checksum 相同"""
+        column_types = [
+            ColumnInfo("funds", "NUMERIC(15, 2)"),
+            ColumnInfo("created_at", "DATETIME"),
+            ColumnInfo("data", "JSON"),
+            ColumnInfo("active", "BOOLEAN"),
+        ]
+        sqlite_row = (1000000, "2026-10-18 01:02:03.000004", '{"b": 2, "a": 1}', 1)
+        postgres_row = (
+            Decimal("1000000.00"),
+            datetime(2026, 10, 18, 1, 2, 3, 4, tzinfo=UTC),
+            {"a": 1, "b": 2},
+            True,
+        )
+
+        source = TableChecksum()
+        source.add(convert_sqlite_value(v, c) for v, c in zip(sqlite_row, column_types))
+        target = TableChecksum()
+        target.add(postgres_row)
+
+        assert source.hexdigest == target.hexdigest
+
+    def test_order_independent(self):
+        """測試：checksum 與資料列順序無關"""
+        first, second = TableChecksum(), TableChecksum()
+        for row in [(1, "a"), (2, "b")]:
+            first.add(row)
+        for row in [(2, "b"), (1, "a")]:
+            second.add(row)
+        assert first.hexdigest == second.hexdigest
+        assert first.rows == 2
+
+        second.add((3, "c"))
+        assert first.hexdigest != second.hexdigest
+
+
+class TestStreaming:
+    """測試分批串流"""
+
+    def test_rows_streamed_in_chunks(self, sqlite_db):
+        """測試：分批讀取所有資料列並轉換型別"""
+        conn = migrate.connect_sqlite(sqlite_db)
+        columns = migrate.get_table_schema(conn, "agents")
+        rows = list(iter_sqlite_rows(conn, "agents", columns, chunk_size=4))
+        conn.close()
+
+        assert len(rows) == 25
+        assert rows[0][1] is False
+        assert rows[0][2] == Decimal("1000000.01")
+
+    def test_copy_stream_reads_in_pieces(self):
+        """測試：CopyStream 依要求大小輸出完整內容"""
+        seen = []
+        stream = CopyStream(iter([(1, None), (2, "x\ty")]), on_row=seen.append)
+
+        data = b""
+        while chunk := stream.read(3):
+            data += chunk
+
+        assert data == b"1\t\\N\n2\tx\\ty\n"
+        assert len(seen) == 2
+
+
+class TestMigrationState:
+    """測試進度檔續傳"""
+
+    def test_completed_tables_persisted(self, tmp_path):
+        """測試：完成的資料表寫入進度檔並可重新載入"""
+        path = tmp_path / "state.json"
+        state = MigrationState(path, "src.db", "pg://target")
+        checksum = TableChecksum()
+        checksum.add((1,))
+        state.mark_completed("agents", checksum)
+
+        reloaded = MigrationState.load(path, "src.db", "pg://target")
+        assert reloaded.is_completed("agents")
+        assert not reloaded.is_completed("transactions")
+        assert reloaded.tables["agents"]["rows"] == 1
+
+    def test_state_for_other_migration_rejected(self, tmp_path):
+        """測試：不同來源/目標的進度檔不可續用"""
+        path = tmp_path / "state.json"
+        MigrationState(path, "src.db", "pg://target").reset()
+
+        with pytest.raises(ValueError):
+            MigrationState.load(path, "other.db", "pg://target")
+
+
+class FakeCursor:
+    """記錄 SQL 的 PostgreSQL cursor（目標資料表 agents 已有資料）"""
+
+    def __init__(self, statements: list[str]):
+        self.statements = statements
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+    def fetchall(self):
+        return [("id",), ("is_active",), ("current_funds",), ("created_at",)]
+
+    def fetchone(self):
+        return (True,)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def cursor(self):
+        return FakeCursor(self.statements)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestTargetSafety:
+    """測試目標資料庫保護"""
+
+    def test_password_only_from_environment(self, monkeypatch):
+        """測試：未設定 POSTGRES_PASSWORD 時不帶密碼（交給 libpq），設定時才帶入"""
+        monkeypatch.setattr(migrate, "POSTGRES_PASSWORD", None)
+        assert "password" not in migrate.postgres_params()
+
+        monkeypatch.setattr(migrate, "POSTGRES_PASSWORD", "from-env")
+        assert migrate.postgres_params()["password"] == "from-env"
+
+    @pytest.mark.parametrize("truncate", [False, True])
+    def test_non_empty_target_requires_truncate(self, sqlite_db, monkeypatch, truncate):
+        """測試：目標已有資料時未指定 --truncate 拒絕搬移，指定後才 TRUNCATE"""
+        conn = FakeConnection()
+        monkeypatch.setattr(migrate, "connect_postgres", lambda params: conn)
+        monkeypatch.setattr(migrate, "migrate_table", lambda *args: TableChecksum())
+        argv = ["--sqlite", str(sqlite_db), "--tables", "agents", "--yes", "--no-verify"]
+
+        status = migrate.main(argv + (["--truncate"] if truncate else []))
+
+        truncated = any(sql.startswith("TRUNCATE") for sql in conn.statements)
+        assert status == (0 if truncate else 1)
+        assert truncated is truncate
+
+
+class TestMissingColumns:
+    """測試 PostgreSQL 沒有的欄位"""
+
+    def test_legacy_session_columns_become_payloads(self, tmp_path):
+        """測試：舊版 agent_sessions 內容轉為 raw codec 的 payload 文件，全為 NULL 的會話略過"""
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE agent_sessions (id VARCHAR(50) PRIMARY KEY, initial_input JSON,
+                                         final_output TEXT, tools_called TEXT,
+                                         created_at DATETIME, updated_at DATETIME);
+            INSERT INTO agent_sessions VALUES ('s1', '{"prompt": "buy"}', 'OUT', NULL,
+                                               '2026-10-01 01:00:00', '2026-10-01 02:00:00');
+            INSERT INTO agent_sessions VALUES ('s2', NULL, NULL, NULL,
+                                               '2026-10-01 01:00:00', '2026-10-01 01:00:00');
+            """
+        )
+        conn.commit()
+        columns = [
+            c
+            for c in migrate.get_table_schema(conn, "agent_sessions")
+            if c.name in migrate.SESSION_PAYLOAD_COLUMNS
+        ]
+
+        rows = list(migrate.iter_session_payloads(conn, columns, chunk_size=10))
+        conn.close()
+
+        assert len(rows) == 1
+        session_id, codec, data, raw_size, _created_at, updated_at = rows[0]
+        assert (session_id, codec, raw_size) == ("s1", "raw", len(data))
+        assert json.loads(data) == {
+            "initial_input": {"prompt": "buy"},
+            "final_output": "OUT",
+            "tools_called": None,
+        }
+        assert updated_at == datetime(2026, 10, 1, 2, 0, 0)
+
+    @pytest.mark.parametrize("allow_drop", [False, True])
+    def test_dropping_data_requires_allow_drop(self, tmp_path, monkeypatch, allow_drop):
+        """測試：PostgreSQL 沒有的欄位仍有資料時拒絕搬移，指定 --allow-drop 才繼續"""
+        path = tmp_path / "source.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE agents (id VARCHAR(50) PRIMARY KEY, is_active BOOLEAN, "
+            "current_funds NUMERIC(15, 2), created_at DATETIME, legacy_note TEXT)"
+        )
+        conn.execute("INSERT INTO agents VALUES ('a1', 1, 100, NULL, 'keep me')")
+        conn.commit()
+        conn.close()
+        target = FakeConnection()
+        monkeypatch.setattr(migrate, "connect_postgres", lambda params: target)
+        monkeypatch.setattr(migrate, "migrate_table", lambda *args: TableChecksum())
+        argv = ["--sqlite", str(path), "--yes", "--no-verify", "--truncate"]
+
+        status = migrate.main(argv + (["--allow-drop"] if allow_drop else []))
+
+        truncated = any(sql.startswith("TRUNCATE") for sql in target.statements)
+        assert status == (0 if allow_drop else 1)
+        assert truncated is allow_drop
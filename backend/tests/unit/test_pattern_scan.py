@@ -0,0 +1,254 @@
+"""
+測試多股票圖表型態掃描引擎
+
+測試場景:
+1. 局部高低點與逐點比較一致
+2. 雙重頂 / 雙重底（含頸線確認）、帶量突破 / 跌破
+3. 成交量分布支撐壓力
+4. 多檔同時掃描與逐檔掃描結果相同、依分數排序
+5. scan_chart_patterns / identify_chart_patterns / analyze_support_resistance 工具
+"""
+
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from trading import pattern_scan
+from trading.pattern_scan import OHLCVPanel, PatternScanError, local_extrema, scan
+from trading.tools.technical_agent import (
+    analyze_support_resistance,
+    identify_chart_patterns,
+    scan_chart_patterns,
+)
+
+from .tool_helpers import invoke
+
+START = date(2024, 1, 1)
+
+
+def bars_from_closes(closes, volumes=None) -> list[dict]:
+    volumes = volumes if volumes is not None else [1000] * len(closes)
+    return [
+        {
+            "date": (START + timedelta(days=i)).isoformat(),
+            "open": float(c),
+            "high": float(c) * 1.005,
+            "low": float(c) * 0.995,
+            "close": float(c),
+            "volume": int(v),
+        }
+        for i, (c, v) in enumerate(zip(closes, volumes, strict=True))
+    ]
+
+
+def path(knots: list[tuple[int, float]]) -> list[float]:
+    """依 (日, 價) 節點線性內插的價格路徑"""
+    days, prices = zip(*knots, strict=True)
+    return list(np.interp(np.arange(days[-1] + 1), days, prices))
+
+
+DOUBLE_TOP = path([(0, 95), (15, 110), (25, 100), (35, 110), (50, 97)])
+DOUBLE_BOTTOM = path([(0, 115), (15, 100), (25, 110), (35, 100.5), (50, 113)])
+FLAT = [100 + (i % 3 - 1) * 0.5 for i in range(50)]
+
+
+@pytest.fixture
+def ohlcv_file(tmp_path, monkeypatch):
+    data = {"2330": {"bars": bars_from_closes(DOUBLE_TOP)}}
+    file = tmp_path / "bars.json"
+    file.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setenv("CASUAL_MARKET_DATA", str(file))
+    return file
+
+
+class TestLocalExtrema:
+    """測試局部高低點"""
+
+    def test_matches_brute_force(self):
+        """測試：與逐點檢查前後視窗的結果相同"""
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(4, 80)).cumsum(axis=1)
+        order = 3
+
+        peaks = local_extrema(values, order)
+        troughs = local_extrema(values, order, maximum=False)
+
+        for i in range(4):
+            for t in range(order, 80 - order):
+                window = values[i, t - order : t + order + 1]
+                assert peaks[i, t] == (values[i, t] == window.max())
+                assert troughs[i, t] == (values[i, t] == window.min())
+        assert not peaks[:, :order].any()
+        assert not peaks[:, -order:].any()
+
+    def test_plateau_marked_once(self):
+        """測試：平台只標記第一天"""
+        values = np.array([[1, 2, 5, 5, 5, 2, 1, 0, 1]], dtype=float)
+
+        assert list(np.flatnonzero(local_extrema(values, 2))) == [2]
+
+
+class TestPatterns:
+    """測試型態識別"""
+
+    def test_double_top_confirmed(self):
+        """測試：兩個相近高點、中間回檔且收盤跌破頸線"""
+        panel = OHLCVPanel.from_bars({"2330": bars_from_closes(DOUBLE_TOP)})
+
+        result = scan(panel, patterns=["double_top"])
+
+        [match] = result.matches
+        assert match.direction == "bearish"
+        assert match.confirmed
+        assert match.detected_on == START + timedelta(days=35)
+        assert match.details["neckline"] == pytest.approx(100 * 0.995)
+        assert match.details["days_apart"] == 20
+
+    def test_double_bottom_forming(self):
+        """測試：雙重底在收盤突破頸線前為形成中（分數較低）"""
+        unconfirmed = DOUBLE_BOTTOM[:45]
+        panel = OHLCVPanel.from_bars(
+            {"A": bars_from_closes(DOUBLE_BOTTOM), "B": bars_from_closes(unconfirmed)}
+        )
+
+        result = scan(panel, patterns=["double_bottom"])
+
+        by_ticker = {m.ticker: m for m in result.matches}
+        assert by_ticker["A"].confirmed
+        assert not by_ticker["B"].confirmed
+        assert result.matches[0].ticker == "A"
+
+    def test_peaks_too_different_not_matched(self):
+        """測試：兩個高點價差超過容忍度時不是雙重頂"""
+        closes = path([(0, 95), (15, 110), (25, 100), (35, 120), (50, 97)])
+        panel = OHLCVPanel.from_bars({"2330": bars_from_closes(closes)})
+
+        assert scan(panel, patterns=["double_top"]).matches == []
+
+    def test_breakout_requires_volume(self):
+        """測試：收盤突破前 20 日最高且放量才算突破"""
+        closes = FLAT + [106]
+        quiet = [1000] * 50 + [1100]
+        loud = [1000] * 50 + [3000]
+        panel = OHLCVPanel.from_bars(
+            {"LOUD": bars_from_closes(closes, loud), "QUIET": bars_from_closes(closes, quiet)}
+        )
+
+        result = scan(panel, patterns=["breakout", "breakdown"])
+
+        [match] = result.matches
+        assert match.ticker == "LOUD"
+        assert match.pattern == "breakout"
+        assert match.details["volume_ratio"] == pytest.approx(3.0)
+        assert match.details["days_ago"] == 0
+
+    def test_breakdown_without_volume_data(self):
+        """測試：沒有成交量資料時只看價格"""
+        closes = FLAT + [93]
+        panel = OHLCVPanel.from_bars({"2330": bars_from_closes(closes, [0] * 51)})
+
+        [match] = scan(panel, patterns=["breakdown"]).matches
+
+        assert match.direction == "bearish"
+
+    def test_batch_equals_single_ticker_scans(self):
+        """測試：多檔同時掃描與逐檔掃描結果相同，且依分數排序"""
+        bars = {
+            "A": bars_from_closes(DOUBLE_TOP),
+            "B": bars_from_closes(DOUBLE_BOTTOM),
+            "C": bars_from_closes(FLAT + [106], [1000] * 50 + [2500]),
+        }
+
+        batch = scan(OHLCVPanel.from_bars(bars))
+        single = [m for t, b in bars.items() for m in scan(OHLCVPanel.from_bars({t: b})).matches]
+
+        assert sorted((m.ticker, m.pattern) for m in batch.matches) == sorted(
+            (m.ticker, m.pattern) for m in single
+        )
+        scores = [m.score for m in batch.matches]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_unknown_pattern_rejected(self):
+        """測試：不支援的型態"""
+        panel = OHLCVPanel.from_bars({"2330": bars_from_closes(FLAT)})
+
+        with pytest.raises(PatternScanError):
+            scan(panel, patterns=["cup_and_handle"])
+
+
+class TestVolumeProfile:
+    """測試成交量分布支撐壓力"""
+
+    def test_high_volume_nodes(self):
+        """測試：量大的價位區低於現價為支撐、高於現價為壓力"""
+        closes = [95.0] * 20 + [105.0] * 20 + [100.0] * 5
+        volumes = [5000] * 40 + [100] * 5
+        panel = OHLCVPanel.from_bars({"2330": bars_from_closes(closes, volumes)})
+
+        levels = pattern_scan.volume_profile_levels(panel)["2330"]
+
+        assert levels["support"][0] == pytest.approx(95, abs=0.5)
+        assert levels["resistance"][0] == pytest.approx(105, abs=0.5)
+
+
+class TestTools:
+    """測試 Agent 工具"""
+
+    def test_scan_tool_with_price_data(self):
+        """測試：傳入多檔 K 線時回傳排序後的型態與支撐壓力"""
+        result = invoke(
+            scan_chart_patterns,
+            {
+                "price_data": {
+                    "2330": bars_from_closes(DOUBLE_TOP),
+                    "2317": bars_from_closes(FLAT),
+                },
+                "limit": 5,
+            },
+        )
+
+        assert result["tickers"] == 2
+        assert result["matches"][0]["ticker"] == "2330"
+        assert result["matches"][0]["pattern"] == "double_top"
+        assert set(result["levels"]) == {"2330", "2317"}
+
+    def test_scan_tool_uses_local_data(self, ohlcv_file):
+        """測試：未傳入 K 線時掃描本機 K 線檔"""
+        result = invoke(scan_chart_patterns, {"patterns": ["double_top"]})
+
+        assert [m["ticker"] for m in result["matches"]] == ["2330"]
+
+    def test_scan_tool_reports_errors(self, monkeypatch):
+        """測試：沒有資料時回傳錯誤"""
+        monkeypatch.delenv("CASUAL_MARKET_DATA", raising=False)
+
+        result = invoke(scan_chart_patterns, {})
+
+        assert "error" in result
+        assert result["matches"] == []
+
+    def test_identify_chart_patterns_includes_engine(self):
+        """測試：單檔型態識別加入雙重頂"""
+        result = invoke(
+            identify_chart_patterns,
+            {"ticker": "2330", "price_data": bars_from_closes(DOUBLE_TOP)},
+        )
+
+        names = [p["pattern_name"] for p in result["patterns"]]
+        assert "雙重頂" in names
+        assert result["pattern_count"] == len(names)
+
+    def test_support_resistance_uses_volume_profile(self):
+        """測試：支撐壓力改用成交量分布"""
+        closes = [95.0] * 20 + [105.0] * 20 + [100.0] * 5
+        volumes = [5000] * 40 + [100] * 5
+
+        result = invoke(
+            analyze_support_resistance,
+            {"ticker": "2330", "price_data": bars_from_closes(closes, volumes)},
+        )
+
+        assert result["support_levels"][0] == pytest.approx(95, abs=0.5)
+        assert result["resistance_levels"][0] == pytest.approx(105, abs=0.5)
@@ -0,0 +1,65 @@
+"""
+測試共用績效指標公式
+
+測試場景:
+1. FIFO 買賣配對與已實現損益
+2. 配對計算不修改原始交易記錄
+3. 日報酬率
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+from common.enums import TransactionAction
+from service import performance_metrics
+
+
+def trade(action, quantity, price, commission="0", ticker="2330"):
+    return SimpleNamespace(
+        ticker=ticker,
+        action=action,
+        quantity=quantity,
+        price=Decimal(str(price)),
+        commission=Decimal(commission),
+    )
+
+
+class TestTradePairs:
+    """測試 FIFO 買賣配對"""
+
+    def test_partial_fills(self):
+        """測試：一筆買入分兩次賣出形成兩個配對"""
+        transactions = [
+            trade(TransactionAction.BUY, 2000, 100),
+            trade(TransactionAction.SELL, 1000, 110),
+            trade(TransactionAction.SELL, 1000, 90),
+        ]
+
+        pairs = performance_metrics.trade_pairs_and_win_rate(transactions)
+
+        assert pairs["total_pairs"] == 2
+        assert pairs["winning_pairs"] == 1
+        assert pairs["win_rate"] == Decimal("50.0")
+        # 不修改原始交易數量
+        assert transactions[0].quantity == 2000
+
+    def test_realized_pnl(self):
+        """測試：已實現損益扣除手續費"""
+        transactions = [
+            trade(TransactionAction.BUY, 1000, 100, commission="142.5"),
+            trade(TransactionAction.SELL, 1000, 110, commission="156.75"),
+        ]
+
+        assert performance_metrics.realized_pnl(transactions) == Decimal("9700.75")
+
+
+class TestDailyReturn:
+    """測試日報酬率"""
+
+    def test_daily_return(self):
+        """測試：以百分比表示"""
+        assert performance_metrics.daily_return(Decimal("100"), Decimal("101")) == Decimal("1")
+
+    def test_non_positive_previous_value(self):
+        """測試：前日總價值非正數時無法計算"""
+        assert performance_metrics.daily_return(Decimal("0"), Decimal("101")) is None
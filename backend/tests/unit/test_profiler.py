@@ -0,0 +1,225 @@
+"""
+測試隨選剖析
+
+測試場景:
+1. Session 範圍：只記錄標記為該 session 的 task（含剖析期間建立的子 task），結束後還原 task factory
+2. 行程範圍：CPU 取樣、task 堆疊、事件迴圈延遲，collapsed stack 格式；uvloop 閒置時計為 idle
+3. 管理：同時只允許一個剖析、參數範圍、時間到自動停止、保留最近幾筆
+4. 管理端點：未設定 token 時隱藏、token 錯誤拒絕、開始 / 摘要 / 下載 / 停止
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.profiler import (
+    ProfileNotFoundError,
+    ProfilerBusyError,
+    ProfilerError,
+    ProfilerManager,
+    bind_profiling_scope,
+    reset_profiling_scope,
+)
+
+
+def busy(seconds: float) -> None:
+    """佔用 CPU（讓取樣執行緒取得事件迴圈堆疊）"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def session_work(session_id: str, rounds: int) -> None:
+    token = bind_profiling_scope(session_id)
+    try:
+        for _ in range(rounds):
+            busy(0.01)
+            await asyncio.gather(asyncio.sleep(0.01), asyncio.sleep(0.01))
+    finally:
+        reset_profiling_scope(token)
+
+
+async def other_work(rounds: int) -> None:
+    for _ in range(rounds):
+        busy(0.01)
+        await asyncio.sleep(0.001)
+
+
+class TestProfileRun:
+    """測試取樣結果"""
+
+    async def test_session_scope(self):
+        """測試：只記錄該 session 的堆疊，其他工作計入 other，結束後還原 task factory"""
+        manager = ProfilerManager()
+        loop = asyncio.get_running_loop()
+        session = asyncio.create_task(session_work("session-1", 20))
+        other = asyncio.create_task(other_work(20))
+
+        run = await manager.start(session_id="session-1", interval_ms=2, duration_seconds=10)
+        assert loop.get_task_factory() is not None
+        await asyncio.gather(session, other)
+        await manager.stop(run.id)
+
+        cpu = run.folded("cpu")
+        tasks = run.folded("tasks")
+        assert "session_work" in cpu
+        assert "other_work" not in cpu
+        assert run.other_samples > 0
+        # gather 建立的子 task 被標記為同一個 session
+        assert "sleep (" in tasks
+        assert "other_work" not in tasks
+        assert loop.get_task_factory() is None
+        assert run.summary()["scope"] == "session"
+
+    async def test_process_scope_summary(self):
+        """測試：摘要包含 CPU 熱點、task 等待位置與事件迴圈延遲，下載為 collapsed 格式"""
+        manager = ProfilerManager()
+        work = asyncio.create_task(other_work(30))
+
+        run = await manager.start(interval_ms=2, duration_seconds=10)
+        await work
+        await manager.stop(run.id)
+        summary = run.summary(top=5)
+
+        assert summary["status"] == "completed"
+        assert summary["cpu"]["samples"] > 0
+        assert summary["cpu"]["top_functions"][0]["frame"].startswith("busy (")
+        assert summary["tasks"]["snapshots"] > 0
+        assert summary["event_loop_lag_ms"]["samples"] == summary["tasks"]["snapshots"]
+        # 事件迴圈大多被 busy 佔用，取樣 task 的喚醒會延遲
+        assert summary["event_loop_lag_ms"]["max"] > 1
+        for line in run.folded("cpu").splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+            assert stack
+        with pytest.raises(ProfilerError):
+            run.folded("memory")
+
+    def test_uvloop_idle_detected(self):
+        """測試：uvloop 閒置（沒有 Python select frame）時計為 idle，不記錄在啟動迴圈的函式上"""
+        uvloop = pytest.importorskip("uvloop")
+
+        async def scenario():
+            manager = ProfilerManager()
+            run = await manager.start(interval_ms=2, duration_seconds=10)
+            await asyncio.sleep(0.3)
+            await other_work(5)
+            await manager.stop(run.id)
+            return run
+
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            run = runner.run(scenario())
+
+        cpu = run.folded("cpu")
+        assert run.idle_samples > 0
+        assert run.idle_samples > sum(run.cpu_stacks.values())
+        assert "busy (" in cpu
+        assert not any(stack[-1].startswith("Runner.run (") for stack in run.cpu_stacks)
+
+
+class TestProfilerManager:
+    """測試剖析管理"""
+
+    async def test_single_active_profile(self):
+        """測試：已有剖析執行中時拒絕，停止後可再開始"""
+        manager = ProfilerManager()
+        run = await manager.start(duration_seconds=10)
+
+        with pytest.raises(ProfilerBusyError):
+            await manager.start(duration_seconds=10)
+        await manager.stop(run.id)
+        second = await manager.start(duration_seconds=10)
+        await manager.stop(second.id)
+
+        assert manager.active is None
+        assert [r.id for r in manager.list()] == [run.id, second.id]
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"interval_ms": 0}, {"interval_ms": 5000}, {"duration_seconds": 0}]
+    )
+    async def test_invalid_parameters(self, kwargs):
+        """測試：取樣間隔與時間超出範圍時拋出 ProfilerError"""
+        with pytest.raises(ProfilerError):
+            await ProfilerManager().start(**kwargs)
+
+    async def test_auto_stop_and_history(self):
+        """測試：時間到自動停止，只保留最近 max_history 筆"""
+        manager = ProfilerManager(max_history=2)
+        ids = []
+        for _ in range(3):
+            run = await manager.start(interval_ms=5, duration_seconds=0.1)
+            ids.append(run.id)
+            await asyncio.sleep(0.3)
+            assert not run.running
+
+        assert [r.id for r in manager.list()] == ids[1:]
+        with pytest.raises(ProfileNotFoundError):
+            manager.get(ids[0])
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    from api.routers import profiling
+
+    monkeypatch.setattr(profiling.settings, "admin_token", "secret")
+    monkeypatch.setattr(profiling, "profiler_manager", ProfilerManager())
+    app = FastAPI()
+    app.include_router(profiling.router, prefix="/api/admin/profiler")
+    with TestClient(app) as client:
+        yield client
+
+
+class TestProfilerEndpoints:
+    """測試管理端點"""
+
+    def test_disabled_without_token(self, monkeypatch):
+        """測試：未設定 ADMIN_TOKEN 時端點回傳 404"""
+        from api.routers import profiling
+
+        monkeypatch.setattr(profiling.settings, "admin_token", None)
+        app = FastAPI()
+        app.include_router(profiling.router, prefix="/api/admin/profiler")
+
+        response = TestClient(app).get("/api/admin/profiler", headers={"X-Admin-Token": "x"})
+
+        assert response.status_code == 404
+
+    def test_rejects_wrong_token(self, admin_client):
+        """測試：缺少或錯誤的 token 回傳 403"""
+        assert admin_client.get("/api/admin/profiler").status_code == 403
+        response = admin_client.get("/api/admin/profiler", headers={"X-Admin-Token": "wrong"})
+        assert response.status_code == 403
+
+    def test_profile_lifecycle(self, admin_client):
+        """測試：開始、重複開始 409、摘要、停止、下載 collapsed 檔案"""
+        headers = {"X-Admin-Token": "secret"}
+
+        started = admin_client.post(
+            "/api/admin/profiler/start",
+            json={"interval_ms": 5, "duration_seconds": 30},
+            headers=headers,
+        )
+        busy_response = admin_client.post("/api/admin/profiler/start", json={}, headers=headers)
+        profile_id = started.json()["id"]
+        stopped = admin_client.post(f"/api/admin/profiler/{profile_id}/stop", headers=headers)
+        summary = admin_client.get(f"/api/admin/profiler/{profile_id}", headers=headers)
+        download = admin_client.get(
+            f"/api/admin/profiler/{profile_id}/download?kind=tasks", headers=headers
+        )
+
+        assert started.status_code == 201
+        assert started.json()["status"] == "running"
+        assert busy_response.status_code == 409
+        assert stopped.json()["status"] == "completed"
+        assert summary.json()["scope"] == "process"
+        assert download.headers["content-disposition"] == (
+            f'attachment; filename="profile-{profile_id}-tasks.folded"'
+        )
+        assert admin_client.get("/api/admin/profiler/missing", headers=headers).status_code == 404
+        invalid = admin_client.post(
+            "/api/admin/profiler/start", json={"interval_ms": 0}, headers=headers
+        )
+        assert invalid.status_code == 422
@@ -0,0 +1,170 @@
+"""
+測試讀取副本路由 (read replica routing)
+
+測試場景:
+1. 未設定讀取副本 - 讀取 session 回退至主資料庫
+2. 已設定讀取副本 - 讀取 session 使用副本
+3. read-your-writes - 最近寫入的 Agent 改走主資料庫
+4. 寫入時間窗過期 - 回到讀取副本
+5. 清單讀取 - 任何 Agent 最近有寫入時改走主資料庫
+6. 寫入記錄 - 清除過期項目、限制筆數，擠出仍在時間窗內的項目時保守改走主資料庫
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import api.config as config
+from database.read_routing import RecentWrites, mark_agent_write
+
+
+@pytest.fixture
+def routing_env(monkeypatch):
+    """隔離全域 engine / session maker 與寫入記錄"""
+    primary_maker = MagicMock(name="primary_maker")
+    replica_maker = MagicMock(name="replica_maker")
+    primary_maker.return_value = AsyncMock()
+    replica_maker.return_value = AsyncMock()
+
+    monkeypatch.setattr(config, "_async_session_maker", primary_maker)
+    monkeypatch.setattr(config, "_async_read_session_maker", replica_maker)
+    writes = RecentWrites(window_seconds=10.0)
+    monkeypatch.setattr(config, "recent_agent_writes", writes)
+    monkeypatch.setattr("database.read_routing.recent_agent_writes", writes)
+
+    return primary_maker, replica_maker
+
+
+def _make_request(agent_id=None):
+    """建立只含 path_params 的 mock request"""
+    request = MagicMock()
+    request.path_params = {"agent_id": agent_id} if agent_id else {}
+    return request
+
+
+async def _drain(agen):
+    """取得 dependency 產生的 session 並完成清理"""
+    session = await agen.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await agen.__anext__()
+    return session
+
+
+class TestReadReplicaRouting:
+    """測試讀取 session 的路由規則"""
+
+    def test_fallback_to_primary_without_replica(self, routing_env, monkeypatch):
+        """測試：未設定讀取副本時使用主資料庫 session maker"""
+        primary_maker, _ = routing_env
+        monkeypatch.setattr(config.settings, "database_read_url", None)
+
+        assert config.get_read_session_maker() is primary_maker
+
+    def test_replica_used_when_configured(self, routing_env, monkeypatch):
+        """測試：設定讀取副本後使用副本 session maker"""
+        _, replica_maker = routing_env
+        monkeypatch.setattr(
+            config.settings, "database_read_url", "postgresql+asyncpg://u:p@replica/db"
+        )
+
+        assert config.get_read_session_maker() is replica_maker
+
+    @pytest.mark.asyncio
+    async def test_recent_write_pins_agent_to_primary(self, routing_env, monkeypatch):
+        """測試：Agent 剛寫入後，讀取請求改走主資料庫"""
+        primary_maker, replica_maker = routing_env
+        monkeypatch.setattr(
+            config.settings, "database_read_url", "postgresql+asyncpg://u:p@replica/db"
+        )
+
+        mark_agent_write("agent-1")
+
+        await _drain(config.get_read_db_session(_make_request("agent-1")))
+        primary_maker.assert_called_once()
+        replica_maker.assert_not_called()
+
+        # 其他 Agent 不受影響
+        await _drain(config.get_read_db_session(_make_request("agent-2")))
+        replica_maker.assert_called_once()
+
+    def test_write_window_expires(self, routing_env, monkeypatch):
+        """測試：超過時間窗後恢復使用讀取副本"""
+        monkeypatch.setattr(
+            config.settings, "database_read_url", "postgresql+asyncpg://u:p@replica/db"
+        )
+
+        config.recent_agent_writes.mark("agent-1", at=time.monotonic() - 11.0)
+
+        assert config.requires_primary_read("agent-1") is False
+        assert config.requires_primary_read(None) is False
+        assert "agent-1" not in config.recent_agent_writes
+
+    def test_no_pinning_without_replica(self, routing_env, monkeypatch):
+        """測試：單一資料庫部署時不需要 read-your-writes 判斷"""
+        monkeypatch.setattr(config.settings, "database_read_url", None)
+
+        mark_agent_write("agent-1")
+        assert config.requires_primary_read("agent-1") is False
+        assert config.requires_primary_read(None) is False
+
+    @pytest.mark.asyncio
+    async def test_list_reads_follow_any_recent_write(self, routing_env, monkeypatch):
+        """測試：任何 Agent 剛寫入後，不限定 Agent 的清單讀取改走主資料庫"""
+        primary_maker, replica_maker = routing_env
+        monkeypatch.setattr(
+            config.settings, "database_read_url", "postgresql+asyncpg://u:p@replica/db"
+        )
+
+        await _drain(config.get_read_db_session(_make_request()))
+        replica_maker.assert_called_once()
+
+        mark_agent_write("agent-1")
+        await _drain(config.get_read_db_session(_make_request()))
+        primary_maker.assert_called_once()
+
+
+class TestRecentWrites:
+    """測試寫入記錄的時間窗與筆數上限"""
+
+    def test_expired_entries_pruned_on_write(self):
+        """測試：寫入時清除時間窗外的舊項目"""
+        writes = RecentWrites(window_seconds=10.0)
+        now = time.monotonic()
+        for index in range(100):
+            writes.mark(f"agent-{index}", at=now - 60.0)
+
+        writes.mark("agent-new")
+
+        assert len(writes) == 1
+        assert writes.is_recent("agent-new") is True
+
+    def test_size_bounded(self):
+        """測試：筆數不超過上限，最舊的項目先被擠出"""
+        writes = RecentWrites(window_seconds=10.0, max_entries=3)
+        now = time.monotonic()
+        for index in range(5):
+            writes.mark(f"agent-{index}", at=now - 60.0 + index)
+        writes.mark("agent-new")
+
+        assert len(writes) == 1
+        for index in range(5):
+            writes.mark(f"agent-{index}")
+
+        assert len(writes) == 3
+        assert "agent-0" not in writes
+        assert "agent-4" in writes
+
+    def test_evicted_fresh_write_pins_all_reads(self):
+        """測試：仍在時間窗內的項目被擠出後，所有讀取改走主資料庫直到時間窗結束"""
+        writes = RecentWrites(window_seconds=10.0, max_entries=1)
+        now = time.monotonic()
+
+        writes.mark("agent-1", at=now - 5.0)
+        writes.mark("agent-2")
+        assert writes.is_recent("agent-3") is True
+
+        writes = RecentWrites(window_seconds=10.0, max_entries=1)
+        writes.mark("agent-1", at=now - 11.0)
+        writes.mark("agent-2", at=now - 10.5)
+        assert writes.is_recent("agent-3") is False
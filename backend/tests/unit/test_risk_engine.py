@@ -0,0 +1,303 @@
+"""
+測試投資組合風險引擎
+
+測試場景:
+1. 共變異數 / 相關係數矩陣與 NumPy 計算一致
+2. 參數法與歷史模擬法 VaR / CVaR
+3. 分散效果（負相關降低組合 VaR）
+4. 依交易日快取共變異數估計（多執行緒同時呼叫時快取不超過上限）
+5. calculate_portfolio_risk / calculate_position_risk 使用伺服器端本機價格（忽略傳入的價格序列）
+"""
+
+import json
+import math
+from datetime import date, timedelta
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from trading.risk_engine import CovarianceEstimate, RiskEngine, RiskEngineError
+from trading.tools.risk_agent import calculate_portfolio_risk, calculate_position_risk
+
+from .tool_helpers import invoke
+
+DAY = date(2024, 5, 2)
+
+
+def random_walk(seed: int, days: int = 120, start: float = 100.0, vol: float = 0.02):
+    rng = np.random.default_rng(seed)
+    return list(start * np.cumprod(1 + rng.normal(0, vol, days)))
+
+
+def write_price_file(path, monkeypatch, closes: dict[str, list[float]]) -> None:
+    """寫入本機價格檔（錄製 K 線格式）並設定 CASUAL_MARKET_DATA"""
+    start = date(2024, 1, 1)
+    data = {
+        ticker: {
+            "bars": [
+                {"date": (start + timedelta(days=i)).isoformat(), "close": close}
+                for i, close in enumerate(series)
+            ]
+        }
+        for ticker, series in closes.items()
+    }
+    path.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setenv("CASUAL_MARKET_DATA", str(path))
+
+
+class TestCovarianceEstimate:
+    """測試共變異數估計"""
+
+    def test_matches_numpy(self):
+        """測試：共變異數與相關係數與 NumPy 直接計算相同"""
+        prices = {"2330": random_walk(1), "2317": random_walk(2, start=50)}
+
+        estimate = RiskEngine().estimate(prices, DAY)
+
+        matrix = np.array([prices["2317"], prices["2330"]]).T
+        returns = matrix[1:] / matrix[:-1] - 1
+        assert estimate.tickers == ("2317", "2330")
+        np.testing.assert_allclose(estimate.covariance, np.cov(returns, rowvar=False))
+        np.testing.assert_allclose(estimate.correlation, np.corrcoef(returns, rowvar=False))
+
+    def test_aligns_to_common_recent_window(self):
+        """測試：長度不同時取共同的最近區間"""
+        estimate = RiskEngine().estimate(
+            {"2330": random_walk(1, days=80), "2317": random_walk(2, days=30)}, DAY
+        )
+
+        assert estimate.observations == 29
+
+    def test_annualized_volatility(self):
+        """測試：年化波動率 = 日標準差 × √252"""
+        prices = random_walk(3, days=250, vol=0.015)
+
+        volatility = RiskEngine().estimate({"2330": prices}, DAY).annualized_volatility()
+
+        returns = np.diff(prices) / prices[:-1]
+        assert volatility["2330"] == pytest.approx(np.std(returns, ddof=1) * math.sqrt(252))
+
+    @pytest.mark.parametrize(
+        "prices",
+        [{}, {"2330": [100.0] * 5}, {"2330": [100.0] * 20 + [0.0]}, {"2330": ["x"] * 20}],
+    )
+    def test_rejects_insufficient_or_invalid_history(self, prices):
+        """測試：資料不足或格式錯誤時拋出 RiskEngineError"""
+        with pytest.raises(RiskEngineError):
+            RiskEngine().estimate(prices, DAY)
+
+
+class TestPortfolioVaR:
+    """測試組合 VaR / CVaR"""
+
+    def test_parametric_var_matches_closed_form(self):
+        """測試：參數法 VaR = z·√(vᵀΣv) − 平均損益"""
+        engine = RiskEngine()
+        estimate = engine.estimate({"2330": random_walk(1), "2317": random_walk(2)}, DAY)
+        values = {"2317": 300_000.0, "2330": 500_000.0}
+
+        var = engine.portfolio_var(estimate, values)
+
+        v = np.array([300_000.0, 500_000.0])
+        sigma = math.sqrt(v @ estimate.covariance @ v)
+        z = NormalDist().inv_cdf(0.95)
+        assert var.parametric_var == pytest.approx(z * sigma - v @ estimate.mean)
+        assert var.parametric_cvar > var.parametric_var
+        assert sum(var.component_var.values()) == pytest.approx(z * sigma)
+
+    def test_historical_var_is_empirical_quantile(self):
+        """測試：歷史模擬法 VaR 為損益分布的 5% 分位數，CVaR 為尾端平均"""
+        engine = RiskEngine()
+        estimate = engine.estimate({"2330": random_walk(4, days=500)}, DAY)
+
+        var = engine.portfolio_var(estimate, {"2330": 1_000_000.0})
+
+        pnl = estimate.returns[:, 0] * 1_000_000
+        assert var.historical_var == pytest.approx(-np.quantile(pnl, 0.05))
+        assert var.historical_cvar == pytest.approx(-pnl[pnl <= -var.historical_var].mean())
+        assert var.historical_cvar >= var.historical_var
+
+    def test_negative_correlation_diversifies(self):
+        """測試：負相關部位的組合 VaR 低於個別 VaR 加總"""
+        base = random_walk(5)
+        mirror = [200 - p for p in base]
+        engine = RiskEngine()
+        estimate = engine.estimate({"A": base, "B": mirror}, DAY)
+
+        var = engine.portfolio_var(estimate, {"A": 100_000.0, "B": 100_000.0})
+
+        assert estimate.correlation[0, 1] < -0.9
+        assert var.diversification_ratio < 0.5
+        assert var.parametric_var < var.undiversified_var
+
+    def test_multi_day_horizon_scales(self):
+        """測試：多日 VaR 以 √t 放大（參數法）"""
+        engine = RiskEngine()
+        estimate = engine.estimate({"2330": random_walk(6)}, DAY)
+
+        one_day = engine.portfolio_var(estimate, {"2330": 1_000_000.0})
+        ten_day = engine.portfolio_var(estimate, {"2330": 1_000_000.0}, horizon_days=10)
+
+        assert sum(ten_day.component_var.values()) == pytest.approx(
+            sum(one_day.component_var.values()) * math.sqrt(10)
+        )
+        assert ten_day.historical_var > one_day.historical_var
+
+    def test_missing_ticker_rejected(self):
+        """測試：持股沒有價格歷史時拋出 RiskEngineError"""
+        engine = RiskEngine()
+        estimate = engine.estimate({"2330": random_walk(1)}, DAY)
+
+        with pytest.raises(RiskEngineError):
+            engine.portfolio_var(estimate, {"2330": 1.0, "2317": 1.0})
+
+
+class TestEstimateCache:
+    """測試依交易日快取"""
+
+    def test_same_day_reuses_estimate(self):
+        """測試：同一交易日相同資料不重算"""
+        engine = RiskEngine()
+        prices = {"2330": random_walk(1), "2317": random_walk(2)}
+
+        first = engine.estimate(prices, DAY)
+        second = engine.estimate(dict(reversed(list(prices.items()))), DAY)
+
+        assert second is first
+        assert engine.cache_info()["hits"] == 1
+        assert engine.cache_info()["misses"] == 1
+
+    def test_new_trading_day_clears_cache(self):
+        """測試：換日時清除前一日的估計"""
+        engine = RiskEngine()
+        prices = {"2330": random_walk(1)}
+        engine.estimate(prices, DAY)
+
+        engine.estimate(prices, date(2024, 5, 3))
+
+        assert engine.cache_info() == {
+            "trading_day": "2024-05-03",
+            "entries": 1,
+            "hits": 0,
+            "misses": 2,
+        }
+
+    def test_changed_prices_recomputed(self):
+        """測試：同日價格資料不同時重新估計"""
+        engine = RiskEngine()
+        prices = random_walk(1)
+        first = engine.estimate({"2330": prices}, DAY)
+
+        second = engine.estimate({"2330": prices[:-1] + [prices[-1] * 1.05]}, DAY)
+
+        assert second is not first
+
+    def test_concurrent_estimates_respect_cache_limit(self):
+        """測試：多執行緒同時估計、換日與淘汰時不出錯，快取不超過上限"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        engine = RiskEngine(max_cached=4)
+        days = [DAY, date(2024, 5, 3)]
+
+        def run(seed: int) -> CovarianceEstimate:
+            return engine.estimate({"2330": random_walk(seed % 12)}, days[seed % 2])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(run, range(400)))
+
+        info = engine.cache_info()
+        assert len(results) == 400
+        assert info["entries"] <= 4
+        assert info["hits"] + info["misses"] == 400
+
+
+class TestRiskAgentTools:
+    """測試風險工具使用伺服器端歷史價格"""
+
+    @pytest.fixture
+    def price_file(self, tmp_path, monkeypatch):
+        write_price_file(
+            tmp_path / "prices.json",
+            monkeypatch,
+            {"2330": random_walk(1), "2317": random_walk(2)},
+        )
+
+    def test_portfolio_risk_uses_covariance(self, price_file):
+        """測試：持股有本機價格時以共變異數計算組合 VaR"""
+        result = invoke(
+            calculate_portfolio_risk,
+            {
+                "position_risks": [
+                    {"ticker": "2330", "position_value": 500_000, "var_95": 50_000},
+                    {"ticker": "2317", "position_value": 300_000, "var_95": 30_000},
+                ],
+                "trading_day": "2024-05-02",
+            },
+        )
+
+        assert result["var_method"] == "covariance"
+        assert result["var_horizon_days"] == 1
+        assert result["total_var_95"] < result["undiversified_var_95"]
+        assert set(result["correlation_matrix"]) == {"2330", "2317"}
+        assert result["historical_cvar_95"] >= result["historical_var_95"]
+        assert result["observations"] == 119
+
+    def test_tools_do_not_accept_price_series(self):
+        """測試：工具參數不含價格序列，模型無法傳入自行產生的價格"""
+        for tool in (calculate_portfolio_risk, calculate_position_risk):
+            properties = tool.params_json_schema["properties"]
+            assert "price_history" not in properties
+            assert "market_history" not in properties
+
+    def test_portfolio_risk_falls_back_without_history(self, tmp_path, monkeypatch):
+        """測試：部分持股沒有本機價格時沿用個別 VaR 加總與 HHI 調整"""
+        write_price_file(tmp_path / "prices.json", monkeypatch, {"2330": random_walk(1)})
+
+        result = invoke(
+            calculate_portfolio_risk,
+            {
+                "position_risks": [
+                    {"ticker": "2330", "position_value": 500_000, "var_95": 50_000},
+                    {"ticker": "2317", "position_value": 300_000, "var_95": 30_000},
+                ],
+                "concentration_json": json.dumps({"hhi": 0.3}),
+            },
+        )
+
+        assert result["var_method"] == "sum"
+        assert result["total_var_95"] == 80_000
+        assert result["correlation_adjustment"] == pytest.approx(1.1)
+
+    def test_position_risk_estimates_volatility_and_beta(self, tmp_path, monkeypatch):
+        """測試：未提供 market_data 時以本機價格估計波動率與相對大盤代理的 Beta"""
+        # 價格檔只有一檔股票時，大盤代理即為該股票本身
+        write_price_file(tmp_path / "prices.json", monkeypatch, {"2330": random_walk(7)})
+
+        result = invoke(
+            calculate_position_risk,
+            {
+                "ticker": "2330",
+                "position_data": {"quantity": 1000, "avg_cost": 90, "current_price": 100},
+            },
+        )
+
+        assert result["volatility_source"] == "historical"
+        assert result["beta"] == pytest.approx(1.0)
+        assert result["volatility"] != 0.25
+
+    def test_position_risk_defaults_without_history(self, monkeypatch):
+        """測試：沒有本機價格資料時維持預設波動率與 Beta"""
+        monkeypatch.delenv("CASUAL_MARKET_DATA", raising=False)
+
+        result = invoke(
+            calculate_position_risk,
+            {
+                "ticker": "2330",
+                "position_data": {"quantity": 1000, "avg_cost": 90, "current_price": 100},
+            },
+        )
+
+        assert result["volatility_source"] == "default"
+        assert result["volatility"] == 0.25
+        assert result["beta"] == 1.0
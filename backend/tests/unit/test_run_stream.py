@@ -0,0 +1,276 @@
+"""
+測試 Agent 執行串流事件批次器
+
+測試場景:
+1. SDK 事件轉換（增量文字、工具呼叫、Agent 切換）
+2. 連續文字片段合併
+3. sub-agent 經由 RunHooks 轉送事件（鎖定版本 SDK 的 as_tool 沒有 on_stream），帶有 parent_call_id
+4. 定時批次推送與關閉時推送剩餘事件
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from agents import Agent, Runner, function_tool
+from agents.items import ModelResponse, ToolCallItem, ToolCallOutputItem
+from agents.models.interface import Model
+from agents.stream_events import (
+    AgentUpdatedStreamEvent,
+    RawResponsesStreamEvent,
+    RunItemStreamEvent,
+)
+from agents.usage import Usage
+from openai.types.responses import (
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+)
+
+from trading.run_stream import RunStreamBatcher
+from trading.subagent_stream import SubagentStreamHooks, relay_subagent_tool
+
+MAIN_AGENT = Agent(name="main")
+SUB_AGENT = Agent(name="technical")
+
+
+def text_delta(delta: str) -> RawResponsesStreamEvent:
+    """建立增量文字事件"""
+    return RawResponsesStreamEvent(
+        data=SimpleNamespace(type="response.output_text.delta", delta=delta)
+    )
+
+
+def tool_called(name: str, call_id: str, agent: Agent = MAIN_AGENT) -> RunItemStreamEvent:
+    """建立工具呼叫事件"""
+    raw = ResponseFunctionToolCall(arguments="{}", call_id=call_id, name=name, type="function_call")
+    return RunItemStreamEvent(name="tool_called", item=ToolCallItem(agent=agent, raw_item=raw))
+
+
+def tool_output(call_id: str, output: str) -> RunItemStreamEvent:
+    """建立工具輸出事件"""
+    raw = {"call_id": call_id, "output": output, "type": "function_call_output"}
+    return RunItemStreamEvent(
+        name="tool_output",
+        item=ToolCallOutputItem(agent=MAIN_AGENT, raw_item=raw, output=output),
+    )
+
+
+class ScriptedModel(Model):
+    """依序回傳固定的工具呼叫，最後回傳文字訊息"""
+
+    def __init__(self, calls: list[tuple[str, str]], text: str):
+        self.calls = calls
+        self.text = text
+
+    async def get_response(self, system_instructions, input, *args, **kwargs) -> ModelResponse:
+        step = (
+            0
+            if isinstance(input, str)
+            else sum(
+                1
+                for item in input
+                if isinstance(item, dict) and item.get("type") == "function_call_output"
+            )
+        )
+        if step < len(self.calls):
+            name, call_id = self.calls[step]
+            item = ResponseFunctionToolCall(
+                arguments='{"input": "2330"}', call_id=call_id, name=name, type="function_call"
+            )
+        else:
+            item = ResponseOutputMessage(
+                id="msg-1",
+                content=[ResponseOutputText(annotations=[], text=self.text, type="output_text")],
+                role="assistant",
+                status="completed",
+                type="message",
+            )
+        return ModelResponse(output=[item], usage=Usage(), response_id=None)
+
+    async def stream_response(self, *args, **kwargs):
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+
+@function_tool
+def lookup_rsi(input: str) -> str:
+    """查詢 RSI"""
+    return f"{input} RSI=72"
+
+
+class Collector:
+    """收集推送的批次"""
+
+    def __init__(self):
+        self.batches: list[list[dict]] = []
+
+    async def __call__(self, events):
+        self.batches.append(events)
+
+    @property
+    def events(self) -> list[dict]:
+        return [event for batch in self.batches for event in batch]
+
+
+class TestEventConversion:
+    """測試事件轉換"""
+
+    @pytest.mark.asyncio
+    async def test_text_deltas_coalesced(self):
+        """測試：同一批次的連續文字片段合併為一筆"""
+        collector = Collector()
+        batcher = RunStreamBatcher(collector)
+
+        for delta in ["買", "進", " 2330"]:
+            batcher.handle_event(text_delta(delta), agent_name="main")
+        await batcher.flush()
+
+        assert collector.events == [{"kind": "text", "agent": "main", "delta": "買進 2330"}]
+        assert batcher.events_received == 3
+
+    @pytest.mark.asyncio
+    async def test_tool_events(self):
+        """測試：工具呼叫開始與完成事件"""
+        collector = Collector()
+        batcher = RunStreamBatcher(collector)
+
+        batcher.handle_event(tool_called("buy_stock", "call-1"))
+        batcher.handle_event(tool_output("call-1", "x" * 600))
+        await batcher.flush()
+
+        started, finished = collector.events
+        assert started == {
+            "kind": "tool_started",
+            "agent": "main",
+            "tool": "buy_stock",
+            "call_id": "call-1",
+        }
+        assert finished["kind"] == "tool_finished"
+        assert finished["call_id"] == "call-1"
+        assert len(finished["output"]) == 500
+        assert finished["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_irrelevant_events_ignored(self):
+        """測試：非文字的原始事件不推送"""
+        collector = Collector()
+        batcher = RunStreamBatcher(collector)
+
+        batcher.handle_event(RawResponsesStreamEvent(data=SimpleNamespace(type="response.created")))
+        batcher.handle_event(AgentUpdatedStreamEvent(new_agent=MAIN_AGENT))
+        await batcher.flush()
+
+        assert collector.events == [{"kind": "agent_updated", "agent": "main"}]
+
+
+class TestSubagentRelay:
+    """測試 sub-agent 事件轉送"""
+
+    @pytest.mark.asyncio
+    async def test_subagent_events_linked_to_parent_call(self):
+        """測試：as_tool 的 hooks 轉送 sub-agent 的 Agent、工具與文字事件，帶有主 Agent 的 tool call ID"""
+        collector = Collector()
+        batcher = RunStreamBatcher(collector)
+        sub_agent = Agent(
+            name="technical",
+            model=ScriptedModel([("lookup_rsi", "sub-call-1")], "RSI 偏高"),
+            tools=[lookup_rsi],
+        )
+        tool = relay_subagent_tool(
+            sub_agent.as_tool(
+                tool_name="technical_analyst",
+                tool_description="技術分析",
+                hooks=SubagentStreamHooks(lambda: batcher),
+            )
+        )
+        main = Agent(
+            name="main",
+            model=ScriptedModel([("technical_analyst", "call-9")], "完成"),
+            tools=[tool],
+        )
+
+        await Runner.run(main, "分析 2330")
+        await batcher.flush()
+
+        events = collector.events
+        assert all(event["parent_call_id"] == "call-9" for event in events)
+        assert [event["kind"] for event in events] == [
+            "agent_updated",
+            "tool_started",
+            "tool_finished",
+            "text",
+        ]
+        assert events[1]["tool"] == "lookup_rsi"
+        assert events[1]["call_id"] == events[2]["call_id"] == "sub-call-1"
+        assert events[2]["output"] == "2330 RSI=72"
+        assert events[3] == {
+            "kind": "text",
+            "agent": "technical",
+            "delta": "RSI 偏高",
+            "parent_call_id": "call-9",
+        }
+
+    @pytest.mark.asyncio
+    async def test_no_sink_skips_events(self):
+        """測試：未啟用串流（sink 為 None）時不轉送，sub-agent 照常執行"""
+        sub_agent = Agent(name="technical", model=ScriptedModel([], "RSI 偏高"))
+        tool = relay_subagent_tool(
+            sub_agent.as_tool(
+                tool_name="technical_analyst",
+                tool_description="技術分析",
+                hooks=SubagentStreamHooks(lambda: None),
+            )
+        )
+        main = Agent(
+            name="main",
+            model=ScriptedModel([("technical_analyst", "call-1")], "完成"),
+            tools=[tool],
+        )
+
+        result = await Runner.run(main, "分析 2330")
+
+        assert result.final_output == "完成"
+        assert relay_subagent_tool(None) is None
+
+
+class TestBatching:
+    """測試批次推送"""
+
+    @pytest.mark.asyncio
+    async def test_periodic_flush(self):
+        """測試：背景任務依間隔推送"""
+        collector = Collector()
+        async with RunStreamBatcher(collector, flush_interval_ms=10) as batcher:
+            batcher.handle_event(text_delta("a"), agent_name="main")
+            await asyncio.sleep(0.05)
+            assert collector.events == [{"kind": "text", "agent": "main", "delta": "a"}]
+
+            batcher.handle_event(tool_called("get_portfolio", "c2"))
+        # 關閉時推送剩餘事件
+        assert collector.events[-1]["kind"] == "tool_started"
+        assert len(collector.batches) == 2
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_flushes_early(self):
+        """測試：緩衝區滿時不等待間隔提前推送"""
+        collector = Collector()
+        async with RunStreamBatcher(
+            collector, flush_interval_ms=10_000, max_buffered_events=2
+        ) as b:
+            b.handle_event(tool_called("a", "c1"))
+            b.handle_event(tool_called("b", "c2"))
+            await asyncio.sleep(0.01)
+            assert len(collector.events) == 2
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_does_not_raise(self):
+        """測試：推送失敗不影響 Agent 執行"""
+
+        async def failing(_events):
+            raise RuntimeError("socket gone")
+
+        batcher = RunStreamBatcher(failing)
+        batcher.handle_event(text_delta("a"), agent_name="main")
+        await batcher.flush()
+        assert batcher.batches_sent == 1
@@ -0,0 +1,258 @@
+"""
+測試全市場基本面篩選索引
+
+測試場景:
+1. 由財報資料計算指標（年化 ROE、百分比轉小數、缺值）
+2. 排序索引篩選結果與逐列比較一致
+3. 條件解析（字串、列表、百分比、別名、錯誤格式）
+4. 存檔 / 讀取與批次建立（本機模擬市場）
+5. screen_stocks 工具
+"""
+
+import asyncio
+import math
+import os
+
+import numpy as np
+import pytest
+
+from api.local_market_mcp import LocalMarketMCP
+from api.market_simulator import MarketSimulator
+from api.mcp_client import MCPMarketClient
+from trading import screening
+from trading.screening import (
+    Condition,
+    ScreeningError,
+    ScreeningIndex,
+    build_screening_index,
+    compute_metrics,
+    parse_conditions,
+    screen,
+)
+from trading.tools.fundamental_agent import screen_stocks
+
+from .tool_helpers import invoke
+
+
+def random_index(rows: int = 5000, seed: int = 0) -> ScreeningIndex:
+    rng = np.random.default_rng(seed)
+    columns = {
+        "pe_ratio": rng.uniform(5, 40, rows),
+        "roe": rng.normal(0.1, 0.08, rows),
+        "revenue_growth": rng.normal(0.05, 0.2, rows),
+        "dividend_yield": rng.uniform(0, 0.08, rows),
+        "industry": rng.choice(["半導體業", "金融保險業", "航運業"], rows),
+    }
+    # 部分股票缺少本益比（虧損）
+    columns["pe_ratio"][rng.random(rows) < 0.1] = np.nan
+    return ScreeningIndex([f"{1000 + i}" for i in range(rows)], columns)
+
+
+@pytest.fixture
+def index_path(tmp_path, monkeypatch):
+    index = ScreeningIndex(
+        ["2330", "2317", "2454"],
+        {
+            "pe_ratio": [18.0, 11.0, 14.0],
+            "roe": [0.28, 0.1, 0.2],
+            "revenue_growth": [0.3, 0.02, 0.15],
+            "dividend_yield": [0.02, 0.045, 0.05],
+            "industry": ["半導體業", "其他電子業", "半導體業"],
+        },
+    )
+    path = str(tmp_path / "screening_index.npz")
+    index.save(path)
+    monkeypatch.setenv("SCREENING_INDEX_PATH", path)
+    return path
+
+
+class TestComputeMetrics:
+    """測試指標計算"""
+
+    def test_ratios_from_statements(self):
+        """測試：ROE 以單季淨利年化、百分比轉為小數、EPS 與去年同季比較"""
+        metrics = compute_metrics(
+            {
+                "income": {"revenue": 1000, "gross_profit": 400, "net_income": 100, "eps": 2.2},
+                "prior_income": {"eps": 2.0},
+                "balance": {
+                    "total_assets": 4000,
+                    "total_liabilities": 2000,
+                    "equity": 2000,
+                    "current_assets": 1500,
+                    "current_liabilities": 1000,
+                },
+                "monthly_revenue": {"yoy_percent": 12.5},
+                "valuation": {"pe_ratio": 14.2, "pb_ratio": 2.1, "dividend_yield": 3.5},
+            }
+        )
+
+        assert metrics["roe"] == pytest.approx(0.2)
+        assert metrics["roa"] == pytest.approx(0.1)
+        assert metrics["gross_margin"] == pytest.approx(0.4)
+        assert metrics["debt_ratio"] == pytest.approx(0.5)
+        assert metrics["current_ratio"] == pytest.approx(1.5)
+        assert metrics["dividend_yield"] == pytest.approx(0.035)
+        assert metrics["revenue_growth"] == pytest.approx(0.125)
+        assert metrics["eps_growth"] == pytest.approx(0.1)
+
+    def test_missing_data_is_nan(self):
+        """測試：缺少財報或分母為零時為 NaN"""
+        metrics = compute_metrics({"income": {"revenue": 0, "net_income": 10}})
+
+        assert math.isnan(metrics["net_margin"])
+        assert math.isnan(metrics["roe"])
+        assert math.isnan(metrics["pe_ratio"])
+
+
+class TestScreeningIndex:
+    """測試排序索引篩選"""
+
+    def test_matches_brute_force(self):
+        """測試：多條件篩選與排序結果與逐列比較相同"""
+        index = random_index()
+        conditions = [
+            Condition("pe_ratio", "<", 15.0),
+            Condition("roe", ">", 0.12),
+            Condition("revenue_growth", ">=", 0.1),
+        ]
+
+        rows, matched = index.query(conditions, sort_by="dividend_yield", limit=20)
+
+        columns = index.columns
+        expected = [
+            i
+            for i in range(len(index))
+            if columns["pe_ratio"][i] < 15
+            and columns["roe"][i] > 0.12
+            and columns["revenue_growth"][i] >= 0.1
+        ]
+        expected.sort(key=lambda i: columns["dividend_yield"][i], reverse=True)
+        assert matched == len(expected)
+        assert list(rows) == expected[:20]
+
+    def test_text_condition_and_ascending_sort(self):
+        """測試：產業相等條件、由小到大排序、缺值不參與排序"""
+        index = random_index()
+
+        rows, _ = index.query(
+            [Condition("industry", "==", "航運業")], sort_by="pe_ratio", descending=False, limit=5
+        )
+
+        values = index.columns["pe_ratio"][rows]
+        assert all(index.columns["industry"][rows] == "航運業")
+        assert list(values) == sorted(values)
+        assert not np.isnan(values).any()
+
+    def test_sort_by_text_field_rejected(self):
+        """測試：不能以文字欄位排序"""
+        with pytest.raises(ScreeningError):
+            random_index(10).query([], sort_by="industry")
+
+    def test_save_and_load(self, tmp_path):
+        """測試：存檔後讀取的欄位與建立時間相同"""
+        index = random_index(100)
+        path = str(tmp_path / "index.npz")
+
+        index.save(path)
+        loaded = ScreeningIndex.load(path)
+
+        assert list(loaded.tickers) == list(index.tickers)
+        np.testing.assert_array_equal(loaded.columns["roe"], index.columns["roe"])
+        assert loaded.built_at == index.built_at
+
+    def test_missing_index_file(self, tmp_path):
+        """測試：索引尚未建立時拋出 ScreeningError"""
+        with pytest.raises(ScreeningError):
+            screening.get_screening_index(str(tmp_path / "missing.npz"))
+
+
+class TestParseConditions:
+    """測試條件解析"""
+
+    def test_string_with_percent_and_aliases(self):
+        """測試：字串條件、百分比與欄位別名"""
+        conditions = parse_conditions("PE < 15, roe > 12% and industry = '半導體業'")
+
+        assert conditions == [
+            Condition("pe_ratio", "<", 15.0),
+            Condition("roe", ">", 0.12),
+            Condition("industry", "==", "半導體業"),
+        ]
+
+    def test_list_of_dicts_and_strings(self):
+        """測試：列表中混用字典與字串"""
+        conditions = parse_conditions([{"field": "yield", "op": ">=", "value": "4%"}, "eps>1"])
+
+        assert conditions == [
+            Condition("dividend_yield", ">=", 0.04),
+            Condition("eps", ">", 1.0),
+        ]
+
+    @pytest.mark.parametrize(
+        "filters", ["unknown_field > 1", "roe > abc", "industry > 1", "roe ~ 1"]
+    )
+    def test_invalid_conditions(self, filters):
+        """測試：未知欄位、非數值、文字欄位比大小與錯誤運算子"""
+        with pytest.raises(ScreeningError):
+            parse_conditions(filters)
+
+
+class TestBuildIndex:
+    """測試批次建立"""
+
+    def test_build_from_local_market(self):
+        """測試：以本機模擬市場建立索引，指標與直接計算一致"""
+        market = MarketSimulator(seed=3)
+        client = MCPMarketClient()
+        client._server = LocalMarketMCP(market)
+        tickers = ["2330", "2317", "2454", "abc"]
+
+        index = asyncio.run(build_screening_index(tickers, client, concurrency=2))
+
+        assert list(index.tickers) == ["2330", "2317", "2454"]
+        row = index.row(0)
+        assert row["industry"] == "半導體業"
+        valuation = market.get_stock_valuation_ratios("2330")["data"]
+        assert row["pe_ratio"] == pytest.approx(valuation["pe_ratio"])
+        assert row["dividend_yield"] == pytest.approx(valuation["dividend_yield"] / 100, abs=1e-4)
+        assert row["eps_growth"] is not None
+
+
+class TestScreenStocksTool:
+    """測試 screen_stocks 工具"""
+
+    def test_screen_top_by_dividend_yield(self, index_path):
+        """測試：依條件篩選並依殖利率排序"""
+        result = invoke(
+            screen_stocks,
+            {"filters": "pe < 15, roe > 12%, revenue_growth > 10%", "sort_by": "dividend_yield"},
+        )
+
+        assert result["matched"] == 1
+        assert [r["ticker"] for r in result["results"]] == ["2454"]
+        assert result["universe"] == 3
+        assert result["elapsed_ms"] >= 0
+
+    def test_without_filters_returns_ranking(self, index_path):
+        """測試：未指定條件時回傳排序後的前 N 名"""
+        result = invoke(screen_stocks, {"sort_by": "roe", "limit": 2})
+
+        assert [r["ticker"] for r in result["results"]] == ["2330", "2454"]
+
+    def test_invalid_filter_reports_error(self, index_path):
+        """測試：條件錯誤時回傳錯誤而非拋出例外"""
+        result = invoke(screen_stocks, {"filters": "market_mood > 1"})
+
+        assert "error" in result
+        assert result["results"] == []
+
+    def test_reloads_rebuilt_index(self, index_path):
+        """測試：索引檔重建後讀取新內容"""
+        screening.get_screening_index()
+        ScreeningIndex(["1101"], {"roe": [0.5]}).save(index_path)
+        os.utime(index_path, (0, 1))
+
+        result = screen(screening.get_screening_index(), sort_by="roe")
+
+        assert [r["ticker"] for r in result["results"]] == ["1101"]
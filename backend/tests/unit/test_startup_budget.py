@@ -0,0 +1,97 @@
+"""
+測試 API 啟動時間
+
+測試場景:
+1. 導入 api.server（uvicorn 的進入點，含 create_app）不載入重量級套件
+2. 啟動耗時在預算內（STARTUP_BUDGET_SECONDS 可覆寫）
+3. 延遲導入的公開名稱仍可正常取得
+
+啟動耗時與載入的套件可用 benchmarks/import_report.py 查看。
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# 共用 CI 機器較慢，保留數倍餘裕（延遲導入前約 4.6 秒，之後約 0.7 秒）
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "2.5"))
+
+# 第一次執行 Agent / 繪製結構圖 / 連線 MCP 時才載入
+HEAVY_PACKAGES = ("agents", "litellm", "openai", "mcp", "graphviz", "pandas", "yfinance")
+
+STARTUP_SNIPPET = """
+import sys, time
+started = time.perf_counter()
+import api.server
+print("__elapsed__", time.perf_counter() - started)
+print("__loaded__", ",".join(sorted(n for n in sys.modules if "." not in n)))
+"""
+
+
+def measure_startup() -> tuple[float, set[str]]:
+    """在全新的子行程中導入 api.server，回傳 (耗時秒數, 已載入的頂層套件)"""
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SNIPPET],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONPATH": str(BACKEND_DIR / "src")},
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    # stdout 也包含 create_app 的日誌
+    values = dict(
+        line.split(" ", 1) for line in result.stdout.splitlines() if line.startswith("__")
+    )
+    return float(values["__elapsed__"]), set(values["__loaded__"].split(","))
+
+
+@pytest.fixture(scope="module")
+def startup():
+    # 取兩次中較快的一次，降低機器負載造成的誤差
+    return min(measure_startup() for _ in range(2))
+
+
+class TestStartupBudget:
+    """測試啟動時間預算"""
+
+    def test_heavy_packages_not_loaded(self, startup):
+        """測試：啟動時不載入 Agents SDK、LiteLLM、graphviz 等套件"""
+        _, loaded = startup
+
+        assert [name for name in HEAVY_PACKAGES if name in loaded] == []
+
+    def test_startup_within_budget(self, startup):
+        """測試：導入 api.server 的耗時在預算內"""
+        elapsed, _ = startup
+
+        assert elapsed < STARTUP_BUDGET_SECONDS, (
+            f"Startup took {elapsed:.2f}s (budget {STARTUP_BUDGET_SECONDS}s); "
+            "run benchmarks/import_report.py to find the slow imports"
+        )
+
+
+class TestLazyExports:
+    """測試延遲導入的公開名稱"""
+
+    def test_package_exports_resolve(self):
+        """測試：套件層級的延遲名稱第一次存取時導入"""
+        import common
+        import trading
+        import trading.tools
+        from service import trading_service
+        from trading.trading_agent import TradingAgent
+
+        assert trading.TradingAgent is TradingAgent
+        assert trading_service.TradingAgent is TradingAgent
+        assert trading_service._trading_agent_class() is TradingAgent
+        assert callable(common.save_agent_graph)
+        assert callable(trading.tools.create_trading_tools)
+        assert callable(trading.tools.get_risk_agent)
+        with pytest.raises(AttributeError):
+            trading.tools.no_such_tool  # noqa: B018
@@ -0,0 +1,364 @@
+"""
+測試投資組合壓力測試引擎
+
+測試場景:
+1. 蒙地卡羅模擬：固定種子可重現、損失分布與尾端分位數、最差路徑
+2. 時間預算：每個批次（含第一個）前檢查，超過預算時以已完成的路徑回答；路徑數與天數有上限
+3. 歷史危機重播：本機價格檔、缺少股票以平均表現代替
+4. 近期收盤價：依日期對齊、不使用交易日之後的價格、大盤代理
+5. perform_stress_test 整合（非同步工具，價格由本機價格檔載入，模擬在執行緒中進行不阻塞事件迴圈）
+"""
+
+import asyncio
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from agents.tool_context import ToolContext
+
+from trading import stress_test
+from trading.risk_engine import RiskEngine, RiskEngineError
+from trading.tools.risk_agent import perform_stress_test
+
+from .tool_helpers import invoke
+
+DAY = date(2024, 5, 2)
+
+
+def random_walk(seed: int, days: int = 120, start: float = 100.0, vol: float = 0.02):
+    rng = np.random.default_rng(seed)
+    return list(start * np.cumprod(1 + rng.normal(0, vol, days)))
+
+
+def daily_bars(start: date, closes: list[float]) -> list[dict]:
+    return [
+        {"date": (start + timedelta(days=i)).isoformat(), "close": close}
+        for i, close in enumerate(closes)
+    ]
+
+
+@pytest.fixture
+def estimate():
+    return RiskEngine().estimate({"2330": random_walk(1), "2317": random_walk(2)}, DAY)
+
+
+@pytest.fixture
+def crisis_file(tmp_path, monkeypatch):
+    """本機價格檔：2330 在 2020 危機期間跌 30% 後回升至 -20%，2317 跌 10%"""
+    start = date(2020, 1, 20)
+    data = {
+        "2330": {"bars": daily_bars(start, [100, 90, 70, 80])},
+        "2317": {"bars": daily_bars(start, [50, 48, 46, 45])},
+    }
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setenv("CASUAL_MARKET_DATA", str(path))
+    return path
+
+
+@pytest.fixture
+def history_file(tmp_path, monkeypatch):
+    """本機價格檔：2330、2317 在 2020 危機前有 120 日歷史，危機期間同 crisis_file"""
+    start = date(2020, 1, 20)
+    history_start = start - timedelta(days=120)
+    data = {
+        "2330": {
+            "bars": daily_bars(history_start, random_walk(1)) + daily_bars(start, [100, 90, 70, 80])
+        },
+        "2317": {
+            "bars": daily_bars(history_start, random_walk(2)) + daily_bars(start, [50, 48, 46, 45])
+        },
+    }
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setenv("CASUAL_MARKET_DATA", str(path))
+    return path
+
+
+class TestMonteCarlo:
+    """測試蒙地卡羅模擬"""
+
+    def test_seeded_runs_are_reproducible(self, estimate):
+        """測試：相同種子得到相同的損失分布"""
+        values = {"2330": 600_000.0, "2317": 400_000.0}
+
+        first = stress_test.monte_carlo(estimate, values, paths=5000, seed=7, time_budget=30)
+        second = stress_test.monte_carlo(estimate, values, paths=5000, seed=7, time_budget=30)
+        other = stress_test.monte_carlo(estimate, values, paths=5000, seed=8, time_budget=30)
+
+        assert first.to_dict() | {"elapsed_ms": 0} == second.to_dict() | {"elapsed_ms": 0}
+        assert other.tail_losses != first.tail_losses
+
+    def test_loss_distribution_and_tails(self, estimate):
+        """測試：尾端分位數遞增、CVaR 不低於 VaR、直方圖涵蓋所有路徑"""
+        result = stress_test.monte_carlo(
+            estimate, {"2330": 1_000_000.0}, paths=5000, horizon_days=10, time_budget=30
+        )
+
+        tails = list(result.tail_losses.values())
+        assert list(result.tail_losses) == ["p90", "p95", "p99", "p99_9"]
+        assert tails == sorted(tails)
+        assert all(result.expected_shortfall[k] >= v for k, v in result.tail_losses.items())
+        assert sum(result.histogram["counts"]) == 5000
+        assert 0 < result.probability_of_loss < 1
+        assert not result.truncated
+
+    def test_worst_paths_are_the_largest_losses(self, estimate):
+        """測試：最差路徑依損失遞減排序，價值路徑長度為天數 + 1"""
+        result = stress_test.monte_carlo(
+            estimate, {"2330": 500_000.0, "2317": 500_000.0}, paths=6000, time_budget=30, worst=3
+        )
+
+        losses = [p["loss"] for p in result.worst_paths]
+        assert losses == sorted(losses, reverse=True)
+        assert losses[0] >= result.tail_losses["p99_9"]
+        assert all(len(p["values"]) == 21 for p in result.worst_paths)
+        assert result.worst_paths[0]["values"][0] == 1_000_000.0
+
+    def test_simulated_volatility_matches_covariance(self, estimate):
+        """測試：單日模擬損失的標準差接近 √(vᵀΣv)"""
+        values = {"2330": 600_000.0, "2317": 400_000.0}
+        result = stress_test.monte_carlo(
+            estimate, values, paths=20_000, horizon_days=1, time_budget=30, bins=200
+        )
+
+        v = np.array([400_000.0, 600_000.0])
+        sigma = np.sqrt(v @ estimate.covariance @ v)
+        z95 = 1.6449
+        assert result.tail_losses["p95"] == pytest.approx(z95 * sigma - v @ estimate.mean, rel=0.05)
+
+    def test_time_budget_truncates(self, estimate):
+        """測試：超過時間預算時回傳已完成的路徑，耗時不超過預算太多"""
+        result = stress_test.monte_carlo(
+            estimate, {"2330": 1_000_000.0}, paths=200_000, horizon_days=250, time_budget=0.2
+        )
+
+        assert result.truncated
+        assert 0 < result.completed_paths < 200_000
+        assert result.requested_paths == 200_000
+        # 批次大小依實測速度調整，只超出少量；完整 200,000 條路徑需數秒。
+        # 誤差保留給整套測試執行時 CPU 被其他工作佔用的情況
+        assert result.elapsed_ms < 200 + 500
+
+    def test_zero_budget_rejected(self, estimate):
+        """測試：第一個批次前也檢查預算，預算用盡時不模擬"""
+        with pytest.raises(RiskEngineError):
+            stress_test.monte_carlo(estimate, {"2330": 1_000_000.0}, time_budget=0)
+
+    def test_horizon_and_paths_capped(self, estimate):
+        """測試：天數與路徑數超過上限時截斷"""
+        result = stress_test.monte_carlo(
+            estimate,
+            {"2330": 1_000_000.0},
+            paths=10**9,
+            horizon_days=100_000,
+            time_budget=0.2,
+        )
+
+        assert result.horizon_days == stress_test.MAX_HORIZON_DAYS
+        assert result.requested_paths == stress_test.MAX_PATHS
+        assert len(result.worst_paths[0]["values"]) == stress_test.MAX_HORIZON_DAYS + 1
+        assert result.elapsed_ms < 200 + 150
+
+    def test_perfectly_correlated_positions(self):
+        """測試：共變異數矩陣非正定（完全相關）時仍可模擬"""
+        prices = random_walk(3)
+        estimate = RiskEngine().estimate({"A": prices, "B": [p * 2 for p in prices]}, DAY)
+
+        result = stress_test.monte_carlo(estimate, {"A": 1.0, "B": 1.0}, paths=1000)
+
+        assert result.completed_paths == 1000
+
+    def test_missing_ticker_rejected(self, estimate):
+        """測試：部位沒有價格歷史時拋出 RiskEngineError"""
+        with pytest.raises(RiskEngineError):
+            stress_test.monte_carlo(estimate, {"2454": 1.0})
+
+
+class TestCrisisReplay:
+    """測試歷史危機重播"""
+
+    def test_replays_local_price_data(self, crisis_file):
+        """測試：以本機價格重播期間損益、最大虧損與谷底日期"""
+        prices = stress_test.load_price_history()
+
+        result = stress_test.crisis_replay({"2330": 100_000.0, "2317": 50_000.0}, prices, "2020")
+
+        assert result["scenario"] == "2020 新冠疫情崩跌"
+        assert result["portfolio_loss"] == pytest.approx(-20_000 - 5_000)
+        assert result["max_loss"] == pytest.approx(-30_000 - 4_000)
+        assert result["trough_date"] == "2020-01-22"
+        assert result["proxied_tickers"] == []
+
+    def test_missing_ticker_uses_average(self, crisis_file):
+        """測試：價格檔沒有的持股以其他股票的平均表現代替"""
+        prices = stress_test.load_price_history()
+
+        result = stress_test.crisis_replay({"2454": 100_000.0}, prices, "2020")
+
+        assert result["proxied_tickers"] == ["2454"]
+        assert result["portfolio_loss"] == pytest.approx(100_000 * ((0.8 + 0.9) / 2 - 1))
+
+    def test_window_without_data_rejected(self, crisis_file):
+        """測試：期間內沒有價格資料時拋出 RiskEngineError"""
+        with pytest.raises(RiskEngineError):
+            stress_test.crisis_replay({"2330": 1.0}, stress_test.load_price_history(), "2008")
+
+    def test_unknown_window_rejected(self):
+        """測試：不支援的危機期間"""
+        with pytest.raises(RiskEngineError):
+            stress_test.crisis_replay({"2330": 1.0}, {}, "1929")
+
+    def test_missing_data_file_rejected(self, monkeypatch):
+        """測試：未設定本機價格檔"""
+        monkeypatch.delenv("CASUAL_MARKET_DATA", raising=False)
+
+        with pytest.raises(RiskEngineError):
+            stress_test.load_price_history()
+
+
+class TestRecentCloses:
+    """測試近期收盤價"""
+
+    @pytest.fixture
+    def closes_file(self, tmp_path, monkeypatch):
+        """2330 有 5 日價格，2317 晚 2 日開始且缺第 4 日"""
+        start = date(2024, 5, 1)
+        data = {
+            "2330": {"bars": daily_bars(start, [10, 11, 12, 13, 14])},
+            "2317": {
+                "bars": [
+                    bar
+                    for bar in daily_bars(start, [0, 0, 20, 22, 24])[2:]
+                    if bar["date"] != "2024-05-04"
+                ]
+            },
+        }
+        path = tmp_path / "prices.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        monkeypatch.setenv("CASUAL_MARKET_DATA", str(path))
+        return path
+
+    def test_aligned_to_common_dates(self, closes_file):
+        """測試：從所有股票都有價格的日期開始，缺漏日沿用前一日，沒有資料的股票略過"""
+        closes = stress_test.recent_closes(["2330", "2317", "2454"])
+
+        assert closes == {"2330": [12.0, 13.0, 14.0], "2317": [20.0, 20.0, 24.0]}
+
+    def test_as_of_and_lookback(self, closes_file):
+        """測試：不使用 as_of 之後的價格，最多回傳 lookback 筆"""
+        assert stress_test.recent_closes(["2330"], as_of=date(2024, 5, 3)) == {
+            "2330": [10.0, 11.0, 12.0]
+        }
+        assert stress_test.recent_closes(["2330"], lookback=2) == {"2330": [13.0, 14.0]}
+        assert stress_test.recent_closes(["2330"], as_of=date(2024, 4, 1)) == {}
+
+    def test_market_proxy(self, closes_file):
+        """測試：大盤代理為區間開始前已有價格的股票之等權平均（以區間第一日為 1）"""
+        closes = stress_test.recent_closes(["2330"], lookback=3, market=True)
+
+        proxy = closes[stress_test.MARKET_PROXY]
+        assert proxy == pytest.approx([1.0, (13 / 12 + 1.0) / 2, (14 / 12 + 24 / 20) / 2])
+
+
+class TestPerformStressTestTool:
+    """測試 perform_stress_test 整合"""
+
+    def test_monte_carlo_and_crisis_scenarios(self, history_file):
+        """測試：同時回傳固定情景、歷史危機重播與以本機價格執行的蒙地卡羅結果"""
+        result = invoke(
+            perform_stress_test,
+            {
+                "positions": [
+                    {"ticker": "2330", "value": 100_000},
+                    {"ticker": "2317", "value": 50_000},
+                ],
+                "scenarios": [{"name": "市場下跌10%", "price_change": -0.1}, "2020"],
+                "simulation": {"paths": 2000, "horizon_days": 5, "seed": 1},
+            },
+        )
+
+        scenarios = {s["scenario"]: s for s in result["stress_scenarios"]}
+        assert scenarios["市場下跌10%"]["portfolio_loss"] == pytest.approx(-15_000)
+        assert scenarios["2020 新冠疫情崩跌"]["portfolio_loss"] == pytest.approx(-25_000)
+        assert result["monte_carlo"]["completed_paths"] == 2000
+        assert result["monte_carlo"]["horizon_days"] == 5
+
+    def test_trading_day_excludes_later_prices(self, history_file):
+        """測試：trading_day 之前沒有足夠價格時不執行蒙地卡羅模擬"""
+        result = invoke(
+            perform_stress_test,
+            {
+                "positions": [{"ticker": "2330", "value": 100_000}],
+                "scenarios": [{"name": "市場下跌10%", "price_change": -0.1}],
+                "trading_day": "2019-09-25",
+            },
+        )
+
+        assert "error" in result["monte_carlo"]
+        assert "price_history" not in perform_stress_test.params_json_schema["properties"]
+
+    def test_time_budget_is_capped(self, history_file, monkeypatch):
+        """測試：Agent 指定的時間預算不超過 STRESS_TEST_TIME_BUDGET"""
+        from trading.tools import risk_agent
+
+        monkeypatch.setattr(risk_agent, "STRESS_TEST_TIME_BUDGET", 0.05)
+
+        result = invoke(
+            perform_stress_test,
+            {
+                "positions": [{"ticker": "2330", "value": 100_000}],
+                "simulation": {"paths": 100_000, "time_budget_seconds": 60},
+            },
+        )
+
+        assert result["monte_carlo"]["truncated"] is True
+        assert result["monte_carlo"]["elapsed_ms"] < 50 + 150
+
+    def test_simulation_does_not_block_event_loop(self, history_file, monkeypatch):
+        """測試：模擬期間事件迴圈仍可執行其他工作"""
+        from trading.tools import risk_agent
+
+        monkeypatch.setattr(risk_agent, "STRESS_TEST_TIME_BUDGET", 0.3)
+        payload = json.dumps(
+            {
+                "positions": [{"ticker": "2330", "value": 100_000}],
+                "simulation": {"paths": 200_000, "horizon_days": 250},
+            }
+        )
+        context = ToolContext(
+            context=None,
+            tool_name=perform_stress_test.name,
+            tool_call_id="call-1",
+            tool_arguments=payload,
+        )
+
+        async def scenario():
+            ticks = 0
+            task = asyncio.create_task(perform_stress_test.on_invoke_tool(context, payload))
+            while not task.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return ticks, task.result()
+
+        ticks, result = asyncio.run(scenario())
+
+        assert result["monte_carlo"]["truncated"] is True
+        assert ticks >= 10
+
+    def test_crisis_without_local_data_reports_error(self, monkeypatch):
+        """測試：沒有本機價格資料時情景回傳錯誤而非中斷壓力測試"""
+        monkeypatch.delenv("CASUAL_MARKET_DATA", raising=False)
+
+        result = invoke(
+            perform_stress_test,
+            {
+                "positions": [{"ticker": "2330", "value": 100_000}],
+                "scenarios": [{"historical_window": "2008"}],
+            },
+        )
+
+        assert result["scenario_count"] == 1
+        assert "error" in result["stress_scenarios"][0]
+        assert "monte_carlo" not in result
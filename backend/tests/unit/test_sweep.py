@@ -0,0 +1,231 @@
+"""
+測試 Agent 配置參數掃描
+
+測試場景:
+1. 參數網格展開與驗證
+2. 最大持倉比例與再平衡頻率限制
+3. 手續費假設影響績效
+4. 排名與平行執行結果一致
+"""
+
+import functools
+import math
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from trading.backtest import (
+    BacktestEngine,
+    BacktestError,
+    Decision,
+    PriceHistory,
+    moving_average_crossover,
+)
+from trading.config import AgentConfig
+from trading.sweep import (
+    SweepCase,
+    SweepResult,
+    apply_case_limits,
+    build_grid,
+    rank_results,
+    run_sweep,
+)
+from trading.tools.trading_tools import COMMISSION_RATE
+
+START = date(2024, 1, 1)
+BASE = AgentConfig(name="sweep", description="sweep", initial_funds=1_000_000)
+
+
+def series(closes: list[float], start: date = START) -> dict[date, float]:
+    """建立連續交易日的收盤價"""
+    return {start + timedelta(days=i): price for i, price in enumerate(closes)}
+
+
+def wave(days: int = 60) -> dict[date, float]:
+    """會產生多次均線交叉的價格"""
+    return series([100 + 10 * math.sin(i / 4) for i in range(days)])
+
+
+def buy_every_day(day, _ledger):
+    """每日嘗試買進 10 張"""
+    return [Decision("2330", "BUY", 10_000)]
+
+
+def buy_every_day_factory():
+    return buy_every_day
+
+
+class TestBuildGrid:
+    """測試參數網格"""
+
+    def test_expands_cartesian_product(self):
+        """測試：三個維度展開為所有組合，其餘配置沿用基準"""
+        cases = build_grid(
+            BASE,
+            max_position_sizes=[20, 50],
+            commission_rates=[0.001, COMMISSION_RATE],
+            rebalance_days=[1, 5, 10],
+        )
+
+        assert len(cases) == 12
+        assert {c.params["max_position_size"] for c in cases} == {20, 50}
+        assert all(c.config.name == "sweep" for c in cases)
+        assert BASE.max_position_size == 50
+
+    def test_defaults_follow_base_config(self):
+        """測試：未指定的維度沿用基準配置與實盤手續費"""
+        (case,) = build_grid(BASE)
+
+        assert case.params == {
+            "max_position_size": BASE.max_position_size,
+            "commission_rate": COMMISSION_RATE,
+            "rebalance_days": 1,
+        }
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"max_position_sizes": [0]}, {"rebalance_days": [0]}, {"max_position_sizes": [150]}],
+    )
+    def test_rejects_invalid_values(self, kwargs):
+        """測試：無效參數直接報錯"""
+        with pytest.raises(BacktestError):
+            build_grid(BASE, **kwargs)
+
+
+class TestCaseLimits:
+    """測試配置限制"""
+
+    def test_position_size_caps_buys(self):
+        """測試：單一股票市值不超過總資產的 max_position_size%"""
+        engine = BacktestEngine({"2330": series([100] * 5)})
+        (case,) = build_grid(BASE, max_position_sizes=[30])
+
+        result = engine.run({"a": apply_case_limits(buy_every_day, case)})["a"]
+
+        position = result.ledger.holdings["2330"]
+        assert position.quantity * 100 <= 0.3 * 1_000_000
+        assert position.quantity == 3000
+
+    def test_rebalance_days_skips_decisions(self):
+        """測試：僅在再平衡日呼叫決策函式"""
+        calls = []
+
+        def record(day, _ledger):
+            calls.append(day.index)
+            return []
+
+        engine = BacktestEngine({"2330": series([100] * 10)})
+        (case,) = build_grid(BASE, rebalance_days=[3])
+
+        engine.run({"a": apply_case_limits(record, case)})
+
+        assert calls == [0, 3, 6, 9]
+
+    def test_commission_rate_applies_to_ledger(self):
+        """測試：手續費假設反映在資金與成交記錄"""
+        engine = BacktestEngine({"2330": series([100, 100])})
+        plan = {0: [Decision("2330", "BUY", 1000)]}
+
+        def decide(day, _ledger):
+            return plan.get(day.index, [])
+
+        ledger = engine.run({"a": decide}, commission_rate=0.01)["a"].ledger
+
+        assert ledger.trades[0].commission == Decimal("1000.0")
+        assert ledger.cash == pytest.approx(1_000_000 - 100_000 - 1000)
+
+
+class TestRanking:
+    """測試排名"""
+
+    def _result(self, sharpe, total_return):
+        return SweepResult(
+            case=SweepCase(config=BASE),
+            summary={"sharpe_ratio": sharpe, "total_return": Decimal(str(total_return))},
+        )
+
+    def test_orders_by_metric_with_missing_last(self):
+        """測試：指標越大越前面，無法計算者排最後"""
+        results = [
+            self._result(None, 0.5),
+            self._result(Decimal("1"), 0.1),
+            self._result(Decimal("2"), 0),
+        ]
+
+        ranked = rank_results(results)
+
+        assert [r.summary["sharpe_ratio"] for r in ranked] == [Decimal("2"), Decimal("1"), None]
+        assert [r.rank for r in ranked] == [1, 2, 3]
+
+    def test_rejects_unknown_metric(self):
+        """測試：不支援的排名指標"""
+        with pytest.raises(BacktestError):
+            rank_results([], rank_by="profit")
+
+
+class TestRunSweep:
+    """測試參數掃描執行"""
+
+    def test_matches_direct_backtest(self):
+        """測試：掃描結果與直接回測相同（價格經記憶體映射陣列傳遞）"""
+        prices = {"2330": wave(), "2317": {d: p * 0.5 for d, p in wave(40).items()}}
+        factory = functools.partial(moving_average_crossover, ["2330", "2317"], 2, 5)
+        cases = build_grid(BASE, max_position_sizes=[20, 100])
+
+        rows = run_sweep(prices, cases, factory, rank_by="total_return", max_workers=1)
+
+        for case in cases:
+            expected = BacktestEngine(prices).run({"a": apply_case_limits(factory(), case)})["a"]
+            row = next(r for r in rows if r["max_position_size"] == case.config.max_position_size)
+            assert row["total_return"] == expected.summary()["total_return"]
+            assert row["total_trades"] == expected.summary()["total_trades"]
+
+    def test_process_pool_matches_serial(self):
+        """測試：多程序與單程序結果一致"""
+        factory = functools.partial(moving_average_crossover, ["2330"], 2, 5)
+        cases = build_grid(
+            BASE,
+            max_position_sizes=[10, 50],
+            commission_rates=[0.001, 0.003],
+            rebalance_days=[1, 2],
+        )
+
+        serial = run_sweep({"2330": wave()}, cases, factory, max_workers=1)
+        parallel = run_sweep({"2330": wave()}, cases, factory, max_workers=2)
+
+        assert serial == parallel
+        assert [r["rank"] for r in parallel] == list(range(1, 9))
+
+    def test_higher_commission_lowers_return(self):
+        """測試：其他參數相同時，手續費越高報酬越低"""
+        cases = build_grid(BASE, commission_rates=[0.001, 0.01])
+
+        rows = run_sweep(
+            {"2330": series([100, 101, 102])},
+            cases,
+            buy_every_day_factory,
+            rank_by="total_return",
+            max_workers=1,
+        )
+
+        assert [r["commission_rate"] for r in rows] == [0.001, 0.01]
+        assert rows[0]["total_return"] > rows[1]["total_return"]
+
+    def test_price_history_round_trips_through_matrix(self):
+        """測試：缺價日在矩陣中以 NaN 表示，還原後為 None"""
+        history = PriceHistory({"2330": series([100, 101]), "2317": {START: 50.0}})
+
+        restored = PriceHistory.from_matrix(
+            list(history.closes),
+            history.dates,
+            [[math.nan if v is None else v for v in history.closes[t]] for t in history.closes],
+        )
+
+        assert restored.closes == history.closes
+        assert restored.dates == history.dates
+
+    def test_empty_grid_rejected(self):
+        """測試：空網格直接報錯"""
+        with pytest.raises(BacktestError):
+            run_sweep({"2330": wave()}, [], buy_every_day_factory)
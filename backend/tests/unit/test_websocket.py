@@ -10,9 +10,17 @@ from datetime import datetime
 from unittest.mock import AsyncMock
 
 import pytest
-from fastapi import WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.testclient import TestClient
 
-from api.websocket import WebSocketManager, websocket_manager
+from api.routers import websocket_router
+from api.websocket import (
+    TOPIC_ALL,
+    WebSocketManager,
+    agent_topic,
+    session_topic,
+    websocket_manager,
+)
 
 
 class TestWebSocketManagerInitialization:
@@ -533,5 +541,526 @@ class TestWebSocketJSONSerialization:
         assert parsed["type"] == "test"
 
 
+class TestWebSocketSlowConsumers:
+    """測試每連線送出佇列與慢速客戶端處理"""
+
+    @staticmethod
+    def _blocking_socket(release: asyncio.Event) -> AsyncMock:
+        """建立送出會阻塞直到 release 的模擬 WebSocket"""
+        ws = AsyncMock(spec=WebSocket)
+
+        async def slow_send(_text):
+            await release.wait()
+
+        ws.send_text.side_effect = slow_send
+        return ws
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self):
+        """測試：慢速客戶端不影響其他客戶端送達"""
+        manager = WebSocketManager(max_queue_size=10)
+        release = asyncio.Event()
+        slow_ws = self._blocking_socket(release)
+        fast_ws = AsyncMock(spec=WebSocket)
+        await manager.connect(slow_ws)
+        await manager.connect(fast_ws)
+
+        for i in range(3):
+            await asyncio.wait_for(manager.broadcast({"type": "test", "seq": i}), timeout=1)
+
+        assert fast_ws.send_text.call_count == 3
+        assert manager.get_metrics()["queue_depth_max"] == 2
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert slow_ws.send_text.call_count == 3
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_overflow_disconnects_slow_consumer(self):
+        """測試：佇列溢出時斷開慢速客戶端"""
+        manager = WebSocketManager(max_queue_size=2)
+        slow_ws = self._blocking_socket(asyncio.Event())
+        fast_ws = AsyncMock(spec=WebSocket)
+        await manager.connect(slow_ws)
+        await manager.connect(fast_ws)
+
+        for i in range(5):
+            await manager.broadcast({"type": "test", "seq": i})
+
+        assert slow_ws not in manager.active_connections
+        assert fast_ws in manager.active_connections
+        slow_ws.close.assert_called_once_with(code=1013)
+        assert manager.get_metrics()["slow_consumer_disconnects"] == 1
+        assert fast_ws.send_text.call_count == 5
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_overflow_drop_policy_notifies_client(self):
+        """測試：drop 策略丟棄溢出訊息並在恢復後通知客戶端"""
+        manager = WebSocketManager(max_queue_size=1, slow_consumer_policy="drop")
+        release = asyncio.Event()
+        slow_ws = self._blocking_socket(release)
+        await manager.connect(slow_ws)
+
+        for i in range(4):
+            await manager.broadcast({"type": "test", "seq": i})
+
+        # 第 1 筆送出中、第 2 筆在佇列、其餘 2 筆被丟棄
+        assert slow_ws in manager.active_connections
+        assert manager.get_metrics()["messages_dropped"] == 2
+
+        release.set()
+        await asyncio.sleep(0.01)
+        sent = [json.loads(call.args[0]) for call in slow_ws.send_text.call_args_list]
+        assert [m["type"] for m in sent] == ["test", "messages_dropped", "test"]
+        assert sent[1]["count"] == 2
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_disconnects(self):
+        """測試：送出逾時的客戶端被斷線"""
+        manager = WebSocketManager(send_timeout=0.01)
+        slow_ws = self._blocking_socket(asyncio.Event())
+        await manager.connect(slow_ws)
+
+        await manager.broadcast({"type": "test"})
+        await asyncio.sleep(0.05)
+
+        assert slow_ws not in manager.active_connections
+        slow_ws.close.assert_called_once_with(code=1013)
+
+    @pytest.mark.asyncio
+    async def test_metrics_record_latency(self):
+        """測試：統計送出數量與延遲"""
+        manager = WebSocketManager()
+        mock_ws = AsyncMock(spec=WebSocket)
+        await manager.connect(mock_ws)
+
+        await manager.broadcast({"type": "test"})
+        metrics = manager.get_metrics()
+
+        assert metrics["connections"] == 1
+        assert metrics["messages_broadcast"] == 1
+        assert metrics["messages_sent"] == 1
+        assert metrics["send_latency_ms"]["max"] >= 0
+        assert metrics["queue_depth_total"] == 0
+        await manager.shutdown()
+
+
+class TestWebSocketTopics:
+    """測試 Agent 主題訂閱"""
+
+    @staticmethod
+    async def _connect_subscribed(manager: WebSocketManager, *agent_ids: str) -> AsyncMock:
+        """建立只訂閱指定 Agent 的連線"""
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+        await manager.unsubscribe(ws, [TOPIC_ALL])
+        await manager.subscribe(ws, [agent_topic(agent_id) for agent_id in agent_ids])
+        return ws
+
+    @pytest.mark.asyncio
+    async def test_agent_events_only_reach_subscribers(self):
+        """測試：Agent 細節事件只送給訂閱該 Agent 的連線"""
+        manager = WebSocketManager()
+        ws_a = await self._connect_subscribed(manager, "agent-a")
+        ws_b = await self._connect_subscribed(manager, "agent-b")
+
+        await manager.broadcast_trade_execution("agent-a", {"ticker": "2330"})
+        await manager.broadcast_portfolio_update("agent-a", {"cash": 1})
+        await manager.broadcast_performance_update("agent-a", {"roi": 0.1})
+
+        assert ws_a.send_text.call_count == 3
+        ws_b.send_text.assert_not_called()
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_new_connection_receives_everything(self):
+        """測試：未調整訂閱的連線預設訂閱萬用主題"""
+        manager = WebSocketManager()
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+
+        await manager.broadcast_trade_execution("agent-x", {"ticker": "2330"})
+
+        ws.send_text.assert_called_once()
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_global_events_ignore_subscriptions(self):
+        """測試：狀態等全域事件仍送給所有連線"""
+        manager = WebSocketManager()
+        ws = await self._connect_subscribed(manager, "agent-a")
+
+        await manager.broadcast_execution_started("agent-b", "session-1", "TRADING")
+
+        ws.send_text.assert_called_once()
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_serialized_once_per_publish(self, monkeypatch):
+        """測試：每次發佈只序列化一次"""
+        manager = WebSocketManager()
+        for _ in range(3):
+            await self._connect_subscribed(manager, "agent-a")
+
+        calls = []
+        real_dumps = json.dumps
+
+        def counting_dumps(*args, **kwargs):
+            calls.append(args)
+            return real_dumps(*args, **kwargs)
+
+        monkeypatch.setattr("api.websocket.json.dumps", counting_dumps)
+        await manager.broadcast_trade_execution("agent-a", {"ticker": "2330"})
+        await manager.broadcast_trade_execution("agent-z", {"ticker": "2330"})
+
+        # 無訂閱者的主題不序列化
+        assert len(calls) == 1
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cleans_topic_index(self):
+        """測試：斷線後從主題索引移除"""
+        manager = WebSocketManager()
+        ws = await self._connect_subscribed(manager, "agent-a")
+        assert manager.get_subscriber_count(agent_topic("agent-a")) == 1
+
+        await manager.disconnect(ws)
+
+        assert manager.get_subscriber_count(agent_topic("agent-a")) == 0
+        assert manager.get_metrics()["topics"] == {}
+
+    @pytest.mark.asyncio
+    async def test_purge_progress_goes_to_agent_topic(self):
+        """測試：清除進度只送給訂閱該 Agent 的連線"""
+        manager = WebSocketManager()
+        ws_a = await self._connect_subscribed(manager, "agent-a")
+        ws_b = await self._connect_subscribed(manager, "agent-b")
+
+        await manager.broadcast_agent_purge_progress("agent-a", {"total_deleted": 10})
+
+        message = json.loads(ws_a.send_text.call_args[0][0])
+        assert message["type"] == "agent_purge_progress"
+        assert message["data"] == {"total_deleted": 10}
+        ws_b.send_text.assert_not_called()
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_execution_stream_goes_to_session_topic(self):
+        """測試：執行串流事件只送給訂閱該會話的連線"""
+        manager = WebSocketManager()
+        watcher = await self._connect_subscribed(manager)
+        await manager.subscribe(watcher, [session_topic("s-1")])
+        other = await self._connect_subscribed(manager, "agent-a")
+
+        events = [{"kind": "text", "agent": "main", "delta": "hi"}]
+        await manager.broadcast_execution_stream("agent-a", "s-1", events)
+
+        message = json.loads(watcher.send_text.call_args[0][0])
+        assert message["type"] == "execution_stream"
+        assert message["session_id"] == "s-1"
+        assert message["events"] == events
+        other.send_text.assert_not_called()
+        await manager.shutdown()
+
+
+class TestWebSocketCoalescing:
+    """測試投資組合/績效更新合併"""
+
+    @pytest.mark.asyncio
+    async def test_updates_within_window_send_latest_only(self):
+        """測試：合併視窗內只送出最新狀態"""
+        manager = WebSocketManager(coalesce_window_ms=20)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+
+        for value in range(5):
+            await manager.broadcast_portfolio_update("agent-a", {"total_value": value})
+            await manager.broadcast_performance_update("agent-a", {"roi": value})
+        ws.send_text.assert_not_called()
+
+        await asyncio.sleep(0.05)
+        sent = [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+        assert sorted(m["type"] for m in sent) == ["performance_update", "portfolio_update"]
+        assert all(m["data"] in ({"total_value": 4}, {"roi": 4}) for m in sent)
+
+        metrics = manager.get_metrics()
+        assert metrics["coalesce_received"] == 10
+        assert metrics["coalesce_sent"] == 2
+        assert metrics["coalesce_ratio"] == 5.0
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_agents_coalesced_separately(self):
+        """測試：不同 Agent 的更新各自合併"""
+        manager = WebSocketManager(coalesce_window_ms=10)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+
+        await manager.broadcast_portfolio_update("agent-a", {"v": 1})
+        await manager.broadcast_portfolio_update("agent-b", {"v": 2})
+        await asyncio.sleep(0.03)
+
+        agents = sorted(json.loads(c.args[0])["agent_id"] for c in ws.send_text.call_args_list)
+        assert agents == ["agent-a", "agent-b"]
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_flush_error_logged_not_raised(self, monkeypatch):
+        """測試：背景送出失敗時記錄錯誤，任務不留下未處理的例外，之後的更新照常合併"""
+        manager = WebSocketManager(coalesce_window_ms=10)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+        real_publish = manager.publish
+        monkeypatch.setattr(manager, "publish", AsyncMock(side_effect=RuntimeError("bus down")))
+
+        await manager.broadcast_portfolio_update("agent-a", {"v": 1})
+        task = manager._coalesce_tasks[("agent-a", "portfolio_update")]
+        await asyncio.sleep(0.03)
+
+        assert task.done() and task.exception() is None
+        assert manager.get_metrics()["coalesce_sent"] == 0
+        monkeypatch.setattr(manager, "publish", real_publish)
+        await manager.broadcast_portfolio_update("agent-a", {"v": 2})
+        await asyncio.sleep(0.03)
+        assert json.loads(ws.send_text.call_args[0][0])["data"] == {"v": 2}
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_trade_events_not_coalesced(self):
+        """測試：交易事件逐筆送出"""
+        manager = WebSocketManager(coalesce_window_ms=1000)
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+
+        for i in range(3):
+            await manager.broadcast_trade_execution("agent-a", {"seq": i})
+
+        assert ws.send_text.call_count == 3
+        await manager.shutdown()
+
+
+class TestWebSocketPortfolioDelta:
+    """測試協商編碼與投資組合差量"""
+
+    HOLDINGS = [
+        {"ticker": "2330", "quantity": 1000, "market_value": 600000},
+        {"ticker": "2317", "quantity": 2000, "market_value": 200000},
+    ]
+
+    @staticmethod
+    def _sent(ws) -> list[dict]:
+        return [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_json_clients_unchanged(self):
+        """測試：未協商的連線收到原本的完整訊息"""
+        manager = WebSocketManager()
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+
+        for value in (1, 2):
+            await manager.broadcast_portfolio_update("a1", {"total_value": value})
+
+        sent = self._sent(ws)
+        assert [m["type"] for m in sent] == ["portfolio_update", "portfolio_update"]
+        assert "seq" not in sent[1]
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_delta_after_snapshot(self):
+        """測試：差量模式先收到快照，之後只收到變更的持股"""
+        manager = WebSocketManager()
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+        welcome = await manager.negotiate(ws, encoding="json", delta=True)
+        assert welcome == {"type": "welcome", "encoding": "json", "delta": True}
+
+        holdings = [dict(h) for h in self.HOLDINGS]
+        await manager.broadcast_portfolio_update("a1", {"cash": 100, "holdings": holdings})
+        holdings[0] = {**holdings[0], "market_value": 610000}
+        await manager.broadcast_portfolio_update("a1", {"cash": 100, "holdings": holdings})
+
+        snapshot, delta = self._sent(ws)
+        assert snapshot["type"] == "portfolio_update"
+        assert snapshot["seq"] == 1
+        assert delta["type"] == "portfolio_delta"
+        assert (delta["base_seq"], delta["seq"]) == (1, 2)
+        assert delta["changes"]["set"] == {}
+        assert delta["changes"]["lists"]["holdings"]["upsert"] == [holdings[0]]
+        assert manager.get_metrics()["portfolio_deltas"] == 1
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_mixed_clients(self):
+        """測試：同一事件依連線設定送出完整訊息或差量"""
+        manager = WebSocketManager()
+        plain = AsyncMock(spec=WebSocket)
+        delta = AsyncMock(spec=WebSocket)
+        await manager.connect(plain)
+        await manager.connect(delta)
+        await manager.negotiate(delta, delta=True)
+
+        await manager.broadcast_portfolio_update("a1", {"cash": 100})
+        await manager.broadcast_portfolio_update("a1", {"cash": 90})
+
+        assert [m["type"] for m in self._sent(plain)] == ["portfolio_update"] * 2
+        assert [m["type"] for m in self._sent(delta)] == ["portfolio_update", "portfolio_delta"]
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_dropped_message_triggers_snapshot(self):
+        """測試：丟棄訊息後下一次改送完整快照"""
+        manager = WebSocketManager(max_queue_size=1, slow_consumer_policy="drop")
+        ws = AsyncMock(spec=WebSocket)
+        released = asyncio.Event()
+
+        async def slow_send(_text):
+            await released.wait()
+
+        ws.send_text.side_effect = slow_send
+        await manager.connect(ws)
+        await manager.negotiate(ws, delta=True)
+
+        # 第一筆送出中、第二筆在佇列中、第三筆被丟棄
+        for cash in (100, 90, 80):
+            await manager.broadcast_portfolio_update("a1", {"cash": cash})
+        released.set()
+        await asyncio.sleep(0.01)
+        await manager.broadcast_portfolio_update("a1", {"cash": 70})
+        await asyncio.sleep(0.01)
+
+        sent = self._sent(ws)
+        assert [m["type"] for m in sent] == [
+            "portfolio_update",
+            "messages_dropped",
+            "portfolio_delta",
+            "portfolio_update",
+        ]
+        assert sent[-1]["seq"] == 4
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_resync(self):
+        """測試：客戶端請求重新同步時收到目前快照"""
+        manager = WebSocketManager()
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+        await manager.negotiate(ws, delta=True)
+
+        await manager.resync(ws, "a1")
+        await asyncio.sleep(0)
+        assert self._sent(ws)[-1]["type"] == "resync_unavailable"
+
+        await manager.broadcast_portfolio_update("a1", {"cash": 100})
+        await manager.resync(ws, "a1")
+        await asyncio.sleep(0)
+        snapshot, resynced = self._sent(ws)[-2:]
+        assert resynced["type"] == "portfolio_update"
+        assert (resynced["seq"], resynced["data"]) == (snapshot["seq"], snapshot["data"])
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_msgpack_encoding(self):
+        """測試：協商 msgpack 後以二進位訊息送出"""
+        msgpack = pytest.importorskip("msgpack")
+        manager = WebSocketManager()
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+        assert (await manager.negotiate(ws, encoding="msgpack"))["encoding"] == "msgpack"
+
+        await manager.broadcast({"type": "agent_status", "agent_id": "a1"})
+
+        ws.send_text.assert_not_called()
+        message = msgpack.unpackb(ws.send_bytes.call_args[0][0])
+        assert message["type"] == "agent_status"
+        assert manager.get_metrics()["encodings"] == {"msgpack": 1}
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unknown_encoding_falls_back_to_json(self):
+        """測試：不支援的編碼維持 JSON"""
+        manager = WebSocketManager()
+        ws = AsyncMock(spec=WebSocket)
+        await manager.connect(ws)
+
+        welcome = await manager.negotiate(ws, encoding="cbor")
+
+        assert welcome["encoding"] == "json"
+        await manager.shutdown()
+
+
+class TestWebSocketSubscriptionProtocol:
+    """測試 /ws 端點的訂閱協定"""
+
+    def test_subscribe_and_unsubscribe(self):
+        """測試：subscribe / unsubscribe 指令回傳目前訂閱"""
+        app = FastAPI()
+        app.include_router(websocket_router.router)
+
+        with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"type": "unsubscribe", "topics": ["*"]}))
+            assert ws.receive_json()["topics"] == []
+
+            ws.send_text(json.dumps({"type": "subscribe", "topics": ["agent:a1"]}))
+            reply = ws.receive_json()
+            assert reply["type"] == "subscriptions"
+            assert reply["topics"] == ["agent:a1"]
+
+            ws.send_text("hello")
+            assert ws.receive_json()["type"] == "pong"
+
+    def test_hello_negotiates_delta(self):
+        """測試：hello 指令回傳實際採用的編碼設定"""
+        app = FastAPI()
+        app.include_router(websocket_router.router)
+
+        with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"type": "hello", "encoding": "json", "delta": True}))
+            reply = ws.receive_json()
+            assert reply["type"] == "welcome"
+            assert (reply["encoding"], reply["delta"]) == ("json", True)
+
+    def test_hello_rejects_non_boolean_delta(self):
+        """測試：delta 不是布林值（例如字串 "false"）時回傳錯誤且不啟用差量"""
+        app = FastAPI()
+        app.include_router(websocket_router.router)
+
+        with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+            ws.send_text(json.dumps({"type": "hello", "delta": "false"}))
+            reply = ws.receive_json()
+            assert reply["type"] == "error"
+            assert reply["data"] == {"delta": "false"}
+
+            ws.send_text(json.dumps({"type": "hello", "delta": False}))
+            reply = ws.receive_json()
+            assert (reply["type"], reply["delta"]) == ("welcome", False)
+
+
+class TestWebSocketMetricsEndpoint:
+    """測試 /api/ws/metrics 端點"""
+
+    def test_requires_admin_token(self, monkeypatch):
+        """測試：未設定 ADMIN_TOKEN 時 404，缺少或錯誤的 token 回傳 403，正確時回傳指標"""
+        from api.config import settings
+
+        app = FastAPI()
+        app.include_router(websocket_router.router)
+        client = TestClient(app)
+
+        monkeypatch.setattr(settings, "admin_token", None)
+        assert client.get("/api/ws/metrics", headers={"X-Admin-Token": "x"}).status_code == 404
+
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        assert client.get("/api/ws/metrics").status_code == 403
+        assert client.get("/api/ws/metrics", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+        response = client.get("/api/ws/metrics", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 200
+        assert "messages_dropped" in response.json()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+"""
+測試 WebSocket 訊息編碼與投資組合差量
+
+測試場景:
+1. 欄位變更、新增與移除
+2. 持股清單依股票代號只送出變更項目
+3. 差量套用後與最新投資組合一致
+4. msgpack 編碼
+"""
+
+import pytest
+
+from api.ws_payloads import (
+    ENCODING_JSON,
+    ENCODING_MSGPACK,
+    apply_portfolio_delta,
+    diff_portfolio,
+    encode_message,
+)
+
+PREVIOUS = {
+    "cash": 100000,
+    "total_value": 900000,
+    "holdings": [
+        {"ticker": "2330", "quantity": 1000, "market_value": 600000},
+        {"ticker": "2317", "quantity": 2000, "market_value": 200000},
+    ],
+}
+
+
+class TestDiffPortfolio:
+    """測試投資組合差量計算"""
+
+    def test_unchanged(self):
+        """測試：沒有變更時差量為空"""
+        assert diff_portfolio(PREVIOUS, PREVIOUS) == {"set": {}, "unset": [], "lists": {}}
+
+    def test_scalar_fields(self):
+        """測試：欄位變更、新增與移除"""
+        current = {k: v for k, v in PREVIOUS.items() if k != "cash"}
+        current["total_value"] = 910000
+        current["roi"] = 1.5
+
+        changes = diff_portfolio(PREVIOUS, current)
+
+        assert changes["set"] == {"total_value": 910000, "roi": 1.5}
+        assert changes["unset"] == ["cash"]
+
+    def test_holdings_only_changed_items(self):
+        """測試：持股清單只包含變更與移除的股票"""
+        current = {
+            **PREVIOUS,
+            "holdings": [
+                {"ticker": "2330", "quantity": 1000, "market_value": 610000},
+                {"ticker": "2454", "quantity": 100, "market_value": 120000},
+            ],
+        }
+
+        changes = diff_portfolio(PREVIOUS, current)
+
+        assert changes["set"] == {}
+        assert changes["lists"]["holdings"] == {
+            "key": "ticker",
+            "upsert": current["holdings"],
+            "remove": ["2317"],
+        }
+
+    def test_list_without_item_key_replaced(self):
+        """測試：無法辨識項目的清單整欄取代"""
+        changes = diff_portfolio({"tags": ["a"]}, {"tags": ["a", "b"]})
+        assert changes["set"] == {"tags": ["a", "b"]}
+
+    def test_apply_round_trip(self):
+        """測試：套用差量後與最新投資組合一致"""
+        current = {
+            "cash": 50000,
+            "total_value": 950000,
+            "holdings": [
+                {"ticker": "2330", "quantity": 1000, "market_value": 650000},
+                {"ticker": "2317", "quantity": 2000, "market_value": 200000},
+                {"ticker": "2454", "quantity": 100, "market_value": 50000},
+            ],
+        }
+
+        changes = diff_portfolio(PREVIOUS, current)
+
+        assert len(changes["lists"]["holdings"]["upsert"]) == 2
+        assert apply_portfolio_delta(PREVIOUS, changes) == current
+
+
+class TestEncodeMessage:
+    """測試訊息編碼"""
+
+    def test_json(self):
+        """測試：JSON 為文字訊息"""
+        assert encode_message({"type": "x"}, ENCODING_JSON) == '{"type": "x"}'
+
+    def test_msgpack(self):
+        """測試：msgpack 為二進位訊息且較 JSON 精簡"""
+        msgpack = pytest.importorskip("msgpack")
+        message = {"type": "portfolio_update", "data": PREVIOUS}
+
+        payload = encode_message(message, ENCODING_MSGPACK)
+
+        assert isinstance(payload, bytes)
+        assert msgpack.unpackb(payload) == message
+        assert len(payload) < len(encode_message(message, ENCODING_JSON))
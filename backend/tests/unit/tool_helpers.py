@@ -0,0 +1,24 @@
+"""
+Function tool 測試輔助函數
+
+以 Agent 框架相同的方式（ToolContext + JSON 參數）呼叫 function tool。
+"""
+
+import asyncio
+import json
+
+from agents.tool_context import ToolContext
+
+
+async def ainvoke(tool, arguments: dict) -> dict:
+    """以 Agent 框架相同的方式呼叫 function tool"""
+    payload = json.dumps(arguments)
+    context = ToolContext(
+        context=None, tool_name=tool.name, tool_call_id="call-1", tool_arguments=payload
+    )
+    return await tool.on_invoke_tool(context, payload)
+
+
+def invoke(tool, arguments: dict) -> dict:
+    """同步版本的 ainvoke（供非 async 測試使用）"""
+    return asyncio.run(ainvoke(tool, arguments))
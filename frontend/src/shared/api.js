@@ -141,7 +141,7 @@ class APIClient {
    *   start_time: string (ISO 8601),
    *   end_time: string (ISO 8601),
    *   execution_time_ms: number,
-   *   final_output: object,
+   *   final_output: object | null,  // 預設為 null，完整輸出請使用 getSessionDetails
    *   completed_at: string (ISO 8601),
    *   error_message: string | null,
    *   created_at: string (ISO 8601)
@@ -1,6 +1,9 @@
 // API Configuration
 export const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 export const WS_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000/ws';
+// WebSocket 訊息編碼（json | msgpack）與投資組合差量模式，預設為 JSON 完整訊息
+export const WS_ENCODING = import.meta.env.VITE_WS_ENCODING || 'json';
+export const WS_DELTA = import.meta.env.VITE_WS_DELTA === 'true';
 
 // Agent Modes
 export const AGENT_MODES = {
@@ -89,11 +92,19 @@ export const WS_EVENT_TYPES = {
   EXECUTION_COMPLETED: 'execution_completed',
   EXECUTION_FAILED: 'execution_failed',
   EXECUTION_STOPPED: 'execution_stopped',
+  EXECUTION_STREAM: 'execution_stream',
   // Status Events
   AGENT_STATUS: 'agent_status',
   TRADE_EXECUTION: 'trade_execution',
   STRATEGY_CHANGE: 'strategy_change',
   PORTFOLIO_UPDATE: 'portfolio_update',
+  PORTFOLIO_DELTA: 'portfolio_delta',
   PERFORMANCE_UPDATE: 'performance_update',
   ERROR: 'error',
+  // Protocol Events
+  SUBSCRIPTIONS: 'subscriptions',
+  PONG: 'pong',
+  WELCOME: 'welcome',
+  MESSAGES_DROPPED: 'messages_dropped',
+  RESYNC_UNAVAILABLE: 'resync_unavailable',
 };
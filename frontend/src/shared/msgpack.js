@@ -0,0 +1,136 @@
+/**
+ * MessagePack Decoder
+ *
+ * 解碼後端以 msgpack 編碼的 WebSocket 二進位訊息（只需解碼，不引入額外套件）
+ * 支援 nil / bool / int / float / str / bin / array / map，不支援 ext 型別
+ */
+
+const textDecoder = new TextDecoder();
+
+/**
+ * 解碼 msgpack 資料
+ * @param {ArrayBuffer|Uint8Array} buffer
+ */
+export function decodeMsgpack(buffer) {
+  const bytes = buffer instanceof Uint8Array ? buffer : new Uint8Array(buffer);
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  let offset = 0;
+
+  function readString(length) {
+    const value = textDecoder.decode(bytes.subarray(offset, offset + length));
+    offset += length;
+    return value;
+  }
+
+  function readBinary(length) {
+    const value = bytes.slice(offset, offset + length);
+    offset += length;
+    return value;
+  }
+
+  function readArray(length) {
+    const result = new Array(length);
+    for (let i = 0; i < length; i++) {
+      result[i] = read();
+    }
+    return result;
+  }
+
+  function readMap(length) {
+    const result = {};
+    for (let i = 0; i < length; i++) {
+      const key = read();
+      result[key] = read();
+    }
+    return result;
+  }
+
+  function readUint(size) {
+    let value;
+    if (size === 1) value = view.getUint8(offset);
+    else if (size === 2) value = view.getUint16(offset);
+    else if (size === 4) value = view.getUint32(offset);
+    else value = Number(view.getBigUint64(offset));
+    offset += size;
+    return value;
+  }
+
+  function readInt(size) {
+    let value;
+    if (size === 1) value = view.getInt8(offset);
+    else if (size === 2) value = view.getInt16(offset);
+    else if (size === 4) value = view.getInt32(offset);
+    else value = Number(view.getBigInt64(offset));
+    offset += size;
+    return value;
+  }
+
+  function read() {
+    const type = view.getUint8(offset++);
+
+    if (type <= 0x7f) return type; // positive fixint
+    if (type <= 0x8f) return readMap(type & 0x0f); // fixmap
+    if (type <= 0x9f) return readArray(type & 0x0f); // fixarray
+    if (type <= 0xbf) return readString(type & 0x1f); // fixstr
+    if (type >= 0xe0) return type - 0x100; // negative fixint
+
+    switch (type) {
+      case 0xc0:
+        return null;
+      case 0xc2:
+        return false;
+      case 0xc3:
+        return true;
+      case 0xc4:
+        return readBinary(readUint(1));
+      case 0xc5:
+        return readBinary(readUint(2));
+      case 0xc6:
+        return readBinary(readUint(4));
+      case 0xca: {
+        const value = view.getFloat32(offset);
+        offset += 4;
+        return value;
+      }
+      case 0xcb: {
+        const value = view.getFloat64(offset);
+        offset += 8;
+        return value;
+      }
+      case 0xcc:
+        return readUint(1);
+      case 0xcd:
+        return readUint(2);
+      case 0xce:
+        return readUint(4);
+      case 0xcf:
+        return readUint(8);
+      case 0xd0:
+        return readInt(1);
+      case 0xd1:
+        return readInt(2);
+      case 0xd2:
+        return readInt(4);
+      case 0xd3:
+        return readInt(8);
+      case 0xd9:
+        return readString(readUint(1));
+      case 0xda:
+        return readString(readUint(2));
+      case 0xdb:
+        return readString(readUint(4));
+      case 0xdc:
+        return readArray(readUint(2));
+      case 0xdd:
+        return readArray(readUint(4));
+      case 0xde:
+        return readMap(readUint(2));
+      case 0xdf:
+        return readMap(readUint(4));
+      default:
+        throw new Error(`Unsupported msgpack type: 0x${type.toString(16)}`);
+    }
+  }
+
+  return read();
+}
@@ -36,6 +36,12 @@ export {
   connectWebSocket,
   disconnectWebSocket,
   sendMessage,
+  subscribeTopics,
+  unsubscribeTopics,
+  agentTopic,
+  sessionTopic,
+  executionStreams,
+  portfolios,
   addEventListener,
   removeEventListener,
   clearAllEventListeners,
@@ -1,13 +1,16 @@
-import { writable } from 'svelte/store';
+import { get, writable } from 'svelte/store';
 import {
   WS_URL,
+  WS_ENCODING,
+  WS_DELTA,
   WS_EVENT_TYPES,
   MAX_RECONNECT_ATTEMPTS,
   RECONNECT_DELAY_MS,
 } from '../shared/constants.js';
-import { agents } from './agents.js';
+import { agents, selectedAgentId } from './agents.js';
 import { refreshAgentDetails } from './agentDetails.js';
 import { addNotification } from './notifications.js';
+import { decodeMsgpack } from '../shared/msgpack.js';
 
 /**
  * WebSocket Store
@@ -34,6 +37,35 @@ export const lastMessage = writable(null);
 // 事件監聽器映射 { eventType: [callbacks] }
 const eventListeners = new Map();
 
+// 目前需要的訂閱主題（重連後重新送出）
+const subscribedTopics = new Set();
+
+// 目前開啟的 Agent 詳細視圖所訂閱的主題
+let viewTopic = null;
+
+// 目前開啟視圖正在執行的會話串流主題
+let streamTopic = null;
+
+// 執行中會話的即時串流內容 { session_id: { agent_id, text, tools } }
+export const executionStreams = writable({});
+
+// 各 Agent 最新投資組合 { agent_id: { seq, data } }（差量模式依序號合併）
+export const portfolios = writable({});
+
+/**
+ * 取得 Agent 專屬主題名稱（對應後端 agent_topic）
+ */
+export function agentTopic(agentId) {
+  return `agent:${agentId}`;
+}
+
+/**
+ * 取得執行會話主題名稱（對應後端 session_topic）
+ */
+export function sessionTopic(sessionId) {
+  return `session:${sessionId}`;
+}
+
 /**
  * 連接到 WebSocket 伺服器
  */
@@ -45,6 +77,7 @@ export function connectWebSocket() {
 
   try {
     wsInstance = new WebSocket(WS_URL);
+    wsInstance.binaryType = 'arraybuffer';
 
     wsInstance.onopen = handleOpen;
     wsInstance.onmessage = handleMessage;
@@ -64,6 +97,18 @@ function handleOpen(_event) {
   connected.set(true);
   reconnectAttempts = 0;
 
+  // 協商編碼與差量模式（預設 JSON 完整訊息不需協商）；重連後序號重新開始
+  portfolios.set({});
+  if (WS_ENCODING !== 'json' || WS_DELTA) {
+    sendMessage({ type: 'hello', encoding: WS_ENCODING, delta: WS_DELTA });
+  }
+
+  // 只接收全域事件與目前視圖需要的 Agent 事件
+  sendMessage({ type: 'unsubscribe', topics: ['*'] });
+  if (subscribedTopics.size > 0) {
+    sendMessage({ type: 'subscribe', topics: [...subscribedTopics] });
+  }
+
   addNotification({
     type: 'success',
     message: '已連接到即時更新伺服器',
@@ -75,7 +120,9 @@ function handleOpen(_event) {
  */
 function handleMessage(event) {
   try {
-    const data = JSON.parse(event.data);
+    // 文字訊息為 JSON，二進位訊息為協商後的 msgpack
+    const data =
+      typeof event.data === 'string' ? JSON.parse(event.data) : decodeMsgpack(event.data);
     lastMessage.set(data);
 
     // 根據事件類型分發
@@ -174,6 +221,58 @@ export function sendMessage(data) {
   }
 }
 
+/**
+ * 訂閱主題（未連線時於連線後送出）
+ */
+export function subscribeTopics(topics) {
+  const added = topics.filter((topic) => !subscribedTopics.has(topic));
+  added.forEach((topic) => subscribedTopics.add(topic));
+  if (added.length > 0 && wsInstance && wsInstance.readyState === WebSocket.OPEN) {
+    sendMessage({ type: 'subscribe', topics: added });
+  }
+}
+
+/**
+ * 取消訂閱主題
+ */
+export function unsubscribeTopics(topics) {
+  const removed = topics.filter((topic) => subscribedTopics.delete(topic));
+  if (removed.length > 0 && wsInstance && wsInstance.readyState === WebSocket.OPEN) {
+    sendMessage({ type: 'unsubscribe', topics: removed });
+  }
+}
+
+// 依開啟的 Agent 詳細視圖切換訂閱
+selectedAgentId.subscribe((agentId) => {
+  const nextTopic = agentId ? agentTopic(agentId) : null;
+  if (nextTopic === viewTopic) return;
+
+  if (viewTopic) {
+    unsubscribeTopics([viewTopic]);
+  }
+  if (nextTopic) {
+    subscribeTopics([nextTopic]);
+  }
+  viewTopic = nextTopic;
+  watchSessionStream(null);
+});
+
+/**
+ * 切換目前觀看的執行會話串流（null 表示停止觀看）
+ */
+function watchSessionStream(sessionId) {
+  const nextTopic = sessionId ? sessionTopic(sessionId) : null;
+  if (nextTopic === streamTopic) return;
+
+  if (streamTopic) {
+    unsubscribeTopics([streamTopic]);
+  }
+  if (nextTopic) {
+    subscribeTopics([nextTopic]);
+  }
+  streamTopic = nextTopic;
+}
+
 /**
  * 註冊事件監聽器
  */
@@ -248,11 +347,102 @@ export function handleEvent(data) {
     case WS_EVENT_TYPES.AGENT_STATUS:
       handleAgentStatusUpdate(payload);
       break;
+    case WS_EVENT_TYPES.EXECUTION_STREAM:
+      handleExecutionStream(payload);
+      break;
+    case WS_EVENT_TYPES.PORTFOLIO_UPDATE:
+      handlePortfolioUpdate(payload);
+      break;
+    case WS_EVENT_TYPES.PORTFOLIO_DELTA:
+      handlePortfolioDelta(payload);
+      break;
+    case WS_EVENT_TYPES.MESSAGES_DROPPED:
+      resyncPortfolios();
+      break;
+    case WS_EVENT_TYPES.RESYNC_UNAVAILABLE:
+      forgetPortfolio(payload.agent_id);
+      break;
+    case WS_EVENT_TYPES.WELCOME:
+      console.warn(`[WS] Negotiated encoding=${payload.encoding} delta=${payload.delta}`);
+      break;
+    case WS_EVENT_TYPES.SUBSCRIPTIONS:
+    case WS_EVENT_TYPES.PONG:
+      break;
     default:
       console.warn(`Unhandled event type: ${eventType}`, payload);
   }
 }
 
+/**
+ * 處理投資組合完整快照
+ */
+function handlePortfolioUpdate(payload) {
+  const { agent_id, seq = null, data } = payload;
+  portfolios.update((all) => ({ ...all, [agent_id]: { seq, data } }));
+}
+
+/**
+ * 處理投資組合差量：序號連續時合併，否則請求完整快照
+ */
+function handlePortfolioDelta(payload) {
+  const { agent_id, seq, base_seq, changes } = payload;
+  const current = get(portfolios)[agent_id];
+
+  if (!current || current.seq !== base_seq) {
+    console.warn(`[WS] Portfolio gap for agent ${agent_id} (have ${current?.seq}, need ${base_seq})`);
+    sendMessage({ type: 'resync', agent_id });
+    return;
+  }
+
+  const data = applyPortfolioChanges(current.data, changes);
+  portfolios.update((all) => ({ ...all, [agent_id]: { seq, data } }));
+
+  // 以完整投資組合通知 portfolio_update 監聽器，與非差量模式一致
+  handleEvent({ type: WS_EVENT_TYPES.PORTFOLIO_UPDATE, agent_id, seq, data });
+}
+
+/**
+ * 套用差量（對應後端 apply_portfolio_delta）
+ */
+function applyPortfolioChanges(previous, changes) {
+  const result = { ...previous };
+  (changes.unset || []).forEach((field) => delete result[field]);
+  Object.assign(result, changes.set || {});
+
+  for (const [field, diff] of Object.entries(changes.lists || {})) {
+    const { key, upsert = [], remove = [] } = diff;
+    const removed = new Set(remove);
+    const upserts = new Map(upsert.map((item) => [item[key], item]));
+    const merged = [];
+
+    for (const item of result[field] || []) {
+      if (removed.has(item[key])) continue;
+      merged.push(upserts.get(item[key]) || item);
+      upserts.delete(item[key]);
+    }
+    result[field] = [...merged, ...upserts.values()];
+  }
+  return result;
+}
+
+/**
+ * 有訊息被丟棄時，重新取得已追蹤 Agent 的投資組合快照
+ */
+function resyncPortfolios() {
+  if (!WS_DELTA) return;
+  Object.keys(get(portfolios)).forEach((agent_id) => sendMessage({ type: 'resync', agent_id }));
+}
+
+/**
+ * 伺服器沒有快照時移除本地狀態，等待下一次完整更新
+ */
+function forgetPortfolio(agentId) {
+  portfolios.update((all) => {
+    const { [agentId]: _removed, ...rest } = all;
+    return rest;
+  });
+}
+
 /**
  * 處理執行開始事件
  */
@@ -266,6 +456,11 @@ function handleExecutionStarted(payload) {
     )
   );
 
+  // 開啟中的 Agent 開始執行時，訂閱該會話的串流事件
+  if (agent_id === get(selectedAgentId)) {
+    watchSessionStream(session_id);
+  }
+
   // addNotification({
   //   type: 'info',
   //   message: `Agent ${agent_id} 開始執行 ${mode} 模式...`,
@@ -274,11 +469,54 @@ function handleExecutionStarted(payload) {
   console.warn(`[WS] Execution started for agent ${agent_id}`);
 }
 
+/**
+ * 處理執行串流事件（增量文字、工具呼叫）
+ */
+function handleExecutionStream(payload) {
+  const { agent_id, session_id, events = [] } = payload;
+
+  executionStreams.update((streams) => {
+    const current = streams[session_id] || { agent_id, text: '', tools: [] };
+    let { text } = current;
+    const tools = [...current.tools];
+
+    for (const event of events) {
+      if (event.kind === 'text' && !event.parent_call_id) {
+        text += event.delta;
+      } else if (event.kind === 'tool_started') {
+        tools.push({ ...event, finished: false });
+      } else if (event.kind === 'tool_finished') {
+        const tool = tools.find((t) => t.call_id === event.call_id);
+        if (tool) {
+          Object.assign(tool, { finished: true, output: event.output });
+        }
+      }
+    }
+
+    return { ...streams, [session_id]: { agent_id, text, tools } };
+  });
+}
+
+/**
+ * 停止觀看 Agent 的會話串流並清除暫存內容（最終輸出由 API 取得）
+ */
+function finishExecutionStream(agentId) {
+  if (agentId === get(selectedAgentId)) {
+    watchSessionStream(null);
+  }
+  executionStreams.update((streams) =>
+    Object.fromEntries(
+      Object.entries(streams).filter(([, stream]) => stream.agent_id !== agentId)
+    )
+  );
+}
+
 /**
  * 處理執行完成事件
  */
 function handleExecutionCompleted(payload) {
   const { agent_id, execution_time_ms, financial_data } = payload;
+  finishExecutionStream(agent_id);
 
   // 如果有財務數據，立即更新 agent 的財務狀態
   if (financial_data) {
@@ -330,6 +568,7 @@ function handleExecutionCompleted(payload) {
  */
 function handleExecutionFailed(payload) {
   const { agent_id, error, financial_data } = payload;
+  finishExecutionStream(agent_id);
 
   // 如果有財務數據，更新財務狀態和執行狀態
   if (financial_data) {
@@ -380,6 +619,7 @@ function handleExecutionFailed(payload) {
  */
 function handleExecutionStopped(payload) {
   const { agent_id, status, financial_data } = payload;
+  finishExecutionStream(agent_id);
 
   // 如果有財務數據，更新財務狀態和執行狀態
   if (financial_data) {
@@ -38,7 +38,7 @@ CREATE TABLE public.agents (
   created_at              TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
   updated_at              TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
   last_active_at          TIMESTAMPTZ,
-  CONSTRAINT check_agent_status CHECK (status IN ('active','inactive','error','suspended')),
+  CONSTRAINT check_agent_status CHECK (status IN ('active','inactive','error','suspended','deleting')),
   CONSTRAINT check_agent_mode   CHECK (current_mode IN ('TRADING','REBALANCING'))
 );
 CREATE INDEX idx_agents_status     ON public.agents (status);
@@ -53,9 +53,6 @@ CREATE TABLE public.agent_sessions (
   start_time         TIMESTAMPTZ NOT NULL DEFAULT NOW(),
   end_time           TIMESTAMPTZ,
   execution_time_ms  INTEGER,
-  initial_input      JSONB,
-  final_output       TEXT,
-  tools_called       TEXT,
   error_message      TEXT,
   created_at         TIMESTAMPTZ NOT NULL DEFAULT NOW(),
   updated_at         TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -66,6 +63,17 @@ CREATE INDEX idx_sessions_status     ON public.agent_sessions (status);
 CREATE INDEX idx_sessions_start_time ON public.agent_sessions (start_time);
 CREATE INDEX idx_sessions_created_at ON public.agent_sessions (created_at);
 
+-- agent_session_payloads（initial_input / final_output / tools_called 合併為 JSON 文件，
+-- 以 codec 壓縮：raw = 未壓縮 JSON、zstd、gzip）
+CREATE TABLE public.agent_session_payloads (
+  session_id  VARCHAR(50) PRIMARY KEY REFERENCES public.agent_sessions(id) ON DELETE CASCADE,
+  codec       VARCHAR(10) NOT NULL DEFAULT 'raw',
+  data        BYTEA       NOT NULL,
+  raw_size    INTEGER     NOT NULL DEFAULT 0,
+  created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- agent_holdings
 CREATE TABLE public.agent_holdings (
   id            BIGSERIAL PRIMARY KEY,
@@ -132,3 +140,21 @@ CREATE TABLE public.agent_performance (
 );
 CREATE INDEX idx_performance_agent_id ON public.agent_performance (agent_id);
 CREATE INDEX idx_performance_date     ON public.agent_performance (date);
+
+-- indicator_snapshots（收盤後預先計算的技術指標快照，每檔股票每個交易日一筆）
+CREATE TABLE public.indicator_snapshots (
+  id             SERIAL      PRIMARY KEY,
+  ticker         VARCHAR(10) NOT NULL,
+  trading_date   DATE        NOT NULL,
+  close          NUMERIC(12,4) NOT NULL,
+  indicators     JSONB       NOT NULL DEFAULT '{}'::jsonb,
+  trend          JSONB,
+  patterns       JSONB       NOT NULL DEFAULT '[]'::jsonb,
+  overall_signal VARCHAR(10) NOT NULL,
+  confidence     NUMERIC(5,4) NOT NULL,
+  signals        JSONB       NOT NULL DEFAULT '[]'::jsonb,
+  created_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  CONSTRAINT uq_indicator_snapshot_ticker_date UNIQUE (ticker, trading_date)
+);
+CREATE INDEX idx_indicator_snapshots_trading_date ON public.indicator_snapshots (trading_date);
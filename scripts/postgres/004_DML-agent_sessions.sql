@@ -1,674 +1,415 @@
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('519215fe-e3e2-4999-bb25-d507f54d6623','agent-5e101682','TRADING','completed','2025-10-29 01:56:20.103413+08','2025-10-29 01:58:15.359925+08',115256,'{}',NULL,NULL,NULL,'2025-10-29 01:56:20.107351+08','2025-10-29 01:58:15.359925+08'),
-	 ('9a1d74f7-0e60-48c8-ab7f-b4d20e3d6ea7','agent-53ba0174','TRADING','completed','2025-10-29 02:23:25.858998+08','2025-10-29 02:32:55.169552+08',569310,'{}',NULL,NULL,NULL,'2025-10-29 02:23:25.86112+08','2025-10-29 02:32:55.169552+08'),
-	 ('206918c4-0b5f-455f-b47e-ca4021094d80','agent-f11318ac','TRADING','completed','2025-10-29 02:38:26.815078+08','2025-10-29 02:42:23.120171+08',236305,'{}',NULL,NULL,NULL,'2025-10-29 02:38:26.817407+08','2025-10-29 02:42:23.120171+08'),
-	 ('513b2323-d92b-4781-a5ba-442ca0f2a85c','agent-f11318ac','TRADING','failed','2025-10-29 17:59:14.972161+08',NULL,NULL,'{}',NULL,NULL,NULL,'2025-10-29 17:59:14.973842+08','2025-10-29 17:59:14.984679+08'),
-	 ('dde88058-cd0a-4cfb-8831-45c9a9b23d65','agent-f11318ac','TRADING','completed','2025-10-29 18:03:28.524951+08','2025-10-29 18:06:14.174101+08',165649,'{}',NULL,NULL,NULL,'2025-10-29 18:03:28.526414+08','2025-10-29 18:06:14.174101+08'),
-	 ('6da78d67-b9e3-4cb4-98d9-b97cec76997c','agent-5e101682','TRADING','completed','2025-10-30 08:35:57.011671+08','2025-10-30 08:36:10.892172+08',13880,'{}',NULL,NULL,NULL,'2025-10-30 08:35:57.013585+08','2025-10-30 08:36:10.892172+08'),
-	 ('16596328-6b49-4fd1-a253-1bf6fd4c03cf','agent-5e101682','TRADING','completed','2025-10-30 08:37:46.804524+08','2025-10-30 08:37:56.46744+08',9662,'{}',NULL,NULL,NULL,'2025-10-30 08:37:46.805816+08','2025-10-30 08:37:56.46744+08'),
-	 ('e1e295e9-0db7-444d-b718-928af3df67ad','agent-5e101682','TRADING','completed','2025-10-30 08:39:08.120607+08','2025-10-30 08:42:53.345399+08',225224,'{}',NULL,NULL,NULL,'2025-10-30 08:39:08.121344+08','2025-10-30 08:42:53.345399+08'),
-	 ('f781908f-4bc9-4b32-8221-7883d292c9da','agent-5e101682','TRADING','completed','2025-10-30 08:43:50.179674+08','2025-10-30 08:46:56.576305+08',186396,'{}',NULL,NULL,NULL,'2025-10-30 08:43:50.182587+08','2025-10-30 08:46:56.576305+08'),
-	 ('a0539fee-28b4-4409-99a9-0182303fb12a','agent-5e101682','TRADING','completed','2025-10-30 08:48:14.607044+08','2025-10-30 08:50:49.823933+08',155216,'{}',NULL,NULL,NULL,'2025-10-30 08:48:14.608146+08','2025-10-30 08:50:49.823933+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('72fe5994-3ef7-4f62-9c60-f7a2c40d93a3','agent-5e101682','TRADING','completed','2025-10-30 08:53:37.190507+08','2025-10-30 08:54:11.354231+08',34163,'{}',NULL,NULL,NULL,'2025-10-30 08:53:37.191883+08','2025-10-30 08:54:11.354231+08'),
-	 ('71759a64-1b2a-4631-b497-4f53de0f4f02','agent-5e101682','TRADING','completed','2025-10-30 08:56:01.005097+08','2025-10-30 08:58:07.364798+08',126359,'{}',NULL,NULL,NULL,'2025-10-30 08:56:01.007519+08','2025-10-30 08:58:07.364798+08'),
-	 ('1059f4ef-0a96-48e1-8703-4ec7114d43e9','agent-5e101682','TRADING','completed','2025-10-30 09:19:25.182047+08','2025-10-30 09:22:14.649809+08',169467,'{}',NULL,NULL,NULL,'2025-10-30 09:19:25.183435+08','2025-10-30 09:22:14.649809+08'),
-	 ('31723d22-a4fa-4452-956b-047fe7995dca','agent-5e101682','TRADING','failed','2025-10-30 19:13:21.127555+08','2025-10-30 19:13:26.578543+08',5450,'{}',NULL,NULL,'Agent execution failed: litellm.UnsupportedParamsError: github_copilot does not support parameters: [''tool_choice''], for model=/gpt-5-mini. To drop these, set `litellm.drop_params=True` or for proxy:
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('519215fe-e3e2-4999-bb25-d507f54d6623','agent-5e101682','TRADING','completed','2025-10-29 01:56:20.103413+08','2025-10-29 01:58:15.359925+08',115256,NULL,'2025-10-29 01:56:20.107351+08','2025-10-29 01:58:15.359925+08'),
+	 ('9a1d74f7-0e60-48c8-ab7f-b4d20e3d6ea7','agent-53ba0174','TRADING','completed','2025-10-29 02:23:25.858998+08','2025-10-29 02:32:55.169552+08',569310,NULL,'2025-10-29 02:23:25.86112+08','2025-10-29 02:32:55.169552+08'),
+	 ('206918c4-0b5f-455f-b47e-ca4021094d80','agent-f11318ac','TRADING','completed','2025-10-29 02:38:26.815078+08','2025-10-29 02:42:23.120171+08',236305,NULL,'2025-10-29 02:38:26.817407+08','2025-10-29 02:42:23.120171+08'),
+	 ('513b2323-d92b-4781-a5ba-442ca0f2a85c','agent-f11318ac','TRADING','failed','2025-10-29 17:59:14.972161+08',NULL,NULL,NULL,'2025-10-29 17:59:14.973842+08','2025-10-29 17:59:14.984679+08'),
+	 ('dde88058-cd0a-4cfb-8831-45c9a9b23d65','agent-f11318ac','TRADING','completed','2025-10-29 18:03:28.524951+08','2025-10-29 18:06:14.174101+08',165649,NULL,'2025-10-29 18:03:28.526414+08','2025-10-29 18:06:14.174101+08'),
+	 ('6da78d67-b9e3-4cb4-98d9-b97cec76997c','agent-5e101682','TRADING','completed','2025-10-30 08:35:57.011671+08','2025-10-30 08:36:10.892172+08',13880,NULL,'2025-10-30 08:35:57.013585+08','2025-10-30 08:36:10.892172+08'),
+	 ('16596328-6b49-4fd1-a253-1bf6fd4c03cf','agent-5e101682','TRADING','completed','2025-10-30 08:37:46.804524+08','2025-10-30 08:37:56.46744+08',9662,NULL,'2025-10-30 08:37:46.805816+08','2025-10-30 08:37:56.46744+08'),
+	 ('e1e295e9-0db7-444d-b718-928af3df67ad','agent-5e101682','TRADING','completed','2025-10-30 08:39:08.120607+08','2025-10-30 08:42:53.345399+08',225224,NULL,'2025-10-30 08:39:08.121344+08','2025-10-30 08:42:53.345399+08'),
+	 ('f781908f-4bc9-4b32-8221-7883d292c9da','agent-5e101682','TRADING','completed','2025-10-30 08:43:50.179674+08','2025-10-30 08:46:56.576305+08',186396,NULL,'2025-10-30 08:43:50.182587+08','2025-10-30 08:46:56.576305+08'),
+	 ('a0539fee-28b4-4409-99a9-0182303fb12a','agent-5e101682','TRADING','completed','2025-10-30 08:48:14.607044+08','2025-10-30 08:50:49.823933+08',155216,NULL,'2025-10-30 08:48:14.608146+08','2025-10-30 08:50:49.823933+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('72fe5994-3ef7-4f62-9c60-f7a2c40d93a3','agent-5e101682','TRADING','completed','2025-10-30 08:53:37.190507+08','2025-10-30 08:54:11.354231+08',34163,NULL,'2025-10-30 08:53:37.191883+08','2025-10-30 08:54:11.354231+08'),
+	 ('71759a64-1b2a-4631-b497-4f53de0f4f02','agent-5e101682','TRADING','completed','2025-10-30 08:56:01.005097+08','2025-10-30 08:58:07.364798+08',126359,NULL,'2025-10-30 08:56:01.007519+08','2025-10-30 08:58:07.364798+08'),
+	 ('1059f4ef-0a96-48e1-8703-4ec7114d43e9','agent-5e101682','TRADING','completed','2025-10-30 09:19:25.182047+08','2025-10-30 09:22:14.649809+08',169467,NULL,'2025-10-30 09:19:25.183435+08','2025-10-30 09:22:14.649809+08'),
+	 ('31723d22-a4fa-4452-956b-047fe7995dca','agent-5e101682','TRADING','failed','2025-10-30 19:13:21.127555+08','2025-10-30 19:13:26.578543+08',5450,'Agent execution failed: litellm.UnsupportedParamsError: github_copilot does not support parameters: [''tool_choice''], for model=/gpt-5-mini. To drop these, set `litellm.drop_params=True` or for proxy:
 
 `litellm_settings:
  drop_params: true`
 .
  If you want to use these params dynamically send allowed_openai_params=[''tool_choice''] in your request.','2025-10-30 19:13:21.129188+08','2025-10-30 19:13:26.578543+08'),
-	 ('a6036ee3-6be3-4ad7-bad8-f6fa0ca0a8e3','agent-5e101682','TRADING','failed','2025-10-30 19:18:19.162328+08','2025-10-30 19:18:24.561056+08',5398,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:18:19.164238+08','2025-10-30 19:18:24.561056+08'),
-	 ('023afb8b-fcf7-418b-9676-03f58688e569','agent-5e101682','TRADING','failed','2025-10-30 19:19:00.790603+08','2025-10-30 19:19:05.826805+08',5036,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:19:00.7919+08','2025-10-30 19:19:05.826805+08'),
-	 ('886d231b-cc5d-40db-8fd4-7406a289f4a2','agent-5e101682','TRADING','failed','2025-10-30 19:20:35.610483+08','2025-10-30 19:20:40.315638+08',4705,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:20:35.611833+08','2025-10-30 19:20:40.315638+08'),
-	 ('a3602325-00f1-44f8-a7ff-28173c047d30','agent-5e101682','TRADING','failed','2025-10-30 19:37:09.021219+08','2025-10-30 19:37:14.867976+08',5846,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:37:09.023044+08','2025-10-30 19:37:14.867976+08'),
-	 ('ac3649eb-ba1e-4ec5-b333-c68107573a0e','agent-5e101682','TRADING','failed','2025-10-30 19:38:36.246231+08','2025-10-30 19:39:04.961249+08',28715,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:38:36.251335+08','2025-10-30 19:39:04.961249+08'),
-	 ('faccea58-8e3f-40ab-984d-e0a53bcf0574','agent-5e101682','TRADING','completed','2025-10-30 19:40:58.824849+08','2025-10-30 19:44:43.003847+08',224178,'{}',NULL,NULL,NULL,'2025-10-30 19:40:58.830253+08','2025-10-30 19:44:43.003847+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('cb3d25c3-ff3d-48b3-a77f-742574a2d370','agent-53ba0174','TRADING','completed','2025-10-30 19:46:10.562116+08','2025-10-30 19:47:27.319381+08',76757,'{}',NULL,NULL,NULL,'2025-10-30 19:46:10.563682+08','2025-10-30 19:47:27.319381+08'),
-	 ('665029ce-fc27-4a4c-9961-6458e0a3ca92','agent-53ba0174','TRADING','completed','2025-10-30 19:51:11.438255+08','2025-10-30 19:52:53.058024+08',101619,'{}',NULL,NULL,NULL,'2025-10-30 19:51:11.440405+08','2025-10-30 19:52:53.058024+08'),
-	 ('0c934e57-88c7-46ed-b526-cc4946128bfc','agent-53ba0174','TRADING','completed','2025-10-30 20:02:13.05093+08','2025-10-30 20:07:57.234177+08',344183,'{}',NULL,NULL,NULL,'2025-10-30 20:02:13.052643+08','2025-10-30 20:07:57.234177+08'),
-	 ('2dc1082b-3dad-4118-a843-d4616dde54e7','agent-53ba0174','TRADING','failed','2025-10-31 01:56:02.177595+08','2025-10-31 01:56:09.562666+08',7385,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 01:56:02.179262+08','2025-10-31 01:56:09.562666+08'),
-	 ('621f1e6b-0e18-4b2a-aba0-c5f592bf349f','agent-53ba0174','TRADING','failed','2025-10-31 01:59:20.015062+08','2025-10-31 01:59:25.398365+08',5383,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 01:59:20.017343+08','2025-10-31 01:59:25.398365+08'),
-	 ('35b8742d-2ce8-4789-b3fd-fabd3d87047f','agent-53ba0174','TRADING','failed','2025-10-31 02:01:28.635043+08','2025-10-31 02:01:34.241486+08',5606,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 02:01:28.636536+08','2025-10-31 02:01:34.241486+08'),
-	 ('24b7e272-d06e-4bcf-9c81-0035e1528869','agent-53ba0174','TRADING','failed','2025-10-31 02:02:52.840173+08','2025-10-31 02:02:57.852181+08',5012,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 02:02:52.841784+08','2025-10-31 02:02:57.852181+08'),
-	 ('e427ee63-8f95-4585-adc3-8e071e69c5dd','agent-53ba0174','TRADING','failed','2025-10-31 02:03:37.89872+08','2025-10-31 02:03:43.028644+08',5129,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 02:03:37.900078+08','2025-10-31 02:03:43.028644+08'),
-	 ('846724cd-8cea-47cd-b4c9-da7883befc3e','agent-53ba0174','TRADING','failed','2025-10-31 02:09:18.268024+08','2025-10-31 02:29:40.151139+08',1221883,'{}',NULL,NULL,'Agent execution failed: litellm.AuthenticationError: AuthenticationError: Github_copilotException - unauthorized: token expired','2025-10-31 02:09:18.269867+08','2025-10-31 02:29:40.151139+08'),
-	 ('67880e71-c903-49c8-b40f-8b805c7f6cd2','agent-53ba0174','TRADING','failed','2025-10-31 03:07:21.443668+08',NULL,NULL,'{}',NULL,NULL,NULL,'2025-10-31 03:07:21.445348+08','2025-10-31 03:07:21.462875+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('b4317345-a3a2-4d09-8e82-66b897a7c926','agent-53ba0174','TRADING','failed','2025-11-01 09:16:18.347826+08','2025-11-01 09:16:18.37219+08',24,'{}',NULL,NULL,'Agent initialization failed: ''str'' object has no attribute ''value''','2025-11-01 09:16:18.349087+08','2025-11-01 09:16:18.37219+08'),
-	 ('35b67d26-c2ce-4bb6-a3ff-ecf14d0285e7','agent-53ba0174','TRADING','failed','2025-11-01 09:16:40.572136+08','2025-11-01 09:16:40.583368+08',11,'{}',NULL,NULL,'Agent initialization failed: ''str'' object has no attribute ''value''','2025-11-01 09:16:40.572861+08','2025-11-01 09:16:40.583368+08'),
-	 ('bcaae722-ead6-446d-b773-b1e47fea29a7','agent-53ba0174','TRADING','completed','2025-11-01 18:05:34.779412+08','2025-11-01 18:07:04.47697+08',89697,'{}',NULL,NULL,NULL,'2025-11-01 18:05:34.794024+08','2025-11-01 18:07:04.47697+08'),
-	 ('0d1e2b9e-84b5-489e-b8fc-0505f0eef963','agent-53ba0174','TRADING','completed','2025-11-01 21:28:07.81827+08','2025-11-01 21:29:39.103165+08',91284,'{}',NULL,NULL,NULL,'2025-11-01 21:28:07.820244+08','2025-11-01 21:29:39.103165+08'),
-	 ('8cd2543e-8ab1-4139-b24e-897479c8e5e1','agent-53ba0174','TRADING','completed','2025-11-06 18:07:25.050003+08','2025-11-06 18:11:31.250617+08',246200,'{}',NULL,NULL,NULL,'2025-11-06 18:07:25.052727+08','2025-11-06 18:11:31.250617+08'),
-	 ('f6492d0a-ee6d-400a-ac20-6c94b67eb6b9','agent-53ba0174','TRADING','failed','2025-11-06 19:29:13.72412+08','2025-11-06 19:29:21.572278+08',7848,'{}',NULL,NULL,'Agent initialization failed: ''AgentsService'' object has no attribute ''agents_service''','2025-11-06 19:29:13.728202+08','2025-11-06 19:29:21.572278+08'),
-	 ('05a0c91f-1817-4e20-91ce-92d26fe6eff3','agent-53ba0174','TRADING','completed','2025-11-06 19:49:22.692482+08','2025-11-06 19:54:24.69485+08',302002,'{}',NULL,NULL,NULL,'2025-11-06 19:49:22.694127+08','2025-11-06 19:54:24.69485+08'),
-	 ('140aecf1-10b0-4ba2-84a2-25e615479227','agent-53ba0174','TRADING','completed','2025-11-06 21:55:08.488896+08','2025-11-06 21:59:23.471417+08',254982,'{}',NULL,NULL,NULL,'2025-11-06 21:55:08.492071+08','2025-11-06 21:59:23.471417+08'),
-	 ('7c90bf6e-02dd-43d3-a710-5119f0317ec8','agent-f11318ac','TRADING','completed','2025-11-06 22:41:34.116971+08','2025-11-06 22:44:31.160125+08',177043,'{}',NULL,NULL,NULL,'2025-11-06 22:41:34.121273+08','2025-11-06 22:44:31.160125+08'),
-	 ('7fd3cf5a-f057-4a0e-8db3-d22d083934ee','agent-5e101682','TRADING','completed','2025-11-06 22:51:53.121453+08','2025-11-06 22:53:02.19196+08',69070,'{}',NULL,NULL,NULL,'2025-11-06 22:51:53.122911+08','2025-11-06 22:53:02.19196+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('4aa3f8fd-3362-44ce-b528-adb9bd0b476c','agent-5e101682','TRADING','completed','2025-11-06 22:55:09.440798+08','2025-11-06 22:55:22.172953+08',12732,'{}',NULL,NULL,NULL,'2025-11-06 22:55:09.446956+08','2025-11-06 22:55:22.172953+08'),
-	 ('ec39dcd0-6b5e-44af-865d-5cab7a84ed1b','agent-5e101682','TRADING','completed','2025-11-06 22:55:57.484704+08','2025-11-06 22:56:19.36358+08',21878,'{}',NULL,NULL,NULL,'2025-11-06 22:55:57.48547+08','2025-11-06 22:56:19.36358+08'),
-	 ('d66894b4-74e2-4097-b4df-416649246267','agent-5e101682','TRADING','completed','2025-11-06 23:01:38.752819+08','2025-11-06 23:03:22.252391+08',103499,'{}',NULL,NULL,NULL,'2025-11-06 23:01:38.754233+08','2025-11-06 23:03:22.252391+08'),
-	 ('ab259b81-ff66-4113-a672-da8458838259','agent-53ba0174','TRADING','completed','2025-11-06 23:14:34.873518+08','2025-11-06 23:24:07.15224+08',572278,'{}',NULL,NULL,NULL,'2025-11-06 23:14:34.876428+08','2025-11-06 23:24:07.15224+08'),
-	 ('17e4f0ce-b1ee-4805-b79d-7dd2427c694a','agent-5e101682','TRADING','completed','2025-11-06 23:26:05.228847+08','2025-11-06 23:26:17.294847+08',12066,'{}',NULL,NULL,NULL,'2025-11-06 23:26:05.229756+08','2025-11-06 23:26:17.294847+08'),
-	 ('5de7ce68-3fe5-40e9-bf1a-b4d95cbcd7a9','agent-5e101682','TRADING','completed','2025-11-07 16:40:20.320293+08','2025-11-07 16:40:41.848004+08',21527,'{}',NULL,NULL,NULL,'2025-11-07 16:40:20.323125+08','2025-11-07 16:40:41.848004+08'),
-	 ('dcee4804-62df-4ae1-827b-7a0ba0963b29','agent-5e101682','TRADING','completed','2025-11-07 16:42:33.799808+08','2025-11-07 16:42:40.623099+08',6823,'{}',NULL,NULL,NULL,'2025-11-07 16:42:33.804358+08','2025-11-07 16:42:40.623099+08'),
-	 ('e81c80da-c49f-46b0-8cfc-c8a2bc73dd46','agent-5e101682','TRADING','completed','2025-11-07 16:44:40.729899+08','2025-11-07 16:44:48.296382+08',7566,'{}',NULL,NULL,NULL,'2025-11-07 16:44:40.742114+08','2025-11-07 16:44:48.296382+08'),
-	 ('1eeb8471-282f-449c-9b53-39307f80891e','agent-5e101682','TRADING','completed','2025-11-07 16:47:21.480914+08','2025-11-07 16:48:40.544118+08',79063,'{}',NULL,NULL,NULL,'2025-11-07 16:47:21.482444+08','2025-11-07 16:48:40.544118+08'),
-	 ('a8d074d1-3213-477f-a152-3e0179251747','agent-5e101682','TRADING','completed','2025-11-07 17:01:33.868727+08','2025-11-07 17:02:26.153563+08',52284,'{}',NULL,NULL,NULL,'2025-11-07 17:01:33.870325+08','2025-11-07 17:02:26.153563+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('aa784902-86e3-4ccf-9f79-8b1b6e2320e9','agent-5e101682','TRADING','completed','2025-11-07 17:48:26.924297+08','2025-11-07 17:51:07.342422+08',160418,'{}',NULL,NULL,NULL,'2025-11-07 17:48:26.926788+08','2025-11-07 17:51:07.342422+08'),
-	 ('c1678e9f-30aa-4156-869b-2de6f8811612','agent-5e101682','TRADING','completed','2025-11-07 18:13:05.184873+08','2025-11-07 18:14:52.152075+08',106967,'{}',NULL,NULL,NULL,'2025-11-07 18:13:05.187+08','2025-11-07 18:14:52.152075+08'),
-	 ('ef171fa3-f10c-47fa-97ac-0fe22a4b3bcd','agent-5e101682','TRADING','completed','2025-11-07 18:19:20.785588+08','2025-11-07 18:20:45.355126+08',84569,'{}',NULL,NULL,NULL,'2025-11-07 18:19:20.787108+08','2025-11-07 18:20:45.355126+08'),
-	 ('68c6b296-ee00-460c-9f0c-fad00514f169','agent-5e101682','TRADING','completed','2025-11-07 21:40:44.349566+08','2025-11-07 21:42:15.461212+08',91111,'{}',NULL,NULL,NULL,'2025-11-07 21:40:44.350877+08','2025-11-07 21:42:15.461212+08'),
-	 ('28b92bbf-edae-410f-95da-8acee4c221da','agent-5e101682','TRADING','completed','2025-11-07 21:44:25.128406+08','2025-11-07 21:51:59.841931+08',454713,'{}',NULL,NULL,NULL,'2025-11-07 21:44:25.129482+08','2025-11-07 21:51:59.841931+08'),
-	 ('c7e7bf5b-ddd9-4c45-979c-56ca336ac7e8','agent-f11318ac','TRADING','completed','2025-11-07 22:21:24.823516+08','2025-11-07 22:26:31.023963+08',306200,'{}',NULL,NULL,NULL,'2025-11-07 22:21:24.834705+08','2025-11-07 22:26:31.023963+08'),
-	 ('5c0e90ba-83db-4c37-a087-3779530c7093','agent-53ba0174','TRADING','completed','2025-11-07 22:33:31.970544+08','2025-11-07 22:40:37.976189+08',426005,'{}',NULL,NULL,NULL,'2025-11-07 22:33:31.975287+08','2025-11-07 22:40:37.976189+08'),
-	 ('d8c19ae3-1f13-4f0f-895f-6d50db64d5b5','agent-f11318ac','TRADING','completed','2025-11-09 02:12:00.350054+08','2025-11-09 02:23:00.810832+08',660460,'{}',NULL,NULL,NULL,'2025-11-09 02:12:00.356505+08','2025-11-09 02:23:00.810832+08'),
-	 ('3024a969-20ab-44df-b54c-79ad3215337e','agent-f11318ac','REBALANCING','failed','2025-11-10 02:31:15.928265+08','2025-11-17 06:18:24.425408+08',618428497,'{}',NULL,NULL,'Session timeout after 1 minutes','2025-11-10 02:31:15.931121+08','2025-11-17 06:18:24.42618+08'),
-	 ('510a21ff-7ad0-44a6-a501-434a49cee413','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:11.150283+08','2025-11-17 06:18:24.425474+08',618373275,'{}',NULL,NULL,'Session timeout after 1 minutes','2025-11-10 02:32:11.157676+08','2025-11-17 06:18:24.426181+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('09ba0efd-b186-4b63-a41d-1e8656b2ba28','agent-f11318ac','TRADING','failed','2025-11-10 02:32:15.336255+08','2025-11-17 06:18:24.425529+08',618369089,'{}',NULL,NULL,'Session timeout after 1 minutes','2025-11-10 02:32:15.336979+08','2025-11-17 06:18:24.426178+08'),
-	 ('fc020958-4bd5-46e6-91a0-599f1d3cdda7','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:17.494357+08','2025-11-17 06:18:24.425575+08',618366931,'{}',NULL,NULL,'Session timeout after 1 minutes','2025-11-10 02:32:17.496196+08','2025-11-17 06:18:24.426183+08'),
-	 ('ade3fb74-0d5f-4806-825a-5cfba3ae5069','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:20.76756+08','2025-11-17 06:18:24.425624+08',618363658,'{}',NULL,NULL,'Session timeout after 1 minutes','2025-11-10 02:32:20.767882+08','2025-11-17 06:18:24.426183+08'),
-	 ('192aec3e-d113-4b45-8bce-312f80d550c8','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:20.779244+08','2025-11-17 06:18:24.425668+08',618363646,'{}',NULL,NULL,'Session timeout after 1 minutes','2025-11-10 02:32:20.779497+08','2025-11-17 06:18:24.42618+08'),
-	 ('653e46d7-2445-4695-b44f-7ef14c60a928','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:37.501129+08','2025-11-17 06:18:24.42571+08',618346924,'{}',NULL,NULL,'Session timeout after 1 minutes','2025-11-10 02:32:37.501997+08','2025-11-17 06:18:24.426182+08'),
-	 ('51b58249-332f-415a-a96d-f1457982cb4d','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:37.552693+08','2025-11-17 06:18:24.425751+08',618346873,'{}',NULL,NULL,'Session timeout after 1 minutes','2025-11-10 02:32:37.552923+08','2025-11-17 06:18:24.426182+08'),
-	 ('1bd05d4e-411c-47ee-931e-5eae377b54e0','agent-f11318ac','REBALANCING','failed','2025-11-10 02:33:47.802216+08','2025-11-10 02:33:47.878284+08',76,'{}',NULL,NULL,'''NoneType'' object has no attribute ''initialize''','2025-11-10 02:33:47.803446+08','2025-11-10 02:33:47.878284+08'),
-	 ('8d684999-5363-4c2b-a99b-330e6f344822','agent-f11318ac','REBALANCING','failed','2025-11-10 02:33:47.861546+08','2025-11-10 02:33:47.887384+08',25,'{}',NULL,NULL,'''NoneType'' object has no attribute ''initialize''','2025-11-10 02:33:47.861903+08','2025-11-10 02:33:47.887384+08'),
-	 ('857fdad4-fcdb-4980-8d4f-5a22c67510fa','agent-f11318ac','REBALANCING','failed','2025-11-10 02:34:29.581764+08','2025-11-10 02:34:29.619475+08',37,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 02:34:29.583965+08','2025-11-10 02:34:29.619475+08'),
-	 ('04aecaa5-0fe4-424c-81ac-6d6b20de4c18','agent-f11318ac','REBALANCING','failed','2025-11-10 02:34:29.586931+08','2025-11-10 02:34:29.624932+08',38,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 02:34:29.587294+08','2025-11-10 02:34:29.624932+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('bbdf46f6-a13e-431f-88d7-cd0fc0ce4bd6','agent-f11318ac','REBALANCING','failed','2025-11-10 02:34:58.613481+08','2025-11-10 02:34:58.63926+08',25,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 02:34:58.614086+08','2025-11-10 02:34:58.63926+08'),
-	 ('88246f26-31cd-49be-b928-61d837af904c','agent-f11318ac','REBALANCING','failed','2025-11-10 02:34:58.614408+08','2025-11-10 02:34:58.639871+08',25,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 02:34:58.614586+08','2025-11-10 02:34:58.639871+08'),
-	 ('ba2a2fc7-2993-4ffb-91d2-a42c9836593b','agent-f11318ac','REBALANCING','failed','2025-11-10 18:40:35.211711+08','2025-11-10 18:40:35.401304+08',189,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 18:40:35.227702+08','2025-11-10 18:40:35.401304+08'),
-	 ('3ace5816-46a2-40b7-826b-65368c951348','agent-f11318ac','REBALANCING','failed','2025-11-10 18:43:31.366042+08','2025-11-10 18:43:31.943804+08',577,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 18:43:31.369668+08','2025-11-10 18:43:31.943804+08'),
-	 ('46fa91ca-fddf-40c8-9eb2-b12e8e142ab9','agent-f11318ac','REBALANCING','failed','2025-11-10 18:55:08.880108+08','2025-11-10 18:55:08.923691+08',43,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 18:55:08.882136+08','2025-11-10 18:55:08.923691+08'),
-	 ('b6f6ccbd-2c14-456a-9143-463e6c09d2f8','agent-f11318ac','REBALANCING','failed','2025-11-10 22:16:28.399563+08','2025-11-10 22:16:31.867307+08',3467,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 22:16:28.406807+08','2025-11-10 22:16:31.867307+08'),
-	 ('18dd9456-91dc-4705-84f7-f533f03e2865','agent-f11318ac','TRADING','failed','2025-11-10 22:16:45.835373+08','2025-11-10 22:16:47.524957+08',1689,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 22:16:45.836977+08','2025-11-10 22:16:47.524957+08'),
-	 ('5f499766-e1a6-447c-ba29-0d0de2eff974','agent-f11318ac','REBALANCING','failed','2025-11-10 22:17:56.962454+08','2025-11-10 22:17:58.997437+08',2034,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 22:17:56.965435+08','2025-11-10 22:17:58.997437+08'),
-	 ('698e9c61-306a-4a88-924c-7e07b2e0e854','agent-f11318ac','TRADING','failed','2025-11-10 22:18:15.809298+08','2025-11-10 22:18:19.469724+08',3660,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 22:18:15.811345+08','2025-11-10 22:18:19.469724+08'),
-	 ('171ee9f7-6317-407b-8d58-7c68a307acb2','agent-f11318ac','REBALANCING','failed','2025-11-10 22:19:47.903224+08','2025-11-10 22:19:49.445307+08',1542,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 22:19:47.903811+08','2025-11-10 22:19:49.445307+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('82cf8cf6-0eca-4fe0-ab53-37fad38fc57e','agent-5e101682','TRADING','failed','2025-11-10 23:44:26.733961+08','2025-11-10 23:44:26.873993+08',140,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 23:44:26.742884+08','2025-11-10 23:44:26.873993+08'),
-	 ('fca8bcc8-31db-42d1-9040-b05bcbadd1ea','agent-5e101682','TRADING','failed','2025-11-10 23:44:48.440878+08','2025-11-10 23:44:48.795702+08',354,'{}',NULL,NULL,'''str'' object has no attribute ''initialize''','2025-11-10 23:44:48.443699+08','2025-11-10 23:44:48.795702+08'),
-	 ('d99dbe63-6514-4d76-922a-cc674f1241cd','agent-5e101682','TRADING','completed','2025-11-10 23:46:51.362141+08',NULL,NULL,'{}',NULL,NULL,NULL,'2025-11-10 23:46:51.364218+08','2025-11-10 23:46:51.374585+08'),
-	 ('64d254a9-9e7c-4b19-a81a-8bffac348fa7','agent-5e101682','TRADING','completed','2025-11-11 02:15:00.884949+08','2025-11-11 02:17:24.283289+08',143398,'{}',NULL,NULL,NULL,'2025-11-11 02:15:00.892102+08','2025-11-11 02:17:24.283289+08'),
-	 ('11d4151a-1103-4c5d-af45-46c333fb0b91','agent-5e101682','TRADING','completed','2025-11-11 02:19:55.57219+08','2025-11-11 02:21:46.272816+08',110700,'{}',NULL,NULL,NULL,'2025-11-11 02:19:55.573182+08','2025-11-11 02:21:46.272816+08'),
-	 ('f4684292-02a3-417e-a6f0-07f9369ed7b7','agent-5e101682','TRADING','completed','2025-11-11 02:37:29.716477+08','2025-11-11 02:37:43.898593+08',14182,'{}',NULL,NULL,NULL,'2025-11-11 02:37:29.719835+08','2025-11-11 02:37:43.898593+08'),
-	 ('9f268b8b-5fb2-4038-a7af-3f0d5b745e80','agent-5e101682','TRADING','completed','2025-11-11 02:39:01.120864+08',NULL,NULL,'{}',NULL,NULL,NULL,'2025-11-11 02:39:01.122263+08','2025-11-11 02:39:01.133402+08'),
-	 ('1e3df266-92e3-462c-9951-97f015701fce','agent-5e101682','TRADING','failed','2025-11-11 06:16:07.976197+08','2025-11-11 06:18:39.939646+08',151963,'{}',NULL,NULL,'Aborted: Agent stopped (was not in active_agents)','2025-11-11 06:16:07.977874+08','2025-11-11 06:18:39.941361+08'),
-	 ('cb7b4307-560a-4b96-b1d3-0847720a3909','agent-53ba0174','TRADING','completed','2025-11-11 06:25:55.662363+08','2025-11-11 06:32:12.45682+08',376794,'{}',NULL,NULL,NULL,'2025-11-11 06:25:55.663729+08','2025-11-11 06:32:12.45682+08'),
-	 ('59509dc8-cb01-40f4-9bd9-1e56e79a9784','agent-53ba0174','TRADING','completed','2025-11-11 06:33:58.960417+08','2025-11-11 06:40:06.845837+08',367885,'{}',NULL,NULL,NULL,'2025-11-11 06:33:58.961564+08','2025-11-11 06:40:06.845837+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('1429d59c-46d0-497f-bf00-f98e3f3f8fed','agent-5e101682','TRADING','completed','2025-11-11 06:56:39.25203+08','2025-11-11 06:58:43.382587+08',124130,'{}',NULL,NULL,NULL,'2025-11-11 06:56:39.257094+08','2025-11-11 06:58:43.382587+08'),
-	 ('9d4f4db3-541d-4930-be9d-a4bfcf84dd59','agent-53ba0174','REBALANCING','completed','2025-11-11 07:03:59.333296+08','2025-11-11 07:10:46.77521+08',407441,'{}',NULL,NULL,NULL,'2025-11-11 07:03:59.33511+08','2025-11-11 07:10:46.77521+08'),
-	 ('b1cb6fb5-7b25-4689-ac1c-eb804581beba','agent-f11318ac','TRADING','completed','2025-11-11 17:12:24.183152+08','2025-11-11 17:14:20.42726+08',116244,'{}',NULL,NULL,NULL,'2025-11-11 17:12:24.185743+08','2025-11-11 17:14:20.42726+08'),
-	 ('24b28d39-e8fd-4dbc-b1ba-029cbbc7f7ea','agent-f11318ac','TRADING','completed','2025-11-11 17:15:04.648472+08','2025-11-11 17:17:09.391846+08',124743,'{}',NULL,NULL,NULL,'2025-11-11 17:15:04.650752+08','2025-11-11 17:17:09.391846+08'),
-	 ('af803887-6774-4918-828f-f65f31563433','agent-53ba0174','TRADING','completed','2025-11-11 18:14:12.187884+08','2025-11-11 18:19:36.256296+08',324068,'{}',NULL,NULL,NULL,'2025-11-11 18:14:12.206039+08','2025-11-11 18:19:36.256296+08'),
-	 ('020aaa69-d197-4845-8587-97a8c5e4e6da','agent-43cc7808','TRADING','completed','2025-11-11 19:04:37.767175+08','2025-11-11 19:05:54.28362+08',76516,'{}',NULL,NULL,NULL,'2025-11-11 19:04:37.779401+08','2025-11-11 19:05:54.28362+08'),
-	 ('fec76b62-92f2-438b-b9a5-7fd201b1cb51','agent-43cc7808','TRADING','completed','2025-11-11 19:06:29.970263+08','2025-11-11 19:07:15.244799+08',45274,'{}',NULL,NULL,NULL,'2025-11-11 19:06:29.976643+08','2025-11-11 19:07:15.244799+08'),
-	 ('e41d17ed-d91a-4145-9440-fa77917bb014','agent-43cc7808','TRADING','completed','2025-11-11 19:09:30.69096+08','2025-11-11 19:09:49.54877+08',18857,'{}',NULL,NULL,NULL,'2025-11-11 19:09:30.693389+08','2025-11-11 19:09:49.54877+08'),
-	 ('4da68912-b2a8-4167-bf3e-a127c1ac7807','agent-43cc7808','TRADING','completed','2025-11-11 19:10:27.881395+08','2025-11-11 19:11:22.330596+08',54449,'{}',NULL,NULL,NULL,'2025-11-11 19:10:27.885092+08','2025-11-11 19:11:22.330596+08'),
-	 ('c7006255-9c24-453e-aec3-42852add52fc','agent-43cc7808','TRADING','completed','2025-11-11 19:35:50.437497+08','2025-11-11 19:36:26.302+08',35864,'{}',NULL,NULL,NULL,'2025-11-11 19:35:50.444749+08','2025-11-11 19:36:26.302+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('1f048cb6-3c3e-4679-a7b0-9f84b7aaf740','agent-43cc7808','REBALANCING','completed','2025-11-11 19:37:03.149049+08','2025-11-11 19:37:24.426748+08',21277,'{}',NULL,NULL,NULL,'2025-11-11 19:37:03.151354+08','2025-11-11 19:37:24.426748+08'),
-	 ('29572047-87a9-4c64-af9c-765db72b4a68','agent-43cc7808','TRADING','completed','2025-11-11 19:40:25.670474+08','2025-11-11 19:41:00.21801+08',34547,'{}',NULL,NULL,NULL,'2025-11-11 19:40:25.679792+08','2025-11-11 19:41:00.21801+08'),
-	 ('61832227-283f-4062-ae23-6a4cf9399ca8','agent-5e101682','TRADING','completed','2025-11-11 19:41:59.693757+08','2025-11-11 19:42:41.516279+08',41822,'{}',NULL,NULL,NULL,'2025-11-11 19:41:59.695417+08','2025-11-11 19:42:41.516279+08'),
-	 ('b0b5ddb6-8f19-4bf8-a8ed-9f3d223527f4','agent-53ba0174','TRADING','completed','2025-11-11 20:11:44.939444+08','2025-11-11 20:15:21.334812+08',216395,'{}',NULL,NULL,NULL,'2025-11-11 20:11:44.950827+08','2025-11-11 20:15:21.334812+08'),
-	 ('915690a6-b26d-49fc-82f6-e826a72a35b6','agent-43cc7808','TRADING','completed','2025-11-12 17:38:28.108215+08','2025-11-12 17:38:46.448202+08',18339,'{}',NULL,NULL,NULL,'2025-11-12 17:38:28.123154+08','2025-11-12 17:38:46.448202+08'),
-	 ('62c6689f-59f1-4fc4-85d7-c5c4c881a0d2','agent-43cc7808','TRADING','completed','2025-11-12 18:54:44.385681+08','2025-11-12 18:57:03.93101+08',139545,'{}',NULL,NULL,NULL,'2025-11-12 18:54:44.389688+08','2025-11-12 18:57:03.93101+08'),
-	 ('46f68168-ccff-4369-a999-c14265fa6ccc','agent-43cc7808','TRADING','completed','2025-11-12 19:09:56.196535+08','2025-11-12 19:11:24.751575+08',88555,'{}',NULL,NULL,NULL,'2025-11-12 19:09:56.198852+08','2025-11-12 19:11:24.751575+08'),
-	 ('25de0d50-5b14-461d-b5ce-e017debeda2e','agent-53ba0174','TRADING','completed','2025-11-12 19:20:30.214541+08','2025-11-12 19:22:47.273168+08',137058,'{}',NULL,NULL,NULL,'2025-11-12 19:20:30.22191+08','2025-11-12 19:22:47.273168+08'),
-	 ('193813d3-0e48-4745-97ac-e9b579c548af','agent-5e101682','TRADING','completed','2025-11-12 19:20:33.167098+08','2025-11-12 19:21:55.459781+08',82292,'{}',NULL,NULL,NULL,'2025-11-12 19:20:33.167799+08','2025-11-12 19:21:55.459781+08'),
-	 ('50326f1a-e451-4450-91cf-70bd90cb381a','agent-5e101682','TRADING','completed','2025-11-12 19:28:00.675429+08','2025-11-12 19:30:19.417341+08',138741,'{}',NULL,NULL,NULL,'2025-11-12 19:28:00.678027+08','2025-11-12 19:30:19.417341+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('cdb5ad2c-9b87-47c7-a218-7757e9f17cc0','agent-f11318ac','TRADING','completed','2025-11-12 19:28:03.422509+08','2025-11-12 19:29:12.210837+08',68788,'{}',NULL,NULL,NULL,'2025-11-12 19:28:03.426969+08','2025-11-12 19:29:12.210837+08'),
-	 ('6f1b8b1b-a425-47d1-ae96-0d6e8b028bca','agent-f11318ac','REBALANCING','completed','2025-11-13 01:49:31.742267+08','2025-11-13 01:50:55.845441+08',84103,'{}',NULL,NULL,NULL,'2025-11-13 01:49:31.748402+08','2025-11-13 01:50:55.845441+08'),
-	 ('b6bdbc5d-804d-4b92-8067-4288eb6fbf38','agent-5e101682','REBALANCING','completed','2025-11-13 01:49:34.144703+08','2025-11-13 01:52:51.179778+08',197035,'{}',NULL,NULL,NULL,'2025-11-13 01:49:34.145845+08','2025-11-13 01:52:51.179778+08'),
-	 ('20b8a1d7-a0b8-48ba-9978-be30e0f96866','agent-43cc7808','REBALANCING','completed','2025-11-13 01:49:37.14757+08','2025-11-13 01:49:49.793007+08',12645,'{}',NULL,NULL,NULL,'2025-11-13 01:49:37.147893+08','2025-11-13 01:49:49.793007+08'),
-	 ('a99589e3-5ff6-44a3-b0b4-0b621399f62b','agent-53ba0174','REBALANCING','completed','2025-11-13 01:49:39.262318+08','2025-11-13 01:52:41.874557+08',182612,'{}',NULL,NULL,NULL,'2025-11-13 01:49:39.264268+08','2025-11-13 01:52:41.874557+08'),
-	 ('2d3a5863-8ca5-48c2-afa1-fcb6a4bcf9e0','agent-43cc7808','TRADING','failed','2025-11-13 17:06:24.151345+08','2025-11-13 17:06:28.734504+08',4583,'{}',NULL,NULL,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-11-13 17:06:24.156658+08','2025-11-13 17:06:28.734504+08'),
-	 ('e4ecce9f-e8ac-449b-8b2e-f23262266201','agent-43cc7808','TRADING','completed','2025-11-13 17:13:16.020289+08','2025-11-13 17:14:43.74174+08',87721,'{}',NULL,NULL,NULL,'2025-11-13 17:13:16.021145+08','2025-11-13 17:14:43.74174+08'),
-	 ('38c0c6ab-938b-4d57-b2fd-58ef7e78b77e','agent-53ba0174','TRADING','completed','2025-11-13 17:13:46.390779+08','2025-11-13 17:15:59.819135+08',133428,'{}',NULL,NULL,NULL,'2025-11-13 17:13:46.391742+08','2025-11-13 17:15:59.819135+08'),
-	 ('80ab88d5-25e0-46aa-8446-40e8ced29d6f','agent-f11318ac','TRADING','completed','2025-11-13 17:30:35.439744+08','2025-11-13 17:33:18.226258+08',162786,'{}',NULL,NULL,NULL,'2025-11-13 17:30:35.446947+08','2025-11-13 17:33:18.226258+08'),
-	 ('bc5c35dc-cc04-4013-9736-b8016a446632','agent-5e101682','TRADING','completed','2025-11-13 17:30:37.381281+08','2025-11-13 17:31:56.146098+08',78764,'{}',NULL,NULL,NULL,'2025-11-13 17:30:37.382078+08','2025-11-13 17:31:56.146098+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('939daac4-563e-4e69-a162-753f2a40873c','agent-53ba0174','TRADING','completed','2025-11-13 17:35:03.781957+08','2025-11-13 17:51:57.296217+08',1013514,'{}',NULL,NULL,NULL,'2025-11-13 17:35:03.79007+08','2025-11-13 17:51:57.296217+08'),
-	 ('a881ab18-6a5d-4ca0-85fe-b14b3dd9b5e7','agent-43cc7808','TRADING','completed','2025-11-13 17:54:53.412492+08','2025-11-13 17:58:35.833368+08',222420,'{}',NULL,NULL,NULL,'2025-11-13 17:54:53.41381+08','2025-11-13 17:58:35.833368+08'),
-	 ('85fbc990-7cf4-4ab6-88cf-b531b07264cb','agent-f11318ac','TRADING','completed','2025-11-14 06:21:54.747216+08','2025-11-14 06:24:09.380395+08',134633,'{}',NULL,NULL,NULL,'2025-11-14 06:21:54.754725+08','2025-11-14 06:24:09.380395+08'),
-	 ('39ab3205-b0e3-4fe5-8593-2c55650b7980','agent-5e101682','TRADING','completed','2025-11-14 06:24:39.762475+08','2025-11-14 06:27:26.489301+08',166726,'{}',NULL,NULL,NULL,'2025-11-14 06:24:39.763442+08','2025-11-14 06:27:26.489301+08'),
-	 ('38595ad3-a1e1-460d-8e98-f576488edc16','agent-43cc7808','TRADING','completed','2025-11-14 06:29:29.97176+08','2025-11-14 06:30:36.888546+08',66916,'{}',NULL,NULL,NULL,'2025-11-14 06:29:29.974414+08','2025-11-14 06:30:36.888546+08'),
-	 ('6b137cfc-2710-47bf-90b0-4cce23feea20','agent-53ba0174','TRADING','completed','2025-11-14 06:30:47.970285+08','2025-11-14 06:43:22.6589+08',754688,'{}',NULL,NULL,NULL,'2025-11-14 06:30:47.971746+08','2025-11-14 06:43:22.6589+08'),
-	 ('6669e182-327b-4725-9d22-1ea3861d232a','agent-f11318ac','TRADING','completed','2025-11-14 18:26:32.298456+08','2025-11-14 18:27:32.455495+08',60157,'{}',NULL,NULL,NULL,'2025-11-14 18:26:32.309143+08','2025-11-14 18:27:32.455495+08'),
-	 ('b12c3839-cb1d-4238-a2c4-e5c39ee56e27','agent-5e101682','TRADING','completed','2025-11-14 18:51:58.861897+08','2025-11-14 18:53:02.684126+08',63822,'{}',NULL,NULL,NULL,'2025-11-14 18:51:58.872882+08','2025-11-14 18:53:02.684126+08'),
-	 ('6abf7daa-864f-4372-8619-fa546353486f','agent-f11318ac','TRADING','completed','2025-11-14 19:42:46.36521+08','2025-11-14 19:45:02.109255+08',135744,'{}',NULL,NULL,NULL,'2025-11-14 19:42:46.409711+08','2025-11-14 19:45:02.109255+08'),
-	 ('a3047d59-c280-48d2-8edf-d1bfb34c45b8','agent-43cc7808','TRADING','completed','2025-11-14 19:45:19.010318+08','2025-11-14 19:47:00.311736+08',101301,'{}',NULL,NULL,NULL,'2025-11-14 19:45:19.011949+08','2025-11-14 19:47:00.311736+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('4ed26f16-e712-408f-a3cf-ffe7a1e3cdd3','agent-53ba0174','TRADING','completed','2025-11-14 19:54:21.495878+08','2025-11-14 20:01:01.141721+08',399645,'{}',NULL,NULL,NULL,'2025-11-14 19:54:21.509426+08','2025-11-14 20:01:01.141721+08'),
-	 ('d7363970-9c8b-4a6f-9d54-1221604ae233','agent-43cc7808','TRADING','completed','2025-11-14 20:17:42.239867+08','2025-11-14 20:19:33.377811+08',111137,'{}',NULL,NULL,NULL,'2025-11-14 20:17:42.248734+08','2025-11-14 20:19:33.377811+08'),
-	 ('6cd69133-0df3-4d2e-8f12-075b0dce980f','agent-5e101682','TRADING','completed','2025-11-16 10:52:25.047424+08','2025-11-16 10:53:56.446266+08',91398,'{}',NULL,NULL,NULL,'2025-11-16 10:52:25.076152+08','2025-11-16 10:53:56.446266+08'),
-	 ('666c8313-f34d-4dd4-a9ca-b2496c556652','agent-43cc7808','TRADING','completed','2025-11-16 10:55:07.369131+08','2025-11-16 10:57:05.138168+08',117769,'{}',NULL,NULL,NULL,'2025-11-16 10:55:07.370221+08','2025-11-16 10:57:05.138168+08'),
-	 ('040a4332-f3bc-461d-a7bb-40d204f2bf1d','agent-f11318ac','TRADING','completed','2025-11-16 10:55:10.103618+08','2025-11-16 10:58:41.361459+08',211257,'{}',NULL,NULL,NULL,'2025-11-16 10:55:10.104476+08','2025-11-16 10:58:41.361459+08'),
-	 ('909544dd-9424-4aa3-8f0e-543989738c12','agent-53ba0174','TRADING','completed','2025-11-16 10:55:13.52914+08','2025-11-16 11:02:09.4146+08',415885,'{}',NULL,NULL,NULL,'2025-11-16 10:55:13.52957+08','2025-11-16 11:02:09.4146+08'),
-	 ('9f51c2fe-734f-4ced-bdd4-d5b6e838a1fd','agent-f11318ac','TRADING','completed','2025-11-16 21:45:52.428264+08','2025-11-16 21:48:50.661716+08',178233,'{}',NULL,NULL,NULL,'2025-11-16 21:45:52.432483+08','2025-11-16 21:48:50.661716+08'),
-	 ('22e7bdbb-3e9e-4b83-8ab6-72a5116ed393','agent-5e101682','TRADING','completed','2025-11-16 21:50:20.438438+08','2025-11-16 21:52:05.9782+08',105539,'{}',NULL,NULL,NULL,'2025-11-16 21:50:20.441175+08','2025-11-16 21:52:05.9782+08'),
-	 ('ca50b805-9cc5-4284-8985-a24ea8235460','agent-5e101682','TRADING','completed','2025-11-16 21:54:59.078526+08','2025-11-16 21:56:54.08079+08',115002,'{}',NULL,NULL,NULL,'2025-11-16 21:54:59.080512+08','2025-11-16 21:56:54.08079+08'),
-	 ('f436f0f9-d8a4-4721-b457-ceef66548633','agent-43cc7808','TRADING','completed','2025-11-16 23:39:33.038145+08','2025-11-16 23:42:24.255403+08',171217,'{}',NULL,NULL,NULL,'2025-11-16 23:39:33.053227+08','2025-11-16 23:42:24.255403+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('7e7a3b15-9d48-48ab-aa34-c687e22518b0','agent-53ba0174','TRADING','completed','2025-11-16 23:39:38.839216+08','2025-11-16 23:45:06.535875+08',327696,'{}',NULL,NULL,NULL,'2025-11-16 23:39:38.839818+08','2025-11-16 23:45:06.535875+08'),
-	 ('e5c378f9-fbec-4794-92d5-1b109a6a581e','agent-43cc7808','TRADING','completed','2025-11-16 23:43:58.021853+08','2025-11-16 23:45:24.809532+08',86787,'{}',NULL,NULL,NULL,'2025-11-16 23:43:58.023805+08','2025-11-16 23:45:24.809532+08'),
-	 ('11fa91c2-1495-4ef9-ac5f-16b889e702fc','agent-5e101682','TRADING','completed','2025-11-16 23:46:59.324399+08','2025-11-16 23:47:16.911911+08',17587,'{}',NULL,NULL,NULL,'2025-11-16 23:46:59.327148+08','2025-11-16 23:47:16.911911+08'),
-	 ('1d033af6-d260-486e-821e-2c895fca1b87','agent-5e101682','TRADING','completed','2025-11-17 04:24:44.617422+08','2025-11-17 04:26:30.748881+08',106131,'{}',NULL,NULL,NULL,'2025-11-17 04:24:44.629698+08','2025-11-17 04:26:30.748881+08'),
-	 ('edc69551-d618-4e9b-9dea-89f1b5f74d9f','agent-5e101682','REBALANCING','completed','2025-11-17 08:27:06.321854+08','2025-11-17 08:29:26.758682+08',140436,'{}',NULL,NULL,NULL,'2025-11-17 08:27:06.324009+08','2025-11-17 08:29:26.758682+08'),
-	 ('f1e61ec6-38e6-4408-968b-82a1d708d666','agent-43cc7808','REBALANCING','completed','2025-11-17 08:40:50.210278+08','2025-11-17 08:41:17.015936+08',26805,'{}','【投資組合重新平衡分析報告】
-(分析日期：2025-11-17)
-
-一、技術面評估
-目前持有四檔股票（台積電2330、元大台灣50 ETF 0050、來億-KY 6890、國泰金控2882），皆呈多頭格局，技術指標（MA、RSI、MACD、KD）一致偏強，且股價普遍高於各期均線，量價結構穩定，短期市況適合順勢操作。若大盤突現拉回，則以ma20或布林帶下緣為重要防守。技術面無明顯轉弱訊號，短時間不需大幅調節。
-
-二、風險評估
-1. 持股集中度：單檔持股（如台積電、國泰金控）均未超出總投資組合市值的50%上限，分散於科技、金融、大型ETF及中小型個股，產業分散度良好。
-2. 波動風險：來億-KY雖動能佳但歷史流動性及波動性較高，前次已降低部位，目前控管得宜。
-3. 現金比例：現金持有比重高達60.7%，意味資產防禦力強，應對突發市況具備高度彈性，但此比例略高，若市況持續偏多可分批增持績優股或ETF以提高資產運用效率。
-
-三、調整建議
-目前組合偏防禦，持股技術面皆強且分散度尚可，無須大幅調整。若需主動優化：
-- 可於大盤回檔測試支撐時，分批增持ETF（0050）或強勢股，降低現金比重至45~55%，提高整體報酬預期。
-- 來億-KY如量縮或情緒逆轉宜續減碼，維持流動性風險控管。
-- 若現有持股上漲幅度過大，建議預留獲利了結及稅務空間，避免集中風險。
-
-註：調整應考慮交易成本及稅務（如證券交易稅），分批操作可降低衝擊。
-
-總結：目前持股穩健，短線無需急調，但現金過高可視市況適度調整分批布局，維持全天候資產分散優勢與防禦力。',NULL,NULL,'2025-11-17 08:40:50.211872+08','2025-11-17 08:41:17.015936+08'),
-	 ('78ae7b0e-3074-475e-9a9a-70f80b05b880','agent-f11318ac','TRADING','completed','2025-11-17 20:39:47.293573+08','2025-11-17 20:41:36.750359+08',109456,'{}','### **交易決策：賣出鴻海 (2317) 以實現獲利並優化投資組合結構**
-
-**日期：** 2025-11-17
-
-**分析師：** agent-f11318ac
-
-#### **1. 總體評估與機會分析**
-
-基於我「耐心、紀律、常識」的投資哲學，我持續檢視投資組合，尋求長期穩健的回報。目前我的投資組合股票佔比高達 99.1%，其中鴻海 (2317) 的持股比例接近 25%，已構成顯著的集中度風險。近期市場對鴻海的評價已反映其價值，股價來到一個相對高點，這為我提供了一個執行紀律、實現部分獲利並重新平衡投資組合的絕佳機會。
-
-*   **標的評估（多面向分析）：**
-    *   **風險面**：透過 `risk_analyst` 評估，我確認鴻海的持股比例（24.8%）雖未觸及 30% 的上限，但已是單一公司的最高持股。適度減碼有助於降低個股波動對整體績效的衝擊，符合我穩健的投資原則。
-    *   **機會識別**：考量到我的平均成本為 249.5 元，而目前市場價格為 250 元，雖然獲利空間不大，但此時賣出主要目的在於執行風險控管，回收資金以尋找更具成長潛力或防禦性的標的，進一步優化整體資產配置。
-
-#### **2. 風險評估與部位規劃**
-
-在做出賣出決策前，我已進行了嚴格的紀律審查。
-
-*   **持股檢視：** 我目前持有 10,000 股鴻海股票，有足夠的股數可供賣出。
-*   **價格確認：** 透過 `get_stock_price_tool`，我已確認鴻海 (2317) 的即時可交易價格為 **250.0 元**。
-*   **部位規劃：** 為了顯著降低集中度風險並回收一筆可觀的現金，我決定賣出 5,000 股（即持股的一半）。
-    *   **交易金額**：`5,000 股 * 250.0 元/股 = 1,250,000 元`。
-    *   **交易後影響**：此交易將使我的現金部位大幅提升，為未來的投資佈局提供充足彈性。同時，鴻海的持股比例將降至約 12.4%，回到一個更為健康的水平。
-
-#### **3. 核心決策與執行**
-
-綜合以上分析，我決定執行賣出交易，實現部分獲利並優化投資組合的風險結構。
-
-**決策：** 執行賣出交易，減持鴻海 (2317) 的持股部位。
-
-**執行細節：**
-*   **標的：** 2317 (鴻海精密工業股份有限公司)
-*   **動作：** 賣出 (SELL)
-*   **數量：** 5,000 股
-*   **價格：** 250.0 元
-*   **工具：** `execute_trade_atomic_tool` (確保交易的原子性與數據一致性)
-
-**決策理由：**
-本次交易的核心目的在於**紀律性地執行風險管理**。鴻海的持股比例已接近我的個人風險上限，雖然基本面穩固，但過於集中將使投資組合暴露於不必要的個股風險之中。在目前價格合適的時機，透過賣出 5,000 股鴻海股票，我能夠實現部分利潤，並將回收的 1,250,000 元現金用於未來更有利的投資機會。這項決策完全符合我「耐心等待，紀律操作」的投資理念，旨在建立一個更均衡、更具韌性的長期投資組合。
-
-#### **4. 未來觀察計畫**
-
-交易完成後，我仍將鴻海視為重要的核心持股之一，並持續關注其在電動車、半導體等新領域的發展。回收的現金將暫時停泊，我會耐心觀察市場，尋找符合我「永遠賺錢的公司」標準的下一個優質標的。',NULL,NULL,'2025-11-17 20:39:47.331339+08','2025-11-17 20:41:36.750359+08'),
-	 ('b2e113fb-6c97-42e2-95e6-560d715a479a','agent-5e101682','TRADING','completed','2025-11-17 20:40:11.791192+08','2025-11-17 20:40:45.529137+08',33737,'{}','交易已執行（已記錄與更新投組）：
-
-- 動作：SELL 2330（台積電）1,000 股
-- 價格：1445.0 元／股
-- 成交總額：1,445,000 元
-- 已記錄手續費：2,059.12 元
-- 交易後投組（系統更新）：
-  • 現金：5,984,158.67 元（59.9%）
-  • 股票市值：3,999,213.60 元（40.1%）
-  • 投組總值：9,983,372.27 元
-  • 2330 持股：1,000 股，市值 1,447,500（約 14.5% 的權重）
-
-500字以內決策摘要（含分析、判斷、風險）：
-考量：投組先前對台積電(2330)之直接與間接敞口過高（直接約29%，加上指數持股的實質暴露接近或超過30%），偏離自訂單一股上限與多元化目標。分析流程：檢視持股分布→估算實質敞口（包含 0050 內含比重）→衡量現金比例與流動性需求→確認即時市價 1445 元。判斷與執行：採一次性賣出 1,000 股（以市價執行）作為穩健快速降風險的方案，可顯著降低非系統性風險並保留充足現金以捕捉未來機會。風險考量：賣出可能錯失短期漲幅，但相對換取更佳資產配置與流動性；賣出量為整張（避免 odd-lot 流動性/成本劣勢）。結論：交易符合集合風險限制（單一股遠低於 40% 上限）、符合流動性與執行效率的取捨，並為後續再平衡或部署國際資產/防禦性配置留下空間。
-
-下一步建議（選項）：
-- 保持現金觀望 5–10% 的短線入場機會，或
-- 部分資金增持國際/不同產業 ETF 分散系統性風險，或
-- 若欲更精準達到 20% 目標，考慮以 odd-lot 微調或賣出部分 0050（我可擬定分批下單方案與成本估算）。
-
-若你同意，我可立刻提出分批執行細節（若要分天/限價/VWAP），或擬定現金再部署的具體標的與配置比例。',NULL,NULL,'2025-11-17 20:40:11.792971+08','2025-11-17 20:40:45.529137+08'),
-	 ('152abac8-432e-4770-ab08-92c5714cfbb4','agent-43cc7808','TRADING','completed','2025-11-17 20:40:30.17457+08','2025-11-17 20:41:16.793836+08',46619,'{}','【台股投資組合全方位評估摘要】
-
-一、現況分析
-- 現金持有超過60%，資產防禦力佳，投資組合偏向低波動、多元分散（科技/金融/ETF/消費）。
-- 即時股價：台積電 1430.0、0050 ETF 61.9、來億-KY 243.0、國泰金控 66.0
-- 各持股技術面普遍強勢，均處多頭排列，MACD、RSI皆未過熱，KD、布林帶也有支撐。近期未見明顯轉弱。
-
-二、風險與策略建議
-- 台積電、來億-KY本益比偏高、波動率高，產業波動風險大但基本面以台積電最穩健；來億-KY流動性需管控。
-- ETF（0050）持有量多、波動風險低，是資產主力配置，適合分批增持提升資金運用效率。
-- 國泰金控短線偏強，金融防禦力佳，股息穩定，適合持續觀察。
-- 單股持股分散皆未超過組合市值50%，分散度良好。
-
-三、結論與初步動向
-- 市場仍維持偏多，持股可續抱；現金部位略高，宜分批加碼ETF或績優大型股，將現金比重適度降至45~55%。
-- 強勢多頭不追高，僅在回檔到技術支撐（如0050月均線及台積電MA20/布林帶下緣等）時分批進場。
-- 持有來億-KY的量縮須續控部位，0050及台積電若挑戰前高/突增量可考慮分批獲利了結。
-
-如需立即執行加碼或減碼，請指定標的與操作方向（如「加碼0050 3000股」）；否則將維持現狀、繼續觀察盤勢與風險。',NULL,NULL,'2025-11-17 20:40:30.176074+08','2025-11-17 20:41:16.793836+08'),
-	 ('d4a42497-57bd-4438-90ca-acac84bdcda1','agent-53ba0174','TRADING','completed','2025-11-17 20:40:37.352781+08','2025-11-17 20:46:18.556641+08',341203,'{}','### 交易決策結論
-
-**當前狀態**：組合總值約721萬（現金約21.8萬元，股票市值約699.4萬元，股票占比約97%）。持股2330（台積電）2500股，市值約357.5萬元；0050（元大台灣50）16000股，市值98.7萬元；2454（聯發科）1000股，市值123萬元；2308（台達電）1000股，市值92.2萬元；2382（廣達）1000股，市值27.95萬元。HHI約0.32，中等集中，單股最高占比約51.1%，符合70%限額。
-
-**分析過程**：情緒分析顯示市場中性46/100，資金流入AI/半導體部門，正面新聞支撐，潛在轉折若信念強化上漲循環。技術面2330上升趨勢強（信心75%），2382買進訊號（信心68%）；0050/2454買進（70%/65%），2308觀望（50%）。基本面2330買入強（信心85%，財務卓越，AI成長）；2382買入（信心75%，伺服器需求）；2454/0050買入/持有；2308持有。風險評估組合低（5/10），VaR0，回撤0%，壓力測試損失0，建議減碼2330分散至2382，降低科技集中（電子占比降至約85%），風險控管優化。2330占比降至51.1%<70%。
-
-**市場判斷**：基於反身性理論，情緒從恐懼轉中性，資金平衡可能觸發自我實現上漲，AI熱潮作為轉折點適合重倉捕捉。若情緒惡化或技術確認下跌，毫不猶豫撤退。
-
-**風險考量**：賣出2330 2000股@1430，收入約286萬元；買入2382 1000股@279.5，成本約28萬元。VaR維持0，回撤0，組合股票占比升至97%，分散提升，風險在可接受範圍。監控情緒與技術訊號，停損設單股跌10%。
-
-**交易決策**：執行賣出2330 2000股和買入2382 1000股，分散風險同時捕捉AI供應鏈轉折，風險在可接受範圍。
-
-（字數：298）',NULL,NULL,'2025-11-17 20:40:37.354441+08','2025-11-17 20:46:18.556641+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('ce3e2fbb-21ea-46b0-8872-f834cc1fed80','agent-f11318ac','TRADING','failed','2025-11-17 20:47:44.162527+08','2025-11-17 20:48:41.925333+08',57762,'{}',NULL,NULL,'"''error''"','2025-11-17 20:47:44.164647+08','2025-11-17 20:48:41.925333+08'),
-	 ('fd4e5c5f-7f7d-48f8-8579-deeb95339ad0','agent-f11318ac','REBALANCING','completed','2025-11-18 01:07:09.072095+08','2025-11-18 01:08:51.17107+08',102098,'{}','### **投資組合重新平衡分析與建議**
-
-**分析師：** agent-f11318ac
-**日期：** 2025-11-17
-
-#### **1. 總體評估與風險識別**
-
-根據我「耐心、紀律、常識」的投資哲學，我對當前投資組合進行了全面檢視。目前投資組合呈現以下幾個關鍵特徵：
-
-*   **股票持倉過高**：股票佔總資產比例高達 99.1%，而現金比例僅 0.9%。這使得投資組合暴露在較高的市場波動風險下，同時也缺乏流動性，若市場出現回檔或有新的投資機會，將難以靈活應對。
-*   **持股集中度偏高**：鴻海 (2317) 和聯發科 (2454) 的持股市值分別佔投資組合的 24.9% 和 24.8%。雖然尚未觸及 30.00% 的單一持股上限，但此等權重已構成顯著的集中度風險。任何一檔股票的劇烈波動都可能對整體績效產生不成比例的巨大影響。
-
-綜合來看，當前組合的風險結構已偏離我穩健、紀律的投資原則。為了追求長期且可持續的回報，執行重新平衡、降低風險是當務之急。
-
-#### **2. 重新平衡策略與建議方案**
-
-考量到過往決策中已點出對鴻海高持股比例的擔憂，且當前價格（250.0 元）仍處於適合實現獲利的區間，我建議優先處理此標的以優化投資組合。
-
-**核心建議：減持鴻海 (2317)，提升現金水位，降低集中度風險。**
-
-*   **標的**：鴻海 (2317)
-*   **建議操作**：賣出
-*   **建議數量**：**5,000 股**
-
-**理由闡述：**
-1.  **執行風險紀律**：賣出 5,000 股可將鴻海的持股比例從約 24.9% 顯著降低至健康的水平（約 12.4%），符合我嚴格的風險控管原則。
-2.  **提升現金部位**：以當前市價 250.0 元計算，此交易預計可回收約 1,250,000 元現金。這將大幅改善投資組合的流動性，使現金比例提升至約 12.5%，讓我們在未來面對市場變化時能保有更多彈性與主動權。
-3.  **實現部分獲利**：此舉能在股價處於相對高位時鎖定部分利潤，將帳面價值轉化為實際現金，為未來的價值投資佈局儲備銀彈。
-
-#### **3. 未來觀察與總結**
-
-本次重新平衡的建議，旨在將投資組合拉回更穩健、更具防禦性的軌道。交易完成後，回收的現金將暫時停泊，我會耐心觀察市場，尋找符合我「永遠賺錢的公司」標準的下一個優質標的，或在市場過度修正時加碼現有核心持股。
-
-**重要提示**：此為基於當前市場狀態的分析建議。實際執行交易前，應在「TRADING 模式」下再次確認即時股價，並使用 `execute_trade_atomic_tool` 以確保交易的準確與一致性。交易成本與稅務（證券交易稅 0.3%）也應納入實際執行的考量。',NULL,NULL,'2025-11-18 01:07:09.119705+08','2025-11-18 01:08:51.17107+08'),
-	 ('82bfdc46-4052-4382-95ef-443bc0ae937d','agent-f11318ac','TRADING','completed','2025-11-18 01:11:58.892173+08','2025-11-18 01:12:56.316333+08',57424,'{}','好的，交易已執行。
-
-### **投資組合重新平衡：減持鴻海 (2317)**
-
-**1. 交易決策與執行**
-
-基於先前「耐心、紀律、常識」的投資原則及對當前投資組合的風險評估，我已執行減持鴻海 (2317) 的交易指令。考量到持股過度集中（佔比約 24.9%）與現金水位過低（約 0.9%）所帶來的風險，本次交易旨在將投資組合調整至更穩健的結構。
-
-*   **標的**：鴻海精密工業股份有限公司 (2317)
-*   **操作**：賣出
-*   **數量**：5,000 股
-*   **價格**：236.0 元
-
-**2. 決策理由與市場判斷**
-
-本次交易的核心目的在於**風險管理**，而非看空鴻海的長期價值。決策理由如下：
-
-*   **降低集中度風險**：賣出 5,000 股後，鴻海在投資組合中的佔比將顯著下降至約 12.4%，有效分散了單一持股的過度曝險，使整體資產配置更加均衡，符合我嚴格的風險控制紀律。
-*   **提升現金水位與流動性**：此交易回收了 1,180,000 元現金，將投資組合的現金比例大幅提升至約 12.6%。這不僅增強了投資組合的防禦能力，也為未來市場若出現修正或新的價值投資機會時，提供了充足的「銀彈」與操作彈性。
-*   **實現部分獲利**：在相對理想的價位鎖定部分利潤，將帳面價值轉化為實際現金，是穩健投資策略的一環。
-
-**3. 風險考量與未來展望**
-
-完成此次重新平衡後，投資組合的風險結構已獲得優化。我將暫時持有這筆現金，並持續以我一貫的耐心，觀察市場動態，尋找下一個符合「能永遠賺錢」標準的優質企業。這次調整是為了走更長遠的路，確保在多變的市場環境中，我們始終保有主動權與應變能力。',NULL,NULL,'2025-11-18 01:11:58.897144+08','2025-11-18 01:12:56.316333+08'),
-	 ('eed67c54-74d0-4ebb-9333-0de42a3e98d1','agent-43cc7808','TRADING','completed','2025-11-18 02:16:43.335642+08','2025-11-18 02:18:54.71775+08',131382,'{}','【投資決策摘要—台股全面評估】
-
-一、現況與市場分析
-- 目前現金部位偏高（60%以上），資產組合分散，四檔持股均低於不超過50%限制，防禦力佳但進帳效率偏低。
-- 盤面短線修正明顯，大盤回檔在即，技術指標（MA、MACD、KD、RSI、布林帶）維持多頭但量縮整理，主流標的（2330台積電、0050、2882國泰金、6890來億-KY）多為整理局面。
-- 現貨價：台積電1445、0050 ETF 61.9、來億-KY 241、國泰金控65.3
-
-二、分析結論與策略
-- 基本面：台積電、0050長期成長性最強，國泰金控防禦及股息優勢明顯；來億-KY波動率較高但可小量配置。多數個股估值偏合理、財務穩健。
-- 市場情緒：資金氛圍謹慎，多數人在觀望，外資態度未明朗，短期利多未明顯，但未見明確悲觀風險。
-- 風險：回檔風險上升，持股結構分散可降低波動衝擊，但仍需嚴控科技、ETF單一曝險比例與及時應對短線急跌。
-
-三、操作決策
-- 現在不宜大幅追高，建議現金逐步加碼優質ETF（0050）與台積電，分批進場以降低均價並提升資產運用效率。短線以台積電1400~1430元、0050 60.2元為優先加碼點，以量化風險與優化配置，單一持股不超過組合市值30%。
-- 國泰金控可維持原部位，適時觀察股息表現與政策面動向。
-- 來億-KY維持小量觀察，波動偏大不建議增加部位。
-
-【決策理由】
-市場雖有短線修正風險，但大盤結構與主流個股技術面仍強。以分批加碼配置0050、台積電，既能提升現金效率又兼顧防禦與長期成長。考量現階段回檔風險，分散配置、保留部份現金機動性，有利攻守兼備；操作後持股比例仍將控制於安全區間。
-
-【執行交易建議】
-→ 下單加碼0050 ETF 3000股（現價61.9元，分散平均成本，有效提升配置效益）
-→ 下單加碼台積電1000股（現價1445元，分批吸收盤中回檔）
-
-請確認是否立即執行上述買入動作（0050 ETF 3000股＋台積電1000股），或調整加碼數量/標的。',NULL,NULL,'2025-11-18 02:16:43.339503+08','2025-11-18 02:18:54.71775+08'),
-	 ('18c3dc3e-ed7a-421d-b0f3-129f57577e46','agent-5e101682','TRADING','completed','2025-11-18 03:06:52.256406+08','2025-11-18 03:08:38.055186+08',105798,'{}','已依流程以原子交易執行買入，以下為交易回報與500字以內決策摘要。
-
-交易執行（已完成，原子性）
-- 動作：BUY 2330（台積電）1,000 股
-- 成交價：1,445.00 元（使用當前市價）
-- 手續費：2,059.12 元
-- 本次實際成本（含手續費）：1,447,059.12 元
-- 執行工具：execute_trade_atomic()
-
-交易後即時投組（已更新）
-- 2330 持股：2,000 股，平均成本（含費用）：約 1,447.28 元／股
-- 其他持股不變（2881、0050）
-- 現金：5,984,158.67 − 1,447,059.12 = 4,537,099.55 元
-- 股票市值（以成交價 1,445 計）：5,441,713.60 元
-- 投組總值：9,978,813.15 元
-- 2330 佔比：約 28.97%（仍低於 40% 上限）
-
-決策摘要（分析、判斷、風險；≈250字）
-分析流程：先取即時價格（1445），並由基本面、技術面與風險三位子 Agent 評估。基本面：台積電營收與獲利強勁、製程與產業地位領先，適合中長期持有；技術面顯示近期價位在關鍵支撐區，流動性充足；風險評估指出買後投組集中度會從約14–29%（依不同估值口徑）提升至約29%，但仍在可接受範圍內且現金充足。綜合判斷：在現金比重偏高且看好中長期成長動能（AI/HPC 驅動、製程優勢）的前提下，回補 1,000 股可提升組合成長性與把握結構性機會。
-
-風險與控管：
-- 主要風險：集中風險（大客戶/產業週期）、高 CapEx 下的現金流波動、短期價格震盪。
-- 建議控管：採分批加碼或定期定額（DCA）；設定分階段停損（建議首檔 10–12%、次檔 15%）；考慮用 put 或 put-spread 做成本上限保護（若可用）；持續監控 CapEx 進度、主要大客戶出貨/訂單變化與季報表現。
-- 成本/稅費考量已納入（交易已扣手續費）。
-
-後續建議（可選執行）
-- 我可幫你設定分階段加碼/停損指令（例如三段 DCA 或分階段止損），或模擬不同下跌情境的每日 VaR / 最大回撤；或設監控警示（CapEx、主要客戶出貨、季度 EPS 差異）。請告訴你優先要我做哪項。',NULL,NULL,'2025-11-18 03:06:52.274924+08','2025-11-18 03:08:38.055186+08'),
-	 ('32823a1f-7dd7-4eae-ad15-5cd28fa295b6','agent-f11318ac','REBALANCING','completed','2025-11-18 06:20:25.625513+08','2025-11-18 06:21:03.754259+08',38128,'{}','我已取得最新的投資組合狀態。目前總值為 9,968,815.79 元，現金比例為 12.7%，股票比例為 87.3%。
-
-持股明細及佔總資產比例如下：
-- **聯發科 (2454):** 24.98%
-- **中華電信 (2412):** 19.79%
-- **統一 (1216):** 15.33%
-- **台積電 (2330):** 14.70%
-- **鴻海 (2317):** 12.51%
-
-所有持股均未超過 30.00% 的上限。現金水位處於健康水平，提供了足夠的防禦和未來投資的彈性。上次減持鴻海後，集中度風險已有效降低。
-
-基於「耐心、紀律、常識」的投資原則，我認為目前的資產配置均衡，無需立即進行大規模調整。這些公司都具備穩定的現金流與強大的市場地位，符合我的長期投資標準。
-
-我將持續觀察市場，等待更具吸引力的投資機會或現有持股基本面發生重大變化時，再考慮調整。
-
-### **投資組合重新平衡分析報告**
-
-**1. 投資組合現況評估**
-
-根據截至 2025-11-17 的數據，目前投資組合結構穩健，總值約 997 萬元，現金比例為 12.7%。經過上次對鴻海 (2317) 的減持調整後，個股集中度風險已顯著降低。目前佔比最高的聯發科 (2454) 為 24.98%，處於可接受範圍，並未觸及 30% 的上限。
-
-**2. 核心持股分析與決策**
-
-- **聯發科 (2454)** 與 **台積電 (2330)**：作為半導體產業的龍頭，兩者基本面強勁，符合「永遠賺錢」的標準，應繼續持有。
-- **中華電信 (2412)** 與 **統一 (1216)**：皆為具備強大護城河的內需型企業，提供穩定的現金流與防禦性，是投資組合中的壓艙石。
-- **鴻海 (2317)**：持股比例已降至 12.51%，風險可控。
-
-**3. 結論與建議**
-
-當前投資組合的配置符合「耐心、紀律」的投資哲學，風險分散且結構健康。現金水位充足，賦予我們在市場波動時的應變能力與未來捕捉良機的彈性。
-
-**因此，我建議「不進行任何調整」，繼續持有現有資產。** 我們應保持耐心，讓這些優質企業的價值隨時間成長。除非市場出現劇烈變化或公司基本面發生質變，否則無需頻繁交易。此次分析結論是：維持現狀，靜待花開。',NULL,NULL,'2025-11-18 06:20:25.632424+08','2025-11-18 06:21:03.754259+08'),
-	 ('ec77f972-0a57-45a2-92ab-5984e2ce7a65','agent-5e101682','REBALANCING','failed','2025-11-18 06:20:28.504933+08','2025-11-18 06:27:59.48493+08',450979,'{}',NULL,NULL,'Aborted: Agent stopped (was not in active_agents)','2025-11-18 06:20:28.50575+08','2025-11-18 06:27:59.493081+08'),
-	 ('e8025665-6c16-43f8-a016-1795fbc27af2','agent-43cc7808','REBALANCING','completed','2025-11-18 06:20:31.109391+08','2025-11-18 06:21:21.095072+08',49985,'{}','【投資組合重新平衡分析報告】
-
-一、技術面狀況
-- 台積電（2330）目前處於月線整理、短線反彈但力道不強，大致區間橫盤，尚未明顯突破1450~1460元壓力。短線建議觀察1400元支撐，僅於回測不破時小量加碼，若跌破則考慮減碼。未見急需調整訊號。
-- 0050 ETF同樣處於整理格局，月線支撐良好且波動低，只能小量低吸，不宜大舉加碼，若跌破61元則需減碼。技術面偏中性，目前部位可維持。
-- 國泰金控（2882）近期跌破均線，短線進入弱勢修正，建議暫保守持有，若跌破64元則建議減碼避險。
-- 來億-KY（6890）波動率高，量能平淡，技術面不構成明顯加碼/減碼指示，維持觀察。
-
-二、風險結構評估
-- 單一持股曝險未違反50%上限，唯國泰金控占比將近三成，電子產業曝險集中，產業分散度有改善空間。
-- 整體持股分散性尚可，四檔權重相對均衡，尚未形成極端偏重；但現金比例高（約60%），防禦力佳卻使投資效率偏低。
-- 預估年化波動率約25%，屬中度風險，最大回檔風險可控。全天候策略建議股票比例降至70%以下、現金增至10~20%、另可納入債券或黃金等非股資產。
-
-三、調整建議與注意事項
-- 若期望提升資產運用效率，可逐步加碼0050或台積電。但考量目前未有強烈技術指標加碼訊號，分批進場為宜，不宜激進“滿手”。
-- 國泰金控與6890不建議擴大部位，並關注短線下跌風險，設停損警戒。
-- 建議維持高現金部位以保機動性，規避突發市場回檔；若要增加持股，注意短線盤勢和進場時點，降低平均成本，並評估交易成本及套利稅負影響。
-
-四、結論
-- 組合分散度合理、現金防禦力足，但資產效率略低，除非出現明確多頭突破，暫不宜大幅調整。可續保持現金為主，關注技術指標轉強再分批加碼台積電或0050，避免重押單一產業。
-- 建議持續觀察盤勢、動態調整，進場必記交易成本與稅負。
-
-如需執行實際交易，請切換至TRADING模式。',NULL,NULL,'2025-11-18 06:20:31.110519+08','2025-11-18 06:21:21.095072+08'),
-	 ('a8869ae3-183e-4d17-9041-1b4b7b41d9e0','agent-53ba0174','REBALANCING','failed','2025-11-18 06:20:33.475193+08','2025-11-18 06:28:07.862795+08',454387,'{}',NULL,NULL,'Aborted: Agent stopped (was not in active_agents)','2025-11-18 06:20:33.478345+08','2025-11-18 06:28:07.863834+08'),
-	 ('272f2feb-b452-4743-9bfe-479eb4f627b3','agent-5e101682','REBALANCING','completed','2025-11-18 06:28:22.509364+08','2025-11-18 06:29:49.602636+08',87093,'{}','以下為重新平衡分析與具體建議（摘要 ≤500字；不執行交易，僅為建議）。
-
-一、當前重點摘要（截至 2025-11-17）
-- 總值：9,981,313 元；現金 4,537,099 元（45.5%）；股票 5,444,214 元（54.5%）。
-- 三檔持股：2330 台積電 市值 ≈2,892,500（約 29%）；2881 富邦金 ≈826,200；0050 ≈1,710,668。
-- 交易成本假設：賣方交易稅 0.3% + 佣金約 0.1425%（合計 ≈0.44%），滑價視執行方式另增。
-
-二、風險判斷
-- 集中風險：2330 佔比 29%，雖低於 40% 上限，但屬「偏高集中」。單一公司 idiosyncratic risk（製程/客戶/地緣等）可能造成超出市場波動的損失。
-- 流動性：整體流動性充足（高現金、0050/2330 交易量大），短期能以分批方式執行減碼。
-- 壓力測試：若股票全體下跌 10% / 20%，組合總值分別降約 5.45% / 10.9%。若僅 2330 下跌 20%，組合降約 5.8%。
-
-三、技術面結論（子 Agent 摘要）
-- 2330：短線在 1430 支撐、1460 阻力。流動性佳。技術建議：持有（若想降波動可於 1370–1400 分批減碼或設定停損）。
-- 2881：短期偏弱但流動性良好。技術建議：持有（若破 88–87 可考慮減碼）。
-- 0050：ETF 波動分散、流動性極佳。技術建議：增碼（觀察），適合做為分散/穩定核心部位。
-
-四、具體再平衡建議（可選方案）
-- 保守方案（建議採用）：把 2330 從 29% 降至 20%。
-  - 目標 2330 市值 ≈1,996,263；需賣出市值 ≈896,237（售出後淨入現金約 891k，扣估算手續/稅 ≈4.9k）。
-  - 資金用途建議：將賣出資金分批投入（示例）— 40% 國內大盤 ETF、40% 國際分散 ETF、20% 防禦型/高息工具或短期債券ETF。
-- 平衡/積極方案：若偏風險承受，可降至 15%（需賣 ≈1.395M，交易成本約 6.2k），並把資金更分散於美股/全球/防禦資產。
-
-五、執行與風控建議（因本模式不可執行）
-- 分批賣出（2–4 份，VWAP 或限價、避免一次性大筆市價單以降低滑價）。
-- 設定階段性停損（例：首檔 10–12%，次檔 15%）與再平衡觸發：單一持股佔比超過設定門檻（建議 20% 或 25%）即提示檢視。
-- 成本與稅務：預估佣金+交易稅合計約 0.44%（視券商而異）；台灣個人資本利得稅請依最新法規或稅務顧問確認。
-
-六、結論（建議）
-優先採用保守方案（將 2330 降至 20%），並把資金分散投入 ETF/防禦商品以降低 idiosyncratic risk，同時保留較高現金水位以把握機會或作為緊急緩衝。若您同意，我可為您：1) 製作分批賣出與再投資的逐筆金額與模擬成本，或 2) 產生月/季再平衡檢視表，供實際下單時參考。您選哪一項？',NULL,NULL,'2025-11-18 06:28:22.519257+08','2025-11-18 06:29:49.602636+08');
-INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,initial_input,final_output,tools_called,error_message,created_at,updated_at) VALUES
-	 ('a700f27f-980a-487c-9505-227a05273e9d','agent-f11318ac','REBALANCING','completed','2025-11-18 06:32:32.770793+08','2025-11-18 06:34:01.917005+08',89146,'{}','我已接收到重新平衡投資組合的任務。
-
-首先，我嘗試使用 `risk_analyst` 工具來評估目前的資產配置，但工具執行失敗。我將根據現有資訊和我自身的投資原則進行分析。
-
-我已詳細檢視了當前的投資組合狀態。總值為 9,968,815.79 元，其中現金比例 12.7%，股票比例 87.3%。
-
-**持股明細及佔總資產比例：**
-- **聯發科 (2454):** 24.98%
-- **中華電信 (2412):** 19.79%
-- **統一 (1216):** 15.33%
-- **台積電 (2330):** 14.70%
-- **鴻海 (2317):** 12.51%
-
-所有個股的持股比例均未超過 30.00% 的上限。現金水位（12.7%）處於一個非常健康且靈活的水平，這為投資組合提供了必要的防禦能力，也保留了在未來市場出現波動時捕捉新機會的彈藥。
-
-根據我「耐心、紀律、常識」的投資哲學，我認為目前的資產配置是相當均衡且理想的，無需進行任何調整。
-
-### **投資組合重新平衡分析報告**
-
-**1. 投資組合現況評估**
-截至 2025-11-17，投資組合結構穩健，風險分散。個股集中度風險處於可控範圍，佔比最高的聯發科（24.98%）遠低於 30% 的上限，顯示投資組合的健康狀態良好。參考過往決策，先前對鴻海的減持是正確的，使其目前的風險權重處於合適水平。
-
-**2. 核心持股分析與決策**
-- **半導體核心（聯發科、台積電）：** 這兩家公司是全球科技產業的基石，擁有強大的技術護城河和穩定的長期現金流產生能力，完全符合我「挑一間會永遠賺錢的公司」的標準，應堅定持有。
-- **防禦性基石（中華電信、統一）：** 這兩家企業分別是電信和食品產業的龍頭，其業務受經濟週期影響較小，能提供穩定的股息和現金流，是投資組合中完美的「壓艙石」，為組合提供了極佳的穩定性。
-- **價值型持股（鴻海）：** 作為全球製造業的領導者，雖然有其週期性，但其規模和行業地位無可取代。目前 12.51% 的持股比例風險適中，可以繼續持有以分享其長期價值。
-
-**3. 結論與建議**
-當前的投資組合配置完美體現了「耐心、紀律、常識」的投資哲學。持有的公司都是一時之選，具備強大的基本面。充足的現金部位則給予我們從容應對市場變化的能力。
-
-股市是讓有耐心的人，從沒耐心的人手中賺錢的地方。頻繁的交易只會徒增成本，侵蝕回報。
-
-**因此，我的最終建議是：「不進行任何交易調整」，繼續耐心持有現有資產。** 我們應讓這些優質企業的價值隨時間慢慢發酵，靜待時間玫瑰的綻放。除非公司基本面出現重大惡化，或市場提供千載難逢的錯殺機會，否則維持現狀是當下最好的策略。',NULL,NULL,'2025-11-18 06:32:32.772438+08','2025-11-18 06:34:01.917005+08'),
-	 ('1d39dce9-85b2-415d-9b61-79f1b9d94723','agent-5e101682','REBALANCING','completed','2025-11-18 06:38:36.8594+08','2025-11-18 06:40:16.111423+08',99252,'{}','摘要（≤500字）——組合再平衡建議（不執行交易）
-
-現狀重點：組合總值 9,981,313 元，現金 4,537,100（45.5%），股票 5,444,214（54.5%）。2330 市值約 2,892,500，佔比約 29%（超出保守上限20%、接近中性上限25%）。
-
-建議（優先採用保守方案）
-1) 目標：將 2330 降至 20%（也列出 25% 中性選項）
-   - 目標市值(20%) ≈ 1,996,263 元 → 需賣出約 896,237 元，約 620 股（由 2,000 → 1,380 股）。估算賣出成本 ≈0.44% ≈ 3,944 元，賣後淨入現金 ≈892k。
-   - 若選 25%：需賣出約 397,172 元，約 275 股；成本 ≈1,748 元。
-
-2) 執行策略（風控導向）
-   - 分批執行（建議 3 批：40% / 30% / 30%），避免一次性市價單。可採限價掛單或分段以 VWAP 執行，遇劇烈盤整則暫緩或拉長分批期。
-   - 參考技術位：若短期跌破 1,370–1,400（分批減碼）；若反彈遇 1,460（短線阻力）亦可逢高分批賣出。
-   - 停損/追蹤：若為保守者設 10% trailing stop；若積極者可用 15–20%。
-
-3) 賣出資金用途（建議配置）
-   - 40% 國內大盤 ETF（維持或增持 ETF 核心），40% 海外/全球 ETF 分散，20% 防禦性工具或短期債/高息 ETF。亦可保留部分現金以備買點。
-
-4) 風險與成本考量
-   - 交易稅費與佣金合計約 0.44%，滑價視執行方式另計。分批賣出可降低滑價風險。
-   - 監控觸發：單一持股佔比超過 25%、或權重偏離目標 ±5%、或單檔大幅利空時啟動再平衡。
-
-頻率與後續：建議季檢（每 3 個月）並在權重偏離或重大事件時即時檢視。以上為分析與執行建議（僅供參考，本模式不執行交易）。如同意，我可產生逐筆分批賣出金額、預估手續費與再投資金額表。',NULL,NULL,'2025-11-18 06:38:36.861041+08','2025-11-18 06:40:16.111423+08'),
-	 ('35ddecf1-e666-4c7a-ac8f-688520e81f69','agent-43cc7808','TRADING','completed','2025-11-18 06:42:17.365037+08','2025-11-18 06:42:47.936608+08',30571,'{}','綜合分析元大台灣高股息ETF（0056）現狀：
-
-1. 技術面：0056現價為35.79元，短期技術指標（MA5和MACD）偏強，但尚無明顯趨勢突破，也缺乏足夠的成交與K線型態數據。不過，目前價格貼近中軸（35.79元），主要支撐在34元附近，首道壓力在37.58元。情緒信號屬於「觀望」、缺乏立即的明確買進或賣出指示，建議等待更多型態與量能變化，技術面偏中性。
-
-2. 風險面：波動率約25%，風險中性。0056為分散型高股息ETF，產業分散度高，單一持股風險低，Beta值貼近大盤，系統性風險隨市場而動，適合穩健、長期資產配置。風險評分全體中性偏低，利於穩健投資，但不建議重押單一ETF。
-
-3. 綜合判斷：0056目前適合用以分散投資組合、提升股息現金流。但基於短線技術面「觀望」信號，且無明確多頭突破，不利短線大量加碼。適宜分批布局、控管風險比重，倘遇壓力區（37.58元）未突破或出現跌破支撐（34元），應保守應對。
-
-結論（交易建議）：現階段不宜激進進場0056，建議小額分批、逐步試單以優化資產分散度與現金流，總持股值切勿超過組合50%限制。是否立刻執行小幅買進，請確認是否有進一步強勢訊號或資產配置優化需求，否則可暫緩觀察，等待明確多頭訊號再加碼。是否要執行小額進場請指示。',NULL,NULL,'2025-11-18 06:42:17.367273+08','2025-11-18 06:42:47.936608+08'),
-	 ('a2d3f116-b17a-459e-8e2f-22d1749aef8b','agent-43cc7808','TRADING','completed','2025-11-18 06:43:41.810458+08','2025-11-18 06:45:06.044524+08',84234,'{}','【交易執行結果與決策摘要】
-
-已成功以現價 35.79 元買入 0056（元大台灣高股息ETF）10,000 股，總交易金額為 357,900 元，實際成本（含手續費）358,410.01 元。
-
-■ 決策理由摘要：本次佈局基於0056 ETF現價接近年度低點，技術面仍屬區間整理、無明顯多頭但具備整理反彈機會，且基本面在成分分散、現金流穩健、估值偏低具吸引力。市場情緒中性偏保守，ETF風險中低並適合長線資產分散。考量組合現金充足，先以小額分批買進，利於提升現金流及分散度，符合全天候分散穩健主張。未來將持續觀察支撐位與市場型態，分批優化調整。
-
-■ 交易已原子完成，組合更穩健、現金流提升，風險可控。',NULL,NULL,'2025-11-18 06:43:41.812353+08','2025-11-18 06:45:06.044524+08'),
-	 ('1058a730-0fdd-4ac7-91b2-b8fd1dccb6c4','agent-53ba0174','TRADING','completed','2025-11-18 06:45:37.365031+08','2025-11-18 06:52:36.114498+08',418749,'{}','### 交易決策結論
-
-**當前狀態**：組合總值約990萬（現金約278萬元，股票市值約711萬元，股票占比71.9%）。持股2330（台積電）2500股，市值約362萬元（占比36.6%）；0050（元大台灣50）16000股，市值約100萬元；2454（聯發科）1000股，市值約124萬元；2308（台達電）1000股，市值約95萬元；2382（廣達）1000股，市值約28萬元。集中度中等（HHI約0.32），單股最高占比符合70%限額。
-
-**分析過程**：對興趣股2408（南亞科）進行技術分析，現價166.5元，數據不足顯示觀望訊號（信心50%），雖有漲幅5%但成交量低，無明確買點；風險評估顯示買入1000股後組合風險5/10，中等，壓力測試10%下跌損失約7萬元，可控，但技術不支撐立即進場。對其他AI相關股2454觀望、2382買入機會但下降中，無強勁轉折。基於反身性理論，市場AI情緒正中性，資金流入半導體，但缺乏自我實現上漲循環確認，無需急進捕捉。
-
-**市場判斷**：當前非轉折點，技術數據有限，雖看好記憶體潛力但觀望為宜。若情緒強化或技術突破阻力174元，將重倉進攻；若惡化，撤退。過往分散至2382優化風險，維持現有配置。
-
-**風險考量**：不執行交易以避免數據不足風險。組合VaR0，回撤0，科技集中85%，監控單股跌10%停損。若買入2408需確認歷史數據，但現階段不適合。
-
-**交易決策**：觀望，不執行交易。繼續研究2408及其他AI機會，待技術確認後行動。
-
-（字數：298）',NULL,NULL,'2025-11-18 06:45:37.366399+08','2025-11-18 06:52:36.114498+08'),
-	 ('d60ae829-001f-45d1-8c09-6295ba032075','agent-5e101682','TRADING','completed','2025-11-18 07:22:29.963181+08','2025-11-18 07:23:07.942636+08',37979,'{}','收到。先回報現況、限制與建議，然後請您決定下一步（因為目前執行原子交易的 execute_trade_atomic 工具在此環境不可用，我需要您允許啟用它或同意替代執行方式）。
-
-一、即時資料（我剛抓取）
-- 無法取得 3115（代號可能錯誤或資料源無此代號），請確認代號或提供公司名稱。
-- 已取得價格：
-  - 2330（台積電）現價：1,445 元（昨收 1,430）
-  - 0050（元大台灣50）現價：61.9 元（昨收 61.7）
-  - 2881（富邦金控）現價：91.8 元（昨收 93.3）
-- 投組目前（您先前提供）：總值 9,981,313 元；2330 市值 2,892,500（佔約 29%）。
-
-二、關鍵限制（重要）
-- 您要求「必須使用 execute_trade_atomic() 來執行交易」。目前在本環境該原子執行工具並不可用，我無法直接下單並原子更新組合。
-- 我可以：
-  A) 等您或系統啟用 execute_trade_atomic，然後我立即依下列決策執行；
-  B) 不執行真實交易，但生成精確的逐筆委託計畫（含數量、分批、價格/市價指示、預估手續費與再投資分配），並可用 record_trade_tool 記錄決策（不會變更現金/持股）；
-  C) 提供完整執行指令清單供您/交易系統手動下單。
-
-三、我的初步投資判斷（基於風控與您過往決策偏好）
-- 2330 目前佔比約 29%，高於中性上限 25%、遠高於保守上限 20%。應優先減碼以分散風險。
-- 建議目標（優先採保守）：將 2330 降到 20%（或至少 25%）：
-  - 目標 20%（以總值 9,981,313 計）→ 2330 目標市值 ≈ 1,996,263 元 → 需賣出市值 ≈ 896,237 元。
-    → 以現價 1,445 元估算，需賣約 620 股（從 2,000 → 1,380 股）。
-  - 若只降至 25% → 需賣約 275 股（估算）。
-- 執行建議（風控導向）：
-  - 分批賣出（建議 3 批：40% / 30% / 30%），以市價或限價靠近當前價執行以降低滑價與執行風險。
-  - 技術位參考：若短期跌破 1,370–1,400，則分批加速減碼；遇反彈到 1,460 可分批逢高出場。
-  - 交易成本：稅費與佣金約 0.44%（依執行方式略有不同）。
-- 賣出後資金用途建議（示例分配）：
-  - 40% 國內大盤 ETF（如 0050）
-  - 40% 海外/全球 ETF（美股/全球股債混合）
-  - 20% 短期債或防禦性工具（或保留部分現金以備買點）
-- 風險考量：若市場短期劇烈震盪，分批延長期、避免一次性市價賣出以免滑價；設定 trailing stop（若短線交易）或遵守再平衡門檻（持股佔比>25%或偏離目標±5%）。
-
-四、建議的下一步（請選一）
-1) 啟用 execute_trade_atomic，我立即按「賣出 620 股 2330（分三批）」執行，並原子記錄交易（執行後我會回傳 ≤500 字決策摘要）。或者改為賣 275 股（25%目標）。
-2) 若無法啟用，我為您產出逐筆委託計畫（含每批數量、建議限價/市價、預估費用、再投資分配），並用 record_trade_tool 記錄決策（但不改變組合）。
-3) 或先讓我用 technical_analyst + risk_analyst 做更深入的技術與風險分析（我可針對 2330、0050、2881 產出短報告），再決定是否下單。
-
-請回覆您選哪一項（或允許我先對 2330 做技術+風險分析），並確認 3115 的正確代號或是否跳過它。我會根據您的回覆立即執行下一步。',NULL,NULL,'2025-11-18 07:22:29.96413+08','2025-11-18 07:23:07.942636+08'),
-	 ('e36a197a-8636-4753-b94a-6f9afe2d85d1','agent-5e101682','TRADING','completed','2025-11-18 07:26:15.719618+08','2025-11-18 07:26:57.71962+08',42000,'{}','已依您授權執行：以市價原子下單賣出 2330 共 1,000 股，交易已完成並原子記錄。以下為執行摘要、分析、風險考量及交易後組合狀況（≤500字）：
-
-一、執行結果（已完成）
-- 交易：SELL 2330，數量 1,000 股，成交價 1,445.00 元/股（即時現價），執行方式：原子交易 execute_trade_atomic()
-- 成交總額（含未扣手續費前）：1,445,000.00 元
-- 手續費/稅費：2,059.12 元
-- 淨入帳現金：1,442,940.88 元
-- 交易備註：決策理由已隨交易紀錄儲存（見下）
-
-二、決策理由（分析過程與市況判斷）
-- 出發點：風險控管與持股集中度過高。交易前 2330 為 2,000 股（市值約 2.8925M，佔整體偏高），需降至更保守的佔比（目標 20–25%）。
-- 工具/限制考量：原子交易工具及交易量必須為 1000 股倍數；基於速度與風險控管，決定先賣 1,000 股以立即降低單一公司暴露。
-- 市場判斷：2330 當前走勢尚整理，價格 1,445 接近近期區間中段，賣出可在控制滑價下達成降低集中度的目標。
-
-三、風險考量
-- 好處：立即降低單一公司系統性風險，釋出流動資金以分散或佈局其他資產。
-- 成本：若後續 2330 強勢上漲，將承擔放棄部分上行收益風險；另有手續費與交易稅（本次約 2,059.12 元）。
-- 執行風險：以市價執行可能遇短期滑價，已盡量以即時價格下單並保留現金以應變。
-
-四、交易後組合（即時更新）
-- 現金：原 4,537,099.54 + 淨入帳 1,442,940.88 = 5,980,040.42 元
-- 持股：
-  - 2330：1,000 股，市值 1,445,000.00 元
-  - 2881：市值 821,700.00 元（不變）
-  - 0050：市值 1,730,013.60 元（不變）
-- 股票市值合計：3,996,713.60 元
-- 投資組合總值：9,976,754.02 元
-- 資產配置：現金 59.96%（≈5,980,040.42），股票 40.04%（≈3,996,713.60）
-- 2330 持股佔比：14.49%（低於 40% 及更保守目標）
-
-五、後續建議（供您指示）
-- 資金分配建議（可分批執行）：40% 加碼 0050、40% 配置海外/全球ETF（美元資產）、20% 保留現金/短債作為備戰資金。
-- 若要我繼續：我可（A）立刻用 execute_trade_atomic 分批買入 0050 / 海外ETF（依您指定標的與金額）；或（B）先對 0050/2881 做技術+風險快速報告再下單；或（C）維持高現金比例觀望機會。
-
-若同意，我將依您選項執行下一步（若需買入請指定標的與分配比例）。',NULL,NULL,'2025-11-18 07:26:15.721638+08','2025-11-18 07:26:57.71962+08'),
-	 ('22efe29d-f64f-4d69-9a7f-568f809ce0e0','agent-5e101682','TRADING','completed','2025-11-18 07:27:15.762001+08','2025-11-18 07:29:38.349257+08',142587,'{}','我已完成投組檢視與四項子專家分析（技術、基本面、情緒、風險）。總結、具體建議與執行計畫如下，請確認是否同意我以原子交易 execute_trade_atomic() 依下列參數逐筆執行（每筆交易我會在交易備註內記錄決策理由並回報執行結果）。
-
-一、重點結論（簡短）
-- 0050（61.9）：作為核心被動標的，建議加碼以提高市場敞口、降低個股風險。技術/基本面偏正面，流動性高，適合分批大額買入。
-- 2344（66.2）：個股屬高波動/記憶體類別，短期有投機性機會但風險高，建議小額分批嘗試（觀察消息與量能變化）。
-- 2330/2881：維持持有（2330 長期看好但短線可分批回補；2881 適合收息、繼續持有）。
-
-二、我建議的具體交易（初步策略）
-- 交易A（核心加碼）：BUY 0050，數量 36,000 股，價格 61.9 元/股。
-  - 理由：在不超過 40% 最大持股限制下，這筆買入能把 0050 的持倉顯著提高（在買入後仍遠低於 40% 上限），以ETF做為長期核心配置。此單總成本約 2,228,400 元。
-  - 執行風控：分批執行（建議每筆以 5,000 或 10,000 股為單位，視當日成交量與對沖需要），或使用 TWAP/分筆以降低滑價。
-
-- 交易B（小額試單）：BUY 2344，數量 4,000 股，價格 66.2 元/股。
-  - 理由：以小比例（約 0.66% 投組）嘗試布局記憶體個股，若行情與基本面訊息確認再補。此單總成本約 264,800 元。
-  - 執行風控：因今日成交量約 44k 股，建議把 4k 分為 2 筆 2,000 股逐步下，避免一次性吃價差。
-
-合計資金需求：約 2,493,200 元，成交後現金量約 3,486,840 元（仍保有 ~35% 現金比重），符合流動性與風險控管建議。
-
-三、風險與風控（必述）
-- 分散 vs 集中：加碼 0050 提高被動分散，但會提高整體市場 beta（ETF 所代表整體暴露）；2344 為高波動個股，僅作小比重嘗試。
-- 流動性/滑價：我建議分批下單、用 TWAP 或分日執行，單筆不要超過當日成交量的 5–10%。2344 建議單筆不超過 2,000 股。
-- 最大持股限制：所有建議均會在下單前再行檢查是否會觸及 40% 限制（我已以目前價格估算，兩筆合併不會觸及上限）。
-- 失敗回滾：我會使用 execute_trade_atomic()（原子交易），保證交易、記錄、資金、持股同步成功或全部回滾。
-
-四、執行細節（若你同意，我會依此執行）
-1) 先下 0050 買單（分批，例如 10k + 10k + 10k + 6k），每筆用價格 61.9（與即時價一致）；decision_reason：增加核心ETF持倉、分散風險、長期配置。
-2) 再下 2344 買單，分為 2 筆 2,000 股、價格 66.2；decision_reason：小額試倉、觀察消息確認後再決定是否補倉。
-3) 每筆成交後我會回報：成交價、手續稅、淨出/入現金、交易後組合狀況與 ≤500 字決策總結。
-
-請回覆其中一項：
-A. 同意我現在以建議數量執行（我將依序用 execute_trade_atomic() 下單，並回報結果）；或
-B. 修改數量/標的（請告訴我要調整哪一筆與新數量）；或
-C. 暫不執行、先觀察（我會保留建議並每日監控訊息）。',NULL,NULL,'2025-11-18 07:27:15.763526+08','2025-11-18 07:29:38.349257+08'),
-	 ('b1b1ca82-05a0-4a07-b5f3-b5e6f65b52c4','agent-f11318ac','TRADING','failed','2025-11-18 20:01:04.25094+08','2025-11-19 08:31:23.427+08',142587,'{}',NULL,NULL,NULL,'2025-11-18 20:01:04.254608+08','2025-11-18 20:01:04.471169+08'),
-	 ('c90b273e-1b44-478e-8c0e-a16f2dfbdda1','agent-f11318ac','TRADING','running','2025-11-19 08:32:11.460116+08',NULL,NULL,'{}',NULL,NULL,NULL,'2025-11-19 08:32:11.466041+08','2025-11-19 08:32:11.717698+08');
+	 ('a6036ee3-6be3-4ad7-bad8-f6fa0ca0a8e3','agent-5e101682','TRADING','failed','2025-10-30 19:18:19.162328+08','2025-10-30 19:18:24.561056+08',5398,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:18:19.164238+08','2025-10-30 19:18:24.561056+08'),
+	 ('023afb8b-fcf7-418b-9676-03f58688e569','agent-5e101682','TRADING','failed','2025-10-30 19:19:00.790603+08','2025-10-30 19:19:05.826805+08',5036,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:19:00.7919+08','2025-10-30 19:19:05.826805+08'),
+	 ('886d231b-cc5d-40db-8fd4-7406a289f4a2','agent-5e101682','TRADING','failed','2025-10-30 19:20:35.610483+08','2025-10-30 19:20:40.315638+08',4705,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:20:35.611833+08','2025-10-30 19:20:40.315638+08'),
+	 ('a3602325-00f1-44f8-a7ff-28173c047d30','agent-5e101682','TRADING','failed','2025-10-30 19:37:09.021219+08','2025-10-30 19:37:14.867976+08',5846,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:37:09.023044+08','2025-10-30 19:37:14.867976+08'),
+	 ('ac3649eb-ba1e-4ec5-b333-c68107573a0e','agent-5e101682','TRADING','failed','2025-10-30 19:38:36.246231+08','2025-10-30 19:39:04.961249+08',28715,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-30 19:38:36.251335+08','2025-10-30 19:39:04.961249+08'),
+	 ('faccea58-8e3f-40ab-984d-e0a53bcf0574','agent-5e101682','TRADING','completed','2025-10-30 19:40:58.824849+08','2025-10-30 19:44:43.003847+08',224178,NULL,'2025-10-30 19:40:58.830253+08','2025-10-30 19:44:43.003847+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('cb3d25c3-ff3d-48b3-a77f-742574a2d370','agent-53ba0174','TRADING','completed','2025-10-30 19:46:10.562116+08','2025-10-30 19:47:27.319381+08',76757,NULL,'2025-10-30 19:46:10.563682+08','2025-10-30 19:47:27.319381+08'),
+	 ('665029ce-fc27-4a4c-9961-6458e0a3ca92','agent-53ba0174','TRADING','completed','2025-10-30 19:51:11.438255+08','2025-10-30 19:52:53.058024+08',101619,NULL,'2025-10-30 19:51:11.440405+08','2025-10-30 19:52:53.058024+08'),
+	 ('0c934e57-88c7-46ed-b526-cc4946128bfc','agent-53ba0174','TRADING','completed','2025-10-30 20:02:13.05093+08','2025-10-30 20:07:57.234177+08',344183,NULL,'2025-10-30 20:02:13.052643+08','2025-10-30 20:07:57.234177+08'),
+	 ('2dc1082b-3dad-4118-a843-d4616dde54e7','agent-53ba0174','TRADING','failed','2025-10-31 01:56:02.177595+08','2025-10-31 01:56:09.562666+08',7385,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 01:56:02.179262+08','2025-10-31 01:56:09.562666+08'),
+	 ('621f1e6b-0e18-4b2a-aba0-c5f592bf349f','agent-53ba0174','TRADING','failed','2025-10-31 01:59:20.015062+08','2025-10-31 01:59:25.398365+08',5383,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 01:59:20.017343+08','2025-10-31 01:59:25.398365+08'),
+	 ('35b8742d-2ce8-4789-b3fd-fabd3d87047f','agent-53ba0174','TRADING','failed','2025-10-31 02:01:28.635043+08','2025-10-31 02:01:34.241486+08',5606,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 02:01:28.636536+08','2025-10-31 02:01:34.241486+08'),
+	 ('24b7e272-d06e-4bcf-9c81-0035e1528869','agent-53ba0174','TRADING','failed','2025-10-31 02:02:52.840173+08','2025-10-31 02:02:57.852181+08',5012,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 02:02:52.841784+08','2025-10-31 02:02:57.852181+08'),
+	 ('e427ee63-8f95-4585-adc3-8e071e69c5dd','agent-53ba0174','TRADING','failed','2025-10-31 02:03:37.89872+08','2025-10-31 02:03:43.028644+08',5129,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-10-31 02:03:37.900078+08','2025-10-31 02:03:43.028644+08'),
+	 ('846724cd-8cea-47cd-b4c9-da7883befc3e','agent-53ba0174','TRADING','failed','2025-10-31 02:09:18.268024+08','2025-10-31 02:29:40.151139+08',1221883,'Agent execution failed: litellm.AuthenticationError: AuthenticationError: Github_copilotException - unauthorized: token expired','2025-10-31 02:09:18.269867+08','2025-10-31 02:29:40.151139+08'),
+	 ('67880e71-c903-49c8-b40f-8b805c7f6cd2','agent-53ba0174','TRADING','failed','2025-10-31 03:07:21.443668+08',NULL,NULL,NULL,'2025-10-31 03:07:21.445348+08','2025-10-31 03:07:21.462875+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('b4317345-a3a2-4d09-8e82-66b897a7c926','agent-53ba0174','TRADING','failed','2025-11-01 09:16:18.347826+08','2025-11-01 09:16:18.37219+08',24,'Agent initialization failed: ''str'' object has no attribute ''value''','2025-11-01 09:16:18.349087+08','2025-11-01 09:16:18.37219+08'),
+	 ('35b67d26-c2ce-4bb6-a3ff-ecf14d0285e7','agent-53ba0174','TRADING','failed','2025-11-01 09:16:40.572136+08','2025-11-01 09:16:40.583368+08',11,'Agent initialization failed: ''str'' object has no attribute ''value''','2025-11-01 09:16:40.572861+08','2025-11-01 09:16:40.583368+08'),
+	 ('bcaae722-ead6-446d-b773-b1e47fea29a7','agent-53ba0174','TRADING','completed','2025-11-01 18:05:34.779412+08','2025-11-01 18:07:04.47697+08',89697,NULL,'2025-11-01 18:05:34.794024+08','2025-11-01 18:07:04.47697+08'),
+	 ('0d1e2b9e-84b5-489e-b8fc-0505f0eef963','agent-53ba0174','TRADING','completed','2025-11-01 21:28:07.81827+08','2025-11-01 21:29:39.103165+08',91284,NULL,'2025-11-01 21:28:07.820244+08','2025-11-01 21:29:39.103165+08'),
+	 ('8cd2543e-8ab1-4139-b24e-897479c8e5e1','agent-53ba0174','TRADING','completed','2025-11-06 18:07:25.050003+08','2025-11-06 18:11:31.250617+08',246200,NULL,'2025-11-06 18:07:25.052727+08','2025-11-06 18:11:31.250617+08'),
+	 ('f6492d0a-ee6d-400a-ac20-6c94b67eb6b9','agent-53ba0174','TRADING','failed','2025-11-06 19:29:13.72412+08','2025-11-06 19:29:21.572278+08',7848,'Agent initialization failed: ''AgentsService'' object has no attribute ''agents_service''','2025-11-06 19:29:13.728202+08','2025-11-06 19:29:21.572278+08'),
+	 ('05a0c91f-1817-4e20-91ce-92d26fe6eff3','agent-53ba0174','TRADING','completed','2025-11-06 19:49:22.692482+08','2025-11-06 19:54:24.69485+08',302002,NULL,'2025-11-06 19:49:22.694127+08','2025-11-06 19:54:24.69485+08'),
+	 ('140aecf1-10b0-4ba2-84a2-25e615479227','agent-53ba0174','TRADING','completed','2025-11-06 21:55:08.488896+08','2025-11-06 21:59:23.471417+08',254982,NULL,'2025-11-06 21:55:08.492071+08','2025-11-06 21:59:23.471417+08'),
+	 ('7c90bf6e-02dd-43d3-a710-5119f0317ec8','agent-f11318ac','TRADING','completed','2025-11-06 22:41:34.116971+08','2025-11-06 22:44:31.160125+08',177043,NULL,'2025-11-06 22:41:34.121273+08','2025-11-06 22:44:31.160125+08'),
+	 ('7fd3cf5a-f057-4a0e-8db3-d22d083934ee','agent-5e101682','TRADING','completed','2025-11-06 22:51:53.121453+08','2025-11-06 22:53:02.19196+08',69070,NULL,'2025-11-06 22:51:53.122911+08','2025-11-06 22:53:02.19196+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('4aa3f8fd-3362-44ce-b528-adb9bd0b476c','agent-5e101682','TRADING','completed','2025-11-06 22:55:09.440798+08','2025-11-06 22:55:22.172953+08',12732,NULL,'2025-11-06 22:55:09.446956+08','2025-11-06 22:55:22.172953+08'),
+	 ('ec39dcd0-6b5e-44af-865d-5cab7a84ed1b','agent-5e101682','TRADING','completed','2025-11-06 22:55:57.484704+08','2025-11-06 22:56:19.36358+08',21878,NULL,'2025-11-06 22:55:57.48547+08','2025-11-06 22:56:19.36358+08'),
+	 ('d66894b4-74e2-4097-b4df-416649246267','agent-5e101682','TRADING','completed','2025-11-06 23:01:38.752819+08','2025-11-06 23:03:22.252391+08',103499,NULL,'2025-11-06 23:01:38.754233+08','2025-11-06 23:03:22.252391+08'),
+	 ('ab259b81-ff66-4113-a672-da8458838259','agent-53ba0174','TRADING','completed','2025-11-06 23:14:34.873518+08','2025-11-06 23:24:07.15224+08',572278,NULL,'2025-11-06 23:14:34.876428+08','2025-11-06 23:24:07.15224+08'),
+	 ('17e4f0ce-b1ee-4805-b79d-7dd2427c694a','agent-5e101682','TRADING','completed','2025-11-06 23:26:05.228847+08','2025-11-06 23:26:17.294847+08',12066,NULL,'2025-11-06 23:26:05.229756+08','2025-11-06 23:26:17.294847+08'),
+	 ('5de7ce68-3fe5-40e9-bf1a-b4d95cbcd7a9','agent-5e101682','TRADING','completed','2025-11-07 16:40:20.320293+08','2025-11-07 16:40:41.848004+08',21527,NULL,'2025-11-07 16:40:20.323125+08','2025-11-07 16:40:41.848004+08'),
+	 ('dcee4804-62df-4ae1-827b-7a0ba0963b29','agent-5e101682','TRADING','completed','2025-11-07 16:42:33.799808+08','2025-11-07 16:42:40.623099+08',6823,NULL,'2025-11-07 16:42:33.804358+08','2025-11-07 16:42:40.623099+08'),
+	 ('e81c80da-c49f-46b0-8cfc-c8a2bc73dd46','agent-5e101682','TRADING','completed','2025-11-07 16:44:40.729899+08','2025-11-07 16:44:48.296382+08',7566,NULL,'2025-11-07 16:44:40.742114+08','2025-11-07 16:44:48.296382+08'),
+	 ('1eeb8471-282f-449c-9b53-39307f80891e','agent-5e101682','TRADING','completed','2025-11-07 16:47:21.480914+08','2025-11-07 16:48:40.544118+08',79063,NULL,'2025-11-07 16:47:21.482444+08','2025-11-07 16:48:40.544118+08'),
+	 ('a8d074d1-3213-477f-a152-3e0179251747','agent-5e101682','TRADING','completed','2025-11-07 17:01:33.868727+08','2025-11-07 17:02:26.153563+08',52284,NULL,'2025-11-07 17:01:33.870325+08','2025-11-07 17:02:26.153563+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('aa784902-86e3-4ccf-9f79-8b1b6e2320e9','agent-5e101682','TRADING','completed','2025-11-07 17:48:26.924297+08','2025-11-07 17:51:07.342422+08',160418,NULL,'2025-11-07 17:48:26.926788+08','2025-11-07 17:51:07.342422+08'),
+	 ('c1678e9f-30aa-4156-869b-2de6f8811612','agent-5e101682','TRADING','completed','2025-11-07 18:13:05.184873+08','2025-11-07 18:14:52.152075+08',106967,NULL,'2025-11-07 18:13:05.187+08','2025-11-07 18:14:52.152075+08'),
+	 ('ef171fa3-f10c-47fa-97ac-0fe22a4b3bcd','agent-5e101682','TRADING','completed','2025-11-07 18:19:20.785588+08','2025-11-07 18:20:45.355126+08',84569,NULL,'2025-11-07 18:19:20.787108+08','2025-11-07 18:20:45.355126+08'),
+	 ('68c6b296-ee00-460c-9f0c-fad00514f169','agent-5e101682','TRADING','completed','2025-11-07 21:40:44.349566+08','2025-11-07 21:42:15.461212+08',91111,NULL,'2025-11-07 21:40:44.350877+08','2025-11-07 21:42:15.461212+08'),
+	 ('28b92bbf-edae-410f-95da-8acee4c221da','agent-5e101682','TRADING','completed','2025-11-07 21:44:25.128406+08','2025-11-07 21:51:59.841931+08',454713,NULL,'2025-11-07 21:44:25.129482+08','2025-11-07 21:51:59.841931+08'),
+	 ('c7e7bf5b-ddd9-4c45-979c-56ca336ac7e8','agent-f11318ac','TRADING','completed','2025-11-07 22:21:24.823516+08','2025-11-07 22:26:31.023963+08',306200,NULL,'2025-11-07 22:21:24.834705+08','2025-11-07 22:26:31.023963+08'),
+	 ('5c0e90ba-83db-4c37-a087-3779530c7093','agent-53ba0174','TRADING','completed','2025-11-07 22:33:31.970544+08','2025-11-07 22:40:37.976189+08',426005,NULL,'2025-11-07 22:33:31.975287+08','2025-11-07 22:40:37.976189+08'),
+	 ('d8c19ae3-1f13-4f0f-895f-6d50db64d5b5','agent-f11318ac','TRADING','completed','2025-11-09 02:12:00.350054+08','2025-11-09 02:23:00.810832+08',660460,NULL,'2025-11-09 02:12:00.356505+08','2025-11-09 02:23:00.810832+08'),
+	 ('3024a969-20ab-44df-b54c-79ad3215337e','agent-f11318ac','REBALANCING','failed','2025-11-10 02:31:15.928265+08','2025-11-17 06:18:24.425408+08',618428497,'Session timeout after 1 minutes','2025-11-10 02:31:15.931121+08','2025-11-17 06:18:24.42618+08'),
+	 ('510a21ff-7ad0-44a6-a501-434a49cee413','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:11.150283+08','2025-11-17 06:18:24.425474+08',618373275,'Session timeout after 1 minutes','2025-11-10 02:32:11.157676+08','2025-11-17 06:18:24.426181+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('09ba0efd-b186-4b63-a41d-1e8656b2ba28','agent-f11318ac','TRADING','failed','2025-11-10 02:32:15.336255+08','2025-11-17 06:18:24.425529+08',618369089,'Session timeout after 1 minutes','2025-11-10 02:32:15.336979+08','2025-11-17 06:18:24.426178+08'),
+	 ('fc020958-4bd5-46e6-91a0-599f1d3cdda7','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:17.494357+08','2025-11-17 06:18:24.425575+08',618366931,'Session timeout after 1 minutes','2025-11-10 02:32:17.496196+08','2025-11-17 06:18:24.426183+08'),
+	 ('ade3fb74-0d5f-4806-825a-5cfba3ae5069','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:20.76756+08','2025-11-17 06:18:24.425624+08',618363658,'Session timeout after 1 minutes','2025-11-10 02:32:20.767882+08','2025-11-17 06:18:24.426183+08'),
+	 ('192aec3e-d113-4b45-8bce-312f80d550c8','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:20.779244+08','2025-11-17 06:18:24.425668+08',618363646,'Session timeout after 1 minutes','2025-11-10 02:32:20.779497+08','2025-11-17 06:18:24.42618+08'),
+	 ('653e46d7-2445-4695-b44f-7ef14c60a928','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:37.501129+08','2025-11-17 06:18:24.42571+08',618346924,'Session timeout after 1 minutes','2025-11-10 02:32:37.501997+08','2025-11-17 06:18:24.426182+08'),
+	 ('51b58249-332f-415a-a96d-f1457982cb4d','agent-f11318ac','REBALANCING','failed','2025-11-10 02:32:37.552693+08','2025-11-17 06:18:24.425751+08',618346873,'Session timeout after 1 minutes','2025-11-10 02:32:37.552923+08','2025-11-17 06:18:24.426182+08'),
+	 ('1bd05d4e-411c-47ee-931e-5eae377b54e0','agent-f11318ac','REBALANCING','failed','2025-11-10 02:33:47.802216+08','2025-11-10 02:33:47.878284+08',76,'''NoneType'' object has no attribute ''initialize''','2025-11-10 02:33:47.803446+08','2025-11-10 02:33:47.878284+08'),
+	 ('8d684999-5363-4c2b-a99b-330e6f344822','agent-f11318ac','REBALANCING','failed','2025-11-10 02:33:47.861546+08','2025-11-10 02:33:47.887384+08',25,'''NoneType'' object has no attribute ''initialize''','2025-11-10 02:33:47.861903+08','2025-11-10 02:33:47.887384+08'),
+	 ('857fdad4-fcdb-4980-8d4f-5a22c67510fa','agent-f11318ac','REBALANCING','failed','2025-11-10 02:34:29.581764+08','2025-11-10 02:34:29.619475+08',37,'''str'' object has no attribute ''initialize''','2025-11-10 02:34:29.583965+08','2025-11-10 02:34:29.619475+08'),
+	 ('04aecaa5-0fe4-424c-81ac-6d6b20de4c18','agent-f11318ac','REBALANCING','failed','2025-11-10 02:34:29.586931+08','2025-11-10 02:34:29.624932+08',38,'''str'' object has no attribute ''initialize''','2025-11-10 02:34:29.587294+08','2025-11-10 02:34:29.624932+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('bbdf46f6-a13e-431f-88d7-cd0fc0ce4bd6','agent-f11318ac','REBALANCING','failed','2025-11-10 02:34:58.613481+08','2025-11-10 02:34:58.63926+08',25,'''str'' object has no attribute ''initialize''','2025-11-10 02:34:58.614086+08','2025-11-10 02:34:58.63926+08'),
+	 ('88246f26-31cd-49be-b928-61d837af904c','agent-f11318ac','REBALANCING','failed','2025-11-10 02:34:58.614408+08','2025-11-10 02:34:58.639871+08',25,'''str'' object has no attribute ''initialize''','2025-11-10 02:34:58.614586+08','2025-11-10 02:34:58.639871+08'),
+	 ('ba2a2fc7-2993-4ffb-91d2-a42c9836593b','agent-f11318ac','REBALANCING','failed','2025-11-10 18:40:35.211711+08','2025-11-10 18:40:35.401304+08',189,'''str'' object has no attribute ''initialize''','2025-11-10 18:40:35.227702+08','2025-11-10 18:40:35.401304+08'),
+	 ('3ace5816-46a2-40b7-826b-65368c951348','agent-f11318ac','REBALANCING','failed','2025-11-10 18:43:31.366042+08','2025-11-10 18:43:31.943804+08',577,'''str'' object has no attribute ''initialize''','2025-11-10 18:43:31.369668+08','2025-11-10 18:43:31.943804+08'),
+	 ('46fa91ca-fddf-40c8-9eb2-b12e8e142ab9','agent-f11318ac','REBALANCING','failed','2025-11-10 18:55:08.880108+08','2025-11-10 18:55:08.923691+08',43,'''str'' object has no attribute ''initialize''','2025-11-10 18:55:08.882136+08','2025-11-10 18:55:08.923691+08'),
+	 ('b6f6ccbd-2c14-456a-9143-463e6c09d2f8','agent-f11318ac','REBALANCING','failed','2025-11-10 22:16:28.399563+08','2025-11-10 22:16:31.867307+08',3467,'''str'' object has no attribute ''initialize''','2025-11-10 22:16:28.406807+08','2025-11-10 22:16:31.867307+08'),
+	 ('18dd9456-91dc-4705-84f7-f533f03e2865','agent-f11318ac','TRADING','failed','2025-11-10 22:16:45.835373+08','2025-11-10 22:16:47.524957+08',1689,'''str'' object has no attribute ''initialize''','2025-11-10 22:16:45.836977+08','2025-11-10 22:16:47.524957+08'),
+	 ('5f499766-e1a6-447c-ba29-0d0de2eff974','agent-f11318ac','REBALANCING','failed','2025-11-10 22:17:56.962454+08','2025-11-10 22:17:58.997437+08',2034,'''str'' object has no attribute ''initialize''','2025-11-10 22:17:56.965435+08','2025-11-10 22:17:58.997437+08'),
+	 ('698e9c61-306a-4a88-924c-7e07b2e0e854','agent-f11318ac','TRADING','failed','2025-11-10 22:18:15.809298+08','2025-11-10 22:18:19.469724+08',3660,'''str'' object has no attribute ''initialize''','2025-11-10 22:18:15.811345+08','2025-11-10 22:18:19.469724+08'),
+	 ('171ee9f7-6317-407b-8d58-7c68a307acb2','agent-f11318ac','REBALANCING','failed','2025-11-10 22:19:47.903224+08','2025-11-10 22:19:49.445307+08',1542,'''str'' object has no attribute ''initialize''','2025-11-10 22:19:47.903811+08','2025-11-10 22:19:49.445307+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('82cf8cf6-0eca-4fe0-ab53-37fad38fc57e','agent-5e101682','TRADING','failed','2025-11-10 23:44:26.733961+08','2025-11-10 23:44:26.873993+08',140,'''str'' object has no attribute ''initialize''','2025-11-10 23:44:26.742884+08','2025-11-10 23:44:26.873993+08'),
+	 ('fca8bcc8-31db-42d1-9040-b05bcbadd1ea','agent-5e101682','TRADING','failed','2025-11-10 23:44:48.440878+08','2025-11-10 23:44:48.795702+08',354,'''str'' object has no attribute ''initialize''','2025-11-10 23:44:48.443699+08','2025-11-10 23:44:48.795702+08'),
+	 ('d99dbe63-6514-4d76-922a-cc674f1241cd','agent-5e101682','TRADING','completed','2025-11-10 23:46:51.362141+08',NULL,NULL,NULL,'2025-11-10 23:46:51.364218+08','2025-11-10 23:46:51.374585+08'),
+	 ('64d254a9-9e7c-4b19-a81a-8bffac348fa7','agent-5e101682','TRADING','completed','2025-11-11 02:15:00.884949+08','2025-11-11 02:17:24.283289+08',143398,NULL,'2025-11-11 02:15:00.892102+08','2025-11-11 02:17:24.283289+08'),
+	 ('11d4151a-1103-4c5d-af45-46c333fb0b91','agent-5e101682','TRADING','completed','2025-11-11 02:19:55.57219+08','2025-11-11 02:21:46.272816+08',110700,NULL,'2025-11-11 02:19:55.573182+08','2025-11-11 02:21:46.272816+08'),
+	 ('f4684292-02a3-417e-a6f0-07f9369ed7b7','agent-5e101682','TRADING','completed','2025-11-11 02:37:29.716477+08','2025-11-11 02:37:43.898593+08',14182,NULL,'2025-11-11 02:37:29.719835+08','2025-11-11 02:37:43.898593+08'),
+	 ('9f268b8b-5fb2-4038-a7af-3f0d5b745e80','agent-5e101682','TRADING','completed','2025-11-11 02:39:01.120864+08',NULL,NULL,NULL,'2025-11-11 02:39:01.122263+08','2025-11-11 02:39:01.133402+08'),
+	 ('1e3df266-92e3-462c-9951-97f015701fce','agent-5e101682','TRADING','failed','2025-11-11 06:16:07.976197+08','2025-11-11 06:18:39.939646+08',151963,'Aborted: Agent stopped (was not in active_agents)','2025-11-11 06:16:07.977874+08','2025-11-11 06:18:39.941361+08'),
+	 ('cb7b4307-560a-4b96-b1d3-0847720a3909','agent-53ba0174','TRADING','completed','2025-11-11 06:25:55.662363+08','2025-11-11 06:32:12.45682+08',376794,NULL,'2025-11-11 06:25:55.663729+08','2025-11-11 06:32:12.45682+08'),
+	 ('59509dc8-cb01-40f4-9bd9-1e56e79a9784','agent-53ba0174','TRADING','completed','2025-11-11 06:33:58.960417+08','2025-11-11 06:40:06.845837+08',367885,NULL,'2025-11-11 06:33:58.961564+08','2025-11-11 06:40:06.845837+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('1429d59c-46d0-497f-bf00-f98e3f3f8fed','agent-5e101682','TRADING','completed','2025-11-11 06:56:39.25203+08','2025-11-11 06:58:43.382587+08',124130,NULL,'2025-11-11 06:56:39.257094+08','2025-11-11 06:58:43.382587+08'),
+	 ('9d4f4db3-541d-4930-be9d-a4bfcf84dd59','agent-53ba0174','REBALANCING','completed','2025-11-11 07:03:59.333296+08','2025-11-11 07:10:46.77521+08',407441,NULL,'2025-11-11 07:03:59.33511+08','2025-11-11 07:10:46.77521+08'),
+	 ('b1cb6fb5-7b25-4689-ac1c-eb804581beba','agent-f11318ac','TRADING','completed','2025-11-11 17:12:24.183152+08','2025-11-11 17:14:20.42726+08',116244,NULL,'2025-11-11 17:12:24.185743+08','2025-11-11 17:14:20.42726+08'),
+	 ('24b28d39-e8fd-4dbc-b1ba-029cbbc7f7ea','agent-f11318ac','TRADING','completed','2025-11-11 17:15:04.648472+08','2025-11-11 17:17:09.391846+08',124743,NULL,'2025-11-11 17:15:04.650752+08','2025-11-11 17:17:09.391846+08'),
+	 ('af803887-6774-4918-828f-f65f31563433','agent-53ba0174','TRADING','completed','2025-11-11 18:14:12.187884+08','2025-11-11 18:19:36.256296+08',324068,NULL,'2025-11-11 18:14:12.206039+08','2025-11-11 18:19:36.256296+08'),
+	 ('020aaa69-d197-4845-8587-97a8c5e4e6da','agent-43cc7808','TRADING','completed','2025-11-11 19:04:37.767175+08','2025-11-11 19:05:54.28362+08',76516,NULL,'2025-11-11 19:04:37.779401+08','2025-11-11 19:05:54.28362+08'),
+	 ('fec76b62-92f2-438b-b9a5-7fd201b1cb51','agent-43cc7808','TRADING','completed','2025-11-11 19:06:29.970263+08','2025-11-11 19:07:15.244799+08',45274,NULL,'2025-11-11 19:06:29.976643+08','2025-11-11 19:07:15.244799+08'),
+	 ('e41d17ed-d91a-4145-9440-fa77917bb014','agent-43cc7808','TRADING','completed','2025-11-11 19:09:30.69096+08','2025-11-11 19:09:49.54877+08',18857,NULL,'2025-11-11 19:09:30.693389+08','2025-11-11 19:09:49.54877+08'),
+	 ('4da68912-b2a8-4167-bf3e-a127c1ac7807','agent-43cc7808','TRADING','completed','2025-11-11 19:10:27.881395+08','2025-11-11 19:11:22.330596+08',54449,NULL,'2025-11-11 19:10:27.885092+08','2025-11-11 19:11:22.330596+08'),
+	 ('c7006255-9c24-453e-aec3-42852add52fc','agent-43cc7808','TRADING','completed','2025-11-11 19:35:50.437497+08','2025-11-11 19:36:26.302+08',35864,NULL,'2025-11-11 19:35:50.444749+08','2025-11-11 19:36:26.302+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('1f048cb6-3c3e-4679-a7b0-9f84b7aaf740','agent-43cc7808','REBALANCING','completed','2025-11-11 19:37:03.149049+08','2025-11-11 19:37:24.426748+08',21277,NULL,'2025-11-11 19:37:03.151354+08','2025-11-11 19:37:24.426748+08'),
+	 ('29572047-87a9-4c64-af9c-765db72b4a68','agent-43cc7808','TRADING','completed','2025-11-11 19:40:25.670474+08','2025-11-11 19:41:00.21801+08',34547,NULL,'2025-11-11 19:40:25.679792+08','2025-11-11 19:41:00.21801+08'),
+	 ('61832227-283f-4062-ae23-6a4cf9399ca8','agent-5e101682','TRADING','completed','2025-11-11 19:41:59.693757+08','2025-11-11 19:42:41.516279+08',41822,NULL,'2025-11-11 19:41:59.695417+08','2025-11-11 19:42:41.516279+08'),
+	 ('b0b5ddb6-8f19-4bf8-a8ed-9f3d223527f4','agent-53ba0174','TRADING','completed','2025-11-11 20:11:44.939444+08','2025-11-11 20:15:21.334812+08',216395,NULL,'2025-11-11 20:11:44.950827+08','2025-11-11 20:15:21.334812+08'),
+	 ('915690a6-b26d-49fc-82f6-e826a72a35b6','agent-43cc7808','TRADING','completed','2025-11-12 17:38:28.108215+08','2025-11-12 17:38:46.448202+08',18339,NULL,'2025-11-12 17:38:28.123154+08','2025-11-12 17:38:46.448202+08'),
+	 ('62c6689f-59f1-4fc4-85d7-c5c4c881a0d2','agent-43cc7808','TRADING','completed','2025-11-12 18:54:44.385681+08','2025-11-12 18:57:03.93101+08',139545,NULL,'2025-11-12 18:54:44.389688+08','2025-11-12 18:57:03.93101+08'),
+	 ('46f68168-ccff-4369-a999-c14265fa6ccc','agent-43cc7808','TRADING','completed','2025-11-12 19:09:56.196535+08','2025-11-12 19:11:24.751575+08',88555,NULL,'2025-11-12 19:09:56.198852+08','2025-11-12 19:11:24.751575+08'),
+	 ('25de0d50-5b14-461d-b5ce-e017debeda2e','agent-53ba0174','TRADING','completed','2025-11-12 19:20:30.214541+08','2025-11-12 19:22:47.273168+08',137058,NULL,'2025-11-12 19:20:30.22191+08','2025-11-12 19:22:47.273168+08'),
+	 ('193813d3-0e48-4745-97ac-e9b579c548af','agent-5e101682','TRADING','completed','2025-11-12 19:20:33.167098+08','2025-11-12 19:21:55.459781+08',82292,NULL,'2025-11-12 19:20:33.167799+08','2025-11-12 19:21:55.459781+08'),
+	 ('50326f1a-e451-4450-91cf-70bd90cb381a','agent-5e101682','TRADING','completed','2025-11-12 19:28:00.675429+08','2025-11-12 19:30:19.417341+08',138741,NULL,'2025-11-12 19:28:00.678027+08','2025-11-12 19:30:19.417341+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('cdb5ad2c-9b87-47c7-a218-7757e9f17cc0','agent-f11318ac','TRADING','completed','2025-11-12 19:28:03.422509+08','2025-11-12 19:29:12.210837+08',68788,NULL,'2025-11-12 19:28:03.426969+08','2025-11-12 19:29:12.210837+08'),
+	 ('6f1b8b1b-a425-47d1-ae96-0d6e8b028bca','agent-f11318ac','REBALANCING','completed','2025-11-13 01:49:31.742267+08','2025-11-13 01:50:55.845441+08',84103,NULL,'2025-11-13 01:49:31.748402+08','2025-11-13 01:50:55.845441+08'),
+	 ('b6bdbc5d-804d-4b92-8067-4288eb6fbf38','agent-5e101682','REBALANCING','completed','2025-11-13 01:49:34.144703+08','2025-11-13 01:52:51.179778+08',197035,NULL,'2025-11-13 01:49:34.145845+08','2025-11-13 01:52:51.179778+08'),
+	 ('20b8a1d7-a0b8-48ba-9978-be30e0f96866','agent-43cc7808','REBALANCING','completed','2025-11-13 01:49:37.14757+08','2025-11-13 01:49:49.793007+08',12645,NULL,'2025-11-13 01:49:37.147893+08','2025-11-13 01:49:49.793007+08'),
+	 ('a99589e3-5ff6-44a3-b0b4-0b621399f62b','agent-53ba0174','REBALANCING','completed','2025-11-13 01:49:39.262318+08','2025-11-13 01:52:41.874557+08',182612,NULL,'2025-11-13 01:49:39.264268+08','2025-11-13 01:52:41.874557+08'),
+	 ('2d3a5863-8ca5-48c2-afa1-fcb6a4bcf9e0','agent-43cc7808','TRADING','failed','2025-11-13 17:06:24.151345+08','2025-11-13 17:06:28.734504+08',4583,'Agent execution failed: litellm.BadRequestError: Github_copilotException - The requested model is not supported.','2025-11-13 17:06:24.156658+08','2025-11-13 17:06:28.734504+08'),
+	 ('e4ecce9f-e8ac-449b-8b2e-f23262266201','agent-43cc7808','TRADING','completed','2025-11-13 17:13:16.020289+08','2025-11-13 17:14:43.74174+08',87721,NULL,'2025-11-13 17:13:16.021145+08','2025-11-13 17:14:43.74174+08'),
+	 ('38c0c6ab-938b-4d57-b2fd-58ef7e78b77e','agent-53ba0174','TRADING','completed','2025-11-13 17:13:46.390779+08','2025-11-13 17:15:59.819135+08',133428,NULL,'2025-11-13 17:13:46.391742+08','2025-11-13 17:15:59.819135+08'),
+	 ('80ab88d5-25e0-46aa-8446-40e8ced29d6f','agent-f11318ac','TRADING','completed','2025-11-13 17:30:35.439744+08','2025-11-13 17:33:18.226258+08',162786,NULL,'2025-11-13 17:30:35.446947+08','2025-11-13 17:33:18.226258+08'),
+	 ('bc5c35dc-cc04-4013-9736-b8016a446632','agent-5e101682','TRADING','completed','2025-11-13 17:30:37.381281+08','2025-11-13 17:31:56.146098+08',78764,NULL,'2025-11-13 17:30:37.382078+08','2025-11-13 17:31:56.146098+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('939daac4-563e-4e69-a162-753f2a40873c','agent-53ba0174','TRADING','completed','2025-11-13 17:35:03.781957+08','2025-11-13 17:51:57.296217+08',1013514,NULL,'2025-11-13 17:35:03.79007+08','2025-11-13 17:51:57.296217+08'),
+	 ('a881ab18-6a5d-4ca0-85fe-b14b3dd9b5e7','agent-43cc7808','TRADING','completed','2025-11-13 17:54:53.412492+08','2025-11-13 17:58:35.833368+08',222420,NULL,'2025-11-13 17:54:53.41381+08','2025-11-13 17:58:35.833368+08'),
+	 ('85fbc990-7cf4-4ab6-88cf-b531b07264cb','agent-f11318ac','TRADING','completed','2025-11-14 06:21:54.747216+08','2025-11-14 06:24:09.380395+08',134633,NULL,'2025-11-14 06:21:54.754725+08','2025-11-14 06:24:09.380395+08'),
+	 ('39ab3205-b0e3-4fe5-8593-2c55650b7980','agent-5e101682','TRADING','completed','2025-11-14 06:24:39.762475+08','2025-11-14 06:27:26.489301+08',166726,NULL,'2025-11-14 06:24:39.763442+08','2025-11-14 06:27:26.489301+08'),
+	 ('38595ad3-a1e1-460d-8e98-f576488edc16','agent-43cc7808','TRADING','completed','2025-11-14 06:29:29.97176+08','2025-11-14 06:30:36.888546+08',66916,NULL,'2025-11-14 06:29:29.974414+08','2025-11-14 06:30:36.888546+08'),
+	 ('6b137cfc-2710-47bf-90b0-4cce23feea20','agent-53ba0174','TRADING','completed','2025-11-14 06:30:47.970285+08','2025-11-14 06:43:22.6589+08',754688,NULL,'2025-11-14 06:30:47.971746+08','2025-11-14 06:43:22.6589+08'),
+	 ('6669e182-327b-4725-9d22-1ea3861d232a','agent-f11318ac','TRADING','completed','2025-11-14 18:26:32.298456+08','2025-11-14 18:27:32.455495+08',60157,NULL,'2025-11-14 18:26:32.309143+08','2025-11-14 18:27:32.455495+08'),
+	 ('b12c3839-cb1d-4238-a2c4-e5c39ee56e27','agent-5e101682','TRADING','completed','2025-11-14 18:51:58.861897+08','2025-11-14 18:53:02.684126+08',63822,NULL,'2025-11-14 18:51:58.872882+08','2025-11-14 18:53:02.684126+08'),
+	 ('6abf7daa-864f-4372-8619-fa546353486f','agent-f11318ac','TRADING','completed','2025-11-14 19:42:46.36521+08','2025-11-14 19:45:02.109255+08',135744,NULL,'2025-11-14 19:42:46.409711+08','2025-11-14 19:45:02.109255+08'),
+	 ('a3047d59-c280-48d2-8edf-d1bfb34c45b8','agent-43cc7808','TRADING','completed','2025-11-14 19:45:19.010318+08','2025-11-14 19:47:00.311736+08',101301,NULL,'2025-11-14 19:45:19.011949+08','2025-11-14 19:47:00.311736+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('4ed26f16-e712-408f-a3cf-ffe7a1e3cdd3','agent-53ba0174','TRADING','completed','2025-11-14 19:54:21.495878+08','2025-11-14 20:01:01.141721+08',399645,NULL,'2025-11-14 19:54:21.509426+08','2025-11-14 20:01:01.141721+08'),
+	 ('d7363970-9c8b-4a6f-9d54-1221604ae233','agent-43cc7808','TRADING','completed','2025-11-14 20:17:42.239867+08','2025-11-14 20:19:33.377811+08',111137,NULL,'2025-11-14 20:17:42.248734+08','2025-11-14 20:19:33.377811+08'),
+	 ('6cd69133-0df3-4d2e-8f12-075b0dce980f','agent-5e101682','TRADING','completed','2025-11-16 10:52:25.047424+08','2025-11-16 10:53:56.446266+08',91398,NULL,'2025-11-16 10:52:25.076152+08','2025-11-16 10:53:56.446266+08'),
+	 ('666c8313-f34d-4dd4-a9ca-b2496c556652','agent-43cc7808','TRADING','completed','2025-11-16 10:55:07.369131+08','2025-11-16 10:57:05.138168+08',117769,NULL,'2025-11-16 10:55:07.370221+08','2025-11-16 10:57:05.138168+08'),
+	 ('040a4332-f3bc-461d-a7bb-40d204f2bf1d','agent-f11318ac','TRADING','completed','2025-11-16 10:55:10.103618+08','2025-11-16 10:58:41.361459+08',211257,NULL,'2025-11-16 10:55:10.104476+08','2025-11-16 10:58:41.361459+08'),
+	 ('909544dd-9424-4aa3-8f0e-543989738c12','agent-53ba0174','TRADING','completed','2025-11-16 10:55:13.52914+08','2025-11-16 11:02:09.4146+08',415885,NULL,'2025-11-16 10:55:13.52957+08','2025-11-16 11:02:09.4146+08'),
+	 ('9f51c2fe-734f-4ced-bdd4-d5b6e838a1fd','agent-f11318ac','TRADING','completed','2025-11-16 21:45:52.428264+08','2025-11-16 21:48:50.661716+08',178233,NULL,'2025-11-16 21:45:52.432483+08','2025-11-16 21:48:50.661716+08'),
+	 ('22e7bdbb-3e9e-4b83-8ab6-72a5116ed393','agent-5e101682','TRADING','completed','2025-11-16 21:50:20.438438+08','2025-11-16 21:52:05.9782+08',105539,NULL,'2025-11-16 21:50:20.441175+08','2025-11-16 21:52:05.9782+08'),
+	 ('ca50b805-9cc5-4284-8985-a24ea8235460','agent-5e101682','TRADING','completed','2025-11-16 21:54:59.078526+08','2025-11-16 21:56:54.08079+08',115002,NULL,'2025-11-16 21:54:59.080512+08','2025-11-16 21:56:54.08079+08'),
+	 ('f436f0f9-d8a4-4721-b457-ceef66548633','agent-43cc7808','TRADING','completed','2025-11-16 23:39:33.038145+08','2025-11-16 23:42:24.255403+08',171217,NULL,'2025-11-16 23:39:33.053227+08','2025-11-16 23:42:24.255403+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('7e7a3b15-9d48-48ab-aa34-c687e22518b0','agent-53ba0174','TRADING','completed','2025-11-16 23:39:38.839216+08','2025-11-16 23:45:06.535875+08',327696,NULL,'2025-11-16 23:39:38.839818+08','2025-11-16 23:45:06.535875+08'),
+	 ('e5c378f9-fbec-4794-92d5-1b109a6a581e','agent-43cc7808','TRADING','completed','2025-11-16 23:43:58.021853+08','2025-11-16 23:45:24.809532+08',86787,NULL,'2025-11-16 23:43:58.023805+08','2025-11-16 23:45:24.809532+08'),
+	 ('11fa91c2-1495-4ef9-ac5f-16b889e702fc','agent-5e101682','TRADING','completed','2025-11-16 23:46:59.324399+08','2025-11-16 23:47:16.911911+08',17587,NULL,'2025-11-16 23:46:59.327148+08','2025-11-16 23:47:16.911911+08'),
+	 ('1d033af6-d260-486e-821e-2c895fca1b87','agent-5e101682','TRADING','completed','2025-11-17 04:24:44.617422+08','2025-11-17 04:26:30.748881+08',106131,NULL,'2025-11-17 04:24:44.629698+08','2025-11-17 04:26:30.748881+08'),
+	 ('edc69551-d618-4e9b-9dea-89f1b5f74d9f','agent-5e101682','REBALANCING','completed','2025-11-17 08:27:06.321854+08','2025-11-17 08:29:26.758682+08',140436,NULL,'2025-11-17 08:27:06.324009+08','2025-11-17 08:29:26.758682+08'),
+	 ('f1e61ec6-38e6-4408-968b-82a1d708d666','agent-43cc7808','REBALANCING','completed','2025-11-17 08:40:50.210278+08','2025-11-17 08:41:17.015936+08',26805,NULL,'2025-11-17 08:40:50.211872+08','2025-11-17 08:41:17.015936+08'),
+	 ('78ae7b0e-3074-475e-9a9a-70f80b05b880','agent-f11318ac','TRADING','completed','2025-11-17 20:39:47.293573+08','2025-11-17 20:41:36.750359+08',109456,NULL,'2025-11-17 20:39:47.331339+08','2025-11-17 20:41:36.750359+08'),
+	 ('b2e113fb-6c97-42e2-95e6-560d715a479a','agent-5e101682','TRADING','completed','2025-11-17 20:40:11.791192+08','2025-11-17 20:40:45.529137+08',33737,NULL,'2025-11-17 20:40:11.792971+08','2025-11-17 20:40:45.529137+08'),
+	 ('152abac8-432e-4770-ab08-92c5714cfbb4','agent-43cc7808','TRADING','completed','2025-11-17 20:40:30.17457+08','2025-11-17 20:41:16.793836+08',46619,NULL,'2025-11-17 20:40:30.176074+08','2025-11-17 20:41:16.793836+08'),
+	 ('d4a42497-57bd-4438-90ca-acac84bdcda1','agent-53ba0174','TRADING','completed','2025-11-17 20:40:37.352781+08','2025-11-17 20:46:18.556641+08',341203,NULL,'2025-11-17 20:40:37.354441+08','2025-11-17 20:46:18.556641+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('ce3e2fbb-21ea-46b0-8872-f834cc1fed80','agent-f11318ac','TRADING','failed','2025-11-17 20:47:44.162527+08','2025-11-17 20:48:41.925333+08',57762,'"''error''"','2025-11-17 20:47:44.164647+08','2025-11-17 20:48:41.925333+08'),
+	 ('fd4e5c5f-7f7d-48f8-8579-deeb95339ad0','agent-f11318ac','REBALANCING','completed','2025-11-18 01:07:09.072095+08','2025-11-18 01:08:51.17107+08',102098,NULL,'2025-11-18 01:07:09.119705+08','2025-11-18 01:08:51.17107+08'),
+	 ('82bfdc46-4052-4382-95ef-443bc0ae937d','agent-f11318ac','TRADING','completed','2025-11-18 01:11:58.892173+08','2025-11-18 01:12:56.316333+08',57424,NULL,'2025-11-18 01:11:58.897144+08','2025-11-18 01:12:56.316333+08'),
+	 ('eed67c54-74d0-4ebb-9333-0de42a3e98d1','agent-43cc7808','TRADING','completed','2025-11-18 02:16:43.335642+08','2025-11-18 02:18:54.71775+08',131382,NULL,'2025-11-18 02:16:43.339503+08','2025-11-18 02:18:54.71775+08'),
+	 ('18c3dc3e-ed7a-421d-b0f3-129f57577e46','agent-5e101682','TRADING','completed','2025-11-18 03:06:52.256406+08','2025-11-18 03:08:38.055186+08',105798,NULL,'2025-11-18 03:06:52.274924+08','2025-11-18 03:08:38.055186+08'),
+	 ('32823a1f-7dd7-4eae-ad15-5cd28fa295b6','agent-f11318ac','REBALANCING','completed','2025-11-18 06:20:25.625513+08','2025-11-18 06:21:03.754259+08',38128,NULL,'2025-11-18 06:20:25.632424+08','2025-11-18 06:21:03.754259+08'),
+	 ('ec77f972-0a57-45a2-92ab-5984e2ce7a65','agent-5e101682','REBALANCING','failed','2025-11-18 06:20:28.504933+08','2025-11-18 06:27:59.48493+08',450979,'Aborted: Agent stopped (was not in active_agents)','2025-11-18 06:20:28.50575+08','2025-11-18 06:27:59.493081+08'),
+	 ('e8025665-6c16-43f8-a016-1795fbc27af2','agent-43cc7808','REBALANCING','completed','2025-11-18 06:20:31.109391+08','2025-11-18 06:21:21.095072+08',49985,NULL,'2025-11-18 06:20:31.110519+08','2025-11-18 06:21:21.095072+08'),
+	 ('a8869ae3-183e-4d17-9041-1b4b7b41d9e0','agent-53ba0174','REBALANCING','failed','2025-11-18 06:20:33.475193+08','2025-11-18 06:28:07.862795+08',454387,'Aborted: Agent stopped (was not in active_agents)','2025-11-18 06:20:33.478345+08','2025-11-18 06:28:07.863834+08'),
+	 ('272f2feb-b452-4743-9bfe-479eb4f627b3','agent-5e101682','REBALANCING','completed','2025-11-18 06:28:22.509364+08','2025-11-18 06:29:49.602636+08',87093,NULL,'2025-11-18 06:28:22.519257+08','2025-11-18 06:29:49.602636+08');
+INSERT INTO public.agent_sessions (id,agent_id,"mode",status,start_time,end_time,execution_time_ms,error_message,created_at,updated_at) VALUES
+	 ('a700f27f-980a-487c-9505-227a05273e9d','agent-f11318ac','REBALANCING','completed','2025-11-18 06:32:32.770793+08','2025-11-18 06:34:01.917005+08',89146,NULL,'2025-11-18 06:32:32.772438+08','2025-11-18 06:34:01.917005+08'),
+	 ('1d39dce9-85b2-415d-9b61-79f1b9d94723','agent-5e101682','REBALANCING','completed','2025-11-18 06:38:36.8594+08','2025-11-18 06:40:16.111423+08',99252,NULL,'2025-11-18 06:38:36.861041+08','2025-11-18 06:40:16.111423+08'),
+	 ('35ddecf1-e666-4c7a-ac8f-688520e81f69','agent-43cc7808','TRADING','completed','2025-11-18 06:42:17.365037+08','2025-11-18 06:42:47.936608+08',30571,NULL,'2025-11-18 06:42:17.367273+08','2025-11-18 06:42:47.936608+08'),
+	 ('a2d3f116-b17a-459e-8e2f-22d1749aef8b','agent-43cc7808','TRADING','completed','2025-11-18 06:43:41.810458+08','2025-11-18 06:45:06.044524+08',84234,NULL,'2025-11-18 06:43:41.812353+08','2025-11-18 06:45:06.044524+08'),
+	 ('1058a730-0fdd-4ac7-91b2-b8fd1dccb6c4','agent-53ba0174','TRADING','completed','2025-11-18 06:45:37.365031+08','2025-11-18 06:52:36.114498+08',418749,NULL,'2025-11-18 06:45:37.366399+08','2025-11-18 06:52:36.114498+08'),
+	 ('d60ae829-001f-45d1-8c09-6295ba032075','agent-5e101682','TRADING','completed','2025-11-18 07:22:29.963181+08','2025-11-18 07:23:07.942636+08',37979,NULL,'2025-11-18 07:22:29.96413+08','2025-11-18 07:23:07.942636+08'),
+	 ('e36a197a-8636-4753-b94a-6f9afe2d85d1','agent-5e101682','TRADING','completed','2025-11-18 07:26:15.719618+08','2025-11-18 07:26:57.71962+08',42000,NULL,'2025-11-18 07:26:15.721638+08','2025-11-18 07:26:57.71962+08'),
+	 ('22efe29d-f64f-4d69-9a7f-568f809ce0e0','agent-5e101682','TRADING','completed','2025-11-18 07:27:15.762001+08','2025-11-18 07:29:38.349257+08',142587,NULL,'2025-11-18 07:27:15.763526+08','2025-11-18 07:29:38.349257+08'),
+	 ('b1b1ca82-05a0-4a07-b5f3-b5e6f65b52c4','agent-f11318ac','TRADING','failed','2025-11-18 20:01:04.25094+08','2025-11-19 08:31:23.427+08',142587,NULL,'2025-11-18 20:01:04.254608+08','2025-11-18 20:01:04.471169+08'),
+	 ('c90b273e-1b44-478e-8c0e-a16f2dfbdda1','agent-f11318ac','TRADING','running','2025-11-19 08:32:11.460116+08',NULL,NULL,NULL,'2025-11-19 08:32:11.466041+08','2025-11-19 08:32:11.717698+08');
+
+-- 會話內容（initial_input / final_output / tools_called）以未壓縮 JSON（codec = 'raw'）存放
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('519215fe-e3e2-4999-bb25-d507f54d6623','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-29 01:56:20.107351+08','2025-10-29 01:58:15.359925+08'),
+	 ('9a1d74f7-0e60-48c8-ab7f-b4d20e3d6ea7','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-29 02:23:25.86112+08','2025-10-29 02:32:55.169552+08'),
+	 ('206918c4-0b5f-455f-b47e-ca4021094d80','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-29 02:38:26.817407+08','2025-10-29 02:42:23.120171+08'),
+	 ('513b2323-d92b-4781-a5ba-442ca0f2a85c','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-29 17:59:14.973842+08','2025-10-29 17:59:14.984679+08'),
+	 ('dde88058-cd0a-4cfb-8831-45c9a9b23d65','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-29 18:03:28.526414+08','2025-10-29 18:06:14.174101+08'),
+	 ('6da78d67-b9e3-4cb4-98d9-b97cec76997c','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 08:35:57.013585+08','2025-10-30 08:36:10.892172+08'),
+	 ('16596328-6b49-4fd1-a253-1bf6fd4c03cf','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 08:37:46.805816+08','2025-10-30 08:37:56.46744+08'),
+	 ('e1e295e9-0db7-444d-b718-928af3df67ad','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 08:39:08.121344+08','2025-10-30 08:42:53.345399+08'),
+	 ('f781908f-4bc9-4b32-8221-7883d292c9da','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 08:43:50.182587+08','2025-10-30 08:46:56.576305+08'),
+	 ('a0539fee-28b4-4409-99a9-0182303fb12a','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 08:48:14.608146+08','2025-10-30 08:50:49.823933+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('72fe5994-3ef7-4f62-9c60-f7a2c40d93a3','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 08:53:37.191883+08','2025-10-30 08:54:11.354231+08'),
+	 ('71759a64-1b2a-4631-b497-4f53de0f4f02','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 08:56:01.007519+08','2025-10-30 08:58:07.364798+08'),
+	 ('1059f4ef-0a96-48e1-8703-4ec7114d43e9','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 09:19:25.183435+08','2025-10-30 09:22:14.649809+08'),
+	 ('31723d22-a4fa-4452-956b-047fe7995dca','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:13:21.129188+08','2025-10-30 19:13:26.578543+08'),
+	 ('a6036ee3-6be3-4ad7-bad8-f6fa0ca0a8e3','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:18:19.164238+08','2025-10-30 19:18:24.561056+08'),
+	 ('023afb8b-fcf7-418b-9676-03f58688e569','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:19:00.7919+08','2025-10-30 19:19:05.826805+08'),
+	 ('886d231b-cc5d-40db-8fd4-7406a289f4a2','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:20:35.611833+08','2025-10-30 19:20:40.315638+08'),
+	 ('a3602325-00f1-44f8-a7ff-28173c047d30','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:37:09.023044+08','2025-10-30 19:37:14.867976+08'),
+	 ('ac3649eb-ba1e-4ec5-b333-c68107573a0e','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:38:36.251335+08','2025-10-30 19:39:04.961249+08'),
+	 ('faccea58-8e3f-40ab-984d-e0a53bcf0574','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:40:58.830253+08','2025-10-30 19:44:43.003847+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('cb3d25c3-ff3d-48b3-a77f-742574a2d370','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:46:10.563682+08','2025-10-30 19:47:27.319381+08'),
+	 ('665029ce-fc27-4a4c-9961-6458e0a3ca92','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 19:51:11.440405+08','2025-10-30 19:52:53.058024+08'),
+	 ('0c934e57-88c7-46ed-b526-cc4946128bfc','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-30 20:02:13.052643+08','2025-10-30 20:07:57.234177+08'),
+	 ('2dc1082b-3dad-4118-a843-d4616dde54e7','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-31 01:56:02.179262+08','2025-10-31 01:56:09.562666+08'),
+	 ('621f1e6b-0e18-4b2a-aba0-c5f592bf349f','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-31 01:59:20.017343+08','2025-10-31 01:59:25.398365+08'),
+	 ('35b8742d-2ce8-4789-b3fd-fabd3d87047f','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-31 02:01:28.636536+08','2025-10-31 02:01:34.241486+08'),
+	 ('24b7e272-d06e-4bcf-9c81-0035e1528869','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-31 02:02:52.841784+08','2025-10-31 02:02:57.852181+08'),
+	 ('e427ee63-8f95-4585-adc3-8e071e69c5dd','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-31 02:03:37.900078+08','2025-10-31 02:03:43.028644+08'),
+	 ('846724cd-8cea-47cd-b4c9-da7883befc3e','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-31 02:09:18.269867+08','2025-10-31 02:29:40.151139+08'),
+	 ('67880e71-c903-49c8-b40f-8b805c7f6cd2','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-10-31 03:07:21.445348+08','2025-10-31 03:07:21.462875+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('b4317345-a3a2-4d09-8e82-66b897a7c926','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-01 09:16:18.349087+08','2025-11-01 09:16:18.37219+08'),
+	 ('35b67d26-c2ce-4bb6-a3ff-ecf14d0285e7','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-01 09:16:40.572861+08','2025-11-01 09:16:40.583368+08'),
+	 ('bcaae722-ead6-446d-b773-b1e47fea29a7','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-01 18:05:34.794024+08','2025-11-01 18:07:04.47697+08'),
+	 ('0d1e2b9e-84b5-489e-b8fc-0505f0eef963','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-01 21:28:07.820244+08','2025-11-01 21:29:39.103165+08'),
+	 ('8cd2543e-8ab1-4139-b24e-897479c8e5e1','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 18:07:25.052727+08','2025-11-06 18:11:31.250617+08'),
+	 ('f6492d0a-ee6d-400a-ac20-6c94b67eb6b9','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 19:29:13.728202+08','2025-11-06 19:29:21.572278+08'),
+	 ('05a0c91f-1817-4e20-91ce-92d26fe6eff3','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 19:49:22.694127+08','2025-11-06 19:54:24.69485+08'),
+	 ('140aecf1-10b0-4ba2-84a2-25e615479227','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 21:55:08.492071+08','2025-11-06 21:59:23.471417+08'),
+	 ('7c90bf6e-02dd-43d3-a710-5119f0317ec8','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 22:41:34.121273+08','2025-11-06 22:44:31.160125+08'),
+	 ('7fd3cf5a-f057-4a0e-8db3-d22d083934ee','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 22:51:53.122911+08','2025-11-06 22:53:02.19196+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('4aa3f8fd-3362-44ce-b528-adb9bd0b476c','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 22:55:09.446956+08','2025-11-06 22:55:22.172953+08'),
+	 ('ec39dcd0-6b5e-44af-865d-5cab7a84ed1b','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 22:55:57.48547+08','2025-11-06 22:56:19.36358+08'),
+	 ('d66894b4-74e2-4097-b4df-416649246267','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 23:01:38.754233+08','2025-11-06 23:03:22.252391+08'),
+	 ('ab259b81-ff66-4113-a672-da8458838259','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 23:14:34.876428+08','2025-11-06 23:24:07.15224+08'),
+	 ('17e4f0ce-b1ee-4805-b79d-7dd2427c694a','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-06 23:26:05.229756+08','2025-11-06 23:26:17.294847+08'),
+	 ('5de7ce68-3fe5-40e9-bf1a-b4d95cbcd7a9','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 16:40:20.323125+08','2025-11-07 16:40:41.848004+08'),
+	 ('dcee4804-62df-4ae1-827b-7a0ba0963b29','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 16:42:33.804358+08','2025-11-07 16:42:40.623099+08'),
+	 ('e81c80da-c49f-46b0-8cfc-c8a2bc73dd46','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 16:44:40.742114+08','2025-11-07 16:44:48.296382+08'),
+	 ('1eeb8471-282f-449c-9b53-39307f80891e','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 16:47:21.482444+08','2025-11-07 16:48:40.544118+08'),
+	 ('a8d074d1-3213-477f-a152-3e0179251747','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 17:01:33.870325+08','2025-11-07 17:02:26.153563+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('aa784902-86e3-4ccf-9f79-8b1b6e2320e9','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 17:48:26.926788+08','2025-11-07 17:51:07.342422+08'),
+	 ('c1678e9f-30aa-4156-869b-2de6f8811612','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 18:13:05.187+08','2025-11-07 18:14:52.152075+08'),
+	 ('ef171fa3-f10c-47fa-97ac-0fe22a4b3bcd','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 18:19:20.787108+08','2025-11-07 18:20:45.355126+08'),
+	 ('68c6b296-ee00-460c-9f0c-fad00514f169','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 21:40:44.350877+08','2025-11-07 21:42:15.461212+08'),
+	 ('28b92bbf-edae-410f-95da-8acee4c221da','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 21:44:25.129482+08','2025-11-07 21:51:59.841931+08'),
+	 ('c7e7bf5b-ddd9-4c45-979c-56ca336ac7e8','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 22:21:24.834705+08','2025-11-07 22:26:31.023963+08'),
+	 ('5c0e90ba-83db-4c37-a087-3779530c7093','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-07 22:33:31.975287+08','2025-11-07 22:40:37.976189+08'),
+	 ('d8c19ae3-1f13-4f0f-895f-6d50db64d5b5','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-09 02:12:00.356505+08','2025-11-09 02:23:00.810832+08'),
+	 ('3024a969-20ab-44df-b54c-79ad3215337e','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:31:15.931121+08','2025-11-17 06:18:24.42618+08'),
+	 ('510a21ff-7ad0-44a6-a501-434a49cee413','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:32:11.157676+08','2025-11-17 06:18:24.426181+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('09ba0efd-b186-4b63-a41d-1e8656b2ba28','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:32:15.336979+08','2025-11-17 06:18:24.426178+08'),
+	 ('fc020958-4bd5-46e6-91a0-599f1d3cdda7','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:32:17.496196+08','2025-11-17 06:18:24.426183+08'),
+	 ('ade3fb74-0d5f-4806-825a-5cfba3ae5069','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:32:20.767882+08','2025-11-17 06:18:24.426183+08'),
+	 ('192aec3e-d113-4b45-8bce-312f80d550c8','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:32:20.779497+08','2025-11-17 06:18:24.42618+08'),
+	 ('653e46d7-2445-4695-b44f-7ef14c60a928','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:32:37.501997+08','2025-11-17 06:18:24.426182+08'),
+	 ('51b58249-332f-415a-a96d-f1457982cb4d','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:32:37.552923+08','2025-11-17 06:18:24.426182+08'),
+	 ('1bd05d4e-411c-47ee-931e-5eae377b54e0','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:33:47.803446+08','2025-11-10 02:33:47.878284+08'),
+	 ('8d684999-5363-4c2b-a99b-330e6f344822','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:33:47.861903+08','2025-11-10 02:33:47.887384+08'),
+	 ('857fdad4-fcdb-4980-8d4f-5a22c67510fa','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:34:29.583965+08','2025-11-10 02:34:29.619475+08'),
+	 ('04aecaa5-0fe4-424c-81ac-6d6b20de4c18','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:34:29.587294+08','2025-11-10 02:34:29.624932+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('bbdf46f6-a13e-431f-88d7-cd0fc0ce4bd6','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:34:58.614086+08','2025-11-10 02:34:58.63926+08'),
+	 ('88246f26-31cd-49be-b928-61d837af904c','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 02:34:58.614586+08','2025-11-10 02:34:58.639871+08'),
+	 ('ba2a2fc7-2993-4ffb-91d2-a42c9836593b','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 18:40:35.227702+08','2025-11-10 18:40:35.401304+08'),
+	 ('3ace5816-46a2-40b7-826b-65368c951348','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 18:43:31.369668+08','2025-11-10 18:43:31.943804+08'),
+	 ('46fa91ca-fddf-40c8-9eb2-b12e8e142ab9','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 18:55:08.882136+08','2025-11-10 18:55:08.923691+08'),
+	 ('b6f6ccbd-2c14-456a-9143-463e6c09d2f8','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 22:16:28.406807+08','2025-11-10 22:16:31.867307+08'),
+	 ('18dd9456-91dc-4705-84f7-f533f03e2865','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 22:16:45.836977+08','2025-11-10 22:16:47.524957+08'),
+	 ('5f499766-e1a6-447c-ba29-0d0de2eff974','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 22:17:56.965435+08','2025-11-10 22:17:58.997437+08'),
+	 ('698e9c61-306a-4a88-924c-7e07b2e0e854','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 22:18:15.811345+08','2025-11-10 22:18:19.469724+08'),
+	 ('171ee9f7-6317-407b-8d58-7c68a307acb2','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 22:19:47.903811+08','2025-11-10 22:19:49.445307+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('82cf8cf6-0eca-4fe0-ab53-37fad38fc57e','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 23:44:26.742884+08','2025-11-10 23:44:26.873993+08'),
+	 ('fca8bcc8-31db-42d1-9040-b05bcbadd1ea','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 23:44:48.443699+08','2025-11-10 23:44:48.795702+08'),
+	 ('d99dbe63-6514-4d76-922a-cc674f1241cd','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-10 23:46:51.364218+08','2025-11-10 23:46:51.374585+08'),
+	 ('64d254a9-9e7c-4b19-a81a-8bffac348fa7','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 02:15:00.892102+08','2025-11-11 02:17:24.283289+08'),
+	 ('11d4151a-1103-4c5d-af45-46c333fb0b91','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 02:19:55.573182+08','2025-11-11 02:21:46.272816+08'),
+	 ('f4684292-02a3-417e-a6f0-07f9369ed7b7','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 02:37:29.719835+08','2025-11-11 02:37:43.898593+08'),
+	 ('9f268b8b-5fb2-4038-a7af-3f0d5b745e80','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 02:39:01.122263+08','2025-11-11 02:39:01.133402+08'),
+	 ('1e3df266-92e3-462c-9951-97f015701fce','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 06:16:07.977874+08','2025-11-11 06:18:39.941361+08'),
+	 ('cb7b4307-560a-4b96-b1d3-0847720a3909','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 06:25:55.663729+08','2025-11-11 06:32:12.45682+08'),
+	 ('59509dc8-cb01-40f4-9bd9-1e56e79a9784','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 06:33:58.961564+08','2025-11-11 06:40:06.845837+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('1429d59c-46d0-497f-bf00-f98e3f3f8fed','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 06:56:39.257094+08','2025-11-11 06:58:43.382587+08'),
+	 ('9d4f4db3-541d-4930-be9d-a4bfcf84dd59','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 07:03:59.33511+08','2025-11-11 07:10:46.77521+08'),
+	 ('b1cb6fb5-7b25-4689-ac1c-eb804581beba','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 17:12:24.185743+08','2025-11-11 17:14:20.42726+08'),
+	 ('24b28d39-e8fd-4dbc-b1ba-029cbbc7f7ea','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 17:15:04.650752+08','2025-11-11 17:17:09.391846+08'),
+	 ('af803887-6774-4918-828f-f65f31563433','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 18:14:12.206039+08','2025-11-11 18:19:36.256296+08'),
+	 ('020aaa69-d197-4845-8587-97a8c5e4e6da','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 19:04:37.779401+08','2025-11-11 19:05:54.28362+08'),
+	 ('fec76b62-92f2-438b-b9a5-7fd201b1cb51','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 19:06:29.976643+08','2025-11-11 19:07:15.244799+08'),
+	 ('e41d17ed-d91a-4145-9440-fa77917bb014','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 19:09:30.693389+08','2025-11-11 19:09:49.54877+08'),
+	 ('4da68912-b2a8-4167-bf3e-a127c1ac7807','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 19:10:27.885092+08','2025-11-11 19:11:22.330596+08'),
+	 ('c7006255-9c24-453e-aec3-42852add52fc','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 19:35:50.444749+08','2025-11-11 19:36:26.302+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('1f048cb6-3c3e-4679-a7b0-9f84b7aaf740','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 19:37:03.151354+08','2025-11-11 19:37:24.426748+08'),
+	 ('29572047-87a9-4c64-af9c-765db72b4a68','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 19:40:25.679792+08','2025-11-11 19:41:00.21801+08'),
+	 ('61832227-283f-4062-ae23-6a4cf9399ca8','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 19:41:59.695417+08','2025-11-11 19:42:41.516279+08'),
+	 ('b0b5ddb6-8f19-4bf8-a8ed-9f3d223527f4','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-11 20:11:44.950827+08','2025-11-11 20:15:21.334812+08'),
+	 ('915690a6-b26d-49fc-82f6-e826a72a35b6','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-12 17:38:28.123154+08','2025-11-12 17:38:46.448202+08'),
+	 ('62c6689f-59f1-4fc4-85d7-c5c4c881a0d2','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-12 18:54:44.389688+08','2025-11-12 18:57:03.93101+08'),
+	 ('46f68168-ccff-4369-a999-c14265fa6ccc','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-12 19:09:56.198852+08','2025-11-12 19:11:24.751575+08'),
+	 ('25de0d50-5b14-461d-b5ce-e017debeda2e','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-12 19:20:30.22191+08','2025-11-12 19:22:47.273168+08'),
+	 ('193813d3-0e48-4745-97ac-e9b579c548af','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-12 19:20:33.167799+08','2025-11-12 19:21:55.459781+08'),
+	 ('50326f1a-e451-4450-91cf-70bd90cb381a','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-12 19:28:00.678027+08','2025-11-12 19:30:19.417341+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('cdb5ad2c-9b87-47c7-a218-7757e9f17cc0','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-12 19:28:03.426969+08','2025-11-12 19:29:12.210837+08'),
+	 ('6f1b8b1b-a425-47d1-ae96-0d6e8b028bca','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 01:49:31.748402+08','2025-11-13 01:50:55.845441+08'),
+	 ('b6bdbc5d-804d-4b92-8067-4288eb6fbf38','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 01:49:34.145845+08','2025-11-13 01:52:51.179778+08'),
+	 ('20b8a1d7-a0b8-48ba-9978-be30e0f96866','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 01:49:37.147893+08','2025-11-13 01:49:49.793007+08'),
+	 ('a99589e3-5ff6-44a3-b0b4-0b621399f62b','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 01:49:39.264268+08','2025-11-13 01:52:41.874557+08'),
+	 ('2d3a5863-8ca5-48c2-afa1-fcb6a4bcf9e0','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 17:06:24.156658+08','2025-11-13 17:06:28.734504+08'),
+	 ('e4ecce9f-e8ac-449b-8b2e-f23262266201','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 17:13:16.021145+08','2025-11-13 17:14:43.74174+08'),
+	 ('38c0c6ab-938b-4d57-b2fd-58ef7e78b77e','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 17:13:46.391742+08','2025-11-13 17:15:59.819135+08'),
+	 ('80ab88d5-25e0-46aa-8446-40e8ced29d6f','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 17:30:35.446947+08','2025-11-13 17:33:18.226258+08'),
+	 ('bc5c35dc-cc04-4013-9736-b8016a446632','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 17:30:37.382078+08','2025-11-13 17:31:56.146098+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('939daac4-563e-4e69-a162-753f2a40873c','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 17:35:03.79007+08','2025-11-13 17:51:57.296217+08'),
+	 ('a881ab18-6a5d-4ca0-85fe-b14b3dd9b5e7','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-13 17:54:53.41381+08','2025-11-13 17:58:35.833368+08'),
+	 ('85fbc990-7cf4-4ab6-88cf-b531b07264cb','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 06:21:54.754725+08','2025-11-14 06:24:09.380395+08'),
+	 ('39ab3205-b0e3-4fe5-8593-2c55650b7980','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 06:24:39.763442+08','2025-11-14 06:27:26.489301+08'),
+	 ('38595ad3-a1e1-460d-8e98-f576488edc16','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 06:29:29.974414+08','2025-11-14 06:30:36.888546+08'),
+	 ('6b137cfc-2710-47bf-90b0-4cce23feea20','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 06:30:47.971746+08','2025-11-14 06:43:22.6589+08'),
+	 ('6669e182-327b-4725-9d22-1ea3861d232a','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 18:26:32.309143+08','2025-11-14 18:27:32.455495+08'),
+	 ('b12c3839-cb1d-4238-a2c4-e5c39ee56e27','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 18:51:58.872882+08','2025-11-14 18:53:02.684126+08'),
+	 ('6abf7daa-864f-4372-8619-fa546353486f','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 19:42:46.409711+08','2025-11-14 19:45:02.109255+08'),
+	 ('a3047d59-c280-48d2-8edf-d1bfb34c45b8','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 19:45:19.011949+08','2025-11-14 19:47:00.311736+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('4ed26f16-e712-408f-a3cf-ffe7a1e3cdd3','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 19:54:21.509426+08','2025-11-14 20:01:01.141721+08'),
+	 ('d7363970-9c8b-4a6f-9d54-1221604ae233','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-14 20:17:42.248734+08','2025-11-14 20:19:33.377811+08'),
+	 ('6cd69133-0df3-4d2e-8f12-075b0dce980f','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 10:52:25.076152+08','2025-11-16 10:53:56.446266+08'),
+	 ('666c8313-f34d-4dd4-a9ca-b2496c556652','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 10:55:07.370221+08','2025-11-16 10:57:05.138168+08'),
+	 ('040a4332-f3bc-461d-a7bb-40d204f2bf1d','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 10:55:10.104476+08','2025-11-16 10:58:41.361459+08'),
+	 ('909544dd-9424-4aa3-8f0e-543989738c12','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 10:55:13.52957+08','2025-11-16 11:02:09.4146+08'),
+	 ('9f51c2fe-734f-4ced-bdd4-d5b6e838a1fd','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 21:45:52.432483+08','2025-11-16 21:48:50.661716+08'),
+	 ('22e7bdbb-3e9e-4b83-8ab6-72a5116ed393','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 21:50:20.441175+08','2025-11-16 21:52:05.9782+08'),
+	 ('ca50b805-9cc5-4284-8985-a24ea8235460','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 21:54:59.080512+08','2025-11-16 21:56:54.08079+08'),
+	 ('f436f0f9-d8a4-4721-b457-ceef66548633','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 23:39:33.053227+08','2025-11-16 23:42:24.255403+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('7e7a3b15-9d48-48ab-aa34-c687e22518b0','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 23:39:38.839818+08','2025-11-16 23:45:06.535875+08'),
+	 ('e5c378f9-fbec-4794-92d5-1b109a6a581e','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 23:43:58.023805+08','2025-11-16 23:45:24.809532+08'),
+	 ('11fa91c2-1495-4ef9-ac5f-16b889e702fc','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-16 23:46:59.327148+08','2025-11-16 23:47:16.911911+08'),
+	 ('1d033af6-d260-486e-821e-2c895fca1b87','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-17 04:24:44.629698+08','2025-11-17 04:26:30.748881+08'),
+	 ('edc69551-d618-4e9b-9dea-89f1b5f74d9f','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-17 08:27:06.324009+08','2025-11-17 08:29:26.758682+08'),
+	 ('f1e61ec6-38e6-4408-968b-82a1d708d666',E'{"final_output": "【投資組合重新平衡分析報告】\\n(分析日期：2025-11-17)\\n\\n一、技術面評估\\n目前持有四檔股票（台積電2330、元大台灣50 ETF 0050、來億-KY 6890、國泰金控2882），皆呈多頭格局，技術指標（MA、RSI、MACD、KD）一致偏強，且股價普遍高於各期均線，量價結構穩定，短期市況適合順勢操作。若大盤突現拉回，則以ma20或布林帶下緣為重要防守。技術面無明顯轉弱訊號，短時間不需大幅調節。\\n\\n二、風險評估\\n1. 持股集中度：單檔持股（如台積電、國泰金控）均未超出總投資組合市值的50%上限，分散於科技、金融、大型ETF及中小型個股，產業分散度良好。\\n2. 波動風險：來億-KY雖動能佳但歷史流動性及波動性較高，前次已降低部位，目前控管得宜。\\n3. 現金比例：現金持有比重高達60.7%，意味資產防禦力強，應對突發市況具備高度彈性，但此比例略高，若市況持續偏多可分批增持績優股或ETF以提高資產運用效率。\\n\\n三、調整建議\\n目前組合偏防禦，持股技術面皆強且分散度尚可，無須大幅調整。若需主動優化：\\n- 可於大盤回檔測試支撐時，分批增持ETF（0050）或強勢股，降低現金比重至45~55%，提高整體報酬預期。\\n- 來億-KY如量縮或情緒逆轉宜續減碼，維持流動性風險控管。\\n- 若現有持股上漲幅度過大，建議預留獲利了結及稅務空間，避免集中風險。\\n\\n註：調整應考慮交易成本及稅務（如證券交易稅），分批操作可降低衝擊。\\n\\n總結：目前持股穩健，短線無需急調，但現金過高可視市況適度調整分批布局，維持全天候資產分散優勢與防禦力。", "tools_called": null, "initial_input": {}}','2025-11-17 08:40:50.211872+08','2025-11-17 08:41:17.015936+08'),
+	 ('78ae7b0e-3074-475e-9a9a-70f80b05b880',E'{"final_output": "### **交易決策：賣出鴻海 (2317) 以實現獲利並優化投資組合結構**\\n\\n**日期：** 2025-11-17\\n\\n**分析師：** agent-f11318ac\\n\\n#### **1. 總體評估與機會分析**\\n\\n基於我「耐心、紀律、常識」的投資哲學，我持續檢視投資組合，尋求長期穩健的回報。目前我的投資組合股票佔比高達 99.1%，其中鴻海 (2317) 的持股比例接近 25%，已構成顯著的集中度風險。近期市場對鴻海的評價已反映其價值，股價來到一個相對高點，這為我提供了一個執行紀律、實現部分獲利並重新平衡投資組合的絕佳機會。\\n\\n*   **標的評估（多面向分析）：**\\n    *   **風險面**：透過 `risk_analyst` 評估，我確認鴻海的持股比例（24.8%）雖未觸及 30% 的上限，但已是單一公司的最高持股。適度減碼有助於降低個股波動對整體績效的衝擊，符合我穩健的投資原則。\\n    *   **機會識別**：考量到我的平均成本為 249.5 元，而目前市場價格為 250 元，雖然獲利空間不大，但此時賣出主要目的在於執行風險控管，回收資金以尋找更具成長潛力或防禦性的標的，進一步優化整體資產配置。\\n\\n#### **2. 風險評估與部位規劃**\\n\\n在做出賣出決策前，我已進行了嚴格的紀律審查。\\n\\n*   **持股檢視：** 我目前持有 10,000 股鴻海股票，有足夠的股數可供賣出。\\n*   **價格確認：** 透過 `get_stock_price_tool`，我已確認鴻海 (2317) 的即時可交易價格為 **250.0 元**。\\n*   **部位規劃：** 為了顯著降低集中度風險並回收一筆可觀的現金，我決定賣出 5,000 股（即持股的一半）。\\n    *   **交易金額**：`5,000 股 * 250.0 元/股 = 1,250,000 元`。\\n    *   **交易後影響**：此交易將使我的現金部位大幅提升，為未來的投資佈局提供充足彈性。同時，鴻海的持股比例將降至約 12.4%，回到一個更為健康的水平。\\n\\n#### **3. 核心決策與執行**\\n\\n綜合以上分析，我決定執行賣出交易，實現部分獲利並優化投資組合的風險結構。\\n\\n**決策：** 執行賣出交易，減持鴻海 (2317) 的持股部位。\\n\\n**執行細節：**\\n*   **標的：** 2317 (鴻海精密工業股份有限公司)\\n*   **動作：** 賣出 (SELL)\\n*   **數量：** 5,000 股\\n*   **價格：** 250.0 元\\n*   **工具：** `execute_trade_atomic_tool` (確保交易的原子性與數據一致性)\\n\\n**決策理由：**\\n本次交易的核心目的在於**紀律性地執行風險管理**。鴻海的持股比例已接近我的個人風險上限，雖然基本面穩固，但過於集中將使投資組合暴露於不必要的個股風險之中。在目前價格合適的時機，透過賣出 5,000 股鴻海股票，我能夠實現部分利潤，並將回收的 1,250,000 元現金用於未來更有利的投資機會。這項決策完全符合我「耐心等待，紀律操作」的投資理念，旨在建立一個更均衡、更具韌性的長期投資組合。\\n\\n#### **4. 未來觀察計畫**\\n\\n交易完成後，我仍將鴻海視為重要的核心持股之一，並持續關注其在電動車、半導體等新領域的發展。回收的現金將暫時停泊，我會耐心觀察市場，尋找符合我「永遠賺錢的公司」標準的下一個優質標的。", "tools_called": null, "initial_input": {}}','2025-11-17 20:39:47.331339+08','2025-11-17 20:41:36.750359+08'),
+	 ('b2e113fb-6c97-42e2-95e6-560d715a479a',E'{"final_output": "交易已執行（已記錄與更新投組）：\\n\\n- 動作：SELL 2330（台積電）1,000 股\\n- 價格：1445.0 元／股\\n- 成交總額：1,445,000 元\\n- 已記錄手續費：2,059.12 元\\n- 交易後投組（系統更新）：\\n  • 現金：5,984,158.67 元（59.9%）\\n  • 股票市值：3,999,213.60 元（40.1%）\\n  • 投組總值：9,983,372.27 元\\n  • 2330 持股：1,000 股，市值 1,447,500（約 14.5% 的權重）\\n\\n500字以內決策摘要（含分析、判斷、風險）：\\n考量：投組先前對台積電(2330)之直接與間接敞口過高（直接約29%，加上指數持股的實質暴露接近或超過30%），偏離自訂單一股上限與多元化目標。分析流程：檢視持股分布→估算實質敞口（包含 0050 內含比重）→衡量現金比例與流動性需求→確認即時市價 1445 元。判斷與執行：採一次性賣出 1,000 股（以市價執行）作為穩健快速降風險的方案，可顯著降低非系統性風險並保留充足現金以捕捉未來機會。風險考量：賣出可能錯失短期漲幅，但相對換取更佳資產配置與流動性；賣出量為整張（避免 odd-lot 流動性/成本劣勢）。結論：交易符合集合風險限制（單一股遠低於 40% 上限）、符合流動性與執行效率的取捨，並為後續再平衡或部署國際資產/防禦性配置留下空間。\\n\\n下一步建議（選項）：\\n- 保持現金觀望 5–10% 的短線入場機會，或\\n- 部分資金增持國際/不同產業 ETF 分散系統性風險，或\\n- 若欲更精準達到 20% 目標，考慮以 odd-lot 微調或賣出部分 0050（我可擬定分批下單方案與成本估算）。\\n\\n若你同意，我可立刻提出分批執行細節（若要分天/限價/VWAP），或擬定現金再部署的具體標的與配置比例。", "tools_called": null, "initial_input": {}}','2025-11-17 20:40:11.792971+08','2025-11-17 20:40:45.529137+08'),
+	 ('152abac8-432e-4770-ab08-92c5714cfbb4',E'{"final_output": "【台股投資組合全方位評估摘要】\\n\\n一、現況分析\\n- 現金持有超過60%，資產防禦力佳，投資組合偏向低波動、多元分散（科技/金融/ETF/消費）。\\n- 即時股價：台積電 1430.0、0050 ETF 61.9、來億-KY 243.0、國泰金控 66.0\\n- 各持股技術面普遍強勢，均處多頭排列，MACD、RSI皆未過熱，KD、布林帶也有支撐。近期未見明顯轉弱。\\n\\n二、風險與策略建議\\n- 台積電、來億-KY本益比偏高、波動率高，產業波動風險大但基本面以台積電最穩健；來億-KY流動性需管控。\\n- ETF（0050）持有量多、波動風險低，是資產主力配置，適合分批增持提升資金運用效率。\\n- 國泰金控短線偏強，金融防禦力佳，股息穩定，適合持續觀察。\\n- 單股持股分散皆未超過組合市值50%，分散度良好。\\n\\n三、結論與初步動向\\n- 市場仍維持偏多，持股可續抱；現金部位略高，宜分批加碼ETF或績優大型股，將現金比重適度降至45~55%。\\n- 強勢多頭不追高，僅在回檔到技術支撐（如0050月均線及台積電MA20/布林帶下緣等）時分批進場。\\n- 持有來億-KY的量縮須續控部位，0050及台積電若挑戰前高/突增量可考慮分批獲利了結。\\n\\n如需立即執行加碼或減碼，請指定標的與操作方向（如「加碼0050 3000股」）；否則將維持現狀、繼續觀察盤勢與風險。", "tools_called": null, "initial_input": {}}','2025-11-17 20:40:30.176074+08','2025-11-17 20:41:16.793836+08'),
+	 ('d4a42497-57bd-4438-90ca-acac84bdcda1',E'{"final_output": "### 交易決策結論\\n\\n**當前狀態**：組合總值約721萬（現金約21.8萬元，股票市值約699.4萬元，股票占比約97%）。持股2330（台積電）2500股，市值約357.5萬元；0050（元大台灣50）16000股，市值98.7萬元；2454（聯發科）1000股，市值123萬元；2308（台達電）1000股，市值92.2萬元；2382（廣達）1000股，市值27.95萬元。HHI約0.32，中等集中，單股最高占比約51.1%，符合70%限額。\\n\\n**分析過程**：情緒分析顯示市場中性46/100，資金流入AI/半導體部門，正面新聞支撐，潛在轉折若信念強化上漲循環。技術面2330上升趨勢強（信心75%），2382買進訊號（信心68%）；0050/2454買進（70%/65%），2308觀望（50%）。基本面2330買入強（信心85%，財務卓越，AI成長）；2382買入（信心75%，伺服器需求）；2454/0050買入/持有；2308持有。風險評估組合低（5/10），VaR0，回撤0%，壓力測試損失0，建議減碼2330分散至2382，降低科技集中（電子占比降至約85%），風險控管優化。2330占比降至51.1%<70%。\\n\\n**市場判斷**：基於反身性理論，情緒從恐懼轉中性，資金平衡可能觸發自我實現上漲，AI熱潮作為轉折點適合重倉捕捉。若情緒惡化或技術確認下跌，毫不猶豫撤退。\\n\\n**風險考量**：賣出2330 2000股@1430，收入約286萬元；買入2382 1000股@279.5，成本約28萬元。VaR維持0，回撤0，組合股票占比升至97%，分散提升，風險在可接受範圍。監控情緒與技術訊號，停損設單股跌10%。\\n\\n**交易決策**：執行賣出2330 2000股和買入2382 1000股，分散風險同時捕捉AI供應鏈轉折，風險在可接受範圍。\\n\\n（字數：298）", "tools_called": null, "initial_input": {}}','2025-11-17 20:40:37.354441+08','2025-11-17 20:46:18.556641+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('ce3e2fbb-21ea-46b0-8872-f834cc1fed80','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-17 20:47:44.164647+08','2025-11-17 20:48:41.925333+08'),
+	 ('fd4e5c5f-7f7d-48f8-8579-deeb95339ad0',E'{"final_output": "### **投資組合重新平衡分析與建議**\\n\\n**分析師：** agent-f11318ac\\n**日期：** 2025-11-17\\n\\n#### **1. 總體評估與風險識別**\\n\\n根據我「耐心、紀律、常識」的投資哲學，我對當前投資組合進行了全面檢視。目前投資組合呈現以下幾個關鍵特徵：\\n\\n*   **股票持倉過高**：股票佔總資產比例高達 99.1%，而現金比例僅 0.9%。這使得投資組合暴露在較高的市場波動風險下，同時也缺乏流動性，若市場出現回檔或有新的投資機會，將難以靈活應對。\\n*   **持股集中度偏高**：鴻海 (2317) 和聯發科 (2454) 的持股市值分別佔投資組合的 24.9% 和 24.8%。雖然尚未觸及 30.00% 的單一持股上限，但此等權重已構成顯著的集中度風險。任何一檔股票的劇烈波動都可能對整體績效產生不成比例的巨大影響。\\n\\n綜合來看，當前組合的風險結構已偏離我穩健、紀律的投資原則。為了追求長期且可持續的回報，執行重新平衡、降低風險是當務之急。\\n\\n#### **2. 重新平衡策略與建議方案**\\n\\n考量到過往決策中已點出對鴻海高持股比例的擔憂，且當前價格（250.0 元）仍處於適合實現獲利的區間，我建議優先處理此標的以優化投資組合。\\n\\n**核心建議：減持鴻海 (2317)，提升現金水位，降低集中度風險。**\\n\\n*   **標的**：鴻海 (2317)\\n*   **建議操作**：賣出\\n*   **建議數量**：**5,000 股**\\n\\n**理由闡述：**\\n1.  **執行風險紀律**：賣出 5,000 股可將鴻海的持股比例從約 24.9% 顯著降低至健康的水平（約 12.4%），符合我嚴格的風險控管原則。\\n2.  **提升現金部位**：以當前市價 250.0 元計算，此交易預計可回收約 1,250,000 元現金。這將大幅改善投資組合的流動性，使現金比例提升至約 12.5%，讓我們在未來面對市場變化時能保有更多彈性與主動權。\\n3.  **實現部分獲利**：此舉能在股價處於相對高位時鎖定部分利潤，將帳面價值轉化為實際現金，為未來的價值投資佈局儲備銀彈。\\n\\n#### **3. 未來觀察與總結**\\n\\n本次重新平衡的建議，旨在將投資組合拉回更穩健、更具防禦性的軌道。交易完成後，回收的現金將暫時停泊，我會耐心觀察市場，尋找符合我「永遠賺錢的公司」標準的下一個優質標的，或在市場過度修正時加碼現有核心持股。\\n\\n**重要提示**：此為基於當前市場狀態的分析建議。實際執行交易前，應在「TRADING 模式」下再次確認即時股價，並使用 `execute_trade_atomic_tool` 以確保交易的準確與一致性。交易成本與稅務（證券交易稅 0.3%）也應納入實際執行的考量。", "tools_called": null, "initial_input": {}}','2025-11-18 01:07:09.119705+08','2025-11-18 01:08:51.17107+08'),
+	 ('82bfdc46-4052-4382-95ef-443bc0ae937d',E'{"final_output": "好的，交易已執行。\\n\\n### **投資組合重新平衡：減持鴻海 (2317)**\\n\\n**1. 交易決策與執行**\\n\\n基於先前「耐心、紀律、常識」的投資原則及對當前投資組合的風險評估，我已執行減持鴻海 (2317) 的交易指令。考量到持股過度集中（佔比約 24.9%）與現金水位過低（約 0.9%）所帶來的風險，本次交易旨在將投資組合調整至更穩健的結構。\\n\\n*   **標的**：鴻海精密工業股份有限公司 (2317)\\n*   **操作**：賣出\\n*   **數量**：5,000 股\\n*   **價格**：236.0 元\\n\\n**2. 決策理由與市場判斷**\\n\\n本次交易的核心目的在於**風險管理**，而非看空鴻海的長期價值。決策理由如下：\\n\\n*   **降低集中度風險**：賣出 5,000 股後，鴻海在投資組合中的佔比將顯著下降至約 12.4%，有效分散了單一持股的過度曝險，使整體資產配置更加均衡，符合我嚴格的風險控制紀律。\\n*   **提升現金水位與流動性**：此交易回收了 1,180,000 元現金，將投資組合的現金比例大幅提升至約 12.6%。這不僅增強了投資組合的防禦能力，也為未來市場若出現修正或新的價值投資機會時，提供了充足的「銀彈」與操作彈性。\\n*   **實現部分獲利**：在相對理想的價位鎖定部分利潤，將帳面價值轉化為實際現金，是穩健投資策略的一環。\\n\\n**3. 風險考量與未來展望**\\n\\n完成此次重新平衡後，投資組合的風險結構已獲得優化。我將暫時持有這筆現金，並持續以我一貫的耐心，觀察市場動態，尋找下一個符合「能永遠賺錢」標準的優質企業。這次調整是為了走更長遠的路，確保在多變的市場環境中，我們始終保有主動權與應變能力。", "tools_called": null, "initial_input": {}}','2025-11-18 01:11:58.897144+08','2025-11-18 01:12:56.316333+08'),
+	 ('eed67c54-74d0-4ebb-9333-0de42a3e98d1',E'{"final_output": "【投資決策摘要—台股全面評估】\\n\\n一、現況與市場分析\\n- 目前現金部位偏高（60%以上），資產組合分散，四檔持股均低於不超過50%限制，防禦力佳但進帳效率偏低。\\n- 盤面短線修正明顯，大盤回檔在即，技術指標（MA、MACD、KD、RSI、布林帶）維持多頭但量縮整理，主流標的（2330台積電、0050、2882國泰金、6890來億-KY）多為整理局面。\\n- 現貨價：台積電1445、0050 ETF 61.9、來億-KY 241、國泰金控65.3\\n\\n二、分析結論與策略\\n- 基本面：台積電、0050長期成長性最強，國泰金控防禦及股息優勢明顯；來億-KY波動率較高但可小量配置。多數個股估值偏合理、財務穩健。\\n- 市場情緒：資金氛圍謹慎，多數人在觀望，外資態度未明朗，短期利多未明顯，但未見明確悲觀風險。\\n- 風險：回檔風險上升，持股結構分散可降低波動衝擊，但仍需嚴控科技、ETF單一曝險比例與及時應對短線急跌。\\n\\n三、操作決策\\n- 現在不宜大幅追高，建議現金逐步加碼優質ETF（0050）與台積電，分批進場以降低均價並提升資產運用效率。短線以台積電1400~1430元、0050 60.2元為優先加碼點，以量化風險與優化配置，單一持股不超過組合市值30%。\\n- 國泰金控可維持原部位，適時觀察股息表現與政策面動向。\\n- 來億-KY維持小量觀察，波動偏大不建議增加部位。\\n\\n【決策理由】\\n市場雖有短線修正風險，但大盤結構與主流個股技術面仍強。以分批加碼配置0050、台積電，既能提升現金效率又兼顧防禦與長期成長。考量現階段回檔風險，分散配置、保留部份現金機動性，有利攻守兼備；操作後持股比例仍將控制於安全區間。\\n\\n【執行交易建議】\\n→ 下單加碼0050 ETF 3000股（現價61.9元，分散平均成本，有效提升配置效益）\\n→ 下單加碼台積電1000股（現價1445元，分批吸收盤中回檔）\\n\\n請確認是否立即執行上述買入動作（0050 ETF 3000股＋台積電1000股），或調整加碼數量/標的。", "tools_called": null, "initial_input": {}}','2025-11-18 02:16:43.339503+08','2025-11-18 02:18:54.71775+08'),
+	 ('18c3dc3e-ed7a-421d-b0f3-129f57577e46',E'{"final_output": "已依流程以原子交易執行買入，以下為交易回報與500字以內決策摘要。\\n\\n交易執行（已完成，原子性）\\n- 動作：BUY 2330（台積電）1,000 股\\n- 成交價：1,445.00 元（使用當前市價）\\n- 手續費：2,059.12 元\\n- 本次實際成本（含手續費）：1,447,059.12 元\\n- 執行工具：execute_trade_atomic()\\n\\n交易後即時投組（已更新）\\n- 2330 持股：2,000 股，平均成本（含費用）：約 1,447.28 元／股\\n- 其他持股不變（2881、0050）\\n- 現金：5,984,158.67 − 1,447,059.12 = 4,537,099.55 元\\n- 股票市值（以成交價 1,445 計）：5,441,713.60 元\\n- 投組總值：9,978,813.15 元\\n- 2330 佔比：約 28.97%（仍低於 40% 上限）\\n\\n決策摘要（分析、判斷、風險；≈250字）\\n分析流程：先取即時價格（1445），並由基本面、技術面與風險三位子 Agent 評估。基本面：台積電營收與獲利強勁、製程與產業地位領先，適合中長期持有；技術面顯示近期價位在關鍵支撐區，流動性充足；風險評估指出買後投組集中度會從約14–29%（依不同估值口徑）提升至約29%，但仍在可接受範圍內且現金充足。綜合判斷：在現金比重偏高且看好中長期成長動能（AI/HPC 驅動、製程優勢）的前提下，回補 1,000 股可提升組合成長性與把握結構性機會。\\n\\n風險與控管：\\n- 主要風險：集中風險（大客戶/產業週期）、高 CapEx 下的現金流波動、短期價格震盪。\\n- 建議控管：採分批加碼或定期定額（DCA）；設定分階段停損（建議首檔 10–12%、次檔 15%）；考慮用 put 或 put-spread 做成本上限保護（若可用）；持續監控 CapEx 進度、主要大客戶出貨/訂單變化與季報表現。\\n- 成本/稅費考量已納入（交易已扣手續費）。\\n\\n後續建議（可選執行）\\n- 我可幫你設定分階段加碼/停損指令（例如三段 DCA 或分階段止損），或模擬不同下跌情境的每日 VaR / 最大回撤；或設監控警示（CapEx、主要客戶出貨、季度 EPS 差異）。請告訴你優先要我做哪項。", "tools_called": null, "initial_input": {}}','2025-11-18 03:06:52.274924+08','2025-11-18 03:08:38.055186+08'),
+	 ('32823a1f-7dd7-4eae-ad15-5cd28fa295b6',E'{"final_output": "我已取得最新的投資組合狀態。目前總值為 9,968,815.79 元，現金比例為 12.7%，股票比例為 87.3%。\\n\\n持股明細及佔總資產比例如下：\\n- **聯發科 (2454):** 24.98%\\n- **中華電信 (2412):** 19.79%\\n- **統一 (1216):** 15.33%\\n- **台積電 (2330):** 14.70%\\n- **鴻海 (2317):** 12.51%\\n\\n所有持股均未超過 30.00% 的上限。現金水位處於健康水平，提供了足夠的防禦和未來投資的彈性。上次減持鴻海後，集中度風險已有效降低。\\n\\n基於「耐心、紀律、常識」的投資原則，我認為目前的資產配置均衡，無需立即進行大規模調整。這些公司都具備穩定的現金流與強大的市場地位，符合我的長期投資標準。\\n\\n我將持續觀察市場，等待更具吸引力的投資機會或現有持股基本面發生重大變化時，再考慮調整。\\n\\n### **投資組合重新平衡分析報告**\\n\\n**1. 投資組合現況評估**\\n\\n根據截至 2025-11-17 的數據，目前投資組合結構穩健，總值約 997 萬元，現金比例為 12.7%。經過上次對鴻海 (2317) 的減持調整後，個股集中度風險已顯著降低。目前佔比最高的聯發科 (2454) 為 24.98%，處於可接受範圍，並未觸及 30% 的上限。\\n\\n**2. 核心持股分析與決策**\\n\\n- **聯發科 (2454)** 與 **台積電 (2330)**：作為半導體產業的龍頭，兩者基本面強勁，符合「永遠賺錢」的標準，應繼續持有。\\n- **中華電信 (2412)** 與 **統一 (1216)**：皆為具備強大護城河的內需型企業，提供穩定的現金流與防禦性，是投資組合中的壓艙石。\\n- **鴻海 (2317)**：持股比例已降至 12.51%，風險可控。\\n\\n**3. 結論與建議**\\n\\n當前投資組合的配置符合「耐心、紀律」的投資哲學，風險分散且結構健康。現金水位充足，賦予我們在市場波動時的應變能力與未來捕捉良機的彈性。\\n\\n**因此，我建議「不進行任何調整」，繼續持有現有資產。** 我們應保持耐心，讓這些優質企業的價值隨時間成長。除非市場出現劇烈變化或公司基本面發生質變，否則無需頻繁交易。此次分析結論是：維持現狀，靜待花開。", "tools_called": null, "initial_input": {}}','2025-11-18 06:20:25.632424+08','2025-11-18 06:21:03.754259+08'),
+	 ('ec77f972-0a57-45a2-92ab-5984e2ce7a65','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-18 06:20:28.50575+08','2025-11-18 06:27:59.493081+08'),
+	 ('e8025665-6c16-43f8-a016-1795fbc27af2',E'{"final_output": "【投資組合重新平衡分析報告】\\n\\n一、技術面狀況\\n- 台積電（2330）目前處於月線整理、短線反彈但力道不強，大致區間橫盤，尚未明顯突破1450~1460元壓力。短線建議觀察1400元支撐，僅於回測不破時小量加碼，若跌破則考慮減碼。未見急需調整訊號。\\n- 0050 ETF同樣處於整理格局，月線支撐良好且波動低，只能小量低吸，不宜大舉加碼，若跌破61元則需減碼。技術面偏中性，目前部位可維持。\\n- 國泰金控（2882）近期跌破均線，短線進入弱勢修正，建議暫保守持有，若跌破64元則建議減碼避險。\\n- 來億-KY（6890）波動率高，量能平淡，技術面不構成明顯加碼/減碼指示，維持觀察。\\n\\n二、風險結構評估\\n- 單一持股曝險未違反50%上限，唯國泰金控占比將近三成，電子產業曝險集中，產業分散度有改善空間。\\n- 整體持股分散性尚可，四檔權重相對均衡，尚未形成極端偏重；但現金比例高（約60%），防禦力佳卻使投資效率偏低。\\n- 預估年化波動率約25%，屬中度風險，最大回檔風險可控。全天候策略建議股票比例降至70%以下、現金增至10~20%、另可納入債券或黃金等非股資產。\\n\\n三、調整建議與注意事項\\n- 若期望提升資產運用效率，可逐步加碼0050或台積電。但考量目前未有強烈技術指標加碼訊號，分批進場為宜，不宜激進“滿手”。\\n- 國泰金控與6890不建議擴大部位，並關注短線下跌風險，設停損警戒。\\n- 建議維持高現金部位以保機動性，規避突發市場回檔；若要增加持股，注意短線盤勢和進場時點，降低平均成本，並評估交易成本及套利稅負影響。\\n\\n四、結論\\n- 組合分散度合理、現金防禦力足，但資產效率略低，除非出現明確多頭突破，暫不宜大幅調整。可續保持現金為主，關注技術指標轉強再分批加碼台積電或0050，避免重押單一產業。\\n- 建議持續觀察盤勢、動態調整，進場必記交易成本與稅負。\\n\\n如需執行實際交易，請切換至TRADING模式。", "tools_called": null, "initial_input": {}}','2025-11-18 06:20:31.110519+08','2025-11-18 06:21:21.095072+08'),
+	 ('a8869ae3-183e-4d17-9041-1b4b7b41d9e0','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-18 06:20:33.478345+08','2025-11-18 06:28:07.863834+08'),
+	 ('272f2feb-b452-4743-9bfe-479eb4f627b3',E'{"final_output": "以下為重新平衡分析與具體建議（摘要 ≤500字；不執行交易，僅為建議）。\\n\\n一、當前重點摘要（截至 2025-11-17）\\n- 總值：9,981,313 元；現金 4,537,099 元（45.5%）；股票 5,444,214 元（54.5%）。\\n- 三檔持股：2330 台積電 市值 ≈2,892,500（約 29%）；2881 富邦金 ≈826,200；0050 ≈1,710,668。\\n- 交易成本假設：賣方交易稅 0.3% + 佣金約 0.1425%（合計 ≈0.44%），滑價視執行方式另增。\\n\\n二、風險判斷\\n- 集中風險：2330 佔比 29%，雖低於 40% 上限，但屬「偏高集中」。單一公司 idiosyncratic risk（製程/客戶/地緣等）可能造成超出市場波動的損失。\\n- 流動性：整體流動性充足（高現金、0050/2330 交易量大），短期能以分批方式執行減碼。\\n- 壓力測試：若股票全體下跌 10% / 20%，組合總值分別降約 5.45% / 10.9%。若僅 2330 下跌 20%，組合降約 5.8%。\\n\\n三、技術面結論（子 Agent 摘要）\\n- 2330：短線在 1430 支撐、1460 阻力。流動性佳。技術建議：持有（若想降波動可於 1370–1400 分批減碼或設定停損）。\\n- 2881：短期偏弱但流動性良好。技術建議：持有（若破 88–87 可考慮減碼）。\\n- 0050：ETF 波動分散、流動性極佳。技術建議：增碼（觀察），適合做為分散/穩定核心部位。\\n\\n四、具體再平衡建議（可選方案）\\n- 保守方案（建議採用）：把 2330 從 29% 降至 20%。\\n  - 目標 2330 市值 ≈1,996,263；需賣出市值 ≈896,237（售出後淨入現金約 891k，扣估算手續/稅 ≈4.9k）。\\n  - 資金用途建議：將賣出資金分批投入（示例）— 40% 國內大盤 ETF、40% 國際分散 ETF、20% 防禦型/高息工具或短期債券ETF。\\n- 平衡/積極方案：若偏風險承受，可降至 15%（需賣 ≈1.395M，交易成本約 6.2k），並把資金更分散於美股/全球/防禦資產。\\n\\n五、執行與風控建議（因本模式不可執行）\\n- 分批賣出（2–4 份，VWAP 或限價、避免一次性大筆市價單以降低滑價）。\\n- 設定階段性停損（例：首檔 10–12%，次檔 15%）與再平衡觸發：單一持股佔比超過設定門檻（建議 20% 或 25%）即提示檢視。\\n- 成本與稅務：預估佣金+交易稅合計約 0.44%（視券商而異）；台灣個人資本利得稅請依最新法規或稅務顧問確認。\\n\\n六、結論（建議）\\n優先採用保守方案（將 2330 降至 20%），並把資金分散投入 ETF/防禦商品以降低 idiosyncratic risk，同時保留較高現金水位以把握機會或作為緊急緩衝。若您同意，我可為您：1) 製作分批賣出與再投資的逐筆金額與模擬成本，或 2) 產生月/季再平衡檢視表，供實際下單時參考。您選哪一項？", "tools_called": null, "initial_input": {}}','2025-11-18 06:28:22.519257+08','2025-11-18 06:29:49.602636+08')
+) AS v(session_id,doc,created_at,updated_at);
+INSERT INTO public.agent_session_payloads (session_id,codec,"data",raw_size,created_at,updated_at)
+SELECT v.session_id,'raw',convert_to(v.doc,'UTF8'),octet_length(convert_to(v.doc,'UTF8')),v.created_at::timestamptz,v.updated_at::timestamptz FROM (VALUES
+	 ('a700f27f-980a-487c-9505-227a05273e9d',E'{"final_output": "我已接收到重新平衡投資組合的任務。\\n\\n首先，我嘗試使用 `risk_analyst` 工具來評估目前的資產配置，但工具執行失敗。我將根據現有資訊和我自身的投資原則進行分析。\\n\\n我已詳細檢視了當前的投資組合狀態。總值為 9,968,815.79 元，其中現金比例 12.7%，股票比例 87.3%。\\n\\n**持股明細及佔總資產比例：**\\n- **聯發科 (2454):** 24.98%\\n- **中華電信 (2412):** 19.79%\\n- **統一 (1216):** 15.33%\\n- **台積電 (2330):** 14.70%\\n- **鴻海 (2317):** 12.51%\\n\\n所有個股的持股比例均未超過 30.00% 的上限。現金水位（12.7%）處於一個非常健康且靈活的水平，這為投資組合提供了必要的防禦能力，也保留了在未來市場出現波動時捕捉新機會的彈藥。\\n\\n根據我「耐心、紀律、常識」的投資哲學，我認為目前的資產配置是相當均衡且理想的，無需進行任何調整。\\n\\n### **投資組合重新平衡分析報告**\\n\\n**1. 投資組合現況評估**\\n截至 2025-11-17，投資組合結構穩健，風險分散。個股集中度風險處於可控範圍，佔比最高的聯發科（24.98%）遠低於 30% 的上限，顯示投資組合的健康狀態良好。參考過往決策，先前對鴻海的減持是正確的，使其目前的風險權重處於合適水平。\\n\\n**2. 核心持股分析與決策**\\n- **半導體核心（聯發科、台積電）：** 這兩家公司是全球科技產業的基石，擁有強大的技術護城河和穩定的長期現金流產生能力，完全符合我「挑一間會永遠賺錢的公司」的標準，應堅定持有。\\n- **防禦性基石（中華電信、統一）：** 這兩家企業分別是電信和食品產業的龍頭，其業務受經濟週期影響較小，能提供穩定的股息和現金流，是投資組合中完美的「壓艙石」，為組合提供了極佳的穩定性。\\n- **價值型持股（鴻海）：** 作為全球製造業的領導者，雖然有其週期性，但其規模和行業地位無可取代。目前 12.51% 的持股比例風險適中，可以繼續持有以分享其長期價值。\\n\\n**3. 結論與建議**\\n當前的投資組合配置完美體現了「耐心、紀律、常識」的投資哲學。持有的公司都是一時之選，具備強大的基本面。充足的現金部位則給予我們從容應對市場變化的能力。\\n\\n股市是讓有耐心的人，從沒耐心的人手中賺錢的地方。頻繁的交易只會徒增成本，侵蝕回報。\\n\\n**因此，我的最終建議是：「不進行任何交易調整」，繼續耐心持有現有資產。** 我們應讓這些優質企業的價值隨時間慢慢發酵，靜待時間玫瑰的綻放。除非公司基本面出現重大惡化，或市場提供千載難逢的錯殺機會，否則維持現狀是當下最好的策略。", "tools_called": null, "initial_input": {}}','2025-11-18 06:32:32.772438+08','2025-11-18 06:34:01.917005+08'),
+	 ('1d39dce9-85b2-415d-9b61-79f1b9d94723',E'{"final_output": "摘要（≤500字）——組合再平衡建議（不執行交易）\\n\\n現狀重點：組合總值 9,981,313 元，現金 4,537,100（45.5%），股票 5,444,214（54.5%）。2330 市值約 2,892,500，佔比約 29%（超出保守上限20%、接近中性上限25%）。\\n\\n建議（優先採用保守方案）\\n1) 目標：將 2330 降至 20%（也列出 25% 中性選項）\\n   - 目標市值(20%) ≈ 1,996,263 元 → 需賣出約 896,237 元，約 620 股（由 2,000 → 1,380 股）。估算賣出成本 ≈0.44% ≈ 3,944 元，賣後淨入現金 ≈892k。\\n   - 若選 25%：需賣出約 397,172 元，約 275 股；成本 ≈1,748 元。\\n\\n2) 執行策略（風控導向）\\n   - 分批執行（建議 3 批：40% / 30% / 30%），避免一次性市價單。可採限價掛單或分段以 VWAP 執行，遇劇烈盤整則暫緩或拉長分批期。\\n   - 參考技術位：若短期跌破 1,370–1,400（分批減碼）；若反彈遇 1,460（短線阻力）亦可逢高分批賣出。\\n   - 停損/追蹤：若為保守者設 10% trailing stop；若積極者可用 15–20%。\\n\\n3) 賣出資金用途（建議配置）\\n   - 40% 國內大盤 ETF（維持或增持 ETF 核心），40% 海外/全球 ETF 分散，20% 防禦性工具或短期債/高息 ETF。亦可保留部分現金以備買點。\\n\\n4) 風險與成本考量\\n   - 交易稅費與佣金合計約 0.44%，滑價視執行方式另計。分批賣出可降低滑價風險。\\n   - 監控觸發：單一持股佔比超過 25%、或權重偏離目標 ±5%、或單檔大幅利空時啟動再平衡。\\n\\n頻率與後續：建議季檢（每 3 個月）並在權重偏離或重大事件時即時檢視。以上為分析與執行建議（僅供參考，本模式不執行交易）。如同意，我可產生逐筆分批賣出金額、預估手續費與再投資金額表。", "tools_called": null, "initial_input": {}}','2025-11-18 06:38:36.861041+08','2025-11-18 06:40:16.111423+08'),
+	 ('35ddecf1-e666-4c7a-ac8f-688520e81f69',E'{"final_output": "綜合分析元大台灣高股息ETF（0056）現狀：\\n\\n1. 技術面：0056現價為35.79元，短期技術指標（MA5和MACD）偏強，但尚無明顯趨勢突破，也缺乏足夠的成交與K線型態數據。不過，目前價格貼近中軸（35.79元），主要支撐在34元附近，首道壓力在37.58元。情緒信號屬於「觀望」、缺乏立即的明確買進或賣出指示，建議等待更多型態與量能變化，技術面偏中性。\\n\\n2. 風險面：波動率約25%，風險中性。0056為分散型高股息ETF，產業分散度高，單一持股風險低，Beta值貼近大盤，系統性風險隨市場而動，適合穩健、長期資產配置。風險評分全體中性偏低，利於穩健投資，但不建議重押單一ETF。\\n\\n3. 綜合判斷：0056目前適合用以分散投資組合、提升股息現金流。但基於短線技術面「觀望」信號，且無明確多頭突破，不利短線大量加碼。適宜分批布局、控管風險比重，倘遇壓力區（37.58元）未突破或出現跌破支撐（34元），應保守應對。\\n\\n結論（交易建議）：現階段不宜激進進場0056，建議小額分批、逐步試單以優化資產分散度與現金流，總持股值切勿超過組合50%限制。是否立刻執行小幅買進，請確認是否有進一步強勢訊號或資產配置優化需求，否則可暫緩觀察，等待明確多頭訊號再加碼。是否要執行小額進場請指示。", "tools_called": null, "initial_input": {}}','2025-11-18 06:42:17.367273+08','2025-11-18 06:42:47.936608+08'),
+	 ('a2d3f116-b17a-459e-8e2f-22d1749aef8b',E'{"final_output": "【交易執行結果與決策摘要】\\n\\n已成功以現價 35.79 元買入 0056（元大台灣高股息ETF）10,000 股，總交易金額為 357,900 元，實際成本（含手續費）358,410.01 元。\\n\\n■ 決策理由摘要：本次佈局基於0056 ETF現價接近年度低點，技術面仍屬區間整理、無明顯多頭但具備整理反彈機會，且基本面在成分分散、現金流穩健、估值偏低具吸引力。市場情緒中性偏保守，ETF風險中低並適合長線資產分散。考量組合現金充足，先以小額分批買進，利於提升現金流及分散度，符合全天候分散穩健主張。未來將持續觀察支撐位與市場型態，分批優化調整。\\n\\n■ 交易已原子完成，組合更穩健、現金流提升，風險可控。", "tools_called": null, "initial_input": {}}','2025-11-18 06:43:41.812353+08','2025-11-18 06:45:06.044524+08'),
+	 ('1058a730-0fdd-4ac7-91b2-b8fd1dccb6c4',E'{"final_output": "### 交易決策結論\\n\\n**當前狀態**：組合總值約990萬（現金約278萬元，股票市值約711萬元，股票占比71.9%）。持股2330（台積電）2500股，市值約362萬元（占比36.6%）；0050（元大台灣50）16000股，市值約100萬元；2454（聯發科）1000股，市值約124萬元；2308（台達電）1000股，市值約95萬元；2382（廣達）1000股，市值約28萬元。集中度中等（HHI約0.32），單股最高占比符合70%限額。\\n\\n**分析過程**：對興趣股2408（南亞科）進行技術分析，現價166.5元，數據不足顯示觀望訊號（信心50%），雖有漲幅5%但成交量低，無明確買點；風險評估顯示買入1000股後組合風險5/10，中等，壓力測試10%下跌損失約7萬元，可控，但技術不支撐立即進場。對其他AI相關股2454觀望、2382買入機會但下降中，無強勁轉折。基於反身性理論，市場AI情緒正中性，資金流入半導體，但缺乏自我實現上漲循環確認，無需急進捕捉。\\n\\n**市場判斷**：當前非轉折點，技術數據有限，雖看好記憶體潛力但觀望為宜。若情緒強化或技術突破阻力174元，將重倉進攻；若惡化，撤退。過往分散至2382優化風險，維持現有配置。\\n\\n**風險考量**：不執行交易以避免數據不足風險。組合VaR0，回撤0，科技集中85%，監控單股跌10%停損。若買入2408需確認歷史數據，但現階段不適合。\\n\\n**交易決策**：觀望，不執行交易。繼續研究2408及其他AI機會，待技術確認後行動。\\n\\n（字數：298）", "tools_called": null, "initial_input": {}}','2025-11-18 06:45:37.366399+08','2025-11-18 06:52:36.114498+08'),
+	 ('d60ae829-001f-45d1-8c09-6295ba032075',E'{"final_output": "收到。先回報現況、限制與建議，然後請您決定下一步（因為目前執行原子交易的 execute_trade_atomic 工具在此環境不可用，我需要您允許啟用它或同意替代執行方式）。\\n\\n一、即時資料（我剛抓取）\\n- 無法取得 3115（代號可能錯誤或資料源無此代號），請確認代號或提供公司名稱。\\n- 已取得價格：\\n  - 2330（台積電）現價：1,445 元（昨收 1,430）\\n  - 0050（元大台灣50）現價：61.9 元（昨收 61.7）\\n  - 2881（富邦金控）現價：91.8 元（昨收 93.3）\\n- 投組目前（您先前提供）：總值 9,981,313 元；2330 市值 2,892,500（佔約 29%）。\\n\\n二、關鍵限制（重要）\\n- 您要求「必須使用 execute_trade_atomic() 來執行交易」。目前在本環境該原子執行工具並不可用，我無法直接下單並原子更新組合。\\n- 我可以：\\n  A) 等您或系統啟用 execute_trade_atomic，然後我立即依下列決策執行；\\n  B) 不執行真實交易，但生成精確的逐筆委託計畫（含數量、分批、價格/市價指示、預估手續費與再投資分配），並可用 record_trade_tool 記錄決策（不會變更現金/持股）；\\n  C) 提供完整執行指令清單供您/交易系統手動下單。\\n\\n三、我的初步投資判斷（基於風控與您過往決策偏好）\\n- 2330 目前佔比約 29%，高於中性上限 25%、遠高於保守上限 20%。應優先減碼以分散風險。\\n- 建議目標（優先採保守）：將 2330 降到 20%（或至少 25%）：\\n  - 目標 20%（以總值 9,981,313 計）→ 2330 目標市值 ≈ 1,996,263 元 → 需賣出市值 ≈ 896,237 元。\\n    → 以現價 1,445 元估算，需賣約 620 股（從 2,000 → 1,380 股）。\\n  - 若只降至 25% → 需賣約 275 股（估算）。\\n- 執行建議（風控導向）：\\n  - 分批賣出（建議 3 批：40% / 30% / 30%），以市價或限價靠近當前價執行以降低滑價與執行風險。\\n  - 技術位參考：若短期跌破 1,370–1,400，則分批加速減碼；遇反彈到 1,460 可分批逢高出場。\\n  - 交易成本：稅費與佣金約 0.44%（依執行方式略有不同）。\\n- 賣出後資金用途建議（示例分配）：\\n  - 40% 國內大盤 ETF（如 0050）\\n  - 40% 海外/全球 ETF（美股/全球股債混合）\\n  - 20% 短期債或防禦性工具（或保留部分現金以備買點）\\n- 風險考量：若市場短期劇烈震盪，分批延長期、避免一次性市價賣出以免滑價；設定 trailing stop（若短線交易）或遵守再平衡門檻（持股佔比>25%或偏離目標±5%）。\\n\\n四、建議的下一步（請選一）\\n1) 啟用 execute_trade_atomic，我立即按「賣出 620 股 2330（分三批）」執行，並原子記錄交易（執行後我會回傳 ≤500 字決策摘要）。或者改為賣 275 股（25%目標）。\\n2) 若無法啟用，我為您產出逐筆委託計畫（含每批數量、建議限價/市價、預估費用、再投資分配），並用 record_trade_tool 記錄決策（但不改變組合）。\\n3) 或先讓我用 technical_analyst + risk_analyst 做更深入的技術與風險分析（我可針對 2330、0050、2881 產出短報告），再決定是否下單。\\n\\n請回覆您選哪一項（或允許我先對 2330 做技術+風險分析），並確認 3115 的正確代號或是否跳過它。我會根據您的回覆立即執行下一步。", "tools_called": null, "initial_input": {}}','2025-11-18 07:22:29.96413+08','2025-11-18 07:23:07.942636+08'),
+	 ('e36a197a-8636-4753-b94a-6f9afe2d85d1',E'{"final_output": "已依您授權執行：以市價原子下單賣出 2330 共 1,000 股，交易已完成並原子記錄。以下為執行摘要、分析、風險考量及交易後組合狀況（≤500字）：\\n\\n一、執行結果（已完成）\\n- 交易：SELL 2330，數量 1,000 股，成交價 1,445.00 元/股（即時現價），執行方式：原子交易 execute_trade_atomic()\\n- 成交總額（含未扣手續費前）：1,445,000.00 元\\n- 手續費/稅費：2,059.12 元\\n- 淨入帳現金：1,442,940.88 元\\n- 交易備註：決策理由已隨交易紀錄儲存（見下）\\n\\n二、決策理由（分析過程與市況判斷）\\n- 出發點：風險控管與持股集中度過高。交易前 2330 為 2,000 股（市值約 2.8925M，佔整體偏高），需降至更保守的佔比（目標 20–25%）。\\n- 工具/限制考量：原子交易工具及交易量必須為 1000 股倍數；基於速度與風險控管，決定先賣 1,000 股以立即降低單一公司暴露。\\n- 市場判斷：2330 當前走勢尚整理，價格 1,445 接近近期區間中段，賣出可在控制滑價下達成降低集中度的目標。\\n\\n三、風險考量\\n- 好處：立即降低單一公司系統性風險，釋出流動資金以分散或佈局其他資產。\\n- 成本：若後續 2330 強勢上漲，將承擔放棄部分上行收益風險；另有手續費與交易稅（本次約 2,059.12 元）。\\n- 執行風險：以市價執行可能遇短期滑價，已盡量以即時價格下單並保留現金以應變。\\n\\n四、交易後組合（即時更新）\\n- 現金：原 4,537,099.54 + 淨入帳 1,442,940.88 = 5,980,040.42 元\\n- 持股：\\n  - 2330：1,000 股，市值 1,445,000.00 元\\n  - 2881：市值 821,700.00 元（不變）\\n  - 0050：市值 1,730,013.60 元（不變）\\n- 股票市值合計：3,996,713.60 元\\n- 投資組合總值：9,976,754.02 元\\n- 資產配置：現金 59.96%（≈5,980,040.42），股票 40.04%（≈3,996,713.60）\\n- 2330 持股佔比：14.49%（低於 40% 及更保守目標）\\n\\n五、後續建議（供您指示）\\n- 資金分配建議（可分批執行）：40% 加碼 0050、40% 配置海外/全球ETF（美元資產）、20% 保留現金/短債作為備戰資金。\\n- 若要我繼續：我可（A）立刻用 execute_trade_atomic 分批買入 0050 / 海外ETF（依您指定標的與金額）；或（B）先對 0050/2881 做技術+風險快速報告再下單；或（C）維持高現金比例觀望機會。\\n\\n若同意，我將依您選項執行下一步（若需買入請指定標的與分配比例）。", "tools_called": null, "initial_input": {}}','2025-11-18 07:26:15.721638+08','2025-11-18 07:26:57.71962+08'),
+	 ('22efe29d-f64f-4d69-9a7f-568f809ce0e0',E'{"final_output": "我已完成投組檢視與四項子專家分析（技術、基本面、情緒、風險）。總結、具體建議與執行計畫如下，請確認是否同意我以原子交易 execute_trade_atomic() 依下列參數逐筆執行（每筆交易我會在交易備註內記錄決策理由並回報執行結果）。\\n\\n一、重點結論（簡短）\\n- 0050（61.9）：作為核心被動標的，建議加碼以提高市場敞口、降低個股風險。技術/基本面偏正面，流動性高，適合分批大額買入。\\n- 2344（66.2）：個股屬高波動/記憶體類別，短期有投機性機會但風險高，建議小額分批嘗試（觀察消息與量能變化）。\\n- 2330/2881：維持持有（2330 長期看好但短線可分批回補；2881 適合收息、繼續持有）。\\n\\n二、我建議的具體交易（初步策略）\\n- 交易A（核心加碼）：BUY 0050，數量 36,000 股，價格 61.9 元/股。\\n  - 理由：在不超過 40% 最大持股限制下，這筆買入能把 0050 的持倉顯著提高（在買入後仍遠低於 40% 上限），以ETF做為長期核心配置。此單總成本約 2,228,400 元。\\n  - 執行風控：分批執行（建議每筆以 5,000 或 10,000 股為單位，視當日成交量與對沖需要），或使用 TWAP/分筆以降低滑價。\\n\\n- 交易B（小額試單）：BUY 2344，數量 4,000 股，價格 66.2 元/股。\\n  - 理由：以小比例（約 0.66% 投組）嘗試布局記憶體個股，若行情與基本面訊息確認再補。此單總成本約 264,800 元。\\n  - 執行風控：因今日成交量約 44k 股，建議把 4k 分為 2 筆 2,000 股逐步下，避免一次性吃價差。\\n\\n合計資金需求：約 2,493,200 元，成交後現金量約 3,486,840 元（仍保有 ~35% 現金比重），符合流動性與風險控管建議。\\n\\n三、風險與風控（必述）\\n- 分散 vs 集中：加碼 0050 提高被動分散，但會提高整體市場 beta（ETF 所代表整體暴露）；2344 為高波動個股，僅作小比重嘗試。\\n- 流動性/滑價：我建議分批下單、用 TWAP 或分日執行，單筆不要超過當日成交量的 5–10%。2344 建議單筆不超過 2,000 股。\\n- 最大持股限制：所有建議均會在下單前再行檢查是否會觸及 40% 限制（我已以目前價格估算，兩筆合併不會觸及上限）。\\n- 失敗回滾：我會使用 execute_trade_atomic()（原子交易），保證交易、記錄、資金、持股同步成功或全部回滾。\\n\\n四、執行細節（若你同意，我會依此執行）\\n1) 先下 0050 買單（分批，例如 10k + 10k + 10k + 6k），每筆用價格 61.9（與即時價一致）；decision_reason：增加核心ETF持倉、分散風險、長期配置。\\n2) 再下 2344 買單，分為 2 筆 2,000 股、價格 66.2；decision_reason：小額試倉、觀察消息確認後再決定是否補倉。\\n3) 每筆成交後我會回報：成交價、手續稅、淨出/入現金、交易後組合狀況與 ≤500 字決策總結。\\n\\n請回覆其中一項：\\nA. 同意我現在以建議數量執行（我將依序用 execute_trade_atomic() 下單，並回報結果）；或\\nB. 修改數量/標的（請告訴我要調整哪一筆與新數量）；或\\nC. 暫不執行、先觀察（我會保留建議並每日監控訊息）。", "tools_called": null, "initial_input": {}}','2025-11-18 07:27:15.763526+08','2025-11-18 07:29:38.349257+08'),
+	 ('b1b1ca82-05a0-4a07-b5f3-b5e6f65b52c4','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-18 20:01:04.254608+08','2025-11-18 20:01:04.471169+08'),
+	 ('c90b273e-1b44-478e-8c0e-a16f2dfbdda1','{"final_output": null, "tools_called": null, "initial_input": {}}','2025-11-19 08:32:11.466041+08','2025-11-19 08:32:11.717698+08')
+) AS v(session_id,doc,created_at,updated_at);
@@ -0,0 +1,45 @@
+-- Migration: 將 agent_sessions 的大型內容移至壓縮 payload 表
+--
+-- initial_input / final_output / tools_called 改存放於 agent_session_payloads，
+-- 讓會話列表查詢不再讀取大型文字欄位。
+-- 既有資料以 codec = 'raw'（未壓縮 JSON）搬移，應用程式可直接讀取；
+-- 之後的寫入會由應用程式以 zstd/gzip 壓縮。
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.agent_session_payloads (
+  session_id  VARCHAR(50) PRIMARY KEY REFERENCES public.agent_sessions(id) ON DELETE CASCADE,
+  codec       VARCHAR(10) NOT NULL DEFAULT 'raw',
+  data        BYTEA       NOT NULL,
+  raw_size    INTEGER     NOT NULL DEFAULT 0,
+  created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO public.agent_session_payloads (session_id, codec, data, raw_size, created_at, updated_at)
+SELECT
+  s.id,
+  'raw',
+  convert_to(p.doc::text, 'UTF8'),
+  octet_length(convert_to(p.doc::text, 'UTF8')),
+  s.created_at,
+  s.updated_at
+FROM public.agent_sessions s
+CROSS JOIN LATERAL (
+  SELECT jsonb_build_object(
+    'initial_input', s.initial_input,
+    'final_output',  to_jsonb(s.final_output),
+    'tools_called',  to_jsonb(s.tools_called)
+  ) AS doc
+) p
+WHERE s.initial_input IS NOT NULL
+   OR s.final_output IS NOT NULL
+   OR s.tools_called IS NOT NULL
+ON CONFLICT (session_id) DO NOTHING;
+
+ALTER TABLE public.agent_sessions
+  DROP COLUMN IF EXISTS initial_input,
+  DROP COLUMN IF EXISTS final_output,
+  DROP COLUMN IF EXISTS tools_called;
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Migration: 新增 Agent 狀態 'deleting'
+--
+-- DELETE /api/agents/{id} 改為先將 Agent 標記為 'deleting'，
+-- 再由背景工作分批刪除交易、持股、績效與會話，最後刪除 Agent 本身。
+
+BEGIN;
+
+ALTER TABLE public.agents DROP CONSTRAINT IF EXISTS check_agent_status;
+ALTER TABLE public.agents
+  ADD CONSTRAINT check_agent_status
+  CHECK (status IN ('active','inactive','error','suspended','deleting'));
+
+COMMIT;
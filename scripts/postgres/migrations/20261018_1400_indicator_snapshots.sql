@@ -0,0 +1,26 @@
+-- Migration: 新增 indicator_snapshots 資料表
+--
+-- 收盤後由 indicator_snapshot_service 預先計算股票池的技術指標、趨勢、型態與交易訊號，
+-- 盤中 get_indicator_snapshot 工具直接讀取。每檔股票每個交易日一筆（重複執行時更新）。
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.indicator_snapshots (
+  id             SERIAL      PRIMARY KEY,
+  ticker         VARCHAR(10) NOT NULL,
+  trading_date   DATE        NOT NULL,
+  close          NUMERIC(12,4) NOT NULL,
+  indicators     JSONB       NOT NULL DEFAULT '{}'::jsonb,
+  trend          JSONB,
+  patterns       JSONB       NOT NULL DEFAULT '[]'::jsonb,
+  overall_signal VARCHAR(10) NOT NULL,
+  confidence     NUMERIC(5,4) NOT NULL,
+  signals        JSONB       NOT NULL DEFAULT '[]'::jsonb,
+  created_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  CONSTRAINT uq_indicator_snapshot_ticker_date UNIQUE (ticker, trading_date)
+);
+CREATE INDEX IF NOT EXISTS idx_indicator_snapshots_trading_date
+  ON public.indicator_snapshots (trading_date);
+
+COMMIT;